@@ -1,90 +1,106 @@
-#!/usr/bin/env python
-import contextlib as __stickytape_contextlib
-
-@__stickytape_contextlib.contextmanager
-def __stickytape_temporary_dir():
-    import tempfile
-    import shutil
-    dir_path = tempfile.mkdtemp()
-    try:
-        yield dir_path
-    finally:
-        shutil.rmtree(dir_path)
+#!/usr/bin/env python3
+"""Atlas vNext CLI."""
+import sys as _atlas_sys
+from importlib.machinery import ModuleSpec as _AtlasModuleSpec
 
-with __stickytape_temporary_dir() as __stickytape_working_dir:
-    def __stickytape_write_module(path, contents):
-        import os, os.path
+_ATLAS_MODULES = {'atlas_mcp': '"""MCP tools for an Atlas workspace, served by `atlas mcp`.\n\ncapture, run, plan, finish and sync change the workspace exactly as the CLI\ncommands do; doctor, req_status, run_report and list_documents answer with\nstructured data. The server process keeps the workspace loaded for the\nwhole session: the parsed document index and doctor\'s per-document results\nstay in memory and are refreshed from filesystem events (inotify on Linux,\na stat per document elsewhere), so tool calls do not re-scan .atlas/.\n\nTools are coroutines that run their work on thread pools. Lookups and\ndoctor read an immutable snapshot of the index and run side by side, each\non a pool of its own; writes queue on one writer lock per workspace and\nrun on a dedicated thread. A slow doctor therefore never delays a lookup\nor a write, from the same client or another one.\n\nNeeds fastmcp or the MCP Python SDK (`pip install mcp`); the CLI does not.\n"""\nimport asyncio\nimport os\nimport sys\nimport threading\nfrom functools import lru_cache\nfrom concurrent.futures import ThreadPoolExecutor\nfrom pathlib import Path\nfrom typing import Any, Callable, Optional\n\nSERVER_NAME = "atlas"\n\n# Tools registered on the server, in the order clients list them.\nTOOLS = (\n    "capture",\n    "run",\n    "plan",\n    "finish",\n    "sync",\n    "doctor",\n    "req_status",\n    "run_report",\n    "list_documents",\n)\n\n# Threads answering lookups, and threads running doctor; writes get a thread of their own.\nLOOKUP_THREADS = 4\nDOCTOR_THREADS = 2\n\n\ndef new_server(host: str, port: int) -> tuple[Any, dict]:\n    """Return an MCP server and the run() arguments that serve it over HTTP.\n\n    fastmcp is preferred, then the MCP SDK\'s own server (MCPServer in 2.x,\n    FastMCP in 1.x, which takes host and port up front).\n\n    Raises:\n        ImportError: If none of them is installed.\n    """\n    try:\n        from fastmcp import FastMCP\n    except ImportError:\n        pass\n    else:\n        return FastMCP(SERVER_NAME), {"transport": "http", "host": host, "port": port}\n    try:\n        from mcp.server.mcpserver import MCPServer\n    except ImportError:\n        from mcp.server.fastmcp import FastMCP\n\n        return FastMCP(SERVER_NAME, host=host, port=port), {"transport": "streamable-http"}\n    return MCPServer(SERVER_NAME), {"transport": "streamable-http", "host": host, "port": port}\n\n\ndef register_tools(server: Any, tools: "AtlasTools") -> None:\n    for name in TOOLS:\n        server.tool()(getattr(tools, name))\n\n\nclass Snapshot:\n    """The document index at one generation; never changed once published.\n\n    entries is a shallow copy of DocIndex.entries: the index replaces a\n    record when its document changes instead of editing it, so the copy\n    stays consistent while the index moves on. listing, runs_by_req and\n    records are derived from it on first use (see AtlasTools.listing,\n    runs_of and records); threads racing to fill one in compute the same\n    value.\n    """\n\n    def __init__(self, generation: int, entries: dict[str, dict]):\n        self.generation = generation\n        self.entries = entries\n        self.listing: Optional[list[tuple[str, str]]] = None\n        self.runs_by_req: Optional[dict[str, list[str]]] = None\n        self.records: dict[str, list[tuple[Path, dict]]] = {}\n\n\nclass AtlasTools:\n    """The MCP tools, bound to one loaded workspace.\n\n    cli is the Atlas CLI module and workspace its WorkspaceServer.\n\n    Lookups (req_status, run_report, list_documents) and doctor read the\n    last published Snapshot. Before reading they fold pending filesystem\n    events into the index if it is free; while a write holds it, they\n    answer from the snapshot as it stands instead of waiting. doctor\n    validates the snapshot\'s records and works on its own copy of the\n    per-document results, publishing it back when done.\n\n    Writes (capture, run, plan, finish, sync) take the writer lock and go\n    through WorkspaceServer.handle() like forwarded CLI calls, so they share\n    the CLI\'s document locks and journal. They publish a new snapshot\n    before returning, so a client always reads its own writes.\n    """\n\n    def __init__(self, cli: Any, workspace: Any):\n        self.cli = cli\n        self.workspace = workspace\n        self.doc_dirs = [cli.REQ_DIR, cli.RULE_DIR, cli.ADR_DIR, cli.CQ_DIR, cli.BRIEF_DIR, cli.RUN_DIR]\n        # Index keys are relative to .atlas/; tools report paths relative to the repository.\n        self.atlas_prefix = cli.ATLAS_ROOT.relative_to(cli.REPO_ROOT).as_posix() + "/"\n        self.folders = tuple(workspace.index.key(folder) + "/" for folder in self.doc_dirs)\n        self.run_folder = workspace.index.key(cli.RUN_DIR) + "/"\n        # IDs outlive snapshots, so their sort keys are worth keeping.\n        self.sort_key = lru_cache(maxsize=None)(cli.id_sort_key)\n        # Separate pools, so a queue of doctor calls never holds up a lookup or a write.\n        self.lookups = ThreadPoolExecutor(LOOKUP_THREADS, thread_name_prefix="atlas-mcp-lookup")\n        self.doctors = ThreadPoolExecutor(DOCTOR_THREADS, thread_name_prefix="atlas-mcp-doctor")\n        self.writes = ThreadPoolExecutor(1, thread_name_prefix="atlas-mcp-write")\n        self.writer = asyncio.Lock()\n        # Held by the one thread using the document index at a time.\n        self.index_lock = threading.Lock()\n        # Guards WorkspaceServer.doctor_caches, which doctor runs copy and replace.\n        self.cache_lock = threading.Lock()\n        self.snapshot = Snapshot(-1, {})\n        with self.index_lock:\n            self.refresh()\n\n    def close(self) -> None:\n        for pool in (self.lookups, self.doctors, self.writes):\n            pool.shutdown()\n\n    # -------------------------------------------------------------------------\n    # Scheduling\n    # -------------------------------------------------------------------------\n\n    @staticmethod\n    async def in_pool(pool: ThreadPoolExecutor, func: Callable, *args: Any) -> Any:\n        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)\n\n    async def exclusive(self, func: Callable, *args: Any) -> Any:\n        """Run func(*args) on the write thread under the writer lock, then publish a snapshot."""\n        async with self.writer:\n            return await self.in_pool(self.writes, self.with_index, func, *args)\n\n    async def lookup(self, func: Callable, *args: Any) -> Any:\n        """Run func(snapshot, *args) on the lookup pool against the freshest snapshot at hand."""\n        return await self.in_pool(self.lookups, lambda: func(self.current(), *args))\n\n    async def checked(self, func: Callable, *args: Any) -> Any:\n        """Like lookup(), but on the doctor pool."""\n        return await self.in_pool(self.doctors, lambda: func(self.current(), *args))\n\n    def with_index(self, func: Callable, *args: Any) -> Any:\n        with self.index_lock:\n            try:\n                return func(*args)\n            finally:\n                self.refresh()\n\n    def current(self) -> Snapshot:\n        """Refresh the snapshot unless the index is busy, and return it."""\n        if self.index_lock.acquire(blocking=False):\n            try:\n                self.refresh()\n            finally:\n                self.index_lock.release()\n        return self.snapshot\n\n    def refresh(self) -> None:\n        """Fold pending changes into the index and publish it if it moved on. Needs index_lock."""\n        if self.workspace.watcher is not None:\n            self.workspace.apply_events()\n        else:\n            self.workspace.index.scan(self.doc_dirs + [self.cli.VIEWS_DIR])\n        index = self.workspace.index\n        if index.generation != self.snapshot.generation:\n            self.snapshot = Snapshot(index.generation, dict(index.entries))\n\n    def key(self, folder: Path, doc_id: str) -> str:\n        return self.workspace.index.key(folder / f"{doc_id}.md")\n\n    @staticmethod\n    def doc_id(key: str) -> str:\n        return key.rsplit("/", 1)[-1][: -len(".md")]\n\n    def listing(self, snapshot: Snapshot) -> list[tuple[str, str]]:\n        """(ID, key) of each REQ, RULE, ADR, CQ, BRIEF and RUN document, in ID order."""\n        if snapshot.listing is None:\n            listing = [(self.doc_id(key), key) for key in snapshot.entries if key.startswith(self.folders)]\n            listing.sort(key=lambda item: self.sort_key(item[0]))\n            snapshot.listing = listing\n        return snapshot.listing\n\n    def records(self, snapshot: Snapshot, folders: list[Path]) -> list[tuple[Path, dict]]:\n        """(path, record) of every document under folders, in the order DocIndex.records() gives."""\n        records = []\n        for folder in folders:\n            prefix = self.workspace.index.key(folder) + "/"\n            ordered = snapshot.records.get(prefix)\n            if ordered is None:\n                keys = sorted((key for key in snapshot.entries if key.startswith(prefix)), key=self.sort_key)\n                root = self.cli.ATLAS_ROOT\n                ordered = snapshot.records[prefix] = [(root / key, snapshot.entries[key]) for key in keys]\n            records.extend(ordered)\n        return records\n\n    def runs_of(self, snapshot: Snapshot, req_id: str) -> list[str]:\n        """Keys of the RUN documents of req_id, in step order."""\n        if snapshot.runs_by_req is None:\n            runs_by_req: dict[str, list[str]] = {}\n            for doc_id, key in self.listing(snapshot):\n                if key.startswith(self.run_folder):\n                    run_req = self.cli.req_id_from_run_id(doc_id)\n                    if run_req:\n                        runs_by_req.setdefault(run_req, []).append(key)\n            snapshot.runs_by_req = runs_by_req\n        return snapshot.runs_by_req.get(req_id, [])\n\n    # -------------------------------------------------------------------------\n    # Work done on the pool\n    # -------------------------------------------------------------------------\n\n    def command(self, argv: list[str]) -> dict:\n        """Run one CLI command and return its exit status and output lines."""\n        request = {\n            "protocol": self.cli.SERVER_PROTOCOL,\n            "source": self.workspace.source,\n            "cwd": os.getcwd(),\n            "argv": argv,\n        }\n        reply = self.workspace.handle(request)\n        if "error" in reply:\n            return {"ok": False, "code": 1, "output": [], "errors": [reply["error"]]}\n        return {\n            "ok": reply["code"] == 0,\n            "code": reply["code"],\n            "output": reply["stdout"].splitlines(),\n            "errors": reply["stderr"].splitlines(),\n        }\n\n    def validate(\n        self, snapshot: Snapshot, checks: frozenset, max_age_hours: int, changed: Optional[str], limit: int\n    ) -> dict:\n        """Run doctor\'s checks over snapshot; other threads keep using the index meanwhile."""\n        cli = self.cli\n        cli._GIT_HEADS.clear()  # HEAD may have moved since the last call.\n        docs = self.records(snapshot, self.doc_dirs)\n        views = self.records(snapshot, [cli.VIEWS_DIR]) if checks & {"views", "coverage"} else []\n        plan = cli.load_schema_plan()\n        cache_key = ("links" in checks, plan.digest)\n        with self.cache_lock:\n            cache = dict(self.workspace.doctor_caches.get(cache_key, {}))\n        # Nothing here should print, but stdout carries the stdio session.\n        with cli.thread_output(sys.stderr, sys.stderr):\n            # One job: forking a process pool from this multithreaded process is unsafe.\n            issues = list(cli.run_checks(docs, views, checks, 1, max_age_hours, changed, cache, plan))\n        with self.cache_lock:\n            self.workspace.doctor_caches[cache_key] = cache\n        counted = sum(1 for issue in issues if issue.counted)\n        return {\n            "ok": counted == 0,\n            "counted": counted,\n            "total": len(issues),\n            "issues": [issue.to_dict() for issue in issues[: max(0, limit)]],\n        }\n\n    def document(self, key: str, record: dict) -> dict:\n        checked, total = record["checkboxes"]\n        return {\n            "id": self.doc_id(key),\n            "path": self.atlas_prefix + key,\n            "meta": record["meta"],\n            "sections": record["sections"],\n            "links": record["links"],\n            "req_refs": record["req_refs"],\n            "checkboxes": {"checked": checked, "total": total},\n        }\n\n    def req_report(self, snapshot: Snapshot, req_id: str) -> dict:\n        cli = self.cli\n        key = self.key(cli.REQ_DIR, req_id)\n        record = snapshot.entries.get(key)\n        if record is None:\n            return {"id": req_id, "found": False}\n        view = snapshot.entries.get(self.key(cli.VIEWS_DIR, req_id))\n        runs = [\n            {"id": self.doc_id(k), "status": snapshot.entries[k]["meta"].get("Status")}\n            for k in self.runs_of(snapshot, req_id)\n        ]\n        return {**self.document(key, record), "found": True, "view": view.get("view") if view else None, "runs": runs}\n\n    def run_summary(self, snapshot: Snapshot, run_id: str) -> dict:\n        cli = self.cli\n        key = self.key(cli.RUN_DIR, run_id)\n        record = snapshot.entries.get(key)\n        if record is None:\n            return {"id": run_id, "found": False}\n        meta = record["meta"]\n        linked = {}\n        for kind, doc_id, folder in (\n            ("REQ", meta.get("REQ") or cli.req_id_from_run_id(run_id), cli.REQ_DIR),\n            ("BRIEF", meta.get("Brief"), cli.BRIEF_DIR),\n        ):\n            if doc_id and self.key(folder, doc_id) in snapshot.entries:\n                linked[kind] = self.atlas_prefix + self.key(folder, doc_id)\n        return {**self.document(key, record), "found": True, "linked": linked}\n\n    def matching(self, snapshot: Snapshot, prefix: str, status: str, limit: int) -> dict:\n        entries = snapshot.entries\n        status = status.lower()\n        matches = [\n            (doc_id, key)\n            for doc_id, key in self.listing(snapshot)\n            if doc_id.startswith(prefix)\n            and (not status or entries[key]["meta"].get("Status", "").lower() == status)\n        ]\n        documents = [\n            {"id": doc_id, "path": self.atlas_prefix + key, "status": entries[key]["meta"].get("Status")}\n            for doc_id, key in matches[: max(0, limit)]\n        ]\n        return {"total": len(matches), "documents": documents}\n\n    # -------------------------------------------------------------------------\n    # Tools that change the workspace\n    # -------------------------------------------------------------------------\n\n    async def capture(self, text: str, domain: str = "GEN", to_brief: bool = False) -> dict:\n        """Capture a request: create or update its REQ and view, optionally with a BRIEF.\n\n        Args:\n            text: The request; REQ IDs mentioned in it are updated instead of creating a new REQ.\n            domain: Domain for new documents (e.g. "AUTH").\n            to_brief: Also create a BRIEF draft from the text.\n        """\n        argv = ["capture", "--domain", domain] + (["--to", "brief"] if to_brief else [])\n        return await self.exclusive(self.command, argv + ["--", text])\n\n    async def run(self, req_ids: list[str], step: Optional[int] = None) -> dict:\n        """Start a RUN document for each REQ (the next step, or the given one)."""\n        argv = ["run"] + (["--step", str(step)] if step is not None else [])\n        return await self.exclusive(self.command, argv + ["--", *req_ids])\n\n    async def plan(self, brief_id: str, step: Optional[int] = None) -> dict:\n        """Start a RUN document for a BRIEF."""\n        argv = ["plan"] + (["--step", str(step)] if step is not None else [])\n        return await self.exclusive(self.command, argv + ["--", brief_id])\n\n    async def finish(self, run_ids: list[str], success: bool = True, git: Optional[str] = None) -> dict:\n        """Close RUNs and record the outcome on their REQ/BRIEF.\n\n        Args:\n            run_ids: RUN IDs to finish.\n            success: Whether the work succeeded.\n            git: Commit hash implementing the change (default: the repository\'s HEAD).\n        """\n        argv = ["finish", "--success", "true" if success else "false"] + (["--git", git] if git else [])\n        return await self.exclusive(self.command, argv + ["--", *run_ids])\n\n    async def sync(\n        self,\n        run_id: str,\n        apply_brief: bool = False,\n        write_req_patch: bool = False,\n        apply_req: bool = False,\n    ) -> dict:\n        """Show (and optionally apply) what a RUN changes in its BRIEF and REQ."""\n        argv = ["sync"]\n        if apply_brief:\n            argv.append("--apply-brief")\n        if write_req_patch:\n            argv.append("--write-req-patch")\n        if apply_req:\n            argv.append("--apply-req")\n        return await self.exclusive(self.command, argv + ["--", run_id])\n\n    # -------------------------------------------------------------------------\n    # Tools that read it\n    # -------------------------------------------------------------------------\n\n    async def doctor(\n        self,\n        links: bool = False,\n        verify_git: bool = False,\n        changed: Optional[str] = None,\n        max_age_hours: int = 24,\n        limit: int = 500,\n    ) -> dict:\n        """Validate the workspace and return the issues found (at most limit of them, with the total).\n\n        Only documents changed since the previous call (and their dependents)\n        are re-checked; the rest reuse results held in memory.\n\n        Args:\n            links: Also check that Markdown links resolve.\n            verify_git: Also check that recorded commit hashes exist.\n            changed: Re-check only documents changed since this git ref ("" for the last call).\n            max_age_hours: Age after which an executing RUN is reported as unfinished.\n            limit: Most issues to return; "total" and "counted" cover all of them.\n        """\n        cli = self.cli\n        checks = cli.DEFAULT_CHECKS | {"links"} if links else cli.DEFAULT_CHECKS\n        if verify_git:\n            checks |= {"git"}\n        return await self.checked(self.validate, checks, max_age_hours, changed, limit)\n\n    async def req_status(self, req_id: str) -> dict:\n        """A REQ\'s header fields, sections and progress, with its view and RUNs."""\n        return await self.lookup(self.req_report, req_id)\n\n    async def run_report(self, run_id: str) -> dict:\n        """A RUN\'s header fields and checklist progress, with the BRIEF/REQ it belongs to."""\n        return await self.lookup(self.run_summary, run_id)\n\n    async def list_documents(self, prefix: str = "", status: str = "", limit: int = 200) -> dict:\n        """List documents whose ID starts with prefix (e.g. "REQ-AUTH") and, if given, with this Status.\n\n        Returns at most limit documents, in ID order, and the total that matched.\n        """\n        return await self.lookup(self.matching, prefix, status, limit)\n'}
 
-        def make_package(path):
-            parts = path.split("/")
-            partial_path = __stickytape_working_dir
-            for part in parts:
-                partial_path = os.path.join(partial_path, part)
-                if not os.path.exists(partial_path):
-                    os.mkdir(partial_path)
-                    with open(os.path.join(partial_path, "__init__.py"), "wb") as f:
-                        f.write(b"\n")
 
-        make_package(os.path.dirname(path))
+class _AtlasBundleImporter:
+    """Import the modules embedded in this file straight from memory."""
 
-        full_path = os.path.join(__stickytape_working_dir, path)
-        with open(full_path, "wb") as module_file:
-            module_file.write(contents)
+    def find_spec(self, name, path=None, target=None):
+        if name not in _ATLAS_MODULES:
+            return None
+        return _AtlasModuleSpec(name, self, origin=f"{__file__}/{name}.py")
 
-    import sys as __stickytape_sys
-    __stickytape_sys.path.insert(0, __stickytape_working_dir)
+    def create_module(self, spec):
+        return None
 
-    #!/usr/bin/env python3
-    """Atlas vNext CLI."""
-    
-    import argparse
-    import json
-    import os
-    import re
-    import sys
-    import subprocess
-    from datetime import datetime, timedelta
-    from pathlib import Path
-    from typing import Iterable, Optional
-    
-    ATLAS_VERSION = "0.3.0"
-    
-    CHANGELOG = {
-        "0.3.0": [
-            "Refactor: SSOT-first structure (views/adr/drafts/inbox/archive).",
-            "Feature: capture/run workflow with REQ-based RUN IDs.",
-            "Feature: finish writes Implemented-Git/Linked-RUN to REQ.",
-            "Feature: doctor validates view refs and git evidence.",
-            "Templates: add VIEW/ADR; update RUN/REQ."
-        ],
-        "0.2.0": [
-            "Feature: Auto-detection of version updates.",
-            "Feature: Print changelog on update.",
-        ],
-        "0.1.0": [
-            "Initial release."
-        ]
-    }
-    
-    # If running from src/atlas_cli.py, parents[1] is the root.
-    # If bundled as atlas.py in the root, parents[0] (or .parent) is the root.
-    _path = Path(__file__).resolve()
-    if _path.name == "atlas_cli.py":
-        REPO_ROOT = _path.parents[1]
-    else:
-        REPO_ROOT = _path.parent
-    
+    def exec_module(self, module):
+        code = compile(_ATLAS_MODULES[module.__name__], module.__spec__.origin, "exec")
+        exec(code, module.__dict__)
+
+
+_atlas_sys.meta_path.insert(0, _AtlasBundleImporter())
+
+
+import argparse
+import json
+import os
+import posixpath
+import re
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+ATLAS_VERSION = "0.3.0"
+
+CHANGELOG = {
+    "0.3.0": [
+        "Refactor: SSOT-first structure (views/adr/drafts/inbox/archive).",
+        "Feature: capture/run workflow with REQ-based RUN IDs.",
+        "Feature: finish writes Implemented-Git/Linked-RUN to REQ.",
+        "Feature: doctor validates view refs and git evidence.",
+        "Templates: add VIEW/ADR; update RUN/REQ."
+    ],
+    "0.2.0": [
+        "Feature: Auto-detection of version updates.",
+        "Feature: Print changelog on update.",
+    ],
+    "0.1.0": [
+        "Initial release."
+    ]
+}
+
+# If running from src/atlas_cli.py, parents[1] is the root.
+# If bundled as atlas.py in the root, parents[0] (or .parent) is the root.
+_path = Path(__file__).resolve()
+if _path.name == "atlas_cli.py":
+    TOOL_ROOT = _path.parents[1]
+else:
+    TOOL_ROOT = _path.parent
+
+# Tool defaults always come from the checkout/bundle this module lives in.
+SRC_DEFAULTS_ROOT = TOOL_ROOT / "src" / ".system_defaults"
+SRC_DEFAULT_TEMPLATES_DIR = SRC_DEFAULTS_ROOT / "templates"
+SRC_DEFAULT_TOP_DOCS_DIR = SRC_DEFAULTS_ROOT / "top_docs"
+SRC_DEFAULT_PROMPTS_DIR = SRC_DEFAULTS_ROOT / "prompts"
+
+
+def set_workspace(repo_root: Path) -> None:
+    """Point every workspace path (.atlas/ and its folders) at repo_root."""
+    global REPO_ROOT, ATLAS_ROOT, SYSTEM_ROOT, TEMPLATES_DIR, STATE_DIR, LAST_RUN_PATH
+    global DOC_INDEX_PATH, DOCTOR_CACHE_PATH, GIT_OBJECTS_PATH, SEQUENCES_PATH, LOCKS_DIR, VERSION_PATH, PATCH_DIR
+    global SCHEMAS_PATH, WORKFLOW_PATH, JOURNAL_PATH, JOURNAL_LOCK_PATH, RUNS_LOG_PATH, ACTIVE_RUNS_PATH
+    global SERVER_SOCKET_PATH, SERVER_LOCK_PATH
+    global REQ_DIR, RULE_DIR, ADR_DIR, CQ_DIR, VIEWS_DIR, INBOX_DIR, DRAFTS_DIR, BRIEF_DIR, RUN_DIR, ARCHIVE_DIR
+    global REQUIRED_TOP_DOCS, OPTIONAL_TOP_DOCS, _DOC_INDEX
+
+    REPO_ROOT = Path(repo_root).resolve()
     ATLAS_ROOT = REPO_ROOT / ".atlas"
     SYSTEM_ROOT = ATLAS_ROOT / ".system"
     TEMPLATES_DIR = SYSTEM_ROOT / "templates"
     STATE_DIR = SYSTEM_ROOT / "state"
     LAST_RUN_PATH = STATE_DIR / "last_run.json"
+    RUNS_LOG_PATH = STATE_DIR / "runs.jsonl"
+    ACTIVE_RUNS_PATH = STATE_DIR / "active_runs.json"
+    DOC_INDEX_PATH = STATE_DIR / "doc_index.json"
+    DOCTOR_CACHE_PATH = STATE_DIR / "doctor_cache.json"
+    GIT_OBJECTS_PATH = STATE_DIR / "git_objects.json"
+    SEQUENCES_PATH = STATE_DIR / "sequences.json"
+    LOCKS_DIR = STATE_DIR / "locks"
+    JOURNAL_PATH = STATE_DIR / "journal.json"
+    JOURNAL_LOCK_PATH = STATE_DIR / "journal.lock"
+    SERVER_SOCKET_PATH = STATE_DIR / "atlas.sock"
+    SERVER_LOCK_PATH = STATE_DIR / "atlas.sock.lock"
     VERSION_PATH = SYSTEM_ROOT / "VERSION"
-    SRC_DEFAULTS_ROOT = REPO_ROOT / "src" / ".system_defaults"
-    SRC_DEFAULT_TEMPLATES_DIR = SRC_DEFAULTS_ROOT / "templates"
-    SRC_DEFAULT_TOP_DOCS_DIR = SRC_DEFAULTS_ROOT / "top_docs"
-    SRC_DEFAULT_PROMPTS_DIR = SRC_DEFAULTS_ROOT / "prompts"
-    
+    SCHEMAS_PATH = SYSTEM_ROOT / "schemas.json"
+    WORKFLOW_PATH = SYSTEM_ROOT / "workflow.json"
+    PATCH_DIR = ATLAS_ROOT / "patch"
+
     REQ_DIR = ATLAS_ROOT / "req"
     RULE_DIR = ATLAS_ROOT / "rule"
     ADR_DIR = ATLAS_ROOT / "adr"
@@ -95,400 +111,828 @@ with __stickytape_temporary_dir() as __stickytape_working_dir:
     BRIEF_DIR = DRAFTS_DIR / "brief"
     RUN_DIR = ATLAS_ROOT / "runs"
     ARCHIVE_DIR = ATLAS_ROOT / "archive"
-    
+
     REQUIRED_TOP_DOCS = [
         ATLAS_ROOT / "FRONT.md",
         ATLAS_ROOT / "BOARD.md",
         ATLAS_ROOT / "CONVENTIONS.md",
     ]
-    
+
     OPTIONAL_TOP_DOCS = [
         ATLAS_ROOT / "GOALS.md",
     ]
-    
-    REQ_ID_PATTERN = re.compile(r"^REQ-([A-Z]+)-(\d{3})$")
-    RULE_ID_PATTERN = re.compile(r"^RULE-([A-Z]+)-(\d{3})$")
-    ADR_ID_PATTERN = re.compile(r"^ADR-([A-Z]+)-(\d{3})$")
-    CQ_ID_PATTERN = re.compile(r"^CQ-([A-Z]+)-(\d{3})$")
-    BRIEF_ID_PATTERN = re.compile(r"^BRIEF-([A-Z]+)-(\d{3})$")
-    RUN_ID_PATTERN = re.compile(r"^RUN-(BRIEF|REQ)-([A-Z]+)-(\d{3})-step-(\d{2})$")
-    
-    META_RE = re.compile(r"^>\s*\*\*([^*]+)\*\*:\s*(.+)$")
-    HEADER_ID_RE = re.compile(r"^#\s+\[([^\]]+)\]", re.M)
-    LINK_RE = re.compile(r"\[[^\]]*\]\(([^)]+)\)")
-    REQ_REF_RE = re.compile(r"REQ-[A-Z]+-\d{3}")
-    REF_TOKEN_RE = re.compile(r"@(?P<id>REQ-[A-Z]+-\d{3})(?:#[^)\s]+)?")
-    NORMATIVE_KEYWORDS = ["반드시", "해야", "불가", "금지", "항상"]
-    
-    ALLOWED_MUST_READ_PREFIXES = {"RULE"}
-    
-    PATCH_DIR = ATLAS_ROOT / "patch"
-    
-    # Embedded source code (populated by build.py)
-    # __EMBEDDED_SRC_PLACEHOLDER__ will be replaced with base64-encoded source
-    EMBEDDED_SRC_B64 = "IyEvdXNyL2Jpbi9lbnYgcHl0aG9uMwoiIiJBdGxhcyB2TmV4dCBDTEkuIiIiCgppbXBvcnQgYXJncGFyc2UKaW1wb3J0IGpzb24KaW1wb3J0IG9zCmltcG9ydCByZQppbXBvcnQgc3lzCmltcG9ydCBzdWJwcm9jZXNzCmZyb20gZGF0ZXRpbWUgaW1wb3J0IGRhdGV0aW1lLCB0aW1lZGVsdGEKZnJvbSBwYXRobGliIGltcG9ydCBQYXRoCmZyb20gdHlwaW5nIGltcG9ydCBJdGVyYWJsZSwgT3B0aW9uYWwKCkFUTEFTX1ZFUlNJT04gPSAiMC4zLjAiCgpDSEFOR0VMT0cgPSB7CiAgICAiMC4zLjAiOiBbCiAgICAgICAgIlJlZmFjdG9yOiBTU09ULWZpcnN0IHN0cnVjdHVyZSAodmlld3MvYWRyL2RyYWZ0cy9pbmJveC9hcmNoaXZlKS4iLAogICAgICAgICJGZWF0dXJlOiBjYXB0dXJlL3J1biB3b3JrZmxvdyB3aXRoIFJFUS1iYXNlZCBSVU4gSURzLiIsCiAgICAgICAgIkZlYXR1cmU6IGZpbmlzaCB3cml0ZXMgSW1wbGVtZW50ZWQtR2l0L0xpbmtlZC1SVU4gdG8gUkVRLiIsCiAgICAgICAgIkZlYXR1cmU6IGRvY3RvciB2YWxpZGF0ZXMgdmlldyByZWZzIGFuZCBnaXQgZXZpZGVuY2UuIiwKICAgICAgICAiVGVtcGxhdGVzOiBhZGQgVklFVy9BRFI7IHVwZGF0ZSBSVU4vUkVRLiIKICAgIF0sCiAgICAiMC4yLjAiOiBbCiAgICAgICAgIkZlYXR1cmU6IEF1dG8tZGV0ZWN0aW9uIG9mIHZlcnNpb24gdXBkYXRlcy4iLAogICAgICAgICJGZWF0dXJlOiBQcmludCBjaGFuZ2Vsb2cgb24gdXBkYXRlLiIsCiAgICBdLAogICAgIjAuMS4wIjogWwogICAgICAgICJJbml0aWFsIHJlbGVhc2UuIgogICAgXQp9CgojIElmIHJ1bm5pbmcgZnJvbSBzcmMvYXRsYXNfY2xpLnB5LCBwYXJlbnRzWzFdIGlzIHRoZSByb290LgojIElmIGJ1bmRsZWQgYXMgYXRsYXMucHkgaW4gdGhlIHJvb3QsIHBhcmVudHNbMF0gKG9yIC5wYXJlbnQpIGlzIHRoZSByb290LgpfcGF0aCA9IFBhdGgoX19maWxlX18pLnJlc29sdmUoKQppZiBfcGF0aC5uYW1lID09ICJhdGxhc19jbGkucHkiOgogICAgUkVQT19ST09UID0gX3BhdGgucGFyZW50c1sxXQplbHNlOgogICAgUkVQT19ST09UID0gX3BhdGgucGFyZW50CgpBVExBU19ST09UID0gUkVQT19ST09UIC8gIi5hdGxhcyIKU1lTVEVNX1JPT1QgPSBBVExBU19ST09UIC8gIi5zeXN0ZW0iClRFTVBMQVRFU19ESVIgPSBTWVNURU1fUk9PVCAvICJ0ZW1wbGF0ZXMiClNUQVRFX0RJUiA9IFNZU1RFTV9ST09UIC8gInN0YXRlIgpMQVNUX1JVTl9QQVRIID0gU1RBVEVfRElSIC8gImxhc3RfcnVuLmpzb24iClZFUlNJT05fUEFUSCA9IFNZU1RFTV9ST09UIC8gIlZFUlNJT04iClNSQ19ERUZBVUxUU19ST09UID0gUkVQT19ST09UIC8gInNyYyIgLyAiLnN5c3RlbV9kZWZhdWx0cyIKU1JDX0RFRkFVTFRfVEVNUExBVEVTX0RJUiA9IFNSQ19ERUZBVUxUU19ST09UIC8gInRlbXBsYXRlcyIKU1JDX0RFRkFVTFRfVE9QX0RPQ1NfRElSID0gU1JDX0RFRkFVTFRTX1JPT1QgLyAidG9wX2RvY3MiClNSQ19ERUZBVUxUX1BST01QVFNfRElSID0gU1JDX0RFRkFVTFRTX1JPT1QgLyAicHJvbXB0cyIKClJFUV9ESVIgPSBBVExBU19ST09UIC8gInJlcSIKUlVMRV9ESVIgPSBBVExBU19ST09UIC8gInJ1bGUiCkFEUl9ESVIgPSBBVExBU19ST09UIC8gImFkciIKQ1FfRElSID0gQVRMQVNfUk9PVCAvICJjcSIKVklFV1NfRElSID0gQVRMQVNfUk9PVCAvICJ2aWV3cyIKSU5CT1hfRElSID0gQVRMQVNfUk9PVCAvICJpbmJveCIgICMgVW5zdHJ1Y3R1cmVkIG5vdGVzLCBleGNsdWRlZCBmcm9tIGRvY3RvcgpEUkFGVFNfRElSID0gQVRMQVNfUk9PVCAvICJkcmFmdHMiCkJSSUVGX0RJUiA9IERSQUZUU19ESVIgLyAiYnJpZWYiClJVTl9ESVIgPSBBVExBU19ST09UIC8gInJ1bnMiCkFSQ0hJVkVfRElSID0gQVRMQVNfUk9PVCAvICJhcmNoaXZlIgoKUkVRVUlSRURfVE9QX0RPQ1MgPSBbCiAgICBBVExBU19ST09UIC8gIkZST05ULm1kIiwKICAgIEFUTEFTX1JPT1QgLyAiQk9BUkQubWQiLAogICAgQVRMQVNfUk9PVCAvICJDT05WRU5USU9OUy5tZCIsCl0KCk9QVElPTkFMX1RPUF9ET0NTID0gWwogICAgQVRMQVNfUk9PVCAvICJHT0FMUy5tZCIsCl0KClJFUV9JRF9QQVRURVJOID0gcmUuY29tcGlsZShyIl5SRVEtKFtBLVpdKyktKFxkezN9KSQiKQpSVUxFX0lEX1BBVFRFUk4gPSByZS5jb21waWxlKHIiXlJVTEUtKFtBLVpdKyktKFxkezN9KSQiKQpBRFJfSURfUEFUVEVSTiA9IHJlLmNvbXBpbGUociJeQURSLShbQS1aXSspLShcZHszfSkkIikKQ1FfSURfUEFUVEVSTiA9IHJlLmNvbXBpbGUociJeQ1EtKFtBLVpdKyktKFxkezN9KSQiKQpCUklFRl9JRF9QQVRURVJOID0gcmUuY29tcGlsZShyIl5CUklFRi0oW0EtWl0rKS0oXGR7M30pJCIpClJVTl9JRF9QQVRURVJOID0gcmUuY29tcGlsZShyIl5SVU4tKEJSSUVGfFJFUSktKFtBLVpdKyktKFxkezN9KS1zdGVwLShcZHsyfSkkIikKCk1FVEFfUkUgPSByZS5jb21waWxlKHIiXj5ccypcKlwqKFteKl0rKVwqXCo6XHMqKC4rKSQiKQpIRUFERVJfSURfUkUgPSByZS5jb21waWxlKHIiXiNccytcWyhbXlxdXSspXF0iLCByZS5NKQpMSU5LX1JFID0gcmUuY29tcGlsZShyIlxbW15cXV0qXF1cKChbXildKylcKSIpClJFUV9SRUZfUkUgPSByZS5jb21waWxlKHIiUkVRLVtBLVpdKy1cZHszfSIpClJFRl9UT0tFTl9SRSA9IHJlLmNvbXBpbGUociJAKD9QPGlkPlJFUS1bQS1aXSstXGR7M30pKD86I1teKVxzXSspPyIpCk5PUk1BVElWRV9LRVlXT1JEUyA9IFsi67CY65Oc7IucIiwgIu2VtOyVvCIsICLrtojqsIAiLCAi6riI7KeAIiwgIu2VreyDgSJdCgpBTExPV0VEX01VU1RfUkVBRF9QUkVGSVhFUyA9IHsiUlVMRSJ9CgpQQVRDSF9ESVIgPSBBVExBU19ST09UIC8gInBhdGNoIgoKIyBFbWJlZGRlZCBzb3VyY2UgY29kZSAocG9wdWxhdGVkIGJ5IGJ1aWxkLnB5KQojIF9fRU1CRURERURfU1JDX1BMQUNFSE9MREVSX18gd2lsbCBiZSByZXBsYWNlZCB3aXRoIGJhc2U2NC1lbmNvZGVkIHNvdXJjZQpFTUJFRERFRF9TUkNfQjY0ID0gIl9fRU1CRURERURfU1JDX1BMQUNFSE9MREVSX18iCgojIENoZWNrYm94IHBhdHRlcm5zCkNIRUNLQk9YX1VOQ0hFQ0tFRCA9IHJlLmNvbXBpbGUociJeKFxzKiktXHMqXFtccypcXSguKikkIikKQ0hFQ0tCT1hfQ0hFQ0tFRCA9IHJlLmNvbXBpbGUociJeKFxzKiktXHMqXFt4XF0oLiopJCIsIHJlLklHTk9SRUNBU0UpClRSQUNFQUJJTElUWV9MSU5LX1JFID0gcmUuY29tcGlsZShyIlwqXCooPzpJbXBsZW1lbnRzfEFuc3dlcnN8U29sdmVkIGJ5fEltcGxlbWVudGVkIGJ5KVwqXCo6XHMqXFsoW15cXV0rKVxdXCgoW14pXSspXCkiKQoKREVGQVVMVF9UT1BfRE9DUyA9IHsKICAgIEFUTEFTX1JPT1QgLyAiRlJPTlQubWQiOiAiIiIjIEF0bGFzXG5cblRoaXMgcmVwbyB1c2VzIEF0bGFzIHZOZXh0LlxuVXNlOiBgcHl0aG9uIGF0bGFzLnB5IGluaXRgXG5cblF1aWNrIGZsb3c6XG4xKSBgcHl0aG9uIGF0bGFzLnB5IGNhcHR1cmUgXCIuLi5cIiAtLWRvbWFpbiBHRU5gXG4yKSBgcHl0aG9uIGF0bGFzLnB5IHJ1biBSRVEtR0VOLTAwMWBcbjMpIGBweXRob24gYXRsYXMucHkgZmluaXNoIFJVTi1SRVEtR0VOLTAwMS1zdGVwLTAxIC0tZ2l0IDxoYXNofG5vLWNvbW1pdD4gLS1zdWNjZXNzIHRydWVgXG5cbkxpbmtzOiBCT0FSRC5tZCwgQ09OVkVOVElPTlMubWQsIEdPQUxTLm1kXG4iIiIsCiAgICBBVExBU19ST09UIC8gIkJPQVJELm1kIjogIiIiIyBCT0FSRFxuXG4+IOydtCDrrLjshJzripQg7ZSE66Gc7KCd7Yq47J2YICoq7ZiE7J6sIOyekeyXhSDsg4Htg5wg7Iqk64OF7IO3KirsnYQg64KY7YOA64OF64uI64ukLlxuPiDruYTslrQg7J6I64qUIOqyveyasCwg7ZW064u5IOyDge2DnOyXkCDtlbTri7ntlZjripQg7J6R7JeF7J20IOyXhuydjOydhCDsnZjrr7jtlanri4jri6QuXG5cbiMjIFF1ZXVlXG4tIChlbXB0eSlcblxuIyMgQWN0aXZlXG4tIChlbXB0eSlcblxuIyMgRG9uZVxuLSAoZW1wdHkpXG5cbj4gTGFzdCBSZXZpZXdlZDogWVlZWS1NTS1ERFxuIiIiLAogICAgQVRMQVNfUk9PVCAvICJDT05WRU5USU9OUy5tZCI6ICIiIiMgQ09OVkVOVElPTlNcblxuIyMgQm91bmRhcmllc1xuXG4jIyMgQWx3YXlzXG4tIEtlZXAgUkVRL1JVTEUvQURSL0NRIGFzIGF1dGhvcml0eTsgZG8gbm90IGF1dG8tZWRpdCB3aXRob3V0IGludGVudC5cbi0gUmVjb3JkIHZlcmlmaWNhdGlvbiBzdGVwcyBpbiBSVU4uXG5cbiMjIyBBc2sgRmlyc3Rcbi0gQWRkIG9yIHJlbW92ZSBkZXBlbmRlbmNpZXMuXG4tIENoYW5nZSBzdG9yYWdlIGxheW91dCB1bmRlciBgLmF0bGFzL2AuXG5cbiMjIyBOZXZlclxuLSBIYXJkY29kZSBzZWNyZXRzLlxuLSBNb2RpZnkgZXhpc3RpbmcgUkVRL1JVTEUvQURSL0NRIHNpbGVudGx5LlxuXG4jIyBSb2xlcyAob25lLWxpbmUpXG4tIFJFUTogd2hhdCB0aGUgc3lzdGVtIG11c3QgZG8gKFNTT1QpLlxuLSBSVUxFOiBjb25zdHJhaW50cyB0aGF0IG11c3QgYWx3YXlzIGhvbGQgKFNTT1QpLlxuLSBBRFI6IGFyY2hpdGVjdHVyYWwgZGVjaXNpb25zIChTU09UKS5cbi0gQ1E6IHF1ZXN0aW9ucyB0aGUgc3lzdGVtIG11c3QgYW5zd2VyLlxuLSBWSUVXOiBodW1hbi1yZWFkYWJsZSBjb250ZXh0LlxuLSBEUkFGVDogb3B0aW9uYWwgaW50YWtlIHNjcmF0Y2hwYWQuXG4tIFJVTjogZXhlY3V0aW9uIHBsYW4gYW5kIGV2aWRlbmNlLlxuXG4jIyBWZXJpZmljYXRpb25cbi0gYHB5dGhvbiBhdGxhcy5weSBkb2N0b3JgXG4tIChwcm9qZWN0IHRlc3RzIGFzIGRlZmluZWQpXG4iIiIsCiAgICBBVExBU19ST09UIC8gIkdPQUxTLm1kIjogIiIiIyBHT0FMU1xuXG4tIFB1cnBvc2U6IChmaWxsIGluKVxuLSBJbiBzY29wZTogKGZpbGwgaW4pXG4tIE91dCBvZiBzY29wZTogKGZpbGwgaW4pXG4iIiIsCn0KCkRFRkFVTFRfVEVNUExBVEVTID0gewogICAgIlJFUS5tZCI6ICIiIiMgW1JFUS1YWFgtMDAxXSBUaXRsZVxuXG4+ICoqSUQqKjogUkVRLVhYWC0wMDFcbj4gKipEb21haW4qKjogWFhYXG4+ICoqU3RhdHVzKio6IERyYWZ0XG4+ICoqTGFzdCBVcGRhdGVkKio6IFlZWVktTU0tRERcbj4gKipJbXBsZW1lbnRlZC1HaXQqKjogLVxuPiAqKkxpbmtlZC1SVU4qKjogLVxuPiAqKk11c3QtUmVhZCoqOiBSVUxFLVhYWC0wMDFcblxuLS0tXG5cbiMjIERlY2lzaW9uXG4tICh3aGF0IG11c3QgYmUgdHJ1ZSlcblxuIyMgSW5wdXRcbi0gKGlucHV0cylcblxuIyMgT3V0cHV0XG4tIChvdXRwdXRzKVxuXG4jIyBBY2NlcHRhbmNlIENyaXRlcmlhXG4tIFsgXSAoY3JpdGVyaWEpXG4iIiIsCiAgICAiUlVMRS5tZCI6ICIiIiMgW1JVTEUtWFhYLTAwMV0gVGl0bGVcblxuPiAqKklEKio6IFJVTEUtWFhYLTAwMVxuPiAqKkRvbWFpbioqOiBYWFhcbj4gKipQcmlvcml0eSoqOiBNZWRpdW1cbj4gKipMYXN0IFVwZGF0ZWQqKjogWVlZWS1NTS1ERFxuPiAqKk11c3QtUmVhZCoqOiBSVUxFLVhYWC0wMDFcblxuLS0tXG5cbiMjIFJ1bGUgU3RhdGVtZW50XG4tIChhbHdheXMgdHJ1ZSAvIGZvcmJpZGRlbilcblxuIyMgU2NvcGVcbi0gKHdoZXJlIGl0IGFwcGxpZXMpXG5cbiMjIFZpb2xhdGlvblxuLSAod2hhdCBjb3VudHMgYXMgYSB2aW9sYXRpb24pXG5cbiMjIEV4YW1wbGVzXG5cbiMjIyBDb3JyZWN0XG4tIChleGFtcGxlKVxuXG4jIyMgSW5jb3JyZWN0XG4tIChleGFtcGxlKVxuIiIiLAogICAgIkNRLm1kIjogIiIiIyBbQ1EtWFhYLTAwMV0gVGl0bGVcblxuPiAqKklEKio6IENRLVhYWC0wMDFcbj4gKipEb21haW4qKjogWFhYXG4+ICoqU3RhdHVzKio6IERyYWZ0XG4+ICoqTGFzdCBVcGRhdGVkKio6IFlZWVktTU0tRERcblxuLS0tXG5cbiMjIFF1ZXN0aW9uXG4tICh3aGF0IG11c3QgdGhlIHN5c3RlbSBhbnN3ZXI/KVxuXG4jIyBFeHBlY3RlZCBBbnN3ZXIgKENyaXRlcmlhKVxuMS4gLi4uXG4yLiAuLi5cblxuIyMgVHJhY2VhYmlsaXR5XG4tICoqU29sdmVzIGJ5Kio6IFtSRVEtWFhYLTAwMV0oLi4vcmVxL1JFUS1YWFgtMDAxLm1kKVxuLSAqKkNvbnN0cmFpbmVkIGJ5Kio6IFtSVUxFLVhYWC0wMDFdKC4uL3J1bGUvUlVMRS1YWFgtMDAxLm1kKVxuIiIiLAogICAgIkJSSUVGLm1kIjogIiIiIyBbQlJJRUYtWFhYLTAwMV0gVGl0bGVcblxuPiAqKklEKio6IEJSSUVGLVhYWC0wMDFcbj4gKipEb21haW4qKjogWFhYXG4+ICoqU3RhdHVzKio6IEFjdGl2ZVxuPiAqKkRhdGUqKjogWVlZWS1NTS1ERFxuXG4jIyAxLiBVc2VyIFJlcXVlc3Rcbi0gKHJhdyB0ZXh0KVxuXG4jIyAyLiBJbnRlbnQgU3VtbWFyeVxuLSBHb2FsOlxuLSBQcm9ibGVtOlxuXG4jIyAzLiBBZmZlY3RlZCBBcnRpZmFjdHNcbi0gQ3JlYXRlOiBcbi0gTW9kaWZ5OiBcbi0gUmVhZDogXG5cbiMjIDQuIFByb3Bvc2VkIENoYW5nZXNcbjEuIFxuMi4gXG5cbiMjIDUuIFZlcmlmaWNhdGlvbiBDcml0ZXJpYVxuLSBbIF0gXG4iIiIsCiAgICAiUlVOLm1kIjogIiIiIyBbUlVOLVJFUS1YWFgtMDAxLXN0ZXAtMDFdIFRpdGxlXG5cbj4gKipJRCoqOiBSVU4tUkVRLVhYWC0wMDEtc3RlcC0wMVxuPiAqKlJFUSoqOiBSRVEtWFhYLTAwMVxuPiAqKlN0YXR1cyoqOiBQbGFubmVkXG4+ICoqU3RhcnRlZCoqOiBZWVlZLU1NLUREXG4+ICoqR2l0Kio6IC1cbj4gKipDb21wbGV0ZWQqKjogLVxuXG4jIyBUYXJnZXQgUkVRXG4tIFJFUS1YWFgtMDAxXG5cbiMjIFBsYW5cbi0gWyBdIFxuXG4jIyBWZXJpZmljYXRpb25cbi0gWyBdIFRlc3Rcbi0gWyBdIFNwZWNcbi0gWyBdIEJvdW5kYXJ5XG5cbiMjIE91dHB1dFxuLSAoZmlsZXMgY3JlYXRlZC9tb2RpZmllZClcbiIiIiwKICAgICJWSUVXLm1kIjogIiIiIyBbVklFVy1SRVEtWFhYLTAwMV0gVGl0bGVcblxuPiAqKlJlZnMqKjogUkVRLVhYWC0wMDFcbj4gKipMYXN0IFVwZGF0ZWQqKjogWVlZWS1NTS1ERFxuXG4jIyBTdW1tYXJ5XG4tIChodW1hbi1yZWFkYWJsZSBzdW1tYXJ5KVxuXG4jIyBSZWZlcmVuY2VzIChTU09UKVxuLSBbUkVRLVhYWC0wMDFdKC4uL3JlcS9SRVEtWFhYLTAwMS5tZClcbiIiIiwKICAgICJBRFIubWQiOiAiIiIjIFtBRFItWFhYLTAwMV0gVGl0bGVcblxuPiAqKklEKio6IEFEUi1YWFgtMDAxXG4+ICoqRG9tYWluKio6IFhYWFxuPiAqKlN0YXR1cyoqOiBEcmFmdFxuPiAqKkRhdGUqKjogWVlZWS1NTS1ERFxuPiAqKlN1cGVyc2VkZXMqKjogLVxuPiAqKlN1cGVyc2VkZWQtQnkqKjogLVxuXG4tLS1cblxuIyMgQ29udGV4dFxuLSAod2h5IHRoaXMgZGVjaXNpb24gaXMgbmVlZGVkKVxuXG4jIyBEZWNpc2lvblxuLSAodGhlIGRlY2lzaW9uKVxuXG4jIyBDb25zZXF1ZW5jZXNcbi0gKHRyYWRlLW9mZnMgYW5kIGZvbGxvdy11cHMpXG5cbiMjIFJlZmVyZW5jZXNcbi0gKFJFUS9SVUxFIGxpbmtzKVxuIiIiLAp9CgpERUZBVUxUX1BST01QVFMgPSB7CiAgICAib25ib2FyZGluZy5tZCI6ICIiIiMgQXRsYXMgQXVkaXQgUHJvbXB0Cgo+ICoqTm90ZSoqOiDquLDsobQgYE9uYm9hcmRpbmcgUHJvbXB0YOqwgCAqKmBBdWRpdCBQcm9tcHRgKirroZwg7J6s7KCV7J2Y65CY7JeI7Iq164uI64ukLgo+IOydtCDtlITroaztlITtirjripQg642UIOydtOyDgSDtjIzsnbzsnYQg7J6Q64+Z7Jy866GcIOyDneyEse2VmOyngCDslYrsnLzrqbAsIO2YhOyerCDtlITroZzsoJ3tirjsmYAg66y47IScIOqwhOydmCAqKuygle2VqeyEsShDb25zaXN0ZW5jeSnsnYQg6rCQ7IKsKEF1ZGl0KSoq7ZWY64qUIOyXre2VoOydhCDsiJjtlontlanri4jri6QuCgotLS0KCiMjIFByb21wdAoKYGBgCuuLueyLoOydgCDsnbQg7ZSE66Gc7KCd7Yq47J2YICoq66y47IScIOygle2VqeyEsSDqsJDsgqzqtIAoQXVkaXRvcikqKuyeheuLiOuLpC4K7J2066+4IOyhtOyerO2VmOuKlCBBdGxhcyDrrLjshJzrk6QoLmF0bGFzLyDtj7TrjZQg64K0IEdPQUxTLCBDT05WRU5USU9OUywgQk9BUkQsIEZST05UKeydtCDtmITsnqwg7ZSE66Gc7KCd7Yq47J2YIOyLpOygnCDsg4Htg5wo7L2U65OcLCDstZzqt7wg7J6R7JeFLCDquLDsiKAg7Iqk7YOdIOuTsSnsmYAg7J287LmY7ZWY64qU7KeAIOygkOqygO2VmOuKlCDqsoPsnbQg7KO8IOyehOustOyeheuLiOuLpC4KCiMjIyBbU3RyaWN0IFJ1bGVzXSDtlbXsi6wg6rec7LmZCjEuICoqUkVBRC1PTkxZKio6IOygiOuMgCwg7Ja065akIOqyveyasOyXkOuPhCDquLDsobQg7YyM7J287J2EIOyngeygkSDsiJjsoJXtlZjqsbDrgpgg64K07Jqp7J2EIOyekOuPmSDsl4XrjbDsnbTtirjtlZjsp4Ag66eI7IS47JqULgoyLiAqKuygnOyViCDrqqjrk5wgKFN1Z2dlc3Rpb24gT25seSkqKjog67aI7J287LmY64KYIOuIhOudveydtCDrsJzqsqzrkJjrqbQgIuyWtOuWu+qyjCDsiJjsoJXtlZjrqbQg7KKL7J2E7KeAIuulvCDsoJzslYgg7ZiV7Iud7Jy866Gc66eMIOy2nOugpe2VmOyEuOyalC4KMy4gKirruYTtjJDsoIEg7Iuc6rCBKio6IOuLqOyInO2eiCDrgrTsmqnsnYQg7JqU7JW97ZWY7KeAIOunkOqzoCwgIuygleunkCDsnbQg64K07Jqp7J20IO2YhOyerCDsnKDtmqjtlZzqsIA/IuulvCDrgYrsnoTsl4bsnbQg7J2Y7Ius7ZWY66mwIOqygOymne2VmOyEuOyalC4KCiMjIyBbQ2hlY2tsaXN0XSDqsoDsgqwg6rSA7KCQCgpMTE3snYAg64uk7J2MIOq4sOykgOyXkCDrlLDrnbwg6rCBIOusuOyEnOulvCDsl4TqsqntlZjqsowg7Y+J6rCA7ZW07JW8IO2VqeuLiOuLpDoKCiMjIyMgMS4gR09BTFMubWQgKOuqqe2RnCDsoJXtlanshLEpCi0gKipBY3RpdmUgVGFza+yZgCDsnbzsuZgg7Jes67aAKio6IO2YhOyerCDsp4Ttlokg7KSR7J24IOyekeyXheuTpOydtCBHT0FMU+yXkCDsoJXsnZjrkJwg7ZW17IusIOuqqe2RnOulvCDrspfslrTrgpjsp4Ag7JWK7JWY64qU6rCAPwotICoqU2NvcGUgQ3JlZXAg6rCQ7KeAKio6IOy1nOq3vCDrhbzsnZjrkJjqsbDrgpgg7LaU6rCA65CcIOq4sOuKpeydtCBJbi1TY29wZSDrspTsnIQg64K07JeQIOyeiOuKlOqwgD8g7JWE64uI66m0IOuylOychOulvCDsobDsmqntnogg64ST7Z6I6rOgIOyeiOuKlOqwgD8KCiMjIyMgMi4gQ09OVkVOVElPTlMubWQgKOq3nOy5mSDtmITsi6TshLEpCi0gKirsnITrsJgg6rCA64ql7ISxIOygkOqygCoqOiDsi6TsoJwg7L2U65Oc64KYIOy1nOq3vCDsu6TrsIsg64K07Jqp7J20IOusuOyEnOydmCDqt5zsuZkoQWx3YXlzLCBOZXZlcinsnYQg7JyE67CY7ZWY6rOgIOyeiOyngCDslYrsnYDqsIA/Ci0gKirqtazssrTshLEg6rKA7KadKio6IOq3nOy5meydtCDrhIjrrLQg7LaU7IOB7KCB7J207Ja07IScKOyYiDogIuq5qOuBl+2VnCDsvZTrk5wg7J6R7ISxIikg7Iuk7KCcIOyngOy5qOydtCDrkJjsp4Ag66q77ZWY64qUIOu2gOu2hOydgCDsl4bripTqsIA/CgojIyMjIDMuIEJPQVJELm1kICjtmITtmakg64+Z6riw7ZmUKQotICoqQWN0aXZlIOyDge2DnCDqsoDspp0qKjogQWN0aXZl7JeQIOyeiOuKlCDsnpHsl4XsnbQg7ZiE7J6sIOyLpOygnOuhnCDsp4Ttlokg7KSR7J246rCAPyAoR09BTFMg67KU7JyE66W8IOuyl+yWtOuCnCDsnpHsl4XsnbQgQWN0aXZl7JeQIOyeiOuKlOqwgD8pCi0gKipRdWV1ZSDrsKnsuZgg7KCQ6rKAKio6IFF1ZXVl7JeQIOyeiOuKlCDtla3rqqnrk6TsnbQg64SI66y0IOyYpOuemCDrsKnsuZjrkJjslrQsIO2YhOyerOydmCBHT0FMU+yZgCDrp57sp4Ag7JWK6rKMIOuQmOyXiOuKlOqwgD8KCiMjIyMgNC4gRlJPTlQubWQgKO2ZmOqyvSDstZzsi6DtmZQpCi0gKirquLDsiKAg7Iqk7YOdIO2YhOyLpO2ZlCoqOiDrrLjshJzsl5Ag7KCB7Z6MIOq4sOyIoCDsiqTtg53snbQg7Iuk7KCcIO2UhOuhnOygne2KuCDsvZTrk5zsmYAg7J287LmY7ZWY64qU6rCAPwotICoq7JWU66y17KCBIOyghOygnCoqOiDtjIAg64K07JeQ7IScIOyVlOusteyggeycvOuhnCDtlansnZjrkJwg7KSR7JqU7ZWcIOuzgOqyvSDsgqztla3snbQg66y47ISc7JeQ7IScIOuIhOudveuQmOyngCDslYrslZjripTqsIA/CgotLS0KCiMjIyBbQXVkaXQgUmVwb3J0XSDstpzroKUg7JaR7IudCgrqsIEg7YyM7J2867OE66GcIOyVhOuemCDsg4Htg5wg7JWE7J207L2Y7J2EIOyCrOyaqe2VmOyXrCDsp4Tri6gg6rKw6rO866W8IOy2nOugpe2VmOyEuOyalC4KCi0gW1BBU1NdICoq7J287LmYIChQYXNzKSoqCi0gW1dBUk5dICoq7J2Y7IusIChXYXJuaW5nKSoqOiDtmZXsnbjsnbQg7ZWE7JqU7ZWY6rGw64KYIOuqqO2YuO2VnCDrtoDrtoQuCi0gW0ZBSUxdICoq67aI7J287LmYL+uIhOudvSAoRmFpbCkqKjog66qF7ZmV7ZWcIOyYpOulmCwg7KaJ7IucIOyImOyglSDtlYTsmpQuCgoqKlvsnpHshLEg7JiI7IucXSoqCgojIyMgMS4gR09BTFMubWQKLSBbUEFTU10g7ZW17IusIOuqqe2RnCDsl6zsoITtnogg7Jyg7Zqo7ZWoLgotIFtXQVJOXSAqKuydmOyLrCoqOiAn7Iuk7Iuc6rCEIOyxhO2MhScg6riw64ql7J20IOy1nOq3vCDsnpHsl4UoVGFzay0xMDIp7JeQ7IScIOq1rO2YhCDspJHsnbjrjbAsIEdPQUxT7J2YIFNjb3Bl7JeQ64qUIOuqheyLnOuQmOyngCDslYrslZjsnYwuIOyXheuNsOydtO2KuCDtlYTsmpQuCgojIyMgMi4gQ09OVkVOVElPTlMubWQKLSBbRkFJTF0gKirrtojsnbzsuZgqKjog66y47ISc7JeQ64qUICdUeXBlIEhpbnQg7ZWE7IiYJ+udvOqzoCDrkJjslrQg7J6I7Jy864KYLCDstZzqt7wgYHV0aWxzLnB5YCDrk7Hsl5DshJwg66eO7J2AIO2VqOyImOqwgCDtg4DsnbTtlZEg7JeG7J20IOyekeyEseuQqC4KICAgIC0gKirsoJzslYgqKjog6rec7LmZ7J2EIOqwle2ZlO2VmOqxsOuCmCwg7JiI7Jm4IOyDge2ZqeydhCDrrLjshJzsl5Ag66qF7Iuc7ZWgIOqygy4KCijsnbTtlZggQk9BUkQsIEZST05UIOuPmeydvCDtj6zrp7cpClxuClxuLS0tClxuClxuIyMjIPCfmoAgW1JlY29tbWVuZGVkIEFjdGlvbnNdIOydtO2bhCDsp4Ttlokg6rCA7J2065OcClxuClxu6rCQ7IKsIOqysOqzvOulvCDrsJTtg5XsnLzroZwg7IKs7Jqp7J6Q6rCAIOy3qO2VtOyVvCDtlaAg6rWs7LK07KCB7J24IO2WieuPmeydhCDsoJzslYjtlZjshLjsmpQuClxuClxuMS4gKirsirnsnbgg7ZWE7JqUIChOZWVkcyBBcHByb3ZhbCkqKjog4pqg77iPL+KdjCDtla3rqqkg7KSRLCDsgqzsmqnsnpDsnZgg7ZmV7J247J20IO2VhOyalO2VnCDsoJXssYXsoIEg6rKw7KCVIOyCrO2VrS4KXG4yLiAqKuyImOyglSDsoJzslYggKEVkaXRzKSoqOiDsponsi5wg66y47ISc66W8IOyImOygle2VtOyVvCDtlZjripQg7IKs7ZWtICjqtazssrTsoIHsnbgg66y46rWsIOygnOyViCDtj6ztlagpLgpcbjMuICoq7IOI66Gc7Jq0IO2DnOyKpO2BrCAoTmV3IFRhc2tzKSoqOiDrrLjshJwg7KCV7ZWp7ISx7J2EIOychO2VtCDsg4jroZwg65Ox66Gd7ZW07JW8IO2VoCDsnpHsl4UgKOyYiDogIuuhnOq3uCDsi5zsiqTthZwg66as7Yyp7Yag66eBIOyKpO2OmSDrrLjshJwg7J6R7ISxIikuClxuClxuKipb7J6R7ISxIOyYiOyLnF0qKgpcbiMjIyDwn5qAIOydtO2bhCDsp4Ttlokg6rCA7J2065OcClxuMS4gKipDT05WRU5USU9OUy5tZCDsl4XrjbDsnbTtirgqKjogYFR5cGUgSGludGAg6rec7LmZ7J2EIGBTdHJpY3Rg7JeQ7IScIGBPcHRpb25hbGDroZwg7JmE7ZmU7ZWY64qUIOusuOq1rOuhnCDsiJjsoJXtlaAg6rKD7J2EIOygnOyViO2VqeuLiOuLpC4KXG4yLiAqKkdPQUxTLm1kIOqygO2GoCoqOiAn7Iuk7Iuc6rCEIOyxhO2MhScg6riw64ql7J20IEluLVNjb3Bl7J247KeAIFBN6rO8IO2YkeydmCDtm4QgU2NvcGUg7IS57IWYIOyXheuNsOydtO2KuCDtlYTsmpQuClxuYGBgClxuCgotLS0KCiMjIEhvdyB0byBleGVjdXRlCuydtCDtlITroaztlITtirjripQg7KCV6riw7KCB7Jy866GcKOuYkOuKlCDtlITroZzsoJ3tirgg67Cp7Zal7ISx7J20IO2dlOuTpOumtCDrlYwpIExMTeyXkOqyjCDsoJzsi5ztlZjsl6wg66y47IScIOu2gOyxhOulvCDsoJDqsoDtlZjripQg7Jqp64+E66GcIOyCrOyaqe2VqeuLiOuLpC4KIiIiLAp9CgoKZGVmIGdldF92ZXJzaW9uKCkgLT4gc3RyOgogICAgIiIiUmVhZCB2ZXJzaW9uIGZyb20gVkVSU0lPTiBmaWxlIChTU09UKS4iIiIKICAgIGlmIFZFUlNJT05fUEFUSC5leGlzdHMoKToKICAgICAgICByZXR1cm4gVkVSU0lPTl9QQVRILnJlYWRfdGV4dChlbmNvZGluZz0idXRmLTgiKS5zdHJpcCgpCiAgICByZXR1cm4gInVua25vd24iCgoKZGVmIG5vd19kYXRlKCkgLT4gc3RyOgogICAgcmV0dXJuIGRhdGV0aW1lLm5vdygpLnN0cmZ0aW1lKCIlWS0lbS0lZCIpCgoKZGVmIG5vd19pc28oKSAtPiBzdHI6CiAgICByZXR1cm4gZGF0ZXRpbWUubm93KCkuaXNvZm9ybWF0KHRpbWVzcGVjPSJzZWNvbmRzIikKCgpkZWYgZW5zdXJlX2RpcihwYXRoOiBQYXRoKSAtPiBOb25lOgogICAgcGF0aC5ta2RpcihwYXJlbnRzPVRydWUsIGV4aXN0X29rPVRydWUpCgoKZGVmIHJlYWRfdGV4dChwYXRoOiBQYXRoKSAtPiBzdHI6CiAgICByZXR1cm4gcGF0aC5yZWFkX3RleHQoZW5jb2Rpbmc9InV0Zi04IikKCgpkZWYgd3JpdGVfdGV4dChwYXRoOiBQYXRoLCBjb250ZW50OiBzdHIpIC0+IE5vbmU6CiAgICBwYXRoLndyaXRlX3RleHQoY29udGVudCwgZW5jb2Rpbmc9InV0Zi04IikKCgpkZWYgbG9hZF9kZWZhdWx0X3RvcF9kb2NzKCkgLT4gZGljdFtQYXRoLCBzdHJdOgogICAgZG9jcyA9IGRpY3QoREVGQVVMVF9UT1BfRE9DUykKICAgIGlmIFNSQ19ERUZBVUxUX1RPUF9ET0NTX0RJUi5pc19kaXIoKToKICAgICAgICBmb3IgcGF0aCBpbiBzb3J0ZWQoU1JDX0RFRkFVTFRfVE9QX0RPQ1NfRElSLmdsb2IoIioubWQiKSk6CiAgICAgICAgICAgIHRhcmdldCA9IEFUTEFTX1JPT1QgLyBwYXRoLm5hbWUKICAgICAgICAgICAgaWYgdGFyZ2V0IGluIGRvY3M6CiAgICAgICAgICAgICAgICBkb2NzW3RhcmdldF0gPSByZWFkX3RleHQocGF0aCkKICAgIHJldHVybiBkb2NzCgoKZGVmIGxvYWRfZGVmYXVsdF90ZW1wbGF0ZXMoKSAtPiBkaWN0W3N0ciwgc3RyXToKICAgIHRlbXBsYXRlcyA9IGRpY3QoREVGQVVMVF9URU1QTEFURVMpCiAgICBpZiBTUkNfREVGQVVMVF9URU1QTEFURVNfRElSLmlzX2RpcigpOgogICAgICAgIGZvciBuYW1lIGluIERFRkFVTFRfVEVNUExBVEVTOgogICAgICAgICAgICBzcmNfcGF0aCA9IFNSQ19ERUZBVUxUX1RFTVBMQVRFU19ESVIgLyBuYW1lCiAgICAgICAgICAgIGlmIHNyY19wYXRoLmV4aXN0cygpOgogICAgICAgICAgICAgICAgdGVtcGxhdGVzW25hbWVdID0gcmVhZF90ZXh0KHNyY19wYXRoKQogICAgcmV0dXJuIHRlbXBsYXRlcwoKCmRlZiBsb2FkX2RlZmF1bHRfcHJvbXB0cygpIC0+IGRpY3Rbc3RyLCBzdHJdOgogICAgcHJvbXB0cyA9IGRpY3QoREVGQVVMVF9QUk9NUFRTKQogICAgaWYgU1JDX0RFRkFVTFRfUFJPTVBUU19ESVIuaXNfZGlyKCk6CiAgICAgICAgZm9yIG5hbWUgaW4gREVGQVVMVF9QUk9NUFRTOgogICAgICAgICAgICBzcmNfcGF0aCA9IFNSQ19ERUZBVUxUX1BST01QVFNfRElSIC8gbmFtZQogICAgICAgICAgICBpZiBzcmNfcGF0aC5leGlzdHMoKToKICAgICAgICAgICAgICAgIHByb21wdHNbbmFtZV0gPSByZWFkX3RleHQoc3JjX3BhdGgpCiAgICByZXR1cm4gcHJvbXB0cwoKCmRlZiBsb2FkX2RlZmF1bHRfc3lzdGVtX2ZpbGVzKCkgLT4gZGljdFtzdHIsIHN0cl06CiAgICAiIiJMb2FkIFZFUlNJT04gYW5kIFZFUlNJT05JTkcubWQgZnJvbSBzcmMvLnN5c3RlbV9kZWZhdWx0cy8uIiIiCiAgICBmaWxlczogZGljdFtzdHIsIHN0cl0gPSB7fQogICAgZm9yIG5hbWUgaW4gWyJWRVJTSU9OIiwgIlZFUlNJT05JTkcubWQiLCAiQ0hBTkdFTE9HLm1kIl06CiAgICAgICAgc3JjX3BhdGggPSBTUkNfREVGQVVMVFNfUk9PVCAvIG5hbWUKICAgICAgICBpZiBzcmNfcGF0aC5leGlzdHMoKToKICAgICAgICAgICAgZmlsZXNbbmFtZV0gPSByZWFkX3RleHQoc3JjX3BhdGgpCiAgICByZXR1cm4gZmlsZXMKCgpkZWYgbG9hZF9kZWZhdWx0X3NyY19maWxlcygpIC0+IGRpY3Rbc3RyLCBzdHJdOgogICAgIiIiTG9hZCBzb3VyY2UgZmlsZXMgLSBlaXRoZXIgZnJvbSBkZWZhdWx0cyBkaXIgb3IgZW1iZWRkZWQgaW4gYXRsYXMucHkuIiIiCiAgICBpbXBvcnQgYmFzZTY0CiAgICBmaWxlczogZGljdFtzdHIsIHN0cl0gPSB7fQogICAgCiAgICAjIFRyeSBsb2FkaW5nIGZyb20gc3JjLy5zeXN0ZW1fZGVmYXVsdHMvc3JjLyBmaXJzdCAoZGV2ZWxvcG1lbnQgbW9kZSkKICAgIHNyY19kaXIgPSBTUkNfREVGQVVMVFNfUk9PVCAvICJzcmMiCiAgICBpZiBzcmNfZGlyLmlzX2RpcigpOgogICAgICAgIGZvciBwYXRoIGluIHNyY19kaXIuZ2xvYigiKi5weSIpOgogICAgICAgICAgICBmaWxlc1twYXRoLm5hbWVdID0gcmVhZF90ZXh0KHBhdGgpCiAgICAKICAgICMgSWYgbm8gZmlsZXMgZm91bmQsIHRyeSBlbWJlZGRlZCBzb3VyY2UgKGRpc3RyaWJ1dGlvbiBtb2RlKQogICAgaWYgbm90IGZpbGVzIGFuZCBFTUJFRERFRF9TUkNfQjY0ICE9ICJfX0VNQkVEREVEX1NSQ19QTEFDRUhPTERFUl9fIjoKICAgICAgICB0cnk6CiAgICAgICAgICAgIGRlY29kZWQgPSBiYXNlNjQuYjY0ZGVjb2RlKEVNQkVEREVEX1NSQ19CNjQpLmRlY29kZSgidXRmLTgiKQogICAgICAgICAgICBmaWxlc1siYXRsYXNfY2xpLnB5Il0gPSBkZWNvZGVkCiAgICAgICAgZXhjZXB0IEV4Y2VwdGlvbjoKICAgICAgICAgICAgcGFzcwogICAgCiAgICByZXR1cm4gZmlsZXMKCgpkZWYgbG9hZF90ZW1wbGF0ZShuYW1lOiBzdHIpIC0+IHN0cjoKICAgIHRlbXBsYXRlX3BhdGggPSBURU1QTEFURVNfRElSIC8gbmFtZQogICAgaWYgbm90IHRlbXBsYXRlX3BhdGguZXhpc3RzKCk6CiAgICAgICAgcmFpc2UgRmlsZU5vdEZvdW5kRXJyb3IoZiJNaXNzaW5nIHRlbXBsYXRlOiB7dGVtcGxhdGVfcGF0aH0iKQogICAgcmV0dXJuIHJlYWRfdGV4dCh0ZW1wbGF0ZV9wYXRoKQoKCmRlZiBpdGVyX21kX2ZpbGVzKGRpcnM6IEl0ZXJhYmxlW1BhdGhdKSAtPiBsaXN0W1BhdGhdOgogICAgZmlsZXM6IGxpc3RbUGF0aF0gPSBbXQogICAgZm9yIGJhc2UgaW4gZGlyczoKICAgICAgICBpZiBub3QgYmFzZS5pc19kaXIoKToKICAgICAgICAgICAgY29udGludWUKICAgICAgICBmb3IgcGF0aCBpbiBiYXNlLnJnbG9iKCIqLm1kIik6CiAgICAgICAgICAgIGZpbGVzLmFwcGVuZChwYXRoKQogICAgcmV0dXJuIGZpbGVzCgoKZGVmIGV4dHJhY3RfbWV0YSh0ZXh0OiBzdHIpIC0+IGRpY3Rbc3RyLCBzdHJdOgogICAgbWV0YTogZGljdFtzdHIsIHN0cl0gPSB7fQogICAgaGVhZCA9ICJcbiIuam9pbih0ZXh0LnNwbGl0bGluZXMoKVs6NjBdKQogICAgZm9yIGxpbmUgaW4gaGVhZC5zcGxpdGxpbmVzKCk6CiAgICAgICAgbWF0Y2ggPSBNRVRBX1JFLm1hdGNoKGxpbmUuc3RyaXAoKSkKICAgICAgICBpZiBtYXRjaDoKICAgICAgICAgICAgbWV0YVttYXRjaC5ncm91cCgxKS5zdHJpcCgpXSA9IG1hdGNoLmdyb3VwKDIpLnN0cmlwKCkKICAgIHJldHVybiBtZXRhCgoKZGVmIGV4dHJhY3RfaGVhZGVyX2lkKHRleHQ6IHN0cikgLT4gT3B0aW9uYWxbc3RyXToKICAgIG1hdGNoID0gSEVBREVSX0lEX1JFLnNlYXJjaCh0ZXh0KQogICAgcmV0dXJuIG1hdGNoLmdyb3VwKDEpLnN0cmlwKCkgaWYgbWF0Y2ggZWxzZSBOb25lCgoKZGVmIHBhcnNlX211c3RfcmVhZCh2YWx1ZTogc3RyKSAtPiBsaXN0W3N0cl06CiAgICByYXcgPSB2YWx1ZS5zdHJpcCgpCiAgICBpZiByYXcubG93ZXIoKSA9PSAibm9uZSI6CiAgICAgICAgcmV0dXJuIFtdCiAgICB0b2tlbnMgPSBbdC5zdHJpcCgpIGZvciB0IGluIHJhdy5zcGxpdCgiLCIpIGlmIHQuc3RyaXAoKV0KICAgIGlkczogbGlzdFtzdHJdID0gW10KICAgIGZvciB0b2tlbiBpbiB0b2tlbnM6CiAgICAgICAgaWYgdG9rZW4uc3RhcnRzd2l0aCgiWyIpIGFuZCAiXSIgaW4gdG9rZW4gYW5kICIoIiBpbiB0b2tlbjoKICAgICAgICAgICAgdG9rZW4gPSB0b2tlblsxIDogdG9rZW4uaW5kZXgoIl0iKV0uc3RyaXAoKQogICAgICAgIGlmIHRva2VuOgogICAgICAgICAgICBpZHMuYXBwZW5kKHRva2VuKQogICAgcmV0dXJuIGlkcwoKCmRlZiBuZXh0X2lkKHByZWZpeDogc3RyLCBkb21haW46IHN0ciwgZGlyX3BhdGg6IFBhdGgsIHBhdHRlcm46IHJlLlBhdHRlcm4pIC0+IHN0cjoKICAgIG1heF9uID0gMAogICAgaWYgZGlyX3BhdGguZXhpc3RzKCk6CiAgICAgICAgZm9yIHBhdGggaW4gZGlyX3BhdGguZ2xvYihmIntwcmVmaXh9LXtkb21haW59LSoubWQiKToKICAgICAgICAgICAgbWF0Y2ggPSBwYXR0ZXJuLm1hdGNoKHBhdGguc3RlbSkKICAgICAgICAgICAgaWYgbWF0Y2g6CiAgICAgICAgICAgICAgICBudW0gPSBpbnQobWF0Y2guZ3JvdXAoMikpCiAgICAgICAgICAgICAgICBpZiBudW0gPiBtYXhfbjoKICAgICAgICAgICAgICAgICAgICBtYXhfbiA9IG51bQogICAgcmV0dXJuIGYie3ByZWZpeH0te2RvbWFpbn0te21heF9uICsgMTowM2R9IgoKCmRlZiBuZXh0X3J1bl9zdGVwKHJlcV9pZDogc3RyKSAtPiBpbnQ6CiAgICBtYXRjaCA9IFJFUV9JRF9QQVRURVJOLm1hdGNoKHJlcV9pZCkKICAgIGlmIG5vdCBtYXRjaDoKICAgICAgICByZXR1cm4gMQogICAgZG9tYWluID0gbWF0Y2guZ3JvdXAoMSkKICAgIG51bWJlciA9IG1hdGNoLmdyb3VwKDIpCiAgICBtYXhfc3RlcCA9IDAKICAgIGlmIFJVTl9ESVIuZXhpc3RzKCk6CiAgICAgICAgZm9yIHBhdGggaW4gUlVOX0RJUi5nbG9iKGYiUlVOLVJFUS17ZG9tYWlufS17bnVtYmVyfS1zdGVwLSoubWQiKToKICAgICAgICAgICAgcnVuX21hdGNoID0gUlVOX0lEX1BBVFRFUk4ubWF0Y2gocGF0aC5zdGVtKQogICAgICAgICAgICBpZiBydW5fbWF0Y2ggYW5kIHJ1bl9tYXRjaC5ncm91cCgxKSA9PSAiUkVRIjoKICAgICAgICAgICAgICAgIHN0ZXAgPSBpbnQocnVuX21hdGNoLmdyb3VwKDQpKQogICAgICAgICAgICAgICAgaWYgc3RlcCA+IG1heF9zdGVwOgogICAgICAgICAgICAgICAgICAgIG1heF9zdGVwID0gc3RlcAogICAgcmV0dXJuIG1heF9zdGVwICsgMQoKCmRlZiB1cGRhdGVfbWV0YV9saW5lKHRleHQ6IHN0ciwga2V5OiBzdHIsIHZhbHVlOiBzdHIpIC0+IHN0cjoKICAgIGxpbmVzID0gdGV4dC5zcGxpdGxpbmVzKCkKICAgIHVwZGF0ZWQgPSBGYWxzZQogICAgZm9yIGksIGxpbmUgaW4gZW51bWVyYXRlKGxpbmVzKToKICAgICAgICBpZiBsaW5lLnN0YXJ0c3dpdGgoIj4gKioiKSBhbmQgbGluZS5zcGxpdCgiKioiLCAyKVsxXS5zdHJpcCgpID09IGtleToKICAgICAgICAgICAgbGluZXNbaV0gPSBmIj4gKip7a2V5fSoqOiB7dmFsdWV9IgogICAgICAgICAgICB1cGRhdGVkID0gVHJ1ZQogICAgICAgICAgICBicmVhawogICAgaWYgbm90IHVwZGF0ZWQ6CiAgICAgICAgaW5zZXJ0X2F0ID0gMSBpZiBsaW5lcyBlbHNlIDAKICAgICAgICBsaW5lcy5pbnNlcnQoaW5zZXJ0X2F0LCBmIj4gKip7a2V5fSoqOiB7dmFsdWV9IikKICAgIHJldHVybiAiXG4iLmpvaW4obGluZXMpICsgIlxuIgoKCmRlZiBub3JtYWxpemVfc3RhdHVzKHZhbHVlOiBzdHIpIC0+IHN0cjoKICAgIHJldHVybiB2YWx1ZS5zdHJpcCgpLmxvd2VyKCkKCgpkZWYgcGFyc2VfY29tcGxldGVkX2RhdGUodmFsdWU6IE9wdGlvbmFsW3N0cl0pIC0+IE9wdGlvbmFsW2RhdGV0aW1lXToKICAgIGlmIG5vdCB2YWx1ZToKICAgICAgICByZXR1cm4gTm9uZQogICAgcmF3ID0gdmFsdWUuc3RyaXAoKQogICAgaWYgcmF3ID09ICItIjoKICAgICAgICByZXR1cm4gTm9uZQogICAgdHJ5OgogICAgICAgIHJldHVybiBkYXRldGltZS5zdHJwdGltZShyYXcsICIlWS0lbS0lZCIpCiAgICBleGNlcHQgVmFsdWVFcnJvcjoKICAgICAgICByZXR1cm4gTm9uZQoKCmRlZiBwYXJzZV9hZmZlY3RlZF9hcnRpZmFjdHModGV4dDogc3RyKSAtPiBkaWN0W3N0ciwgbGlzdFtzdHJdXToKICAgIGFydGlmYWN0cyA9IHsiQ3JlYXRlIjogW10sICJNb2RpZnkiOiBbXSwgIlJlYWQiOiBbXX0KICAgIGZvciBsaW5lIGluIHRleHQuc3BsaXRsaW5lcygpOgogICAgICAgIGxpbmUgPSBsaW5lLnN0cmlwKCkKICAgICAgICBmb3Iga2V5IGluIGFydGlmYWN0cy5rZXlzKCk6CiAgICAgICAgICAgIHByZWZpeCA9IGYiLSB7a2V5fToiCiAgICAgICAgICAgIGlmIGxpbmUuc3RhcnRzd2l0aChwcmVmaXgpOgogICAgICAgICAgICAgICAgcmVtYWluZGVyID0gbGluZVtsZW4ocHJlZml4KSA6XS5zdHJpcCgpCiAgICAgICAgICAgICAgICBpZiByZW1haW5kZXI6CiAgICAgICAgICAgICAgICAgICAgcGFydHMgPSBbcC5zdHJpcCgpIGZvciBwIGluIHJlbWFpbmRlci5zcGxpdCgiLCIpIGlmIHAuc3RyaXAoKV0KICAgICAgICAgICAgICAgICAgICBhcnRpZmFjdHNba2V5XS5leHRlbmQocGFydHMpCiAgICByZXR1cm4gYXJ0aWZhY3RzCgoKZGVmIHVwZGF0ZV9icmllZl9zdGF0dXMoYnJpZWZfaWQ6IHN0ciwgc3RhdHVzOiBzdHIpIC0+IGJvb2w6CiAgICBpZiBub3QgQlJJRUZfSURfUEFUVEVSTi5tYXRjaChicmllZl9pZCk6CiAgICAgICAgcHJpbnQoZiJbV0FSTl0gSW52YWxpZCBCUklFRiBJRCBpbiBSVU4gbWV0YToge2JyaWVmX2lkfSIpCiAgICAgICAgcmV0dXJuIEZhbHNlCiAgICBicmllZl9wYXRoID0gQlJJRUZfRElSIC8gZiJ7YnJpZWZfaWR9Lm1kIgogICAgaWYgbm90IGJyaWVmX3BhdGguZXhpc3RzKCk6CiAgICAgICAgcHJpbnQoZiJbV0FSTl0gQlJJRUYgbm90IGZvdW5kIGZvciBSVU46IHticmllZl9wYXRofSIpCiAgICAgICAgcmV0dXJuIEZhbHNlCiAgICBicmllZl90ZXh0ID0gcmVhZF90ZXh0KGJyaWVmX3BhdGgpCiAgICBicmllZl90ZXh0ID0gdXBkYXRlX21ldGFfbGluZShicmllZl90ZXh0LCAiU3RhdHVzIiwgc3RhdHVzKQogICAgd3JpdGVfdGV4dChicmllZl9wYXRoLCBicmllZl90ZXh0KQogICAgcHJpbnQoZiJbT0tdIFVwZGF0ZWQge2JyaWVmX3BhdGh9IikKICAgIHJldHVybiBUcnVlCgoKZGVmIGV4dHJhY3RfaWRzX2Zyb21fdGV4dCh0ZXh0OiBzdHIpIC0+IGxpc3Rbc3RyXToKICAgIHJldHVybiByZS5maW5kYWxsKHIiKD86UkVRfFJVTEV8QURSfENRfEJSSUVGfFJVTiktW0EtWl0rLVxkezN9KD86LXN0ZXAtXGR7Mn0pPyIsIHRleHQpCgoKZGVmIGRlcml2ZV90aXRsZSh0ZXh0OiBzdHIsIGZhbGxiYWNrOiBzdHIgPSAiVXNlciBSZXF1ZXN0IikgLT4gc3RyOgogICAgdGl0bGVfc3JjID0gIiAiLmpvaW4odGV4dC5zdHJpcCgpLnNwbGl0bGluZXMoKSkuc3RyaXAoKQogICAgaWYgbm90IHRpdGxlX3NyYzoKICAgICAgICByZXR1cm4gZmFsbGJhY2sKICAgIHJldHVybiB0aXRsZV9zcmNbOjYwXSArICgiLi4uIiBpZiBsZW4odGl0bGVfc3JjKSA+IDYwIGVsc2UgIiIpCgoKZGVmIGlzX3JlbGF0aXZlX3RvKHBhdGg6IFBhdGgsIGJhc2U6IFBhdGgpIC0+IGJvb2w6CiAgICB0cnk6CiAgICAgICAgcGF0aC5yZWxhdGl2ZV90byhiYXNlKQogICAgICAgIHJldHVybiBUcnVlCiAgICBleGNlcHQgVmFsdWVFcnJvcjoKICAgICAgICByZXR1cm4gRmFsc2UKCgpkZWYgcmVxX2lkX2Zyb21fcnVuX2lkKHJ1bl9pZDogc3RyKSAtPiBPcHRpb25hbFtzdHJdOgogICAgbWF0Y2ggPSBSVU5fSURfUEFUVEVSTi5tYXRjaChydW5faWQpCiAgICBpZiBub3QgbWF0Y2g6CiAgICAgICAgcmV0dXJuIE5vbmUKICAgIGtpbmQsIGRvbWFpbiwgbnVtYmVyLCBfc3RlcCA9IG1hdGNoLmdyb3VwcygpCiAgICBpZiBraW5kICE9ICJSRVEiOgogICAgICAgIHJldHVybiBOb25lCiAgICByZXR1cm4gZiJSRVEte2RvbWFpbn0te251bWJlcn0iCgoKZGVmIGRldGVjdF9naXRfaGFzaCgpIC0+IE9wdGlvbmFsW3N0cl06CiAgICB0cnk6CiAgICAgICAgcmVzdWx0ID0gc3VicHJvY2Vzcy5ydW4oCiAgICAgICAgICAgIFsiZ2l0IiwgInJldi1wYXJzZSIsICJIRUFEIl0sCiAgICAgICAgICAgIGNhcHR1cmVfb3V0cHV0PVRydWUsCiAgICAgICAgICAgIHRleHQ9VHJ1ZSwKICAgICAgICAgICAgY2hlY2s9VHJ1ZSwKICAgICAgICApCiAgICBleGNlcHQgRXhjZXB0aW9uOgogICAgICAgIHJldHVybiBOb25lCiAgICB2YWx1ZSA9IHJlc3VsdC5zdGRvdXQuc3RyaXAoKQogICAgcmV0dXJuIHZhbHVlIGlmIHZhbHVlIGVsc2UgTm9uZQoKCmRlZiB3cml0ZV9sYXN0X3J1bihzdGF0ZTogZGljdCkgLT4gTm9uZToKICAgIGVuc3VyZV9kaXIoU1RBVEVfRElSKQogICAgd3JpdGVfdGV4dChMQVNUX1JVTl9QQVRILCBqc29uLmR1bXBzKHN0YXRlLCBpbmRlbnQ9MikgKyAiXG4iKQoKCiMgPT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT0KIyBTeW5jIHV0aWxpdGllcwojID09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09PT09CgpkZWYgcGFyc2VfY2hlY2tib3hlcyh0ZXh0OiBzdHIpIC0+IGxpc3RbdHVwbGVbaW50LCBib29sLCBzdHJdXToKICAgICIiIlBhcnNlIGNoZWNrYm94ZXMgZnJvbSB0ZXh0LiBSZXR1cm5zIGxpc3Qgb2YgKGxpbmVfbnVtLCBpc19jaGVja2VkLCBjb250ZW50KS4iIiIKICAgIHJlc3VsdHMgPSBbXQogICAgZm9yIGksIGxpbmUgaW4gZW51bWVyYXRlKHRleHQuc3BsaXRsaW5lcygpKToKICAgICAgICBpZiBDSEVDS0JPWF9DSEVDS0VELm1hdGNoKGxpbmUpOgogICAgICAgICAgICBtYXRjaCA9IENIRUNLQk9YX0NIRUNLRUQubWF0Y2gobGluZSkKICAgICAgICAgICAgcmVzdWx0cy5hcHBlbmQoKGksIFRydWUsIG1hdGNoLmdyb3VwKDIpLnN0cmlwKCkpKQogICAgICAgIGVsaWYgQ0hFQ0tCT1hfVU5DSEVDS0VELm1hdGNoKGxpbmUpOgogICAgICAgICAgICBtYXRjaCA9IENIRUNLQk9YX1VOQ0hFQ0tFRC5tYXRjaChsaW5lKQogICAgICAgICAgICByZXN1bHRzLmFwcGVuZCgoaSwgRmFsc2UsIG1hdGNoLmdyb3VwKDIpLnN0cmlwKCkpKQogICAgcmV0dXJuIHJlc3VsdHMKCgpkZWYgcGFyc2VfdHJhY2VhYmlsaXR5KHRleHQ6IHN0cikgLT4gZGljdFtzdHIsIHR1cGxlW3N0ciwgc3RyXV06CiAgICAiIiJQYXJzZSB0cmFjZWFiaWxpdHkgbGlua3MuIFJldHVybnMge2xpbmtfdHlwZTogKGlkLCBwYXRoKX0uIiIiCiAgICByZXN1bHRzID0ge30KICAgIGZvciBtYXRjaCBpbiBUUkFDRUFCSUxJVFlfTElOS19SRS5maW5kaXRlcih0ZXh0KToKICAgICAgICBsaW5rX2lkID0gbWF0Y2guZ3JvdXAoMSkuc3RyaXAoKQogICAgICAgIGxpbmtfcGF0aCA9IG1hdGNoLmdyb3VwKDIpLnN0cmlwKCkKICAgICAgICAjIERldGVybWluZSBsaW5rIHR5cGUgZnJvbSBjb250ZXh0CiAgICAgICAgZnVsbF9tYXRjaCA9IG1hdGNoLmdyb3VwKDApCiAgICAgICAgaWYgIkltcGxlbWVudHMiIGluIGZ1bGxfbWF0Y2g6CiAgICAgICAgICAgIHJlc3VsdHNbIkltcGxlbWVudHMiXSA9IChsaW5rX2lkLCBsaW5rX3BhdGgpCiAgICAgICAgZWxpZiAiQW5zd2VycyIgaW4gZnVsbF9tYXRjaDoKICAgICAgICAgICAgcmVzdWx0c1siQW5zd2VycyJdID0gKGxpbmtfaWQsIGxpbmtfcGF0aCkKICAgICAgICBlbGlmICJTb2x2ZWQgYnkiIGluIGZ1bGxfbWF0Y2g6CiAgICAgICAgICAgIHJlc3VsdHNbIlNvbHZlZCBieSJdID0gKGxpbmtfaWQsIGxpbmtfcGF0aCkKICAgICAgICBlbGlmICJJbXBsZW1lbnRlZCBieSIgaW4gZnVsbF9tYXRjaDoKICAgICAgICAgICAgcmVzdWx0c1siSW1wbGVtZW50ZWQgYnkiXSA9IChsaW5rX2lkLCBsaW5rX3BhdGgpCiAgICByZXR1cm4gcmVzdWx0cwoKCmRlZiByZXNvbHZlX2xpbmtlZF9kb2NzKHJ1bl9wYXRoOiBQYXRoKSAtPiBkaWN0W3N0ciwgUGF0aF06CiAgICAiIiJSZXNvbHZlIFJVTiAtPiBCUklFRiAtPiBSRVEgY2hhaW4uIFJldHVybnMge2RvY190eXBlOiBwYXRofS4iIiIKICAgIGRvY3MgPSB7fQogICAgdGV4dCA9IHJlYWRfdGV4dChydW5fcGF0aCkKICAgIG1ldGEgPSBleHRyYWN0X21ldGEodGV4dCkKCiAgICAjIFJVTiAtPiBSRVEgKGRpcmVjdCkKICAgIHJlcV9pZCA9IG1ldGEuZ2V0KCJSRVEiKSBvciByZXFfaWRfZnJvbV9ydW5faWQocnVuX3BhdGguc3RlbSkKICAgIGlmIHJlcV9pZCBhbmQgUkVRX0lEX1BBVFRFUk4ubWF0Y2gocmVxX2lkKToKICAgICAgICByZXFfcGF0aCA9IFJFUV9ESVIgLyBmIntyZXFfaWR9Lm1kIgogICAgICAgIGlmIHJlcV9wYXRoLmV4aXN0cygpOgogICAgICAgICAgICBkb2NzWyJSRVEiXSA9IHJlcV9wYXRoCiAgICAKICAgICMgUlVOIC0+IEJSSUVGCiAgICBicmllZl9pZCA9IG1ldGEuZ2V0KCJCcmllZiIpCiAgICBpZiBicmllZl9pZCBhbmQgQlJJRUZfSURfUEFUVEVSTi5tYXRjaChicmllZl9pZCk6CiAgICAgICAgYnJpZWZfcGF0aCA9IEJSSUVGX0RJUiAvIGYie2JyaWVmX2lkfS5tZCIKICAgICAgICBpZiBicmllZl9wYXRoLmV4aXN0cygpOgogICAgICAgICAgICBkb2NzWyJCUklFRiJdID0gYnJpZWZfcGF0aAogICAgICAgICAgICAKICAgICAgICAgICAgIyBCUklFRiAtPiBSRVEgKHZpYSBJbXBsZW1lbnRzIGxpbmspCiAgICAgICAgICAgIGJyaWVmX3RleHQgPSByZWFkX3RleHQoYnJpZWZfcGF0aCkKICAgICAgICAgICAgdHJhY2UgPSBwYXJzZV90cmFjZWFiaWxpdHkoYnJpZWZfdGV4dCkKICAgICAgICAgICAgaWYgIkltcGxlbWVudHMiIGluIHRyYWNlOgogICAgICAgICAgICAgICAgcmVxX2lkLCByZXFfcmVsX3BhdGggPSB0cmFjZVsiSW1wbGVtZW50cyJdCiAgICAgICAgICAgICAgICByZXFfcGF0aCA9IChicmllZl9wYXRoLnBhcmVudCAvIHJlcV9yZWxfcGF0aCkucmVzb2x2ZSgpCiAgICAgICAgICAgICAgICBpZiByZXFfcGF0aC5leGlzdHMoKToKICAgICAgICAgICAgICAgICAgICBkb2NzWyJSRVEiXSA9IHJlcV9wYXRoCiAgICAKICAgIHJldHVybiBkb2NzCgoKZGVmIGNvbXB1dGVfc3RhdHVzX2Zyb21fY2hlY2tib3hlcyh0ZXh0OiBzdHIpIC0+IE9wdGlvbmFsW3N0cl06CiAgICAiIiJDb21wdXRlIHN0YXR1cyBiYXNlZCBvbiBjaGVja2JveCBjb21wbGV0aW9uIGluIFN0ZXBzL1ZlcmlmaWNhdGlvbiBzZWN0aW9ucy4iIiIKICAgIGNoZWNrYm94ZXMgPSBwYXJzZV9jaGVja2JveGVzKHRleHQpCiAgICBpZiBub3QgY2hlY2tib3hlczoKICAgICAgICByZXR1cm4gTm9uZQogICAgCiAgICB0b3RhbCA9IGxlbihjaGVja2JveGVzKQogICAgY2hlY2tlZCA9IHN1bSgxIGZvciBfLCBpc19jaGVja2VkLCBfIGluIGNoZWNrYm94ZXMgaWYgaXNfY2hlY2tlZCkKICAgIAogICAgaWYgY2hlY2tlZCA9PSAwOgogICAgICAgIHJldHVybiAiUGxhbm5lZCIKICAgIGVsaWYgY2hlY2tlZCA9PSB0b3RhbDoKICAgICAgICByZXR1cm4gIkNvbXBsZXRlZCIKICAgIGVsc2U6CiAgICAgICAgcmV0dXJuICJJblByb2dyZXNzIgoKCmRlZiBnZW5lcmF0ZV9zeW5jX2RpZmYocnVuX3BhdGg6IFBhdGgpIC0+IGRpY3Q6CiAgICAiIiJHZW5lcmF0ZSBkaWZmIGZvciBzeW5jIG9wZXJhdGlvbi4gUmV0dXJucyBjaGFuZ2VzIHRvIGFwcGx5LiIiIgogICAgZGlmZiA9IHsKICAgICAgICAicnVuIjogeyJwYXRoIjogcnVuX3BhdGgsICJjaGFuZ2VzIjogW119LAogICAgICAgICJicmllZiI6IE5vbmUsCiAgICAgICAgInJlcSI6IE5vbmUsCiAgICB9CiAgICAKICAgIHJ1bl90ZXh0ID0gcmVhZF90ZXh0KHJ1bl9wYXRoKQogICAgcnVuX21ldGEgPSBleHRyYWN0X21ldGEocnVuX3RleHQpCiAgICBydW5fY2hlY2tib3hlcyA9IHBhcnNlX2NoZWNrYm94ZXMocnVuX3RleHQpCiAgICAKICAgICMgQ29tcHV0ZSBSVU4gc3RhdHVzIGZyb20gY2hlY2tib3hlcwogICAgY29tcHV0ZWRfc3RhdHVzID0gY29tcHV0ZV9zdGF0dXNfZnJvbV9jaGVja2JveGVzKHJ1bl90ZXh0KQogICAgY3VycmVudF9zdGF0dXMgPSBydW5fbWV0YS5nZXQoIlN0YXR1cyIsICIiKQogICAgCiAgICBpZiBjb21wdXRlZF9zdGF0dXMgYW5kIG5vcm1hbGl6ZV9zdGF0dXMoY29tcHV0ZWRfc3RhdHVzKSAhPSBub3JtYWxpemVfc3RhdHVzKGN1cnJlbnRfc3RhdHVzKToKICAgICAgICBkaWZmWyJydW4iXVsiY2hhbmdlcyJdLmFwcGVuZCh7CiAgICAgICAgICAgICJ0eXBlIjogInN0YXR1cyIsCiAgICAgICAgICAgICJmcm9tIjogY3VycmVudF9zdGF0dXMsCiAgICAgICAgICAgICJ0byI6IGNvbXB1dGVkX3N0YXR1cywKICAgICAgICB9KQogICAgCiAgICAjIFJlc29sdmUgbGlua2VkIGRvY3VtZW50cwogICAgbGlua2VkID0gcmVzb2x2ZV9saW5rZWRfZG9jcyhydW5fcGF0aCkKICAgIAogICAgIyBCUklFRiBzeW5jCiAgICBpZiAiQlJJRUYiIGluIGxpbmtlZDoKICAgICAgICBicmllZl9wYXRoID0gbGlua2VkWyJCUklFRiJdCiAgICAgICAgYnJpZWZfdGV4dCA9IHJlYWRfdGV4dChicmllZl9wYXRoKQogICAgICAgIGJyaWVmX21ldGEgPSBleHRyYWN0X21ldGEoYnJpZWZfdGV4dCkKICAgICAgICBicmllZl9zdGF0dXMgPSBicmllZl9tZXRhLmdldCgiU3RhdHVzIiwgIiIpCiAgICAgICAgCiAgICAgICAgZGlmZlsiYnJpZWYiXSA9IHsKICAgICAgICAgICAgInBhdGgiOiBicmllZl9wYXRoLAogICAgICAgICAgICAiY2hhbmdlcyI6IFtdLAogICAgICAgIH0KICAgICAgICAKICAgICAgICAjIFN5bmMgc3RhdHVzCiAgICAgICAgaWYgY29tcHV0ZWRfc3RhdHVzIGFuZCBub3JtYWxpemVfc3RhdHVzKGJyaWVmX3N0YXR1cykgIT0gbm9ybWFsaXplX3N0YXR1cyhjb21wdXRlZF9zdGF0dXMpOgogICAgICAgICAgICBkaWZmWyJicmllZiJdWyJjaGFuZ2VzIl0uYXBwZW5kKHsKICAgICAgICAgICAgICAgICJ0eXBlIjogInN0YXR1cyIsCiAgICAgICAgICAgICAgICAiZnJvbSI6IGJyaWVmX3N0YXR1cywKICAgICAgICAgICAgICAgICJ0byI6IGNvbXB1dGVkX3N0YXR1cywKICAgICAgICAgICAgfSkKICAgIAogICAgIyBSRVEgcGF0Y2ggKGRvbid0IGF1dG8tbW9kaWZ5LCBnZW5lcmF0ZSBwYXRjaCkKICAgIGlmICJSRVEiIGluIGxpbmtlZDoKICAgICAgICByZXFfcGF0aCA9IGxpbmtlZFsiUkVRIl0KICAgICAgICByZXFfdGV4dCA9IHJlYWRfdGV4dChyZXFfcGF0aCkKICAgICAgICByZXFfbWV0YSA9IGV4dHJhY3RfbWV0YShyZXFfdGV4dCkKICAgICAgICByZXFfY2hlY2tib3hlcyA9IHBhcnNlX2NoZWNrYm94ZXMocmVxX3RleHQpCiAgICAgICAgCiAgICAgICAgZGlmZlsicmVxIl0gPSB7CiAgICAgICAgICAgICJwYXRoIjogcmVxX3BhdGgsCiAgICAgICAgICAgICJjaGFuZ2VzIjogW10sCiAgICAgICAgICAgICJjaGVja2JveGVzIjogcmVxX2NoZWNrYm94ZXMsCiAgICAgICAgfQogICAgICAgIAogICAgICAgICMgQ2hlY2sgaWYgUkVRIGFjY2VwdGFuY2UgY3JpdGVyaWEgc2hvdWxkIGJlIHVwZGF0ZWQgYmFzZWQgb24gUlVOIGNvbXBsZXRpb24KICAgICAgICBpZiBjb21wdXRlZF9zdGF0dXMgPT0gIkNvbXBsZXRlZCIgYW5kIHJlcV9jaGVja2JveGVzOgogICAgICAgICAgICAjIFN1Z2dlc3QgbWFya2luZyByZWxhdGVkIGNoZWNrYm94ZXMKICAgICAgICAgICAgZGlmZlsicmVxIl1bImNoYW5nZXMiXS5hcHBlbmQoewogICAgICAgICAgICAgICAgInR5cGUiOiAiY2hlY2tib3hfc3VnZ2VzdGlvbiIsCiAgICAgICAgICAgICAgICAibWVzc2FnZSI6IGYiUlVOIGNvbXBsZXRlZC4gQ29uc2lkZXIgdXBkYXRpbmcgYWNjZXB0YW5jZSBjcml0ZXJpYSBpbiB7cmVxX3BhdGgubmFtZX0iLAogICAgICAgICAgICB9KQogICAgCiAgICByZXR1cm4gZGlmZgoKCmRlZiBwcmludF9zeW5jX2RpZmYoZGlmZjogZGljdCkgLT4gTm9uZToKICAgICIiIlByaW50IHN5bmMgZGlmZiBpbiBodW1hbi1yZWFkYWJsZSBmb3JtYXQuIiIiCiAgICBydW5faW5mbyA9IGRpZmZbInJ1biJdCiAgICBwcmludChmIlxuW1NZTkNdIHtydW5faW5mb1sncGF0aCddLnN0ZW19IikKICAgIAogICAgaWYgcnVuX2luZm9bImNoYW5nZXMiXToKICAgICAgICBmb3IgY2hhbmdlIGluIHJ1bl9pbmZvWyJjaGFuZ2VzIl06CiAgICAgICAgICAgIGlmIGNoYW5nZVsidHlwZSJdID09ICJzdGF0dXMiOgogICAgICAgICAgICAgICAgcHJpbnQoZiIgIOKGkiBSVU46IFN0YXR1cyB7Y2hhbmdlWydmcm9tJ119IOKGkiB7Y2hhbmdlWyd0byddfSIpCiAgICBlbHNlOgogICAgICAgIHByaW50KCIgIOKGkiBSVU46IChubyBjaGFuZ2VzKSIpCiAgICAKICAgIGlmIGRpZmZbImJyaWVmIl06CiAgICAgICAgYnJpZWZfaW5mbyA9IGRpZmZbImJyaWVmIl0KICAgICAgICBpZiBicmllZl9pbmZvWyJjaGFuZ2VzIl06CiAgICAgICAgICAgIGZvciBjaGFuZ2UgaW4gYnJpZWZfaW5mb1siY2hhbmdlcyJdOgogICAgICAgICAgICAgICAgaWYgY2hhbmdlWyJ0eXBlIl0gPT0gInN0YXR1cyI6CiAgICAgICAgICAgICAgICAgICAgcHJpbnQoZiIgIOKGkiBCUklFRiAoe2JyaWVmX2luZm9bJ3BhdGgnXS5zdGVtfSk6IFN0YXR1cyB7Y2hhbmdlWydmcm9tJ119IOKGkiB7Y2hhbmdlWyd0byddfSIpCiAgICAgICAgZWxzZToKICAgICAgICAgICAgcHJpbnQoZiIgIOKGkiBCUklFRiAoe2JyaWVmX2luZm9bJ3BhdGgnXS5zdGVtfSk6IChubyBjaGFuZ2VzKSIpCiAgICAKICAgIGlmIGRpZmZbInJlcSJdOgogICAgICAgIHJlcV9pbmZvID0gZGlmZlsicmVxIl0KICAgICAgICBpZiByZXFfaW5mb1siY2hhbmdlcyJdOgogICAgICAgICAgICBmb3IgY2hhbmdlIGluIHJlcV9pbmZvWyJjaGFuZ2VzIl06CiAgICAgICAgICAgICAgICBpZiBjaGFuZ2VbInR5cGUiXSA9PSAiY2hlY2tib3hfc3VnZ2VzdGlvbiI6CiAgICAgICAgICAgICAgICAgICAgcHJpbnQoZiIgIOKGkiBSRVEgKHtyZXFfaW5mb1sncGF0aCddLnN0ZW19KTogW1BhdGNoIHJlcXVpcmVkXSB7Y2hhbmdlWydtZXNzYWdlJ119IikKICAgICAgICBlbHNlOgogICAgICAgICAgICBwcmludChmIiAg4oaSIFJFUSAoe3JlcV9pbmZvWydwYXRoJ10uc3RlbX0pOiAobm8gY2hhbmdlcykiKQoKCmRlZiBhcHBseV9icmllZl9jaGFuZ2VzKGRpZmY6IGRpY3QpIC0+IGJvb2w6CiAgICAiIiJBcHBseSBjaGFuZ2VzIHRvIEJSSUVGIGRvY3VtZW50LiIiIgogICAgaWYgbm90IGRpZmZbImJyaWVmIl0gb3Igbm90IGRpZmZbImJyaWVmIl1bImNoYW5nZXMiXToKICAgICAgICByZXR1cm4gRmFsc2UKICAgIAogICAgYnJpZWZfcGF0aCA9IGRpZmZbImJyaWVmIl1bInBhdGgiXQogICAgYnJpZWZfdGV4dCA9IHJlYWRfdGV4dChicmllZl9wYXRoKQogICAgCiAgICBmb3IgY2hhbmdlIGluIGRpZmZbImJyaWVmIl1bImNoYW5nZXMiXToKICAgICAgICBpZiBjaGFuZ2VbInR5cGUiXSA9PSAic3RhdHVzIjoKICAgICAgICAgICAgYnJpZWZfdGV4dCA9IHVwZGF0ZV9tZXRhX2xpbmUoYnJpZWZfdGV4dCwgIlN0YXR1cyIsIGNoYW5nZVsidG8iXSkKICAgIAogICAgd3JpdGVfdGV4dChicmllZl9wYXRoLCBicmllZl90ZXh0KQogICAgcHJpbnQoZiJbT0tdIFVwZGF0ZWQge2JyaWVmX3BhdGh9IikKICAgIHJldHVybiBUcnVlCgoKZGVmIHdyaXRlX3JlcV9wYXRjaChkaWZmOiBkaWN0KSAtPiBPcHRpb25hbFtQYXRoXToKICAgICIiIldyaXRlIFJFUSBwYXRjaCBmaWxlLiIiIgogICAgaWYgbm90IGRpZmZbInJlcSJdIG9yIG5vdCBkaWZmWyJyZXEiXVsiY2hhbmdlcyJdOgogICAgICAgIHJldHVybiBOb25lCiAgICAKICAgIGVuc3VyZV9kaXIoUEFUQ0hfRElSKQogICAgcmVxX3BhdGggPSBkaWZmWyJyZXEiXVsicGF0aCJdCiAgICBwYXRjaF9wYXRoID0gUEFUQ0hfRElSIC8gZiJ7cmVxX3BhdGguc3RlbX0ucGF0Y2gubWQiCiAgICAKICAgIGNvbnRlbnQgPSBmIiIiIyBQYXRjaCBmb3Ige3JlcV9wYXRoLnN0ZW19Cgo+ICoqR2VuZXJhdGVkKio6IHtub3dfZGF0ZSgpfQo+ICoqU291cmNlIFJVTioqOiB7ZGlmZlsncnVuJ11bJ3BhdGgnXS5zdGVtfQoKIyMgU3VnZ2VzdGVkIENoYW5nZXMKCiIiIgogICAgZm9yIGNoYW5nZSBpbiBkaWZmWyJyZXEiXVsiY2hhbmdlcyJdOgogICAgICAgIGlmIGNoYW5nZVsidHlwZSJdID09ICJjaGVja2JveF9zdWdnZXN0aW9uIjoKICAgICAgICAgICAgY29udGVudCArPSBmIi0ge2NoYW5nZVsnbWVzc2FnZSddfVxuIgogICAgCiAgICBjb250ZW50ICs9IGYiIiIKIyMgSG93IHRvIEFwcGx5CgpgYGBiYXNoCmF0bGFzIHN5bmMge2RpZmZbJ3J1biddWydwYXRoJ10uc3RlbX0gLS1hcHBseS1yZXEKYGBgCgpPciBtYW51YWxseSBlZGl0OiB7cmVxX3BhdGh9CiIiIgogICAgCiAgICB3cml0ZV90ZXh0KHBhdGNoX3BhdGgsIGNvbnRlbnQpCiAgICBwcmludChmIltPS10gQ3JlYXRlZCBwYXRjaDoge3BhdGNoX3BhdGh9IikKICAgIHJldHVybiBwYXRjaF9wYXRoCgoKZGVmIGFwcGx5X3JlcV9jaGFuZ2VzKGRpZmY6IGRpY3QpIC0+IGJvb2w6CiAgICAiIiJBcHBseSBjaGFuZ2VzIHRvIFJFUSBkb2N1bWVudCAod2l0aCB3YXJuaW5nKS4iIiIKICAgIGlmIG5vdCBkaWZmWyJyZXEiXSBvciBub3QgZGlmZlsicmVxIl1bImNoYW5nZXMiXToKICAgICAgICByZXR1cm4gRmFsc2UKICAgIAogICAgcHJpbnQoIltXQVJOXSBNb2RpZnlpbmcgUkVRIGRvY3VtZW50IChhdXRob3JpdHkgZG9jdW1lbnQpIikKICAgIHJlcV9wYXRoID0gZGlmZlsicmVxIl1bInBhdGgiXQogICAgcmVxX3RleHQgPSByZWFkX3RleHQocmVxX3BhdGgpCiAgICAKICAgICMgRm9yIG5vdywganVzdCB1cGRhdGUgc3RhdHVzIGlmIFJVTiBpcyBjb21wbGV0ZWQKICAgIHJ1bl9jaGFuZ2VzID0gZGlmZlsicnVuIl1bImNoYW5nZXMiXQogICAgZm9yIGNoYW5nZSBpbiBydW5fY2hhbmdlczoKICAgICAgICBpZiBjaGFuZ2VbInR5cGUiXSA9PSAic3RhdHVzIiBhbmQgY2hhbmdlWyJ0byJdID09ICJDb21wbGV0ZWQiOgogICAgICAgICAgICByZXFfdGV4dCA9IHVwZGF0ZV9tZXRhX2xpbmUocmVxX3RleHQsICJTdGF0dXMiLCAiSW1wbGVtZW50ZWQiKQogICAgCiAgICB3cml0ZV90ZXh0KHJlcV9wYXRoLCByZXFfdGV4dCkKICAgIHByaW50KGYiW09LXSBVcGRhdGVkIHtyZXFfcGF0aH0iKQogICAgcmV0dXJuIFRydWUKCgpkZWYgaW5pdF9jb21tYW5kKF9hcmdzOiBhcmdwYXJzZS5OYW1lc3BhY2UpIC0+IGludDoKICAgIG92ZXJ3cml0ZSA9IGdldGF0dHIoX2FyZ3MsICJvdmVyd3JpdGUiLCBGYWxzZSkKICAgIGVuc3VyZV9kaXIoQVRMQVNfUk9PVCkKICAgIGZvciBkIGluIFsKICAgICAgICBSRVFfRElSLAogICAgICAgIFJVTEVfRElSLAogICAgICAgIEFEUl9ESVIsCiAgICAgICAgQ1FfRElSLAogICAgICAgIFZJRVdTX0RJUiwKICAgICAgICBJTkJPWF9ESVIsCiAgICAgICAgRFJBRlRTX0RJUiwKICAgICAgICBCUklFRl9ESVIsCiAgICAgICAgUlVOX0RJUiwKICAgICAgICBBUkNISVZFX0RJUiwKICAgICAgICBURU1QTEFURVNfRElSLAogICAgICAgIFNUQVRFX0RJUiwKICAgICAgICBTWVNURU1fUk9PVCAvICJwcm9tcHRzIiwKICAgICAgICBTWVNURU1fUk9PVCAvICJzcmMiLAogICAgXToKICAgICAgICBlbnN1cmVfZGlyKGQpCgogICAgZm9yIHBhdGgsIGNvbnRlbnQgaW4gbG9hZF9kZWZhdWx0X3RvcF9kb2NzKCkuaXRlbXMoKToKICAgICAgICBpZiBvdmVyd3JpdGUgb3Igbm90IHBhdGguZXhpc3RzKCk6CiAgICAgICAgICAgIHdyaXRlX3RleHQocGF0aCwgY29udGVudCkKCiAgICBmb3IgbmFtZSwgY29udGVudCBpbiBsb2FkX2RlZmF1bHRfdGVtcGxhdGVzKCkuaXRlbXMoKToKICAgICAgICB0ZW1wbGF0ZV9wYXRoID0gVEVNUExBVEVTX0RJUiAvIG5hbWUKICAgICAgICBpZiBvdmVyd3JpdGUgb3Igbm90IHRlbXBsYXRlX3BhdGguZXhpc3RzKCk6CiAgICAgICAgICAgIHdyaXRlX3RleHQodGVtcGxhdGVfcGF0aCwgY29udGVudCkKCiAgICBwcm9tcHRzX2RpciA9IFNZU1RFTV9ST09UIC8gInByb21wdHMiCiAgICBmb3IgbmFtZSwgY29udGVudCBpbiBsb2FkX2RlZmF1bHRfcHJvbXB0cygpLml0ZW1zKCk6CiAgICAgICAgcHJvbXB0X3BhdGggPSBwcm9tcHRzX2RpciAvIG5hbWUKICAgICAgICBpZiBvdmVyd3JpdGUgb3Igbm90IHByb21wdF9wYXRoLmV4aXN0cygpOgogICAgICAgICAgICB3cml0ZV90ZXh0KHByb21wdF9wYXRoLCBjb250ZW50KQogICAgICAgICAgICBwcmludChmIltPS10gQ3JlYXRlZCB7cHJvbXB0X3BhdGh9IikKCiAgICBmb3IgbmFtZSwgY29udGVudCBpbiBsb2FkX2RlZmF1bHRfc3lzdGVtX2ZpbGVzKCkuaXRlbXMoKToKICAgICAgICBzeXN0ZW1fcGF0aCA9IFNZU1RFTV9ST09UIC8gbmFtZQogICAgICAgIGlmIG92ZXJ3cml0ZSBvciBub3Qgc3lzdGVtX3BhdGguZXhpc3RzKCk6CiAgICAgICAgICAgIHdyaXRlX3RleHQoc3lzdGVtX3BhdGgsIGNvbnRlbnQpCiAgICAgICAgICAgIHByaW50KGYiW09LXSBDcmVhdGVkIHtzeXN0ZW1fcGF0aH0iKQoKICAgIHNyY19kaXIgPSBTWVNURU1fUk9PVCAvICJzcmMiCiAgICBmb3IgbmFtZSwgY29udGVudCBpbiBsb2FkX2RlZmF1bHRfc3JjX2ZpbGVzKCkuaXRlbXMoKToKICAgICAgICBzcmNfcGF0aCA9IHNyY19kaXIgLyBuYW1lCiAgICAgICAgaWYgb3ZlcndyaXRlIG9yIG5vdCBzcmNfcGF0aC5leGlzdHMoKToKICAgICAgICAgICAgd3JpdGVfdGV4dChzcmNfcGF0aCwgY29udGVudCkKICAgICAgICAgICAgcHJpbnQoZiJbT0tdIENyZWF0ZWQge3NyY19wYXRofSIpCgogICAgaWYgbm90IExBU1RfUlVOX1BBVEguZXhpc3RzKCk6CiAgICAgICAgd3JpdGVfbGFzdF9ydW4oeyJzdGFnZSI6ICJpZGxlIiwgInVwZGF0ZWRfYXQiOiBub3dfaXNvKCl9KQoKICAgIHByaW50KCJbT0tdIEF0bGFzIHN0cnVjdHVyZSBpbml0aWFsaXplZC4iKQogICAgcHJpbnQoIltJTkZPXSBSdW4gdGhlIHByb21wdCBpbiAuYXRsYXMvLnN5c3RlbS9wcm9tcHRzL29uYm9hcmRpbmcubWQgdG8gY29tcGxldGUgc2V0dXAuIikKICAgIHJldHVybiAwCgoKZGVmIGNyZWF0ZV9icmllZl9kb2ModGV4dDogc3RyLCBkb21haW46IHN0cikgLT4gUGF0aDoKICAgIGJyaWVmX2lkID0gbmV4dF9pZCgiQlJJRUYiLCBkb21haW4sIEJSSUVGX0RJUiwgQlJJRUZfSURfUEFUVEVSTikKICAgIHRpdGxlID0gZGVyaXZlX3RpdGxlKHRleHQpCiAgICBjb250ZW50ID0gZiIiIiMgW3ticmllZl9pZH1dIHt0aXRsZX0KCj4gKipJRCoqOiB7YnJpZWZfaWR9Cj4gKipEb21haW4qKjoge2RvbWFpbn0KPiAqKlN0YXR1cyoqOiBBY3RpdmUKPiAqKkRhdGUqKjoge25vd19kYXRlKCl9CgojIyAxLiBVc2VyIFJlcXVlc3QKe3RleHQuc3RyaXAoKX0KCiMjIDIuIEludGVudCBTdW1tYXJ5Ci0gR29hbDogCi0gUHJvYmxlbTogCgojIyAzLiBBZmZlY3RlZCBBcnRpZmFjdHMKLSBDcmVhdGU6IAotIE1vZGlmeTogCi0gUmVhZDogCgojIyA0LiBQcm9wb3NlZCBDaGFuZ2VzCjEuIAoyLiAKCiMjIDUuIFZlcmlmaWNhdGlvbiBDcml0ZXJpYQotIFsgXSAKIiIiCiAgICBwYXRoID0gQlJJRUZfRElSIC8gZiJ7YnJpZWZfaWR9Lm1kIgogICAgZW5zdXJlX2RpcihCUklFRl9ESVIpCiAgICB3cml0ZV90ZXh0KHBhdGgsIGNvbnRlbnQpCiAgICByZXR1cm4gcGF0aAoKCmRlZiBjYXB0dXJlX2NvbW1hbmQoYXJnczogYXJncGFyc2UuTmFtZXNwYWNlKSAtPiBpbnQ6CiAgICBkb21haW4gPSBhcmdzLmRvbWFpbi51cHBlcigpCiAgICB0ZXh0ID0gYXJncy50ZXh0LnN0cmlwKCkKICAgIGlmIG5vdCB0ZXh0OgogICAgICAgIHByaW50KCJbRVJSXSBFbXB0eSBpbnB1dC4iKQogICAgICAgIHJldHVybiAxCgogICAgdGl0bGUgPSBkZXJpdmVfdGl0bGUodGV4dCkKICAgIHJlcV9pZHMgPSBbcmlkIGZvciByaWQgaW4gZXh0cmFjdF9pZHNfZnJvbV90ZXh0KHRleHQpIGlmIHJpZC5zdGFydHN3aXRoKCJSRVEtIildCiAgICBpZiBub3QgcmVxX2lkczoKICAgICAgICByZXFfaWRzID0gW25leHRfaWQoIlJFUSIsIGRvbWFpbiwgUkVRX0RJUiwgUkVRX0lEX1BBVFRFUk4pXQoKICAgIGNyZWF0ZWQgPSBbXQogICAgZm9yIHJlcV9pZCBpbiByZXFfaWRzOgogICAgICAgIGlmIG5vdCBSRVFfSURfUEFUVEVSTi5tYXRjaChyZXFfaWQpOgogICAgICAgICAgICBwcmludChmIltXQVJOXSBTa2lwcGluZyBpbnZhbGlkIFJFUSBJRDoge3JlcV9pZH0iKQogICAgICAgICAgICBjb250aW51ZQogICAgICAgIGNyZWF0ZV9yZXFfc3R1YihyZXFfaWQsIHRpdGxlPXRpdGxlKQogICAgICAgIHJlcV9wYXRoID0gUkVRX0RJUiAvIGYie3JlcV9pZH0ubWQiCiAgICAgICAgaWYgcmVxX3BhdGguZXhpc3RzKCk6CiAgICAgICAgICAgIGFwcGVuZF9jYXB0dXJlX25vdGUocmVxX3BhdGgsIHRleHQpCiAgICAgICAgdmlld19wYXRoID0gZW5zdXJlX3ZpZXdfZG9jKHJlcV9pZCwgdGl0bGUpCiAgICAgICAgY3JlYXRlZC5hcHBlbmQoKHJlcV9wYXRoLCB2aWV3X3BhdGgpKQoKICAgIGlmIGdldGF0dHIoYXJncywgInRvIiwgTm9uZSkgPT0gImJyaWVmIjoKICAgICAgICBicmllZl9wYXRoID0gY3JlYXRlX2JyaWVmX2RvYyh0ZXh0LCBkb21haW4pCiAgICAgICAgcHJpbnQoZiJbT0tdIENyZWF0ZWQge2JyaWVmX3BhdGh9IikKCiAgICBmb3IgcmVxX3BhdGgsIHZpZXdfcGF0aCBpbiBjcmVhdGVkOgogICAgICAgIHByaW50KGYiW09LXSBVcGRhdGVkIHtyZXFfcGF0aH0iKQogICAgICAgIHByaW50KGYiW09LXSBVcGRhdGVkIHt2aWV3X3BhdGh9IikKICAgIHJldHVybiAwCgoKZGVmIGNyZWF0ZV9yZXFfc3R1YihyZXFfaWQ6IHN0ciwgdGl0bGU6IE9wdGlvbmFsW3N0cl0gPSBOb25lKSAtPiBOb25lOgogICAgcGF0aCA9IFJFUV9ESVIgLyBmIntyZXFfaWR9Lm1kIgogICAgaWYgcGF0aC5leGlzdHMoKToKICAgICAgICByZXR1cm4KICAgIG1hdGNoID0gUkVRX0lEX1BBVFRFUk4ubWF0Y2gocmVxX2lkKQogICAgaWYgbm90IG1hdGNoOgogICAgICAgIHJldHVybgogICAgZG9tYWluID0gbWF0Y2guZ3JvdXAoMSkKICAgIHRlbXBsYXRlID0gbG9hZF90ZW1wbGF0ZSgiUkVRLm1kIikKICAgIHRpdGxlID0gdGl0bGUgb3IgIlRpdGxlIgogICAgY29udGVudCA9IHRlbXBsYXRlLnJlcGxhY2UoIlJFUS1YWFgtMDAxIiwgcmVxX2lkKQogICAgY29udGVudCA9IGNvbnRlbnQucmVwbGFjZSgiIyBbUkVRLVhYWC0wMDFdIFRpdGxlIiwgZiIjIFt7cmVxX2lkfV0ge3RpdGxlfSIpCiAgICBjb250ZW50ID0gY29udGVudC5yZXBsYWNlKCJEb21haW4qKjogWFhYIiwgZiJEb21haW4qKjoge2RvbWFpbn0iKQogICAgY29udGVudCA9IGNvbnRlbnQucmVwbGFjZSgiTGFzdCBVcGRhdGVkKio6IFlZWVktTU0tREQiLCBmIkxhc3QgVXBkYXRlZCoqOiB7bm93X2RhdGUoKX0iKQogICAgd3JpdGVfdGV4dChwYXRoLCBjb250ZW50KQoKCmRlZiBhcHBlbmRfY2FwdHVyZV9ub3RlKHBhdGg6IFBhdGgsIHRleHQ6IHN0cikgLT4gTm9uZToKICAgIG5vdGUgPSB0ZXh0LnN0cmlwKCkKICAgIGlmIG5vdCBub3RlOgogICAgICAgIHJldHVybgogICAgY29udGVudCA9IHJlYWRfdGV4dChwYXRoKQogICAgc3RhbXAgPSBub3dfZGF0ZSgpCiAgICBibG9jayA9IGYiXG4jIyBDYXB0dXJlICh7c3RhbXB9KVxue25vdGV9XG4iCiAgICBpZiBmIiMjIENhcHR1cmUgKHtzdGFtcH0pIiBpbiBjb250ZW50OgogICAgICAgIHJldHVybgogICAgd3JpdGVfdGV4dChwYXRoLCBjb250ZW50LnJzdHJpcCgpICsgYmxvY2spCgoKZGVmIGVuc3VyZV92aWV3X2RvYyhyZXFfaWQ6IHN0ciwgdGl0bGU6IHN0cikgLT4gUGF0aDoKICAgIHBhdGggPSBWSUVXU19ESVIgLyBmIntyZXFfaWR9Lm1kIgogICAgaWYgbm90IHBhdGguZXhpc3RzKCk6CiAgICAgICAgdGVtcGxhdGUgPSBsb2FkX3RlbXBsYXRlKCJWSUVXLm1kIikKICAgICAgICBjb250ZW50ID0gdGVtcGxhdGUucmVwbGFjZSgiUkVRLVhYWC0wMDEiLCByZXFfaWQpCiAgICAgICAgY29udGVudCA9IGNvbnRlbnQucmVwbGFjZSgiIyBbVklFVy1SRVEtWFhYLTAwMV0gVGl0bGUiLCBmIiMgW1ZJRVcte3JlcV9pZH1dIHt0aXRsZX0iKQogICAgICAgIGNvbnRlbnQgPSBjb250ZW50LnJlcGxhY2UoIkxhc3QgVXBkYXRlZCoqOiBZWVlZLU1NLUREIiwgZiJMYXN0IFVwZGF0ZWQqKjoge25vd19kYXRlKCl9IikKICAgICAgICB3cml0ZV90ZXh0KHBhdGgsIGNvbnRlbnQpCiAgICAgICAgcmV0dXJuIHBhdGgKCiAgICBjb250ZW50ID0gcmVhZF90ZXh0KHBhdGgpCiAgICBpZiByZXFfaWQgbm90IGluIGNvbnRlbnQ6CiAgICAgICAgaWYgIiMjIFJlZmVyZW5jZXMgKFNTT1QgaW5kZXgpIiBub3QgaW4gY29udGVudDoKICAgICAgICAgICAgY29udGVudCA9IGNvbnRlbnQucnN0cmlwKCkgKyAiXG5cbiMjIFJlZmVyZW5jZXMgKFNTT1QgaW5kZXgpXG4iCiAgICAgICAgY29udGVudCA9IGNvbnRlbnQucnN0cmlwKCkgKyBmIlxuLSB7cmVxX2lkfVxuIgogICAgICAgIHdyaXRlX3RleHQocGF0aCwgY29udGVudCkKICAgIHJldHVybiBwYXRoCgoKZGVmIGV4dHJhY3Rfc2VjdGlvbl9saW5lcyh0ZXh0OiBzdHIsIGhlYWRpbmc6IHN0cikgLT4gbGlzdFtzdHJdOgogICAgbGluZXMgPSB0ZXh0LnNwbGl0bGluZXMoKQogICAgb3V0OiBsaXN0W3N0cl0gPSBbXQogICAgaW5fc2VjdGlvbiA9IEZhbHNlCiAgICB0YXJnZXQgPSBmIiMjIHtoZWFkaW5nfSIuc3RyaXAoKS5sb3dlcigpCiAgICBmb3IgbGluZSBpbiBsaW5lczoKICAgICAgICBzdHJpcHBlZCA9IGxpbmUuc3RyaXAoKQogICAgICAgIGlmIHN0cmlwcGVkLnN0YXJ0c3dpdGgoIiMjICIpOgogICAgICAgICAgICBpZiBpbl9zZWN0aW9uOgogICAgICAgICAgICAgICAgYnJlYWsKICAgICAgICAgICAgaW5fc2VjdGlvbiA9IHN0cmlwcGVkLmxvd2VyKCkgPT0gdGFyZ2V0CiAgICAgICAgICAgIGNvbnRpbnVlCiAgICAgICAgaWYgaW5fc2VjdGlvbjoKICAgICAgICAgICAgb3V0LmFwcGVuZChsaW5lKQogICAgcmV0dXJuIG91dAoKCmRlZiBleHRyYWN0X3ZpZXdfcmVmZXJlbmNlcyh0ZXh0OiBzdHIpIC0+IHNldFtzdHJdOgogICAgcmVmczogc2V0W3N0cl0gPSBzZXQoKQogICAgZm9yIGxpbmUgaW4gZXh0cmFjdF9zZWN0aW9uX2xpbmVzKHRleHQsICJSZWZlcmVuY2VzIChTU09UIGluZGV4KSIpOgogICAgICAgIGZvciByZWZfaWQgaW4gUkVRX1JFRl9SRS5maW5kYWxsKGxpbmUpOgogICAgICAgICAgICByZWZzLmFkZChyZWZfaWQpCiAgICByZXR1cm4gcmVmcwoKCmRlZiBleHRyYWN0X3ZpZXdfc3VtbWFyeV9yZWZzKHRleHQ6IHN0cikgLT4gc2V0W3N0cl06CiAgICByZWZzOiBzZXRbc3RyXSA9IHNldCgpCiAgICBmb3IgbGluZSBpbiBleHRyYWN0X3NlY3Rpb25fbGluZXModGV4dCwgIlN1bW1hcnkiKToKICAgICAgICBpZiAiPCEtLSIgaW4gbGluZToKICAgICAgICAgICAgY29udGludWUKICAgICAgICBmb3IgbWF0Y2ggaW4gUkVGX1RPS0VOX1JFLmZpbmRpdGVyKGxpbmUpOgogICAgICAgICAgICByZWZzLmFkZChtYXRjaC5ncm91cCgiaWQiKSkKICAgIHJldHVybiByZWZzCgoKZGVmIGV4dHJhY3Rfdmlld19zc290X3JlZnModGV4dDogc3RyKSAtPiBzZXRbc3RyXToKICAgIG1ldGEgPSBleHRyYWN0X21ldGEodGV4dCkKICAgIHZhbHVlID0gbWV0YS5nZXQoIlNTT1QiLCAiIikKICAgIHJldHVybiBzZXQoUkVRX1JFRl9SRS5maW5kYWxsKHZhbHVlKSkKCgpkZWYgcnVuX2NvbW1hbmQoYXJnczogYXJncGFyc2UuTmFtZXNwYWNlKSAtPiBpbnQ6CiAgICByZXFfaWQgPSBhcmdzLnJlcV9pZAogICAgaWYgcmVxX2lkLmVuZHN3aXRoKCIubWQiKToKICAgICAgICByZXFfaWQgPSBQYXRoKHJlcV9pZCkuc3RlbQoKICAgIG1hdGNoID0gUkVRX0lEX1BBVFRFUk4ubWF0Y2gocmVxX2lkKQogICAgaWYgbm90IG1hdGNoOgogICAgICAgIHByaW50KGYiW0VSUl0gSW52YWxpZCBSRVEgSUQ6IHtyZXFfaWR9IikKICAgICAgICByZXR1cm4gMQoKICAgIHJlcV9wYXRoID0gUkVRX0RJUiAvIGYie3JlcV9pZH0ubWQiCiAgICBpZiBub3QgcmVxX3BhdGguZXhpc3RzKCk6CiAgICAgICAgcHJpbnQoZiJbRVJSXSBSRVEgbm90IGZvdW5kOiB7cmVxX3BhdGh9IikKICAgICAgICByZXR1cm4gMQoKICAgIGRvbWFpbiA9IG1hdGNoLmdyb3VwKDEpCiAgICBudW1iZXIgPSBtYXRjaC5ncm91cCgyKQogICAgc3RlcCA9IGdldGF0dHIoYXJncywgInN0ZXAiLCBOb25lKSBvciBuZXh0X3J1bl9zdGVwKHJlcV9pZCkKICAgIHJ1bl9pZCA9IGYiUlVOLVJFUS17ZG9tYWlufS17bnVtYmVyfS1zdGVwLXtpbnQoc3RlcCk6MDJkfSIKICAgIHJ1bl9wYXRoID0gUlVOX0RJUiAvIGYie3J1bl9pZH0ubWQiCiAgICBpZiBydW5fcGF0aC5leGlzdHMoKToKICAgICAgICBwcmludChmIltFUlJdIFJVTiBhbHJlYWR5IGV4aXN0czoge3J1bl9wYXRofSIpCiAgICAgICAgcmV0dXJuIDEKCiAgICBjb250ZW50ID0gZiIiIiMgW3tydW5faWR9XSBQbGFuCgo+ICoqSUQqKjoge3J1bl9pZH0KPiAqKlJFUSoqOiB7cmVxX2lkfQo+ICoqU3RhdHVzKio6IFBsYW5uZWQKPiAqKlN0YXJ0ZWQqKjoge25vd19kYXRlKCl9Cj4gKipHaXQqKjogLQo+ICoqQ29tcGxldGVkKio6IC0KCiMjIFRhcmdldCBSRVEKLSB7cmVxX2lkfQoKIyMgUGxhbgotIFsgXSAKCiMjIFZlcmlmaWNhdGlvbgotIFsgXSBUZXN0Ci0gWyBdIFNwZWMKLSBbIF0gQm91bmRhcnkKCiMjIE91dHB1dAotIChmaWxlcyBjcmVhdGVkL21vZGlmaWVkKQoiIiIKICAgIHdyaXRlX3RleHQocnVuX3BhdGgsIGNvbnRlbnQpCgogICAgd3JpdGVfbGFzdF9ydW4oCiAgICAgICAgewogICAgICAgICAgICAicnVuX2lkIjogcnVuX2lkLAogICAgICAgICAgICAicmVxX2lkIjogcmVxX2lkLAogICAgICAgICAgICAic3RhZ2UiOiAiZXhlY3V0aW5nIiwKICAgICAgICAgICAgInVwZGF0ZWRfYXQiOiBub3dfaXNvKCksCiAgICAgICAgfQogICAgKQoKICAgIHByaW50KGYiW09LXSBDcmVhdGVkIHtydW5fcGF0aH0iKQogICAgcmV0dXJuIDAKCgpkZWYgcGxhbl9jb21tYW5kKGFyZ3M6IGFyZ3BhcnNlLk5hbWVzcGFjZSkgLT4gaW50OgogICAgcHJpbnQoIltXQVJOXSAncGxhbicgaXMgZGVwcmVjYXRlZC4gVXNlICdydW4nIGluc3RlYWQuIikKICAgIGFyZ3MucmVxX2lkID0gYXJncy5icmllZl9pZAogICAgcmV0dXJuIHJ1bl9jb21tYW5kKGFyZ3MpCgoKZGVmIGZpbmlzaF9jb21tYW5kKGFyZ3M6IGFyZ3BhcnNlLk5hbWVzcGFjZSkgLT4gaW50OgogICAgcnVuX2lkID0gYXJncy5ydW5faWQKICAgIGlmIHJ1bl9pZC5lbmRzd2l0aCgiLm1kIik6CiAgICAgICAgcnVuX2lkID0gUGF0aChydW5faWQpLnN0ZW0KCiAgICBpZiBub3QgUlVOX0lEX1BBVFRFUk4ubWF0Y2gocnVuX2lkKToKICAgICAgICBwcmludChmIltFUlJdIEludmFsaWQgUlVOIElEOiB7cnVuX2lkfSIpCiAgICAgICAgcmV0dXJuIDEKCiAgICBydW5fcGF0aCA9IFJVTl9ESVIgLyBmIntydW5faWR9Lm1kIgogICAgaWYgbm90IHJ1bl9wYXRoLmV4aXN0cygpOgogICAgICAgIHByaW50KGYiW0VSUl0gUlVOIG5vdCBmb3VuZDoge3J1bl9wYXRofSIpCiAgICAgICAgcmV0dXJuIDEKCiAgICBnaXRfaGFzaCA9IGFyZ3MuZ2l0CiAgICBpZiBub3QgZ2l0X2hhc2g6CiAgICAgICAgZ2l0X2hhc2ggPSBkZXRlY3RfZ2l0X2hhc2goKQogICAgaWYgbm90IGdpdF9oYXNoOgogICAgICAgIHByaW50KCJbRVJSXSBNaXNzaW5nIGdpdCBoYXNoLiBQcm92aWRlIC0tZ2l0IG9yIGVuc3VyZSBnaXQgaXMgYXZhaWxhYmxlLiIpCiAgICAgICAgcmV0dXJuIDEKCiAgICB0ZXh0ID0gcmVhZF90ZXh0KHJ1bl9wYXRoKQogICAgbWV0YSA9IGV4dHJhY3RfbWV0YSh0ZXh0KQogICAgYnJpZWZfaWQgPSBtZXRhLmdldCgiQnJpZWYiKQogICAgcmVxX2lkID0gbWV0YS5nZXQoIlJFUSIpIG9yIHJlcV9pZF9mcm9tX3J1bl9pZChydW5faWQpCiAgICBzdGF0dXMgPSAiQ29tcGxldGVkIiBpZiBhcmdzLnN1Y2Nlc3MgZWxzZSAiRmFpbGVkIgogICAgdGV4dCA9IHVwZGF0ZV9tZXRhX2xpbmUodGV4dCwgIlN0YXR1cyIsIHN0YXR1cykKICAgIHRleHQgPSB1cGRhdGVfbWV0YV9saW5lKHRleHQsICJHaXQiLCBnaXRfaGFzaCkKICAgIHRleHQgPSB1cGRhdGVfbWV0YV9saW5lKHRleHQsICJDb21wbGV0ZWQiLCBub3dfZGF0ZSgpKQogICAgd3JpdGVfdGV4dChydW5fcGF0aCwgdGV4dCkKCiAgICBpZiBicmllZl9pZDoKICAgICAgICB1cGRhdGVfYnJpZWZfc3RhdHVzKGJyaWVmX2lkLCBzdGF0dXMpCgogICAgaWYgcmVxX2lkOgogICAgICAgIHJlcV9wYXRoID0gUkVRX0RJUiAvIGYie3JlcV9pZH0ubWQiCiAgICAgICAgaWYgcmVxX3BhdGguZXhpc3RzKCk6CiAgICAgICAgICAgIHJlcV90ZXh0ID0gcmVhZF90ZXh0KHJlcV9wYXRoKQogICAgICAgICAgICByZXFfdGV4dCA9IHVwZGF0ZV9tZXRhX2xpbmUocmVxX3RleHQsICJJbXBsZW1lbnRlZC1HaXQiLCBnaXRfaGFzaCkKICAgICAgICAgICAgcmVxX3RleHQgPSB1cGRhdGVfbWV0YV9saW5lKHJlcV90ZXh0LCAiTGlua2VkLVJVTiIsIHJ1bl9pZCkKICAgICAgICAgICAgcmVxX3RleHQgPSB1cGRhdGVfbWV0YV9saW5lKHJlcV90ZXh0LCAiTGFzdCBVcGRhdGVkIiwgbm93X2RhdGUoKSkKICAgICAgICAgICAgd3JpdGVfdGV4dChyZXFfcGF0aCwgcmVxX3RleHQpCiAgICAgICAgICAgIHByaW50KGYiW09LXSBVcGRhdGVkIHtyZXFfcGF0aH0iKQoKICAgIGxhc3RfcnVuX3N0YXRlID0gewogICAgICAgICJydW5faWQiOiBydW5faWQsCiAgICAgICAgInN0YWdlIjogImZpbmlzaGVkIiwKICAgICAgICAiZ2l0X2hhc2giOiBnaXRfaGFzaCwKICAgICAgICAiY29tcGxldGVkX2F0Ijogbm93X2lzbygpLAogICAgfQogICAgaWYgYnJpZWZfaWQ6CiAgICAgICAgbGFzdF9ydW5fc3RhdGVbImJyaWVmX2lkIl0gPSBicmllZl9pZAogICAgaWYgcmVxX2lkOgogICAgICAgIGxhc3RfcnVuX3N0YXRlWyJyZXFfaWQiXSA9IHJlcV9pZAogICAgd3JpdGVfbGFzdF9ydW4obGFzdF9ydW5fc3RhdGUpCgogICAgcHJpbnQoZiJbT0tdIFVwZGF0ZWQge3J1bl9wYXRofSIpCiAgICByZXR1cm4gMAoKCmRlZiBzeW5jX2NvbW1hbmQoYXJnczogYXJncGFyc2UuTmFtZXNwYWNlKSAtPiBpbnQ6CiAgICAiIiJTeW5jIFJVTiBzdGF0dXMgdG8gQlJJRUYvUkVRIGRvY3VtZW50cy4iIiIKICAgIHJ1bl9pZCA9IGFyZ3MucnVuX2lkCiAgICBpZiBydW5faWQuZW5kc3dpdGgoIi5tZCIpOgogICAgICAgIHJ1bl9pZCA9IFBhdGgocnVuX2lkKS5zdGVtCgogICAgaWYgbm90IFJVTl9JRF9QQVRURVJOLm1hdGNoKHJ1bl9pZCk6CiAgICAgICAgcHJpbnQoZiJbRVJSXSBJbnZhbGlkIFJVTiBJRDoge3J1bl9pZH0iKQogICAgICAgIHJldHVybiAxCgogICAgcnVuX3BhdGggPSBSVU5fRElSIC8gZiJ7cnVuX2lkfS5tZCIKICAgIGlmIG5vdCBydW5fcGF0aC5leGlzdHMoKToKICAgICAgICBwcmludChmIltFUlJdIFJVTiBub3QgZm91bmQ6IHtydW5fcGF0aH0iKQogICAgICAgIHJldHVybiAxCgogICAgIyBHZW5lcmF0ZSBkaWZmCiAgICBkaWZmID0gZ2VuZXJhdGVfc3luY19kaWZmKHJ1bl9wYXRoKQogICAgCiAgICAjIEFsd2F5cyBwcmludCBkaWZmIChkcnktcnVuIGluZm8pCiAgICBwcmludF9zeW5jX2RpZmYoZGlmZikKICAgIAogICAgIyBDaGVjayBpZiBhbnkgYXBwbHkgZmxhZ3MgYXJlIHNldAogICAgYXBwbHlfYnJpZWYgPSBnZXRhdHRyKGFyZ3MsICJhcHBseV9icmllZiIsIEZhbHNlKQogICAgYXBwbHlfcmVxID0gZ2V0YXR0cihhcmdzLCAiYXBwbHlfcmVxIiwgRmFsc2UpCiAgICB3cml0ZV9wYXRjaCA9IGdldGF0dHIoYXJncywgIndyaXRlX3JlcV9wYXRjaCIsIEZhbHNlKQogICAgCiAgICBpZiBub3QgKGFwcGx5X2JyaWVmIG9yIGFwcGx5X3JlcSBvciB3cml0ZV9wYXRjaCk6CiAgICAgICAgcHJpbnQoIlxuW0lORk9dIERyeS1ydW4gbW9kZS4gVXNlIC0tYXBwbHktYnJpZWYsIC0td3JpdGUtcmVxLXBhdGNoLCBvciAtLWFwcGx5LXJlcSB0byBtYWtlIGNoYW5nZXMuIikKICAgICAgICByZXR1cm4gMAogICAgCiAgICAjIEFwcGx5IFJVTiBjaGFuZ2VzIChhbHdheXMgd2hlbiBhbnkgYXBwbHkgZmxhZyBpcyBzZXQpCiAgICBpZiBkaWZmWyJydW4iXVsiY2hhbmdlcyJdOgogICAgICAgIHJ1bl90ZXh0ID0gcmVhZF90ZXh0KHJ1bl9wYXRoKQogICAgICAgIGZvciBjaGFuZ2UgaW4gZGlmZlsicnVuIl1bImNoYW5nZXMiXToKICAgICAgICAgICAgaWYgY2hhbmdlWyJ0eXBlIl0gPT0gInN0YXR1cyI6CiAgICAgICAgICAgICAgICBydW5fdGV4dCA9IHVwZGF0ZV9tZXRhX2xpbmUocnVuX3RleHQsICJTdGF0dXMiLCBjaGFuZ2VbInRvIl0pCiAgICAgICAgd3JpdGVfdGV4dChydW5fcGF0aCwgcnVuX3RleHQpCiAgICAgICAgcHJpbnQoZiJbT0tdIFVwZGF0ZWQge3J1bl9wYXRofSIpCiAgICAKICAgICMgQXBwbHkgQlJJRUYgY2hhbmdlcwogICAgaWYgYXBwbHlfYnJpZWY6CiAgICAgICAgYXBwbHlfYnJpZWZfY2hhbmdlcyhkaWZmKQogICAgCiAgICAjIFdyaXRlIFJFUSBwYXRjaAogICAgaWYgd3JpdGVfcGF0Y2g6CiAgICAgICAgd3JpdGVfcmVxX3BhdGNoKGRpZmYpCiAgICAKICAgICMgQXBwbHkgUkVRIGNoYW5nZXMgKHdpdGggd2FybmluZykKICAgIGlmIGFwcGx5X3JlcToKICAgICAgICBhcHBseV9yZXFfY2hhbmdlcyhkaWZmKQogICAgCiAgICByZXR1cm4gMAoKCmRlZiBpdGVyX2xpbmtzKHRleHQ6IHN0cikgLT4gbGlzdFtzdHJdOgogICAgbGlua3MgPSBbXQogICAgaW5fY29kZSA9IEZhbHNlCiAgICBmb3IgbGluZSBpbiB0ZXh0LnNwbGl0bGluZXMoKToKICAgICAgICBzdHJpcHBlZCA9IGxpbmUuc3RyaXAoKQogICAgICAgIGlmIHN0cmlwcGVkLnN0YXJ0c3dpdGgoImBgYCIpOgogICAgICAgICAgICBpbl9jb2RlID0gbm90IGluX2NvZGUKICAgICAgICAgICAgY29udGludWUKICAgICAgICBpZiBpbl9jb2RlOgogICAgICAgICAgICBjb250aW51ZQogICAgICAgIGZvciBtYXRjaCBpbiBMSU5LX1JFLmZpbmRpdGVyKGxpbmUpOgogICAgICAgICAgICBsaW5rcy5hcHBlbmQobWF0Y2guZ3JvdXAoMSkuc3RyaXAoKSkKICAgIHJldHVybiBsaW5rcwoKCmRlZiBkb2N0b3JfY29tbWFuZChhcmdzOiBhcmdwYXJzZS5OYW1lc3BhY2UpIC0+IGludDoKICAgIGlzc3VlcyA9IDAKICAgIGJyaWVmX3N0YXR1c2VzOiBkaWN0W3N0ciwgc3RyXSA9IHt9CiAgICBydW5fYnJpZWZfc3RhdHVzZXM6IGxpc3RbdHVwbGVbc3RyLCBzdHIsIHN0ciwgT3B0aW9uYWxbZGF0ZXRpbWVdXV0gPSBbXQoKICAgIHJlcXVpcmVkX2RpcnMgPSBbCiAgICAgICAgUkVRX0RJUiwKICAgICAgICBSVUxFX0RJUiwKICAgICAgICBBRFJfRElSLAogICAgICAgIENRX0RJUiwKICAgICAgICBWSUVXU19ESVIsCiAgICAgICAgSU5CT1hfRElSLAogICAgICAgIERSQUZUU19ESVIsCiAgICAgICAgQlJJRUZfRElSLAogICAgICAgIFJVTl9ESVIsCiAgICAgICAgQVJDSElWRV9ESVIsCiAgICAgICAgU1lTVEVNX1JPT1QsCiAgICAgICAgVEVNUExBVEVTX0RJUiwKICAgICAgICBTVEFURV9ESVIsCiAgICBdCiAgICBmb3IgcGF0aCBpbiByZXF1aXJlZF9kaXJzOgogICAgICAgIGlmIG5vdCBwYXRoLmV4aXN0cygpOgogICAgICAgICAgICBwcmludChmIltFUlJdIE1pc3NpbmcgZGlyZWN0b3J5OiB7cGF0aH0iKQogICAgICAgICAgICBpc3N1ZXMgKz0gMQoKICAgIGZvciBwYXRoIGluIFJFUVVJUkVEX1RPUF9ET0NTOgogICAgICAgIGlmIG5vdCBwYXRoLmV4aXN0cygpOgogICAgICAgICAgICBwcmludChmIltFUlJdIE1pc3NpbmcgdG9wIGRvYzoge3BhdGh9IikKICAgICAgICAgICAgaXNzdWVzICs9IDEKCiAgICBmb3IgcGF0aCBpbiBPUFRJT05BTF9UT1BfRE9DUzoKICAgICAgICBpZiBub3QgcGF0aC5leGlzdHMoKToKICAgICAgICAgICAgcHJpbnQoZiJbV0FSTl0gTWlzc2luZyBvcHRpb25hbCBkb2M6IHtwYXRofSIpCgogICAgc2Nhbl9kaXJzID0gW1JFUV9ESVIsIFJVTEVfRElSLCBBRFJfRElSLCBDUV9ESVIsIEJSSUVGX0RJUiwgUlVOX0RJUl0KICAgIGFsbF9kb2NzID0gaXRlcl9tZF9maWxlcyhzY2FuX2RpcnMpCiAgICBhbGxfaWRzOiBzZXRbc3RyXSA9IHNldCgpCgogICAgZm9yIHBhdGggaW4gYWxsX2RvY3M6CiAgICAgICAgdGV4dCA9IHJlYWRfdGV4dChwYXRoKQogICAgICAgIG1ldGEgPSBleHRyYWN0X21ldGEodGV4dCkKICAgICAgICBtZXRhX2lkID0gbWV0YS5nZXQoIklEIikKICAgICAgICBoZWFkZXJfaWQgPSBleHRyYWN0X2hlYWRlcl9pZCh0ZXh0KQogICAgICAgIGZpbGVfaWQgPSBwYXRoLnN0ZW0KICAgICAgICBmb3IgY2FuZGlkYXRlIGluIFttZXRhX2lkLCBoZWFkZXJfaWQsIGZpbGVfaWRdOgogICAgICAgICAgICBpZiBjYW5kaWRhdGU6CiAgICAgICAgICAgICAgICBhbGxfaWRzLmFkZChjYW5kaWRhdGUpCgogICAgZm9yIHBhdGggaW4gYWxsX2RvY3M6CiAgICAgICAgdGV4dCA9IHJlYWRfdGV4dChwYXRoKQogICAgICAgIG1ldGEgPSBleHRyYWN0X21ldGEodGV4dCkKICAgICAgICBtZXRhX2lkID0gbWV0YS5nZXQoIklEIikKICAgICAgICBoZWFkZXJfaWQgPSBleHRyYWN0X2hlYWRlcl9pZCh0ZXh0KQogICAgICAgIGZpbGVfaWQgPSBwYXRoLnN0ZW0KCiAgICAgICAgZm9sZGVyID0gcGF0aC5wYXJlbnQubmFtZQogICAgICAgIGV4cGVjdGVkX3ByZWZpeCA9IHsKICAgICAgICAgICAgInJlcSI6ICJSRVEiLAogICAgICAgICAgICAicnVsZSI6ICJSVUxFIiwKICAgICAgICAgICAgImFkciI6ICJBRFIiLAogICAgICAgICAgICAiY3EiOiAiQ1EiLAogICAgICAgICAgICAiYnJpZWYiOiAiQlJJRUYiLAogICAgICAgICAgICAicnVucyI6ICJSVU4iLAogICAgICAgIH0uZ2V0KGZvbGRlcikKCiAgICAgICAgaWYgZXhwZWN0ZWRfcHJlZml4IGlzIE5vbmU6CiAgICAgICAgICAgIGNvbnRpbnVlCgogICAgICAgIGlmIGV4cGVjdGVkX3ByZWZpeCA9PSAiQlJJRUYiOgogICAgICAgICAgICBzdGF0dXMgPSBtZXRhLmdldCgiU3RhdHVzIikKICAgICAgICAgICAgaWYgbm90IHN0YXR1czoKICAgICAgICAgICAgICAgIHByaW50KGYiW0VSUl0gTWlzc2luZyBTdGF0dXM6IHtwYXRofSIpCiAgICAgICAgICAgICAgICBpc3N1ZXMgKz0gMQogICAgICAgICAgICBlbHNlOgogICAgICAgICAgICAgICAgYnJpZWZfc3RhdHVzZXNbZmlsZV9pZF0gPSBzdGF0dXMKCiAgICAgICAgaWYgZXhwZWN0ZWRfcHJlZml4ID09ICJSVU4iOgogICAgICAgICAgICBicmllZl9pZCA9IG1ldGEuZ2V0KCJCcmllZiIpCiAgICAgICAgICAgIHJ1bl9zdGF0dXMgPSBtZXRhLmdldCgiU3RhdHVzIikKICAgICAgICAgICAgY29tcGxldGVkID0gbWV0YS5nZXQoIkNvbXBsZXRlZCIpCiAgICAgICAgICAgIGlmIGJyaWVmX2lkIGFuZCBydW5fc3RhdHVzOgogICAgICAgICAgICAgICAgcnVuX2JyaWVmX3N0YXR1c2VzLmFwcGVuZCgKICAgICAgICAgICAgICAgICAgICAoZmlsZV9pZCwgYnJpZWZfaWQsIHJ1bl9zdGF0dXMsIHBhcnNlX2NvbXBsZXRlZF9kYXRlKGNvbXBsZXRlZCkpCiAgICAgICAgICAgICAgICApCiAgICAgICAgICAgIGlmIGZpbGVfaWQuc3RhcnRzd2l0aCgiUlVOLUJSSUVGLSIpIGFuZCBub3QgYnJpZWZfaWQ6CiAgICAgICAgICAgICAgICBwcmludChmIltXQVJOXSBNaXNzaW5nIEJyaWVmIHJlZmVyZW5jZToge3BhdGh9IikKICAgICAgICAgICAgICAgIGlzc3VlcyArPSAxCgogICAgICAgIGlmIG5vdCBtZXRhX2lkOgogICAgICAgICAgICBwcmludChmIltFUlJdIE1pc3NpbmcgbWV0YSBJRDoge3BhdGh9IikKICAgICAgICAgICAgaXNzdWVzICs9IDEKICAgICAgICBpZiBub3QgaGVhZGVyX2lkOgogICAgICAgICAgICBwcmludChmIltFUlJdIE1pc3NpbmcgaGVhZGVyIElEOiB7cGF0aH0iKQogICAgICAgICAgICBpc3N1ZXMgKz0gMQoKICAgICAgICBwYXR0ZXJuID0gewogICAgICAgICAgICAiUkVRIjogUkVRX0lEX1BBVFRFUk4sCiAgICAgICAgICAgICJSVUxFIjogUlVMRV9JRF9QQVRURVJOLAogICAgICAgICAgICAiQURSIjogQURSX0lEX1BBVFRFUk4sCiAgICAgICAgICAgICJDUSI6IENRX0lEX1BBVFRFUk4sCiAgICAgICAgICAgICJCUklFRiI6IEJSSUVGX0lEX1BBVFRFUk4sCiAgICAgICAgICAgICJSVU4iOiBSVU5fSURfUEFUVEVSTiwKICAgICAgICB9W2V4cGVjdGVkX3ByZWZpeF0KCiAgICAgICAgaWYgbm90IHBhdHRlcm4ubWF0Y2goZmlsZV9pZCk6CiAgICAgICAgICAgIHByaW50KGYiW0VSUl0gSW52YWxpZCBmaWxlbmFtZSBmb3Ige2V4cGVjdGVkX3ByZWZpeH06IHtwYXRofSIpCiAgICAgICAgICAgIGlzc3VlcyArPSAxCgogICAgICAgIGlmIG1ldGFfaWQgYW5kIG1ldGFfaWQgIT0gZmlsZV9pZDoKICAgICAgICAgICAgcHJpbnQoZiJbRVJSXSBNZXRhIElEIG1pc21hdGNoOiB7cGF0aH0iKQogICAgICAgICAgICBpc3N1ZXMgKz0gMQogICAgICAgIGlmIGhlYWRlcl9pZCBhbmQgaGVhZGVyX2lkICE9IGZpbGVfaWQ6CiAgICAgICAgICAgIHByaW50KGYiW0VSUl0gSGVhZGVyIElEIG1pc21hdGNoOiB7cGF0aH0iKQogICAgICAgICAgICBpc3N1ZXMgKz0gMQoKICAgICAgICBpZiBleHBlY3RlZF9wcmVmaXggaW4geyJSRVEiLCAiUlVMRSJ9OgogICAgICAgICAgICBtdXN0X3JlYWQgPSBtZXRhLmdldCgiTXVzdC1SZWFkIikKICAgICAgICAgICAgaWYgbXVzdF9yZWFkIGlzIE5vbmU6CiAgICAgICAgICAgICAgICBwcmludChmIltFUlJdIE1pc3NpbmcgTXVzdC1SZWFkOiB7cGF0aH0iKQogICAgICAgICAgICAgICAgaXNzdWVzICs9IDEKICAgICAgICAgICAgZWxzZToKICAgICAgICAgICAgICAgIGlkcyA9IHBhcnNlX211c3RfcmVhZChtdXN0X3JlYWQpCiAgICAgICAgICAgICAgICBpZiBub3QgaWRzIGFuZCBtdXN0X3JlYWQuc3RyaXAoKS5sb3dlcigpICE9ICJub25lIjoKICAgICAgICAgICAgICAgICAgICBwcmludChmIltFUlJdIEVtcHR5IE11c3QtUmVhZDoge3BhdGh9IikKICAgICAgICAgICAgICAgICAgICBpc3N1ZXMgKz0gMQogICAgICAgICAgICAgICAgZm9yIHJlZl9pZCBpbiBpZHM6CiAgICAgICAgICAgICAgICAgICAgcHJlZml4ID0gcmVmX2lkLnNwbGl0KCItIiwgMSlbMF0KICAgICAgICAgICAgICAgICAgICBpZiBwcmVmaXggbm90IGluIEFMTE9XRURfTVVTVF9SRUFEX1BSRUZJWEVTOgogICAgICAgICAgICAgICAgICAgICAgICBwcmludChmIltFUlJdIE11c3QtUmVhZCBkaXNhbGxvd2VkIElEOiB7cGF0aH0gLT4ge3JlZl9pZH0iKQogICAgICAgICAgICAgICAgICAgICAgICBpc3N1ZXMgKz0gMQogICAgICAgICAgICAgICAgICAgIGlmIHJlZl9pZCBub3QgaW4gYWxsX2lkczoKICAgICAgICAgICAgICAgICAgICAgICAgcHJpbnQoZiJbRVJSXSBNdXN0LVJlYWQgbWlzc2luZyB0YXJnZXQ6IHtwYXRofSAtPiB7cmVmX2lkfSIpCiAgICAgICAgICAgICAgICAgICAgICAgIGlzc3VlcyArPSAxCgogICAgICAgIGlmIGV4cGVjdGVkX3ByZWZpeCA9PSAiUkVRIjoKICAgICAgICAgICAgc3RhdHVzID0gbWV0YS5nZXQoIlN0YXR1cyIsICIiKQogICAgICAgICAgICBpbXBsZW1lbnRlZF9naXQgPSBtZXRhLmdldCgiSW1wbGVtZW50ZWQtR2l0IiwgIiIpLnN0cmlwKCkKICAgICAgICAgICAgaWYgbm9ybWFsaXplX3N0YXR1cyhzdGF0dXMpID09ICJpbXBsZW1lbnRlZCIgYW5kIChub3QgaW1wbGVtZW50ZWRfZ2l0IG9yIGltcGxlbWVudGVkX2dpdCA9PSAiLSIpOgogICAgICAgICAgICAgICAgcHJpbnQoZiJbV0FSTl0gSW1wbGVtZW50ZWQgUkVRIG1pc3NpbmcgZ2l0IGhhc2g6IHtwYXRofSIpCiAgICAgICAgICAgICAgICBpc3N1ZXMgKz0gMQoKICAgICAgICBpZiBhcmdzLmxpbmtzOgogICAgICAgICAgICBmb3IgdGFyZ2V0IGluIGl0ZXJfbGlua3ModGV4dCk6CiAgICAgICAgICAgICAgICBpZiBub3QgdGFyZ2V0IG9yIHRhcmdldC5zdGFydHN3aXRoKCIjIik6CiAgICAgICAgICAgICAgICAgICAgY29udGludWUKICAgICAgICAgICAgICAgIGlmIHJlLm1hdGNoKHIiXlthLXpBLVpdW2EtekEtWjAtOSsuLV0qOiIsIHRhcmdldCk6CiAgICAgICAgICAgICAgICAgICAgY29udGludWUKICAgICAgICAgICAgICAgIHJlc29sdmVkID0gKHBhdGgucGFyZW50IC8gdGFyZ2V0KS5yZXNvbHZlKCkKICAgICAgICAgICAgICAgIGlmIG5vdCByZXNvbHZlZC5leGlzdHMoKToKICAgICAgICAgICAgICAgICAgICBwcmludChmIltFUlJdIEJyb2tlbiBsaW5rOiB7cGF0aH0gLT4ge3RhcmdldH0iKQogICAgICAgICAgICAgICAgICAgIGlzc3VlcyArPSAxCgogICAgIyBWaWV3IC0+IFJFUSBsaW5rIHZhbGlkYXRpb24KICAgIHZpZXdfcmVmczogc2V0W3N0cl0gPSBzZXQoKQogICAgZm9yIHBhdGggaW4gaXRlcl9tZF9maWxlcyhbVklFV1NfRElSXSk6CiAgICAgICAgdGV4dCA9IHJlYWRfdGV4dChwYXRoKQogICAgICAgIGluZGV4X3JlZnMgPSBleHRyYWN0X3ZpZXdfcmVmZXJlbmNlcyh0ZXh0KQogICAgICAgIHN1bW1hcnlfcmVmcyA9IGV4dHJhY3Rfdmlld19zdW1tYXJ5X3JlZnModGV4dCkKICAgICAgICBzc290X3JlZnMgPSBleHRyYWN0X3ZpZXdfc3NvdF9yZWZzKHRleHQpCiAgICAgICAgc3VtbWFyeV9saW5lcyA9IGV4dHJhY3Rfc2VjdGlvbl9saW5lcyh0ZXh0LCAiU3VtbWFyeSIpCgogICAgICAgIGlmIG5vdCBpbmRleF9yZWZzOgogICAgICAgICAgICBwcmludChmIltXQVJOXSBWaWV3IG1pc3NpbmcgUmVmZXJlbmNlcyAoU1NPVCBpbmRleCk6IHtwYXRofSIpCiAgICAgICAgICAgIGlzc3VlcyArPSAxCgogICAgICAgIGlmIG5vdCBzc290X3JlZnM6CiAgICAgICAgICAgIHByaW50KGYiW1dBUk5dIFZpZXcgbWlzc2luZyBTU09UIG1ldGE6IHtwYXRofSIpCiAgICAgICAgICAgIGlzc3VlcyArPSAxCgogICAgICAgIGZvciByZWZfaWQgaW4gc3NvdF9yZWZzOgogICAgICAgICAgICBpZiByZWZfaWQgbm90IGluIGluZGV4X3JlZnM6CiAgICAgICAgICAgICAgICBwcmludChmIltXQVJOXSBTU09UIHJlZiBub3QgaW4gU1NPVCBpbmRleDoge3BhdGh9IC0+IHtyZWZfaWR9IikKICAgICAgICAgICAgICAgIGlzc3VlcyArPSAxCiAgICAgICAgICAgIHJlZl9wYXRoID0gUkVRX0RJUiAvIGYie3JlZl9pZH0ubWQiCiAgICAgICAgICAgIGlmIG5vdCByZWZfcGF0aC5leGlzdHMoKToKICAgICAgICAgICAgICAgIHByaW50KGYiW1dBUk5dIFNTT1QgcmVmIG1pc3NpbmcgUkVROiB7cGF0aH0gLT4ge3JlZl9pZH0iKQogICAgICAgICAgICAgICAgaXNzdWVzICs9IDEKCiAgICAgICAgZm9yIHJlZl9pZCBpbiBpbmRleF9yZWZzOgogICAgICAgICAgICByZWZfcGF0aCA9IFJFUV9ESVIgLyBmIntyZWZfaWR9Lm1kIgogICAgICAgICAgICBpZiBub3QgcmVmX3BhdGguZXhpc3RzKCk6CiAgICAgICAgICAgICAgICBwcmludChmIltXQVJOXSBWaWV3IHJlZnMgbWlzc2luZyBSRVE6IHtwYXRofSAtPiB7cmVmX2lkfSIpCiAgICAgICAgICAgICAgICBpc3N1ZXMgKz0gMQoKICAgICAgICBmb3IgcmVmX2lkIGluIHN1bW1hcnlfcmVmczoKICAgICAgICAgICAgaWYgcmVmX2lkIG5vdCBpbiBpbmRleF9yZWZzOgogICAgICAgICAgICAgICAgcHJpbnQoZiJbV0FSTl0gU3VtbWFyeSByZWYgbm90IGluIFNTT1QgaW5kZXg6IHtwYXRofSAtPiB7cmVmX2lkfSIpCiAgICAgICAgICAgICAgICBpc3N1ZXMgKz0gMQogICAgICAgICAgICByZWZfcGF0aCA9IFJFUV9ESVIgLyBmIntyZWZfaWR9Lm1kIgogICAgICAgICAgICBpZiBub3QgcmVmX3BhdGguZXhpc3RzKCk6CiAgICAgICAgICAgICAgICBwcmludChmIltXQVJOXSBTdW1tYXJ5IHJlZiBtaXNzaW5nIFJFUToge3BhdGh9IC0+IHtyZWZfaWR9IikKICAgICAgICAgICAgICAgIGlzc3VlcyArPSAxCgogICAgICAgIGZvciBsaW5lIGluIHN1bW1hcnlfbGluZXM6CiAgICAgICAgICAgIGlmICI8IS0tIiBpbiBsaW5lOgogICAgICAgICAgICAgICAgY29udGludWUKICAgICAgICAgICAgaWYgIkFUTEFTOk9LIiBpbiBsaW5lIGFuZCBub3QgUkVGX1RPS0VOX1JFLnNlYXJjaChsaW5lKToKICAgICAgICAgICAgICAgIHByaW50KGYiW1dBUk5dIFN1bW1hcnkgbGluZSBtYXJrZWQgQVRMQVM6T0sgbWlzc2luZyByZWY6IHtwYXRofSIpCiAgICAgICAgICAgICAgICBpc3N1ZXMgKz0gMQogICAgICAgICAgICBpZiBhbnkoa2V5d29yZCBpbiBsaW5lIGZvciBrZXl3b3JkIGluIE5PUk1BVElWRV9LRVlXT1JEUykgYW5kIG5vdCBSRUZfVE9LRU5fUkUuc2VhcmNoKGxpbmUpOgogICAgICAgICAgICAgICAgcHJpbnQoZiJbV0FSTl0gU3VtbWFyeSBsaW5lIGhhcyBub3JtYXRpdmUga2V5d29yZCB3aXRob3V0IHJlZjoge3BhdGh9IikKICAgICAgICAgICAgICAgIGlzc3VlcyArPSAxCgogICAgICAgIHZpZXdfcmVmcy51cGRhdGUoaW5kZXhfcmVmcyB8IHN1bW1hcnlfcmVmcyB8IHNzb3RfcmVmcykKCiAgICAgICAgZm9yIHRhcmdldCBpbiBpdGVyX2xpbmtzKHRleHQpOgogICAgICAgICAgICBpZiBub3QgdGFyZ2V0IG9yIHRhcmdldC5zdGFydHN3aXRoKCIjIik6CiAgICAgICAgICAgICAgICBjb250aW51ZQogICAgICAgICAgICBpZiByZS5tYXRjaChyIl5bYS16QS1aXVthLXpBLVowLTkrLi1dKjoiLCB0YXJnZXQpOgogICAgICAgICAgICAgICAgY29udGludWUKICAgICAgICAgICAgcmVzb2x2ZWQgPSAocGF0aC5wYXJlbnQgLyB0YXJnZXQpLnJlc29sdmUoKQogICAgICAgICAgICBpZiBpc19yZWxhdGl2ZV90byhyZXNvbHZlZCwgUkVRX0RJUikgYW5kIG5vdCByZXNvbHZlZC5leGlzdHMoKToKICAgICAgICAgICAgICAgIHByaW50KGYiW1dBUk5dIEJyb2tlbiBSRVEgbGluayBpbiB2aWV3OiB7cGF0aH0gLT4ge3RhcmdldH0iKQogICAgICAgICAgICAgICAgaXNzdWVzICs9IDEKCiAgICAjIFJFUSB3aXRob3V0IGFueSB2aWV3IHJlZmVyZW5jZQogICAgcmVxX2lkcyA9IFtwYXRoLnN0ZW0gZm9yIHBhdGggaW4gYWxsX2RvY3MgaWYgcGF0aC5wYXJlbnQubmFtZSA9PSAicmVxIl0KICAgIGZvciByZXFfaWQgaW4gcmVxX2lkczoKICAgICAgICBpZiByZXFfaWQgbm90IGluIHZpZXdfcmVmczoKICAgICAgICAgICAgcHJpbnQoZiJbV0FSTl0gTWlzc2luZyB2aWV3IHJlZmVyZW5jZSBmb3IgUkVROiB7cmVxX2lkfSIpCiAgICAgICAgICAgIGlzc3VlcyArPSAxCgogICAgbGF0ZXN0X3J1bl9ieV9icmllZjogZGljdFtzdHIsIHR1cGxlW3N0ciwgc3RyLCBPcHRpb25hbFtkYXRldGltZV1dXSA9IHt9CiAgICBmb3IgcnVuX2lkLCBicmllZl9pZCwgcnVuX3N0YXR1cywgY29tcGxldGVkX2F0IGluIHJ1bl9icmllZl9zdGF0dXNlczoKICAgICAgICBub3JtYWxpemVkID0gbm9ybWFsaXplX3N0YXR1cyhydW5fc3RhdHVzKQogICAgICAgIGlmIG5vcm1hbGl6ZWQgbm90IGluIHsiY29tcGxldGVkIiwgImZhaWxlZCJ9OgogICAgICAgICAgICBjb250aW51ZQogICAgICAgIGV4aXN0aW5nID0gbGF0ZXN0X3J1bl9ieV9icmllZi5nZXQoYnJpZWZfaWQpCiAgICAgICAgaWYgZXhpc3RpbmcgaXMgTm9uZToKICAgICAgICAgICAgbGF0ZXN0X3J1bl9ieV9icmllZlticmllZl9pZF0gPSAocnVuX2lkLCBydW5fc3RhdHVzLCBjb21wbGV0ZWRfYXQpCiAgICAgICAgICAgIGNvbnRpbnVlCiAgICAgICAgZXhpc3RpbmdfcnVuX2lkLCBfLCBleGlzdGluZ19jb21wbGV0ZWQgPSBleGlzdGluZwogICAgICAgIGlmIGNvbXBsZXRlZF9hdCBhbmQgKGV4aXN0aW5nX2NvbXBsZXRlZCBpcyBOb25lIG9yIGNvbXBsZXRlZF9hdCA+IGV4aXN0aW5nX2NvbXBsZXRlZCk6CiAgICAgICAgICAgIGxhdGVzdF9ydW5fYnlfYnJpZWZbYnJpZWZfaWRdID0gKHJ1bl9pZCwgcnVuX3N0YXR1cywgY29tcGxldGVkX2F0KQogICAgICAgIGVsaWYgY29tcGxldGVkX2F0IGlzIE5vbmUgYW5kIGV4aXN0aW5nX2NvbXBsZXRlZCBpcyBOb25lIGFuZCBydW5faWQgPiBleGlzdGluZ19ydW5faWQ6CiAgICAgICAgICAgIGxhdGVzdF9ydW5fYnlfYnJpZWZbYnJpZWZfaWRdID0gKHJ1bl9pZCwgcnVuX3N0YXR1cywgY29tcGxldGVkX2F0KQoKICAgIGZvciBicmllZl9pZCwgKHJ1bl9pZCwgcnVuX3N0YXR1cywgXykgaW4gbGF0ZXN0X3J1bl9ieV9icmllZi5pdGVtcygpOgogICAgICAgIGJyaWVmX3N0YXR1cyA9IGJyaWVmX3N0YXR1c2VzLmdldChicmllZl9pZCkKICAgICAgICBpZiBub3QgYnJpZWZfc3RhdHVzOgogICAgICAgICAgICBwcmludChmIltXQVJOXSBCUklFRiBtaXNzaW5nIGZvciBSVU46IHtydW5faWR9IC0+IHticmllZl9pZH0iKQogICAgICAgICAgICBpc3N1ZXMgKz0gMQogICAgICAgICAgICBjb250aW51ZQogICAgICAgIGlmIG5vcm1hbGl6ZV9zdGF0dXMoYnJpZWZfc3RhdHVzKSAhPSBub3JtYWxpemVfc3RhdHVzKHJ1bl9zdGF0dXMpOgogICAgICAgICAgICBwcmludCgKICAgICAgICAgICAgICAgIGYiW1dBUk5dIEJSSUVGIHN0YXR1cyBtaXNtYXRjaDoge2JyaWVmX2lkfSBpcyB7YnJpZWZfc3RhdHVzfSwgbGF0ZXN0IFJVTiB7cnVuX2lkfSBpcyB7cnVuX3N0YXR1c30iCiAgICAgICAgICAgICkKICAgICAgICAgICAgaXNzdWVzICs9IDEKCiAgICBpZiBMQVNUX1JVTl9QQVRILmV4aXN0cygpOgogICAgICAgIHRyeToKICAgICAgICAgICAgc3RhdGUgPSBqc29uLmxvYWRzKHJlYWRfdGV4dChMQVNUX1JVTl9QQVRIKSkKICAgICAgICBleGNlcHQganNvbi5KU09ORGVjb2RlRXJyb3I6CiAgICAgICAgICAgIHN0YXRlID0ge30KICAgICAgICAgICAgcHJpbnQoZiJbRVJSXSBJbnZhbGlkIEpTT046IHtMQVNUX1JVTl9QQVRIfSIpCiAgICAgICAgICAgIGlzc3VlcyArPSAxCiAgICAgICAgc3RhZ2UgPSBzdGF0ZS5nZXQoInN0YWdlIikKICAgICAgICB1cGRhdGVkX2F0ID0gc3RhdGUuZ2V0KCJ1cGRhdGVkX2F0Iikgb3Igc3RhdGUuZ2V0KCJjb21wbGV0ZWRfYXQiKQogICAgICAgIGlmIHN0YWdlID09ICJleGVjdXRpbmciIGFuZCB1cGRhdGVkX2F0OgogICAgICAgICAgICB0cnk6CiAgICAgICAgICAgICAgICB0cyA9IGRhdGV0aW1lLmZyb21pc29mb3JtYXQodXBkYXRlZF9hdCkKICAgICAgICAgICAgICAgIGlmIGRhdGV0aW1lLm5vdygpIC0gdHMgPiB0aW1lZGVsdGEoaG91cnM9YXJncy5tYXhfYWdlX2hvdXJzKToKICAgICAgICAgICAgICAgICAgICBwcmludCgKICAgICAgICAgICAgICAgICAgICAgICAgZiJbV0FSTl0gUlVOIG1heSBiZSB1bmZpbmlzaGVkICg+e2FyZ3MubWF4X2FnZV9ob3Vyc31oKToge3N0YXRlLmdldCgncnVuX2lkJyl9IgogICAgICAgICAgICAgICAgICAgICkKICAgICAgICAgICAgICAgICAgICBpc3N1ZXMgKz0gMQogICAgICAgICAgICBleGNlcHQgVmFsdWVFcnJvcjoKICAgICAgICAgICAgICAgIHByaW50KCJbRVJSXSBJbnZhbGlkIHRpbWVzdGFtcCBpbiBsYXN0X3J1bi5qc29uIikKICAgICAgICAgICAgICAgIGlzc3VlcyArPSAxCgogICAgcHJpbnQoZiJbRE9ORV0gRG9jdG9yIGNvbXBsZXRlZCB3aXRoIHtpc3N1ZXN9IGlzc3VlKHMpLiIpCiAgICByZXR1cm4gMCBpZiBpc3N1ZXMgPT0gMCBlbHNlIDEKCgogICAgcHJpbnQoZiJbRE9ORV0gRG9jdG9yIGNvbXBsZXRlZCB3aXRoIHtpc3N1ZXN9IGlzc3VlKHMpLiIpCiAgICByZXR1cm4gMCBpZiBpc3N1ZXMgPT0gMCBlbHNlIDEKCgpkZWYgcGFyc2VfdmVyc2lvbih2OiBzdHIpIC0+IHR1cGxlW2ludCwgLi4uXToKICAgIHRyeToKICAgICAgICByZXR1cm4gdHVwbGUobWFwKGludCwgdi5zdHJpcCgpLnNwbGl0KCIuIikpKQogICAgZXhjZXB0IFZhbHVlRXJyb3I6CiAgICAgICAgcmV0dXJuICgwLCAwLCAwKQoKCmRlZiBjaGVja192ZXJzaW9uX3VwZGF0ZSgpIC0+IE5vbmU6CiAgICAiIiJDaGVjayBpZiBBdGxhcyBoYXMgYmVlbiB1cGRhdGVkIGFuZCBwcmludCBjaGFuZ2Vsb2cuIiIiCiAgICBpZiBub3QgVkVSU0lPTl9QQVRILmV4aXN0cygpOgogICAgICAgIHJldHVybgoKICAgIGluc3RhbGxlZF92ZXJfc3RyID0gVkVSU0lPTl9QQVRILnJlYWRfdGV4dChlbmNvZGluZz0idXRmLTgiKS5zdHJpcCgpCiAgICBpZiBub3QgaW5zdGFsbGVkX3Zlcl9zdHI6CiAgICAgICAgcmV0dXJuCgogICAgaW5zdGFsbGVkX3ZlciA9IHBhcnNlX3ZlcnNpb24oaW5zdGFsbGVkX3Zlcl9zdHIpCiAgICBjdXJyZW50X3ZlciA9IHBhcnNlX3ZlcnNpb24oQVRMQVNfVkVSU0lPTikKCiAgICBpZiBjdXJyZW50X3ZlciA+IGluc3RhbGxlZF92ZXI6CiAgICAgICAgcHJpbnQoZiJcbltJTkZPXSBVcGdyYWRpbmcgQXRsYXM6IHtpbnN0YWxsZWRfdmVyX3N0cn0gLT4ge0FUTEFTX1ZFUlNJT059IikKICAgICAgICBwcmludCgiPSIgKiA2MCkKICAgICAgICAKICAgICAgICAjIENvbGxlY3QgdmVyc2lvbnMgdG8gcHJpbnQKICAgICAgICB2ZXJzaW9uc190b19wcmludCA9IFtdCiAgICAgICAgZm9yIHZlcl9zdHIgaW4gQ0hBTkdFTE9HOgogICAgICAgICAgICB2ZXIgPSBwYXJzZV92ZXJzaW9uKHZlcl9zdHIpCiAgICAgICAgICAgIGlmIHZlciA+IGluc3RhbGxlZF92ZXIgYW5kIHZlciA8PSBjdXJyZW50X3ZlcjoKICAgICAgICAgICAgICAgIHZlcnNpb25zX3RvX3ByaW50LmFwcGVuZCgodmVyLCB2ZXJfc3RyKSkKICAgICAgICAKICAgICAgICAjIFNvcnQgYnkgdmVyc2lvbiBkZXNjZW5kaW5nCiAgICAgICAgdmVyc2lvbnNfdG9fcHJpbnQuc29ydChrZXk9bGFtYmRhIHg6IHhbMF0sIHJldmVyc2U9VHJ1ZSkKICAgICAgICAKICAgICAgICBmb3IgXywgdmVyX3N0ciBpbiB2ZXJzaW9uc190b19wcmludDoKICAgICAgICAgICAgcHJpbnQoZiJbe3Zlcl9zdHJ9XSIpCiAgICAgICAgICAgIGZvciBjaGFuZ2UgaW4gQ0hBTkdFTE9HW3Zlcl9zdHJdOgogICAgICAgICAgICAgICAgcHJpbnQoZiItIHtjaGFuZ2V9IikKICAgICAgICAgICAgcHJpbnQoKQogICAgICAgICAgICAKICAgICAgICBwcmludCgiPSIgKiA2MCkKICAgICAgICAKICAgICAgICAjIFVwZGF0ZSBWRVJTSU9OIGZpbGUKICAgICAgICBpZiBWRVJTSU9OX1BBVEguZXhpc3RzKCk6CiAgICAgICAgICAgIHdyaXRlX3RleHQoVkVSU0lPTl9QQVRILCBBVExBU19WRVJTSU9OKQogICAgICAgICAgICBwcmludChmIltPS10gVXBkYXRlZCBWRVJTSU9OIGZpbGUgdG8ge0FUTEFTX1ZFUlNJT059XG4iKQoKCmRlZiBidWlsZF9wYXJzZXIoKSAtPiBhcmdwYXJzZS5Bcmd1bWVudFBhcnNlcjoKICAgIHBhcnNlciA9IGFyZ3BhcnNlLkFyZ3VtZW50UGFyc2VyKHByb2c9ImF0bGFzIikKICAgIHBhcnNlci5hZGRfYXJndW1lbnQoCiAgICAgICAgIi0tdmVyc2lvbiIsICItdiIsCiAgICAgICAgYWN0aW9uPSJ2ZXJzaW9uIiwKICAgICAgICB2ZXJzaW9uPWYiQXRsYXMge2dldF92ZXJzaW9uKCl9IgogICAgKQogICAgc3ViID0gcGFyc2VyLmFkZF9zdWJwYXJzZXJzKGRlc3Q9ImNvbW1hbmQiLCByZXF1aXJlZD1GYWxzZSkKCiAgICBpbml0ID0gc3ViLmFkZF9wYXJzZXIoImluaXQiKQogICAgaW5pdC5hZGRfYXJndW1lbnQoIi0tb3ZlcndyaXRlIiwgYWN0aW9uPSJzdG9yZV90cnVlIikKCiAgICBjYXB0dXJlID0gc3ViLmFkZF9wYXJzZXIoImNhcHR1cmUiKQogICAgY2FwdHVyZS5hZGRfYXJndW1lbnQoInRleHQiKQogICAgY2FwdHVyZS5hZGRfYXJndW1lbnQoIi0tZG9tYWluIiwgZGVmYXVsdD0iR0VOIikKICAgIGNhcHR1cmUuYWRkX2FyZ3VtZW50KCItLXRvIiwgY2hvaWNlcz1bImJyaWVmIl0pCgogICAgaW50YWtlID0gc3ViLmFkZF9wYXJzZXIoImludGFrZSIpCiAgICBpbnRha2UuYWRkX2FyZ3VtZW50KCJ0ZXh0IikKICAgIGludGFrZS5hZGRfYXJndW1lbnQoIi0tZG9tYWluIiwgZGVmYXVsdD0iR0VOIikKICAgIGludGFrZS5hZGRfYXJndW1lbnQoIi0tdG8iLCBjaG9pY2VzPVsiYnJpZWYiXSkKCiAgICBydW4gPSBzdWIuYWRkX3BhcnNlcigicnVuIikKICAgIHJ1bi5hZGRfYXJndW1lbnQoInJlcV9pZCIpCiAgICBydW4uYWRkX2FyZ3VtZW50KCItLXN0ZXAiLCB0eXBlPWludCkKCiAgICBwbGFuID0gc3ViLmFkZF9wYXJzZXIoInBsYW4iKQogICAgcGxhbi5hZGRfYXJndW1lbnQoImJyaWVmX2lkIikKICAgIHBsYW4uYWRkX2FyZ3VtZW50KCItLXN0ZXAiLCB0eXBlPWludCkKCiAgICBmaW5pc2ggPSBzdWIuYWRkX3BhcnNlcigiZmluaXNoIikKICAgIGZpbmlzaC5hZGRfYXJndW1lbnQoInJ1bl9pZCIpCiAgICBmaW5pc2guYWRkX2FyZ3VtZW50KCItLWdpdCIpCiAgICBmaW5pc2guYWRkX2FyZ3VtZW50KCItLXN1Y2Nlc3MiLCB0eXBlPWxhbWJkYSB2OiB2Lmxvd2VyKCkgPT0gInRydWUiLCByZXF1aXJlZD1UcnVlKQoKICAgIGRvY3RvciA9IHN1Yi5hZGRfcGFyc2VyKCJkb2N0b3IiKQogICAgZG9jdG9yLmFkZF9hcmd1bWVudCgiLS1saW5rcyIsIGFjdGlvbj0ic3RvcmVfdHJ1ZSIpCiAgICBkb2N0b3IuYWRkX2FyZ3VtZW50KCItLW1heC1hZ2UtaG91cnMiLCB0eXBlPWludCwgZGVmYXVsdD0yNCkKCiAgICBzeW5jID0gc3ViLmFkZF9wYXJzZXIoInN5bmMiLCBoZWxwPSJTeW5jIFJVTiBzdGF0dXMgdG8gQlJJRUYvUkVRIGRvY3VtZW50cyIpCiAgICBzeW5jLmFkZF9hcmd1bWVudCgicnVuX2lkIiwgaGVscD0iUlVOIGRvY3VtZW50IElEIikKICAgIHN5bmMuYWRkX2FyZ3VtZW50KCItLWFwcGx5LWJyaWVmIiwgYWN0aW9uPSJzdG9yZV90cnVlIiwgaGVscD0iQXBwbHkgY2hhbmdlcyB0byBCUklFRiBkb2N1bWVudCIpCiAgICBzeW5jLmFkZF9hcmd1bWVudCgiLS13cml0ZS1yZXEtcGF0Y2giLCBhY3Rpb249InN0b3JlX3RydWUiLCBoZWxwPSJXcml0ZSBSRVEgcGF0Y2ggZmlsZSIpCiAgICBzeW5jLmFkZF9hcmd1bWVudCgiLS1hcHBseS1yZXEiLCBhY3Rpb249InN0b3JlX3RydWUiLCBoZWxwPSJBcHBseSBjaGFuZ2VzIHRvIFJFUSBkb2N1bWVudCAoY2F1dGlvbikiKQoKICAgIHJldHVybiBwYXJzZXIKCgpkZWYgbWFpbihhcmd2OiBPcHRpb25hbFtsaXN0W3N0cl1dID0gTm9uZSkgLT4gaW50OgogICAgcGFyc2VyID0gYnVpbGRfcGFyc2VyKCkKICAgIGFyZ3MgPSBwYXJzZXIucGFyc2VfYXJncyhhcmd2KQoKICAgIGlmIG5vdCBhcmdzLmNvbW1hbmQ6CiAgICAgICAgcGFyc2VyLnByaW50X2hlbHAoKQogICAgICAgIHJldHVybiAwCgogICAgaWYgYXJncy5jb21tYW5kICE9ICJpbml0IiBhbmQgbm90IEFUTEFTX1JPT1QuZXhpc3RzKCk6CiAgICAgICAgcHJpbnQoIltJTkZPXSAuYXRsYXMgbm90IGZvdW5kLiBJbml0aWFsaXppbmcuLi4iKQogICAgICAgIGluaXRfY29tbWFuZChhcmdzKQoKICAgIGlmIGFyZ3MuY29tbWFuZCAhPSAiaW5pdCI6CiAgICAgICAgY2hlY2tfdmVyc2lvbl91cGRhdGUoKQoKICAgIGlmIGFyZ3MuY29tbWFuZCA9PSAiaW5pdCI6CiAgICAgICAgcmV0dXJuIGluaXRfY29tbWFuZChhcmdzKQogICAgaWYgYXJncy5jb21tYW5kID09ICJjYXB0dXJlIjoKICAgICAgICByZXR1cm4gY2FwdHVyZV9jb21tYW5kKGFyZ3MpCiAgICBpZiBhcmdzLmNvbW1hbmQgPT0gImludGFrZSI6CiAgICAgICAgcHJpbnQoIltXQVJOXSAnaW50YWtlJyBpcyBkZXByZWNhdGVkLiBVc2UgJ2NhcHR1cmUnIGluc3RlYWQuIikKICAgICAgICByZXR1cm4gY2FwdHVyZV9jb21tYW5kKGFyZ3MpCiAgICBpZiBhcmdzLmNvbW1hbmQgPT0gInJ1biI6CiAgICAgICAgcmV0dXJuIHJ1bl9jb21tYW5kKGFyZ3MpCiAgICBpZiBhcmdzLmNvbW1hbmQgPT0gInBsYW4iOgogICAgICAgIHJldHVybiBwbGFuX2NvbW1hbmQoYXJncykKICAgIGlmIGFyZ3MuY29tbWFuZCA9PSAiZmluaXNoIjoKICAgICAgICByZXR1cm4gZmluaXNoX2NvbW1hbmQoYXJncykKICAgIGlmIGFyZ3MuY29tbWFuZCA9PSAiZG9jdG9yIjoKICAgICAgICByZXR1cm4gZG9jdG9yX2NvbW1hbmQoYXJncykKICAgIGlmIGFyZ3MuY29tbWFuZCA9PSAic3luYyI6CiAgICAgICAgcmV0dXJuIHN5bmNfY29tbWFuZChhcmdzKQoKICAgIHBhcnNlci5wcmludF9oZWxwKCkKICAgIHJldHVybiAxCgoKaWYgX19uYW1lX18gPT0gIl9fbWFpbl9fIjoKICAgIHJhaXNlIFN5c3RlbUV4aXQobWFpbigpKQo="
-    
-    # Checkbox patterns
-    CHECKBOX_UNCHECKED = re.compile(r"^(\s*)-\s*\[\s*\](.*)$")
-    CHECKBOX_CHECKED = re.compile(r"^(\s*)-\s*\[x\](.*)$", re.IGNORECASE)
-    TRACEABILITY_LINK_RE = re.compile(r"\*\*(?:Implements|Answers|Solved by|Implemented by)\*\*:\s*\[([^\]]+)\]\(([^)]+)\)")
-    
-    DEFAULT_TOP_DOCS = {
-        ATLAS_ROOT / "FRONT.md": """# Atlas\n\nThis repo uses Atlas vNext.\nUse: `python atlas.py init`\n\nQuick flow:\n1) `python atlas.py capture \"...\" --domain GEN`\n2) `python atlas.py run REQ-GEN-001`\n3) `python atlas.py finish RUN-REQ-GEN-001-step-01 --git <hash|no-commit> --success true`\n\nLinks: BOARD.md, CONVENTIONS.md, GOALS.md\n""",
-        ATLAS_ROOT / "BOARD.md": """# BOARD\n\n> 이 문서는 프로젝트의 **현재 작업 상태 스냅샷**을 나타냅니다.\n> 비어 있는 경우, 해당 상태에 해당하는 작업이 없음을 의미합니다.\n\n## Queue\n- (empty)\n\n## Active\n- (empty)\n\n## Done\n- (empty)\n\n> Last Reviewed: YYYY-MM-DD\n""",
-        ATLAS_ROOT / "CONVENTIONS.md": """# CONVENTIONS\n\n## Boundaries\n\n### Always\n- Keep REQ/RULE/ADR/CQ as authority; do not auto-edit without intent.\n- Record verification steps in RUN.\n\n### Ask First\n- Add or remove dependencies.\n- Change storage layout under `.atlas/`.\n\n### Never\n- Hardcode secrets.\n- Modify existing REQ/RULE/ADR/CQ silently.\n\n## Roles (one-line)\n- REQ: what the system must do (SSOT).\n- RULE: constraints that must always hold (SSOT).\n- ADR: architectural decisions (SSOT).\n- CQ: questions the system must answer.\n- VIEW: human-readable context.\n- DRAFT: optional intake scratchpad.\n- RUN: execution plan and evidence.\n\n## Verification\n- `python atlas.py doctor`\n- (project tests as defined)\n""",
-        ATLAS_ROOT / "GOALS.md": """# GOALS\n\n- Purpose: (fill in)\n- In scope: (fill in)\n- Out of scope: (fill in)\n""",
-    }
-    
-    DEFAULT_TEMPLATES = {
-        "REQ.md": """# [REQ-XXX-001] Title\n\n> **ID**: REQ-XXX-001\n> **Domain**: XXX\n> **Status**: Draft\n> **Last Updated**: YYYY-MM-DD\n> **Implemented-Git**: -\n> **Linked-RUN**: -\n> **Must-Read**: RULE-XXX-001\n\n---\n\n## Decision\n- (what must be true)\n\n## Input\n- (inputs)\n\n## Output\n- (outputs)\n\n## Acceptance Criteria\n- [ ] (criteria)\n""",
-        "RULE.md": """# [RULE-XXX-001] Title\n\n> **ID**: RULE-XXX-001\n> **Domain**: XXX\n> **Priority**: Medium\n> **Last Updated**: YYYY-MM-DD\n> **Must-Read**: RULE-XXX-001\n\n---\n\n## Rule Statement\n- (always true / forbidden)\n\n## Scope\n- (where it applies)\n\n## Violation\n- (what counts as a violation)\n\n## Examples\n\n### Correct\n- (example)\n\n### Incorrect\n- (example)\n""",
-        "CQ.md": """# [CQ-XXX-001] Title\n\n> **ID**: CQ-XXX-001\n> **Domain**: XXX\n> **Status**: Draft\n> **Last Updated**: YYYY-MM-DD\n\n---\n\n## Question\n- (what must the system answer?)\n\n## Expected Answer (Criteria)\n1. ...\n2. ...\n\n## Traceability\n- **Solves by**: [REQ-XXX-001](../req/REQ-XXX-001.md)\n- **Constrained by**: [RULE-XXX-001](../rule/RULE-XXX-001.md)\n""",
-        "BRIEF.md": """# [BRIEF-XXX-001] Title\n\n> **ID**: BRIEF-XXX-001\n> **Domain**: XXX\n> **Status**: Active\n> **Date**: YYYY-MM-DD\n\n## 1. User Request\n- (raw text)\n\n## 2. Intent Summary\n- Goal:\n- Problem:\n\n## 3. Affected Artifacts\n- Create: \n- Modify: \n- Read: \n\n## 4. Proposed Changes\n1. \n2. \n\n## 5. Verification Criteria\n- [ ] \n""",
-        "RUN.md": """# [RUN-REQ-XXX-001-step-01] Title\n\n> **ID**: RUN-REQ-XXX-001-step-01\n> **REQ**: REQ-XXX-001\n> **Status**: Planned\n> **Started**: YYYY-MM-DD\n> **Git**: -\n> **Completed**: -\n\n## Target REQ\n- REQ-XXX-001\n\n## Plan\n- [ ] \n\n## Verification\n- [ ] Test\n- [ ] Spec\n- [ ] Boundary\n\n## Output\n- (files created/modified)\n""",
-        "VIEW.md": """# [VIEW-REQ-XXX-001] Title\n\n> **Refs**: REQ-XXX-001\n> **Last Updated**: YYYY-MM-DD\n\n## Summary\n- (human-readable summary)\n\n## References (SSOT)\n- [REQ-XXX-001](../req/REQ-XXX-001.md)\n""",
-        "ADR.md": """# [ADR-XXX-001] Title\n\n> **ID**: ADR-XXX-001\n> **Domain**: XXX\n> **Status**: Draft\n> **Date**: YYYY-MM-DD\n> **Supersedes**: -\n> **Superseded-By**: -\n\n---\n\n## Context\n- (why this decision is needed)\n\n## Decision\n- (the decision)\n\n## Consequences\n- (trade-offs and follow-ups)\n\n## References\n- (REQ/RULE links)\n""",
-    }
-    
-    DEFAULT_PROMPTS = {
-        "onboarding.md": """# Atlas Audit Prompt
-    
-    > **Note**: 기존 `Onboarding Prompt`가 **`Audit Prompt`**로 재정의되었습니다.
-    > 이 프롬프트는 더 이상 파일을 자동으로 생성하지 않으며, 현재 프로젝트와 문서 간의 **정합성(Consistency)을 감사(Audit)**하는 역할을 수행합니다.
-    
-    ---
-    
-    ## Prompt
-    
-    ```
-    당신은 이 프로젝트의 **문서 정합성 감사관(Auditor)**입니다.
-    이미 존재하는 Atlas 문서들(.atlas/ 폴더 내 GOALS, CONVENTIONS, BOARD, FRONT)이 현재 프로젝트의 실제 상태(코드, 최근 작업, 기술 스택 등)와 일치하는지 점검하는 것이 주 임무입니다.
-    
-    ### [Strict Rules] 핵심 규칙
-    1. **READ-ONLY**: 절대, 어떤 경우에도 기존 파일을 직접 수정하거나 내용을 자동 업데이트하지 마세요.
-    2. **제안 모드 (Suggestion Only)**: 불일치나 누락이 발견되면 "어떻게 수정하면 좋을지"를 제안 형식으로만 출력하세요.
-    3. **비판적 시각**: 단순히 내용을 요약하지 말고, "정말 이 내용이 현재 유효한가?"를 끊임없이 의심하며 검증하세요.
-    
-    ### [Checklist] 검사 관점
-    
-    LLM은 다음 기준에 따라 각 문서를 엄격하게 평가해야 합니다:
-    
-    #### 1. GOALS.md (목표 정합성)
-    - **Active Task와 일치 여부**: 현재 진행 중인 작업들이 GOALS에 정의된 핵심 목표를 벗어나지 않았는가?
-    - **Scope Creep 감지**: 최근 논의되거나 추가된 기능이 In-Scope 범위 내에 있는가? 아니면 범위를 조용히 넓히고 있는가?
-    
-    #### 2. CONVENTIONS.md (규칙 현실성)
-    - **위반 가능성 점검**: 실제 코드나 최근 커밋 내용이 문서의 규칙(Always, Never)을 위반하고 있지 않은가?
-    - **구체성 검증**: 규칙이 너무 추상적이어서(예: "깨끗한 코드 작성") 실제 지침이 되지 못하는 부분은 없는가?
-    
-    #### 3. BOARD.md (현황 동기화)
-    - **Active 상태 검증**: Active에 있는 작업이 현재 실제로 진행 중인가? (GOALS 범위를 벗어난 작업이 Active에 있는가?)
-    - **Queue 방치 점검**: Queue에 있는 항목들이 너무 오래 방치되어, 현재의 GOALS와 맞지 않게 되었는가?
-    
-    #### 4. FRONT.md (환경 최신화)
-    - **기술 스택 현실화**: 문서에 적힌 기술 스택이 실제 프로젝트 코드와 일치하는가?
-    - **암묵적 전제**: 팀 내에서 암묵적으로 합의된 중요한 변경 사항이 문서에서 누락되지 않았는가?
-    
-    ---
-    
-    ### [Audit Report] 출력 양식
-    
-    각 파일별로 아래 상태 아이콘을 사용하여 진단 결과를 출력하세요.
-    
-    - [PASS] **일치 (Pass)**
-    - [WARN] **의심 (Warning)**: 확인이 필요하거나 모호한 부분.
-    - [FAIL] **불일치/누락 (Fail)**: 명확한 오류, 즉시 수정 필요.
-    
-    **[작성 예시]**
-    
-    ### 1. GOALS.md
-    - [PASS] 핵심 목표 여전히 유효함.
-    - [WARN] **의심**: '실시간 채팅' 기능이 최근 작업(Task-102)에서 구현 중인데, GOALS의 Scope에는 명시되지 않았음. 업데이트 필요.
-    
-    ### 2. CONVENTIONS.md
-    - [FAIL] **불일치**: 문서에는 'Type Hint 필수'라고 되어 있으나, 최근 `utils.py` 등에서 많은 함수가 타이핑 없이 작성됨.
-        - **제안**: 규칙을 강화하거나, 예외 상황을 문서에 명시할 것.
-    
-    (이하 BOARD, FRONT 동일 포맷)
-    \n
-    \n---
-    \n
-    \n### 🚀 [Recommended Actions] 이후 진행 가이드
-    \n
-    \n감사 결과를 바탕으로 사용자가 취해야 할 구체적인 행동을 제안하세요.
-    \n
-    \n1. **승인 필요 (Needs Approval)**: ⚠️/❌ 항목 중, 사용자의 확인이 필요한 정책적 결정 사항.
-    \n2. **수정 제안 (Edits)**: 즉시 문서를 수정해야 하는 사항 (구체적인 문구 제안 포함).
-    \n3. **새로운 태스크 (New Tasks)**: 문서 정합성을 위해 새로 등록해야 할 작업 (예: "로그 시스템 리팩토링 스펙 문서 작성").
-    \n
-    \n**[작성 예시]**
-    \n### 🚀 이후 진행 가이드
-    \n1. **CONVENTIONS.md 업데이트**: `Type Hint` 규칙을 `Strict`에서 `Optional`로 완화하는 문구로 수정할 것을 제안합니다.
-    \n2. **GOALS.md 검토**: '실시간 채팅' 기능이 In-Scope인지 PM과 협의 후 Scope 섹션 업데이트 필요.
-    \n```
-    \n
-    
-    ---
-    
-    ## How to execute
-    이 프롬프트는 정기적으로(또는 프로젝트 방향성이 흔들릴 때) LLM에게 제시하여 문서 부채를 점검하는 용도로 사용합니다.
-    """,
-    }
-    
-    
-    def get_version() -> str:
-        """Read version from VERSION file (SSOT)."""
-        if VERSION_PATH.exists():
-            return VERSION_PATH.read_text(encoding="utf-8").strip()
+
+    # The document index is per workspace.
+    _DOC_INDEX = None
+
+
+set_workspace(TOOL_ROOT)
+
+
+class LazyPattern:
+    """A regex compiled on first use, so start-up only pays for the patterns a command touches.
+
+    Attribute lookups are forwarded to the compiled re.Pattern and cached on
+    the instance, so later calls cost the same as on the pattern itself.
+    """
+
+    def __init__(self, pattern: str, flags: int = 0) -> None:
+        self.pattern = pattern
+        self.flags = flags
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = getattr(re.compile(self.pattern, self.flags), name)
+        setattr(self, name, value)
+        return value
+
+    def __reduce__(self):
+        return LazyPattern, (self.pattern, self.flags)
+
+
+# ID numbers are zero-padded to three digits (RUN steps to two) and widen
+# past 999 (99) without padding, so every number has exactly one spelling:
+# REQ-CORE-007, REQ-CORE-999, REQ-CORE-1000, but never REQ-CORE-0007.
+ID_NUMBER = r"(?:\d{3}|[1-9]\d{3,})"
+STEP_NUMBER = r"(?:\d{2}|[1-9]\d{2,})"
+REQ_ID_PATTERN = LazyPattern(rf"^REQ-([A-Z]+)-({ID_NUMBER})$")
+RULE_ID_PATTERN = LazyPattern(rf"^RULE-([A-Z]+)-({ID_NUMBER})$")
+ADR_ID_PATTERN = LazyPattern(rf"^ADR-([A-Z]+)-({ID_NUMBER})$")
+CQ_ID_PATTERN = LazyPattern(rf"^CQ-([A-Z]+)-({ID_NUMBER})$")
+BRIEF_ID_PATTERN = LazyPattern(rf"^BRIEF-([A-Z]+)-({ID_NUMBER})$")
+RUN_ID_PATTERN = LazyPattern(rf"^RUN-(BRIEF|REQ)-([A-Z]+)-({ID_NUMBER})-step-({STEP_NUMBER})$")
+
+META_RE = LazyPattern(r"^>\s*\*\*([^*]+)\*\*:\s*(.+)$")
+HEADER_ID_RE = LazyPattern(r"^#\s+\[([^\]]+)\]", re.M)
+LINK_RE = LazyPattern(r"\[[^\]]*\]\(([^)]+)\)")
+REQ_REF_RE = LazyPattern(rf"REQ-[A-Z]+-{ID_NUMBER}(?!\d)")
+REF_TOKEN_RE = LazyPattern(rf"@(?P<id>REQ-[A-Z]+-{ID_NUMBER})(?!\d)(?:#[^)\s]+)?")
+ID_DIGITS_RE = LazyPattern(r"(\d+)")
+NORMATIVE_KEYWORDS = ["반드시", "해야", "불가", "금지", "항상"]
+
+ALLOWED_MUST_READ_PREFIXES = {"RULE"}
+
+
+# Embedded source code (populated by build.py)
+# __EMBEDDED_SRC_PLACEHOLDER__ will be replaced with the zlib-compressed,
+# base85-encoded source; only `init` decodes it.
+EMBEDDED_SRC_B85 = "c-q9hYj+#hl_>ZfzoG(lkE&z<lAK3(sHW323E7M(QYI-snnFWGpdeNRppYs+6vJ?q6Dz&kN$%}rV#i9x&baTS+ewytjgxjK&g$gP^hc9gGe2SW>%8g#LXLB<lSLJ(&U2rA_TFco{kZVC%d;%KydRG*N8|h6<Y;=3j6Ywi*Xt|OVVHUMH=_qrZ*^n61+Qwgcr;1UsTZbqCt;dJ>i5^OWUQW(Og&AKEPgNvrw8gqsw-qiS#6LeBd?c?r_jSN-uL8_ycvb#@NSfHseU+(rtv6JWz_G6hkyIga2j$!?9FQHCU#CArbm-_d{@0+pGIl8KZN@9G)>Zmw;4i9yR!+t-I`3}WE>7_wUynCm7VTO?d_fQtxa#)t6yn-zI6p4vHJYV=5y_ht>@t7am|DO<kOP3M?dM+b~Ffk(EO6Ov$M6^9K>k`lb@!u-gK5mo_{}%4ztT)KfT;f!@)GW9FO;t2baUNcM#u?f>ym@+PWTvSZT@Yg%f<ZoX*DHVUpe(43k6eFrFTG+wB*d`(YOKz3p3@-uhZr-oPLp$Jv2*n8wp6^VUZ&=TQVu?>C=|r<XV4@jZCN7N!X{S>8xL!HIeI!(oie0jL6Vfh8VfUO4W1cjKuS-H-dxxEDDM>_*TZR#@`Fe&2g(z5Vj#m9_0_-fV*H;K(mir&OiWP_TVE4_iHwmDx0D_M>Uk!&UQ=fp<SjGkoMGE1+;QjmLm)2jTc`G)(S#y1XiG`o5a)dwm>F<8TPm9Yz3eHQ3rot#-j%A9%1dW5hSYy)5lr4skbid&9UjIcfl!rU373?`p@3GjDnjd1;bNTU>X4Htr8$31Rn9EvVteV_nMBzS8l0Sb-M*4&0`?xD^05aSQm}?jRmU-EPoIqbwQTkNlt(4?HT<8Ux~c%YfSU80$+kqus5ojqdi=)-JTfrOnW5(J+hV7ei?5Cdtt2!#<b|r!b@8VR)3mCWk(GW5S4g2T|`{GMirJslz*%$|&j2;CTr9AcOh0YCGGj-L>}hm0KITJE}9&@nx?LaIWLOEub#bXw+4m*6pg@-S&-}8!Nl*o$lKDHZ)Oe7MhqUB+b>`y4hXZTAg1tnRH=q<Z9mB-nwyfcW%WAfMbHAt<_-UUKUNexVy7S*o*u$nj~FZ*(F-hz-vC^Z6;%ZKhWlz31V{un1AHyYD5n`zeOv1nf7H2i!exreb^xZ;FqTxCIXL*-5n<TfZE&bn_D!thQ~yZpLbr}0SL+u2bS<{7oPbMD(rS)D|c_M>^^Td3*hUnZ?3gpp)U>my}PyDU0qpyzAdkwTi@+&J^R)6DgcMy?6hCJ)!tlftKS=2t1n2OLYn0R{9Sz>KiFOFK+`u?RNa@iwqLluvGub2{OZ=N?ah^q+%N1vUcn@G;P-R#b7ggR{iSx7-sb1F)82;Rba$X~dsh#g-suKi5WmQi*uJ$Pa05!n53BMC>7z__ee>C^SNL&ld*%ABync3jy?tG^vnkDNuRf2%%s~P=ytTgFUekyStnTJ6fDfi@UUl^v)u^(@1Vv6X&e-$>OBzIhqNW<|NkTzJFbjpCm{rH@T`pMIs#ZmJlTxz^`-&yADHP*U4q{?ST?@*=5T{+B-7OSoxV*Fc`SMUSqq0LToJWp)d5{HwoON|IuH|ltd>x=A-FV!O9=J8!O;b_{m~*!m0%^7C<#$%T8Zhl{vi~(;r1tpS-IuSEMPHvGlecT={aFBT(z_?iWpBKEv9Bew6vQv9#lps{s)9YJVdr;aVL6DsX89VGeVFoAH#Pw(VxD}J_ANqGf~2rkqtFJUL#m1ul<a5K(Dbjcv49iw4(e({zgSu(jlQmsexqGp0$8%3Iuoiw36N#Ez-oCPJ?TQzwL%G!iMf!bc!feFC)Yjif_H1I<>|gRPJkRVyy!u1IP1f2K0VN8;Eki{W}!tEz`0*dQlXSp1xoFwaWv4Bp#nx@X~v?$ML4mDZ&t)5%uwEln{LhP+gqEvtx?|+YTW|QZmn#u%`33FwfRze6Y2hrDc0eU6!^iMkvzAxvQcaSL_Uz|0O&J3RCq+YP&S=JsgX=tRMc=9=mo_YkbPXaM+<lXeComW%e;;78%Mx~;NUja($5OWF?XRGkSixK3eO<S^I>b2!FeuA;LsJO)8=dfUxr5@7agG(l#=*4;l@BX#rh+ZlBUTFc4OA!8LdpGX}mv!!^tp7?#(7p5)N-r{V+@s%ix$qVyx;sjao8561j*9<B+H^EExmNhCnlEWXQr&C^Q_RTnt0T5*Z5RZ~{oi_7G8ei-v=inl=v)rNu7r2q4~FAHO$L`6WDSHoU<wybH%I6cCraD>>N_|D#4#AIqw?`<WVnkMytI@!bfx>onDU<9UKQ4onAd*ud8<T7?YHs(!uOty?AVzch@q$UwWDrb+5!y+9X(<K_%bE1q-;qDV`??%R`SSYr-&NP#sSu4{(d;C4-sGy-}u=C}4-fyT^wkxbPZy_C05v*A?_s79y6HE%o{?SmXn*z}DkO_~!p5i5L3BiKaoU6j{-Jd1-^1c-;94wHcJ>JU%Y(9#5?7Vpbn{<7zP`O5(*0^ls=VOwwnB^2Xh0e9ye09r*4Koo&}09fE<lV~`El1tDODiBt;w%g4sSN^JDenI2bud7$CTxq~Db?S|=VY||mziQRi*SedxZamvYnwQr7uPoi}AAkPjn|oKAU+&;z<0OEy(Qf-@vDnk5*wa)DITf@AY;Cu_jrtc0!hSla|2_8Y@2xcduJcsT^pADlC&6FTgBtO%`Sqd1oCc7~&8-gw=2TxjXY{M{2G2}rZha~;cmA8_O@FiLQ!C#DNCp*6H4*pVm9=Qxe(gqkccr`C&bM6u`)6)vmu|!V{Jp=w1nuGD61?(TPf^9^+be5r0&Q943%9eUZtp?W+a0XisW*_M-Uw<N>zgl>)wsP!WiQ?C-1ebbfVBdgKcLSx0I^tQP)E$+**2}Y`d|6n?LJq%4lMA6_GW42zxBUz^Kat*Gv$p0+zR0I1sKfj42JU+Xc7vnt%C@@Q#J+vcK<2tcXMm|#tNMxUTD7x0^k}k;QHx@k4}H|&e`|g0a(-@zxC1CTYtc()8D@F$%n7u(<dLlarXXe{Po|?UjJ4dxbeyc2#+9C+_;5j9sqgwCQNJnl{U6{Tu0ompAa!>17#r6lYtoBLsr(0Jb#i*X2_lT-u@Bn_juTEO^yO6-tD$wqHAl=HmWk<kha=>erp4lv<n1iIP~@-)GQ2vh4)!CiCpX(!+5`m<Qh(mS=4VpOQ@~<>n}Fp0FjvPuQ8LpgDmY1P+t6&0q<+ooNk}}>o1~4cHUs>IJs3+FM+tI8GQ}p@YNSkw7j)RkL|T068eCyK@-t<5C3%h)+OH4s_r5+AE<hS!Ryb#>b6%`cG^L0cN>Pe^6dJ?`tGaUO1#D$^pz#8q0PRzGR_WxWqfl7Pu;jK-?Y@X@Kf(Jd;hqbqL$ZY84b1;EtgQbxZu$p!0qwv@h)oQ@Ys*?ROVTC1FhTRTN&{CJA8Fut1Myhu<nbqxOdOPgUZtF@ztPMQuNv0?Ru-#x?T60&3-Zp<FWT#dlOoCx}*xKzH#qC3E(<cq15L~N{OBuiJVoKso9mQ&<`r9{|5Ns!8gYVBIYQbJ_E0_Sr5*$z--f5L{mVOI0#Tmux@y+1l{nIBz$`ea1*t$7Q+RY^c!1y#yflWBk%NskIx>ybNbyky~l4pJpJc)&fa_X@pnHyd-sud>C)pz56^z~fp_+^AD+Ga9S?T%<JaHu&c6He)7QUq_WJKGT{?UBp?CW2M~`2B4c?r7?~T*%{k(<kp8o#f*^fVhdT(I6pZw;JXFvV0;Q_fg{oe1TnX|WlATJ)j^$1IGCpe<BxBubn-S1=DFpAUv=i|q3{ZhAmdwk)7_u?#?MYqRI&yPlvDc~BvULmbU@%<V|7rD330D^<CvK`?eFX}IOufl)L8#kJ3Yc}X|2NVII^;UX#Hkpn4AsopvegR`4{WA9YLKIC9M=m3o!yAUnt1psHeFjL9#?zx~a7MucBfd$RQ6F$Y$xa|C!-i^MGuuFY(mviO#DlmO(hUQPVt}B4SuNdjcF((xM-HsD(g%4zg&i|W?t>T?O`<X0gup<l(N(&1fOe8Jgnx(O5%vmm0cq-vXlw82mN!w#!fMaMaf2vx7WF{l<hE`k{djN$5?!24@ya1T<qTxwG01vq5x0{e>|h_(rU_DC6woBwFD`k92ceujNCoGOX0TEKA|J1=0tN=OyM#A%Al<_To#KT9RHBli**{2zeY*;bV#%Y!F5b_~(hx5LdNE$lWOlh#7{S+PQ8uLy`C)`a_NX8#4wk%w8JyFaX%zPH9#35wQUN-!FL{aF;o)M2_n^66iYgEgi)AXCO8~T}H=`v5R>g-keP<=$ddXUNtXCj1tX;T6h(1XZRGxWLm`8@l2B!vqaX+w;Tc4T*t?Bn|YW(Ibog_$2{Q)x3cucFa4j9)<Ci&M}fHKLT<P&vuV$pe}Mm2;UFWAfo_K-Th^2#en9XsA`JRL^7Sub5$U%PZ^$+N!m>op?K_z7O~s~tF0%`$wohME+9NxS_P-KzERlfB)kdH3!Si!`OCzJ;`2-T+)^Zo{I}pip$zqXLLDn~LxVg3+2BY77OL1Sz^APwV5!j5ezu<5Q;I16<XIgdQ_P=z7tF4({G6-kqj#h{g82j_3E}g|pN+L<i2+kjnw>%&7v>H`AC17{0s#bZa(R4A=`oZyT@Oa5ZUR2oAEh5qjQbRDA5mAT5p+Ty_uz1=tZVa-gK)WHJP5r%JpOCquo3cu9IdyLpp@-hK61m2W=?5i>MdUro{!HWqUe{uZcj>mWOpeYMz$gY2vGaeejAfa*4QUlbyjLr#n0F|qrKfyD$S2httOexAQ-Q0;2VLz!v(wERmIc2f|$!~J*&ID);vfKgh^Ks>~OIlJ9&wJxX8*DqV|09FB4TUCUfL`$w~V=z?)Y`JW|<?5Cggr`dz{(NYiw**d!1y(@`AXE_GUj#ou1waLYY6=XU*bIR`4G%r!8w%6_#&u%--p*_^3R42#b4fT{BI=wbz-vZJQuy;NZ)Gr$rAenTT6&P=u?lQy3MAQZXMV=5hfh@d3oUF9seNC>fsB@u)>6uRvE{Iz0?~0v&8ACfSmqTVDw(%}=#-Y_BJiP<0~qMv1l9={qF<*K<j1A&s|jvXDXR9yZkXPUrr4QCB{qeE@7R@@d?|m%PrI_d_`Cy~M?H(UcvK|xXdaPyJzBW_<q<AgoMYQ4ci0fd-_2^qxg8C%Qozlp6G%-B>iIb_C*w~FU7-&kw|Ms^k`zsJq3vzv1p=BqEmUaD+nd(+C!>#L8<PspCUBsQ;Dm2shkn^_K6|7w#1PR{miL5)9<jxUk}L7DVH{!QpiCe@N~?+nragU+$%WFeA2pMKSThZhA)H^Evq@HjJ(X8dw>QM2Vu=tY1|UWROUC;N$nzkw=MUW8$_x)9H_0BPRzrAfCJek!KK}6RpFi^MZ0X8U?9L}2z6Ry)*j4Xbx&-G+IN*J7_TF1~r2E06v$x+k`|f|psjkKcQ96Ep0Ds~5i3h^d|Mn)nhvTC6`1^1i`~#f`fA)jZfBMPUJAa@SUw`-P;jiKRc=rBl-q~B<#n->YgC-wao%8HZUXzoq_sNG3`E(1Tfukj~;3L@K*aBcY3b2<?KK#Miw?FV{5&;~8<%Ih7zde5IJsQOuj~@T{AI-V6Rs)o%)sQj>u<qQsQ-ibZ+4rFQYi4@R=~~94haug5^3iMDbCN>eXFpR1>l(BIr(q8O53`do@j}TN{zpI8CN_`%=_7>S>9;>(x!zF~G*}1F@JP=R(CA7)27^5N-p|k8dq<A!{@EYjJpIu-4e#tf-udKre~=S<gOK5k_fRkJ`1N<a(;xjhKxpHF{r(XTlh)_GAAItg*JRkA{N{B!>Hpu@%EQwSKC-4+Lt$!fXPU-vf<YlL>v)gf`j4~kec*layLZlh|C1W9Cu9gKYt60AjaLyL&)$3E^!u;D$bS6M>5qRd8i%vD0aqR>T(xlM{coMU_d{Gn0{x>;e*NL;w;v&_&VKq!gJiJY-#PtnAHp~R7=mP{@4s>O@Z+<ezS*ih-69lv=j^RFywhL(0ssTVZ+7=COI6<1cz6`x&`y8*27`k7c;n&eyMH9L%ZKlL@|zD}E1drFBd<>5{?AW-^L;Zae1G;oz6aw$ed_7I0HnCH$B*7R``){}1y0|G8ozz#^u2$<0m{fek0U$%{lmxK|H0XN--0!K=aUb=MML@CFV5b0=kd?pu;=>IH_zVsqn_RmKKb|e8Ze&s-hyY=4@pstBWLft_xPv3c>ET$`r21$V5i^uF03M{Z9YPs4J;K+;6qr5*UtX+U2AN-xTFak!j9`uiEqQoe)Jk3NUgT9aRWCDAi~+Z->0Sf`D>^uI(_rQ(|7*>JLFpm*%2UbKm6o3zr+;;z&-w_e}n<CO4`#~bBTH+sY{)AJ^%DqzkK{dYvTnqlrmX*1KywAGx!UAd~o{P*ARMY`tLu4z3-j<{D)`nek^+cb{<Zhdce^tI`@u3T<(!z^_#bGvA?Zp7HtRwB@Kd(Fetf26CwxiQ`fTLPQUX9CZB?_XTQaY*bM;c^t=CpV^|+IxsB7`ym|J{Ls~u@5vk&^8|d^Q!UoWbix4FL`9oM_!i<MMf`0%DtSSOSz<5_7=J~uK2{f=`3X<69hmSlQ8w?5v8}EIZi4YW`Bs2%1CI9*J(+|IAAseqU(je}`XN_8ewNON*xf@)59<74tyRT_*e)1n5oc-n_qOF99#Ji|H>f_-XKzb02K;U4jAh-E3lm<%o=nde6pZxw8r{8)TFkQw=tNrlT^*~SK{nyTZ{|jpB2fTrP^`AoF0BKHt`;dtL+yCIg5%#Cj$$CD3?(t84=>ffgHGKS&HyvCQjjI_uzc&kNX-yS+(#VKA+K5Uk?-PPr%dU{|9jl#u7g&=AMQT?dT)(7!p_i0iTSI#M*1rL|%a%|ee)RLxpFNVg2&*4|q}VhrF>f4X(eM9ERuQ)}3kojq;Jl)42LO0Kfvx{X#35j`8h9>0V%&s}L;)GAXp4U9@z1{R@-8A@ys|bUl-18OHH~CvZ@qc?!G92`eeWSuCSvjZ*JSGvi&rH?a6z)e^Z{4rr*9&Po&Ni4G?#CGfEQ<G2XG6_I0VaFvY})T6q-ru+K$k<pd*X{c;XL%U({+yJDCZd{`*5h5FiAwC`zsW)<eYqKR%+Z_3aOk9su2bn<yS|4#2_>Kl%4R5Vgp2900@K&6S;<4nl+JrhhZcGGKuC>E)H}P5y+e!Si1ZQ?yDa_W1ZGKq@~b1cm`1C^SF*)h`}D`j|jNd#Qy@U0+$>z@{`;z08pD{Oe&nWQO~z??9upYXR&2<q=2)|N4)>1ckLqKQQP^m-cu=L%}zoKnF%!%P|WxGl!BRTY$wzf~nZyFIvT^;&3h^Mj;CZsQwyw@^>y;)Y_4xd}KY%t5=>5WYK|o0rtuc22n)rcW}oLjYk0oNzJdm106WH0nD@I$S-ErrIfrBw9baXjxO#V0b_X{?RT)bHy&LCo{YqocQnypK=5xr(jwxW*)$%adioB^g$kG7|L;f_0c6kwo);d!{u++*tsi<yhM;9R{lPET!l<bwEt`I$nEn>*YmG4tTF0M!Oc?zWl5Wg?XCQ(6j<P3!!KWS{Ig&6^VVF9I5+9tt|GS`edt9T#9zP)9{=fh0r?0`uHo`kPyh`a4xrEb02W6$l|K~$Rbzxd4uK(yAuFI0WwS`VUeDm?^Z>e((?KY4)5g2E``-K)_-t&ZkA#Z{;{P9212p@_lXzf7ih2-M1@BW_3(t3OTCLBQFBsZC)$^DQw$bbFxz5n;)f4cl%AYd`AMht71Q6PR5w<XC-XTSaq(m9w1?j)vF*f|TsyuU<D_1i#;GU`zFpC!17kSo*V(-k!aB85F;r~<#W<oi!h<QD;UNHXr(>u(^D{wWOd^>>hjf9nIB@FB@?+;#qpC2|9F?Qw0y%hP{;*8;iRc8UxDMLzl6$0$T&2j7A6|N6n>@Bi}gKfHJP{<ny4{P&;eUPL^Q<tU>s78+F}46S2M)Ur1-PVA1}i+8LYafgphcVwsCQ4VBx2+e--khcpF4T3Damc@9FPh|$V^yyaCR}0X1j{ArA&LwV26h%Y=%5?Jv;6AY99}<4S%vnx7d-(ga?>s6eR=3A^js{@r^Y!z|A=;ktg;`W9(;L8KkgF?Z>z_XQLH>3d1(C-;{ujarXy9F7?>|5NS75nseLwK<2=ew1=q&c$J47>x3(6V;FM^r!am+f<!p?!SrrFFE^ppmMylL)6)2?`h`D6f@O;c?>ii%n7Ge#!E%Ha?7g6fu1`NvGtqk`d|Z3NyzbzK+LQ$Crs0LNXf&!&UsUjv3hxA8>0C87s-o#bupkfCFt&H8M7Z=4*Cl|v9bcTsDY8^4rRE|D!L=2Jfd{OQ;K^3~>Fj+%ejN6Qc0PMjqRH3Q`aNjeIrKEBK*QE$1P0TmwiGu>V^&Sq)U?Z>H)?nb2!O5_tZy2oY6foyp<okb14w(chP=%;GY05I2Jezer=9B@l};WQb=y)OAXT1__i+ITz_Gui%(oI;npeRNq{_Gm~2N2`~y6;%`WMChR-3Zu$?l*N5<yF$GoOcf1zV=^g7JTiz9qhdrlH2%z@$cy6XLBz($czrH*$z!0X*lI)UETN+WCJlpWc`ri^wo9FfCo9%41M#tUz~-A<JL|8|H-LSFH`Pb5V1UBpE;z`J#yvE|BD2^;_o`+W4$*RYmfj~PywK~VVRm4wk7+lICd$>2;M>J95Rf%^8{E&b3^ge3q9kjHwV1EkBOB%eXQMnDW>K3SVV|1Hszz%zM&+wNin9!mz#x@lUR)D%WVP7(D~(ZOv2v;u49ZQd9Dk?<#vVc&EHe*n5YpwS<CDo8K3*h8$S4qOBCOXdO#>}i2zrlAbP@afLA`aXJv~oa#{g|0hm*MP2mA{_G43ZL{|iCuAbNmrp|LsxZqSDYp$xE$v9&nxW~=-1HtGSrZ}P9z?e@y9`q6%6b)(^3Nxt-@FO{q}O%KWq`qb>8-|*^(b)W|M4UE^r2O&Czx|ZVnuEjfAfEqX@V2OD>oVQlp!Elxx_(9<_4ht*#svO$S0JStFovBEb-T^FA4tdeqeM+>ri)-lpZvc<Kg8xiQg4oxgi_K(u9j~Wyynu;kmi>A5fkG&$Dag({0bf)Tbig_)253y!3na@BnCU^9%<cjOBud^SW6pk*^?>!E%ec=(311to>fo7$W7}(pW92l1*J;ofOpQU{8oDKV!z7ESggv#ntO|W;Q4~PqCx>Llc+JKHJqt8#y#}NhHqT*3cJ<@LszjaX2?9dGfQTJ@ZrQ7kr}aGT(Gbs59fuLRR3|t10;kiZ12qWC=LYY|l4;Ht#C&hXW98jnGAz0><%`oL4|U3WQw*N4$76({bvi}JuF&{!nYa~i6poKPzI|n)Fpj*tfIUDIaetDh3`%Fo05OeTkslFO7Dn18=LSPaVOIDVCM_;N%nFBym-vo(9`&?O9uVjvp<Q$CMd>&is@MqdX5{UMy?a2hfo39;CikF&NZfX)wG45u4?vhshrF?d(SV42KWU*i)DgLOQ1^^LeM=r_@C_qluNQ^A193m<GlSRoWEeJ#8srFXg&8vR79xM9sssX&Cq$M2KI8Iipi6hr__DBS__xzRgY%BKaw+8Qg=0h&UV*ax&D8Q5kI))Qn342j)&xf;?q7YpLq)f}<^0wtZg+Inau6ErFB$tBV##xBg%dQn^!@W>5}cG8Mj$drV7o1;k8UsII;M$z7snz%E$|a-Z>t(Xt-Kv#-xW>$Ng~pM!~GN-WZ)2fX!qEXp6F{gKd+NAnM=2^Fr6xG+nvv%qzwIMyG%MALJP&iC751sT73){O~T&P`|1uH7DG+kuCdP_dv>J}xlXW@j`H-qctRA!<qwnaXqbe!7jQVO{%kbKd>lbTov^~J7st!jK`6(DB7iYQuF01DdISAFmg<7JB}_mX*Jm7VML_{Ssc0Ep6~BVdhd6nQr1SLgGmI0z`FUpoy?#}3GvG`~D;^a0HmzfV_CtPUZH#2#*Ds;XM38eIgicLB6KD#DS=^8Kc2Ac>V&@(=16wjWb{t;Wvr*9>95p)+S`-OeZvos#0Kbz`@T#B%7JTXSV8E-36kx0jdCP%pM@y)HvI0$^PL7DCJ$06-4xPgA$ghB^+M<(v<_E<U(DU0Xu7IlUtb(pk22cr`QVmWikO!t1<dlNaiq^6qAf?7aV6<bwd}<)dtQG~K6fXmyM9X1$t`dqsrZ$i~iKa^jURmFK4poy%Dw3#B63f8EKg!4CxoiY~mLT0e(M;;3mIwBp4yVx2krlXqe4!(9$!{l~LL(n8p<{VJmoAgD>uZZI4$WuLWud~Qivpz=ToG~EV<Eb!WIv94pu#Qz2BRbxDL22^I4~@-5X!F~SUir>iELF^S$rvyx8INMN5f=7fdEL4QBwfN5mf|2!Z=Pf3)oQfJf<O~6mysy)k|09T(U0{T}LgcKy-ko@&*c{27Cf?kXkbKRY%3KnIC$)qp(c%ac30V7C(2M-=gI@&mrs3QSwV)$iGF8%38Hzf?X$3roe(N{K?LjJ~!9e|LZSu89zV7AZW=KtxPS#(+wGhK$RZz8jcc~)X{7(*l$qCuS`ck8)NK2I3~dX!g4@G$NKcX3hptAMksk6;@OIU0)l+2K&u;S%>Y|C7!vF(RD=2TF7x;sTWhyA+B-lgj!y!`!po3oP(NlxnoOA+Ht18ewG|ihO@IVPr>(v#T2#qx1-+c|CB%rMDHL=|{-Az?<$B%1l6UMhc2akUl-VdwDJ4C|{Vob^-FwkdZfbnA#8YODZtWoMLV0!{OHxvVlk!<2BETxGukqf&uF!RXgE6#pyc8XofJ8<p5y4tVZj=IQfXvyUm=vI&@bQ{vFBEH`NwF5FS5m{{m{deP6^sMsPA82Nfk!3WbM*v+Tkx?O*3WkLZe^2UJhft3P|>}sOG{7FaXTJQeGc{z$dQTyKg46ZV8^}sfcG4|LaoCzO1q=Juni!GFccN&l0<mc$IzjlelFQ$-@G=*e;f%C3KDFwJtv+=!bGWrG~<6L6UXD3;hfYDpy?FP<s#)%{nQre8;BOm!*I0U4?RAM+4u#pXKEb;m3$PsNa0M@9Yxd7N3=BvS;j`OShe_Z5YdsWetTSReJzQ{)F7`WdQZZJ+gtk5l}@1Hg>MmFSkWnGz%xQWL}*lkC$#9dkHysWpre7H&n|Fr%zN~{ManY&s=isovD;sscJCYoUf4hmTnBU?)s6c(n5nDmJqu(q0XvFAD~r&}lPbGil@3!+%)=;>D)x^wxcdC9%@?{m>wkwH@n5|9w0eJI<rQ?5Cr8FFU9m3<dGL9qF4G@(X&df@I_@Q~QWJW2(CYq$h<p!-@Z9nCG3J*iKC*C1W}T#pb0mZbLmw$EB(xuiuFuOx;c)2n4rb$fncU^D9F;*!nQE1#raR4M^A3Y>#;Wx@7cO{r(CZgR&Ow6`sJox^V^K2j4I%QGsNeFo3G~cbeO&8?r<XTyY1aAZPqmg@u&HoOM9N@8<4l&leQ6U>xeEf+vUjCsu6vAPzn<=wU+o+oAm~unlp`hxH)u|-WDs_K0asiBg?1fO@zwC2;#LA7#rwFW-701xRJk=t1W~zrLR2+HTfRUqGFW1&R6M8=L0HB@d4bB=nE5IQzo(YHtA&p+9&Qq-5+F+56Qbk9Rswth2+J32>KQM;hl(T3(FY4>$_Al7BC5NpIfqo0(F#NHg3?OmRL{A@)4eZOP?*Z91<rInT@GqbHo{L&pK}bBFt6B0#VRpDq{!S|bSmxAMj`TL=s7WZL(36)mqoU+2Lb~?l!fy$(A9vjZ48TCFPN!_tT0XPMPuA>ds9v0Nw~tTfi3a2t2gSjrF0>#9ru+8BGko_K&WMkfJ|LDLI}NbFn_Pkcjfg?UDx3kzIl;TdsCTZ{&(-Hw<OI{<T@W33Oa=~Qhnz%ko`>EJkVE%5yD3m+P4>uyQA;{GFv!~4dMsN0)>3()Q>pr+S+Ix)6ImJqXh-oQL*I*-LWRRcy}Q!lpGH1)3Yu{f*2fccuXhFV;;{*lV!7<3?jQlh9$d2?!BW?0i7$h3rPIX2+F_it|;AdSoj&9XBD+!5I{j!27%Xk;HR^37Y_rz19d)unC;>~7mM2fmJpEVz*m(L@G5s(4c%kz^MoC5%V3Q|Rq%FWdYub)Q<bC+^-I$w+SxFidJ&*9TU?uby)Trn57l@^gQ|Lsq-p#ozfSZ{EY(1k{A~7!Ywbt+12J}bF!cr)YEOsb<E5h>FLPg7Lnfn?VP!HdH6$|{J&uNVHQ2k-ai^30Y4d4t<OB-mSVqvT8B#$C*Fs@V?niXIEzHl{yi)}Lfr^8#HG?UgXm`X#c4rC)X+LOzNSpLfqhSK$!}P4Mqb0P&`ieVIj(STaG;t1G1Jek`c2TW(04QG-#y}M%r0jUSbmjB?6WU~Y-<swK0?YK5Upgdwue?Pj8Q5%{6;6yu#Q4T{BcI^c5HLQ)eFP3xXj+s;Ungn1Kz_;)SA~VNF_#<AOQ)%Z6G&002A6eomN_ad^S&zAeuOP~fvYBD97m9sZEWBzfISpg$-)pG;CUF6Bjk#P&qERwyBBff9D0lh^K?1FpayKGy^6NtU6gOvH=iqyXL!N$TTgu@*z;~rJC|;!U-=6i(NG1oU6W&^718!anBMCrhhq~;mn1tj{$TqN7X9R`gY-SbGvSe_sN_hxrOvcc+Ml9VKNYV!<u-r<sHnDtwbT%uOLJ$^13t!*H7QAWJTMy3HL6bog0J^b4;=EDl){d(8cpRSki#vXW*IRk>>#?}M^h)BFCSnrPB5u>g3I_Q_2Cx_VCDs&WO@&W665Z;i>i8{5z`~=TJRGCZ$ZH{YDOa*4D3&~z>x|WT8Hn4(|ANTCmw1~hY_i-web+qOqvmlG#ZM@5}nflyX1flJ&<4+XB5yd^HwGH-7vX(epFwhn8}6i#SbXJ!awc@Uh-1Wnohh)ro|a^{>Ha|;|(KLcCk2(zpNGmC@}v(2{4rrwa_@q$K!Sbn=VKwRC3vCUM-3X+=w1Yt>j#dANHWxB`Dizr7Wk{Z>PDlJ-wgMRfw%<D_p$lV%F(ey)2%vizD8LBiB8*X9G2LHYgq`c_DDRPgzHPs!IFEnrEkMg}aQ=%O2TvxFyt1$SfU>(f6>9EJlkc_|xe)s+~d`T?~^q=eE{V;HhdWGlP3n?r(|e!S+2!`Wo9&d*%0rS;MnMpy`9LHSqc_u+%K1!PM1QiBr}U2`wH`p-mr}VZ9NlkLmpOU~F3!v3@6aDHzCbCuuT?0K$5#1aFQ4jh&;-ccI(j`k+1?O8O-*4RRk9{3=I4v`-J9OtXEydM~fEwrNIfG1W*>Wj+7A_ot~w9QC!PlK7KzWC)?W7af%-uo1uA6I$HRQ;&e@V=A!7A#()-qk^UlIjE={_#3M^;AO*mI@r6aRR>5?a9mZ&oH##8)`_c0YIf(&P$HL?*#fJ(HsGG2;{C*#aHoSLNz5u%VJAtcO@cu@5Q|MQ|I@OhMRf->?_(In3Ca$~G>8*ZjD!9!3oWqL2WmJ<6rCNQs6n&|ClA=aN;KNM=RJFcSJ5)7AG*c%sFx1jx?{o0Zd5rgW;K`P>hKE9CB&%2wpWiyaM^~<Q($NHZiEvyrgg+EC7bz#iD)3$4@6SRQ0_p<0{O-@5t>xBLx7{RoC;2wM^r4uBpf?bKR;%dq-csk8hE7teo;&&u>kKZea+@_L_~Hd(;jDwO5;J5#30}IVq~Ws-mk36r#B+qs8$$@w1h(=DJnw{1T6rt*tz&F4QqJ*D3&H$$m0X-h*yUH21TqhP+#WuOF4)xWzgv$%(Q&V^gveF(1B8pr0^gfm$7x^K=~3Hafv^L<0Idh2AvjcdN`<4bgW}(=L9cV_#T;V&veI%z3JA1!e*(OS;>W@btO?fy|OJ_R&Gz4u>>tx8%4|vK*)MToqtMK4l!vDD`Tp@C29s3LWg!8Hfddb+GM_Z{&Rglw3dLZ#PO8E?ObG9fIK6jB$#w68;0Y1a&ROg46!FBUqzjmkF*TvZ)npD^eS+HQG^0Iy9_IChS)9zPMvIyQmA`3MAaZv-@`2l{~D<tkSXw%I*5w+W1ftvR}tD0pgHZp_JocM;B%+OPX~Jp`y3LfmYVv~)(Zzy;j)-yj84E9WG=?c8_sIr`L_?k-URKKY`D7{N1Y{#8}3+5R|F5*gJz;~+SQCmt41v?5OqbIta{TphfSB?c1x-%LkcmYAUWbGTE!{}G?>GHr8PZ}y(L4x`Ow<T5p=Vg<v^uBRWidevO#3JNDFdSZQ2Z|<jh@m?pEAR7O~+nc4HM^;7Y!)tI)_a)(3Wb6$H^Wwn2-xCHjlGJ?&1)tdDVu3I&PG;n9=^-3jKGp0`&^s;Yx=?fmX@)n%O(#!(&1iIY_(gh)?$<#?dau<muCQMM?Gg49IylRv%{g;Ht&4-9&%QCm=6&J?&|-99gHIQvk^<m@hno?WzY<Ski-XcHC$t=3>kp4+T--c($(2pTjS8=f;lYU-(Fmo97jeIONv#fA4Hlcws4&-t!kqdjq^cFr;K*yD2y&%1w3#*(3>C>cn{=-=7TOT!CLKUc+4R3zl!@?hMuJ#naUrE#1`;&RTPl{IBleBO`%59ufz#@~p#83kg^TL9#vC^(n@>c-zOCg`bPy&Ql-+H(XkS2R;$Bt$+Fz;eCPbME=32&|H;S645K%b~+rKzkF4hXE}$JUb|cWu^QQc3mEfLk!dmNJ0ty+znOe=So{c%?Jb<x&~$8;b_sAUb+JV<9N~P7uuxJ^GU(JuwaL{ls}`F>N&9qG`vMMwi-qYUKDJd`I?K4`c01x`b+imlp$OvC{uCZ%}Spxh_Dh#c2XMTxk{5ATzOTs{4$xSIx^UaV|6m2%QsauXL~YnZBO$5X}IjctUJnL)nXrl61tq=1z(zWDMO^%dHh2z^icbTZ{-IOJcrKZ=$q`Cd>$}SzNw}ya8EF!IY@*O4Q-u$9=QR$;AUF{(Fq=_22Sb)Vq!=f7ZQtflNOWiR&@h-H)fC6R4TEI$PJPQNA416qE4$vxjBwaD|1JP1QyShz9}D=p<@D1WuZy>WmAe)z$)6(Dz-WYu&%2Ga|$8%Ds99i#4DSxmZvuxV6MCE_KV-daM9mfS=;{R>Wkl$6l}LPgVLO2OL7(IBw+iB&Q<0b^2YtFizhf`vTqZmyzv(gS&x-;GU0G2*Dc&GY#>ZpOv*viT*DhcL1eV_69p|hyna3B+klnPsR_$@jw!XU9h;N|dGb#Zh-#uho7F%ZmqAsU%(Fo}^D((pov0RGC#lbY_l)<YD|`~KYf#2nH;phO1<pHhe1g$r-7+yYyVYSo5}3#|fz`@+_G0{p@m*Ow<E=QaG2VU0eV_kX$Y{INeu(QYU<shP?Y$ViqTCzzhNldBEag~cmJ#ca>yvA5RFDH?S?i^@@)!;a^H@K>vh#fDZTsGp=9k0fpmY3%E4X#^&!@itdj>POU7)K=osSm9Y3+V~O(hLO`Fx*1#&Jt9Q^`G6Nlq~n8f6L?9<^#+8VoeJvt)ZqyH@7nMh9KL6s9qHWQf{@#Z$a^g`P0MS{9QhJ@i9^M4uE+`U+#64f}lmja{y-@2qaU)ZTuz+unQ$4V~-!b{l;i@o{zQ#*M8_`wixk?(S~4+qy`5eFL?zP^OI;#n;<Abz_roYn;s{>{0bxJl&uqRlfG*3bd&L+PqssmrxP=e3|BrX%C=JJOYsB!!bQb^p>zJfEZm&K8}tgBv4peOheLgT9IB`cVjzB%YZIx>EO%(`*CUSKp7~qbVvO0k^!yyG>yb&BAe}x*zwF5JXww}d(z@1`d1<wWR~KwpG<M=X#b8?Fo`|<bWRmgq{3B3$*Nqaq8<)DUs0Ks>pM#+Ki8zVaDyfADZ9;PRb43_sIJOp;tL?OsAu}Hq`d$LWQK`pT-Ov!(w6Up86YhBf*~dj&S;d3?Ke=U<d_4idY#Y#zw6*7!z9Tf@i6P%ql5Aw<G@^;2@tjH2Py-!RK*>u(VGPpKOB3r@jgao+Xq>$hk=VyZj4M`vSbudS|kZELx~jW@~WRid}_one*pu#eAm&zo^U<t#eH>(x3RTrtj(@oaT70F#8TUR4a!jvKI9L>Dat$+wjhYh^EQ{F33jE+k{>tX>wvL>+bTN%*c(tSyS?D~jX-OuH(;4dJr$|iNDP93vzMqswKsul=uter3sNmxgGSQ8ubYS-^<wY}{5Efl_5skgRKR*c#c8nY%w`lhAdNl6>9Ms&Do-H%`UT_{e_x2VQG}j-1Mbz8^=nm~qOFYJ+#(oz4&E70%kz-a@*+b-Lxo^93(A|>B6(s)O?M_p_%GwnhM**o0YhVG-F22p5V|lNH*RbpGtZNMQznEY%0R$^^9UKDQ72+$fQV&yn16>+3^43YaLvrQoRkm_h2tY2M9_6av1Fpw-4+gY%1MSeD<zva=7}3c5g6Z((_~DVw&Z@4rbv>IuUbMtKhApi?WjnqR5XWz5aUp-Bx^}Obk9cXxiHl+t1q+z^%w;iL(8SAP~o~NFPU0<d0Ex6KA`C_IsfU8xaIXXeMWXmmu+~bBi}S;Hoe<MP{mZCH{Yc|YMtvri8wL`rdGw`c}MPJ%<!!FBj(PHeCts{`rbmLkah#!Z&1s1R4<hmY{tQNdgf@0NlAI%hZqgAdb8916Tu)Ekh<AI_b??{0N?gzDaF3hVrheeLG|gtF-a3lEvzNY-XX#b2~7(g&7$FZ*dx~AB9D~j(;gJ=6xW0lscKO)X@j!P8u;b%hAd43Rv|{G#WiwWq<29fHU&t~GOszYC}44BLzI$D=@wAH;+@tWN{h&G(&&DZl&$!Ku&C20l$PYtT~5`>QH4t)4n3&))WeiGCEr|*Z(xa&09@`ve_G=RDD0R_&JTK_+R{~WE2(tg1r@y$vkY&M@$`?R3?n$;(R1-j6hr2$=*>I3E4ytx3kEgiCy9vc1SF&08f3OLo-RKf$Q^F&ysHqcrQ2A+T=cg%RCZ7+UXwTla^Wj;wpZl0(ocHbl9nx}VsnvF)ixf?mp{w@YM4fKj8@&BdCRqx)!p@%+Bl7!u8LERj>0&vHioX>A#H#pGsL|kX^zKt@dxWS_`@Is-hr1OrcKktad{IbIJaAy9_vUMGc%8(K90g8G+;rKEi$4OE45)fh<Zmoj7xc+f*)f*%#`wKw`kOec(-=!p5rl)h`Si61~cP1;}0oMPT{q_qQWmFb6nC-DlD5=e4y%!#^uvrQEplaH8}cTBD=|~%<==RKByrw=_pJ!Ar*3T8QSAWR6`ZD6pi}0P@EZ;g01e#&71AbHO5*x_W_nFo<c9vjGYPC?<R`+<Ys`O2~dD1Hv`OHo>Ej$RJLGP>5ye}Pmv883t0rQ(b;}P_JI<kGeoxqs)qtwG9&}hBpH%Zi7n4nQx6I<PHRb%1o+dxNY)9o@PZ$3N%6A|OK;%Kw_X?n5i#1LLezL!Ttr2Wf)<66&IK=WVhq#%+1PqcXhBIpYgq|9ymfU*Ybe9?3xiqXkQWb1OwoZDt#N4zA;0j+I(6LI#7k^ET~JKCslg(Zzf^AwcPEBY)CyH`KaLJ1dL|&LH3r6yG#W)5kmn#d^af$d-aQ7HneLOSgyf8CY<@u9WS%mDK;%Y?v{Y1r<f%jnqWcXMIgVQ5;bdeY07dSiyBS~OkKi!T$B4Jt0g5UZ>f$aMP|e2dDMTt4GJI27?2KO=sX$Q_$cI#TZv1*jWWxT1-{GoczL98cvP&Gs6{EDkWR&<pp<&JPQ7kuVkpx!{wW63>+{d!K=!WUR^zbzYtddL>^#FD0CEUQSRnj&$f@_H3b_)Ge)?oW$tP?AKT%6&t9^F#e&|tGmGfQZ;&7)ZIj!#aig2b0>)ynW8R&@6)ithPWXj|{J+b_WJa;=~Zm7>#VIP}q>38%29#@8vT8$OdMmW|Wx*d3=(KRfb?gLrdd$Ez5oClb|eMfeBt>3y^s>Nk0dUgHqbeA<T+BcNKitH@N56i#$-r*Ld&O;IzZ);PXaN-kde%CPdPeUAji3Pa)v6J#W))r_p_3h!-&7xuKrZeHb@uELQ+@gQqI=Ntv9@7+oxg)qk=gEVMaZzN=AY+Y{ljj$*V9&8MK^V(GwGv@b7K61K0W~XEoSdiKZQ3J9)?xCZ`JkO~CsXE5IQGA(B3z{w)1VuA1Ws!%0Qx)Sc(I*t+E9c2*gBo|^&CSr({m&qhZ-A5}cRu2aOv<k4vzO6#+ArQ}Z?3jo2_5=*c1U9wVxn_22M))4C4jt<j-sgAQ||cYW($3t-B|d@u}P!A*P<=mC5D%Mw%y%Wzp=gxz5X@!y2B}Z=mv}rO99J%2=erZy;k`&gzTE6Nnrmf_`5{TyBpuflCw#xc71&Vy4YHMp}V_&qrG(td;0tp49WGkJx<L%3dbQ#QLgt?x48ga6rK(yxQD1_=~~cs9PQ&D^oFwx;}(Sd`yd-q_)#7jr%4fkhuqEB1X6;|0Ix?VHrYQxVg`~@)ZnJdyM)m`>6n5|o7)}o8NX(OfwJLnpvfu1|0pZ$TZSJFp$H+#n^Y-4J85T1!)Ap~RWLp)x5RQjw}hpqiPChOlzkXw_j~EI><g0nS~Y{s@hZSh<(7+VVw3<ZlQHai<O&6dxaN)(p}$HAyD^L1c!8Qk+=Nr;Y$A5{|NGS|qLHS&9oGoky~8jjr?+8z4>%gFH{QY7-tKA&t@6+%1Se8tKs)&iF%9)y28H(@wZ$$z7Ep@jy`~@ZTC|=lu#G*Rezn?b?Ugm|U0$rL0v#eHRbf${S=JMtbG4&`{m)&GBRsO@!lmZUJ`14GlR^2`=0*<8MYbl0Jm`(5Ll=|jRg3VT*a?3mbZx&9e5TW1wBK8steHZ#CB_Q}7+7Hch<S!+QAtSvq7V{7tqco1Ohk|&`65oDETj90HgRs!(i45`KHuJ0Bb;@OSkSjmnXZt&T$(RU4rJ0@2_L8S#9Yu{OM2_*U5Un~>|3q#S=2A1o~GL+*|ARRPF5&otVB=n62*mGkeA@j2430JVBq94%!`wO#F(X<F-~bRA~W2koo0rGhhcm_G6!aA;4<tGN#7PCv>j7)P9X!}2J+MpO-nDFq2&R|Ln_fss=c;U&5IcRHR(q!NpORA4|G-rzLcqSH589Rhp45Hv`eU+YjCm|GAoql?e>fE#0N}#lq){#GSKrK4H22>lapja8_p{O3Pw4V5F&?mDaRASpqIqPGSo|jLxyzjP7qJ$ved(PUv1d-gLt|#MYBG`4D~yo*kFc_u1B}VPRncNxQMoa6QGL*b;8~-x@;Pb?-l*Ot(`*RxNf%OdfF<xr^|JUQ5}mkOA^_@){O8t))naZMvyZ728;Ha@0L60iSeY57LQSwMO~yZU5)}{da1c|u2v%owY9z0-bU+dI<vtJhJD;mfd#`e+sJnLBIoP;fS8BHI(d46z&3L#gm5KCV{;uRb|kudOB;M(I~e{Af#t`_gIH|Y9T#FVemc2f3nixPfc9vqVik5zD$t!1gSiOA(peexam89Sm)%2jc`?fdEgDvo(bjxU_$5Og<GTmV!;rNC={+WbIu;s+;^16p62+FNo;p0S4p7J=MgBr{W9HRwZnv+mztUXWy0NmpSy!Uf0d$4xN(mK(oDUUuGxmj&*iT}riXm|+Yz_>C0>Edwx(a&L@>V#2RGhFe44>@wQ9<mP3wsG@M$QM4tB!Ho)vU`kqNvs}U92XnR(vZ;xg|}Kf)QiVi@$7`KdzA`R2>&$CfUk;i#Ux66E+po&I3wRHscF{Ax`OtPaz(KEXwYAoNkS&HYFn1=fqnLe7GA=$@FX=BO8g*eg)(62j@o?V*GS1E!BNtF4mBhV-kBaCtW<vyG0E#UN&_(F=aLz!2a?Lw|9cTI8hSjD0oCUR;sVn9R>w`&pFCktL41T#=Wi1sY*FnldDh_r7CI3iptx9njl}Vqz7&WcUw@=S!E^OVufnuwt%*pvoOvE?{`#dHq_R2b)3cl%Zk*ZL%vBoD^9mdmmDUb32vSSBfcH$5c!uI67Sq-hbo(Za(c?;P^H)yt(p^E4g?FogjmT2WFt8mnm@*PVUsXUSs62o+!%rsLzIGk@3WYR8Xl0?_c5;pHwqh7+0BbS2(ZoQ6#V_!@SY+}Y>SS;Do7C0_k}#>mJJVAfo?<wcT1MzyOhyNW<4b#ldSLEqlN1bQaJ%#ERJO%pj762gQB2g+UCjRWFxYd!j*l-D^+nxSPEVg)z(v9%pzWF*~JPrp@KS?JC0HKz~`|v)Z3y`UVuPOVrb^6d!|lGTsdtms3uPKU7;PZO1E~^?4D$w5Pk0EQQ>P<aL{6S2(qn$3KyBBTFf6gt)QmQVnF8g@S+hlag$-(i>G$R*8im_R)t=)K~+=FEGu|a1YJ6BQMvY$uH~OYb^X-@h8qq)drkFMw{C53u57q^YLaEeI)*LdbnJ^cPQOM#mm?h3)Cr0#TS~Tpl$?2)6@5)Aw6cTn=`Vgsb(+7+r!3X|_%6_A-?86KWF&dbM9B!toQ2C0LM?pDCT<HXYg=|#TGDP)h#fQtk)yD!A_%9z0+6++EVIJKL(IXhOh#5&1CVj9OFL1!B+q37guwIpnh;aVOX0r95g)E;Yt<M7B5`ymQ9*<%IV4P}pLkzmj58)I@`CjON&zuewIfnekbGU5$k)d__g3cMK!@Livr8noc2%b>rIQyGmq&RnfRgV=)58em0yH0j9=lS(*VYzj_oLd{SK1i5x#Y`#?-qto4KsD&@c=#DNWaw3W(ZTWd;%*{q(Kch+#xZH`OI<vLUyLqJ)!`~SUeE;C|48GSO8myhXl0q1#;2$<fDBqrYq3`xY8LdtM=T_cE&f8<Fh21BVPcW>)%!o{_#%N(%IOvWyMC<i29DPVreWzr}_g6Sg=XE)1yg5Pq2*pC9F@hP-<WW#g1yDI-7-tXgu|u1B)=ehF8!@x(%7$b84NOQZsO(^~iC^4wg|Gw?`|z%*s~A?lIZ$I_D8VJrX7^#kd{kL`6~~lUoWKor(d`_`{ykS2-N0Na3x6U4B-kvYCJ^okqCAICbogO6ciViZ}w=JH@OsQ;xB^*2Q(%k5JCusQE&Cz1hv#$GL@QuoxtwfUw7<S2}eB5R@+}<QwJXc~R6z?Io(HKv!_}rBVT+suTHaY8A_!l)6I|a)O%`R7w1tde)#%s>E2ebfosnSrhZM<C<{FWK6m#jM6Qa<e1N1Uo)7r=cI2UzRC)weuQ>6nPN~X`7`lK_wLcj=B!4>mJ^mmq#$IeO=M6az;co}3e8vqSgwZMsY(r=i`1y|cw1JWmT{xz(r%C#W7p`2WAn5+_E>^XBcd&?2Fj~|iU(Uu;WJ0clb5jPX=r#e2OKjds50epbSonM=ER|bk@9tMYj=bj5<CyXj17j<*#z~xe1nc?t*9JcS&bqk9*Q)2oh~FZ5NU=a2uWnYn3790T@i{mC)<C@hPdWgx=c}aTFuzfEmg#<=@X3O#229w+)5jka^A6MFeTgNNNGt9!xUZYTHedza~JAK!5Yx57f#>Wq)M<&BXMLnka(+Ug1Q{MGI4IN1S_09Qj&|)un$2icVE~|QPz3K3mj`y2AB%TPJ7uM0qI!rUc%WhY$1Yoti6O*I~OE9$@HD9OK7N%T#!3AjLWStE+NrG1z<ASMaUgf^<og0nu?S`0eqZH>tw68$E>PDbe?Vblo_CG6iJEc`hkcL)mV_ASFcCqnv@6xb{0*(voZp8E&yQlZ1Nt&q&TmJONIJmaj8l9nyISGs(t3*B_^<?xzkFU5UHW04Q4eGyiZJ<q>_>XIzh0&4QUPqk114;3ixIP+_Z_?F#-Id$XgdXC)b2(VC3Ugy%>O)RJ-buSj@9jCa2c1zI{AtU2087ld>QR)Pmxhaskv$*yqeav=Xt?X4ZUct}VuuOF6OwwDryFTODtk83$eO&4JRAcZ~O-JcJV(sh<Ugnz!nI9<|raFb#*pXo!X{coX^A>%T5|&qf#;f-GuAD7}#o1dKxI9wtdL1jGl54kRs&*vtbh0K@wjiQ(qT_R7Xad!u_}eY3m1+rEJwOqhHa+r|KHO}Ypq9SWOnQiJHfZTvw|Ju>CQE-EYyUl1_<#?zPr`lUguMp0Za@#WU$Zu^y8K9t)=I?4<7Yso&!h5L5i2Q=t$FHz7qG(~yE^C_9PM>^&Pr-%1Oy-7gk;s<CRo+$edx@{Hr^=l&0!e+UrCZ`-OMlHqIx;yP{5P-_rn3HA5qyj^YJ&vEONwQXNGV79VojoqEDhacTal05|`a~`NE{SmFUb(vfY@t#om93Ni#xdPgbAf``Bs?684?aQ;<Q-)$3CqR7WF+-;2rp6Y5IG;6s4iwyF`EFNZ5fwv>OoA(qe;?DlLXDYm31GEzu|4SZ*CDUaBgLJ`qZEr>Ymj|M?(rNyD6olKbVbs4Muh5S~@(KW5R{Sd@9w*!$vha3MbrVR&12lk8UFxo?a980ARbNn*Q0X4)%>b0<{dPD4Pb*r|ck1$(-Q6**>zjaFenDFgfpvt#v|<L+s{&UPj}|Ofr#k6jgF3W-DKE6Gxv2=rUFg=XasMA?{p^Cq&Vkq*twj<m*Lmhb{r}Bb{X!B+FN|`V$kX!`>O0xDYnsp=}1EYieUZiY23UmuLnU!W_A+3?oY4J(w!ZW6{b1h-pfvPNjubyO}p}7Rd<-y%TA>1GXyMbmU$&0Q843sJ3J<6y5j~HsXFgJ_$|~w$rYD#=ELh3(+c)J!+Ah7PX%;oz`H+HXE|}ZZe2&0@&K*0hgq1Rm7z!0aa>XP)DGwmev%AEKI5CH?2`!zU&bl^)7jK-a|>|jM>|<++OT0QF;Mvqm#dUywb4d*`P93_{oA{14*<c^YLqC*%XBiEn@}(94Pn2;|oeOE*3*sE}@>~6~gpxwyYMkk!zLA@g`1WUf1tm2tqLwwvw}Gv|R}jfZ`T3)&kn%%NqHHcr|Dt@otu9Se40``c?5e?e>GJ94u0&+FoQcnXaRsF=}_BewpD2?#3z#s@ce&LsVMRN+;CnefEOV+SY1!eRHk-igi`^g<9>U_4dp1UUGY2h{p>TFrEw$Dl`)V;U-IDTtS^{?A*F>V`cl*T%BwN0%v+ucOva7ZCd_T&)5b5O}dFiE$dl!RAnm<bR||XI7FoCJHWCWVii%%=dvT&?3!d;Mp+w|6a97elLsn}oJ!NdL1ZJ3GQKB3aeKmKw4p8{NzM(GX=&LN<opy)G?vm}^U9qF6B|!SSA9hi=c#mHWg&`9%Tmtb*G?&|7n9)a<%5V}&nBdwFcDiTGcOfl8rxFNISJe-x69vnU%IkL;wshH|D2>%(C+H<?bR2a-Fl@<5A8KOw|G9)J+E59N|+bXc}>PKy6Ib+=Qdu_hL!a0y!>`b0m@5S;?^OEU?Tl<jDONYX^^`xN3*PDGXfQS+`SoMHR7_i9gqOlI(rV;4ya#tjvgr308A_d;pYY`Rccb8JY8QE!0z0+QvjGoehY5r`g&Hvn6|p&XXV&PdrK!w+F0Lw!O65lGYOPE1_t18Zm{Zz=ODuol{0U3f_V($AVG%pI}R0Wm8MbFmxM@~_h<x8VegidT|O+7k9ldg+t&-Rhi$Q?ZU`;jbIA^AFg9EFIdz2sP)gw<f7OC#NnqcGhYX4QR2+pZLT8UG)+uxjvnC9xkFOMNyAi>;lFBn)UZI@o78%+qGY;Yz<ajQ83^>;mqXA%KZw&vyk}ay-nPus1pcT}};Ry10gQw{;0zaq~697tWJckxpJ8h;VH_IC}tq#g1%PBZV`-<87yul>*x^fKaa!5f+W<cxZzQ3}-*mFWge)I#c{x_e)9G_6R=mJ-C{>IpSz}W1aS0~SJXVc;Iceh?>Zx(l+l~Kxqgn}JDJ7k8ybS}B5lY)3@>xGJW<RF?S{%AW1WbzPcfz(&_vg+OD*7l7R^4fl({p!nG+iN>HI#<3%x+iscWn~H1h-0XMd1r5Z8&DSIu-@9G-MK<}_k~rmbjWneUh-ZM5!u+&aN1Ru=4Do9w5_dFe$MHR&OoF##&$~M;hh^98@3J9?vBu(vpYuZ2mQuFrFxFXNyknuO;`P{wA{BW&_p^GGiNlVR0M{@){$Ko$j-jiC-p`yYHSnw+4~llBS+D<0B;Q9$RVdnos_pkD$k9JDRquWeWUy~Vlsjw9rsZNCpPbpY_3yrl~+m>wqzp_E3hoDsVlD0uOM!sJtQ0!W|0wi-4NFD1+9-I5g1vYjgRDRBiCn_v{u+@j<eYJPz0O2oz?~K+1W^%XZt<rfUX5_aC~LUadjG^Ba*9EJfq|LhSgk#(UY@-kb*7uk_o2o_GG0*mquoH<WU5m%*Np)J4mLv8QqP>cpzY*?@DgAVmfSPe??!-IO<nf_Bc48L++P#=Fmn5wpvMSx^*2@a?$So=Q*n6?jc>%Xxl&mkEmr93d_r0;b>oCnx$58*=hvn2PVllK2b@Ek)*}FTw3Q6Qt8;PaoQhv<-4ASs8Ey-<_;8HgcFqUCl03!4{cc-YgPof4i72xG?l=>)9SvP+iZCC%f(zHM6JWDi_tzG*f@YdD7DQiGjY-0D%$^K!c<rUabwH`vK)RQKQX*IiU*>|7)I)L(=o!AGZe0pw&k+;O*onm7%i@qJI!E;QnN>uu}l`9qQlUciZ%9?2Pm_D^yVxL6z@jOlxRIpj|KaG6%5Bo-Ho_yg~-9VGG^1<N--f94M+Me(KrQep*?QB<4NPCTuJ#4xSdo&#2J#wlZGBBj9x&!fYXtO`@WF$j&--9U85?<ei;J#3fB<%ScGL3pjBh+Gl^XbAEHDVWUSp+MBVb9+M$bbMJAYWGzG=OUYdX$a_0^X`Oclf1r57NPIZ)gr9q3vWIxUEc1L*KGYOA$gcni~mwG<opjGB!d=3h^{e)3-D7v8}UB~Sq`4;Um*dOsbYO30*R`G4OM`hrG$AIprFPHgl8BD;1M+<ik7k$(_HOHu++}=dEKM9~ErYF4aqC)vbJfXfadXt~rIke+^`cY{zve;hF?|0hk%6i7x>Ypp!>c;xQwKgFVM&*M%B^(yQ_!9yz+t-{fkpR$<HLL~PZiDkNP<ygbi<TvR*BME}7zN>~P~C>~Uz+H89x+;+D3ubXoEjwild$O1t#vhHkujB75LwH~4*Vpr(Ef0C_*2N|bNkvN)6rPOcA8CD?z}xt1!NLhE4qi;$zmJ<ad(08+6+D#=S-u}g}<;|wS_pUqkhV4=Yc^QWe1jwQs5$0Ii#Bus8i<>#qdgF&qDdcKD1CCf`++r;Y$^pAQvdvQZe}j9*M~-oMKpEPPq!90&%BEiAc3et(0fk(bb8svH|;IR%Vh2F-M#Uhf1$9KOK$)o$`Ck^YLQ-Hdf}r$eF68iG{_74UC<ooMZQAQ&{|2#$j&IOkos_5F_+dO~^W=R80yqqdmnO6saUN2G3-xRwSx48(dW=TO>Kqsq*@OM@YpBkw;BcrIN)7`xfPt|Agx<X_(`F7aQmnsN$Sa?{O2v<$cFclo?ANZ2}uVanzk!8D*6#2I=H{I>X8k8@ULR<`9@243I%m8s4i)Tq2Mxl@C54l_$s~^4`c2Hu0*Kjaj@AmK<OhY+Hq4Nv~wQEtD|0=G`I7HjCP)_oF+Uiz!Q3n;rv|jt44?ak+@;NQikQkD)Vp*5Xt;wt14njZO@3jViAEtXXhlDxBC{!gcQ9t(uJJ%+2TcPqDH^{2b<m2Q5)x%=NFfV^S2978rX76%tDh1Wtl^%D^%^gUlCBX^?nf<2C!huavcAXUa0s9*si8<fnOvHvPm#Rk9Hs0$y4AVMc2-8r?t2SpcGqs0NNTV5J4tm-i+H6J<RuF|RNN2PR+;=Ptt<930+?E+-q53`(u2+pe(%pY<?g{rGNEr9hIsY&(KvDz-R4hzY?pwn#g~00vqz;fqKPvf)W?HSQWU*#%z>1DPsQRJj#31xw@&hY;@ZwP}a1Y^XY2NFSff_cZ5`bIU4C);SjeP9Q$+Ypzwy_1SP(qGqz!tYOv(6_cdcCA7o1CQz`M3}l0}o(PPbqoxFiYztTkno14KqM(6}uzHuK!H!Uc`wv?QXYV){QyT;kM9-KEc-dQiW<dh|0K%a)&2sp-u(7@^>!G<h5UmE~&Iu@QepaT{1s23w38LbE9vieB%mOl-#>03Dr1!J8L9;T_Ym<Po498Z~I84whZa6t(G0S|5w*Xond5jtvTPp(XrJLLCcs6RF@qo5HQ0}Z66~uJVh_9c@%IS$rg_Ld6yc)GKlSp-PhT&1-qY4A2Ao%o_MuoAJ);Vu<#H7y|Ue0vWMiMktiNbwE$D<sY81BZnq8VKtOYAnp0!QP>G5)5g0ZX2b5z~oUos{5&5Io0FV0U|EwY~D}`o{Y1tKEXB4q3q%m{L!1KWA)qwP<Wc1?3*~9J{m&-kKP;M^w$D_y=}~33CnuM$%PlYBzhuQJ~eeacoA`2&P(DF0gFRE{|e~FVk$8Y2<LQzB0}ZK?Yo`c~yA9ws+8P25m$aYuyxIuzkyPc;QZRb>{X|x)qc=5a*3VCX!Kv|4MPsO|z_$Tw>ToC`J)w@d1M~!ci+8TiXE{6z>Ld#nbx$`!t(?M8{<#cdEh2LF0nz3VV>VyqezEWeY^=1`-pA2b}z+G$*<kT0|r5VJnTGHV%!IikZ;qyJHFVb+w<c0*5mm)Q`E~3F@g_qa7|@;smTfu}8!1khw1xrXud_3D6ucm;$NhCjKnGtm|3nGB_`)TAZ0GV~vPk$?UkAo}VgSn4zgOcaGE?&C*nGiseEoIGE+%k3-K82SRk0TX3TVvuV>;K4v#YS6(h-45p=m<|j|js9u>y`s=hE*~D?E07|7@8dq9Xid$nBKT}HhX`0OE_RJ0T9L!r319dj?UZw+qjV3cVlxLLjjrUlk{8gSkbCsL$xCzSBOjakV8Bfx;ky-B8+rfa6mtTs~co0j3*MeQ6CB7|}3xz?>3_hEU{HvTT+ZE>Mvc_tU4MpX%Lt4u~(4AtKcVD;0zBj6|Ah68F=2sOzIWlWC5&X)+tFf+y3sxG7p;w`r`?7bXP_TY;7>>u0Y;F#;Xv&v2P7BFt_G(3yxhk|izNxbJ=|dSA*#Hi)Tk>E~#e+1;JSSB=EX}Uic)Ca?Vy$EN4r}~4cRTtF8oq-y9Rp|R6yubt7&vMSm_LvkK?CE?iDf8An-boV|D|Ki?7Td&HV`zb)d<!>-S9b8N;sjZz_gvz32atl@ddSoIQ}thBNo*(s;Ss+SgbF*Rc>!95bsjHYs=EQ;q6^%cvqAwzUZG!vuXldk+VT!jPJTN>UdBX4`&%qN92AcFa2C0y3Z{Zaz<cBaDZi|2;}w7o?gd}I!ELJG@*Qg$sjWsa4wh<010CdIbG$-OcRPy<c!z~D&#DhlAa`Kw^lJ~*PV#dCRdASPIJs7aUUq~3Y!(vT_hsq%$+}KuAD2B7s<-FD8JLoZz@(GfWzW>iFhw{iczy<JDP6ufv~L2Sr)&^wys1X!K1W=mW9yJo?-<K<`6X}_}H^N7ZuM(M;j&Wv6YmXkCY{d2|^a7b^sAO8DE@w;cS{n+KYxJ*IYzPnItuop_(PdC`2Ox!zrK{B>qq?X*PY7MuKWmRE1bbjjPd0HM|f~6&+6e^1%n^AmS?4K&T<8!yYOx(I(UDQ4YQs?PMwH`+nrH13=%1MM&d~L^KbN@v7YLWQlMsBg_Xa+nL?Pn5h)&7qyz?2?HJGI7kU-pA45ZlgYS4yss%i*%8PG;a#jTs9O`pG@q*pWvxvaGL)XI1b~2u$6Dy6AT0H2lviRcOiJm9FcOL-kl>%vfDxz*!m=!YkWc|#AIwJKxT&Ka4ajl8sDAJaIvym5;)Xpr5m;`I_jX?0T<yRlr10KFoXW)xomfwDj8qpgYvHCok&DlGJin+G4e`q!FItE2NN7-XpdHWquYdSI5IL7r_UB`1<|0z5i=7iHpkGcCcqP+tB}H!0ZqOemN{|b3Gk3^pp1(OjmNLcD>Rf2Jz+0fgrvPCQjLggZW2--B`GZdZ<Z>&PC+_#$wIHJ4l7AQ3@q1n?@&s#eZt?0BC?h_LEC*>Fj&;X*kl;NqFiZG8i_@szG4K~M_GF82PH(vd(D}-TN0L@YK3X&j&W#VoOLpXGqGJ0xCWDTsVjY(l7xeXQE~cF;w8?dTm5ft31sZRgT0t7kHDZM`gGo?`+=2*7zxl$92TT4Jmc)ovjYFfsrSk{;1Y4P!K@Ve=la17?8%R_FUnz>0ZKb2sfw;C_=y<n80ys8B6*>tx$#I1dflVZY^YsqSM*`RPN~6QelmyL4f{sa+g99vIIT(<a3##=H`8=05S9VvQHv!2k+0kj)LJAt5Dx|9$HLTY1p0uc_)>xWIHDn||fXQJ@F`6u1L%Wr0wP(Cbmz3V2f9cYacZ^YY$@V5Vp|3m1EbY-DoIcZtF9N^4*l{;;t#&~RT(GXI45nI5Cp{~{(Q1%>T2iN`{uIu=Sw^#Nk4qr+6oU$<@H~b_OFW_+wc4FKcR)rxs7a(S6o;xo;5C~>vOq@qI@YY!w($0AJVVt3d66xd6*$q5amj#L`apl+P`Kucxs5GutX0VnOQn}6MxfNn?Jx7eA-631e<s8hH<~su@Ht>VhbIj_yIq%~x*}&ugv1+kyhCx?9SfZO4w4ivIMutLzVPPMOQp|ms%C*&>w}n~f)~8&G{M7$_cb)+<D-yLaN+3*P6lyi4hLGgR*+q;(ErrR<zo51Aob^TA{K4W9k}wBc3&^!4fY+Lfh)6y5|ETL2E9=#*#bG;O2|gPi{YA<JowADJDYGkBJ(ge`X7c%<6M}_XgCv2rzuy(EcWVKT`uB-JSDf>@-(!`gwezzmn$=KF5AAf(RSagtZln5R&!N!d<OGseG_d8oL6hxE7x~(#q^by-T!8;`|Z`|(YM`sx!b;Rb7N(<ooi3qGFq=*-GRc&?6y7u5q&bX6*;*AS=y72*5<Wf+Lvq4(%9w{q*j8Pz!`tSs=`3U?RFDF>!lS6GUslHB?=vP$RenEEO@@2GnQzCaqObf!Kjalk~qKxnCR?{RU>yAIDZOG@%&t5fe_X(l#10`aMn`1Y|i{i&DidAf%#gM7g#V;IL8PJadK^jcx=@>sV}_H>=`dkY$fxS?=o)}yywo_s(k*ut-?<<Z>yf3H*CssguvapC}g0GYOugZl?YM#S_B?aYXM+L$tQz^RMKD&=>v%RZWrlfMKE*jSLF%zkL#3T2sM9ke~8?oE(*<D;))Z!1z9M;!K|<(IZbChN^@sI6ZTa!W>s7Q7SFWZCZI2_LW`u)%Pn5m%d*!lC*%DjOwoK3jsqxvDG>tArDv0t%SW%MyKVxGoU(zsn%nIL2uGtZ9-FIflknOy(ZEzgXni6#Evi<-;zb1mji6@5`##qU!(tY?EVob~<7tFm5Ih@g|Ir{zM>Vh@F9jcHyP=Z00*N_5(XRc|csfL}0ve%cOZd~emRI2s=}5L`rrGh1si>UB*4OBqr9aclHR_WOVDu<wGZMJ)^-2#zxNuom&caC!Pc~O66;$eNV>a7tT03UDOtz8ZB2Txxb>8ed9B`)A^qx!bavmOTrpZ1?b?}TuKi~3J1_O@tw~|id0UQf5D8-wNDzNlTj~EtODt@7bElrZlIwiu;YS1@*|6<E?>>yS}`wgw^c^!|AO@g|dDN>7oi%EbCKv*X%-r`@a*<_-_uw{JWHS(c|hjgEe1g|b0C5nVdg;FzQ3^;`S5CWBusQO-ed%NR3huJ%$n8Qs={Mcp_du(El4QhEm0m@h}jVo}qkWW!yqX+HtD9!fdVI?Hrv$9Cuv0`6-P!>)Kv=i828+|<~9BIAo+FB}e4QI~IeA_^=jyMK!s~CSmQb0;JpoXhTQ!^9E$879Ie!<}QqI`eMBy$#I?2=Npa^)<fsID4_F&+~jj9jMEvC9N1+N?b3RF~APpHvX@JZy?I3(akq#x2qD-AX!M@P;JqS*MXxr&&f$lByNmD^jK^*JMcSABo}77$$*)1(+r?9fkl)utHX^G{@)C+JSRPDw?5@33?i{rw9Iv#^(~X55Dpi&=8^I=TOQCWeCG;)+Jh*Ag{EY)A@5}n&si0uR%X`^vl^<Lc2CPy9V=OovE$>`dPujY%!zFlJpQem_UY{IoP32(u<1@3Rp{yloa9?h-iSNv*~Q#S5|+t49oO4_%m6J@||l};WNO&(HuCYi)PC$D^Y=7p)lhNImpeduPyIO_OFT>>C&DuVMz-X6t_k;7kfnI<Cv9Dv_Fem%ClA?<<H(JWp(A|?yc>1_gPX*@2vk_8$k2LD_3f3TQ^qLF$^I5-Uz>O1mpr(_t;PCf4{fV{JYLmf1&SoC^(2(UgfQgncb1u4MvuICAn=+lhpQcaeWdkiu5YRjAR!UooZS~eBq?^U)|Z-+(53iy7Llt5{08{-ppk4;poQ_2aF?^k?K+`+;B;4?Inzrb<^2>OF1Ut*5RccT7n$+mho+C4F<l={%|~NH|j!~95PM767JSGqABv1mhshr8fDprRJ=&oLS?Qw3gTB?&x>eI&|#!W3j~iWL<G|of>um0*C$3C-b~~#jIj<c7o&1C>|>eh$&#jexZa+B4DFl*If}=i)ZlS~GgU>Ow1SQCj2gL&rEaL%I#LKS$-y@#g|N59*2o^?(@i;gFkyi_9DB+B*D#uD!r9uPfxCa|<Z~6A*stzRW^T*RmVt>rDdA;-)W>WKB1N#g!T_Uq8+D@Etdg$pC;g+k_q8O(JS0Pm$q-^xaSkj<qDQL`THKg<QloQ(Q>jwFJ-$7zx3CwC-z-z$NCHm8VHNR0hS-qtSuU|U;7iV&njM|;QnL%iywHBW6el#(F`Wi3qlI^4U9HbSmi)$X1O#a*V-FF@%Sa(92%ArNq59~)g98UyiKDy68OeU)QYzlim_?n*XU2Zf81RvXViF~1xMYC!&1{MphU5~2B15t;RkQV|+@5&ra{L4efQC6cxM7obGM9{*i6AFrc9Jn$fjVHfQ1&S4U%7VMj?@)th{v<xP<f7Vxe;Bvj%a~>VhZMjsDgdBFcBsTo-Hg9u&_`^!Z;Kxb;u`EX-dzo`$KhLi`FEt&Y;MNnssh30og{M`Y59~5P@aMDUPu%4{<LqEAv&?-MBz{H4UQk+iEywAvr{~8ufuGvyjM^9p~J|M6!sI^AhV5)dv!%QBDkCJK+^bu>iiM5+}8Mkexj(ee2tkj`x)3?`f4$rzoE};gKyhljWTyd$Mn`3EWd*`T6%gU$o}kaE*VZ5%>u;WieR^2*QVJ)0QKzl&PmoRN}g{?TbO{Ro%+O&N78U$o<OjWkMgT$$ZX}2o=s+(PAj6ilT`h*o{p@XGI7dMNE!YD!Pf!TGEvBkkw&O=B^ZG6k4?&k=}v0fzvEu!=SEY1{wOX)$HfellplH`6?OnF^?dB;`(%JK?tXhE*fF@C}IPm07Z1vq1u#q$l?yQqR$k`fNH(>*`E&oHq1sgOsF_5y=|UarpD&Y+ZtB0yzss_;_kVYjzurhKWW@^$2@nu66~F0c>x|>)5VYF;e`2syk&Y{cW=Mfwl>>HS!EE%YB(pfsF;0_xR4^Z$K2mZPOpEp&`(}DWC3L!*|GqZPsUQJLn;$2a5Z@CRA2#pD$AXm@&3r@jt=1XL#YW5DfO2CqLt&ulrMntVF){3#bkL=T0yueAd;(n$!#9l_GlC9qLze>FIO8asCO!))Ml+7S;~+SM9fq$Gg;J^_$1_<hFn%W6`FiqMw*kHyXR4H7t5^_`uok*o0e~fa|D7Xrhz%(;Jgg0GWeyrq~+?9XHBgf;5hMYJsGYGk72HvD`8a?HP(b!nf?$876fFKDM^H4kAz}MWd~#89F(-~Da?H=P4$LhOi^sINK~t$Qaxh)fttWco7(0Haj9ipfS?#A`^6W$7e~>qy%A`7d2Q=4dTwGxQG{k%6I!VR1$i@&kYDgfCV)H)b#;8=+$&n%^On$7FomxgjlPPUdkeY1m}*au>Ub_eAvorh$#Q!tTFPvXi+6&;G*v-8ZC$h|(^?_h%6G~+O7$mI=Gy94EqXth?iZyx-Asi>_=%L!PpU$;#Q*bD$0ZcNN$+gBko)BF5nJ3<T*rb|sx%Bw8D33>hLRv?POlnzx?9S@Q{5$<uR4Jn4p<}7lLb{M4rkt#{(_hET3M4z5?zuYy2J=}ju7Rug7=tM{N9xg{QsmWznWL+XW)udstwmpAh)hcErXEOMgt7)5?cXdqOA()!2Bdtyz<H`%_~=~)*C`8f?O?mGL<gS0a(@Rc)OyP8j!JpY(#BpP(QalV{rgYQahFn0yoDYo&1Z<i^1O2PVPps(BMXxP1QvvHu5U`*Sv9~xwb~F=Re!l3;NQah}!?_p^h7=Sq*ynTm}C>C#;GTqy!+^Cgt|{!UeT!Jl}3GxIK0aMbLoWF&&z_5gd)A9X!%#CKh2dDiYJY%TQapn+q^xU5IF{gd0{Wx6*TIHz{w`Dp#nm0;BLjk6&flf8d&|&f#~ZQ9{cMRyhDAOO87zIQl^=*(b>ovvp;JGKiqcbf`{&t9>_CR$w_@71*YUT47m2<yH|3(#A5VVlN1OE?p1FTSv#{as;fO4@!7nu)Qy&{eVKPgD~q#U=?3_o)34dBp}JvBbyvcFu;;z;V#NUf@Zl;QJ`8m>$=6Hsq>KQNll>V2o6<h*r3!HiLbTuE;;47Ufm#75-eV-6!e;yqjTHJvb(dhwX3r1&aGQP#*Ms17eCdlE2p7_+CpmD)J7Khs`EE;rBx!@opP8jK^_Z}Drh>}8FD3HJsAAPF)@@c^a|*M#o6=Lg%USMy-llp#h#0&_`XR$w9g2?Lesw8Fufa*MN7>9h`!L^#J~@K+ZKTGeiv;P`Eh3w_2ltcIKuYPP!VfwQ4V|f!jhpfx45iAI|r8W-~_mBh^lM^ti3C<X*99;7G@Q(`IZ|!F&{kcC5c>ZM_t3@U_E>nPcsQ-6HSb+OYb#akA{xX6Ucqqb{J#E80%V`c0OthM6s=s$tcZ5oax(djK3IXm|Ce28Caw^>oN+rbjcYNr>K}LdAij;6P}FIvStOc`+BvZQte5OrIra-1pzGS96QBY1H`B$*DCK^$$_<+g$R_|LKJbzILK6SYb=&&>66(sz6;7C3g8E2evK%Dza6kMJ`rODtZUjLK=YUfeA2{P&12os(v_$CCv`WrqKlp4P9%V55<-Ai<O*m!-z=ae1`XOw*4Kuo?z0`Suq2tJ8<-RoW;$rISo^BPotSw~r8!SB&Wp--p}r)~8Q~2xUhQIy2HlSi)P1()h}hQ&l;F`pTp4u!S~Hf2-Hz%te-&FuXiWE?`tG)c@B$RDqvOs|HK_WAlhWSg9)pr*{(P6Z+Fr!YNK0K;SQ61;v3{YB#zrdow*X${UzjHMB3484leB0KMh&#I@ai&AU$kFP)Zw1EFm}Wfx#(hxcAuk=16t-OIb&#=9J;zbw*Zt#?ip)}l9(xE44WJh#sMu3ImPCKsE-l1k#3`vnIwQ9t?#Ud#uI?oGb<tim6hzf4}8wxceoczLJKhu+mpF8yh}K2`52Ss7#h|C1+pwn%j*=8;TU_m(pmbOV;%%*L{2=9USG9dUp23v*2n+cZPsye?*#9Dj%5Z}aKaOg`t0u_R0I7~pU8^eD5G-}hYZu@YvWuK{#=yQtaxYc*f3Pt20OOxn~5;6jI#)}sw^Ueg6GDFZ}T1o1U>FF@SgFmy7b0jE`{MViN@2V0Pg;<Hys`klJX!Ibtu3k+P7G{(!1qC+Lwzm<Pn&cw-B*d+;V8u9P>YyT+OvMaSumYq;deK<K>ngklfx-a8ubDxV(tadCUD$AX-wt3Bgzp?X})XU@Het{79Ku{JKcAbqmB)W7%f>Id?TZh+MERZb5=VLQ}b~)Sv_tD}2=saM6RPH^ZyTd|<(HkGOmYu~Ox&^0mlAH|Ok7z(`BdDBeg@qm1{kl1Q9ISccjY_?F>5q*T2$q5BbGCTus?o{VkDOw=pGEwlhr$~LTfq6wd-s_)*F<3-L>AUrH}6DTpXU2GGEhfivHi?cNs9pNDfQ#52B%I38Jg^OL8xVbD<JfTrJ=D^O5YdUA*XnR$Zvh0HGl_m(6_B2$?t!LMQ6(@Vf;o2r*e5@=a>`F13LnYWvQ$<6q`4mV^dk_9l9Q1r2^&(YT^oBimYqbbb3TlfFOcAP}<Py*IyD-(<%c$JF&%C=I<4B{LD)qkll;kuX6r0NRraVLXc!N~!Hk_xpMJiiPSr_sz&WX9|N*+;!{-GH8Xj_R3CqbKe(5{K{6(w+}uXvKtTb1vauPXT(@cIb_H#b1bMQq_BN?rX3h*OWS1Km_T3b3QBbd``|3wO8;*+o%q5IeP;xMB}XNt%Or9A^hlDs0knRSKK@^+|+HX>T!MlMBxgHh~7r7dFLY#OIO?FQT;SWLt_Jn4E0y8o$<QXK_<O1+q_KsI}}IA4P)eoat@S3o|GwUdrS2<}J)xgRNR&<tRN^X~lGfl~#5UrA4YzX5@YFpj=VK#f|53zY+{l=c1Ka1azZst-Cog)Dq8O1Ex)E%h6G33CV4gjMW4Z%beepR37jk!QXLBD!Qq!!6L<^vE;GW=V&Cb9fyllaPP8wH>$X`Ip%rZ5Dj9qAewY_p16KYvpG5ca8o`c-XSJI2gj>s=L4ON`|uzcihUz*jl1!*dk~V5AyEeSZSQ3D*^Jw&(2u53Z`xIF+}pEaO@|2FU=1%8^RO6s*x$$eUd<-HqYTn`5k)0ngNOISc!+w4YI1QuO7~Hpwp@g}7)2pTAoEJ0sfY?#5GkRISDeU2#nDiW2C|zoCvP0_WW+z!bX|MTD;)_NI1OO%DjvU~8Wv*DVfpmeuzMKjvKp+32_nNh*KZrTLIaYkoswgyI18xg;dad8@>yNCW`(R4DWh&wBPI#lihd7d&r$=rhyouO+Y6EM*lnjF1IjrY+DOl549=%RL7V1D7$RD*pdsPE90`NSOu2YLpXSIGd9149AO_pi1rCE%IYz0)G?vQ7nAv4n`mlH-Oz$y%YAi>Mvv?`N){j#*kIGb99lUU%L*mp#$dl`v4LEPGz2`K%$B7`rBTW4`g~w?;f|X<cD}bh`1^GAiz;D$4z*6lO1A56^8*i7CN<5=feL7176K|DZW_``Q0II^wYNV7H=#}6zCYu*{E;0cM2aXDR5rkXl=R^P@S(jm}ythK~D3ew!U|!?<EtE%~){!!eo&lQ}5{SrLHblmu5{L5I0hpvU&Zfc1MKcieIOsU*ykoS39Y!G>`{i<tUE5mb>}bV4^o2y#0~{|#Ml`2!6&$d5!n6;Bh+KI)&w`n~0cd`w=9?<;<YFX3eZbRU_jKkuos^@6k0nWm=A>e>v#`POhX>esqLfu}&Upw2QW8`!Pq~UkpNr9P)R6P)k_P1)p1H&>sX-A7t3hWaqAH%;c~LEpsG_wpY?)^=No%i{LWS(kTK7?1lkqjkdFGlOm*&rDZK>Q6ziTICu*^0k^#TEhwsL`c&gY`e#4kD%zo_qCbHJ*){mq5cV5D@w#2-8546snM5Z0`439z)7w&h6-su$00wP486>WH0IoX+OF-BYZ&K>%v91W>k%OR89Ai*xqfdC@|1V5-En#p3PM3I|7$>evw2Tx1ICBJ7Wfc{k>((zQxQ3%0oe3g}QqOU}9c9ExC_qfd8E%4TopZjqhYNT_feza~<eYB}dGhs4isQuJCKlOHADU`{#aHefBch>hHe$}EN{ES^k-17Z&)%CVA3sc`U@?byJXo6w@Kj&l5~wxA|rjuxW!#A*fiU|XqHs5;0ks_r;n7g4+rE7wI-YoMGIXLiQ2IqA}zEIup4!|*8Mk#JqVpB`aWbr16jSa;C5JST2uF_ozXT?{GgwKo`scUejYf~79sRQ7@5C9U<*4Hm3}Xjj$2c+yS{-Ut&hrpndHMZR}y+RNtK!^P_xJ&q)`yC^ItW@X_(lWPLVQPPiC2dm<lQ>zX5Ney9m^X7zoYAH;e4tkDTY6OQI6$HFhbu4zy``VJEC}!gt&J(g-91#?u^(5I|0%rRmV-1<fxl4}95Lj^6PPjC>_MaqTmj=I|+rg*IxKbfI7n3#Q|5J;BBm#pz-`eT6Uutje?vM;$Obcc=_~dePr9P#|m(_wwpg0K_X*=c`#4p4UD@`9F<0+yHC-`NQaiY~1y8~n|>ntBUzt~ki1%)pMS>%5WFC3tgr&w|}ILr+n``HUrc%CyLYjc;~mbqCo>;a+r=)PkrJzrZ^dI?X#DJV;LSz3CN!IO#@Wq*vfGkuh#O#FV^kgSk0-nM&8RRE5v5LK#(<E(w>&Yl0ix^M4q<46wtpPynD&P6ja07;Is*+7fE&?ICtrbsPG*_)%8S&$f#h(HV%1Bl|%`0m&B>aOnT8G^Q)%WZzKh?$;#R99EmyFz1un+53r@YmxRps3v=`LDdn=e1(zkpl8mYMm9)@tWr~jtKnRb`N**H;4PXqoe%Y(df<IUq;84LFKBQq@m*{s~Pg5kd|JajVB9uw7q*IPcHDY9s89O1(nEJ>1$q5Uq%YpTGLz{L!;(F>0W}6V15M?8Bm)1+Dn+y02AidUhP1SJCP1)ii3K%uZ(wq!yS09%;eu6?d8Wi-;Lgm;u-A5y}v^eJO1}&?_a;{_s*UVfLIAjfg4tF?KbjC{m35SY1U6VxM!Tu%5eG}WH`#(We=k8;k28c3@5t8Yn6@+w6%{uf?NDO==A$rW~Mve1BlbkY<yp?Kzi#~HWq%+Xyy+H>A*iOAmcU&BVFFSF3kfPGXrjxvpagT{eJ%>w<BCG%D)$LbFZZI2=ZP$xbC5cwVC-l9dFJ$WL)9J7;}D>bGUWccmj3c{Rnle?gF>5S=+W5Xg4;22Y-pQGO&Xmo9pUm@8m!7{q1i?`-plSRA>W&8io~GGd+hVV19;2=HO2+3jGB5Ncas*ky+Nx;roLVGZ*fEZ=}0ceHsMXx-dYjlD(>06)DIelM_%@XI26^G{lYZ0WupSH2}waQpf_Khms_QCE@N-YcB&NDdhhpH&MfAna7igG2<Ed>aeYe)nsmINm^Z(cXM(?<<2OdFm_e2aR8Uyci~4<%HUdFUKTh@S3L#u3{WHo#UOCV%mlQ}M8iMOS(CVg1tv$f>QoHEAfh>;_$Lnl?g>}zaStdEEf!NqzKA%hh6dQ;-)<LBPkDJy!Uxv+Mj)hBF}n<E+UUG(=562Y&^)Q5#g^@oTxeX6HZ;cz&pCYvP!>5YZ=kL}t|UjwAdnQ_Fo4z_H~6y5L5u80cQvNN_2lCUn`XaB4$@<Do^QtJB2s<+9Hd`>fHGm0KDjFwA5iEA^CzUfsBrKKO${&L?d7bz!(Rg;Lx8!{i9u%ov+3>as#^9SAt$1@p=iAV45(o4g&R{&8uriP1h9Nl!(?oI^L}stWbc43k8O49O((#5!36@><U?3YI|!WNrn=@f-POU>7->isxPMJXn&GX!^T?ob)z=itvH8twSE=8O3yWK#or53~1;#^1N)4j$0!3;&dl2v3v0Kye>Xb8Zp8Orbs^K%Q<;CANY$zaWo(oH2!2+l>`(-&Z<N~f7xsqE)Tm!QrDEH&x(f4om4}Wwx=c?%Dh`2Ra=TlXjX^=Ej3r96YO^u0yr(fQw?lw$Qzl3a|6-_?SGKa;7U0qz=6osUlz_UROr@;Z_Mu>BHNr@qe1mNjSR`VIyG&NN)yo0@o8B$n}WMNKyl>mb!Y!Dtl|N7tZ*UH-@OhNFL<AxD(a+z}*u2hc(iX7)t>jq6Pl#)Nvf!b{g@URWs$9V3H*s@rd$uzYwJmfhj^YSqTRmCQ3?v32u_>l$_V3vQF8<xX=y|w_|g_=@KE<oYl`Olvw4_~i)=D%O@fB&JgMbtDmU_ahFgmzyU9&hKw{GA`XfBTIQcVb-nPm?cy>i<+dx1l8r{Tyn~Na%JXYS!>12c+bvAhT?zUN56#L)DjM(pkY9PCVOjI%B$BYxC?^tMjyDjy893`cH#1E7VC^P|HA`n7x94*eDMPrc1EN6T4g?KMjrtmOX==rr0;G6O#~up-?xDWV}FxP>hw?)9EMo+udB?n%ZXoOXQ8idM}Eq-|wIKO$7Dh&17pZ$h@fyo)CCznK~;BklO*R2u}%~fOtRdpvZgGD)>M`!R*I;9_#^mWHSCCA;%MZfv1AAGq$Zr5P?{zMpW>~*_VmO=HP-6Pp0!Fr2-=~u-H{8e3(KtO}G1aNo#Ke`Q}VB>eG5+K(`l7*n@c>pe=ZwD7Mw0G3x%1Z|x>7<Afg^Y9|usXmR4mN23V?Vjbp7tdySVp#Tnfc`0K#-1i4_+AC4$(5GEwYBAE(4ccTXhNgWQ0@SxWSj6H<VgU{ijkV;QE3~aS?R^ftr;G<usZ;PkeyiO@pm&2!z(qS$6PIU-bPyavPmbD+*-aj}<h;WPtWRmAiiYbm3#yCZ{furbvltYEjO!~1ouq`~z^B7+nwrQ+p^DGV>lDU2Lj$il?Ct}Fv^bX`PlZy|s@vBsR#6*Bc><?0wH?rhd>eNm#jqDYUIQvWR^5AKLd&<9#Dt#0>aj{HXRO1nkWS^RIo-Zptd*(Y5%%k}Dqb)0wVOHGWZ?@-VhHB=SWR3LSw|Q`x4kH})$U{Dl0j(Uk62@FaqNia3fgF8FOa9LAq;yfhH6|H0L&;{=`JOVAsY<BMbxylV_dhCFt#!OpYifjH<6HICct;qRE0n8!eR9dDb_>zkaTN6J*=#Xxl0NPY(p{pHBol*fFt%8ecr0X+-%8*qPWFZ=d0-qRFZrU+?9}@-y<L8IY7VzLrfqghbEPDy5TVrN+07rVUYHaPrj$dHy`t9A`z*Jy<*@(MC-lf+#m!HW}a?((XQ%K^;YU<r>r*)ME}!pZD&!6);Jr^VZ+mJ@W}EeXsMdF0SX3QgV>;t-1z>n+yGSi#+*^X6K^WY{!Eu*Y%fpg6V;e_h>&<{4GZBBnkx~QX1akr;*^Fw6CH(4RPZ6USDpowd#s2YRuN`KklkBybz_9QqB4Qgc49(wAe?rpZsHwkqP{^83pAjVtjGpI+G}FyhuB?UYK0{a=^y`<1K!YZY0O!q{3z>&4s4F=9}*2if<=50{srgU!p;|tk*HBrAGG|P;XC$rJ56JV*udlPPmz;2lm(wPjA=z~CZ+*Ppv4Xu<EfpnTrzZ*XpQuLq^W*{Nz%q52pA1)fhfOY#aj&3-`$35il?vcEr(V0S%=7}W-l}cK8JGeG<PIN(i&%PQC}6!Yg&sh2o1xd5-1axU-7%}c$T5}%Qf`uqDp8Y&bLd4sH=EEaP_nZA8>Ar|7JQdeFfail=p3Gi>ZG8Zh!mWSQAe-1ty=wyJHqL&A3N7Z!P1aoMFR_M9KY3G+7iQ+f8nYn{rx7795C9kOXBI4MaS`vHBz-%DlWb-5Z!xaFV_<!cldxn4X({n73s<Vh(U4eM7;%ja5mhrop;5y)u|jS*$O|AIsH3oa}u*f_*B+3E8ExARiTFaEJNMrswRrHoo)218uDjzHYHzZ#NMoDE>Tai;N%N3Fn6LAw_fEV-@dOEIjATY3$)#3a1d3nVItB`_=XMtAGBzY4Foat|bJq_F4bB_(W})&B5IrCLS6g4pJ){0Y=hhtVX4zi<^z-ItioHLDK8zYtyg4W#)DIk_a>XNhdkrYMjp|GvoD6Ub#+Q1)a$5Y?$MNm*C<j6{<@auh+>6wZZ|T+6foi)iVwj)oqxd7vbpO0>XnY3)8W|bVkV^6JJ~DBaL0sgT~u6T+LJgfR`vI@xkwG{pfOk-I8NycuFXEh8YeUH4bht(K6_ym>N0RS*U{S3*#9&45ebN6}^iyyz-aufLmo&;HBT5XU`WM_u6yfV2@hvLZ~p@LLZ9z6qqLSuO#CPW}`L3`^BfJnf457WMLqvp<;_-HpVm|&|fmXf*Xkp;_yHl%%4>xi9yk@P*Z$cR?|;Ni-3DT1(<t;q{IE3Oc$uc=6Po_=Zx&PCuV3CSc%AEb#O4dCpY7Z!(#-|k7gziTS%Ts&|PJway4E|&_Gf`-r%YL2aMxUzISjuIyl}t+52IXzd7c#Wsm|C6e2)}K|iv%o6gY>Vmkk)udLP`xQQIPN(I6-pneb62g#ytx`=J&QUMFh0Ovw#OSJTwyM|^=J|*Uzfw|#crmznoWC7UF20o|IkJy@!QkkY!<qB~P9PR6-$`2}k(<{5{sDGb=X{B7;CwJr72Y{rMY3DFN`U2J<c7}<Oz6G%`K&~t?rtQ`hgjk|Ei>rfJ7l;aj-S9#NL>m(hUX<06jNkVabXxUED?oEKcm0y2eeA~C1|WX$e0=c%tQyt*4K(hJ?_i$q=!(Rpr`Zef2k-myxh{cIaQmGBIB9}!$`UHkgPRMqz#p`Y{-%?!NV%F#0{;-eq&%O_r^`HNW$mIYwSxzSfJ%B!buXG$pvZ%N%pJ3RvTum)(c$6AmS#=+vXDU{x_3bGVyV;+<S1c|oR|&#p>3cZrldgyji&`MSV1nZe0ZxauA9&pSnH|}=#s)rYl(<wreD*5S(O=52iqZj5!8jM=<=uNp&6)~&F2@Zh53ju-8{9)^vtWOxHVIL(ZLM3FFG~e-2$jjAz-Q7W*qFxK#4-m&9u<$v-D<xrS$heyF)8MoqjiH@gbWe5aV98yr1FG7j6~L5cPt7?I_rQ`gv)n^mM*NC0PYQ^>VN~s?^38e85d-o;40h6>-k?n8Cl0|JAVVkTew1!UDDOG(>`Sz<V(3cWd)Q*N_tskkDecyukJK0ZKs*23YLS-G6S3S7-Jv(UZXT2BG?W^hAR>s%tkj&tG&1f5?Sw(19((W|Zvlg(Q27rP%f>jykICHrlWY=L^X0*uLFe3><*Mm~paDcj_`52cjlsk0eL7Nm&q(5l55MkmD{n7g67^2bf<4)Y+!#3Ou~b&Sf4F5P%V`0{%w8MvL<;B+mrzCtI+R7t)KP$Dy6c&C^Qd!V?)d%Egs0%TxvtxMhvjDCe6UyrB3;>c$2NZMDv35TjKdw(@Mkg#oaBH>59QMFA=@`2bAZa4inqP#4uFpInb?vD#RVc8M7dj&x3bx2Y>reQquYbpJdX_=a#p75#(`QYOhg05h5Q1l+m22Rp$hHb1<3w0H2$;a~hmyGPq^PJ(8xD3TigAQ=8==R4q%yobmCaeOj*i&v?8Xr36M;basH0%0WT^ST)CLFXx{>!}hk`Pp{ZMW|;PFrZ1|o_pDm+$i?-AbFr56G~jCYrX5qnGJfscQo3~PY&PZyN5f+zj}hp@)n$(<I^)Q6XY^Bn%v<#@Gsfk|9q1xnRLnw*?Cw`QJS>OQ=JXD0lnf8x+HWLw2_pyQMfNMtPhk*todj`zTKMlxan(e7n3-eg%|US`>u2B#MtJ<dUbNOH0>tlVn5MaisfQ7;9K_u7i|WYhi%r7$%}O!RFylo1`qokI|lgv-#nz#R&MDm4OEf3gIe`7`zB1$0Lpb+UZYrWWHWzjpK%AkWKj#m8po0&uRe4;>=4l^{M}M~zn~Bw?bPtgO)!$}1_GATz@l)bQS$+NT`R1_xp!%vD&8sFiXp{=5cMZ8_!S=CAM}t|_LPpHmI-69)w&XN5A7{5RMa`dsp(@kiSiiomyvlv!@S*(j0vrJ(@C7zATD9>a4?P<#v;ih15vxiq3CsVFs~ZBMI&dFV(krYOB0Z}&_Pcm1%Dc%M3lFPybl2ytefX1XA8Do{{G!iP^Aep1pA%=(G5rKYRC}q6M0)lS{}%5hdaYC4fpHOiP*hqn96suIW3d1!!b~9RuCryj`Et`IA3c!Yu7O3NyAeJm6lz$%KcGiJ<!?VkuEK&BDX!J_OC3YGteG4OIp~<(qcUXes6B3(rKYVSSGp$ee|FYA8I44A#GP2KSeGrsbpF4vKe~zZ)zh#Q?HgGU(5j1p1IQP{r$rq4SVwT{qaeDG}_*^w(~j*tk)Ke{_WVM8aApD_usDXiX8s$((QWUzEVdW?(PR#oI)siQ13FUCqTJWHGza#_*ILutQbmDPg$TiqKn-5%U0-T-g3vs25NUYs%8i_Lq5e)M=?7`<h;Q6%yD1>zIqpNn&Erq3vsP%5+-{aM_ktfzkWx3X?g9m7ePs#Do}EAp{)Rf4J?TE0`|QwG_<h+f;tvEOwBQm5&rc%EaPGCem9PPOJU;{wx)&*7PeSnSVLC(9G>Y*jJX_i5%9o<gNIyC%uh`7to^!|w*7?N)GNz0iosrcL`2-Z?#39oVK(LO2CfR{JeP}Z+a%)2mLQ?&HLz<u0z_hIMvWhTiPb@HLMSK6I<j9xHkerO%;LPL1&POxigyZnpGDYGc-%xDIE58=&&jpe2}B|yeY96@m;QCwKoWj83<uaCmfaq=@O(Y>jHz9v&%i~7zK>MQL20b`v?Tkf#5-Du5|2hOK@GQQ#6+Y{YAg{C#f4VnP)?`z{=n}&gs2DNoJmF7h$!MpN!cra%ByzjFtbj-!ByaU^M>~Ue^R6Veh5OGZDa@H-bALPXp;`_L6m<_jd?(iEV+7<3<9q08`TqV5{YJQ!9uKZo{jD)Dud4|)juMx*JWopNUU*2{TIpO6i9zolbK`Y@@(*EehL9p-|5diO>_(2OU*I!fY0-OgD=o_;B7H=skS)Oc1I^kdU89@P*+~771g9X2ht(x;MT0*wHeSrx%E(WR(8-OqnW*Kcn76$7IuMF>u3ki{B+R!r?YTh^}VP);8bKicdIlqExQK2^t2zH;?jH<J3O(+=2^3{VZ$x7wAF!-PL#yfsCCpN8*e|uo<d6IZxt8QprD(`dvmu19X^F8L+kh5q688zPSOsT^+3wAI+K5isS&}<hyAec^CpL;yA>CQFr&M}nb3#x$pG`$?YFMo7vX4*6Mr&XP2W8yS_WXP#h$i;_Q5Ub)LXz=U+#M38d)U8+JO(D)^#1<l-jVZn-smuF0RcLnxa3vm$mvGy8>J+A#FAKXhO;)if59XN%$YSww$W_W_(M%LK;&u#NwWe($+b&o=K(Za_J&e+j9X$9@8qiS*n&owx5=#9eyNnQIc&%H*qOgB;J!Kxo#uRI%nF+%)W--?rY2xQ*-qc4gj?$2u#J1iuZlBOd|#d`P3R2h)>8eE(FbMLYDFLEOvV~+b(fzDOuRa#JCwOJXS?lH1dlNV85APdz138Yb3++%xzrK-$I*8oN;PqlVAj8Er6dL$=Wq3KEZWTv7ZdQJMFl~l3k8d#7k3ZrXO;LRaGu+f8~Pmuq;zBjvkHPNX9I)g{g1%V6DmV;Ry#tNxk*B#X|TgJI@Bj7v^bsd~6+R?0*2*h#1jOEV^COZI`^s9H4RQ6mVDy#EuT?s~{s|*Ys>LAU#gtp=V%0kjPWq*~FW8gqY*p%{MZ#1L4!vYgzMxY6a7tuo~G1O4{jdgPpy_hS8rlnfF$s$S=E8KU9Oyx;n(LM^=YOh6nSrFHe(!&yR=H`IAwRKKmbvjcQFzTlUDBp16tKrd`ZkX<5S3@<R?xhT+~|t2$@dCR$}#Q29Zvr)C_L`D02*^A~u~p(E$u@O!%;^Ib^!f~cVAv{5yN{!qVs_O_44MQp`41Q$eks<;ObVDEs@;n~EN71e=nrb~$G5hxtGT~#0+Vng;;%AQPSSfKzJgGH&J_n6fRkm(2AFPZvnA}vMvaQGN$21uZqF(U8tLT4mxW^>vZoaATq#^-4=`?<Kd{sK<MX8<qj++QwP93c{*O~An9h>h=CU28^CYX%Le$+?&2@BBU?UvhSRhjFY#VYi^csalGmSk9hi>C83qy?`*Xr&$)r33$K}8XE7z93ZG*2Fi)JZ#64In%&HwfaQSMa{dv89-+!&A^6A_ENgzS*q$ZMI4#e&s_UlPCV^72V=S4}iW{waPnnk4{D|9cWNQd0LN93uSX#QeNRVe6Lkkv;8J;@%Qr8SAS_<4yx0reOT#`Af#(D*Q<sm>3D56wLAQ1|XK6W^*Re&Q~VO5;Ezm?P{<t~Pj|IIpycsAXDX8Hg*wYw@Mb53olxX4&wi=>>p?aH~0s`f~+g}5oY=2&6-WSy(~{BezRBq@e`Yz@>8uEqtNA+GVZex!3<7sL9AxQ9qU+}d2(A1~aKJbOW#P{%_2&=%40^_Kiy)RQ~X)u}C1>fH4mAiCaK9@W0m*qmS8&{O-w_L2<!Kpn{_uOWu&z{saczwWjFQ)Ha%H(EHVJ-yLoR^&s}IBB1_|H%hdM3?@nXS@{_Rq7_XptAZd$J`|`G^-`g(Di6?-!C(yBet}Zkd<bnbtgG?cH6Hya$~e6&~gFQA|AW%=rR#@oomXvswK$b*^*Cu<JqbXT?f&vW>=w&D2`q<TEN?A($k?rA9`+fk3&VSSm%3ZApywzpy#~q%GC=ut_2@7a}$qguQvqf*4DRsC;8zw|32C|IaWy*U*Yr74|}_#gPl?SW^c5=OBt{^wS2vVluZl&t>guVc(ZFx$-`Co#Qoaf^erxo$`u4Dqvs`-JeWelYgTxVmwlYlyZ!B*(RY|NhUU}Z;+RIb>(NJM@b5-{VZXR|PWP9+e;xNO&mO++{{HLrKiKe9%+vs-n9B42DlV1=If~oT#g_S8jAfj@8yl9Wvh~<8S^JdSVc`3&kz%oM!LoE2(0O@#yUzDqN9~&nY#c<}L(T%wp{IJoAfTM@G!C&(Ie$S{1>0w}%mK_WS%b69v<3r9rZtFT9LpUlaqoDDVmRZqhIMz?<HSI)VR!-pW{$I8^0SU74@pBmD;z(S=}Jvm+Dh0(s#}UIGC67qXAIltM+-I;w{*L_UzQ&rMwjYxkmm{+TFl+^SBNpV7%$NsIqCIq<Q|Uv*W`9lLTOD72$nLP)PtFWj}H`4$^nQJFKSOiW&;#u_h?uwWeKv{3S6HSMKr}mwL0gCaPj!@Jzy3_j#9|^Wrsb={`29123)Uynp1H-nypJ{Q%6}cT7b-F2ZHKZKIuG_vI7DuJiQuR!~d1i;iI5X`2|M2EHn;Y+)ai@qj!fvToRcqZdc18uQB*)d~0@~0MjG1frvoA0i3ePW161-yy5665bPM)znHwEUk#_x?kE;LAr}b)OLOy2%p|>fC|jy1Ha@~b2ETY?nmgx$U5}S>wfo(*by>izj|QM;dYoJE#<Nvf(Bz-_2D?-I^o$twWreY=v;_Q()quZZ{te#0qKZdM&0UtEEiYpxSf#ZP3@2W~e13%(99(P(=yFJFM!()4WRl7Wg=Ew)SOPWY+6dqm0#Rpt=zpLObW|`G4o1{}?JkXLzD!*CjOpAZV|<}5C(QS1aBYe%Bs_&Kl`5ZdM61~@$>Kwmxjf1s(24-c-g0N{_SrzZMwW^0hk$oz$j%yi5=OLSb)Q0)P>iY-cj}J3EM0~igU{i~`fV9_S{)BauDxDxj0ITe8CEBUuu%|yk7d${sW3lNORjv%@qS*dZg0^NYOrh{<4e1eiYSZqs?Ni0$)-<vi%KPL9P-s0#u*%H!rp(*B1@NnDDLvEy8~=6T?lUMVVymV+(4yS8r!W?4#}`~k8@K`y0J$pCXstqRw(eWnvXw@r!zSFUc_U^yTeHl@fr`kT`xMX@=5JO0aOdUh^L_TSKt|{v;ml+0}eaKcX((1wc*zdizAs@fcQ`$Ffz@R9}AZ?z*3H|Iw|hVKsXCU)cJ|oFP>H{38&K;KtmYbW2imfcYIAPwP!ZHjF&03Q-)7%xG)$a;D}_ga%Mp5jL==)OfTxfSjZ9ArJ)DQzYb!|E7o4Ph4Meduv;$F$Y#%<Bf@o)=g(!{>vf~0tWH7nff+OsDmr@-Z9uLjK>VH_UjQgh(-)b&E#AfOd>mb1#}&DSF0gpOfl^QtQne_jZLQav@uz%zRpi&@YGE#CBh|HD#7714t;BCr{njaP%0?10<mpB6skm67B95x(dA;+syM2LXHY^`+U{a7X6yDHAR>cc+hAR2jL6v$a4+*1f@j;qWsX{_^KqXs}eu4GA3bXf=-ey)_(bZc_{L9v~ofQqn5wnmI>!FHTyKm3|@(U#JV^YkP;}q95^j68GM`@8v-02tD0<x{J(lxn|fi<3JJhhhd-vxu@a5la<pN!G-3PoRZXfr$+=Q&-1v8pB6p2%~w4gmPHDk-cb#o=u~L0)6I3nA5Mn+V&a`!NImks&z<b9T<m9Y2Yeoqxp6vzqsA#`ouixi(xG=XNa*;HvosBr^9=lK$zz+r0I4rmFbTkuqN%=lh4>l3d@7mX-G1iuSi54DkH{eh~@$SND;2lJY)_2y;^JI;w#1KlT_IZ2#}ahX=a_6!{7=DcUO9>$ndToIy}7_9R9Mx{C+)!Wag8-c*86Of0`GS$A#n@2i4U3uI<w1A=Pfo_A0MqF#B`xOKqZ71<aqNg|t&>**IB7uP}Ul(>`8!tK=H31gV)-rQ=STA13mq^wr-upZ+Y;dQL$T0x8pq-PE1lykGsm7@%i$^VfjRD5OPhw?WlrM5S}SfD6M$v4b({P_#2?H=x&93JIZc~R+qzt$R28aqecG(}GnDsIx{EE+KlDN5SvE+;)6Nwl8R@)Y*9Le1908u0@X%-#X5x?Pl$6?h&{+9hIv#jhETCMV{!ny$+vKOP;KRkWr}<u-l2EV7-@;$&HwOa8sFa@GUquh-6|IzMWIp4Me2Z`9YuHaY$oq?e;_;F@p=^cqGXw<FR)VO`p2D*`8Xi+^tgp#=WIL8;&=h2eop#SR>e<z(PpBx63lKkX29bx?~z6y*7H;AbdU6#hc~+;4oQ6;05;)RY<<&T6B>&?Uu4cpmVKIGlV8U!#b68Xzew4d)mk%giLSiCC&NgZ%+hcN)0|p#qgr2`q!;6#wc=sY!+*Jc|Kwjjv5--C(o4+6pb=UF|G6nyclx7;=L^2beqv(b$&99V84!!Oj5#l&a}M1Nes}J&|ZgJq4bejlTF1motjAP%b_ei!aOth_VHyw~o1pVY>WS3LoFs&vq1qQBNvleC=z`tYY3OYYC|cCy*l$DB5K#r=paqa@tbKa9g?5r<`jX-GiX`xFOmocbPuD42z&|nL<uItB>hFVzc-a1_zi385=;S(t~24^ixvgp*rUhADKTL%AlfhbHl?gwJsEM!!R3uW!PCQFMEIJJkj<r!hgI_@KFD6^Ns{-Q%OLD41+5F6!r7?O_mJKyfW?0_6bz%Q+al)3gS-0GRJ{iEUUOo%=AFhOdzXgK^{kgAwOOh$O&Nl6J$mkFI}c(tM>*jw1?HFFEC7sUtsr|V}Ng%_v9J)?l#q_X@UMA4sOW{_$>2NATsdON4#LpADUAfA+BDp+YjVn&vhNh(*~H}nJQ{H7bkd19h{6^a#GF=Tqfz8qr-!f{>{XUdt>-ss2`0*G@Zrzj)8403eI3nE2+)PHzfTESLH!0U@=H$iq}gla@FSe%+&@9aO<fCXf3Di6Ih0isqUR@iMQ|E1@HOTkUb1WMQY0JVErwQyQB(&OTNZ9&^w^g(BB|Jk=Z2B-ExRKh?%!>i(Ko-ZDsa%*G9@23|JIB(SQxujs&O5Q25)~sv`Xyc#B^##V^2?g89b{;@pTPE>R4>?FFses78~UqH-!a78VRi?<Q0R)@-AL(S)fGzPvLpCk4vpc*W4oVs>0WmZVit)UG)$MzM=i#`S^@9zBym^-f8)WwJ-3KX>6jFCbSHF-v#XWmUM8P+L+Lt5Tos?RGgcgTPc0#T(d;=ZU$VDX|I9A8*gDi@Pht^|CJ%jLUv-JuiS=34ESA@G7M-v4yz!7#Rwxaqs{`mc;m{IM|`Fjh?aAa)DWDP4jyC;X&esLuOIyAs-3$24R3{I|iIx%SEQS>kW(-G<>Xrm^$)^E9lS&e;`?Qh2X?RMWwn~TGh^)Pc4{RCakW-PCze<KWGA(H~XK5@`>`%AQX)9`06{`@E?;@_n-VMU1nVM?fqOnb67>V*n|d9wY(TF2$?>PN#oJy6+**iz$;ic!I&olXbu^BVszUhqLzSC+&*f{)oszW&twDDzVU(@%E#%gW9f%yS7VH1-CKJ9{2<y|1cQJh>{9YmSV#rxYS%d-h?OFqb9-E1wiWq6;vo<Y2m(9|wshFkm77Fs0Faa1NQ(|}<*%Pnw2Q1Gc4XEB7P-d+|LFq{Adel)7?h;jN3{BUm*nM~#}5+%#v~?}lh82paM)~g4bOpMejNSrC!xmtc^Hc<^7>M(|IyoK0~`Mwgd5|(jGY`DqA`Xm$^s#5+Xi}+Eo*SN4VW?6KNK#371o?kYLVt=d&n{a9*<@cn`8s%No$Z=J;WniQhSIKb5fic*sroo@BXViCktd(AO3;wqu{Yr%$G$tDjL&kOu30{TfZ)tV!UYTD)R$ZO%2mPu=+HGB0GkZpF^x5TQR%7HWi(y%ma)wBA~L~h2ER3hLYfPxPJuqMeCAUPbC36*0p&WluHtbQ_^%x@K=ZlG8@7%W@bU?8RfW0NRS4sk06P?!st3W5!TOq`O(ha>c7Z7yP9L&8e$V?vjSL)3iBgEy@os1XHi+?>!}fFrr3BcHW^Nja#8dtLj@Pmsl-QD)m*a`Zm}|(uD$)jtGw-VQYzgPkb-&%I9s<%(3tkzd0R;hX)N08mC3T1BP0(H_S=J!E>L2^b84|&kbzMbq7tfDOUGTi_1c}jB$tSPv3bm&B*o7|O;{|JF9_iS%Noa_uEk061N6ca%lffYuE;%dQ3jHAwlp^2nG0at{6nNbXIdN?Ca8kk&CP#yzCTX>IFxxILV&&!%f%6LGgEE1nqDiu5L*qK3^2U2TrrL`fH({Bf{t9?0vR33N)J4tu~D3NgXrTP<!UV}JM_zaptDxMI|c1)sz{ILP#tN$y6*PXa9H9gAHin^<j)?5pZSUKK~D*9ZQZ8_p3>TSiBX|8l*Ov~__n%+0z~uKeZQV#Q1K#ae|&ub9)m9l$GQacu3fLMeb{839dN6ij%SJj!xE?S%d!@&e&pyhWK0Alpv)~>gP@6zV1iIR2px}Mmgb#J#ABpN)vXx7W&!#je#2j_CJ?G`Ruzkn#o}4z&W^~QW7InX)dz#MRIW7lA{5#ok8<1ya}A8GC_p~5{a?5b1pT3Gf^+W4*?@9NESWPi*`MM{Ehmx8L|KF}KJz6QAR~r@dQd5ttR-XZIasJ^oT;giPGgg~S*pN+<gK$qR@%^DD+nUX70kzuUCSD!6BCi{SbqU5G#6ZhDvWk*S>O?VX?nbdU{;qb%XcIVGITlIJe|rNlsh1}ft1!C7{>0F7F0lu?>k)D6j}qDeae6DHgBMRILHO<Z7!{WN>6pk7hpr}UCOXE!0W-iv1TmmlnNn;q)R1xAG!VkC<sIHtn1tX0WTa_x&(1m9G#><U*BUP83g+4(M7ec(s|iDS2~f_-zb%r03mZeP()Fbh{?K-jcz=oosd`|s&n-nm0FgmPc%~tb-IOqWRYxQSR>tmL!|rKRd*=~|Kj&ttS<qrQ=d4~Y?J!iYaY?I_y#MlVrspoCaZ_rSKh1oedg_pEaV}QAqSLogNXjF8%ev3=aStXoA}h&hXR3ttS#2LSjce){08e<iJp+vv+Q2~Vpfb7fgd)#VI`1-N~Uhe<MBu5gF2qGGJaa27w-a9;uWfzjl5ed7OPvh>Y!MTp+A7s#cjn=E0mYc55-n@3VFk6`mA)KzoR4PW*9hO#(gI|KDL{v_0b6@33kY?2U>R(J8`~4LhNXvrp)v2K<25-BmE|BTt7Iucl+Jm=Xc>E&xF;SA|(EwDN*X~-T!ZuE9h5l(5>cIzLF}dGvfM~y#l{(3F7UcqH!VyimuZ_Jd<NZsuXJtWi%2}94fZx-V{cX^K>FpA@H&MC1#5x^e4|pw1{E<mhGYnbe$N_rM~g2)rCD?+PtpNqa+vFtj~HrBH<QohZqgMQD;H+8rKE5Zfw*;E%Yx_kRm_UO<@&_Rj_HMSgDn6NmX>z5j7N`^be42V#6KkX4~gY2g$Vh>T7-IY;WdeI9}^%YdslEsNfPww$YQvu94G*A;lbHT2}0V4h@K3*p-|Y)-S%{B()-}x!#zro2eD!8(<ZrBs8Bz_WWcEG8&NQ<o>DqNWi}YCCX*lRbd)H`$40LVuLgR)fnX_l3)$IAu$*mFGzGJAwMDxnlzW4xl=Iz07$J%v@~BsbeL(&gbS6Ae3{Y`Xl-KmUR)`BQz)}*>qdhxF`k02vaQaXvOaPU2Vd6r<r{+#J1FU1Ey~p`o6uPc1qOUW@LZ2r_}Ktl)Mo%BJZY-e00XzL3J$U%W$GBbTqODie5n<$0UPOjs{5V*HAsFmO8{jpfw`zytF}P(iRi9_e8y_-JMZ2baINM`4+4zvPIFO^$nR{Up4`v*tg5B*Fz{HFw9}zTd)FLmz@o$2qPTo*BXbFhK{384R+ZQ=iIrMPy#ILWRozjZ`^ny=tWg5}Y#1hPWe`Cm7uGP@9lhCpzkedC#;NVcv(?*6n`Eo17U(G*l0BO`%Nm0+7qAjF|I}515Hx&v)=i#KHUVa}C0;XIclc7fT^LebV)`2ELnmW;r(04H0Z~mA^4nUtm?)ont9yA1GUR-IQdw@-$M4`C=HQWHncE@N;4wEu@})G#BSks(7Y{7y?WS`m4X?B)%sS^NFnLAF^&|xna$D8s;bBpYr;9OgvFoPWaL2UVEzpar{E)-X6#gUr4DW#3qClDf2mEPwA*?2sLNS_xXu0(fqRh+a<JW(j?R7e+cGlN3!l*;?AbeL>@fGVp`2Z?xvoEpzV#ORj?pGJ%d3q}KfL$G6TmM(;{;I0IQmyxlHfHEx7)};+g`}J7D&8(gt0sy$Jt13MxITvXO*l!z<7yq26IutjZjYC>{GupW-rN|vpN`?4G?erT8Snl9kV8ChfKyZPr(hyiqklic){rt3pa7lqm6ptJEgOriFr@b$7|0;_9PL>TcrmVhQS_x%ds#`-GKTc&P#Am<1VbD!LILQ7M+@kYfK27uSQuEO<c7ZhpS4Bm`!>)kydy&!3oqbHNba=dI=k$g?j9bD&Y&pwQYU_+>^2Yd*_u8_-M)tnFYTxmkmHvG@mIfzApIkRoqvA$`N!>(o$vD9(Km<hAz#H?$Sd{FFZuDi!~Oky@8D!~^uzW(?0)~BVQEva4_)4;|B?Z{GGyvzTzxQ1-`+v~_HcLa&3{1CPcP|zU%}(;lar&pZ}j7@;qlJ?;qfT{@o4X4q~HC4dir6so4+|ae5+o4{nEWUIaDwHfG>8AM%%ipS1<AL?r49cAAhAE=f|V{H}2in^zP5O8RO{9{^5`Im3f1&_P#whJR0rV=YNpr$A)m=)313Q=IP;y0Z0CJ`}lisqTZr%<pQOj69*dnTf^h$#0P@<ZB|arX}S0}uTlMt3)=#cb7APU5mIQ^5RarnjEyvRY$7>KQ_vZNk+6Ahe>z`%lATY|kJGWaK+Z3^kf3S8E~FRJ0*;8`*sL=sn5y|Beu}rVxgCtungeri*~MWfnne3cQ53`l7CebR?HeY1wxu|N*<~N6Jj5>j7dcE9l)Uum&hGwxs=C2c#n5IkUfidh3*dqcSDP1$#k|DegDmI|9sA&|>(oB-n_iMiUMA6JfFKZFrDfGW%nuF^zS%$A`QB_G{x+B}`pal1yx*{|KPE4I;zqnFN7tpn>>#qe<BiCM+fJ~cJ46hzfg=MX61_47VAJtrk{ju@NCC{5+gJOX_EnXi$IbNvz~mw^t!ze5^e!*}xEs$tr1tYLDMkZ0VRT$X%8=?pSC<t=mlP?FW5A)0WzF1h7Xk1_K)&qMCc=<5q5%)S?)c+rz@Oe>=1pYyWv&jicjM`j!3v?uh7nU7=;f>&bATOiw76}xlSC{^?dfu{GEWspKc3w4UWky?r+?B@hU*z9lIj0>F137{*v%jkF|E97JOS3u+jGF7(0x!kzzGauBEo2L6`pGL9bF_XBK-dA<azSy<yT(^b{q;I`es&MfLHq7VI-=YGLIJH58l)A(jeB-azy@Q`Q;zcMF6H0sl|DR5>fR5VQt!7Ew3p*f!U7!YHs+y4>_><X=l2(w`Vw6ih8B4vs!mNBrrI?uls@!C59eOx#7Tm!GoXm7nEV@yz|q`PTK&~zV5AgiR&@kw|9RIqFyIoB%_byxec+-lSK(3H{iAajJOJ`=tsY1tU(7%OZBsO)6lKfZt1uxgpTkDL_5jdBx_$9-~aJ-dEMQXw<&Bh(7b4;IEO~dX6y7Z_G?HzydXL^!L$=8<qm{%2)m9PDYSZIQOLYtGH-g82K<F^9$Cw}E%|rFADec~Zy}j3sevPU7qhaW%OrAlm^Hii=8!v1=Uq870?<{+>AW-a4wTP{I16HaC~&l^eD5W6tHDIAW-%<1qxsN?I(7EumPXrzz3JL+1_{z^^L>QVRxoboX{0w4W9d)7f%V6d3sWAX>S}QhEu_ON^vDf>{zF|Ws_(#6K;P&P&_nt?b+fxO8~O!MQDrK*%O4J!aNqQXu9B#6vt#<H^;$0r^3tK600A2CmM;mu`k#1C1xlFp9wR9$h#k#u;O5Lx`;Nb>>EDamfsl_sCmR5tx$7PiuT-<5xJ`YGf)GL)z*no@7+CX*u8)LD7I(o>HLMFmf7l^bd6?QPEI}xRWr3wPn^lohHki-WvCtx5C%g}%F-);D6Gr|>i10gGKiAG%MU<>JBw*mR%?hEL@rQy~#$u6bdI7|RQY@J1ycwGvcp426w~JCNLigs-%*IPdvZKS4L4&mV)M?9Y#f$gF$ke}iYneW_mxiY}UoAP?2N+098^2?#iurN-=-|xCm?|_rNgvEt>+Cg>ZV*R-d{cgG{2l0J{0ji*=)fjQxM{@@pRmiV%4$%LyWYE+gW(J<gU`^-p8YW~hXZ-(6%)uBhv~g34Zv%3FiA*LDB{eNTSpSOm?=p_e!eW(J;x@nsHY4O#PhRKp{7)&(%K5X=vS*t2!_W36i_%Aa*?eQg~*<(d^h>=@aTJB<+wWn-yP?r#MG)O<E~j{0VPer$cM-oBSuhe1sHC#!$$B<s`92FuO05JOVJ7!W)ls-NX1lfW9c5M&6f~q3x_EA+iF@Y!Qq%e`G{0OOnNjtu8AxGRCtYjq`}D3@t#G{ND_QRWS5%~Gm&|{$+Bv46f}+=L*bPo^sYX09I|b$td^c$UW(5K8H&B|j4s(hy=T8Dl1IWZ;Y?KWBeThn;LK2+vxut+S9C?xz*I<lt?i)Jcd;dLt87#r$_ri)M}0^<sF&W?YP4yYemy(xkX*6Ol0VgSFky=xsG6Jo1!W52xsG3XN7X?IEo<qQc8IKBP?qKj6yQ$3XA@?zFGIP|LG4S)=VkzWiyq4mOTB<ZV9UG095^6f=*6=j<g_{4*$pU?xr#j_ARkTPsR51ru#1eOn4yJbM(;cv-G(Y+RIb!sB#zPhRL6`@`LY4C^ELRd*kzy_1A7W)I&QxrgE%=@1cAdge#^X_F6;_0nRT_qxsfDrcU{g@WR$Z_H!=MUzGE$RMo0;&G-K^}-j%2=;M4;Zs5KO+2ps#eIe^G(=1mjb%hhkcDcd*UpHMn!w+Lb*cwufvbaVWL_CUWwn^Aa3bSd@1nI;)!d?7gn{j|MVe3>XCU@%pi!y;az%bHI^Z7CfU{h6kYkq^XV`GildX65;KmOpu@sksRNqri)XFiVllVEwAf-J@;YN%HESse~O0e^XDRWzn=){KAhLgDe6}p)kdU@I>2eSuRn+e(BCSGR}^zS1@)5*bs*|;D@CGKT~j&0YYZIDa(1!T!9~mmCRm?OP1&y<U-=e9{(m(Ms;`G$dK*fG}~G2S<SXW6L|P}-3}i4xH(48(V4CTv_$J|1r}Lz?CXZwno__*qQ(9$gs<z!Qa3`(fZ4U~rgnNYGXU9=E7*wX@*b<uVaS+mcNWKzYIT!(c4&Y8wCc=Lm&77WC2+!L8YpI^9-mpaDdZfR-c9PUs1f3{QNV=qKlkWi2s-dM*P`X3_}hz4L~rQPI++2@-g?)10U<B}bPdCVampVB-EFmB%Gsd4QjbKQVn1#`dYR(Wni@vj<E>N=P|6{%pW$?3N;8%JvmTeDVHZ^7YYRZt`iBrH2LA&BM4le<(iTe+;$~A=$zwrS3f8rBDXgdYBI*6=|8Ym(l;sDOUOr#fj>B~MHbk@Bo_f)xU;J-MAHtFFt$9Oq`bE1k4{2y^@f>jttCWKQHABrUR8fFUEkj7wp8lgT8Jp7R<zjQvGi*(V=_~y-M%v_haT@J2Xc7h0cse)VCZC&oyykGEo;?yxg^%1mGLGW}PwD$JKW|DsDT|o)<8&l826Ky?!A=d}wvF<^1Una1%BstF=o1jI=XvuEcBopNFBfCOl79X@vR(i8?UG?kFUE`Cc&EHU+-_ZuD>Da6<zPZ?!<=5$b1TqWA&US#jp~-F=tOWJ%E7mw0%f?|cr#V@58fSrqhgzip|8k0@i%Kw)rObaI;I=kFrwI#m9k8Sw96>0N<hoc=~*r7Nz;0M=~ZJ*Jc0n!Wwx%>6jDpHsTcfZN))={@o9;E?0MTVWj2)Px*oyYFFq|ncNfIjWAk7(9<04Ng^0|x-5kyeE4(S%`T=cHSwJn5*?9dX%F6SE6hJmU5phIxYdQ7l;u+;|vjDf}LDvfZqjj(~Gji}@&Yhrx{QKkZAt9m;n#a~}KZSx9EPf0gIe`*^n8kaEls1<X7B)YFm!=}d(nh2%EI(1b!0gY9@#V65fsuwr5X;UUnQ<7Bm~FMKj$;Pvf_9d9lvgFSp}j&!Q)QxQVC^X9YcxHR7NCjjK#xzCm^tSX?1xKp9Pt2j4s4zb2OjwT2y7Ncfqz*n@|#JH_Q14F*|-kp1o#OTBWWx%y}O>KGqa_$0vzyL)fW_XT95=(Y$OC6g^Q>DHEc|sm22($3rK})WB+1VIR`qW?s+jQ@4#9ho<rf*Qk=pEIwaxYz(b+I;Xt{Lt~g$T%^PaNZ6;@rtR}caKc8Lbe2?sV^&1GBEEu#L*NrTHtPS11y`9~YUHl%?pRu|3wM(7YW*7AIo}4a=l|`Di;4~G7PI_Hu)<qu*O^UUt+Y%8#NzdxtKwchKAx9^n6rz+m!dH^k*=ChdFQ$$|8X3{;A*uqmRm<MK70b5TLT05Ess9_BQR-SW|2MXYSeBg~_R)ovvzk~IO&l{X?tINQtLqxm%s|J{EL<Dpu{GaD{X3mhU|O8MIvcckvm$J3>J$1fiz`n>s*SB@jyW(}*27+OA!;;?6zG#p@7WU|)bf!BCez{<z^K+Q6c6J4BtH#v$WjIfJ{Uxt{1|hauQUP#5yf11`BbIE9|ka2r!2@u=<^T2_WC3O+1!dSwQ3UY^~sGUs3qq&Pr66+r!Km5F0<IVbLY6dV;1MBRI$~)0rYI|3Iw6^NaL}W0*#V;&z}Vm5D~tVrdSj-DkF3~`*O3q(_j;kO9oU2QM|x~MW(}PtySVQl71xFW0;Vd@;NryPu30n09z8#6U0#kPRzOm;$GK}gI$_`F2Fy<7}N}XuNMV>P7pElOh?XSq?rOpN4>c~6>eexI2u<ReMsVKFltfLN8#?7vheWXhY|4qQp;Byvayb$*77eOHH2d4=!o0iPP=XC!elj9HTF)^LT5;-L$$rw+(4liQ3cx~5CP8zC}F^d_yN^_QV=QXCTmm%qLbY#4Dd<uL-0R&)np8nnNn>X@N0$3$PrdE5P7>}SEqyNnKsYVoy;0K6{V|Bu>;4>C&i}Me9J#yusTOR8^K`#Nz$s4{M3@0@uWy5s|D3w0bH3vnpbiN1^2MqDb__d2MZD7Zj8Bk&?}Q%FVU?@`CU6si2SZ84juk-&cpP~xe}`q$t83cbHYo-FCi8K@1=#XvG7^e7-wHDh$^KUMaEm->b-+Ehi3#z%x&uyyH3&vaYlvUiFL-o?`}Xm)G7)-dAEQ>K|9OE?8_Z+%d3{<t@vPri#Zp^x}2@5YY8>+9Lk%5`kai^;9ra&vR=S1l2<QZzRbdk#|z@LFu38iSX`1-pa`=II(hR7;v0qv#8P)6mVVjWm8&>!&0z0w3IV$->rP8wGN0!DzI?2|Vm7|5aPetm^+0Y3IvIvTzI+*R#E+DWJ;eZnGfICfFj@0v8H5<LAWPDTbeMig$(2RMUnf0$0MN|VXu5ykr40HnFW1RU)oCcs(13C(8sYom{=77&e@`+%1|b;HyfbnlD1sx~YEI?oR?a?8?tz!y(LMJ4N4%3N`6!6y!Lhn6CSlfz-z2}pF{YXR{0Sx~!FB%b=<wul=Mb_;yfTCA(Dgz|!*=%fl56@^CS&mNLf`GbQb9$`fBo0jS}}-s1@KV@QF>DTP)6E0eEW9$U>6cuxExRq9j;ACxxbf&?z7_%{DWzO&A*hn3;wF^=NBEShG}-Jv(6AgOLMA9mt_>{4HY-H%lix`KD&dAX^?PC&+6cibA0EcgCD^0mME`%+=0z>dA_mI@|+U1NkX<MI0_b2TLN3j?VR<uxEB=#*7;Gqlxa&lk^oN%xtfdTqR25`Dz#=37w7_V;`DOL3Ed#1)SnH&{k7R9nlCw5<KI<sF`J_EwCo^enuK^h(E3>gUJ$;wD8@7RBh68Jn&(o%JQ|oMMj43}Yl@|l`h$kR!p)yA%bX?*m+VItLqR{~7x{!3M=x0>w5D=y(@Iyy@Uc^82n6QDuv$xWwqI4&i=I3?F_MnA7($;>T_CUoEUG?WwkJrtUtC~e$xJfz>8yK*{j@=d3L59!=>qF3CFh?&SkJTGvkZ76a>mCre+(Z{uB%`q&|=W)7x?e#%QG>Vg(uCl==4y5BOjQJE9M`ki*k<QiFXLH<}#g9vzOW)AMSiVIzj!btv1>6EhjW64coVrIFP@s3PhxbjsecHyeMa#K@yN8IPQ2R&;?E(4oDw$Hv#81l(Nj<_zV`=L8ka43DYnp2vj(9pZ-bt*Y=zI{lVT}y7Cqll^>rRjke!L5~|gr?%*pU8O`UAfB~zR)L@g<;_srNstR71I2n=|^P~ox6Bd!sU?g0_{YU0h84kptVv6NoCaarUsGE!6&ib5jgR8lM$aCKLX&$gD$Yf$yz=gxnH?r}02V(>mSn4-sf&&{ut^ByTr{NzsEos&gjTo&v?kX+FQMwu5OD<e<FMTYyqyiH)b270OMuO+p@K&=4aBgN^=FReMs*5XlEcoc?=q%YUA@?HfrxXKngv7Ao_5EE#NeLvOLuPag8<WNM_Ekd;J;Wi!$binZ05Gt}%B^l4gkwJ7>(gi0{@K|&ITAQHg3~s=@R%xI4MQhW>|gv-C#;s~WS%f#dW^O<&vk2C+|ITEJTxs{xiG1dYuMOhOulL<y*Ui?Ne|OzFVqYZ_sfh#B|aDCxw+~%?DG~&@j{Qb)+haZW}94L9a&7e3NN@gvblLBw<_d$#gv=K)+`;V=M1rU^}wlxb(za&(of#cXVVXblwz1o&kg>QVKt|jcexg`c%s7RjNTA-fK!k}uXhGp$~%bVD!H_<zW}(7#`EOu&O4@8<9P+7_L;7r*%SvwYpCaSqCsGKLG(4PdB`6IQ6b=&34)z`Oiy$&19B`Qr|jBYVcv|FOU~YdpLWHCxx;BXD6zYph>E;N^yAQb19azQGSw9iwL2QmC1ccuuhdLQQfY_{_rLe#XaX`X#ljgRcbZcBs-;g!l)$mjbI5H!%Na#!?Nu5~jIxCR3hFZ=VdZ>CkgV%N1_)$i^{(U|)<{;7Jeu_bzGGV9j3A@68>#DctCM87$qc<V>f@}vdo%OLx`)NZyGMGrwe@d&9L*scUl~yf(a}5evJU>nOBo7acC6=dK|zVg?hz}^hte(Sg@!sERaC{$J9;iTd0|(2=MZ(xbn2ieCRO9UzYcZ@!`NXAn2J!d;y#&71HO@|qZe08y>^w~XzJ}MZ%{Y!HiKc51*Nj>#!0o*hD~$zIBYFzi~H_?;A}-RpUOn-fx+JmghKHdx?MjQw9evT-u3uJt)XQz1;Y)E^9-1<=%DhIz3u{GP$3vfY#@3w+eZ1QQ9QAUh%pLv47s4M46`^Z=T|)_OgKrbcx%fRy2xM*`=s>YF38wWi7wFw&hG$KCnyqGXW5|S{LV*&ga1`D?xN^H4jG*>9Og|CbG($-k`8xSN{tVY%Dez(sqE-Y(bmm!LBrCO)CAY1w9;7UaMm}%9zztvlue@<RSl<bV?#1gHA$th;Y<P<oX%$EhAtQ8T7wvE29>Z_v{6Rpd;G>_&6U;&_&GZ|XB%C|O|(H3UvY9KDm{o`p$^~~3CkGlC=Oq$93`)+cQ>6VZkerj*k?W?naW-D`{qF!%~`l`=@bHH0;M^W%(Pe+gsT3k=wl;PSQoxu5dMr-6`23|YC4<b^fMA8ZPkquB1WE9V7Wpb>#UnZ>V|~TzNk;6v<NjnC;?@o&xrD+QCSuNdO8Cn2tqlX+9uuxB4Z1#_3j^Yb81$xO!eky7$%FV6!>(;^9mF9VYQU{GKeXPB>d2yQdW+ap3kmwl!;Zregs4fDenfH@~+=DN7e13!17~hEyahbW(~&cXeJphM6bf$r@osmkt!Q@fkaG2GQl6-HiCkT1QXJ;1X?hZ!(J!V_!7k$+(#tv7*=aId1f#Aj_4@O723rTSq1y$Nfk<u(p*52JtoCoxe1T_pgZaO%9XjrlnzXZP{nqk$(gR)X-PKc#nm*bZ*D*H9?2D-okan<{qY<MPDopq{$*8(<b?oXm}dYn*pp;rj(J^HgR+mL!FF94@Rh5p>rk-7wJ<}7;P!brxRYkZrCHL<Q}cKyiEf2yS-U3|hAqHqB7S-l+<y|et)dOxt^!?KR3-Jm%7{VI(Ylc8withKVyX0-K(-NcvGqIa#yJ3?>%`)Z6a@t1V|+HKG#Df=K`}@gi2)eF4!=K3j>#h9>1^OkX?yBV^R}6hrZKaApY&iOxb$!DgK8cgxX7}HNi^Y4gHQk>#ieTD15yT-eZw|m+EYLp@8_1Ur3)|S2xL9V?`x;>Z}(2}??&6Z$5P}Cs3AN+RU4|<uv&Xa`2}*mi5T<$Dvj*pSz#en<TdzqbBCv>){S^o-ceET7MZOn{oe%G49re2o4R38Q+(FdcYQPg?J-`1Bd{98GNjd|AJe1{gLVUv-<J@S-b_9K5BQoYHdw~1x_4x>-l6)$c5lwY%h(D>_>VcZk+O+GQ~IcS%*_`msS_ib&c<ohgsIx*U)<HhknLe7V7l|pDoTT6A3<r1dVf|p4g|99r3w%h1D$AiB_EJ^5aESt=!zH!ji00y7c<9ZdU35uN6h3qNc8txK_JIGuIx7*bdzFUnL8;TR~OUi5Shvi)c>0+=Fyu+)bn`X8}<oGAKw|mfvP(5<7&J(A72%(;qtxaL{Z~;W%#VV*gR4A%~^$?24SQT%aJusJjtE|n^bw^@wd0<I7Xfy;JwDnHn)|SJ);g={{xrYW?*{EiU+s;00FT6|Ii2(_-g69T^LI?y@VV`r^OmXy*3zGB<FWlb1*@bx9EYai=1yP_tgqcdAU8eNjyaqE9aiJW*pHap$SCH<D_5|`}n*F6~vq8F%9icvHDd(PE!Y2&yQ&Htfo)NXzEl;R7#EXPpB{Qm0BBH*%Zlpq8lgq_exRvt$6VOc{074bGqpWG2v~x9#^DE#a9O9n3QyC&Wmgw)kr@_74`f1^pgP+q(0;kDp4enTMA==X;V}@=*Obpsln!zSNjNPMcrzn=_M_M?>FEdTq0I{Gs6%GRNnkD!~YjlxKIu>6jb?Wt?(pDgRupx15)i_?uundAP7{Qk_4o`k}pc%QFHXC0e)RbE|eG{f;;fFCjRy4(<NDG%@?k2-41A$7}2@oK@ziWw-K-CeG>5wS<NwB%gwX`Rdrr|2r9OC%Q&BcKl>*4ko|=INMHTF>1vL$?N0#Q&Ug;{NngOxk3q`74~Rw^zz9KdOlLogK?>ce7`K)7v`*=<1yce@G40zC#37fh^hgW(^iRsaj`zMj86Cat%3IFamjjDW3@3kmL+rfvL2gh;l7*boSjF6%VQw|=<_2II3Je3UKZ`f>m@H$%<W%<j%<voOsjTU8a@M+})3dPN3A|_MTct(F|20=?;R#8dmU@w!$V7nRxcQP}NUeyALW(wt-wa{NV{=Eq6VmMMNf}?jsY)9pbNC=GhFVaC(ih5IzuFtvor43d7i>J>HJbHBvR{CjV=N?Gh&Ge^YapAb{5Z!9CxLEGVwIcDGk85tp%T?lQviNihgdTO-AwebfZEh{@R&EXXB_c8p^4tKxI$z8{EOQsvN~b{B~`HU>s%VKkn5qp-FXM)8Ya^cdDHJsPTpmlhurC(Ay%F7&BdrUGg5d%=4QSTG9n(p*URN?UfxpP-=X`YKQHc-7i-nOF2S*!!&DYa56|~-ykPSpyq4*gIjzfawS-^nG61W8cfY(g^z(T4`$2L$y%n1ve6#^K`sy=ZGqg1tAefH-1RkUBfFbCsSy7$lIb0%nZipXu9dWgEy)23=ILM29Nj>p4;4giq+3yJ)%R8_~gBLFz>^`gq4|XHg9m{7zJ9}*zOzLbkh<kE(0oZAwp_FHCEIWrsd;<08p{^Dd*N2oX&!1~VYmXzdAN_h-ii@jJf(8ov*@;U)I4DyUTNKid&Z$e)z3KP+EZfFpM@lk%Grmo+@y9+()Dj!mw<#1EXsQNw*jM_p3s#4h;+Dm!lW2CiO>Q1KWl{ZeFj3-(hP&h(61vj|6RIr^*v8g_S$SnCmA525-o*sQ1dG4f4znr8dxun60u>xN_&BAgT`~AN6#a^<d#mm8P=-x$#i|Vn&hPbkNTLFsPOZzW+Wf&A#@pRmuQXS7KZ$<gjhR`|R)6v*f7H4X;HNpC@b|Y@3v$QDeKOp9ZANR@+Xrt{&F(Y#9(I!F$?uhQ+H=XEsu{cjw07cWF6%SDfshEoidq=HK;5uzJKt>|d^_4d{5Ghb908UGRds+PP(qZ1fB!htz^rpBwaHp%EhN!0WE2#~K&#L1rH^D%R2Sw`afyw04}tIy4m+HUZ_X#<<kKMebo%nFD^(5x!O{a;-qnz+_1&QDdyu_9i^K-ff%P`xl-r-Rh8@y}p{z&^{AW+WF3L3|Gy(4)O{zUwQIFU_Vhz?PA|bkUHwlhf6jWe=ea}Qq&jFA;I5nv06(_hKXe+i!B(SU@{mv{M?ezpz$kQ9m<uVTXgGt~{ayc7cVWh;=h(G-{cPzSIVZ#jKRVwfZN;p*HMhrZSOzQakyLU&U<Ku4f{P~AFxWyx8BYI(^oh3`vY3I6_-D2e0b$JIWRYPlT3_B|;ny+ro`P@Npk}m$bx&=n8Z|CjLn5GHt!e+$bOIvti*fwJg4e)ZX&>$NqIUggRhjEcu_Qe}^NY2>x^sI~ubkjY6Z<UZAFBX=@0USha2i~T>ixu?kFkx|pO4xV!a<JvP&|BlTN&(12vdr_yJSx;d9CO>$VHNC7@1yze81ZiCVI^xDR_8)isT=cvepM-K!?43rPKW$+ri)@S<g#Em9sU&lmg~xFD(0m>#}0Y<9eB*MhCgd_1_21qs+%v^R~F{%8Uoni&e<g;(!YdTX1ZN43Q&QLU{>dUx3=x|NC(_;2-x{{bnwVG%Mx<^UzgL1q8grdFk^?<{iEMFZ<t;Wd}n$<UQ8d5x%A_BG3)@bGQZ)p4Ldu$e9_ZmUd+<)-pRioA0F(#*g5`z=o3WVCF1aIZlH{quT3XXE^fw4ZzW)RngK#xROnzp^Vyq&s}MC$QijujoPdyO!CWY@Uzdau?C0^>m`R)im)(QVN;52!yB;FHE1R*i{qE%b(J220OVJ(g{hyJY6y&Hxx(}*N2$-RCC#X*ASS*E*+$f%6tZt@S#jvR5eLLnfeA0wCBtxv`k(oj)aVGDB4mszpL-ywyr|50t$Gx5rPHz>|n;SlkvRH5l>wz7O{+#UXR^sFB@RYpJ5leZ&oPI7`F@{ZNwnZ=-N+W956=@M!n23zi>N+wY$7g4%RS4+SybaL!w(a{Tg7E#p1|V!1?8*}1h6dH@0&JrKBW6mCocggpEAQ|ggAAQWlhu_#Ose*RuLF}q+cVXwHaw+jX}AGezPlNJ>W#089ws@7(hI4?-OvFfLBad-zr3$$13*bc4uJq0h)}bnZs*<m1k+t)EfdtVmHp{DuE2!7j=C!2)*S9$^~7QZxV9aQ-l$iCB(?w<v5vLcWAVCU%zc5%B>8CC7!DIS(aVfS*lbl$wdV33(aTLNvWelWNt1xw@7~QV6`3n0y>F+>7v}##vv6Hhlod(*{h>-<HAM&86wC-P-;41Qk5Gb_hMT%m2S)G_pQ}Tr;m0>DOGD&@%l-ts&s4GQ$@m-pY;*LDfB!V>l^89_V1y;mTTnVOrrvu=juV|XRf^pmeRKH!U}u!SJ(gMh8A@ov?K~~1s9q)UdajfnR=IXa7+*W&ONv8WhI(HWRBxM$x9aE~c9qy{rILn8R*Drz!?k)<ab*hc?8s8?crF!1I~rHXl3mADd~O%?Jw(U(2_i5hEUVtg6%8YJKo(--0=U3HG%ML_#M%h`MsCUSwjHG4mQ1ISJ%mVOEB7~O_3MiuB|dk+wvZsn1u3G9bPZZ*$?icW5zwqKqy;fSmmba?RLqae9fwAkfQ3b418K}#IxnlGX6s&k^)LOG=Ko&V&ap>q*4zu|)1!yw5C8J}fA%`UmVz4h^NSc}P~sR~8ngi>fl`40ATfgI1@K<34nbx+jB+!MCYqjX_{-jI^LM=-+Gcyiwzfi_vNCg;EjvLwOxqYJ9`+2+(Ys~R-7?OP&=`5nTTbUTD;{5f>HLY)*N{!pi}4DDYuPkg1sOKWR=urmy_9$KcF-jElfi9+oOo=5k*pF!EFm}56$2zz2J|l4e3><NAYyf`4}P&>H!M}v4TI#c_Ke;?0}YqqO^jd*Dz|<Dl=~Tv^h^$F#MSC)lL5i0wjOk)-{^CcLh7Zl&C?A#V5y?k1wG%e6XvFCok;B7Mx77~RO_Rjk+Hc8q(61XHuH4T4)AJ=Bs2)!37flsi>1~<XrdR<QWRF`7G%z}Z>M`D27V*JbLJ-Nerh$TlHkfef0&ABhz>lMzUbB9jA#2%A_GYW0#77ZopK?8g*Tcv%C6ZpjhZEGEf;RJ6=L>m%Kfn!(s0pZb71V<+wR5STmKdXFv;RxYbM8Ta9ydOy+XqiS8HbBdMYMcvjmD2(=N8&mi|r%m#s75jM5P;zmO6#deOA-E2^23>=Bzg{W}Ep_BHj0(82Zz>ALMPOR3rqObVR;mtpAVlrRM0uJ^)I&C4BNk*(n}h@+l?B)%qOLs!n#JjmANB~??o(OBuse;Cmq5*ZB8aC&00!of4aDL;dk1>7K1kJnC}Zz138e1E~QGKT6e7Lqm&_(dbzz;3*z$h00++yR9eq{N|26%a)emb{jfHsUc8WVYGzL(_t{IwePFZ;Kr<HdlKd4^1r_T>u(52x1hnxEBPJLSf%8N>D%&AcTzj8419P0n!(c?FrM$mA6%2o882BA{y^p^Mcsgf=}2(2KO`1fxPB9Z|Y(^HK^-C(o!V8S+@0m0cuxzSO"
+
+# Checkbox patterns
+CHECKBOX_UNCHECKED = LazyPattern(r"^(\s*)-\s*\[\s*\](.*)$")
+CHECKBOX_CHECKED = LazyPattern(r"^(\s*)-\s*\[x\](.*)$", re.IGNORECASE)
+TRACEABILITY_LINK_RE = LazyPattern(r"\*\*(?:Implements|Answers|Solved by|Implemented by)\*\*:\s*\[([^\]]+)\]\(([^)]+)\)")
+
+DEFAULT_TOP_DOCS = {
+    "FRONT.md": """# Atlas\n\nThis repo uses Atlas vNext.\nUse: `python atlas.py init`\n\nQuick flow:\n1) `python atlas.py capture \"...\" --domain GEN`\n2) `python atlas.py run REQ-GEN-001`\n3) `python atlas.py finish RUN-REQ-GEN-001-step-01 --git <hash|no-commit> --success true`\n\nLinks: BOARD.md, CONVENTIONS.md, GOALS.md\n""",
+    "BOARD.md": """# BOARD\n\n> 이 문서는 프로젝트의 **현재 작업 상태 스냅샷**을 나타냅니다.\n> 비어 있는 경우, 해당 상태에 해당하는 작업이 없음을 의미합니다.\n\n## Queue\n- (empty)\n\n## Active\n- (empty)\n\n## Done\n- (empty)\n\n> Last Reviewed: YYYY-MM-DD\n""",
+    "CONVENTIONS.md": """# CONVENTIONS\n\n## Boundaries\n\n### Always\n- Keep REQ/RULE/ADR/CQ as authority; do not auto-edit without intent.\n- Record verification steps in RUN.\n\n### Ask First\n- Add or remove dependencies.\n- Change storage layout under `.atlas/`.\n\n### Never\n- Hardcode secrets.\n- Modify existing REQ/RULE/ADR/CQ silently.\n\n## Roles (one-line)\n- REQ: what the system must do (SSOT).\n- RULE: constraints that must always hold (SSOT).\n- ADR: architectural decisions (SSOT).\n- CQ: questions the system must answer.\n- VIEW: human-readable context.\n- DRAFT: optional intake scratchpad.\n- RUN: execution plan and evidence.\n\n## Verification\n- `python atlas.py doctor`\n- (project tests as defined)\n""",
+    "GOALS.md": """# GOALS\n\n- Purpose: (fill in)\n- In scope: (fill in)\n- Out of scope: (fill in)\n""",
+}
+
+DEFAULT_TEMPLATES = {
+    "REQ.md": """# [REQ-XXX-001] Title\n\n> **ID**: REQ-XXX-001\n> **Domain**: XXX\n> **Status**: Draft\n> **Last Updated**: YYYY-MM-DD\n> **Implemented-Git**: -\n> **Linked-RUN**: -\n> **Must-Read**: RULE-XXX-001\n\n---\n\n## Decision\n- (what must be true)\n\n## Input\n- (inputs)\n\n## Output\n- (outputs)\n\n## Acceptance Criteria\n- [ ] (criteria)\n""",
+    "RULE.md": """# [RULE-XXX-001] Title\n\n> **ID**: RULE-XXX-001\n> **Domain**: XXX\n> **Priority**: Medium\n> **Last Updated**: YYYY-MM-DD\n> **Must-Read**: RULE-XXX-001\n\n---\n\n## Rule Statement\n- (always true / forbidden)\n\n## Scope\n- (where it applies)\n\n## Violation\n- (what counts as a violation)\n\n## Examples\n\n### Correct\n- (example)\n\n### Incorrect\n- (example)\n""",
+    "CQ.md": """# [CQ-XXX-001] Title\n\n> **ID**: CQ-XXX-001\n> **Domain**: XXX\n> **Status**: Draft\n> **Last Updated**: YYYY-MM-DD\n\n---\n\n## Question\n- (what must the system answer?)\n\n## Expected Answer (Criteria)\n1. ...\n2. ...\n\n## Traceability\n- **Solves by**: [REQ-XXX-001](../req/REQ-XXX-001.md)\n- **Constrained by**: [RULE-XXX-001](../rule/RULE-XXX-001.md)\n""",
+    "BRIEF.md": """# [BRIEF-XXX-001] Title\n\n> **ID**: BRIEF-XXX-001\n> **Domain**: XXX\n> **Status**: Active\n> **Date**: YYYY-MM-DD\n\n## 1. User Request\n- (raw text)\n\n## 2. Intent Summary\n- Goal:\n- Problem:\n\n## 3. Affected Artifacts\n- Create: \n- Modify: \n- Read: \n\n## 4. Proposed Changes\n1. \n2. \n\n## 5. Verification Criteria\n- [ ] \n""",
+    "RUN.md": """# [RUN-REQ-XXX-001-step-01] Title\n\n> **ID**: RUN-REQ-XXX-001-step-01\n> **REQ**: REQ-XXX-001\n> **Status**: Planned\n> **Started**: YYYY-MM-DD\n> **Git**: -\n> **Completed**: -\n\n## Target REQ\n- REQ-XXX-001\n\n## Plan\n- [ ] \n\n## Verification\n- [ ] Test\n- [ ] Spec\n- [ ] Boundary\n\n## Output\n- (files created/modified)\n""",
+    "VIEW.md": """# [VIEW-REQ-XXX-001] Title\n\n> **Refs**: REQ-XXX-001\n> **Last Updated**: YYYY-MM-DD\n\n## Summary\n- (human-readable summary)\n\n## References (SSOT)\n- [REQ-XXX-001](../req/REQ-XXX-001.md)\n""",
+    "ADR.md": """# [ADR-XXX-001] Title\n\n> **ID**: ADR-XXX-001\n> **Domain**: XXX\n> **Status**: Draft\n> **Date**: YYYY-MM-DD\n> **Supersedes**: -\n> **Superseded-By**: -\n\n---\n\n## Context\n- (why this decision is needed)\n\n## Decision\n- (the decision)\n\n## Consequences\n- (trade-offs and follow-ups)\n\n## References\n- (REQ/RULE links)\n""",
+}
+
+DEFAULT_PROMPTS = {
+    "onboarding.md": """# Atlas Audit Prompt
+
+> **Note**: 기존 `Onboarding Prompt`가 **`Audit Prompt`**로 재정의되었습니다.
+> 이 프롬프트는 더 이상 파일을 자동으로 생성하지 않으며, 현재 프로젝트와 문서 간의 **정합성(Consistency)을 감사(Audit)**하는 역할을 수행합니다.
+
+---
+
+## Prompt
+
+```
+당신은 이 프로젝트의 **문서 정합성 감사관(Auditor)**입니다.
+이미 존재하는 Atlas 문서들(.atlas/ 폴더 내 GOALS, CONVENTIONS, BOARD, FRONT)이 현재 프로젝트의 실제 상태(코드, 최근 작업, 기술 스택 등)와 일치하는지 점검하는 것이 주 임무입니다.
+
+### [Strict Rules] 핵심 규칙
+1. **READ-ONLY**: 절대, 어떤 경우에도 기존 파일을 직접 수정하거나 내용을 자동 업데이트하지 마세요.
+2. **제안 모드 (Suggestion Only)**: 불일치나 누락이 발견되면 "어떻게 수정하면 좋을지"를 제안 형식으로만 출력하세요.
+3. **비판적 시각**: 단순히 내용을 요약하지 말고, "정말 이 내용이 현재 유효한가?"를 끊임없이 의심하며 검증하세요.
+
+### [Checklist] 검사 관점
+
+LLM은 다음 기준에 따라 각 문서를 엄격하게 평가해야 합니다:
+
+#### 1. GOALS.md (목표 정합성)
+- **Active Task와 일치 여부**: 현재 진행 중인 작업들이 GOALS에 정의된 핵심 목표를 벗어나지 않았는가?
+- **Scope Creep 감지**: 최근 논의되거나 추가된 기능이 In-Scope 범위 내에 있는가? 아니면 범위를 조용히 넓히고 있는가?
+
+#### 2. CONVENTIONS.md (규칙 현실성)
+- **위반 가능성 점검**: 실제 코드나 최근 커밋 내용이 문서의 규칙(Always, Never)을 위반하고 있지 않은가?
+- **구체성 검증**: 규칙이 너무 추상적이어서(예: "깨끗한 코드 작성") 실제 지침이 되지 못하는 부분은 없는가?
+
+#### 3. BOARD.md (현황 동기화)
+- **Active 상태 검증**: Active에 있는 작업이 현재 실제로 진행 중인가? (GOALS 범위를 벗어난 작업이 Active에 있는가?)
+- **Queue 방치 점검**: Queue에 있는 항목들이 너무 오래 방치되어, 현재의 GOALS와 맞지 않게 되었는가?
+
+#### 4. FRONT.md (환경 최신화)
+- **기술 스택 현실화**: 문서에 적힌 기술 스택이 실제 프로젝트 코드와 일치하는가?
+- **암묵적 전제**: 팀 내에서 암묵적으로 합의된 중요한 변경 사항이 문서에서 누락되지 않았는가?
+
+---
+
+### [Audit Report] 출력 양식
+
+각 파일별로 아래 상태 아이콘을 사용하여 진단 결과를 출력하세요.
+
+- [PASS] **일치 (Pass)**
+- [WARN] **의심 (Warning)**: 확인이 필요하거나 모호한 부분.
+- [FAIL] **불일치/누락 (Fail)**: 명확한 오류, 즉시 수정 필요.
+
+**[작성 예시]**
+
+### 1. GOALS.md
+- [PASS] 핵심 목표 여전히 유효함.
+- [WARN] **의심**: '실시간 채팅' 기능이 최근 작업(Task-102)에서 구현 중인데, GOALS의 Scope에는 명시되지 않았음. 업데이트 필요.
+
+### 2. CONVENTIONS.md
+- [FAIL] **불일치**: 문서에는 'Type Hint 필수'라고 되어 있으나, 최근 `utils.py` 등에서 많은 함수가 타이핑 없이 작성됨.
+    - **제안**: 규칙을 강화하거나, 예외 상황을 문서에 명시할 것.
+
+(이하 BOARD, FRONT 동일 포맷)
+\n
+\n---
+\n
+\n### 🚀 [Recommended Actions] 이후 진행 가이드
+\n
+\n감사 결과를 바탕으로 사용자가 취해야 할 구체적인 행동을 제안하세요.
+\n
+\n1. **승인 필요 (Needs Approval)**: ⚠️/❌ 항목 중, 사용자의 확인이 필요한 정책적 결정 사항.
+\n2. **수정 제안 (Edits)**: 즉시 문서를 수정해야 하는 사항 (구체적인 문구 제안 포함).
+\n3. **새로운 태스크 (New Tasks)**: 문서 정합성을 위해 새로 등록해야 할 작업 (예: "로그 시스템 리팩토링 스펙 문서 작성").
+\n
+\n**[작성 예시]**
+\n### 🚀 이후 진행 가이드
+\n1. **CONVENTIONS.md 업데이트**: `Type Hint` 규칙을 `Strict`에서 `Optional`로 완화하는 문구로 수정할 것을 제안합니다.
+\n2. **GOALS.md 검토**: '실시간 채팅' 기능이 In-Scope인지 PM과 협의 후 Scope 섹션 업데이트 필요.
+\n```
+\n
+
+---
+
+## How to execute
+이 프롬프트는 정기적으로(또는 프로젝트 방향성이 흔들릴 때) LLM에게 제시하여 문서 부채를 점검하는 용도로 사용합니다.
+""",
+}
+
+
+def get_version() -> str:
+    """Read version from VERSION file (SSOT)."""
+    try:
+        return VERSION_PATH.read_text(encoding="utf-8").strip()
+    except OSError:
         return "unknown"
-    
-    
-    def now_date() -> str:
-        return datetime.now().strftime("%Y-%m-%d")
-    
-    
-    def now_iso() -> str:
-        return datetime.now().isoformat(timespec="seconds")
-    
-    
-    def ensure_dir(path: Path) -> None:
-        path.mkdir(parents=True, exist_ok=True)
-    
-    
-    def read_text(path: Path) -> str:
-        return path.read_text(encoding="utf-8")
-    
-    
-    def write_text(path: Path, content: str) -> None:
-        path.write_text(content, encoding="utf-8")
-    
-    
-    def load_default_top_docs() -> dict[Path, str]:
-        docs = dict(DEFAULT_TOP_DOCS)
-        if SRC_DEFAULT_TOP_DOCS_DIR.is_dir():
-            for path in sorted(SRC_DEFAULT_TOP_DOCS_DIR.glob("*.md")):
-                target = ATLAS_ROOT / path.name
-                if target in docs:
-                    docs[target] = read_text(path)
-        return docs
-    
-    
-    def load_default_templates() -> dict[str, str]:
-        templates = dict(DEFAULT_TEMPLATES)
-        if SRC_DEFAULT_TEMPLATES_DIR.is_dir():
-            for name in DEFAULT_TEMPLATES:
-                src_path = SRC_DEFAULT_TEMPLATES_DIR / name
-                if src_path.exists():
-                    templates[name] = read_text(src_path)
-        return templates
-    
-    
-    def load_default_prompts() -> dict[str, str]:
-        prompts = dict(DEFAULT_PROMPTS)
-        if SRC_DEFAULT_PROMPTS_DIR.is_dir():
-            for name in DEFAULT_PROMPTS:
-                src_path = SRC_DEFAULT_PROMPTS_DIR / name
-                if src_path.exists():
-                    prompts[name] = read_text(src_path)
-        return prompts
-    
-    
-    def load_default_system_files() -> dict[str, str]:
-        """Load VERSION and VERSIONING.md from src/.system_defaults/."""
-        files: dict[str, str] = {}
-        for name in ["VERSION", "VERSIONING.md", "CHANGELOG.md"]:
-            src_path = SRC_DEFAULTS_ROOT / name
+
+
+def now_date() -> str:
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def now_iso() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def ensure_dir(path: Path) -> None:
+    path.mkdir(parents=True, exist_ok=True)
+
+
+def read_text(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+def atomic_write(path: Path, content: str, durable: bool = True) -> None:
+    """Write content to a temp file beside path and rename it into place.
+
+    Readers see either the old or the new file, never a torn one. With
+    durable, the temp file (and on POSIX the directory entry) is fsynced,
+    so the new content also survives a crash.
+    """
+    tmp_path = write_temp(path, content, fsync=durable)
+    try:
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    if durable:
+        fsync_dir(path.parent)
+
+
+def write_temp(path: Path, content: str, fsync: bool) -> Path:
+    """Write content to a new temp file beside path (with path's mode) and return the temp path."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{os.urandom(4).hex()}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(content)
+            if fsync:
+                handle.flush()
+                os.fsync(handle.fileno())
+        try:
+            os.chmod(tmp_path, path.stat().st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return tmp_path
+
+
+def fsync_path(path: Path) -> None:
+    """fsync a file or directory through a read-only descriptor (POSIX only)."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_dir(path: Path) -> None:
+    """Persist directory entries (renames) on POSIX; Windows has no directory fsync."""
+    if os.name != "nt":
+        fsync_path(path)
+
+
+def write_text(path: Path, content: str) -> None:
+    atomic_write(path, content)
+    if _DOC_INDEX is not None:
+        _DOC_INDEX.invalidate(path)
+
+
+def write_files(files: list[tuple[Path, str]]) -> None:
+    """Atomically write many files with one group flush instead of a flush per write.
+
+    Every temp file is written first and only then fsynced one by one, so
+    the kernel writes them back together and the later fsyncs find little
+    left to do. They are then renamed into place, and finally each touched
+    directory is fsynced once. A crash leaves each file either old or new.
+    """
+    staged: list[tuple[Path, Path]] = []
+    # Windows cannot flush through a read-only handle; fsync each file as it is written there.
+    deferred = os.name != "nt"
+    try:
+        for path, content in files:
+            staged.append((write_temp(path, content, fsync=not deferred), path))
+        if deferred:
+            for tmp_path, _ in staged:
+                fsync_path(tmp_path)
+        for tmp_path, path in staged:
+            os.replace(tmp_path, path)
+    except BaseException:
+        for tmp_path, _ in staged:
+            tmp_path.unlink(missing_ok=True)
+        raise
+    for directory in {path.parent for _, path in staged}:
+        fsync_dir(directory)
+    if _DOC_INDEX is not None:
+        for _, path in staged:
+            _DOC_INDEX.invalidate(path)
+
+
+def write_json_atomic(path: Path, data: dict) -> None:
+    """Write compact JSON atomically; caches are rebuildable, so skip the fsync."""
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    atomic_write(path, payload, durable=False)
+
+
+def load_default_top_docs() -> dict[Path, str]:
+    docs = dict(DEFAULT_TOP_DOCS)
+    if SRC_DEFAULT_TOP_DOCS_DIR.is_dir():
+        for path in sorted(SRC_DEFAULT_TOP_DOCS_DIR.glob("*.md")):
+            if path.name in docs:
+                docs[path.name] = read_text(path)
+    return {ATLAS_ROOT / name: content for name, content in docs.items()}
+
+
+def load_default_templates() -> dict[str, str]:
+    templates = dict(DEFAULT_TEMPLATES)
+    if SRC_DEFAULT_TEMPLATES_DIR.is_dir():
+        for name in DEFAULT_TEMPLATES:
+            src_path = SRC_DEFAULT_TEMPLATES_DIR / name
             if src_path.exists():
-                files[name] = read_text(src_path)
-        return files
-    
-    
-    def load_default_src_files() -> dict[str, str]:
-        """Load source files - either from defaults dir or embedded in atlas.py."""
+                templates[name] = read_text(src_path)
+    return templates
+
+
+def load_default_prompts() -> dict[str, str]:
+    prompts = dict(DEFAULT_PROMPTS)
+    if SRC_DEFAULT_PROMPTS_DIR.is_dir():
+        for name in DEFAULT_PROMPTS:
+            src_path = SRC_DEFAULT_PROMPTS_DIR / name
+            if src_path.exists():
+                prompts[name] = read_text(src_path)
+    return prompts
+
+
+def load_default_system_files() -> dict[str, str]:
+    """Load VERSION, VERSIONING.md and the doctor schemas from src/.system_defaults/."""
+    files: dict[str, str] = {}
+    for name in ["VERSION", "VERSIONING.md", "CHANGELOG.md", "schemas.json", "workflow.json"]:
+        src_path = SRC_DEFAULTS_ROOT / name
+        if src_path.exists():
+            files[name] = read_text(src_path)
+    return files
+
+
+def load_default_src_files() -> dict[str, str]:
+    """Load source files - either from defaults dir or embedded in atlas.py."""
+    files: dict[str, str] = {}
+
+    # Try loading from src/.system_defaults/src/ first (development mode)
+    src_dir = SRC_DEFAULTS_ROOT / "src"
+    if src_dir.is_dir():
+        for path in src_dir.glob("*.py"):
+            files[path.name] = read_text(path)
+    
+    # If no files found, try embedded source (distribution mode)
+    if not files and EMBEDDED_SRC_B85 != "__EMBEDDED_SRC_PLACEHOLDER__":
         import base64
-        files: dict[str, str] = {}
-        
-        # Try loading from src/.system_defaults/src/ first (development mode)
-        src_dir = SRC_DEFAULTS_ROOT / "src"
-        if src_dir.is_dir():
-            for path in src_dir.glob("*.py"):
-                files[path.name] = read_text(path)
-        
-        # If no files found, try embedded source (distribution mode)
-        if not files and EMBEDDED_SRC_B64 != "__EMBEDDED_SRC_PLACEHOLDER__":
-            try:
-                decoded = base64.b64decode(EMBEDDED_SRC_B64).decode("utf-8")
-                files["atlas_cli.py"] = decoded
-            except Exception:
-                pass
-        
-        return files
-    
-    
-    def load_template(name: str) -> str:
-        template_path = TEMPLATES_DIR / name
-        if not template_path.exists():
-            raise FileNotFoundError(f"Missing template: {template_path}")
-        return read_text(template_path)
-    
-    
-    def iter_md_files(dirs: Iterable[Path]) -> list[Path]:
-        files: list[Path] = []
-        for base in dirs:
-            if not base.is_dir():
-                continue
-            for path in base.rglob("*.md"):
-                files.append(path)
-        return files
-    
+        import zlib
+
+        try:
+            decoded = zlib.decompress(base64.b85decode(EMBEDDED_SRC_B85)).decode("utf-8")
+            files["atlas_cli.py"] = decoded
+        except Exception:
+            pass
+        # Modules bundled next to it by build.py (served from memory when imported).
+        for name, source in globals().get("_ATLAS_MODULES", {}).items():
+            files[f"{name}.py"] = source
     
-    def extract_meta(text: str) -> dict[str, str]:
+    return files
+
+
+def load_template(name: str) -> str:
+    template_path = TEMPLATES_DIR / name
+    if not template_path.exists():
+        raise FileNotFoundError(f"Missing template: {template_path}")
+    return read_text(template_path)
+
+
+def id_sort_key(name: str) -> tuple[list, str]:
+    """Sort key that orders the numbers in IDs and paths by value.
+
+    REQ-CORE-999 sorts before REQ-CORE-1000 and step-99 before step-100;
+    for three-digit IDs the order is the same as plain string order.
+    """
+    parts: list = ID_DIGITS_RE.split(name)
+    parts[1::2] = [int(digits) for digits in parts[1::2]]
+    return parts, name
+
+
+def iter_md_files(dirs: Iterable[Path]) -> list[Path]:
+    files: list[Path] = []
+    for base in dirs:
+        if not base.is_dir():
+            continue
+        files.extend(sorted(base.rglob("*.md"), key=lambda path: id_sort_key(str(path))))
+    return files
+
+
+def extract_meta(text: str) -> dict[str, str]:
+    meta: dict[str, str] = {}
+    head = "\n".join(text.splitlines()[:60])
+    for line in head.splitlines():
+        match = META_RE.match(line.strip())
+        if match:
+            meta[match.group(1).strip()] = match.group(2).strip()
+    return meta
+
+
+def extract_header_id(text: str) -> Optional[str]:
+    match = HEADER_ID_RE.search(text)
+    return match.group(1).strip() if match else None
+
+
+HEADER_CHUNK_SIZE = 512
+HEADER_MAX_LINES = 60
+
+
+def read_header(path: Path) -> tuple[dict[str, str], Optional[str]]:
+    """Read only the `> **Key**: value` block at the top of a document.
+
+    The file is streamed in small chunks and reading stops at the first `---`
+    rule or `## ` section, so long bodies are never loaded. Returns
+    (meta, header_id).
+    """
+    meta: dict[str, str] = {}
+    header_id: Optional[str] = None
+    pending = b""
+    line_no = 0
+    with open(path, "rb") as handle:
+        while True:
+            chunk = handle.read(HEADER_CHUNK_SIZE)
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop() if chunk else b""
+            for raw in lines:
+                line = raw.decode("utf-8").strip()
+                line_no += 1
+                if line == "---" or line.startswith("## ") or line_no > HEADER_MAX_LINES:
+                    return meta, header_id
+                if header_id is None:
+                    match = HEADER_ID_RE.match(line)
+                    if match:
+                        header_id = match.group(1).strip()
+                        continue
+                match = META_RE.match(line)
+                if match:
+                    meta[match.group(1).strip()] = match.group(2).strip()
+            if not chunk:
+                return meta, header_id
+
+
+def parse_must_read(value: str) -> list[str]:
+    raw = value.strip()
+    if raw.lower() == "none":
+        return []
+    tokens = [t.strip() for t in raw.split(",") if t.strip()]
+    ids: list[str] = []
+    for token in tokens:
+        if token.startswith("[") and "]" in token and "(" in token:
+            token = token[1 : token.index("]")].strip()
+        if token:
+            ids.append(token)
+    return ids
+
+
+def scan_max_id(prefix: str, domain: str, dir_path: Path, pattern: re.Pattern) -> int:
+    max_n = 0
+    if dir_path.exists():
+        for path in dir_path.glob(f"{prefix}-{domain}-*.md"):
+            match = pattern.match(path.stem)
+            if match:
+                num = int(match.group(2))
+                if num > max_n:
+                    max_n = num
+    return max_n
+
+
+def scan_max_run_step(domain: str, number: str) -> int:
+    max_step = 0
+    if RUN_DIR.exists():
+        for path in RUN_DIR.glob(f"RUN-REQ-{domain}-{number}-step-*.md"):
+            run_match = RUN_ID_PATTERN.match(path.stem)
+            if run_match and run_match.group(1) == "REQ":
+                step = int(run_match.group(4))
+                if step > max_step:
+                    max_step = step
+    return max_step
+
+
+def next_id(prefix: str, domain: str, dir_path: Path, pattern: re.Pattern) -> str:
+    """Reserve the next free ID number for prefix/domain."""
+    return next_ids(prefix, domain, dir_path, pattern, 1)[0]
+
+
+def next_ids(prefix: str, domain: str, dir_path: Path, pattern: re.Pattern, count: int) -> list[str]:
+    """Reserve count consecutive IDs for prefix/domain with one counter update."""
+    first = SequenceStore().allocate(
+        "ids",
+        f"{prefix}-{domain}",
+        scan=lambda: scan_max_id(prefix, domain, dir_path, pattern),
+        taken=lambda n: (dir_path / f"{prefix}-{domain}-{n:03d}.md").exists(),
+        count=count,
+    )
+    return [f"{prefix}-{domain}-{number:03d}" for number in range(first, first + count)]
+
+
+def next_run_step(req_id: str) -> int:
+    """Reserve the next RUN step number for req_id."""
+    match = REQ_ID_PATTERN.match(req_id)
+    if not match:
+        return 1
+    domain = match.group(1)
+    number = match.group(2)
+    return SequenceStore().allocate(
+        "steps",
+        req_id,
+        scan=lambda: scan_max_run_step(domain, number),
+        taken=lambda n: (RUN_DIR / f"RUN-REQ-{domain}-{number}-step-{n:02d}.md").exists(),
+    )
+
+
+SECTION_HEADING_RE = LazyPattern(r"^## (.+?)[ \t]*\r?$", re.M)
+
+
+class Document:
+    """A Markdown document parsed once into header lines and a body string.
+
+    Only the header (title and `> **Key**: value` block, up to the first
+    `---` rule or `## ` heading) is split into lines; the body is kept as
+    one string and its sections are located by offset on first use.
+    set_meta()/set_section()/append_section() mark their region dirty and
+    render() re-emits untouched regions verbatim in a single pass, so
+    updating a field of a long REQ never re-tokenises its Capture log.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.header: list[str] = []
+        pos = 0
+        while pos < len(text) and len(self.header) < HEADER_MAX_LINES:
+            end = text.find("\n", pos)
+            if end == -1:
+                end = len(text)
+            line = text[pos:end].rstrip("\r")
+            stripped = line.strip()
+            if stripped == "---" or stripped.startswith("## "):
+                break
+            self.header.append(line)
+            pos = end + 1
+        self.body = text[pos:]
+        self.header_dirty = False
+        self._sections: Optional[dict[str, tuple[int, int]]] = None
+        self._section_edits: dict[str, str] = {}
+        self._appended: list[str] = []
+
+    @classmethod
+    def load(cls, path: Path, txn: Optional["Transaction"] = None) -> "Document":
+        return cls(txn.read(path) if txn is not None else read_text(path))
+
+    @property
+    def dirty(self) -> bool:
+        return self.header_dirty or bool(self._section_edits) or bool(self._appended)
+
+    @property
+    def meta(self) -> dict[str, str]:
         meta: dict[str, str] = {}
-        head = "\n".join(text.splitlines()[:60])
-        for line in head.splitlines():
+        for line in self.header:
             match = META_RE.match(line.strip())
             if match:
                 meta[match.group(1).strip()] = match.group(2).strip()
         return meta
-    
-    
-    def extract_header_id(text: str) -> Optional[str]:
-        match = HEADER_ID_RE.search(text)
-        return match.group(1).strip() if match else None
-    
-    
-    def parse_must_read(value: str) -> list[str]:
-        raw = value.strip()
-        if raw.lower() == "none":
-            return []
-        tokens = [t.strip() for t in raw.split(",") if t.strip()]
-        ids: list[str] = []
-        for token in tokens:
-            if token.startswith("[") and "]" in token and "(" in token:
-                token = token[1 : token.index("]")].strip()
-            if token:
-                ids.append(token)
-        return ids
-    
-    
-    def next_id(prefix: str, domain: str, dir_path: Path, pattern: re.Pattern) -> str:
-        max_n = 0
-        if dir_path.exists():
-            for path in dir_path.glob(f"{prefix}-{domain}-*.md"):
-                match = pattern.match(path.stem)
-                if match:
-                    num = int(match.group(2))
-                    if num > max_n:
-                        max_n = num
-        return f"{prefix}-{domain}-{max_n + 1:03d}"
-    
-    
-    def next_run_step(req_id: str) -> int:
-        match = REQ_ID_PATTERN.match(req_id)
-        if not match:
-            return 1
-        domain = match.group(1)
-        number = match.group(2)
-        max_step = 0
-        if RUN_DIR.exists():
-            for path in RUN_DIR.glob(f"RUN-REQ-{domain}-{number}-step-*.md"):
-                run_match = RUN_ID_PATTERN.match(path.stem)
-                if run_match and run_match.group(1) == "REQ":
-                    step = int(run_match.group(4))
-                    if step > max_step:
-                        max_step = step
-        return max_step + 1
-    
-    
-    def update_meta_line(text: str, key: str, value: str) -> str:
-        lines = text.splitlines()
-        updated = False
-        for i, line in enumerate(lines):
+
+    def _meta_index(self, key: str) -> Optional[int]:
+        for i, line in enumerate(self.header):
             if line.startswith("> **") and line.split("**", 2)[1].strip() == key:
-                lines[i] = f"> **{key}**: {value}"
-                updated = True
-                break
-        if not updated:
-            insert_at = 1 if lines else 0
-            lines.insert(insert_at, f"> **{key}**: {value}")
-        return "\n".join(lines) + "\n"
-    
-    
-    def normalize_status(value: str) -> str:
-        return value.strip().lower()
-    
-    
-    def parse_completed_date(value: Optional[str]) -> Optional[datetime]:
-        if not value:
-            return None
-        raw = value.strip()
-        if raw == "-":
-            return None
-        try:
-            return datetime.strptime(raw, "%Y-%m-%d")
-        except ValueError:
-            return None
-    
-    
-    def parse_affected_artifacts(text: str) -> dict[str, list[str]]:
-        artifacts = {"Create": [], "Modify": [], "Read": []}
-        for line in text.splitlines():
-            line = line.strip()
-            for key in artifacts.keys():
-                prefix = f"- {key}:"
-                if line.startswith(prefix):
-                    remainder = line[len(prefix) :].strip()
-                    if remainder:
-                        parts = [p.strip() for p in remainder.split(",") if p.strip()]
-                        artifacts[key].extend(parts)
-        return artifacts
-    
-    
-    def update_brief_status(brief_id: str, status: str) -> bool:
-        if not BRIEF_ID_PATTERN.match(brief_id):
-            print(f"[WARN] Invalid BRIEF ID in RUN meta: {brief_id}")
-            return False
-        brief_path = BRIEF_DIR / f"{brief_id}.md"
-        if not brief_path.exists():
-            print(f"[WARN] BRIEF not found for RUN: {brief_path}")
+                return i
+        return None
+
+    def set_meta(self, key: str, value: str) -> None:
+        """Set a header field, inserting it under the title if it is missing."""
+        line = f"> **{key}**: {value}"
+        index = self._meta_index(key)
+        if index is None:
+            self.header.insert(1 if self.header else 0, line)
+        elif self.header[index] != line:
+            self.header[index] = line
+        else:
+            return
+        self.header_dirty = True
+
+    def sections(self) -> dict[str, tuple[int, int]]:
+        """Map each `## ` heading to the (start, end) offsets of its body; first heading wins."""
+        if self._sections is None:
+            spans: dict[str, tuple[int, int]] = {}
+            matches = list(SECTION_HEADING_RE.finditer(self.body))
+            for i, match in enumerate(matches):
+                end = matches[i + 1].start() if i + 1 < len(matches) else len(self.body)
+                spans.setdefault(match.group(1), (min(match.end() + 1, end), end))
+            self._sections = spans
+        return self._sections
+
+    def has_section(self, heading: str) -> bool:
+        return heading in self._section_edits or heading in self.sections() or any(
+            block.startswith(f"\n## {heading}\n") for block in self._appended
+        )
+
+    def section(self, heading: str) -> Optional[str]:
+        if heading in self._section_edits:
+            return self._section_edits[heading]
+        span = self.sections().get(heading)
+        return self.body[span[0] : span[1]] if span else None
+
+    def set_section(self, heading: str, content: str) -> None:
+        """Replace a section's body, keeping the blank lines that separate it from the next one."""
+        old = self.section(heading)
+        if old is None:
+            raise KeyError(heading)
+        gap = old[len(old.rstrip("\n")) :] or "\n"
+        self._section_edits[heading] = content.rstrip("\n") + gap
+
+    def append_section(self, heading: str, content: str) -> None:
+        """Add a `## heading` section after the last one (trailing blank lines are dropped)."""
+        self._appended.append(f"\n## {heading}\n{content.strip()}\n")
+
+    def render(self) -> str:
+        if not self.dirty:
+            return self.text
+        if self.header_dirty:
+            head = "".join(line + "\n" for line in self.header)
+        else:
+            head = self.text[: len(self.text) - len(self.body)]
+        body = self.body
+        if self._section_edits:
+            spans = self.sections()
+            parts: list[str] = []
+            pos = 0
+            for heading, (start, end) in sorted(
+                ((heading, spans[heading]) for heading in self._section_edits), key=lambda item: item[1]
+            ):
+                parts.append(body[pos:start])
+                parts.append(self._section_edits[heading])
+                pos = end
+            parts.append(body[pos:])
+            body = "".join(parts)
+        text = head + body
+        if self._appended:
+            text = text.rstrip() + "".join(self._appended)
+        elif self.text and not self.text.endswith("\n"):
+            # Keep a missing final newline missing, so only the edited region changes.
+            text = text.rstrip("\n")
+        elif not text.endswith("\n"):
+            text += "\n"
+        return text
+
+    def save(self, path: Path, txn: Optional["Transaction"] = None) -> bool:
+        """Write the document back if it changed; returns whether it did."""
+        if not self.dirty:
             return False
-        brief_text = read_text(brief_path)
-        brief_text = update_meta_line(brief_text, "Status", status)
-        write_text(brief_path, brief_text)
-        print(f"[OK] Updated {brief_path}")
+        if txn is not None:
+            txn.write(path, self.render())
+        else:
+            write_text(path, self.render())
         return True
-    
-    
-    def extract_ids_from_text(text: str) -> list[str]:
-        return re.findall(r"(?:REQ|RULE|ADR|CQ|BRIEF|RUN)-[A-Z]+-\d{3}(?:-step-\d{2})?", text)
-    
-    
-    def derive_title(text: str, fallback: str = "User Request") -> str:
-        title_src = " ".join(text.strip().splitlines()).strip()
-        if not title_src:
-            return fallback
-        return title_src[:60] + ("..." if len(title_src) > 60 else "")
-    
-    
-    def is_relative_to(path: Path, base: Path) -> bool:
-        try:
-            path.relative_to(base)
-            return True
-        except ValueError:
-            return False
-    
-    
-    def req_id_from_run_id(run_id: str) -> Optional[str]:
-        match = RUN_ID_PATTERN.match(run_id)
-        if not match:
-            return None
-        kind, domain, number, _step = match.groups()
-        if kind != "REQ":
-            return None
-        return f"REQ-{domain}-{number}"
-    
-    
-    def detect_git_hash() -> Optional[str]:
+
+
+def normalize_status(value: str) -> str:
+    return value.strip().lower()
+
+
+def parse_completed_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    raw = value.strip()
+    if raw == "-":
+        return None
+    try:
+        return datetime.strptime(raw, "%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def parse_affected_artifacts(text: str) -> dict[str, list[str]]:
+    artifacts = {"Create": [], "Modify": [], "Read": []}
+    for line in text.splitlines():
+        line = line.strip()
+        for key in artifacts.keys():
+            prefix = f"- {key}:"
+            if line.startswith(prefix):
+                remainder = line[len(prefix) :].strip()
+                if remainder:
+                    parts = [p.strip() for p in remainder.split(",") if p.strip()]
+                    artifacts[key].extend(parts)
+    return artifacts
+
+
+def update_brief_status(brief_id: str, status: str, txn: "Transaction") -> bool:
+    if not BRIEF_ID_PATTERN.match(brief_id):
+        print(f"[WARN] Invalid BRIEF ID in RUN meta: {brief_id}")
+        return False
+    brief_path = BRIEF_DIR / f"{brief_id}.md"
+    if not brief_path.exists():
+        print(f"[WARN] BRIEF not found for RUN: {brief_path}")
+        return False
+    txn.lock(brief_path)
+    brief = Document.load(brief_path, txn)
+    brief.set_meta("Status", status)
+    brief.save(brief_path, txn)
+    return True
+
+
+ANY_ID_RE = LazyPattern(rf"(?:REQ|RULE|ADR|CQ|BRIEF|RUN)-[A-Z]+-{ID_NUMBER}(?:-step-{STEP_NUMBER})?(?!\d)")
+
+
+def extract_ids_from_text(text: str) -> list[str]:
+    return ANY_ID_RE.findall(text)
+
+
+def derive_title(text: str, fallback: str = "User Request") -> str:
+    title_src = " ".join(text.strip().splitlines()).strip()
+    if not title_src:
+        return fallback
+    return title_src[:60] + ("..." if len(title_src) > 60 else "")
+
+
+def is_relative_to(path: Path, base: Path) -> bool:
+    try:
+        path.relative_to(base)
+        return True
+    except ValueError:
+        return False
+
+
+def req_id_from_run_id(run_id: str) -> Optional[str]:
+    match = RUN_ID_PATTERN.match(run_id)
+    if not match:
+        return None
+    kind, domain, number, _step = match.groups()
+    if kind != "REQ":
+        return None
+    return f"REQ-{domain}-{number}"
+
+
+GIT_HASH_RE = LazyPattern(r"^[0-9a-f]{40}(?:[0-9a-f]{24})?$")
+# HEAD per working directory; finish and batch scripts ask for it repeatedly.
+_GIT_HEADS: dict[Path, Optional[str]] = {}
+
+
+# Variables that change which repository or HEAD git itself would use.
+GIT_DISCOVERY_ENV = ("GIT_DIR", "GIT_COMMON_DIR", "GIT_WORK_TREE", "GIT_CEILING_DIRECTORIES")
+
+
+class UnsupportedGitLayout(Exception):
+    """The repository cannot be read natively; ask git instead."""
+
+
+def find_git_dir(start: Path) -> Optional[Path]:
+    """The .git directory for start, following `gitdir:` files of worktrees and submodules."""
+    for base in [start, *start.parents]:
+        dot_git = base / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            line = read_text(dot_git).strip()
+            if not line.startswith("gitdir:"):
+                raise UnsupportedGitLayout(dot_git)
+            return (base / line[len("gitdir:") :].strip()).resolve()
+    return None
+
+
+def resolve_git_ref(git_dir: Path, common_dir: Path, ref: str) -> str:
+    """Follow ref through loose and packed refs to a commit hash.
+
+    A ref that cannot be found (an unborn branch, or refs kept somewhere
+    this reader does not know) raises UnsupportedGitLayout, so git decides.
+    """
+    for _ in range(10):
+        if GIT_HASH_RE.match(ref):
+            return ref
+        if not ref.startswith("ref:"):
+            raise UnsupportedGitLayout(ref)
+        name = ref[len("ref:") :].strip()
+        for base in (git_dir, common_dir):
+            loose = base / name
+            if loose.is_file():
+                ref = read_text(loose).strip()
+                break
+        else:
+            packed = common_dir / "packed-refs"
+            if packed.is_file():
+                for line in read_text(packed).splitlines():
+                    if line.endswith(" " + name) and not line.startswith(("#", "^")):
+                        ref = line.split(" ", 1)[0]
+                        break
+            if not GIT_HASH_RE.match(ref):
+                raise UnsupportedGitLayout(name)
+    raise UnsupportedGitLayout(ref)
+
+
+def read_git_head(start: Path) -> Optional[str]:
+    """Resolve HEAD from .git/HEAD, loose refs and packed-refs without running git.
+
+    Handles branches, detached HEAD and linked worktrees (`commondir`);
+    raises UnsupportedGitLayout for anything else, e.g. reftable storage,
+    an unborn branch or environment overrides of repository discovery.
+    """
+    for name in GIT_DISCOVERY_ENV:
+        if os.environ.get(name):
+            raise UnsupportedGitLayout(name)
+    git_dir = find_git_dir(start)
+    if git_dir is None:
+        return None
+    common_dir = git_dir
+    commondir_file = git_dir / "commondir"
+    if commondir_file.is_file():
+        common_dir = (git_dir / read_text(commondir_file).strip()).resolve()
+    if (common_dir / "reftable").is_dir():
+        raise UnsupportedGitLayout("reftable")
+    try:
+        head = read_text(git_dir / "HEAD").strip()
+    except OSError as exc:
+        raise UnsupportedGitLayout(git_dir) from exc
+    return resolve_git_ref(git_dir, common_dir, head)
+
+
+def detect_git_hash() -> Optional[str]:
+    """HEAD commit of the repository around the current directory, cached per process."""
+    cwd = Path.cwd()
+    if cwd in _GIT_HEADS:
+        return _GIT_HEADS[cwd]
+    try:
+        value = read_git_head(cwd)
+    except (UnsupportedGitLayout, OSError, UnicodeDecodeError):
+        import subprocess
+
         try:
             result = subprocess.run(
                 ["git", "rev-parse", "HEAD"],
@@ -496,1099 +940,3763 @@ with __stickytape_temporary_dir() as __stickytape_working_dir:
                 text=True,
                 check=True,
             )
+            value = result.stdout.strip() or None
         except Exception:
-            return None
-        value = result.stdout.strip()
-        return value if value else None
-    
-    
-    def write_last_run(state: dict) -> None:
-        ensure_dir(STATE_DIR)
-        write_text(LAST_RUN_PATH, json.dumps(state, indent=2) + "\n")
-    
-    
-    # =============================================================================
-    # Sync utilities
-    # =============================================================================
-    
-    def parse_checkboxes(text: str) -> list[tuple[int, bool, str]]:
-        """Parse checkboxes from text. Returns list of (line_num, is_checked, content)."""
-        results = []
-        for i, line in enumerate(text.splitlines()):
-            if CHECKBOX_CHECKED.match(line):
-                match = CHECKBOX_CHECKED.match(line)
-                results.append((i, True, match.group(2).strip()))
-            elif CHECKBOX_UNCHECKED.match(line):
-                match = CHECKBOX_UNCHECKED.match(line)
-                results.append((i, False, match.group(2).strip()))
-        return results
-    
-    
-    def parse_traceability(text: str) -> dict[str, tuple[str, str]]:
-        """Parse traceability links. Returns {link_type: (id, path)}."""
-        results = {}
-        for match in TRACEABILITY_LINK_RE.finditer(text):
-            link_id = match.group(1).strip()
-            link_path = match.group(2).strip()
-            # Determine link type from context
-            full_match = match.group(0)
-            if "Implements" in full_match:
-                results["Implements"] = (link_id, link_path)
-            elif "Answers" in full_match:
-                results["Answers"] = (link_id, link_path)
-            elif "Solved by" in full_match:
-                results["Solved by"] = (link_id, link_path)
-            elif "Implemented by" in full_match:
-                results["Implemented by"] = (link_id, link_path)
-        return results
-    
-    
-    def resolve_linked_docs(run_path: Path) -> dict[str, Path]:
-        """Resolve RUN -> BRIEF -> REQ chain. Returns {doc_type: path}."""
-        docs = {}
-        text = read_text(run_path)
-        meta = extract_meta(text)
-    
-        # RUN -> REQ (direct)
-        req_id = meta.get("REQ") or req_id_from_run_id(run_path.stem)
-        if req_id and REQ_ID_PATTERN.match(req_id):
-            req_path = REQ_DIR / f"{req_id}.md"
-            if req_path.exists():
-                docs["REQ"] = req_path
-        
-        # RUN -> BRIEF
-        brief_id = meta.get("Brief")
-        if brief_id and BRIEF_ID_PATTERN.match(brief_id):
-            brief_path = BRIEF_DIR / f"{brief_id}.md"
-            if brief_path.exists():
-                docs["BRIEF"] = brief_path
-                
-                # BRIEF -> REQ (via Implements link)
-                brief_text = read_text(brief_path)
-                trace = parse_traceability(brief_text)
-                if "Implements" in trace:
-                    req_id, req_rel_path = trace["Implements"]
-                    req_path = (brief_path.parent / req_rel_path).resolve()
-                    if req_path.exists():
-                        docs["REQ"] = req_path
-        
-        return docs
-    
-    
-    def compute_status_from_checkboxes(text: str) -> Optional[str]:
-        """Compute status based on checkbox completion in Steps/Verification sections."""
-        checkboxes = parse_checkboxes(text)
-        if not checkboxes:
-            return None
-        
-        total = len(checkboxes)
-        checked = sum(1 for _, is_checked, _ in checkboxes if is_checked)
-        
-        if checked == 0:
-            return "Planned"
-        elif checked == total:
-            return "Completed"
+            value = None
+    _GIT_HEADS[cwd] = value
+    return value
+
+
+def write_last_run(state: dict, txn: Optional["Transaction"] = None) -> None:
+    ensure_dir(STATE_DIR)
+    content = json.dumps(state, indent=2) + "\n"
+    if txn is not None:
+        txn.lock(LAST_RUN_PATH)
+        txn.write(LAST_RUN_PATH, content)
+        return
+    with doc_lock(LAST_RUN_PATH):
+        write_text(LAST_RUN_PATH, content)
+
+
+# =============================================================================
+# Run log
+# =============================================================================
+
+ACTIVE_RUNS_VERSION = 1
+RUN_EVENTS = ("created", "executing", "finished", "failed")
+ACTIVE_RUN_EVENTS = {"created", "executing"}
+# RUN Status values sync may set, mapped to the lifecycle event they record.
+RUN_STATUS_EVENTS = {"inprogress": "executing", "active": "executing", "completed": "finished", "failed": "failed"}
+
+
+def append_run_event(event: str, run_id: str, **fields: str) -> None:
+    """Append one lifecycle event to state/runs.jsonl.
+
+    Each event is a single O_APPEND write, so concurrent writers never
+    need a lock and never interleave inside a line. last_run.json keeps
+    being written alongside for older tooling.
+    """
+    ensure_dir(STATE_DIR)
+    entry = {"event": event, "run_id": run_id, "at": now_iso(), **fields}
+    data = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+    fd = os.open(RUNS_LOG_PATH, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def load_active_runs() -> dict[str, dict]:
+    """RUNs whose latest event is created/executing, mapped to that event.
+
+    The view in state/active_runs.json remembers how far into runs.jsonl
+    it has read; only events appended since are read and applied, and the
+    view is saved again if it moved. A shorter log (truncated or replaced)
+    is replayed from the start.
+    """
+    try:
+        view = json.loads(read_text(ACTIVE_RUNS_PATH))
+    except (OSError, ValueError):
+        view = None
+    if (
+        not isinstance(view, dict)
+        or view.get("version") != ACTIVE_RUNS_VERSION
+        or not isinstance(view.get("runs"), dict)
+        or not isinstance(view.get("offset"), int)
+    ):
+        view = {"version": ACTIVE_RUNS_VERSION, "offset": 0, "runs": {}}
+    try:
+        with open(RUNS_LOG_PATH, "rb") as handle:
+            handle.seek(0, os.SEEK_END)
+            if handle.tell() < view["offset"]:
+                view = {"version": ACTIVE_RUNS_VERSION, "offset": 0, "runs": {}}
+            handle.seek(view["offset"])
+            data = handle.read()
+    except FileNotFoundError:
+        return {}
+    # A writer may be mid-append; leave an unterminated last line for next time.
+    end = data.rfind(b"\n") + 1
+    if not end:
+        return view["runs"]
+    runs = view["runs"]
+    for line in data[:end].splitlines():
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        run_id = entry.get("run_id") if isinstance(entry, dict) else None
+        if not run_id:
+            continue
+        if entry.get("event") in ACTIVE_RUN_EVENTS:
+            runs[run_id] = entry
         else:
-            return "InProgress"
-    
-    
-    def generate_sync_diff(run_path: Path) -> dict:
-        """Generate diff for sync operation. Returns changes to apply."""
-        diff = {
-            "run": {"path": run_path, "changes": []},
-            "brief": None,
-            "req": None,
-        }
-        
-        run_text = read_text(run_path)
-        run_meta = extract_meta(run_text)
-        run_checkboxes = parse_checkboxes(run_text)
-        
-        # Compute RUN status from checkboxes
-        computed_status = compute_status_from_checkboxes(run_text)
-        current_status = run_meta.get("Status", "")
-        
-        if computed_status and normalize_status(computed_status) != normalize_status(current_status):
-            diff["run"]["changes"].append({
-                "type": "status",
-                "from": current_status,
-                "to": computed_status,
-            })
-        
-        # Resolve linked documents
-        linked = resolve_linked_docs(run_path)
-        
-        # BRIEF sync
-        if "BRIEF" in linked:
-            brief_path = linked["BRIEF"]
-            brief_text = read_text(brief_path)
-            brief_meta = extract_meta(brief_text)
-            brief_status = brief_meta.get("Status", "")
-            
-            diff["brief"] = {
-                "path": brief_path,
-                "changes": [],
-            }
-            
-            # Sync status
-            if computed_status and normalize_status(brief_status) != normalize_status(computed_status):
-                diff["brief"]["changes"].append({
-                    "type": "status",
-                    "from": brief_status,
-                    "to": computed_status,
-                })
-        
-        # REQ patch (don't auto-modify, generate patch)
-        if "REQ" in linked:
-            req_path = linked["REQ"]
-            req_text = read_text(req_path)
-            req_meta = extract_meta(req_text)
-            req_checkboxes = parse_checkboxes(req_text)
-            
-            diff["req"] = {
-                "path": req_path,
-                "changes": [],
-                "checkboxes": req_checkboxes,
-            }
-            
-            # Check if REQ acceptance criteria should be updated based on RUN completion
-            if computed_status == "Completed" and req_checkboxes:
-                # Suggest marking related checkboxes
-                diff["req"]["changes"].append({
-                    "type": "checkbox_suggestion",
-                    "message": f"RUN completed. Consider updating acceptance criteria in {req_path.name}",
-                })
-        
-        return diff
-    
-    
-    def print_sync_diff(diff: dict) -> None:
-        """Print sync diff in human-readable format."""
-        run_info = diff["run"]
-        print(f"\n[SYNC] {run_info['path'].stem}")
-        
-        if run_info["changes"]:
-            for change in run_info["changes"]:
-                if change["type"] == "status":
-                    print(f"  → RUN: Status {change['from']} → {change['to']}")
+            runs.pop(run_id, None)
+    view["offset"] += end
+    if STATE_DIR.is_dir():
+        write_json_atomic(ACTIVE_RUNS_PATH, view)
+    return runs
+
+
+# =============================================================================
+# Locks and sequence store
+# =============================================================================
+
+SEQUENCES_VERSION = 1
+
+# Blocks larger than this are checked with one directory scan instead of a stat per number.
+SEQUENCE_PROBE_LIMIT = 8
+
+# Seconds file_lock() keeps retrying a contended lock on Windows before giving up.
+FILE_LOCK_TIMEOUT = 300
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on path (created if missing) for the with-block.
+
+    Raises:
+        OSError: If the lock cannot be taken; on Windows also when it stays
+            contended for FILE_LOCK_TIMEOUT seconds.
+    """
+    ensure_dir(path.parent)
+    with open(path, "a+b") as handle:
+        if os.name == "nt":
+            import errno
+            import msvcrt
+            import time
+
+            handle.seek(0)
+            deadline = time.monotonic() + FILE_LOCK_TIMEOUT
+            while True:
+                try:
+                    # LK_LOCK gives up after ~10s of retries; keep waiting like flock does, up to the deadline.
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError as exc:
+                    if exc.errno not in (errno.EDEADLOCK, errno.EACCES) or time.monotonic() >= deadline:
+                        raise
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
         else:
-            print("  → RUN: (no changes)")
-        
-        if diff["brief"]:
-            brief_info = diff["brief"]
-            if brief_info["changes"]:
-                for change in brief_info["changes"]:
-                    if change["type"] == "status":
-                        print(f"  → BRIEF ({brief_info['path'].stem}): Status {change['from']} → {change['to']}")
-            else:
-                print(f"  → BRIEF ({brief_info['path'].stem}): (no changes)")
-        
-        if diff["req"]:
-            req_info = diff["req"]
-            if req_info["changes"]:
-                for change in req_info["changes"]:
-                    if change["type"] == "checkbox_suggestion":
-                        print(f"  → REQ ({req_info['path'].stem}): [Patch required] {change['message']}")
-            else:
-                print(f"  → REQ ({req_info['path'].stem}): (no changes)")
-    
-    
-    def apply_brief_changes(diff: dict) -> bool:
-        """Apply changes to BRIEF document."""
-        if not diff["brief"] or not diff["brief"]["changes"]:
-            return False
-        
-        brief_path = diff["brief"]["path"]
-        brief_text = read_text(brief_path)
-        
-        for change in diff["brief"]["changes"]:
-            if change["type"] == "status":
-                brief_text = update_meta_line(brief_text, "Status", change["to"])
-        
-        write_text(brief_path, brief_text)
-        print(f"[OK] Updated {brief_path}")
-        return True
-    
-    
-    def write_req_patch(diff: dict) -> Optional[Path]:
-        """Write REQ patch file."""
-        if not diff["req"] or not diff["req"]["changes"]:
-            return None
-        
-        ensure_dir(PATCH_DIR)
-        req_path = diff["req"]["path"]
-        patch_path = PATCH_DIR / f"{req_path.stem}.patch.md"
-        
-        content = f"""# Patch for {req_path.stem}
-    
-    > **Generated**: {now_date()}
-    > **Source RUN**: {diff['run']['path'].stem}
-    
-    ## Suggested Changes
-    
+            import fcntl
+
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+# Lock files held by this process, so nested doc_lock() calls on one document do not self-deadlock.
+_HELD_LOCKS: dict[Path, int] = {}
+
+
+def doc_lock_path(path: Path) -> Path:
+    return LOCKS_DIR / (DocIndex.key(path).replace("/", "__") + ".lock")
+
+
+@contextmanager
+def doc_lock(*paths: Path) -> Iterator[None]:
+    """Hold the per-document write locks of paths for a read-modify-write.
+
+    Locks live in state/locks/ rather than on the documents themselves,
+    because atomic writes replace a document's inode. Every command takes
+    them in the same order: RUN, then BRIEF, then REQ, then view, then
+    anything else (last_run.json, patches), whether through nested
+    doc_lock() calls or one call with several paths.
     """
-        for change in diff["req"]["changes"]:
-            if change["type"] == "checkbox_suggestion":
-                content += f"- {change['message']}\n"
-        
-        content += f"""
-    ## How to Apply
-    
-    ```bash
-    atlas sync {diff['run']['path'].stem} --apply-req
-    ```
-    
-    Or manually edit: {req_path}
+    from contextlib import ExitStack
+
+    with ExitStack() as stack:
+        for lock_path in sorted({doc_lock_path(path) for path in paths}, key=doc_lock_rank):
+            if _HELD_LOCKS.get(lock_path):
+                _HELD_LOCKS[lock_path] += 1
+            else:
+                stack.enter_context(file_lock(lock_path))
+                _HELD_LOCKS[lock_path] = 1
+            stack.callback(_release_held_lock, lock_path)
+        yield
+
+
+LOCK_ORDER = ["runs__", "drafts__brief__", "req__", "views__"]
+
+
+def doc_lock_rank(lock_path: Path) -> tuple[int, str]:
+    name = lock_path.name
+    rank = next((i for i, prefix in enumerate(LOCK_ORDER) if name.startswith(prefix)), len(LOCK_ORDER))
+    return rank, name
+
+
+def _release_held_lock(lock_path: Path) -> None:
+    _HELD_LOCKS[lock_path] -= 1
+    if not _HELD_LOCKS[lock_path]:
+        del _HELD_LOCKS[lock_path]
+
+
+class SequenceStore:
+    """High-water marks for ID numbers, persisted in state/sequences.json.
+
+    "ids" maps "PREFIX-DOMAIN" to the highest number handed out and "steps"
+    maps a REQ ID to its highest RUN step. Allocation reads and bumps one
+    counter under a file lock, so concurrent captures never get the same
+    number. A counter is rebuilt from a directory scan only when it is
+    missing or a number it would hand out is already taken on disk (files
+    added by hand, by git, or by an older Atlas).
     """
-        
-        write_text(patch_path, content)
-        print(f"[OK] Created patch: {patch_path}")
-        return patch_path
-    
-    
-    def apply_req_changes(diff: dict) -> bool:
-        """Apply changes to REQ document (with warning)."""
-        if not diff["req"] or not diff["req"]["changes"]:
-            return False
-        
-        print("[WARN] Modifying REQ document (authority document)")
-        req_path = diff["req"]["path"]
-        req_text = read_text(req_path)
-        
-        # For now, just update status if RUN is completed
-        run_changes = diff["run"]["changes"]
-        for change in run_changes:
-            if change["type"] == "status" and change["to"] == "Completed":
-                req_text = update_meta_line(req_text, "Status", "Implemented")
-        
-        write_text(req_path, req_text)
-        print(f"[OK] Updated {req_path}")
-        return True
-    
-    
-    def init_command(_args: argparse.Namespace) -> int:
-        overwrite = getattr(_args, "overwrite", False)
-        ensure_dir(ATLAS_ROOT)
-        for d in [
-            REQ_DIR,
-            RULE_DIR,
-            ADR_DIR,
-            CQ_DIR,
-            VIEWS_DIR,
-            INBOX_DIR,
-            DRAFTS_DIR,
-            BRIEF_DIR,
-            RUN_DIR,
-            ARCHIVE_DIR,
-            TEMPLATES_DIR,
-            STATE_DIR,
-            SYSTEM_ROOT / "prompts",
-            SYSTEM_ROOT / "src",
-        ]:
-            ensure_dir(d)
-    
-        for path, content in load_default_top_docs().items():
-            if overwrite or not path.exists():
-                write_text(path, content)
-    
-        for name, content in load_default_templates().items():
-            template_path = TEMPLATES_DIR / name
-            if overwrite or not template_path.exists():
-                write_text(template_path, content)
-    
-        prompts_dir = SYSTEM_ROOT / "prompts"
-        for name, content in load_default_prompts().items():
-            prompt_path = prompts_dir / name
-            if overwrite or not prompt_path.exists():
-                write_text(prompt_path, content)
-                print(f"[OK] Created {prompt_path}")
-    
-        for name, content in load_default_system_files().items():
-            system_path = SYSTEM_ROOT / name
-            if overwrite or not system_path.exists():
-                write_text(system_path, content)
-                print(f"[OK] Created {system_path}")
-    
-        src_dir = SYSTEM_ROOT / "src"
-        for name, content in load_default_src_files().items():
-            src_path = src_dir / name
-            if overwrite or not src_path.exists():
-                write_text(src_path, content)
-                print(f"[OK] Created {src_path}")
-    
-        if not LAST_RUN_PATH.exists():
-            write_last_run({"stage": "idle", "updated_at": now_iso()})
-    
-        print("[OK] Atlas structure initialized.")
-        print("[INFO] Run the prompt in .atlas/.system/prompts/onboarding.md to complete setup.")
-        return 0
-    
-    
-    def create_brief_doc(text: str, domain: str) -> Path:
-        brief_id = next_id("BRIEF", domain, BRIEF_DIR, BRIEF_ID_PATTERN)
-        title = derive_title(text)
-        content = f"""# [{brief_id}] {title}
-    
-    > **ID**: {brief_id}
-    > **Domain**: {domain}
-    > **Status**: Active
-    > **Date**: {now_date()}
-    
-    ## 1. User Request
-    {text.strip()}
-    
-    ## 2. Intent Summary
-    - Goal: 
-    - Problem: 
-    
-    ## 3. Affected Artifacts
-    - Create: 
-    - Modify: 
-    - Read: 
-    
-    ## 4. Proposed Changes
-    1. 
-    2. 
-    
-    ## 5. Verification Criteria
-    - [ ] 
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or SEQUENCES_PATH
+        self.lock_path = self.path.with_suffix(".lock")
+
+    def load(self) -> dict:
+        try:
+            data = json.loads(read_text(self.path))
+        except (OSError, ValueError):
+            data = None
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != SEQUENCES_VERSION
+            or not isinstance(data.get("ids"), dict)
+            or not isinstance(data.get("steps"), dict)
+        ):
+            return {"version": SEQUENCES_VERSION, "ids": {}, "steps": {}}
+        return data
+
+    def allocate(self, table: str, key: str, scan, taken, count: int = 1) -> int:
+        """Reserve count consecutive numbers for key and return the first.
+
+        scan() (the highest number on disk) and taken(n) repair a stale
+        counter: small blocks are probed number by number, larger ones
+        (bulk capture batches) with a single scan().
+        """
+        with file_lock(self.lock_path):
+            data = self.load()
+            current = data[table].get(key)
+            if not isinstance(current, int):
+                current = scan()
+            elif count > SEQUENCE_PROBE_LIMIT or any(taken(current + i) for i in range(1, count + 1)):
+                current = max(scan(), current)
+            data[table][key] = current + count
+            write_json_atomic(self.path, data)
+        return current + 1
+
+    def observe(self, table: str, key: str, number: int) -> None:
+        """Raise key's high-water mark to number (for IDs chosen explicitly)."""
+        with file_lock(self.lock_path):
+            data = self.load()
+            current = data[table].get(key)
+            if isinstance(current, int) and current >= number:
+                return
+            data[table][key] = number
+            write_json_atomic(self.path, data)
+
+
+# =============================================================================
+# Journal
+# =============================================================================
+
+JOURNAL_VERSION = 1
+
+
+def content_hash(content: Optional[str]) -> Optional[str]:
+    import hashlib
+
+    return None if content is None else hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def read_optional(path: Path) -> Optional[str]:
+    try:
+        return read_text(path)
+    except FileNotFoundError:
+        return None
+
+
+class Transaction:
+    """Edits to several documents that land together or not at all.
+
+    Commands stage new contents with write() (read() sees staged edits);
+    commit() first writes a durable redo journal to state/journal.json,
+    then writes every file with one group flush (see write_files) and
+    deletes the journal. If the process dies in between, recover_journal()
+    finishes the job on the next start. Used as a context manager, the
+    transaction commits on a clean exit and holds the doc_lock()s taken
+    through lock() until then.
     """
-        path = BRIEF_DIR / f"{brief_id}.md"
-        ensure_dir(BRIEF_DIR)
-        write_text(path, content)
-        return path
-    
-    
-    def capture_command(args: argparse.Namespace) -> int:
-        domain = args.domain.upper()
-        text = args.text.strip()
-        if not text:
-            print("[ERR] Empty input.")
-            return 1
-    
-        title = derive_title(text)
-        req_ids = [rid for rid in extract_ids_from_text(text) if rid.startswith("REQ-")]
-        if not req_ids:
-            req_ids = [next_id("REQ", domain, REQ_DIR, REQ_ID_PATTERN)]
-    
-        created = []
-        for req_id in req_ids:
-            if not REQ_ID_PATTERN.match(req_id):
-                print(f"[WARN] Skipping invalid REQ ID: {req_id}")
-                continue
-            create_req_stub(req_id, title=title)
-            req_path = REQ_DIR / f"{req_id}.md"
-            if req_path.exists():
-                append_capture_note(req_path, text)
-            view_path = ensure_view_doc(req_id, title)
-            created.append((req_path, view_path))
-    
-        if getattr(args, "to", None) == "brief":
-            brief_path = create_brief_doc(text, domain)
-            print(f"[OK] Created {brief_path}")
-    
-        for req_path, view_path in created:
-            print(f"[OK] Updated {req_path}")
-            print(f"[OK] Updated {view_path}")
-        return 0
-    
-    
-    def create_req_stub(req_id: str, title: Optional[str] = None) -> None:
-        path = REQ_DIR / f"{req_id}.md"
-        if path.exists():
-            return
-        match = REQ_ID_PATTERN.match(req_id)
-        if not match:
-            return
-        domain = match.group(1)
-        template = load_template("REQ.md")
-        title = title or "Title"
-        content = template.replace("REQ-XXX-001", req_id)
-        content = content.replace("# [REQ-XXX-001] Title", f"# [{req_id}] {title}")
-        content = content.replace("Domain**: XXX", f"Domain**: {domain}")
-        content = content.replace("Last Updated**: YYYY-MM-DD", f"Last Updated**: {now_date()}")
-        write_text(path, content)
-    
-    
-    def append_capture_note(path: Path, text: str) -> None:
-        note = text.strip()
-        if not note:
+
+    def __init__(self, command: str):
+        from contextlib import ExitStack
+
+        self.command = command
+        self.files: dict[Path, str] = {}
+        self.before: dict[Path, Optional[str]] = {}
+        self.locks = ExitStack()
+
+    def __enter__(self) -> "Transaction":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        with self.locks:
+            if exc_type is None:
+                self.commit()
+
+    def lock(self, *paths: Path) -> None:
+        self.locks.enter_context(doc_lock(*paths))
+
+    def read(self, path: Path) -> str:
+        if path in self.files:
+            return self.files[path]
+        return read_text(path)
+
+    def write(self, path: Path, content: str) -> None:
+        if path not in self.before:
+            self.before[path] = content_hash(read_optional(path))
+        self.files[path] = content
+
+    def commit(self) -> None:
+        if not self.files:
             return
-        content = read_text(path)
-        stamp = now_date()
-        block = f"\n## Capture ({stamp})\n{note}\n"
-        if f"## Capture ({stamp})" in content:
+        journal = {
+            "version": JOURNAL_VERSION,
+            "command": self.command,
+            "created_at": now_iso(),
+            "files": [
+                {
+                    "path": DocIndex.key(path),
+                    "before": self.before[path],
+                    "after": content_hash(content),
+                    "content": content,
+                }
+                for path, content in self.files.items()
+            ],
+        }
+        with file_lock(JOURNAL_LOCK_PATH):
+            # Durable on its own before any document is written, so redo never depends on the payload flush.
+            atomic_write(JOURNAL_PATH, json.dumps(journal, ensure_ascii=False))
+            write_files(list(self.files.items()))
+            JOURNAL_PATH.unlink()
+            fsync_dir(STATE_DIR)
+
+
+def load_journal() -> Optional[dict]:
+    try:
+        data = json.loads(read_text(JOURNAL_PATH))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        data = None
+    if not isinstance(data, dict) or data.get("version") != JOURNAL_VERSION or not isinstance(data.get("files"), list):
+        return {}
+    return data
+
+
+def recover_journal() -> None:
+    """Finish a transaction that was interrupted after its journal became durable.
+
+    Files still holding their pre-transaction content are rewritten; files
+    already holding the new content are skipped; files edited since are
+    left alone with a warning. Without a journal nothing was written, so
+    there is nothing to roll back.
+    """
+    if not JOURNAL_PATH.exists():
+        return
+    data = load_journal()
+    if not data:
+        if data is not None:
+            aside = JOURNAL_PATH.with_name(JOURNAL_PATH.name + ".corrupt")
+            os.replace(JOURNAL_PATH, aside)
+            print(f"[WARN] Unreadable journal moved to {aside}")
+        return
+    paths = [ATLAS_ROOT / entry["path"] for entry in data["files"]]
+    with doc_lock(*paths), file_lock(JOURNAL_LOCK_PATH):
+        data = load_journal()
+        if not data:
             return
-        write_text(path, content.rstrip() + block)
-    
-    
-    def ensure_view_doc(req_id: str, title: str) -> Path:
-        path = VIEWS_DIR / f"{req_id}.md"
-        if not path.exists():
-            template = load_template("VIEW.md")
-            content = template.replace("REQ-XXX-001", req_id)
-            content = content.replace("# [VIEW-REQ-XXX-001] Title", f"# [VIEW-{req_id}] {title}")
-            content = content.replace("Last Updated**: YYYY-MM-DD", f"Last Updated**: {now_date()}")
-            write_text(path, content)
-            return path
-    
-        content = read_text(path)
-        if req_id not in content:
-            if "## References (SSOT index)" not in content:
-                content = content.rstrip() + "\n\n## References (SSOT index)\n"
-            content = content.rstrip() + f"\n- {req_id}\n"
-            write_text(path, content)
-        return path
-    
-    
-    def extract_section_lines(text: str, heading: str) -> list[str]:
-        lines = text.splitlines()
-        out: list[str] = []
-        in_section = False
-        target = f"## {heading}".strip().lower()
-        for line in lines:
-            stripped = line.strip()
-            if stripped.startswith("## "):
-                if in_section:
-                    break
-                in_section = stripped.lower() == target
+        files: list[tuple[Path, str]] = []
+        for entry in data["files"]:
+            path = ATLAS_ROOT / entry["path"]
+            current = content_hash(read_optional(path))
+            if current == entry["after"]:
                 continue
-            if in_section:
-                out.append(line)
-        return out
-    
-    
-    def extract_view_references(text: str) -> set[str]:
-        refs: set[str] = set()
-        for line in extract_section_lines(text, "References (SSOT index)"):
-            for ref_id in REQ_REF_RE.findall(line):
-                refs.add(ref_id)
-        return refs
-    
-    
-    def extract_view_summary_refs(text: str) -> set[str]:
-        refs: set[str] = set()
-        for line in extract_section_lines(text, "Summary"):
-            if "<!--" in line:
+            if current == entry["before"]:
+                files.append((path, entry["content"]))
+            else:
+                print(f"[WARN] {path} changed after the interrupted {data['command']}; left as is.")
+            for stale in path.parent.glob(f".{path.name}.*.tmp"):
+                stale.unlink(missing_ok=True)
+        if files:
+            write_files(files)
+        JOURNAL_PATH.unlink()
+        fsync_dir(STATE_DIR)
+    print(f"[INFO] Recovered interrupted {data['command']}: {len(files)} file(s) rewritten.")
+
+
+# =============================================================================
+# Parallel helpers
+# =============================================================================
+
+# Below this many items a process pool costs more than it saves.
+PARALLEL_MIN_ITEMS = 1000
+
+# Read-only state of a pool worker process (set once per worker by the initializer).
+_WORKER_CONTEXT: dict = {}
+
+
+def resolve_jobs(jobs: Optional[int]) -> int:
+    # Servers (atlas serve, atlas mcp) may have other threads running; never fork a pool from them.
+    if _SERVER is not None:
+        return 1
+    return max(1, jobs or os.cpu_count() or 1)
+
+
+def _set_worker_context(context: dict) -> None:
+    _WORKER_CONTEXT.clear()
+    _WORKER_CONTEXT.update(context)
+    # Spawned workers re-import the module and start out on the tool's workspace.
+    if context.get("repo_root") not in (None, REPO_ROOT):
+        set_workspace(context["repo_root"])
+
+
+def _run_chunk(func, items: list) -> list:
+    return func(items, _WORKER_CONTEXT)
+
+
+def map_chunks(func, items: list, jobs: int, context: Optional[dict] = None) -> list:
+    """Apply func(items, context) -> list to items, sharded over worker processes.
+
+    Results are concatenated in input order, so output stays deterministic
+    regardless of which worker finishes first. Small workloads, jobs=1 and
+    platforms without process pools run in-process, where context is passed
+    straight through, so concurrent callers on several threads never see
+    each other's context.
+    """
+    context = {"repo_root": REPO_ROOT, **(context or {})}
+    if jobs > 1 and len(items) >= PARALLEL_MIN_ITEMS:
+        from concurrent.futures import ProcessPoolExecutor
+        from functools import partial
+
+        size = -(-len(items) // (jobs * 4))
+        chunks = [items[i : i + size] for i in range(0, len(items), size)]
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(jobs, len(chunks)),
+                initializer=_set_worker_context,
+                initargs=(context,),
+            ) as pool:
+                results: list = []
+                for chunk_result in pool.map(partial(_run_chunk, func), chunks):
+                    results.extend(chunk_result)
+                return results
+        except (OSError, NotImplementedError):
+            pass
+    return func(items, context)
+
+
+# =============================================================================
+# Document index
+# =============================================================================
+
+DOC_INDEX_VERSION = 4
+
+VIEW_INDEX_HEADING = "## references (ssot index)"
+VIEW_SUMMARY_HEADING = "## summary"
+
+
+def parse_document(path: Path) -> dict:
+    """Parse a document into the fields cached by the document index.
+
+    The text is split into lines once; meta, links, checkboxes and sections
+    are all collected in the same pass.
+    """
+    text = read_text(path)
+    meta: dict[str, str] = {}
+    links: list[str] = []
+    checked = total = 0
+    sections: dict[str, list[str]] = {}
+    section: Optional[list[str]] = None
+    headings: list[str] = []
+    in_code = False
+    for i, line in enumerate(text.splitlines()):
+        stripped = line.strip()
+        if i < 60:
+            match = META_RE.match(stripped)
+            if match:
+                meta[match.group(1).strip()] = match.group(2).strip()
+        if CHECKBOX_CHECKED.match(line):
+            checked += 1
+            total += 1
+        elif CHECKBOX_UNCHECKED.match(line):
+            total += 1
+        if stripped.startswith("## "):
+            if not in_code:
+                headings.append(section_name(stripped))
+            key = stripped.lower()
+            section = None if key in sections else sections.setdefault(key, [])
+        elif section is not None:
+            section.append(line)
+        if stripped.startswith("```"):
+            in_code = not in_code
+            continue
+        if not in_code:
+            links.extend(match.group(1).strip() for match in LINK_RE.finditer(line))
+
+    record = {
+        "meta": meta,
+        "header_id": extract_header_id(text),
+        "links": links,
+        "req_refs": sorted(set(REQ_REF_RE.findall(text))),
+        "checkboxes": [checked, total],
+        "sections": headings,
+    }
+    if is_relative_to(path, VIEWS_DIR):
+        record["view"] = summarize_view(sections)
+    return record
+
+
+def summarize_view(sections: dict[str, list[str]]) -> dict:
+    """Collect the view fields doctor validates from pre-split sections."""
+    index_refs: set[str] = set()
+    for line in sections.get(VIEW_INDEX_HEADING, []):
+        index_refs.update(REQ_REF_RE.findall(line))
+    summary_refs: set[str] = set()
+    ok_without_ref = normative_without_ref = 0
+    for line in sections.get(VIEW_SUMMARY_HEADING, []):
+        if "<!--" in line:
+            continue
+        refs = [match.group("id") for match in REF_TOKEN_RE.finditer(line)]
+        summary_refs.update(refs)
+        if refs:
+            continue
+        if "ATLAS:OK" in line:
+            ok_without_ref += 1
+        if any(keyword in line for keyword in NORMATIVE_KEYWORDS):
+            normative_without_ref += 1
+    return {
+        "index_refs": sorted(index_refs),
+        "summary_refs": sorted(summary_refs),
+        "ok_without_ref": ok_without_ref,
+        "normative_without_ref": normative_without_ref,
+    }
+
+
+def stat_key(path: Path) -> Optional[list[int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+class DocIndex:
+    """Parsed documents cached on disk, invalidated per file by (mtime_ns, size, inode)."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or DOC_INDEX_PATH
+        self.entries: dict[str, dict] = {}
+        self.dirty = False
+        # Keys of directories a filesystem watcher keeps current (see watch()).
+        self.watched: set[str] = set()
+        # Sorted records per directory for records(), dropped on any change.
+        self._ordered: dict[str, list[tuple[Path, dict]]] = {}
+        # Bumped on every change. Records are replaced, never edited in place,
+        # so a shallow copy of entries stays a consistent snapshot.
+        self.generation = 0
+        self._load()
+
+    def _modified(self) -> None:
+        self.dirty = True
+        self.generation += 1
+        self._ordered.clear()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(read_text(self.path))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == DOC_INDEX_VERSION:
+            self.entries = data.get("docs", {})
+
+    @staticmethod
+    def key(path: Path) -> str:
+        raw = str(path)
+        root = str(ATLAS_ROOT) + os.sep
+        if raw.startswith(root):
+            return raw[len(root) :].replace(os.sep, "/")
+        return path.as_posix()
+
+    def get(self, path: Path) -> Optional[dict]:
+        """Return the parsed record for path, re-parsing only if the file changed."""
+        key = self.key(path)
+        stamp = stat_key(path)
+        if stamp is None:
+            if self.entries.pop(key, None) is not None:
+                self._modified()
+            return None
+        entry = self.entries.get(key)
+        if entry is not None and entry.get("stat") == stamp:
+            return entry
+        entry = parse_document(path)
+        entry["stat"] = stamp
+        self.entries[key] = entry
+        self._modified()
+        return entry
+
+    def scan(self, dirs: Iterable[Path], jobs: int = 1) -> list[tuple[Path, dict]]:
+        """Return (path, record) for every document under dirs, dropping deleted entries.
+
+        Stale entries are re-parsed across ``jobs`` worker processes when there
+        are enough of them to pay for the pool.
+        """
+        dirs = list(dirs)
+        if self.watched and all(self.key(d) in self.watched for d in dirs):
+            return self.records(dirs)
+        paths = iter_md_files(dirs)
+        keys = [self.key(path) for path in paths]
+        stale: list[tuple[Path, str, list[int]]] = []
+        for path, key in zip(paths, keys):
+            stamp = stat_key(path)
+            if stamp is None:
                 continue
-            for match in REF_TOKEN_RE.finditer(line):
-                refs.add(match.group("id"))
-        return refs
-    
-    
-    def extract_view_ssot_refs(text: str) -> set[str]:
-        meta = extract_meta(text)
-        value = meta.get("SSOT", "")
-        return set(REQ_REF_RE.findall(value))
-    
-    
-    def run_command(args: argparse.Namespace) -> int:
-        req_id = args.req_id
-        if req_id.endswith(".md"):
-            req_id = Path(req_id).stem
-    
-        match = REQ_ID_PATTERN.match(req_id)
-        if not match:
-            print(f"[ERR] Invalid REQ ID: {req_id}")
-            return 1
-    
-        req_path = REQ_DIR / f"{req_id}.md"
-        if not req_path.exists():
-            print(f"[ERR] REQ not found: {req_path}")
-            return 1
-    
-        domain = match.group(1)
-        number = match.group(2)
-        step = getattr(args, "step", None) or next_run_step(req_id)
-        run_id = f"RUN-REQ-{domain}-{number}-step-{int(step):02d}"
-        run_path = RUN_DIR / f"{run_id}.md"
-        if run_path.exists():
-            print(f"[ERR] RUN already exists: {run_path}")
-            return 1
-    
-        content = f"""# [{run_id}] Plan
-    
-    > **ID**: {run_id}
-    > **REQ**: {req_id}
-    > **Status**: Planned
-    > **Started**: {now_date()}
-    > **Git**: -
-    > **Completed**: -
-    
-    ## Target REQ
-    - {req_id}
-    
-    ## Plan
-    - [ ] 
-    
-    ## Verification
-    - [ ] Test
-    - [ ] Spec
-    - [ ] Boundary
-    
-    ## Output
-    - (files created/modified)
+            entry = self.entries.get(key)
+            if entry is None or entry.get("stat") != stamp:
+                stale.append((path, key, stamp))
+        if stale:
+            parsed = map_chunks(parse_documents, [path for path, _, _ in stale], jobs)
+            for (_, key, stamp), entry in zip(stale, parsed):
+                entry["stat"] = stamp
+                self.entries[key] = entry
+            self._modified()
+
+        records = []
+        for path, key in zip(paths, keys):
+            entry = self.entries.get(key)
+            if entry is not None:
+                records.append((path, entry))
+        prefixes = tuple(self.key(d) + "/" for d in dirs)
+        seen = set(keys)
+        for key in [k for k in self.entries if k.startswith(prefixes) and k not in seen]:
+            del self.entries[key]
+            self._modified()
+        return records
+
+    def refresh(self, paths: Iterable[Path]) -> None:
+        """Re-read only the given documents, or directory trees, into the index."""
+        for path in paths:
+            if path.suffix == ".md":
+                self.get(path)
+            elif path.is_dir():
+                self.scan([path])
+            else:
+                prefix = self.key(path) + "/"
+                for key in [k for k in self.entries if k.startswith(prefix)]:
+                    del self.entries[key]
+                    self._modified()
+
+    def records(self, dirs: Iterable[Path]) -> list[tuple[Path, dict]]:
+        """Like scan(), but trusts the in-memory entries instead of stat-ing every file."""
+        records = []
+        for directory in dirs:
+            prefix = self.key(directory) + "/"
+            ordered = self._ordered.get(prefix)
+            if ordered is None:
+                keys = sorted((k for k in self.entries if k.startswith(prefix)), key=id_sort_key)
+                ordered = self._ordered[prefix] = [(ATLAS_ROOT / key, self.entries[key]) for key in keys]
+            records.extend(ordered)
+        return records
+
+    def watch(self, dirs: list[Path]) -> None:
+        """Scan dirs once, then let scan() trust memory for them.
+
+        The caller must feed every change under dirs to refresh(); `atlas
+        serve` does so from inotify events.
+        """
+        self.watched = set()
+        self.scan(dirs)
+        self.watched = {self.key(d) for d in dirs}
+
+    def invalidate(self, path: Path) -> None:
+        if self.entries.pop(self.key(path), None) is not None:
+            self._modified()
+
+    def save(self) -> None:
+        if not self.dirty or not STATE_DIR.is_dir():
+            return
+        write_json_atomic(self.path, {"version": DOC_INDEX_VERSION, "docs": self.entries})
+        self.dirty = False
+
+
+def parse_documents(paths: list[Path], context: Optional[dict] = None) -> list[dict]:
+    return [parse_document(path) for path in paths]
+
+
+# Process-wide index of the current workspace; reset by set_workspace().
+_DOC_INDEX: Optional[DocIndex] = None
+
+
+def doc_meta(path: Path) -> dict[str, str]:
+    """Header meta for one document.
+
+    Served from the document index when a long-running caller already holds
+    it in memory; otherwise only the header block is read from disk.
     """
-        write_text(run_path, content)
-    
-        write_last_run(
-            {
-                "run_id": run_id,
-                "req_id": req_id,
-                "stage": "executing",
-                "updated_at": now_iso(),
-            }
-        )
-    
-        print(f"[OK] Created {run_path}")
-        return 0
-    
-    
-    def plan_command(args: argparse.Namespace) -> int:
-        print("[WARN] 'plan' is deprecated. Use 'run' instead.")
-        args.req_id = args.brief_id
-        return run_command(args)
-    
-    
-    def finish_command(args: argparse.Namespace) -> int:
-        run_id = args.run_id
-        if run_id.endswith(".md"):
-            run_id = Path(run_id).stem
-    
-        if not RUN_ID_PATTERN.match(run_id):
-            print(f"[ERR] Invalid RUN ID: {run_id}")
-            return 1
-    
-        run_path = RUN_DIR / f"{run_id}.md"
-        if not run_path.exists():
-            print(f"[ERR] RUN not found: {run_path}")
-            return 1
-    
-        git_hash = args.git
-        if not git_hash:
-            git_hash = detect_git_hash()
-        if not git_hash:
-            print("[ERR] Missing git hash. Provide --git or ensure git is available.")
-            return 1
-    
-        text = read_text(run_path)
-        meta = extract_meta(text)
-        brief_id = meta.get("Brief")
-        req_id = meta.get("REQ") or req_id_from_run_id(run_id)
-        status = "Completed" if args.success else "Failed"
-        text = update_meta_line(text, "Status", status)
-        text = update_meta_line(text, "Git", git_hash)
-        text = update_meta_line(text, "Completed", now_date())
-        write_text(run_path, text)
-    
-        if brief_id:
-            update_brief_status(brief_id, status)
-    
-        if req_id:
-            req_path = REQ_DIR / f"{req_id}.md"
-            if req_path.exists():
-                req_text = read_text(req_path)
-                req_text = update_meta_line(req_text, "Implemented-Git", git_hash)
-                req_text = update_meta_line(req_text, "Linked-RUN", run_id)
-                req_text = update_meta_line(req_text, "Last Updated", now_date())
-                write_text(req_path, req_text)
-                print(f"[OK] Updated {req_path}")
-    
-        last_run_state = {
-            "run_id": run_id,
-            "stage": "finished",
-            "git_hash": git_hash,
-            "completed_at": now_iso(),
-        }
-        if brief_id:
-            last_run_state["brief_id"] = brief_id
-        if req_id:
-            last_run_state["req_id"] = req_id
-        write_last_run(last_run_state)
+    if _DOC_INDEX is not None:
+        record = _DOC_INDEX.get(path)
+        return record["meta"] if record else {}
+    try:
+        return read_header(path)[0]
+    except OSError:
+        return {}
+
+
+def doc_record(path: Path) -> dict:
+    """Full parsed record for one document, from the loaded index or a one-off parse."""
+    if _DOC_INDEX is not None:
+        return _DOC_INDEX.get(path) or {}
+    try:
+        return parse_document(path)
+    except OSError:
+        return {}
+
+
+def get_doc_index() -> DocIndex:
+    """Return the process-wide document index, loading it on first use."""
+    global _DOC_INDEX
+    if _DOC_INDEX is None:
+        _DOC_INDEX = DocIndex()
+    return _DOC_INDEX
+
+
+def save_doc_index() -> None:
+    if _DOC_INDEX is not None:
+        _DOC_INDEX.save()
+
+
+# =============================================================================
+# Sync utilities
+# =============================================================================
+
+def parse_checkboxes(text: str) -> list[tuple[int, bool, str]]:
+    """Parse checkboxes from text. Returns list of (line_num, is_checked, content)."""
+    results = []
+    for i, line in enumerate(text.splitlines()):
+        if CHECKBOX_CHECKED.match(line):
+            match = CHECKBOX_CHECKED.match(line)
+            results.append((i, True, match.group(2).strip()))
+        elif CHECKBOX_UNCHECKED.match(line):
+            match = CHECKBOX_UNCHECKED.match(line)
+            results.append((i, False, match.group(2).strip()))
+    return results
+
+
+def parse_traceability(text: str) -> dict[str, tuple[str, str]]:
+    """Parse traceability links. Returns {link_type: (id, path)}."""
+    results = {}
+    for match in TRACEABILITY_LINK_RE.finditer(text):
+        link_id = match.group(1).strip()
+        link_path = match.group(2).strip()
+        # Determine link type from context
+        full_match = match.group(0)
+        if "Implements" in full_match:
+            results["Implements"] = (link_id, link_path)
+        elif "Answers" in full_match:
+            results["Answers"] = (link_id, link_path)
+        elif "Solved by" in full_match:
+            results["Solved by"] = (link_id, link_path)
+        elif "Implemented by" in full_match:
+            results["Implemented by"] = (link_id, link_path)
+    return results
+
+
+def resolve_linked_docs(run_path: Path) -> dict[str, Path]:
+    """Resolve RUN -> BRIEF -> REQ chain. Returns {doc_type: path}."""
+    docs = {}
+    meta = doc_meta(run_path)
+
+    # RUN -> REQ (direct)
+    req_id = meta.get("REQ") or req_id_from_run_id(run_path.stem)
+    if req_id and REQ_ID_PATTERN.match(req_id):
+        req_path = REQ_DIR / f"{req_id}.md"
+        if req_path.exists():
+            docs["REQ"] = req_path
     
-        print(f"[OK] Updated {run_path}")
-        return 0
+    # RUN -> BRIEF
+    brief_id = meta.get("Brief")
+    if brief_id and BRIEF_ID_PATTERN.match(brief_id):
+        brief_path = BRIEF_DIR / f"{brief_id}.md"
+        if brief_path.exists():
+            docs["BRIEF"] = brief_path
+            
+            # BRIEF -> REQ (via Implements link)
+            brief_text = read_text(brief_path)
+            trace = parse_traceability(brief_text)
+            if "Implements" in trace:
+                req_id, req_rel_path = trace["Implements"]
+                req_path = (brief_path.parent / req_rel_path).resolve()
+                if req_path.exists():
+                    docs["REQ"] = req_path
+    
+    return docs
+
+
+def compute_status_from_checkboxes(text: str) -> Optional[str]:
+    """Compute status based on checkbox completion in Steps/Verification sections."""
+    checkboxes = parse_checkboxes(text)
+    checked = sum(1 for _, is_checked, _ in checkboxes if is_checked)
+    return status_from_checkbox_tally(checked, len(checkboxes))
+
+
+def status_from_checkbox_tally(checked: int, total: int) -> Optional[str]:
+    if not total:
+        return None
+    if checked == 0:
+        return "Planned"
+    elif checked == total:
+        return "Completed"
+    else:
+        return "InProgress"
+
+
+def generate_sync_diff(run_path: Path) -> dict:
+    """Generate diff for sync operation. Returns changes to apply."""
+    diff = {
+        "run": {"path": run_path, "changes": []},
+        "brief": None,
+        "req": None,
+    }
     
+    run_record = doc_record(run_path)
+    run_meta = run_record.get("meta", {})
     
-    def sync_command(args: argparse.Namespace) -> int:
-        """Sync RUN status to BRIEF/REQ documents."""
-        run_id = args.run_id
-        if run_id.endswith(".md"):
-            run_id = Path(run_id).stem
+    # Compute RUN status from checkboxes
+    computed_status = status_from_checkbox_tally(*run_record.get("checkboxes", [0, 0]))
+    current_status = run_meta.get("Status", "")
     
-        if not RUN_ID_PATTERN.match(run_id):
-            print(f"[ERR] Invalid RUN ID: {run_id}")
-            return 1
+    if computed_status and normalize_status(computed_status) != normalize_status(current_status):
+        diff["run"]["changes"].append({
+            "type": "status",
+            "from": current_status,
+            "to": computed_status,
+        })
     
-        run_path = RUN_DIR / f"{run_id}.md"
-        if not run_path.exists():
-            print(f"[ERR] RUN not found: {run_path}")
-            return 1
+    # Resolve linked documents
+    linked = resolve_linked_docs(run_path)
     
-        # Generate diff
-        diff = generate_sync_diff(run_path)
-        
-        # Always print diff (dry-run info)
-        print_sync_diff(diff)
-        
-        # Check if any apply flags are set
-        apply_brief = getattr(args, "apply_brief", False)
-        apply_req = getattr(args, "apply_req", False)
-        write_patch = getattr(args, "write_req_patch", False)
-        
-        if not (apply_brief or apply_req or write_patch):
-            print("\n[INFO] Dry-run mode. Use --apply-brief, --write-req-patch, or --apply-req to make changes.")
-            return 0
+    # BRIEF sync
+    if "BRIEF" in linked:
+        brief_path = linked["BRIEF"]
+        brief_meta = doc_meta(brief_path)
+        brief_status = brief_meta.get("Status", "")
         
-        # Apply RUN changes (always when any apply flag is set)
-        if diff["run"]["changes"]:
-            run_text = read_text(run_path)
-            for change in diff["run"]["changes"]:
-                if change["type"] == "status":
-                    run_text = update_meta_line(run_text, "Status", change["to"])
-            write_text(run_path, run_text)
-            print(f"[OK] Updated {run_path}")
-        
-        # Apply BRIEF changes
-        if apply_brief:
-            apply_brief_changes(diff)
+        diff["brief"] = {
+            "path": brief_path,
+            "changes": [],
+        }
         
-        # Write REQ patch
-        if write_patch:
-            write_req_patch(diff)
+        # Sync status
+        if computed_status and normalize_status(brief_status) != normalize_status(computed_status):
+            diff["brief"]["changes"].append({
+                "type": "status",
+                "from": brief_status,
+                "to": computed_status,
+            })
+    
+    # REQ patch (don't auto-modify, generate patch)
+    if "REQ" in linked:
+        req_path = linked["REQ"]
+        req_checked, req_total = doc_record(req_path).get("checkboxes", [0, 0])
         
-        # Apply REQ changes (with warning)
-        if apply_req:
-            apply_req_changes(diff)
+        diff["req"] = {
+            "path": req_path,
+            "changes": [],
+            "checkboxes": (req_checked, req_total),
+        }
         
-        return 0
-    
-    
-    def iter_links(text: str) -> list[str]:
-        links = []
-        in_code = False
-        for line in text.splitlines():
-            stripped = line.strip()
-            if stripped.startswith("```"):
-                in_code = not in_code
-                continue
-            if in_code:
-                continue
-            for match in LINK_RE.finditer(line):
-                links.append(match.group(1).strip())
-        return links
-    
-    
-    def doctor_command(args: argparse.Namespace) -> int:
-        issues = 0
-        brief_statuses: dict[str, str] = {}
-        run_brief_statuses: list[tuple[str, str, str, Optional[datetime]]] = []
-    
-        required_dirs = [
-            REQ_DIR,
-            RULE_DIR,
-            ADR_DIR,
-            CQ_DIR,
-            VIEWS_DIR,
-            INBOX_DIR,
-            DRAFTS_DIR,
-            BRIEF_DIR,
-            RUN_DIR,
-            ARCHIVE_DIR,
-            SYSTEM_ROOT,
-            TEMPLATES_DIR,
-            STATE_DIR,
-        ]
-        for path in required_dirs:
-            if not path.exists():
-                print(f"[ERR] Missing directory: {path}")
-                issues += 1
-    
-        for path in REQUIRED_TOP_DOCS:
-            if not path.exists():
-                print(f"[ERR] Missing top doc: {path}")
-                issues += 1
-    
-        for path in OPTIONAL_TOP_DOCS:
-            if not path.exists():
-                print(f"[WARN] Missing optional doc: {path}")
+        # Check if REQ acceptance criteria should be updated based on RUN completion
+        if computed_status == "Completed" and req_total:
+            # Suggest marking related checkboxes
+            diff["req"]["changes"].append({
+                "type": "checkbox_suggestion",
+                "message": f"RUN completed. Consider updating acceptance criteria in {req_path.name}",
+            })
     
-        scan_dirs = [REQ_DIR, RULE_DIR, ADR_DIR, CQ_DIR, BRIEF_DIR, RUN_DIR]
-        all_docs = iter_md_files(scan_dirs)
-        all_ids: set[str] = set()
+    return diff
+
+
+def print_sync_diff(diff: dict) -> None:
+    """Print sync diff in human-readable format."""
+    run_info = diff["run"]
+    print(f"\n[SYNC] {run_info['path'].stem}")
     
-        for path in all_docs:
-            text = read_text(path)
-            meta = extract_meta(text)
-            meta_id = meta.get("ID")
-            header_id = extract_header_id(text)
-            file_id = path.stem
-            for candidate in [meta_id, header_id, file_id]:
-                if candidate:
-                    all_ids.add(candidate)
+    if run_info["changes"]:
+        for change in run_info["changes"]:
+            if change["type"] == "status":
+                print(f"  → RUN: Status {change['from']} → {change['to']}")
+    else:
+        print("  → RUN: (no changes)")
     
-        for path in all_docs:
-            text = read_text(path)
-            meta = extract_meta(text)
-            meta_id = meta.get("ID")
-            header_id = extract_header_id(text)
-            file_id = path.stem
+    if diff["brief"]:
+        brief_info = diff["brief"]
+        if brief_info["changes"]:
+            for change in brief_info["changes"]:
+                if change["type"] == "status":
+                    print(f"  → BRIEF ({brief_info['path'].stem}): Status {change['from']} → {change['to']}")
+        else:
+            print(f"  → BRIEF ({brief_info['path'].stem}): (no changes)")
+    
+    if diff["req"]:
+        req_info = diff["req"]
+        if req_info["changes"]:
+            for change in req_info["changes"]:
+                if change["type"] == "checkbox_suggestion":
+                    print(f"  → REQ ({req_info['path'].stem}): [Patch required] {change['message']}")
+        else:
+            print(f"  → REQ ({req_info['path'].stem}): (no changes)")
+
+
+def apply_brief_changes(diff: dict, txn: Transaction) -> bool:
+    """Apply changes to BRIEF document."""
+    if not diff["brief"] or not diff["brief"]["changes"]:
+        return False
+    
+    brief_path = diff["brief"]["path"]
+    txn.lock(brief_path)
+    brief = Document.load(brief_path, txn)
+    for change in diff["brief"]["changes"]:
+        if change["type"] == "status":
+            brief.set_meta("Status", change["to"])
+    brief.save(brief_path, txn)
+    print(f"[OK] Updated {brief_path}")
+    return True
+
+
+def write_req_patch(diff: dict, txn: Transaction) -> Optional[Path]:
+    """Write REQ patch file."""
+    if not diff["req"] or not diff["req"]["changes"]:
+        return None
     
-            folder = path.parent.name
-            expected_prefix = {
-                "req": "REQ",
-                "rule": "RULE",
-                "adr": "ADR",
-                "cq": "CQ",
-                "brief": "BRIEF",
-                "runs": "RUN",
-            }.get(folder)
+    ensure_dir(PATCH_DIR)
+    req_path = diff["req"]["path"]
+    patch_path = PATCH_DIR / f"{req_path.stem}.patch.md"
     
-            if expected_prefix is None:
-                continue
+    content = f"""# Patch for {req_path.stem}
+
+> **Generated**: {now_date()}
+> **Source RUN**: {diff['run']['path'].stem}
+
+## Suggested Changes
+
+"""
+    for change in diff["req"]["changes"]:
+        if change["type"] == "checkbox_suggestion":
+            content += f"- {change['message']}\n"
     
-            if expected_prefix == "BRIEF":
-                status = meta.get("Status")
-                if not status:
-                    print(f"[ERR] Missing Status: {path}")
-                    issues += 1
-                else:
-                    brief_statuses[file_id] = status
+    content += f"""
+## How to Apply
+
+```bash
+atlas sync {diff['run']['path'].stem} --apply-req
+```
+
+Or manually edit: {req_path}
+"""
     
-            if expected_prefix == "RUN":
-                brief_id = meta.get("Brief")
-                run_status = meta.get("Status")
-                completed = meta.get("Completed")
-                if brief_id and run_status:
-                    run_brief_statuses.append(
-                        (file_id, brief_id, run_status, parse_completed_date(completed))
-                    )
-                if file_id.startswith("RUN-BRIEF-") and not brief_id:
-                    print(f"[WARN] Missing Brief reference: {path}")
-                    issues += 1
-    
-            if not meta_id:
-                print(f"[ERR] Missing meta ID: {path}")
-                issues += 1
-            if not header_id:
-                print(f"[ERR] Missing header ID: {path}")
-                issues += 1
-    
-            pattern = {
-                "REQ": REQ_ID_PATTERN,
-                "RULE": RULE_ID_PATTERN,
-                "ADR": ADR_ID_PATTERN,
-                "CQ": CQ_ID_PATTERN,
-                "BRIEF": BRIEF_ID_PATTERN,
-                "RUN": RUN_ID_PATTERN,
-            }[expected_prefix]
-    
-            if not pattern.match(file_id):
-                print(f"[ERR] Invalid filename for {expected_prefix}: {path}")
-                issues += 1
-    
-            if meta_id and meta_id != file_id:
-                print(f"[ERR] Meta ID mismatch: {path}")
-                issues += 1
-            if header_id and header_id != file_id:
-                print(f"[ERR] Header ID mismatch: {path}")
-                issues += 1
-    
-            if expected_prefix in {"REQ", "RULE"}:
-                must_read = meta.get("Must-Read")
-                if must_read is None:
-                    print(f"[ERR] Missing Must-Read: {path}")
-                    issues += 1
-                else:
-                    ids = parse_must_read(must_read)
-                    if not ids and must_read.strip().lower() != "none":
-                        print(f"[ERR] Empty Must-Read: {path}")
-                        issues += 1
-                    for ref_id in ids:
-                        prefix = ref_id.split("-", 1)[0]
-                        if prefix not in ALLOWED_MUST_READ_PREFIXES:
-                            print(f"[ERR] Must-Read disallowed ID: {path} -> {ref_id}")
-                            issues += 1
-                        if ref_id not in all_ids:
-                            print(f"[ERR] Must-Read missing target: {path} -> {ref_id}")
-                            issues += 1
-    
-            if expected_prefix == "REQ":
-                status = meta.get("Status", "")
-                implemented_git = meta.get("Implemented-Git", "").strip()
-                if normalize_status(status) == "implemented" and (not implemented_git or implemented_git == "-"):
-                    print(f"[WARN] Implemented REQ missing git hash: {path}")
-                    issues += 1
-    
-            if args.links:
-                for target in iter_links(text):
-                    if not target or target.startswith("#"):
-                        continue
-                    if re.match(r"^[a-zA-Z][a-zA-Z0-9+.-]*:", target):
-                        continue
-                    resolved = (path.parent / target).resolve()
-                    if not resolved.exists():
-                        print(f"[ERR] Broken link: {path} -> {target}")
-                        issues += 1
-    
-        # View -> REQ link validation
-        view_refs: set[str] = set()
-        for path in iter_md_files([VIEWS_DIR]):
-            text = read_text(path)
-            index_refs = extract_view_references(text)
-            summary_refs = extract_view_summary_refs(text)
-            ssot_refs = extract_view_ssot_refs(text)
-            summary_lines = extract_section_lines(text, "Summary")
-    
-            if not index_refs:
-                print(f"[WARN] View missing References (SSOT index): {path}")
-                issues += 1
-    
-            if not ssot_refs:
-                print(f"[WARN] View missing SSOT meta: {path}")
-                issues += 1
+    txn.lock(patch_path)
+    txn.write(patch_path, content)
+    print(f"[OK] Created patch: {patch_path}")
+    return patch_path
+
+
+def apply_req_changes(diff: dict, txn: Transaction) -> bool:
+    """Apply changes to REQ document (with warning)."""
+    if not diff["req"] or not diff["req"]["changes"]:
+        return False
+    
+    print("[WARN] Modifying REQ document (authority document)")
+    req_path = diff["req"]["path"]
+    txn.lock(req_path)
+    req = Document.load(req_path, txn)
+    # For now, just update status if RUN is completed
+    run_changes = diff["run"]["changes"]
+    for change in run_changes:
+        if change["type"] == "status" and change["to"] == "Completed":
+            req.set_meta("Status", "Implemented")
+    req.save(req_path, txn)
+    print(f"[OK] Updated {req_path}")
+    return True
+
+
+def init_command(_args: argparse.Namespace) -> int:
+    overwrite = getattr(_args, "overwrite", False)
+    ensure_dir(ATLAS_ROOT)
+    for d in [
+        REQ_DIR,
+        RULE_DIR,
+        ADR_DIR,
+        CQ_DIR,
+        VIEWS_DIR,
+        INBOX_DIR,
+        DRAFTS_DIR,
+        BRIEF_DIR,
+        RUN_DIR,
+        ARCHIVE_DIR,
+        TEMPLATES_DIR,
+        STATE_DIR,
+        SYSTEM_ROOT / "prompts",
+        SYSTEM_ROOT / "src",
+    ]:
+        ensure_dir(d)
+
+    for path, content in load_default_top_docs().items():
+        if overwrite or not path.exists():
+            write_text(path, content)
+
+    for name, content in load_default_templates().items():
+        template_path = TEMPLATES_DIR / name
+        if overwrite or not template_path.exists():
+            write_text(template_path, content)
+
+    prompts_dir = SYSTEM_ROOT / "prompts"
+    for name, content in load_default_prompts().items():
+        prompt_path = prompts_dir / name
+        if overwrite or not prompt_path.exists():
+            write_text(prompt_path, content)
+            print(f"[OK] Created {prompt_path}")
+
+    for name, content in load_default_system_files().items():
+        system_path = SYSTEM_ROOT / name
+        if overwrite or not system_path.exists():
+            write_text(system_path, content)
+            print(f"[OK] Created {system_path}")
+
+    src_dir = SYSTEM_ROOT / "src"
+    for name, content in load_default_src_files().items():
+        src_path = src_dir / name
+        if overwrite or not src_path.exists():
+            write_text(src_path, content)
+            print(f"[OK] Created {src_path}")
+
+    if not LAST_RUN_PATH.exists():
+        write_last_run({"stage": "idle", "updated_at": now_iso()})
+
+    print("[OK] Atlas structure initialized.")
+    print("[INFO] Run the prompt in .atlas/.system/prompts/onboarding.md to complete setup.")
+    return 0
+
+
+def create_brief_doc(text: str, domain: str) -> Path:
+    brief_id = next_id("BRIEF", domain, BRIEF_DIR, BRIEF_ID_PATTERN)
+    path = BRIEF_DIR / f"{brief_id}.md"
+    ensure_dir(BRIEF_DIR)
+    write_text(path, render_brief(brief_id, text, domain))
+    return path
+
+
+def render_brief(brief_id: str, text: str, domain: str) -> str:
+    title = derive_title(text)
+    return f"""# [{brief_id}] {title}
+
+> **ID**: {brief_id}
+> **Domain**: {domain}
+> **Status**: Active
+> **Date**: {now_date()}
+
+## 1. User Request
+{text.strip()}
+
+## 2. Intent Summary
+- Goal: 
+- Problem: 
+
+## 3. Affected Artifacts
+- Create: 
+- Modify: 
+- Read: 
+
+## 4. Proposed Changes
+1. 
+2. 
+
+## 5. Verification Criteria
+- [ ] 
+"""
+
+
+def capture_command(args: argparse.Namespace) -> int:
+    domain = args.domain.upper()
+    source = getattr(args, "from_file", None)
+    if source is not None:
+        if args.text:
+            print("[ERR] Give either text or --from-file, not both.")
+            return 1
+        return capture_from_file(source, domain, args.to == "brief", args.format, args.batch_size)
+    text = (args.text or "").strip()
+    if not text:
+        print("[ERR] Empty input.")
+        return 1
+
+    created, brief_path = capture_text(text, domain, getattr(args, "to", None) == "brief")
+    if brief_path is not None:
+        print(f"[OK] Created {brief_path}")
+    for req_path, view_path in created:
+        print(f"[OK] Updated {req_path}")
+        print(f"[OK] Updated {view_path}")
+    return 0
+
+
+def capture_text(text: str, domain: str, to_brief: bool) -> tuple[list[tuple[Path, Path]], Optional[Path]]:
+    """Capture one request; returns the (REQ, view) paths touched and the BRIEF created, if any."""
+    title = derive_title(text)
+    req_ids = [rid for rid in extract_ids_from_text(text) if rid.startswith("REQ-")]
+    if not req_ids:
+        req_ids = [next_id("REQ", domain, REQ_DIR, REQ_ID_PATTERN)]
+
+    created = []
+    for req_id in req_ids:
+        if not REQ_ID_PATTERN.match(req_id):
+            print(f"[WARN] Skipping invalid REQ ID: {req_id}")
+            continue
+        create_req_stub(req_id, title=title)
+        req_path = REQ_DIR / f"{req_id}.md"
+        if req_path.exists():
+            append_capture_note(req_path, text)
+        view_path = ensure_view_doc(req_id, title)
+        created.append((req_path, view_path))
+
+    brief_path = create_brief_doc(text, domain) if to_brief else None
+    return created, brief_path
+
+
+# =============================================================================
+# Bulk capture
+# =============================================================================
+
+CAPTURE_BATCH_SIZE = 500
+DOMAIN_RE = LazyPattern(r"^[A-Z]+$")
+
+
+def iter_capture_records(handle, fmt: str) -> Iterator[tuple[int, Optional[dict]]]:
+    """Yield (line number, record) from a JSONL or CSV stream; unreadable lines are reported with record None."""
+    if fmt == "csv":
+        import csv
+
+        reader = csv.DictReader(handle)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_no, line in enumerate(handle, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            print(f"[WARN] Skipping line {line_no}: invalid JSON ({exc})")
+            yield line_no, None
+            continue
+        if isinstance(record, str):
+            record = {"text": record}
+        if not isinstance(record, dict):
+            print(f"[WARN] Skipping line {line_no}: expected an object or a string")
+            yield line_no, None
+            continue
+        yield line_no, record
+
+
+def capture_record_text(record: dict) -> str:
+    """A record's capture text: "text", or "title" and "body" joined like a pasted request."""
+    text = record.get("text")
+    if not text:
+        text = "\n\n".join(str(record[key]).strip() for key in ["title", "body"] if record.get(key))
+    return str(text or "").strip()
+
+
+def capture_from_file(source: str, domain: str, to_brief: bool, fmt: Optional[str], batch_size: int) -> int:
+    """Capture every record of a JSONL/CSV file (or stdin for "-") in this one process.
+
+    IDs are reserved per batch with one sequence-store update per domain,
+    templates are loaded once, and each batch is written with one group
+    flush (write_files) instead of an fsync per document.
+    """
+    from contextlib import nullcontext
+
+    fmt = fmt or ("csv" if source.lower().endswith(".csv") else "jsonl")
+    try:
+        handle = nullcontext(sys.stdin) if source == "-" else open(source, encoding="utf-8", newline="")
+    except OSError as exc:
+        print(f"[ERR] Cannot read {source}: {exc}")
+        return 1
+    templates = {"REQ": load_template("REQ.md"), "VIEW": load_template("VIEW.md")}
+    for path in [REQ_DIR, VIEWS_DIR] + ([BRIEF_DIR] if to_brief else []):
+        ensure_dir(path)
+
+    captured = 0
+    skipped = 0
+    batch: list[tuple[int, str, str]] = []
+    with handle as stream:
+        for line_no, record in iter_capture_records(stream, fmt):
+            if record is None:
+                skipped += 1
+                continue
+            text = capture_record_text(record)
+            item_domain = str(record.get("domain") or domain).strip().upper()
+            if not text or not DOMAIN_RE.match(item_domain):
+                reason = "empty text" if not text else f"invalid domain {item_domain!r}"
+                print(f"[WARN] Skipping line {line_no}: {reason}")
+                skipped += 1
+                continue
+            batch.append((line_no, text, item_domain))
+            if len(batch) >= batch_size:
+                done = capture_batch(batch, templates, to_brief)
+                captured += done
+                skipped += len(batch) - done
+                batch = []
+        if batch:
+            done = capture_batch(batch, templates, to_brief)
+            captured += done
+            skipped += len(batch) - done
+
+    suffix = f"; skipped {skipped}" if skipped else ""
+    print(f"[DONE] Captured {captured} item(s) from {source}{suffix}.")
+    return 1 if skipped else 0
+
+
+def capture_batch(batch: list[tuple[int, str, str]], templates: dict[str, str], to_brief: bool) -> int:
+    """Capture one batch of (line number, text, domain) items; returns how many were captured."""
+    from collections import Counter
+
+    captured = 0
+    fresh = []
+    for line_no, text, domain in batch:
+        if any(rid.startswith("REQ-") for rid in extract_ids_from_text(text)):
+            # Updates to existing REQs need the locked read-modify-write path.
+            try:
+                updated, _ = capture_text(text, domain, to_brief)
+            except OSError as exc:
+                print(f"[WARN] Skipping line {line_no}: {exc}")
+                continue
+            if updated:
+                captured += 1
+            else:
+                print(f"[WARN] Skipping line {line_no}: no valid REQ ID to update")
+        else:
+            fresh.append((line_no, text, domain))
+
+    # Fresh IDs are reserved in the sequence store, so no other writer can
+    # claim these paths and they need no per-document lock.
+    domains = Counter(domain for _, _, domain in fresh)
+    req_ids = {d: iter(next_ids("REQ", d, REQ_DIR, REQ_ID_PATTERN, n)) for d, n in domains.items()}
+    brief_ids = {}
+    if to_brief:
+        brief_ids = {d: iter(next_ids("BRIEF", d, BRIEF_DIR, BRIEF_ID_PATTERN, n)) for d, n in domains.items()}
+
+    files: list[tuple[Path, str]] = []
+    for line_no, text, domain in fresh:
+        req_id = next(req_ids[domain])
+        brief_id = next(brief_ids[domain]) if to_brief else ""
+        captured += 1
+        title = derive_title(text)
+        req_path = REQ_DIR / f"{req_id}.md"
+        view_path = VIEWS_DIR / f"{req_id}.md"
+        if req_path.exists() or view_path.exists():
+            create_req_stub(req_id, title=title)
+            append_capture_note(req_path, text)
+            ensure_view_doc(req_id, title)
+        else:
+            files.append((req_path, render_req_stub(req_id, title, templates["REQ"]).rstrip() + capture_block(text)))
+            files.append((view_path, render_view(req_id, title, templates["VIEW"])))
+        if to_brief and BRIEF_ID_PATTERN.match(brief_id):
+            files.append((BRIEF_DIR / f"{brief_id}.md", render_brief(brief_id, text, domain)))
+    if files:
+        write_files(files)
+
+    print(f"[OK] Captured {captured} item(s) (lines {batch[0][0]}-{batch[-1][0]})")
+    return captured
+
+
+def render_req_stub(req_id: str, title: str, template: str) -> str:
+    content = template.replace("REQ-XXX-001", req_id)
+    content = content.replace("# [REQ-XXX-001] Title", f"# [{req_id}] {title}")
+    content = content.replace("Domain**: XXX", f"Domain**: {req_id.split('-')[1]}")
+    return content.replace("Last Updated**: YYYY-MM-DD", f"Last Updated**: {now_date()}")
+
+
+def render_view(req_id: str, title: str, template: str) -> str:
+    content = template.replace("REQ-XXX-001", req_id)
+    content = content.replace("# [VIEW-REQ-XXX-001] Title", f"# [VIEW-{req_id}] {title}")
+    return content.replace("Last Updated**: YYYY-MM-DD", f"Last Updated**: {now_date()}")
+
+
+def capture_block(text: str) -> str:
+    return f"\n## Capture ({now_date()})\n{text.strip()}\n"
+
+
+def create_req_stub(req_id: str, title: Optional[str] = None) -> None:
+    path = REQ_DIR / f"{req_id}.md"
+    match = REQ_ID_PATTERN.match(req_id)
+    if not match:
+        return
+    domain = match.group(1)
+    content = render_req_stub(req_id, title or "Title", load_template("REQ.md"))
+    with doc_lock(path):
+        if path.exists():
+            return
+        write_text(path, content)
+    SequenceStore().observe("ids", f"REQ-{domain}", int(match.group(2)))
+
+
+def append_capture_note(path: Path, text: str) -> None:
+    note = text.strip()
+    if not note:
+        return
+    heading = f"Capture ({now_date()})"
+    with doc_lock(path):
+        doc = Document.load(path)
+        if doc.has_section(heading):
+            return
+        doc.append_section(heading, note)
+        doc.save(path)
+
+
+def ensure_view_doc(req_id: str, title: str) -> Path:
+    path = VIEWS_DIR / f"{req_id}.md"
+    with doc_lock(path):
+        if not path.exists():
+            write_text(path, render_view(req_id, title, load_template("VIEW.md")))
+            return path
+
+        content = read_text(path)
+        if req_id not in content:
+            if "## References (SSOT index)" not in content:
+                content = content.rstrip() + "\n\n## References (SSOT index)\n"
+            content = content.rstrip() + f"\n- {req_id}\n"
+            write_text(path, content)
+    return path
+
+
+def render_run(run_id: str, req_id: str) -> str:
+    return f"""# [{run_id}] Plan
+
+> **ID**: {run_id}
+> **REQ**: {req_id}
+> **Status**: Planned
+> **Started**: {now_date()}
+> **Git**: -
+> **Completed**: -
+
+## Target REQ
+- {req_id}
+
+## Plan
+- [ ] 
+
+## Verification
+- [ ] Test
+- [ ] Spec
+- [ ] Boundary
+
+## Output
+- (files created/modified)
+"""
+
+
+def prepare_run(req_id: str, step: Optional[int] = None) -> tuple[str, str, Path]:
+    """Validate req_id and allocate its RUN step; returns (req_id, run_id, run_path).
+
+    Raises ValueError with the reason when the REQ ID is invalid or missing.
+    """
+    if req_id.endswith(".md"):
+        req_id = Path(req_id).stem
+
+    match = REQ_ID_PATTERN.match(req_id)
+    if not match:
+        raise ValueError(f"Invalid REQ ID: {req_id}")
+
+    req_path = REQ_DIR / f"{req_id}.md"
+    if not req_path.exists():
+        raise ValueError(f"REQ not found: {req_path}")
+
+    domain = match.group(1)
+    number = match.group(2)
+    if step:
+        SequenceStore().observe("steps", req_id, int(step))
+    else:
+        step = next_run_step(req_id)
+    run_id = f"RUN-REQ-{domain}-{number}-step-{int(step):02d}"
+    return req_id, run_id, RUN_DIR / f"{run_id}.md"
+
+
+def read_batch_ids(ids: list[str], source: Optional[str]) -> Optional[list[str]]:
+    """IDs from the command line followed by those in source (one or more per line, "-" for stdin)."""
+    ids = list(ids)
+    if not source:
+        return ids
+    try:
+        if source == "-":
+            lines = sys.stdin.read().splitlines()
+        else:
+            lines = read_text(Path(source)).splitlines()
+    except OSError as exc:
+        print(f"[ERR] Cannot read {source}: {exc}")
+        return None
+    for line in lines:
+        line = line.split("#", 1)[0]
+        ids.extend(token for token in line.replace(",", " ").split() if token)
+    return ids
+
+
+def print_batch_summary(headers: tuple[str, str, str], rows: list[tuple[str, str, str]], ok: int) -> None:
+    """Print one row per ID as a fixed-width table, then the success count."""
+    widths = [max(len(row[i]) for row in [headers, *rows]) for i in range(2)]
+    for row in [headers, *rows]:
+        print(f"{row[0]:<{widths[0]}}  {row[1]:<{widths[1]}}  {row[2]}")
+    print(f"[DONE] {ok} of {len(rows)} succeeded.")
+
+
+def run_command(args: argparse.Namespace) -> int:
+    req_ids = read_batch_ids(args.req_ids, getattr(args, "from_file", None))
+    if req_ids is None:
+        return 1
+    if not req_ids:
+        print("[ERR] No REQ IDs given.")
+        return 1
+    step = getattr(args, "step", None)
+    if len(req_ids) > 1:
+        if step:
+            print("[ERR] --step needs exactly one REQ ID.")
+            return 1
+        return run_batch(req_ids)
+
+    try:
+        req_id, run_id, run_path = prepare_run(req_ids[0], step)
+    except ValueError as exc:
+        print(f"[ERR] {exc}")
+        return 1
+    with doc_lock(run_path):
+        if run_path.exists():
+            print(f"[ERR] RUN already exists: {run_path}")
+            return 1
+        write_text(run_path, render_run(run_id, req_id))
+
+    append_run_event("created", run_id, req_id=req_id)
+    write_last_run(
+        {
+            "run_id": run_id,
+            "req_id": req_id,
+            "stage": "executing",
+            "updated_at": now_iso(),
+        }
+    )
+
+    print(f"[OK] Created {run_path}")
+    return 0
+
+
+def run_batch(req_ids: list[str]) -> int:
+    """Create one RUN per REQ ID (repeats get consecutive steps) with one group flush."""
+    rows: list[Optional[tuple[str, str, str]]] = []
+    planned: list[tuple[int, str, str, Path]] = []
+    for raw in req_ids:
+        try:
+            req_id, run_id, run_path = prepare_run(raw)
+        except ValueError as exc:
+            rows.append((raw, "-", str(exc)))
+            continue
+        planned.append((len(rows), req_id, run_id, run_path))
+        rows.append(None)
+
+    created: list[tuple[str, str]] = []
+    with doc_lock(*[run_path for _, _, _, run_path in planned]):
+        files = []
+        for row, req_id, run_id, run_path in planned:
+            if run_path.exists():
+                rows[row] = (req_id, run_id, "RUN already exists")
+                continue
+            files.append((run_path, render_run(run_id, req_id)))
+            rows[row] = (req_id, run_id, "created")
+            created.append((req_id, run_id))
+        if files:
+            write_files(files)
+
+    for req_id, run_id in created:
+        append_run_event("created", run_id, req_id=req_id)
+    if created:
+        req_id, run_id = created[-1]
+        write_last_run({"run_id": run_id, "req_id": req_id, "stage": "executing", "updated_at": now_iso()})
+
+    print_batch_summary(("REQ", "RUN", "Result"), rows, len(created))
+    return 0 if len(created) == len(rows) else 1
+
+
+def plan_command(args: argparse.Namespace) -> int:
+    print("[WARN] 'plan' is deprecated. Use 'run' instead.")
+    args.req_ids = [args.brief_id]
+    return run_command(args)
+
+
+def finish_command(args: argparse.Namespace) -> int:
+    run_ids = read_batch_ids(args.run_ids, getattr(args, "from_file", None))
+    if run_ids is None:
+        return 1
+    if not run_ids:
+        print("[ERR] No RUN IDs given.")
+        return 1
+
+    # (RUN ID, error) in input order; error is None for RUNs to finish.
+    results: list[tuple[str, Optional[str]]] = []
+    runs: list[tuple[str, Path]] = []
+    for run_id in run_ids:
+        if run_id.endswith(".md"):
+            run_id = Path(run_id).stem
+        run_path = RUN_DIR / f"{run_id}.md"
+        if not RUN_ID_PATTERN.match(run_id):
+            error = f"Invalid RUN ID: {run_id}"
+        elif not run_path.exists():
+            error = f"RUN not found: {run_path}"
+        elif any(run_id == seen for seen, _ in runs):
+            error = "Duplicate RUN ID"
+        else:
+            runs.append((run_id, run_path))
+            results.append((run_id, None))
+            continue
+        if len(run_ids) == 1:
+            print(f"[ERR] {error}")
+            return 1
+        results.append((run_id, error))
+
+    # Resolved once for the whole batch.
+    git_hash = args.git
+    if not git_hash:
+        git_hash = detect_git_hash()
+    if not git_hash:
+        print("[ERR] Missing git hash. Provide --git or ensure git is available.")
+        return 1
+
+    verbose = len(run_ids) == 1
+    finished = finish_runs(runs, git_hash, args.success, verbose) if runs else {}
+    event = "finished" if args.success else "failed"
+    for run_id, _ in runs:
+        append_run_event(event, run_id, git=git_hash)
+
+    if verbose:
+        print(f"[OK] Updated {runs[0][1]}")
+        return 0
+    status = "Completed" if args.success else "Failed"
+    rows = [
+        (run_id, "-", error) if error else (run_id, finished.get(run_id) or "-", status)
+        for run_id, error in results
+    ]
+    print_batch_summary(("RUN", "REQ", "Status"), rows, len(runs))
+    return 0 if len(runs) == len(rows) else 1
+
+
+def finish_runs(runs: list[tuple[str, Path]], git_hash: str, success: bool, verbose: bool) -> dict[str, Optional[str]]:
+    """Mark runs finished and update their BRIEFs and REQs in one transaction.
+
+    Locks are taken a layer at a time (every RUN, then every BRIEF, then
+    every REQ), the order all commands use. Returns RUN ID -> REQ ID.
+    """
+    status = "Completed" if success else "Failed"
+    linked: dict[str, Optional[str]] = {}
+    # RUN, BRIEF, REQ and last_run.json are staged and written as one
+    # transaction; the RUNs stay locked until then, so a concurrent finish or
+    # sync of the same RUN cannot interleave with this one.
+    with Transaction("finish") as txn:
+        txn.lock(*[run_path for _, run_path in runs])
+        briefs: dict[str, str] = {}
+        for run_id, run_path in runs:
+            run = Document.load(run_path, txn)
+            meta = run.meta
+            brief_id = meta.get("Brief")
+            linked[run_id] = meta.get("REQ") or req_id_from_run_id(run_id)
+            run.set_meta("Status", status)
+            run.set_meta("Git", git_hash)
+            run.set_meta("Completed", now_date())
+            run.save(run_path, txn)
+            if brief_id:
+                briefs[run_id] = brief_id
+
+        txn.lock(*[BRIEF_DIR / f"{brief_id}.md" for brief_id in briefs.values() if BRIEF_ID_PATTERN.match(brief_id)])
+        for brief_id in briefs.values():
+            if update_brief_status(brief_id, status, txn) and verbose:
+                print(f"[OK] Updated {BRIEF_DIR / f'{brief_id}.md'}")
+
+        txn.lock(*[REQ_DIR / f"{req_id}.md" for req_id in linked.values() if req_id])
+        for run_id, req_id in linked.items():
+            if not req_id:
+                continue
+            req_path = REQ_DIR / f"{req_id}.md"
+            if req_path.exists():
+                req = Document.load(req_path, txn)
+                req.set_meta("Implemented-Git", git_hash)
+                req.set_meta("Linked-RUN", run_id)
+                req.set_meta("Last Updated", now_date())
+                req.save(req_path, txn)
+                if verbose:
+                    print(f"[OK] Updated {req_path}")
+
+        run_id = runs[-1][0]
+        last_run_state = {
+            "run_id": run_id,
+            "stage": "finished",
+            "git_hash": git_hash,
+            "completed_at": now_iso(),
+        }
+        if run_id in briefs:
+            last_run_state["brief_id"] = briefs[run_id]
+        if linked[run_id]:
+            last_run_state["req_id"] = linked[run_id]
+        write_last_run(last_run_state, txn)
+    return linked
+
+
+def sync_command(args: argparse.Namespace) -> int:
+    """Sync RUN status to BRIEF/REQ documents."""
+    run_id = args.run_id
+    if run_id.endswith(".md"):
+        run_id = Path(run_id).stem
+
+    if not RUN_ID_PATTERN.match(run_id):
+        print(f"[ERR] Invalid RUN ID: {run_id}")
+        return 1
+
+    run_path = RUN_DIR / f"{run_id}.md"
+    if not run_path.exists():
+        print(f"[ERR] RUN not found: {run_path}")
+        return 1
+
+    # Generate diff
+    diff = generate_sync_diff(run_path)
     
-            for ref_id in ssot_refs:
-                if ref_id not in index_refs:
-                    print(f"[WARN] SSOT ref not in SSOT index: {path} -> {ref_id}")
-                    issues += 1
-                ref_path = REQ_DIR / f"{ref_id}.md"
-                if not ref_path.exists():
-                    print(f"[WARN] SSOT ref missing REQ: {path} -> {ref_id}")
-                    issues += 1
+    # Always print diff (dry-run info)
+    print_sync_diff(diff)
     
-            for ref_id in index_refs:
-                ref_path = REQ_DIR / f"{ref_id}.md"
-                if not ref_path.exists():
-                    print(f"[WARN] View refs missing REQ: {path} -> {ref_id}")
-                    issues += 1
+    # Check if any apply flags are set
+    apply_brief = getattr(args, "apply_brief", False)
+    apply_req = getattr(args, "apply_req", False)
+    write_patch = getattr(args, "write_req_patch", False)
     
-            for ref_id in summary_refs:
-                if ref_id not in index_refs:
-                    print(f"[WARN] Summary ref not in SSOT index: {path} -> {ref_id}")
-                    issues += 1
-                ref_path = REQ_DIR / f"{ref_id}.md"
-                if not ref_path.exists():
-                    print(f"[WARN] Summary ref missing REQ: {path} -> {ref_id}")
-                    issues += 1
+    if not (apply_brief or apply_req or write_patch):
+        print("\n[INFO] Dry-run mode. Use --apply-brief, --write-req-patch, or --apply-req to make changes.")
+        return 0
     
-            for line in summary_lines:
-                if "<!--" in line:
+    event = None
+    with Transaction("sync") as txn:
+        txn.lock(run_path)
+        # Apply RUN changes (always when any apply flag is set)
+        if diff["run"]["changes"]:
+            run = Document.load(run_path, txn)
+            for change in diff["run"]["changes"]:
+                if change["type"] == "status":
+                    run.set_meta("Status", change["to"])
+                    event = RUN_STATUS_EVENTS.get(normalize_status(change["to"]))
+            run.save(run_path, txn)
+            print(f"[OK] Updated {run_path}")
+
+        # Apply BRIEF changes
+        if apply_brief:
+            apply_brief_changes(diff, txn)
+
+        # Apply REQ changes (with warning)
+        if apply_req:
+            apply_req_changes(diff, txn)
+
+        # Write REQ patch (locked last, after the REQ, like every other command)
+        if write_patch:
+            write_req_patch(diff, txn)
+
+    if event:
+        append_run_event(event, run_id)
+    return 0
+
+
+def iter_links(text: str) -> list[str]:
+    links = []
+    in_code = False
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            in_code = not in_code
+            continue
+        if in_code:
+            continue
+        for match in LINK_RE.finditer(line):
+            links.append(match.group(1).strip())
+    return links
+
+
+DOC_FOLDER_PREFIXES = {
+    "req": "REQ",
+    "rule": "RULE",
+    "adr": "ADR",
+    "cq": "CQ",
+    "brief": "BRIEF",
+    "runs": "RUN",
+}
+
+DOC_ID_PATTERNS = {
+    "REQ": REQ_ID_PATTERN,
+    "RULE": RULE_ID_PATTERN,
+    "ADR": ADR_ID_PATTERN,
+    "CQ": CQ_ID_PATTERN,
+    "BRIEF": BRIEF_ID_PATTERN,
+    "RUN": RUN_ID_PATTERN,
+}
+
+URI_SCHEME_RE = LazyPattern(r"^[a-zA-Z][a-zA-Z0-9+.-]*:")
+
+# Check groups accepted by validate(). "links" and "git" are opt-in, like
+# doctor --links and doctor --verify-git.
+CHECKS = ("layout", "documents", "links", "views", "coverage", "runs", "git", "last_run")
+DEFAULT_CHECKS = frozenset(CHECKS) - {"links", "git"}
+# Per-document results are cached only for the full per-document check set.
+CACHED_CHECKS = frozenset({"documents", "views"})
+
+SEVERITY_LABELS = {"error": "ERR", "warning": "WARN", "notice": "WARN", "info": "INFO"}
+COUNTED_SEVERITIES = {"error", "warning"}
+
+
+class Issue(NamedTuple):
+    """One validation finding.
+
+    severity is "error" or "warning" (both count towards doctor's exit
+    status), "notice" (shown as a warning, not counted) or "info".
+    path is the offending document and target the referenced ID or link,
+    when there is one.
+    """
+
+    code: str
+    severity: str
+    message: str
+    path: Optional[str] = None
+    target: Optional[str] = None
+
+    @property
+    def counted(self) -> bool:
+        return self.severity in COUNTED_SEVERITIES
+
+    def render(self) -> str:
+        return f"[{SEVERITY_LABELS.get(self.severity, self.severity.upper())}] {self.message}"
+
+    def to_dict(self) -> dict:
+        return self._asdict()
+
+
+# =============================================================================
+# Schema plans
+# =============================================================================
+
+# Used when a workspace has no schemas.json/workflow.json: only the identity,
+# Must-Read and git-evidence rules doctor has always applied.
+BUILTIN_SCHEMAS = {
+    "id_patterns": {
+        "req": REQ_ID_PATTERN.pattern,
+        "rule": RULE_ID_PATTERN.pattern,
+        "adr": ADR_ID_PATTERN.pattern,
+        "cq": CQ_ID_PATTERN.pattern,
+        "brief": BRIEF_ID_PATTERN.pattern,
+        "run": RUN_ID_PATTERN.pattern,
+    },
+    "document_types": {
+        "req": {"required_meta": ["ID", "Must-Read"]},
+        "rule": {"required_meta": ["ID", "Must-Read"]},
+        "adr": {"required_meta": ["ID"]},
+        "cq": {"required_meta": ["ID"]},
+        "brief": {"required_meta": ["ID", "Status"]},
+        "run": {"folder": "runs", "required_meta": ["ID"]},
+    },
+}
+BUILTIN_WORKFLOW = {
+    "completion_rules": {
+        "req_implemented": {
+            "type": "req",
+            "status": "Implemented",
+            "required_fields": ["Implemented-Git"],
+            "message": "Implemented REQ missing git hash",
+        },
+    },
+}
+
+# Severity of each schema rule unless schemas.json "validation_rules" overrides it.
+DEFAULT_RULE_SEVERITIES = {
+    "required_meta": "error",
+    "required_sections": "warning",
+    "status_value_valid": "error",
+    "date_format": "warning",
+    "completion_fields": "warning",
+    "link_type_correct": "warning",
+    "link_outbound_allowed": "warning",
+    "self_reference": "warning",
+    "domain_known": "warning",
+}
+DEFAULT_DATE_PATTERN = r"^\d{4}-\d{2}-\d{2}$"
+SCHEMA_VERSION = 2
+SECTION_NUMBER_RE = LazyPattern(r"^\d+\.\s*")
+
+
+def section_name(heading: str) -> str:
+    """Normalise a "## 1. User Request" heading to "user request"."""
+    return SECTION_NUMBER_RE.sub("", heading[3:].strip()).lower()
+
+
+class TypePlan(NamedTuple):
+    """Compiled checks for one document type (one .atlas/ folder)."""
+
+    doc_type: str
+    prefix: str
+    id_pattern: re.Pattern
+    required_meta: tuple[str, ...]
+    required_sections: tuple[str, ...]
+    section_titles: tuple[str, ...]
+    statuses: Optional[frozenset[str]]
+    date_fields: tuple[str, ...]
+    completion: tuple[tuple[str, tuple[str, ...], str], ...]
+    allowed_outbound: Optional[frozenset[str]]
+    self_reference: bool
+    known_domains: Optional[frozenset[str]]
+
+
+class SchemaPlan(NamedTuple):
+    """schemas.json + workflow.json compiled into per-folder TypePlans."""
+
+    digest: str
+    types: dict[str, TypePlan]
+    severities: dict[str, str]
+    date_pattern: re.Pattern
+    note: str = ""
+
+    def for_path(self, path: Path) -> Optional[TypePlan]:
+        return self.types.get(path.parent.name)
+
+    def folder_of(self, prefix: str) -> Optional[str]:
+        for folder, plan in self.types.items():
+            if plan.prefix == prefix:
+                return folder
+        return None
+
+
+def compile_schema_plan(schemas: dict, workflow: dict, digest: str = "", note: str = "") -> SchemaPlan:
+    rules = schemas.get("validation_rules", {})
+    severities = dict(DEFAULT_RULE_SEVERITIES)
+    for name, rule in rules.items():
+        if isinstance(rule, dict) and rule.get("severity"):
+            severities[name] = rule["severity"]
+    date_rule = rules.get("date_format", {})
+    date_fields = tuple(date_rule.get("fields", []))
+
+    domains = schemas.get("domains", {})
+    known_domains = None
+    if domains and not domains.get("allow_unknown", True):
+        known_domains = frozenset(domains.get("known", []))
+
+    states = workflow.get("states", {})
+    completion: dict[str, list[tuple[str, tuple[str, ...], str]]] = {}
+    for rule in workflow.get("completion_rules", {}).values():
+        if rule.get("type") and rule.get("status"):
+            completion.setdefault(rule["type"], []).append(
+                (normalize_status(rule["status"]), tuple(rule.get("required_fields", [])), rule.get("message", ""))
+            )
+
+    # Only folders doctor indexes get plans; types the schema leaves out keep the built-in rules.
+    types_by_name = {
+        name: spec
+        for name, spec in schemas.get("document_types", {}).items()
+        if spec.get("folder", name) in DOC_FOLDER_PREFIXES
+    }
+    folders = {name: spec.get("folder", name) for name, spec in types_by_name.items()}
+    for name, spec in BUILTIN_SCHEMAS["document_types"].items():
+        if spec.get("folder", name) not in folders.values():
+            types_by_name[name] = spec
+            folders[name] = spec.get("folder", name)
+    types: dict[str, TypePlan] = {}
+    for name, spec in types_by_name.items():
+        folder = folders[name]
+        prefix = DOC_FOLDER_PREFIXES[folder]
+        pattern = schemas.get("id_patterns", {}).get(name) or DOC_ID_PATTERNS[prefix].pattern
+        link_rules = spec.get("link_rules", {})
+        outbound = link_rules.get("allowed_outbound")
+        values = states.get(name, {}).get("values")
+        types[folder] = TypePlan(
+            doc_type=name,
+            prefix=prefix,
+            id_pattern=re.compile(pattern),
+            required_meta=tuple(field for field in spec.get("required_meta", []) if field != "ID"),
+            required_sections=tuple(section.lower() for section in spec.get("required_sections", [])),
+            section_titles=tuple(spec.get("required_sections", [])),
+            statuses=frozenset(normalize_status(v) for v in values) if values else None,
+            date_fields=date_fields,
+            completion=tuple(completion.get(name, [])),
+            allowed_outbound=frozenset(folders.get(t, t) for t in outbound) if outbound is not None else None,
+            self_reference=link_rules.get("self_reference", True),
+            known_domains=known_domains,
+        )
+    return SchemaPlan(digest, types, severities, re.compile(date_rule.get("pattern", DEFAULT_DATE_PATTERN)), note)
+
+
+_SCHEMA_PLANS: dict[str, SchemaPlan] = {}
+
+
+def load_schema_plan() -> SchemaPlan:
+    """Compiled plan for the workspace's schema files, memoised by their content hash.
+
+    Schema files older than version 2 described fields doctor never checked,
+    so they are ignored in favour of the built-in rules (with a notice).
+    """
+    import hashlib
+
+    raw = []
+    for path in [SCHEMAS_PATH, WORKFLOW_PATH]:
+        try:
+            raw.append(path.read_bytes())
+        except OSError:
+            raw.append(b"")
+    digest = hashlib.sha256(b"\0".join(raw)).hexdigest()
+    plan = _SCHEMA_PLANS.get(digest)
+    if plan is not None:
+        return plan
+    note = ""
+    try:
+        schemas = json.loads(raw[0]) if raw[0] else BUILTIN_SCHEMAS
+        workflow = json.loads(raw[1]) if raw[1] else BUILTIN_WORKFLOW
+    except ValueError as exc:
+        note = f"Invalid schema file ({exc}); using built-in rules."
+        schemas, workflow = BUILTIN_SCHEMAS, BUILTIN_WORKFLOW
+    else:
+        if raw[0] and schemas.get("version", 1) < SCHEMA_VERSION:
+            note = f"{SCHEMAS_PATH} predates schema version {SCHEMA_VERSION}; using built-in rules."
+            schemas, workflow = BUILTIN_SCHEMAS, BUILTIN_WORKFLOW
+    plan = _SCHEMA_PLANS[digest] = compile_schema_plan(schemas, workflow, digest, note)
+    return plan
+
+
+def is_local_link(target: str) -> bool:
+    return bool(target) and not target.startswith("#") and not URI_SCHEME_RE.match(target)
+
+
+def link_key(doc_key: str, target: str) -> str:
+    """Lexically resolve a relative link against the linking document's index key."""
+    return posixpath.normpath(posixpath.join(posixpath.dirname(doc_key), target))
+
+
+# The default filesystems on macOS and Windows match names regardless of case.
+CASE_INSENSITIVE_FS = sys.platform in ("darwin", "win32")
+
+
+def fold_case(key: str) -> str:
+    """Key as the filesystem compares it: case-folded where names are case-insensitive."""
+    return key.casefold() if CASE_INSENSITIVE_FS else key
+
+
+class LinkResolver:
+    """Resolves relative links against one directory walk of .atlas/.
+
+    Links are normalised lexically and looked up in the set of existing
+    paths, so checking a link costs no syscalls. Only links that leave
+    .atlas/ fall back to symlink-aware Path.resolve()/exists(). existing
+    holds fold_case() keys, so Foo.md finds foo.md where the filesystem
+    would.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        root = root or ATLAS_ROOT
+        self.existing: set[str] = set()
+        self._doc: tuple[Optional[Path], str] = (None, "")
+        for dirpath, dirnames, filenames in os.walk(root):
+            rel = os.path.relpath(dirpath, root)
+            base = "" if rel == os.curdir else rel.replace(os.sep, "/") + "/"
+            self.existing.update(fold_case(base + name) for name in dirnames)
+            self.existing.update(fold_case(base + name) for name in filenames)
+
+    def key(self, path: Path, target: str) -> Optional[str]:
+        """Index-style key of the link target, or None if it points outside .atlas/."""
+        # Links of one document are checked back to back; remember its key.
+        if self._doc[0] is not path:
+            self._doc = (path, DocIndex.key(path))
+        key = link_key(self._doc[1], target)
+        if key == ".." or key.startswith(("../", "/")) or ":" in key.split("/", 1)[0]:
+            return None
+        return key
+
+    def is_broken(self, path: Path, target: str, within: Optional[Path] = None) -> bool:
+        """True if target does not exist (and, when within is given, lies under it)."""
+        key = self.key(path, target)
+        if key is None:
+            resolved = (path.parent / target).resolve()
+            if within is not None and not is_relative_to(resolved, within):
+                return False
+            return not resolved.exists()
+        if within is not None:
+            base = DocIndex.key(within)
+            if key != base and not key.startswith(base + "/"):
+                return False
+        return key != "." and fold_case(key) not in self.existing
+
+
+def check_layout() -> Iterable[Issue]:
+    required_dirs = [
+        REQ_DIR,
+        RULE_DIR,
+        ADR_DIR,
+        CQ_DIR,
+        VIEWS_DIR,
+        INBOX_DIR,
+        DRAFTS_DIR,
+        BRIEF_DIR,
+        RUN_DIR,
+        ARCHIVE_DIR,
+        SYSTEM_ROOT,
+        TEMPLATES_DIR,
+        STATE_DIR,
+    ]
+    for path in required_dirs:
+        if not path.exists():
+            yield Issue("missing-directory", "error", f"Missing directory: {path}", str(path))
+
+    for path in REQUIRED_TOP_DOCS:
+        if not path.exists():
+            yield Issue("missing-top-doc", "error", f"Missing top doc: {path}", str(path))
+
+    for path in OPTIONAL_TOP_DOCS:
+        if not path.exists():
+            yield Issue("missing-optional-doc", "notice", f"Missing optional doc: {path}", str(path))
+
+
+def check_document(path: Path, record: dict, all_ids: set[str], plan: SchemaPlan) -> Iterable[Issue]:
+    """Per-document checks: ID consistency, Must-Read, git evidence and the schema rules."""
+    type_plan = plan.for_path(path)
+    if type_plan is None:
+        return
+    expected_prefix = type_plan.prefix
+    severity = plan.severities
+    meta = record["meta"]
+    meta_id = meta.get("ID")
+    header_id = record["header_id"]
+    file_id = path.stem
+    where = str(path)
+
+    for field in type_plan.required_meta:
+        if not meta.get(field):
+            yield Issue("missing-meta", severity["required_meta"], f"Missing {field}: {path}", where, field)
+
+    if expected_prefix == "RUN" and file_id.startswith("RUN-BRIEF-") and not meta.get("Brief"):
+        yield Issue("missing-brief-ref", "warning", f"Missing Brief reference: {path}", where)
+
+    if not meta_id:
+        yield Issue("missing-meta-id", "error", f"Missing meta ID: {path}", where)
+    if not header_id:
+        yield Issue("missing-header-id", "error", f"Missing header ID: {path}", where)
+
+    if not type_plan.id_pattern.match(file_id):
+        yield Issue("invalid-filename", "error", f"Invalid filename for {expected_prefix}: {path}", where)
+
+    if meta_id and meta_id != file_id:
+        yield Issue("meta-id-mismatch", "error", f"Meta ID mismatch: {path}", where, meta_id)
+    if header_id and header_id != file_id:
+        yield Issue("header-id-mismatch", "error", f"Header ID mismatch: {path}", where, header_id)
+
+    must_read = meta.get("Must-Read")
+    if must_read is not None and expected_prefix in {"REQ", "RULE"}:
+        ids = parse_must_read(must_read)
+        if not ids and must_read.strip().lower() != "none":
+            yield Issue("empty-must-read", "error", f"Empty Must-Read: {path}", where)
+        for ref_id in ids:
+            prefix = ref_id.split("-", 1)[0]
+            if prefix not in ALLOWED_MUST_READ_PREFIXES:
+                yield Issue(
+                    "must-read-disallowed", "error",
+                    f"Must-Read disallowed ID: {path} -> {ref_id}", where, ref_id,
+                )
+            if ref_id not in all_ids:
+                yield Issue(
+                    "must-read-missing-target", "error",
+                    f"Must-Read missing target: {path} -> {ref_id}", where, ref_id,
+                )
+
+    status = meta.get("Status", "")
+    if status and type_plan.statuses is not None and normalize_status(status) not in type_plan.statuses:
+        yield Issue(
+            "invalid-status", severity["status_value_valid"],
+            f"Invalid Status for {expected_prefix}: {path} -> {status}", where, status,
+        )
+
+    for field in type_plan.date_fields:
+        value = meta.get(field, "").strip()
+        if value and value != "-" and not plan.date_pattern.match(value):
+            yield Issue(
+                "invalid-date", severity["date_format"], f"Invalid {field} date: {path} -> {value}", where, field
+            )
+
+    if type_plan.required_sections:
+        headings = record.get("sections", [])
+        for name, wanted in zip(type_plan.section_titles, type_plan.required_sections):
+            if not any(h == wanted or h.startswith(wanted + " ") for h in headings):
+                yield Issue(
+                    "missing-section", severity["required_sections"], f"Missing section {name}: {path}", where, name
+                )
+
+    for required_status, fields, message in type_plan.completion:
+        if normalize_status(status) != required_status:
+            continue
+        for field in fields:
+            value = meta.get(field, "").strip()
+            if not value or value == "-":
+                text = f"{message}: {path}" if message else f"{status} {expected_prefix} missing {field}: {path}"
+                yield Issue("completion-missing-field", severity["completion_fields"], text, where, field)
+
+    domain = meta.get("Domain", "").strip()
+    if domain and type_plan.known_domains is not None and domain not in type_plan.known_domains:
+        yield Issue("unknown-domain", severity["domain_known"], f"Unknown domain: {path} -> {domain}", where, domain)
+
+
+def check_document_links(path: Path, record: dict, resolver: LinkResolver, plan: SchemaPlan) -> Iterable[Issue]:
+    type_plan = plan.for_path(path)
+    if type_plan is None:
+        return
+    severity = plan.severities
+    where = str(path)
+    for target in record["links"]:
+        if not is_local_link(target):
+            continue
+        if resolver.is_broken(path, target):
+            yield Issue("broken-link", "error", f"Broken link: {path} -> {target}", where, target)
+            continue
+        key = resolver.key(path, target.split("#", 1)[0])
+        if key is None or not key.endswith(".md"):
+            continue
+        target_folder = posixpath.basename(posixpath.dirname(key))
+        target_stem = posixpath.basename(key)[:-3]
+        if not type_plan.self_reference and target_stem == path.stem:
+            yield Issue("self-reference", severity["self_reference"], f"Self reference: {path}", where, target)
+            continue
+        expected_folder = plan.folder_of(target_stem.split("-", 1)[0])
+        if expected_folder is not None and target_folder in plan.types and target_folder != expected_folder:
+            yield Issue(
+                "link-wrong-folder", severity["link_type_correct"],
+                f"Link to wrong folder: {path} -> {target}", where, target,
+            )
+        elif type_plan.allowed_outbound is not None and target_folder in plan.types and (
+            target_folder not in type_plan.allowed_outbound
+        ):
+            yield Issue(
+                "link-not-allowed", severity["link_outbound_allowed"],
+                f"Link to {plan.types[target_folder].prefix} not allowed from {type_plan.prefix}: {path} -> {target}",
+                where, target,
+            )
+
+
+def check_document_chunk(items: list[tuple[Path, dict]], context: dict) -> list[list[Issue]]:
+    """map_chunks() entry point for the per-document checks, with options from context."""
+    all_ids = context["all_ids"]
+    documents = context["documents"]
+    resolver = context["resolver"]
+    plan = context["plan"]
+    results = []
+    for path, record in items:
+        found = list(check_document(path, record, all_ids, plan)) if documents else []
+        if resolver is not None:
+            found.extend(check_document_links(path, record, resolver, plan))
+        results.append(found)
+    return results
+
+
+def check_view(path: Path, record: dict, req_ids: set[str], resolver: LinkResolver) -> Iterable[Issue]:
+    view = record["view"]
+    index_refs = set(view["index_refs"])
+    summary_refs = view["summary_refs"]
+    ssot_refs = sorted(set(REQ_REF_RE.findall(record["meta"].get("SSOT", ""))))
+    where = str(path)
+
+    if not index_refs:
+        yield Issue("view-missing-index", "warning", f"View missing References (SSOT index): {path}", where)
+
+    if not ssot_refs:
+        yield Issue("view-missing-ssot", "warning", f"View missing SSOT meta: {path}", where)
+
+    for ref_id in ssot_refs:
+        if ref_id not in index_refs:
+            yield Issue(
+                "ssot-ref-not-indexed", "warning",
+                f"SSOT ref not in SSOT index: {path} -> {ref_id}", where, ref_id,
+            )
+        if ref_id not in req_ids:
+            yield Issue(
+                "ssot-ref-missing-req", "warning", f"SSOT ref missing REQ: {path} -> {ref_id}", where, ref_id
+            )
+
+    for ref_id in view["index_refs"]:
+        if ref_id not in req_ids:
+            yield Issue(
+                "view-ref-missing-req", "warning", f"View refs missing REQ: {path} -> {ref_id}", where, ref_id
+            )
+
+    for ref_id in summary_refs:
+        if ref_id not in index_refs:
+            yield Issue(
+                "summary-ref-not-indexed", "warning",
+                f"Summary ref not in SSOT index: {path} -> {ref_id}", where, ref_id,
+            )
+        if ref_id not in req_ids:
+            yield Issue(
+                "summary-ref-missing-req", "warning",
+                f"Summary ref missing REQ: {path} -> {ref_id}", where, ref_id,
+            )
+
+    for _ in range(view["ok_without_ref"]):
+        yield Issue(
+            "summary-ok-missing-ref", "warning", f"Summary line marked ATLAS:OK missing ref: {path}", where
+        )
+    for _ in range(view["normative_without_ref"]):
+        yield Issue(
+            "summary-normative-missing-ref", "warning",
+            f"Summary line has normative keyword without ref: {path}", where,
+        )
+
+    for target in record["links"]:
+        if is_local_link(target) and resolver.is_broken(path, target, within=REQ_DIR):
+            yield Issue(
+                "view-broken-req-link", "warning", f"Broken REQ link in view: {path} -> {target}", where, target
+            )
+
+
+def view_refs_of(record: dict) -> set[str]:
+    view = record["view"]
+    refs = set(view["index_refs"]) | set(view["summary_refs"])
+    refs.update(REQ_REF_RE.findall(record["meta"].get("SSOT", "")))
+    return refs
+
+
+def check_view_coverage(docs: list[tuple[Path, dict]], views: list[tuple[Path, dict]]) -> Iterable[Issue]:
+    """Every REQ must be referenced by at least one view."""
+    view_refs: set[str] = set()
+    for _, record in views:
+        view_refs.update(view_refs_of(record))
+    for path, _ in docs:
+        if path.parent.name == "req" and path.stem not in view_refs:
+            yield Issue(
+                "req-missing-view", "warning",
+                f"Missing view reference for REQ: {path.stem}", str(path), path.stem,
+            )
+
+
+def check_brief_runs(docs: list[tuple[Path, dict]]) -> Iterable[Issue]:
+    """BRIEF status must follow the latest finished RUN that references it."""
+    brief_statuses: dict[str, str] = {}
+    latest_run_by_brief: dict[str, tuple[Path, str, Optional[datetime]]] = {}
+    for path, record in docs:
+        folder = path.parent.name
+        meta = record["meta"]
+        if folder == "brief" and meta.get("Status"):
+            brief_statuses[path.stem] = meta["Status"]
+        if folder != "runs":
+            continue
+        brief_id = meta.get("Brief")
+        run_status = meta.get("Status")
+        if not brief_id or not run_status:
+            continue
+        if normalize_status(run_status) not in {"completed", "failed"}:
+            continue
+        completed_at = parse_completed_date(meta.get("Completed"))
+        existing = latest_run_by_brief.get(brief_id)
+        if existing is None:
+            latest_run_by_brief[brief_id] = (path, run_status, completed_at)
+            continue
+        existing_path, _, existing_completed = existing
+        if completed_at and (existing_completed is None or completed_at > existing_completed):
+            latest_run_by_brief[brief_id] = (path, run_status, completed_at)
+        elif completed_at is None and existing_completed is None and path.stem > existing_path.stem:
+            latest_run_by_brief[brief_id] = (path, run_status, completed_at)
+
+    for brief_id, (run_path, run_status, _) in latest_run_by_brief.items():
+        run_id = run_path.stem
+        brief_status = brief_statuses.get(brief_id)
+        if not brief_status:
+            yield Issue(
+                "brief-missing-for-run", "warning",
+                f"BRIEF missing for RUN: {run_id} -> {brief_id}", str(run_path), brief_id,
+            )
+            continue
+        if normalize_status(brief_status) != normalize_status(run_status):
+            yield Issue(
+                "brief-status-mismatch", "warning",
+                f"BRIEF status mismatch: {brief_id} is {brief_status}, latest RUN {run_id} is {run_status}",
+                str(run_path), brief_id,
+            )
+
+
+GIT_OBJECTS_VERSION = 1
+GIT_EVIDENCE_FIELDS = {"req": "Implemented-Git", "runs": "Git"}
+# Placeholders finish and the templates write when there is no commit to point at.
+GIT_PLACEHOLDERS = {"", "-", "no-commit"}
+HEX_PREFIX_RE = LazyPattern(r"^[0-9a-f]{4,64}$")
+
+
+def load_git_objects(repo: str) -> dict[str, str]:
+    """Hashes already verified in repo, mapped to the full commit ID."""
+    try:
+        data = json.loads(read_text(GIT_OBJECTS_PATH))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != GIT_OBJECTS_VERSION or data.get("repo") != repo:
+        return {}
+    commits = data.get("commits")
+    return commits if isinstance(commits, dict) else {}
+
+
+def git_batch_check(values: list[str]) -> Optional[dict[str, Optional[str]]]:
+    """Look up every value with one `git cat-file --batch-check` process.
+
+    Returns value -> full commit ID (None if it names no commit), or None
+    if git cannot be run here.
+    """
+    import subprocess
+
+    payload = "".join(f"{value}^{{commit}}\n" for value in values)
+    try:
+        result = subprocess.run(
+            ["git", "cat-file", "--batch-check=%(objectname) %(objecttype)"],
+            cwd=REPO_ROOT,
+            input=payload,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    lines = result.stdout.splitlines()
+    if len(lines) != len(values):
+        return None
+    found: dict[str, Optional[str]] = {}
+    for value, line in zip(values, lines):
+        parts = line.split()
+        found[value] = parts[0] if len(parts) == 2 and parts[1] == "commit" else None
+    return found
+
+
+def check_git_evidence(docs: list[tuple[Path, dict]]) -> Iterable[Issue]:
+    """Implemented-Git (REQ) and Git (RUN) values must name commits in the repository.
+
+    Values are checked in one batch; verified hashes are cached in
+    state/git_objects.json, since a commit, once it exists, never changes.
+    """
+    evidence: list[tuple[Path, str, str]] = []
+    for path, record in docs:
+        field = GIT_EVIDENCE_FIELDS.get(path.parent.name)
+        value = record["meta"].get(field, "").strip() if field else ""
+        if value not in GIT_PLACEHOLDERS:
+            evidence.append((path, field, value))
+    if not evidence:
+        return
+
+    try:
+        git_dir = find_git_dir(REPO_ROOT)
+    except (UnsupportedGitLayout, OSError):
+        git_dir = None
+    repo = str(git_dir or REPO_ROOT)
+    known = load_git_objects(repo)
+    unknown = sorted({value for _, _, value in evidence if value not in known})
+    found: dict[str, Optional[str]] = {}
+    if unknown:
+        checked = git_batch_check(unknown)
+        if checked is None:
+            yield Issue("git-unavailable", "notice", "git cat-file failed; Git evidence not verified.", repo)
+            return
+        found = checked
+        # Only hash prefixes are cached; branch names and other refs move.
+        verified = {
+            value: commit for value, commit in checked.items()
+            if commit and HEX_PREFIX_RE.match(value) and commit.startswith(value)
+        }
+        if verified and STATE_DIR.is_dir():
+            write_json_atomic(
+                GIT_OBJECTS_PATH,
+                {"version": GIT_OBJECTS_VERSION, "repo": repo, "commits": {**known, **verified}},
+            )
+
+    for path, field, value in evidence:
+        if value not in known and not found.get(value):
+            yield Issue(
+                "git-commit-missing", "error",
+                f"{field} not found in repository: {path} -> {value}", str(path), value,
+            )
+
+
+def check_last_run(max_age_hours: int) -> Iterable[Issue]:
+    """Report every RUN still created/executing after max_age_hours.
+
+    Active RUNs come from the runs.jsonl view; last_run.json is still
+    validated and covers RUNs started before the log existed.
+    """
+    stale: set[str] = set()
+    cutoff = datetime.now() - timedelta(hours=max_age_hours)
+    active = load_active_runs()
+    for run_id, entry in sorted(active.items(), key=lambda item: str(item[1].get("at"))):
+        try:
+            ts = datetime.fromisoformat(entry.get("at", ""))
+        except (TypeError, ValueError):
+            continue
+        if ts < cutoff:
+            stale.add(run_id)
+            yield Issue(
+                "run-maybe-unfinished", "warning",
+                f"RUN may be unfinished (>{max_age_hours}h): {run_id}", str(RUNS_LOG_PATH), run_id,
+            )
+
+    if not LAST_RUN_PATH.exists():
+        return
+    where = str(LAST_RUN_PATH)
+    try:
+        state = json.loads(read_text(LAST_RUN_PATH))
+    except json.JSONDecodeError:
+        state = {}
+        yield Issue("last-run-invalid-json", "error", f"Invalid JSON: {LAST_RUN_PATH}", where)
+    stage = state.get("stage")
+    updated_at = state.get("updated_at") or state.get("completed_at")
+    if stage == "executing" and updated_at:
+        try:
+            ts = datetime.fromisoformat(updated_at)
+        except ValueError:
+            yield Issue("last-run-invalid-timestamp", "error", "Invalid timestamp in last_run.json", where)
+            return
+        run_id = state.get("run_id")
+        if ts < cutoff and run_id not in stale:
+            yield Issue(
+                "run-maybe-unfinished", "warning",
+                f"RUN may be unfinished (>{max_age_hours}h): {run_id}", where, run_id,
+            )
+
+
+# =============================================================================
+# Incremental doctor
+# =============================================================================
+
+DOCTOR_CACHE_VERSION = 4
+
+
+def load_doctor_cache(links: bool, schema: str) -> dict[str, dict]:
+    """Return cached per-document issues, or {} if they were produced under other options or schemas."""
+    if _SERVER is not None:
+        return _SERVER.doctor_caches.get((links, schema), {})
+    try:
+        data = json.loads(read_text(DOCTOR_CACHE_PATH))
+    except (OSError, ValueError):
+        return {}
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != DOCTOR_CACHE_VERSION
+        or data.get("root") != str(ATLAS_ROOT)
+        or data.get("links") != links
+        or data.get("schema") != schema
+    ):
+        return {}
+    docs = data.get("docs", {})
+    for entry in docs.values():
+        entry["issues"] = [Issue(**item) for item in entry["issues"]]
+    return docs
+
+
+def save_doctor_cache(links: bool, schema: str, docs: dict[str, dict]) -> None:
+    if _SERVER is not None:
+        _SERVER.doctor_caches[(links, schema)] = docs
+        return
+    if not STATE_DIR.is_dir():
+        return
+    docs = {key: {**entry, "issues": [issue.to_dict() for issue in entry["issues"]]} for key, entry in docs.items()}
+    write_json_atomic(
+        DOCTOR_CACHE_PATH,
+        {"version": DOCTOR_CACHE_VERSION, "root": str(ATLAS_ROOT), "links": links, "schema": schema, "docs": docs},
+    )
+
+
+def record_ids(path: Path, record: dict) -> set[str]:
+    ids = {path.stem}
+    for candidate in [record["meta"].get("ID"), record["header_id"]]:
+        if candidate:
+            ids.add(candidate)
+    return ids
+
+
+def git_changed_keys(ref: str) -> Optional[set[str]]:
+    """Index keys of .atlas files that differ from ref, or None if git is unavailable."""
+    import subprocess
+
+    try:
+        result = subprocess.run(
+            ["git", "diff", "--name-only", "--relative", ref, "--", ATLAS_ROOT.name],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            check=True,
+        )
+    except Exception:
+        return None
+    prefix = ATLAS_ROOT.name + "/"
+    return {line[len(prefix) :] for line in result.stdout.splitlines() if line.startswith(prefix)}
+
+
+def target_exists(key: str, exists: dict[str, bool]) -> bool:
+    """Whether the path at index key exists, stat-ed once per exists dict."""
+    if key not in exists:
+        exists[key] = (ATLAS_ROOT / key).exists()
+    return exists[key]
+
+
+def outside_link_targets(key: str, record: dict, indexed: set[str], exists: dict[str, bool]) -> dict[str, bool]:
+    """Non-indexed paths a document links to (FRONT.md, images), each mapped to whether it exists."""
+    targets: dict[str, bool] = {}
+    for target in record["links"]:
+        if is_local_link(target):
+            target_key = link_key(key, target)
+            if target_key not in indexed:
+                targets[target_key] = target_exists(target_key, exists)
+    return targets
+
+
+def affected_keys(
+    records: list[tuple[Path, dict]],
+    cache: dict[str, dict],
+    git_keys: Optional[set[str]] = None,
+    exists: Optional[dict[str, bool]] = None,
+) -> set[str]:
+    """Documents to re-validate: changed ones plus everything that depends on them.
+
+    A document is changed if its stat differs from the cached run, it has no
+    cached result, it was deleted, or it is in git_keys (see git_changed_keys).
+    Dependents are views naming a changed REQ, REQ/RULE docs whose Must-Read
+    names a changed ID, and documents linking to an added or deleted file,
+    indexed or not. exists memoises the stat of non-indexed link targets
+    (see outside_link_targets).
+    """
+    exists = {} if exists is None else exists
+    current = {DocIndex.key(path): (path, record) for path, record in records}
+    changed = {
+        key for key, (_, record) in current.items()
+        if key not in cache or cache[key].get("stat") != record.get("stat")
+    }
+    removed = set(cache) - set(current)
+    changed |= removed
+    if git_keys is not None:
+        changed |= git_keys & (set(current) | removed)
+    # Unchanged documents whose non-indexed link targets appeared or vanished.
+    relinked = {
+        key for key in current
+        if key not in changed and any(
+            target_exists(target, exists) != existed for target, existed in cache[key].get("targets", {}).items()
+        )
+    }
+    if not changed:
+        return relinked
+
+    changed_ids: set[str] = set()
+    for key in changed:
+        if key in current:
+            changed_ids |= record_ids(*current[key])
+        changed_ids.update(cache.get(key, {}).get("ids", []))
+    added_or_removed = removed | {key for key in changed if key not in cache}
+
+    affected = set(changed)
+    for key, (_, record) in current.items():
+        if key in affected:
+            continue
+        depends_on = set(parse_must_read(record["meta"].get("Must-Read", "None")))
+        if "view" in record:
+            depends_on |= view_refs_of(record)
+        if depends_on & changed_ids or (
+            added_or_removed
+            and any(
+                is_local_link(target) and link_key(key, target) in added_or_removed
+                for target in record["links"]
+            )
+        ):
+            affected.add(key)
+    return (affected | relinked) & set(current)
+
+
+def document_issues(
+    docs: list[tuple[Path, dict]],
+    views: list[tuple[Path, dict]],
+    checks: frozenset[str],
+    jobs: int,
+    changed: Optional[str] = None,
+    cache: Optional[dict[str, dict]] = None,
+    plan: Optional[SchemaPlan] = None,
+) -> tuple[list[Issue], list[Issue]]:
+    """Return (notes about the run, per-document and per-view issues in document order).
+
+    With the full per-document check set, results are cached per document
+    and changed (see validate) limits re-validation to affected documents.
+    The cache lives in doctor_cache.json unless the caller passes its own
+    dict, which is then updated in place. plan defaults to the workspace's
+    compiled schemas.json/workflow.json.
+    """
+    plan = plan or load_schema_plan()
+    notes: list[Issue] = []
+    if plan.note:
+        notes.append(Issue("schema-fallback", "notice", plan.note, str(SCHEMAS_PATH)))
+    all_ids: set[str] = set()
+    for path, record in docs:
+        all_ids |= record_ids(path, record)
+    req_ids = {path.stem for path, _ in docs if path.parent == REQ_DIR}
+    links = "links" in checks
+
+    doc_keys = [DocIndex.key(path) for path, _ in docs]
+    view_keys = [DocIndex.key(path) for path, _ in views]
+    cached = CACHED_CHECKS <= checks
+    persist = cache is None
+    if persist:
+        cache = load_doctor_cache(links, plan.digest) if cached else {}
+    affected = set(doc_keys) | set(view_keys)
+    exists: dict[str, bool] = {}
+    if cached and changed is not None:
+        git_keys = None
+        if changed:
+            git_keys = git_changed_keys(changed)
+            if git_keys is None:
+                notes.append(Issue(
+                    "git-diff-failed", "notice", f"git diff against {changed} failed; using stat snapshot only."
+                ))
+        affected = affected_keys(docs + views, cache, git_keys, exists)
+        notes.append(Issue(
+            "partial-validation", "info",
+            f"Re-validating {len(affected)} of {len(docs) + len(views)} document(s).",
+        ))
+    elif cached and cache and _SERVER is not None:
+        # The server's cache is current as of its last doctor run; re-check only what changed since.
+        affected = affected_keys(docs + views, cache, exists=exists)
+
+    stale_docs = [(key, item) for key, item in zip(doc_keys, docs) if key in affected]
+    if not checks & {"documents", "links"}:
+        stale_docs = []
+    stale_views = [(key, item) for key, item in zip(view_keys, views) if key in affected]
+    if "views" not in checks:
+        stale_views = []
+    resolver = LinkResolver() if stale_views or (links and stale_docs) else None
+    fresh = map_chunks(
+        check_document_chunk,
+        [item for _, item in stale_docs],
+        jobs,
+        context={
+            "all_ids": all_ids,
+            "documents": "documents" in checks,
+            "resolver": resolver if links else None,
+            "plan": plan,
+        },
+    )
+    found_by_key = {key: found for (key, _), found in zip(stale_docs, fresh)}
+    for key, (path, record) in stale_views:
+        found_by_key[key] = list(check_view(path, record, req_ids, resolver))
+
+    if cached:
+        indexed = set(doc_keys) | set(view_keys)
+        new_cache: dict[str, dict] = {}
+        for key, (path, record) in zip(doc_keys + view_keys, docs + views):
+            found = found_by_key.get(key)
+            if found is None:
+                found = found_by_key[key] = cache[key]["issues"]
+                targets = cache[key].get("targets", {})
+            else:
+                targets = outside_link_targets(key, record, indexed, exists)
+            new_cache[key] = {
+                "stat": record.get("stat"),
+                "ids": sorted(record_ids(path, record)),
+                "targets": targets,
+                "issues": found,
+            }
+        if not persist:
+            cache.clear()
+            cache.update(new_cache)
+        # Saved before anything is reported, so an interrupted consumer keeps the results.
+        elif stale_docs or stale_views or set(cache) != set(new_cache):
+            save_doctor_cache(links, plan.digest, new_cache)
+
+    issues = [issue for key in doc_keys + view_keys for issue in found_by_key.get(key, [])]
+    return notes, issues
+
+
+# =============================================================================
+# Validation API
+# =============================================================================
+
+
+def run_checks(
+    docs: list[tuple[Path, dict]],
+    views: list[tuple[Path, dict]],
+    checks: frozenset[str],
+    jobs: int,
+    max_age_hours: int,
+    changed: Optional[str] = None,
+    cache: Optional[dict[str, dict]] = None,
+    plan: Optional[SchemaPlan] = None,
+) -> Iterator[Issue]:
+    """Run the selected checks over already-parsed records, in doctor's report order."""
+    notes, found = document_issues(docs, views, checks, jobs, changed, cache, plan)
+
+    yield from notes
+    if "layout" in checks:
+        yield from check_layout()
+    yield from found
+    if "coverage" in checks:
+        yield from check_view_coverage(docs, views)
+    if "runs" in checks:
+        yield from check_brief_runs(docs)
+    if "git" in checks:
+        yield from check_git_evidence(docs)
+    if "last_run" in checks:
+        yield from check_last_run(max_age_hours)
+
+
+def validate(
+    workspace: Optional[Path] = None,
+    checks: Optional[Iterable[str]] = None,
+    *,
+    max_age_hours: int = 24,
+    jobs: Optional[int] = None,
+    changed: Optional[str] = None,
+) -> Iterator[Issue]:
+    """Validate an Atlas workspace and return an iterator over its Issue records.
+
+    For the current workspace issues stream out as the checks produce them.
+    Another workspace is switched to, validated in full and switched back
+    before this returns, so the process never stays pointed at it while the
+    caller consumes the issues.
+
+    Args:
+        workspace: Directory containing .atlas/ (default: the current workspace).
+        checks: Check groups from CHECKS to run (default: all but "links" and "git").
+        max_age_hours: Age after which an executing RUN is reported as unfinished.
+        jobs: Worker processes for parsing and per-document checks (default: CPU count).
+        changed: Re-validate only documents changed since the last cached run
+            (""), or since the given git ref; cached issues are reused for the rest.
+
+    Raises:
+        ValueError: If checks names an unknown group.
+    """
+    selected = DEFAULT_CHECKS if checks is None else frozenset(checks)
+    unknown = selected - set(CHECKS)
+    if unknown:
+        raise ValueError(f"Unknown checks: {', '.join(sorted(unknown))}")
+
+    previous = REPO_ROOT
+    if workspace is None or Path(workspace).resolve() == previous:
+        return _validate_current(selected, max_age_hours, jobs, changed)
+    set_workspace(workspace)
+    try:
+        return iter(list(_validate_current(selected, max_age_hours, jobs, changed)))
+    finally:
+        save_doc_index()
+        set_workspace(previous)
+
+
+def _validate_current(
+    selected: frozenset[str], max_age_hours: int, jobs: Optional[int], changed: Optional[str]
+) -> Iterator[Issue]:
+    jobs = resolve_jobs(jobs)
+    # Parse stage: every document is read (or fetched from the index) once.
+    docs: list[tuple[Path, dict]] = []
+    views: list[tuple[Path, dict]] = []
+    if selected - {"layout", "last_run"}:
+        index = get_doc_index()
+        docs = index.scan([REQ_DIR, RULE_DIR, ADR_DIR, CQ_DIR, BRIEF_DIR, RUN_DIR], jobs=jobs)
+        if selected & {"views", "coverage"}:
+            views = index.scan([VIEWS_DIR], jobs=jobs)
+    return run_checks(docs, views, selected, jobs, max_age_hours, changed)
+
+
+def doctor_command(args: argparse.Namespace) -> int:
+    checks = DEFAULT_CHECKS | {"links"} if args.links else DEFAULT_CHECKS
+    if args.verify_git:
+        checks |= {"git"}
+    issues = 0
+    for issue in validate(checks=checks, max_age_hours=args.max_age_hours, jobs=args.jobs, changed=args.changed):
+        print(issue.render())
+        if issue.counted:
+            issues += 1
+
+    print(f"[DONE] Doctor completed with {issues} issue(s).")
+    return 0 if issues == 0 else 1
+
+
+# =============================================================================
+# Watch
+# =============================================================================
+
+WATCH_DEBOUNCE_MS = 50
+WATCH_POLL_INTERVAL = 0.5
+
+# inotify(7) event masks.
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+INOTIFY_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+)
+
+
+class InotifyWatcher:
+    """Reports changed paths under root using Linux inotify (via libc, no dependencies)."""
+
+    name = "inotify"
+
+    def __init__(self, root: Path):
+        import ctypes
+        import ctypes.util
+
+        self.root = root
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._get_errno = ctypes.get_errno
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(self._get_errno(), "inotify_init1 failed")
+        self.watches: dict[int, Path] = {}
+        self.add_tree(root)
+
+    def add_tree(self, directory: Path) -> None:
+        for dirpath, _, _ in os.walk(directory):
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(dirpath), INOTIFY_MASK)
+            if wd < 0:
+                raise OSError(self._get_errno(), f"inotify_add_watch failed: {dirpath}")
+            self.watches[wd] = Path(dirpath)
+
+    def wait(self, timeout: Optional[float]) -> set[Path]:
+        import select
+        import struct
+
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed: set[Path] = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = struct.unpack_from("iIII", data, offset)
+                offset += 16
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    # Events were dropped; rescan everything.
+                    changed.add(self.root)
                     continue
-                if "ATLAS:OK" in line and not REF_TOKEN_RE.search(line):
-                    print(f"[WARN] Summary line marked ATLAS:OK missing ref: {path}")
-                    issues += 1
-                if any(keyword in line for keyword in NORMATIVE_KEYWORDS) and not REF_TOKEN_RE.search(line):
-                    print(f"[WARN] Summary line has normative keyword without ref: {path}")
-                    issues += 1
-    
-            view_refs.update(index_refs | summary_refs | ssot_refs)
-    
-            for target in iter_links(text):
-                if not target or target.startswith("#"):
+                base = self.watches.get(wd)
+                if mask & IN_IGNORED:
+                    self.watches.pop(wd, None)
+                if base is None:
                     continue
-                if re.match(r"^[a-zA-Z][a-zA-Z0-9+.-]*:", target):
+                path = base / os.fsdecode(name) if name else base
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    self.add_tree(path)
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Portable fallback: compares stat snapshots of the tree every interval."""
+
+    name = "polling"
+
+    def __init__(self, root: Path, interval: float = WATCH_POLL_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.snapshot = self._snapshot()
+
+    def _snapshot(self) -> dict[str, tuple[int, int]]:
+        snapshot = {}
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
                     continue
-                resolved = (path.parent / target).resolve()
-                if is_relative_to(resolved, REQ_DIR) and not resolved.exists():
-                    print(f"[WARN] Broken REQ link in view: {path} -> {target}")
-                    issues += 1
-    
-        # REQ without any view reference
-        req_ids = [path.stem for path in all_docs if path.parent.name == "req"]
-        for req_id in req_ids:
-            if req_id not in view_refs:
-                print(f"[WARN] Missing view reference for REQ: {req_id}")
-                issues += 1
-    
-        latest_run_by_brief: dict[str, tuple[str, str, Optional[datetime]]] = {}
-        for run_id, brief_id, run_status, completed_at in run_brief_statuses:
-            normalized = normalize_status(run_status)
-            if normalized not in {"completed", "failed"}:
-                continue
-            existing = latest_run_by_brief.get(brief_id)
-            if existing is None:
-                latest_run_by_brief[brief_id] = (run_id, run_status, completed_at)
+                snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout: Optional[float]) -> set[Path]:
+        import time
+
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        current = self._snapshot()
+        changed = {path for path, stamp in current.items() if self.snapshot.get(path) != stamp}
+        changed |= set(self.snapshot) - set(current)
+        self.snapshot = current
+        return {Path(path) for path in changed}
+
+    def close(self) -> None:
+        pass
+
+
+def make_watcher(root: Path, poll: bool = False, interval: float = WATCH_POLL_INTERVAL):
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError) as exc:
+            print(f"[WARN] inotify unavailable ({exc}); falling back to polling.")
+    return PollingWatcher(root, interval)
+
+
+def is_watched_change(path: Path) -> bool:
+    """Ignore Atlas's own cache writes and editor temp files; keep docs, directories and schemas."""
+    if is_relative_to(path, STATE_DIR):
+        return path in (LAST_RUN_PATH, RUNS_LOG_PATH)
+    return path.suffix in {".md", ""} or path in (SCHEMAS_PATH, WORKFLOW_PATH)
+
+
+def watch_changes(watcher, debounce: float) -> set[Path]:
+    """Block until something changes, then collect events until debounce seconds pass quietly."""
+    changed: set[Path] = set()
+    while not changed:
+        changed = {path for path in watcher.wait(None) if is_watched_change(path)}
+    while True:
+        more = watcher.wait(debounce)
+        if not more:
+            return changed
+        changed |= {path for path in more if is_watched_change(path)}
+
+
+def diff_issues(before: list[Issue], after: list[Issue]) -> tuple[list[Issue], list[Issue]]:
+    """Return (appeared, disappeared) issues, keeping report order."""
+    from collections import Counter
+
+    remaining = Counter(before)
+    appeared = []
+    for issue in after:
+        if remaining[issue] > 0:
+            remaining[issue] -= 1
+        else:
+            appeared.append(issue)
+    return appeared, list((+remaining).elements())
+
+
+class IncrementalValidator:
+    """Doctor state kept in memory between edits, for watch.
+
+    Records, per-document issues and reverse dependencies (ID -> documents
+    naming it in Must-Read or view refs, file -> documents linking to it)
+    are held in memory, so update() re-validates only the changed documents
+    and their dependents instead of the whole workspace.
+    """
+
+    def __init__(self, checks: frozenset[str], max_age_hours: int, jobs: int):
+        from collections import Counter, defaultdict
+
+        self.checks = checks
+        self.links = "links" in checks
+        self.max_age_hours = max_age_hours
+        self.jobs = jobs
+        self.index = get_doc_index()
+        self.doc_dirs = [REQ_DIR, RULE_DIR, ADR_DIR, CQ_DIR, BRIEF_DIR, RUN_DIR]
+        self.prefixes = tuple(DocIndex.key(d) + "/" for d in self.doc_dirs + [VIEWS_DIR])
+        self.records: dict[str, tuple[Path, dict]] = {}
+        self.issues: dict[str, list[Issue]] = {}
+        self.coverage: dict[str, list[Issue]] = {}
+        self.global_issues: dict[str, list[Issue]] = {}
+        self.id_counts: Counter = Counter()
+        self.view_refs: Counter = Counter()
+        self.dependents: dict[str, set[str]] = defaultdict(set)
+        self.linkers: dict[str, set[str]] = defaultdict(set)
+        self.resolver = LinkResolver()
+        self.plan = load_schema_plan()
+        self.total = 0
+
+    def start(self) -> list[Issue]:
+        """Full validation (reusing doctor's on-disk cache); returns every issue in doctor order."""
+        docs = self.index.scan(self.doc_dirs, jobs=self.jobs)
+        views = self.index.scan([VIEWS_DIR], jobs=self.jobs)
+        cache = load_doctor_cache(self.links, self.plan.digest)
+        issues = [
+            issue
+            for issue in run_checks(docs, views, self.checks, self.jobs, self.max_age_hours, "", cache, self.plan)
+            if issue.severity != "info"
+        ]
+        self.total = sum(issue.counted for issue in issues)
+        for path, record in docs + views:
+            key = DocIndex.key(path)
+            self._add(key, path, record)
+            self.issues[key] = cache[key]["issues"]
+        for key in self.records:
+            if key.startswith("req/"):
+                self.coverage[key] = self._coverage(key)
+        for group in ["layout", "runs", "last_run"]:
+            self.global_issues[group] = self._global(group)
+        return issues
+
+    def cache_entries(self) -> dict[str, dict]:
+        indexed = set(self.records)
+        exists: dict[str, bool] = {}
+        return {
+            key: {
+                "stat": record.get("stat"),
+                "ids": sorted(record_ids(path, record)),
+                "targets": outside_link_targets(key, record, indexed, exists),
+                "issues": self.issues[key],
+            }
+            for key, (path, record) in self.records.items()
+        }
+
+    # ------------------------------------------------------------------
+    # Bookkeeping
+    # ------------------------------------------------------------------
+
+    def _depends_on(self, record: dict) -> set[str]:
+        ids = set(parse_must_read(record["meta"].get("Must-Read", "None")))
+        if "view" in record:
+            ids |= view_refs_of(record)
+        return ids
+
+    def _link_targets(self, key: str, record: dict) -> set[str]:
+        return {fold_case(link_key(key, target)) for target in record["links"] if is_local_link(target)}
+
+    def _add(self, key: str, path: Path, record: dict) -> None:
+        self.records[key] = (path, record)
+        self.id_counts.update(record_ids(path, record))
+        if "view" in record:
+            self.view_refs.update(view_refs_of(record))
+        for ref_id in self._depends_on(record):
+            self.dependents[ref_id].add(key)
+        for target in self._link_targets(key, record):
+            self.linkers[target].add(key)
+
+    def _remove(self, key: str) -> None:
+        path, record = self.records.pop(key)
+        self.id_counts.subtract(record_ids(path, record))
+        if "view" in record:
+            self.view_refs.subtract(view_refs_of(record))
+        for ref_id in self._depends_on(record):
+            self.dependents[ref_id].discard(key)
+        for target in self._link_targets(key, record):
+            self.linkers[target].discard(key)
+
+    def _has_id(self, ref_id: str) -> bool:
+        return self.id_counts[ref_id] > 0
+
+    def _check(self, key: str) -> list[Issue]:
+        path, record = self.records[key]
+        if "view" in record:
+            req_ids = {ref_id for ref_id in view_refs_of(record) if f"req/{ref_id}.md" in self.records}
+            return list(check_view(path, record, req_ids, self.resolver)) if "views" in self.checks else []
+        all_ids = {ref_id for ref_id in parse_must_read(record["meta"].get("Must-Read", "None")) if self._has_id(ref_id)}
+        found = list(check_document(path, record, all_ids, self.plan)) if "documents" in self.checks else []
+        if self.links:
+            found.extend(check_document_links(path, record, self.resolver, self.plan))
+        return found
+
+    def _coverage(self, key: str) -> list[Issue]:
+        if "coverage" not in self.checks or key not in self.records:
+            return []
+        path, record = self.records[key]
+        return list(check_view_coverage([(path, record)], [])) if self.view_refs[path.stem] <= 0 else []
+
+    def _global(self, group: str) -> list[Issue]:
+        if group not in self.checks:
+            return []
+        if group == "layout":
+            return list(check_layout())
+        if group == "runs":
+            docs = [item for key, item in self.records.items() if key.startswith(("runs/", "drafts/brief/"))]
+            return list(check_brief_runs(docs))
+        return list(check_last_run(self.max_age_hours))
+
+    def _changed_keys(self, paths: set[Path]) -> set[str]:
+        keys: set[str] = set()
+        for path in paths:
+            key = DocIndex.key(path)
+            if path == ATLAS_ROOT:
+                return set(self.records) | {DocIndex.key(p) for p in iter_md_files(self.doc_dirs + [VIEWS_DIR])}
+            if not (key + "/").startswith(self.prefixes) and not key.startswith(self.prefixes):
                 continue
-            existing_run_id, _, existing_completed = existing
-            if completed_at and (existing_completed is None or completed_at > existing_completed):
-                latest_run_by_brief[brief_id] = (run_id, run_status, completed_at)
-            elif completed_at is None and existing_completed is None and run_id > existing_run_id:
-                latest_run_by_brief[brief_id] = (run_id, run_status, completed_at)
-    
-        for brief_id, (run_id, run_status, _) in latest_run_by_brief.items():
-            brief_status = brief_statuses.get(brief_id)
-            if not brief_status:
-                print(f"[WARN] BRIEF missing for RUN: {run_id} -> {brief_id}")
-                issues += 1
+            if path.suffix == ".md":
+                keys.add(key)
                 continue
-            if normalize_status(brief_status) != normalize_status(run_status):
-                print(
-                    f"[WARN] BRIEF status mismatch: {brief_id} is {brief_status}, latest RUN {run_id} is {run_status}"
-                )
-                issues += 1
-    
-        if LAST_RUN_PATH.exists():
-            try:
-                state = json.loads(read_text(LAST_RUN_PATH))
-            except json.JSONDecodeError:
-                state = {}
-                print(f"[ERR] Invalid JSON: {LAST_RUN_PATH}")
-                issues += 1
-            stage = state.get("stage")
-            updated_at = state.get("updated_at") or state.get("completed_at")
-            if stage == "executing" and updated_at:
-                try:
-                    ts = datetime.fromisoformat(updated_at)
-                    if datetime.now() - ts > timedelta(hours=args.max_age_hours):
-                        print(
-                            f"[WARN] RUN may be unfinished (>{args.max_age_hours}h): {state.get('run_id')}"
-                        )
-                        issues += 1
-                except ValueError:
-                    print("[ERR] Invalid timestamp in last_run.json")
-                    issues += 1
-    
-        print(f"[DONE] Doctor completed with {issues} issue(s).")
-        return 0 if issues == 0 else 1
-    
-    
-        print(f"[DONE] Doctor completed with {issues} issue(s).")
-        return 0 if issues == 0 else 1
-    
-    
-    def parse_version(v: str) -> tuple[int, ...]:
+            # A directory appeared or vanished: everything below it changed.
+            keys |= {k for k in self.records if k.startswith(key + "/")}
+            if path.is_dir():
+                keys |= {DocIndex.key(p) for p in iter_md_files([path])}
+        return keys
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def update(self, paths: set[Path]) -> tuple[list[Issue], list[Issue]]:
+        """Apply filesystem changes; return (appeared, disappeared) issues."""
+        keys = self._changed_keys(paths)
+        schema_changed = False
+        if SCHEMAS_PATH in paths or WORKFLOW_PATH in paths:
+            plan = load_schema_plan()
+            schema_changed = plan.digest != self.plan.digest
+            self.plan = plan
+        for key in keys:
+            self.index.get(ATLAS_ROOT / key)
+
+        changed_ids: set[str] = set()
+        changed_refs: set[str] = set()
+        existence: set[str] = set()
+        before: list[Issue] = []
+        for key in keys:
+            old = self.records.get(key)
+            new = self.index.entries.get(key)
+            if old is not None:
+                changed_ids |= record_ids(*old)
+                if "view" in old[1]:
+                    changed_refs |= view_refs_of(old[1])
+                self._remove(key)
+            if new is not None:
+                path = ATLAS_ROOT / key
+                self._add(key, path, new)
+                changed_ids |= record_ids(path, new)
+                if "view" in new:
+                    changed_refs |= view_refs_of(new)
+            if (old is None) != (new is None):
+                existence.add(key)
+                self._update_resolver(key, exists=new is not None)
+
+        affected = set(self.records) if schema_changed else set(keys)
+        for ref_id in changed_ids:
+            affected |= self.dependents.get(ref_id, set())
+        for key in existence:
+            affected |= self.linkers.get(fold_case(key), set())
+
+        after: list[Issue] = []
+        for key in sorted(affected):
+            before.extend(self.issues.pop(key, []))
+            if key in self.records:
+                self.issues[key] = self._check(key)
+                after.extend(self.issues[key])
+
+        coverage_keys = {key for key in keys if key.startswith("req/")}
+        coverage_keys |= {f"req/{ref_id}.md" for ref_id in changed_refs}
+        for key in sorted(coverage_keys):
+            before.extend(self.coverage.pop(key, []))
+            if key in self.records:
+                self.coverage[key] = self._coverage(key)
+                after.extend(self.coverage[key])
+
+        groups = ["layout", "last_run"]
+        if any(key.startswith(("runs/", "drafts/brief/")) for key in keys):
+            groups.append("runs")
+        for group in groups:
+            before.extend(self.global_issues.get(group, []))
+            self.global_issues[group] = self._global(group)
+            after.extend(self.global_issues[group])
+        self.total += sum(issue.counted for issue in after) - sum(issue.counted for issue in before)
+        return diff_issues(before, after)
+
+    def _update_resolver(self, key: str, exists: bool) -> None:
+        if exists:
+            parts = key.split("/")
+            for i in range(1, len(parts) + 1):
+                self.resolver.existing.add(fold_case("/".join(parts[:i])))
+        else:
+            self.resolver.existing.discard(fold_case(key))
+
+
+def watch_command(args: argparse.Namespace) -> int:
+    import time
+
+    checks = DEFAULT_CHECKS | {"links"} if args.links else DEFAULT_CHECKS
+    # Watch first, so edits made during the initial pass are picked up afterwards.
+    watcher = make_watcher(ATLAS_ROOT, poll=args.poll, interval=args.interval)
+    validator = IncrementalValidator(checks, args.max_age_hours, resolve_jobs(args.jobs))
+    for issue in validator.start():
+        print(issue.render())
+    print(f"[INFO] Watching {ATLAS_ROOT} ({watcher.name}) with {validator.total} issue(s). Press Ctrl+C to stop.")
+    sys.stdout.flush()
+
+    try:
+        while True:
+            changed = watch_changes(watcher, args.debounce / 1000)
+            started = time.perf_counter()
+            appeared, gone = validator.update(changed)
+            for issue in gone:
+                print(f"- {issue.render()}")
+            for issue in appeared:
+                print(f"+ {issue.render()}")
+            elapsed = (time.perf_counter() - started) * 1000
+            print(
+                f"[WATCH] {len(changed)} change(s): {validator.total} issue(s) "
+                f"(+{len(appeared)} -{len(gone)}) in {elapsed:.0f} ms"
+            )
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        save_doctor_cache(validator.links, validator.plan.digest, validator.cache_entries())
+    print("[DONE] Watch stopped.")
+    return 0
+
+
+# =============================================================================
+# Server
+# =============================================================================
+
+SERVER_PROTOCOL = 1
+# Commands the CLI hands to a running `atlas serve`; everything else runs in-process.
+SERVER_COMMANDS = frozenset({"capture", "intake", "run", "plan", "finish", "sync", "doctor"})
+# Set (to anything non-empty) to always run in-process.
+NO_SERVER_ENV = "ATLAS_NO_SERVER"
+
+# The server, when this process is one (see serve_command).
+_SERVER: Optional["WorkspaceServer"] = None
+
+
+def source_stamp() -> list:
+    """Identifies the code this process runs; a server only serves clients running the same file."""
+    path = os.path.realpath(__file__)
+    st = os.stat(path)
+    return [path, st.st_mtime_ns, st.st_size]
+
+
+def forward_to_server(argv: list[str]) -> Optional[int]:
+    """Run argv on this workspace's `atlas serve` and return its exit status.
+
+    Returns None when there is no server to ask (or it declines), so the
+    caller runs the command in-process. Commands reading stdin ('-') are
+    never forwarded.
+    """
+    if not argv or argv[0] not in SERVER_COMMANDS or "-" in argv or os.environ.get(NO_SERVER_ENV):
+        return None
+    if not SERVER_SOCKET_PATH.exists():
+        return None
+    import socket
+
+    request = {"protocol": SERVER_PROTOCOL, "source": source_stamp(), "cwd": os.getcwd(), "argv": argv}
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
         try:
-            return tuple(map(int, v.strip().split(".")))
-        except ValueError:
-            return (0, 0, 0)
-    
-    
-    def check_version_update() -> None:
-        """Check if Atlas has been updated and print changelog."""
-        if not VERSION_PATH.exists():
+            sock.connect(str(SERVER_SOCKET_PATH))
+        except OSError:
+            return None  # Stale socket: the server is gone.
+        try:
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reader:
+                reply = json.loads(reader.readline())
+        except (OSError, ValueError):
+            # The command may already have run; running it again here could apply it twice.
+            print(f"[ERR] Lost connection to atlas serve ({SERVER_SOCKET_PATH}).", file=sys.stderr)
+            return 1
+    finally:
+        sock.close()
+    if "error" in reply:
+        print(f"[WARN] {reply['error']} Running in-process.", file=sys.stderr)
+        return None
+    sys.stdout.write(reply.get("stdout", ""))
+    sys.stderr.write(reply.get("stderr", ""))
+    return reply.get("code", 1)
+
+
+class ThreadStream:
+    """Stand-in for sys.stdout or sys.stderr that routes writes per thread.
+
+    A thread's writes go where thread_output() pointed them, or else to the
+    stream this one replaced. Unlike contextlib.redirect_stdout, capturing
+    one command's output never swallows another thread's writes (or an MCP
+    transport's).
+    """
+
+    def __init__(self, stream):
+        import threading
+
+        self.stream = stream
+        self.local = threading.local()
+
+    def target(self):
+        return getattr(self.local, "target", None) or self.stream
+
+    def write(self, text: str) -> int:
+        return self.target().write(text)
+
+    def flush(self) -> None:
+        self.target().flush()
+
+    def __getattr__(self, name: str):
+        return getattr(self.target(), name)
+
+
+def install_thread_streams() -> None:
+    """Replace sys.stdout and sys.stderr with ThreadStreams (once, before other threads start)."""
+    if not isinstance(sys.stdout, ThreadStream):
+        sys.stdout = ThreadStream(sys.stdout)
+    if not isinstance(sys.stderr, ThreadStream):
+        sys.stderr = ThreadStream(sys.stderr)
+
+
+@contextmanager
+def thread_output(stdout, stderr) -> Iterator[None]:
+    """Send the calling thread's sys.stdout/sys.stderr writes to stdout/stderr for the with-block.
+
+    Needs install_thread_streams(); other threads keep writing where they did.
+    """
+    routes = []
+    for stream, target in ((sys.stdout, stdout), (sys.stderr, stderr)):
+        if isinstance(target, ThreadStream):
+            target = target.target()
+        routes.append((stream, getattr(stream.local, "target", None)))
+        stream.local.target = target
+    try:
+        yield
+    finally:
+        for stream, previous in routes:
+            stream.local.target = previous
+
+
+class WorkspaceServer:
+    """Serves CLI requests for one workspace from a single long-lived process.
+
+    The document index stays in memory and, with inotify, is kept current
+    from filesystem events instead of re-walking .atlas/ for every request;
+    doctor keeps its per-document results in memory and re-checks only the
+    documents that changed (and their dependents). Requests are handled one
+    at a time, and locks still coordinate with in-process CLI runs.
+    """
+
+    def __init__(self, watcher: Optional["InotifyWatcher"]):
+        import threading
+
+        install_thread_streams()
+        # Commands run in the client's working directory, which is process-wide.
+        self.command_lock = threading.Lock()
+        self.watcher = watcher
+        self.source = source_stamp()
+        self.dirs = [REQ_DIR, RULE_DIR, ADR_DIR, CQ_DIR, BRIEF_DIR, RUN_DIR, VIEWS_DIR]
+        self.index = get_doc_index()
+        self.parser = build_parser()
+        self.doctor_caches: dict[tuple[bool, str], dict[str, dict]] = {}
+        self.stopping = False
+        if watcher is not None:
+            self.index.watch(self.dirs)
+
+    def apply_events(self) -> None:
+        """Feed filesystem events queued since the last call into the document index."""
+        if self.watcher is None:
             return
-    
-        installed_ver_str = VERSION_PATH.read_text(encoding="utf-8").strip()
-        if not installed_ver_str:
+        changed = self.watcher.wait(0)
+        if ATLAS_ROOT in changed:
+            self.index.watch(self.dirs)  # Events were dropped: rescan.
             return
-    
-        installed_ver = parse_version(installed_ver_str)
-        current_ver = parse_version(ATLAS_VERSION)
-    
-        if current_ver > installed_ver:
-            print(f"\n[INFO] Upgrading Atlas: {installed_ver_str} -> {ATLAS_VERSION}")
-            print("=" * 60)
-            
-            # Collect versions to print
-            versions_to_print = []
-            for ver_str in CHANGELOG:
-                ver = parse_version(ver_str)
-                if ver > installed_ver and ver <= current_ver:
-                    versions_to_print.append((ver, ver_str))
-            
-            # Sort by version descending
-            versions_to_print.sort(key=lambda x: x[0], reverse=True)
-            
-            for _, ver_str in versions_to_print:
-                print(f"[{ver_str}]")
-                for change in CHANGELOG[ver_str]:
-                    print(f"- {change}")
-                print()
-                
-            print("=" * 60)
+        self.index.refresh(path for path in changed if any(is_relative_to(path, d) for d in self.dirs))
+
+    def handle(self, request: dict) -> dict:
+        """Run one request and return its reply; safe to call from several threads.
+
+        Commands resolve relative paths against the client's cwd, and the
+        working directory belongs to the whole process, so commands run one
+        at a time under command_lock. That lock is not reentrant: a command
+        must never call handle() itself. Each command's output is captured
+        through thread_output(), so writes from other threads are left alone.
+        """
+        import io
+        import traceback
+
+        if request.get("protocol") != SERVER_PROTOCOL:
+            return {"error": "atlas serve speaks another protocol version."}
+        if request.get("stop"):
+            self.stopping = True
+            return {"code": 0, "stdout": f"[OK] Stopped atlas serve for {ATLAS_ROOT}\n"}
+        if request.get("source") != self.source:
+            return {"error": "atlas.py changed since atlas serve started; restart it."}
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with self.command_lock:
+            self.apply_events()
+            _GIT_HEADS.clear()  # HEAD may have moved since the last request.
+            cwd = os.getcwd()
+            try:
+                os.chdir(request["cwd"])
+                with thread_output(stdout, stderr):
+                    code = run_cli(request["argv"], self.parser)
+            except SystemExit as exc:
+                if isinstance(exc.code, str):
+                    stderr.write(exc.code + "\n")
+                    code = 1
+                else:
+                    code = exc.code or 0
+            except Exception:
+                traceback.print_exc(file=stderr)
+                code = 1
+            finally:
+                os.chdir(cwd)
+        return {"code": code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+    def serve_connection(self, conn) -> None:
+        try:
+            with conn.makefile("rb") as reader:
+                request = json.loads(reader.readline())
+            reply = self.handle(request)
+            conn.sendall(json.dumps(reply, ensure_ascii=False).encode("utf-8") + b"\n")
+        except (OSError, ValueError):
+            pass  # The client went away or sent garbage; nothing to answer.
+
+
+def server_running() -> bool:
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(SERVER_SOCKET_PATH))
+        except OSError:
+            return False
+    return True
+
+
+def stop_server() -> int:
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(SERVER_SOCKET_PATH))
+            sock.sendall(json.dumps({"protocol": SERVER_PROTOCOL, "stop": True}).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reader:
+                reply = json.loads(reader.readline())
+        except (OSError, ValueError):
+            print(f"[INFO] atlas serve is not running for {ATLAS_ROOT}")
+            return 1
+    print(reply.get("stdout", "").rstrip())
+    return 0
+
+
+def workspace_watcher() -> Optional[InotifyWatcher]:
+    """An inotify watcher on .atlas/ for a long-lived process, or None where there is none."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return InotifyWatcher(ATLAS_ROOT)
+    except (OSError, AttributeError) as exc:
+        print(f"[WARN] inotify unavailable ({exc}); documents are re-checked on every request.", file=sys.stderr)
+        return None
+
+
+def serve_command(args: argparse.Namespace) -> int:
+    global _SERVER
+    import select
+    import signal
+    import socket
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("[ERR] atlas serve needs Unix domain sockets, which this platform does not have.")
+        return 1
+    if args.stop:
+        return stop_server()
+
+    ensure_dir(STATE_DIR)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Checking for a live server and replacing a stale socket must not race another `serve`.
+    with file_lock(SERVER_LOCK_PATH):
+        if server_running():
+            listener.close()
+            print(f"[ERR] atlas serve is already running: {SERVER_SOCKET_PATH}")
+            return 1
+        try:
+            SERVER_SOCKET_PATH.unlink(missing_ok=True)
+            listener.bind(str(SERVER_SOCKET_PATH))
+            listener.listen(16)
+        except OSError as exc:
+            listener.close()
+            print(f"[ERR] Cannot listen on {SERVER_SOCKET_PATH}: {exc}")
+            return 1
+    socket_stat = SERVER_SOCKET_PATH.stat()
+
+    watcher = workspace_watcher()
+    _SERVER = WorkspaceServer(watcher)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    mode = watcher.name if watcher is not None else "stat"
+    print(f"[INFO] Serving {ATLAS_ROOT} on {SERVER_SOCKET_PATH} ({mode}). Press Ctrl+C to stop.")
+    sys.stdout.flush()
+
+    try:
+        waiting = [listener] + ([watcher.fd] if watcher is not None else [])
+        while not _SERVER.stopping:
+            ready, _, _ = select.select(waiting, [], [])
+            if watcher is not None and watcher.fd in ready:
+                _SERVER.apply_events()
+            if listener in ready:
+                conn, _ = listener.accept()
+                with conn:
+                    _SERVER.serve_connection(conn)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        _SERVER = None
+        listener.close()
+        try:
+            # Leave a socket another server has since bound alone.
+            if SERVER_SOCKET_PATH.stat().st_ino == socket_stat.st_ino:
+                SERVER_SOCKET_PATH.unlink()
+        except OSError:
+            pass
+        if watcher is not None:
+            watcher.close()
+        save_doc_index()
+    print("[DONE] Server stopped.")
+    return 0
+
+
+def mcp_command(args: argparse.Namespace) -> int:
+    """Serve the workspace's tools over MCP (stdio, or HTTP) until the client disconnects."""
+    global _SERVER
+    import atlas_mcp
+
+    try:
+        server, http_options = atlas_mcp.new_server(args.host, args.port)
+    except ImportError:
+        print("[ERR] atlas mcp needs fastmcp or the MCP Python SDK: pip install mcp", file=sys.stderr)
+        return 1
+
+    watcher = workspace_watcher()
+    _SERVER = WorkspaceServer(watcher)
+    tools = atlas_mcp.AtlasTools(sys.modules[__name__], _SERVER)
+    try:
+        atlas_mcp.register_tools(server, tools)
+        transport = f"http://{args.host}:{args.port}" if args.http else "stdio"
+        print(f"[INFO] Serving MCP tools for {ATLAS_ROOT} ({transport}).", file=sys.stderr)
+        if args.http:
+            server.run(**http_options)
+        else:
+            server.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        tools.close()
+        _SERVER = None
+        if watcher is not None:
+            watcher.close()
+        save_doc_index()
+    return 0
+
+
+def parse_version(v: str) -> tuple[int, ...]:
+    try:
+        return tuple(map(int, v.strip().split(".")))
+    except ValueError:
+        return (0, 0, 0)
+
+
+def check_version_update() -> None:
+    """Check if Atlas has been updated and print changelog."""
+    try:
+        installed_ver_str = VERSION_PATH.read_text(encoding="utf-8").strip()
+    except OSError:
+        return
+    if not installed_ver_str or installed_ver_str == ATLAS_VERSION:
+        return
+
+    installed_ver = parse_version(installed_ver_str)
+    current_ver = parse_version(ATLAS_VERSION)
+
+    if current_ver > installed_ver:
+        print(f"\n[INFO] Upgrading Atlas: {installed_ver_str} -> {ATLAS_VERSION}")
+        print("=" * 60)
+        
+        # Collect versions to print
+        versions_to_print = []
+        for ver_str in CHANGELOG:
+            ver = parse_version(ver_str)
+            if ver > installed_ver and ver <= current_ver:
+                versions_to_print.append((ver, ver_str))
+        
+        # Sort by version descending
+        versions_to_print.sort(key=lambda x: x[0], reverse=True)
+        
+        for _, ver_str in versions_to_print:
+            print(f"[{ver_str}]")
+            for change in CHANGELOG[ver_str]:
+                print(f"- {change}")
+            print()
             
-            # Update VERSION file
-            if VERSION_PATH.exists():
-                write_text(VERSION_PATH, ATLAS_VERSION)
-                print(f"[OK] Updated VERSION file to {ATLAS_VERSION}\n")
-    
-    
-    def build_parser() -> argparse.ArgumentParser:
-        parser = argparse.ArgumentParser(prog="atlas")
-        parser.add_argument(
-            "--version", "-v",
-            action="version",
-            version=f"Atlas {get_version()}"
-        )
-        sub = parser.add_subparsers(dest="command", required=False)
-    
-        init = sub.add_parser("init")
-        init.add_argument("--overwrite", action="store_true")
-    
-        capture = sub.add_parser("capture")
-        capture.add_argument("text")
-        capture.add_argument("--domain", default="GEN")
-        capture.add_argument("--to", choices=["brief"])
-    
-        intake = sub.add_parser("intake")
-        intake.add_argument("text")
-        intake.add_argument("--domain", default="GEN")
-        intake.add_argument("--to", choices=["brief"])
-    
-        run = sub.add_parser("run")
-        run.add_argument("req_id")
-        run.add_argument("--step", type=int)
-    
-        plan = sub.add_parser("plan")
-        plan.add_argument("brief_id")
-        plan.add_argument("--step", type=int)
-    
-        finish = sub.add_parser("finish")
-        finish.add_argument("run_id")
-        finish.add_argument("--git")
-        finish.add_argument("--success", type=lambda v: v.lower() == "true", required=True)
-    
-        doctor = sub.add_parser("doctor")
-        doctor.add_argument("--links", action="store_true")
-        doctor.add_argument("--max-age-hours", type=int, default=24)
-    
-        sync = sub.add_parser("sync", help="Sync RUN status to BRIEF/REQ documents")
-        sync.add_argument("run_id", help="RUN document ID")
-        sync.add_argument("--apply-brief", action="store_true", help="Apply changes to BRIEF document")
-        sync.add_argument("--write-req-patch", action="store_true", help="Write REQ patch file")
-        sync.add_argument("--apply-req", action="store_true", help="Apply changes to REQ document (caution)")
-    
-        return parser
-    
-    
-    def main(argv: Optional[list[str]] = None) -> int:
-        parser = build_parser()
-        args = parser.parse_args(argv)
-    
-        if not args.command:
-            parser.print_help()
-            return 0
-    
-        if args.command != "init" and not ATLAS_ROOT.exists():
-            print("[INFO] .atlas not found. Initializing...")
-            init_command(args)
-    
-        if args.command != "init":
-            check_version_update()
-    
-        if args.command == "init":
-            return init_command(args)
-        if args.command == "capture":
-            return capture_command(args)
-        if args.command == "intake":
-            print("[WARN] 'intake' is deprecated. Use 'capture' instead.")
-            return capture_command(args)
-        if args.command == "run":
-            return run_command(args)
-        if args.command == "plan":
-            return plan_command(args)
-        if args.command == "finish":
-            return finish_command(args)
-        if args.command == "doctor":
-            return doctor_command(args)
-        if args.command == "sync":
-            return sync_command(args)
-    
+        print("=" * 60)
+        
+        # Update VERSION file
+        if VERSION_PATH.exists():
+            write_text(VERSION_PATH, ATLAS_VERSION)
+            print(f"[OK] Updated VERSION file to {ATLAS_VERSION}\n")
+
+
+class VersionAction(argparse.Action):
+    """--version that reads VERSION only when the flag is given."""
+
+    def __init__(self, option_strings: list[str], dest: str = argparse.SUPPRESS, **kwargs) -> None:
+        kwargs.setdefault("help", "show program's version number and exit")
+        super().__init__(option_strings, dest, nargs=0, default=argparse.SUPPRESS, **kwargs)
+
+    def __call__(self, parser, namespace, values, option_string=None) -> None:
+        print(f"Atlas {get_version()}")
+        parser.exit()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="atlas")
+    parser.add_argument("--version", "-v", action=VersionAction)
+    sub = parser.add_subparsers(dest="command", required=False, prog=parser.prog)
+
+    init = sub.add_parser("init")
+    init.add_argument("--overwrite", action="store_true")
+
+    capture = sub.add_parser("capture")
+    capture.add_argument("text", nargs="?")
+    capture.add_argument("--domain", default="GEN")
+    capture.add_argument("--to", choices=["brief"])
+    capture.add_argument(
+        "--from-file", metavar="PATH", help="Capture every record of a JSONL/CSV file ('-' reads stdin)"
+    )
+    capture.add_argument(
+        "--format", choices=["jsonl", "csv"], help="Input format (default: from the file suffix, else jsonl)"
+    )
+    capture.add_argument("--batch-size", type=int, default=CAPTURE_BATCH_SIZE, help="Items written per group flush")
+
+    intake = sub.add_parser("intake")
+    intake.add_argument("text")
+    intake.add_argument("--domain", default="GEN")
+    intake.add_argument("--to", choices=["brief"])
+
+    run = sub.add_parser("run")
+    run.add_argument("req_ids", nargs="*", metavar="req_id")
+    run.add_argument("--step", type=int)
+    run.add_argument("--from-file", metavar="PATH", help="Read more REQ IDs from a file ('-' for stdin)")
+
+    plan = sub.add_parser("plan")
+    plan.add_argument("brief_id")
+    plan.add_argument("--step", type=int)
+
+    finish = sub.add_parser("finish")
+    finish.add_argument("run_ids", nargs="*", metavar="run_id")
+    finish.add_argument("--from-file", metavar="PATH", help="Read more RUN IDs from a file ('-' for stdin)")
+    finish.add_argument("--git")
+    finish.add_argument("--success", type=lambda v: v.lower() == "true", required=True)
+
+    doctor = sub.add_parser("doctor")
+    doctor.add_argument("--links", action="store_true")
+    doctor.add_argument("--max-age-hours", type=int, default=24)
+    doctor.add_argument("--jobs", "-j", type=int, help="Worker processes (default: CPU count)")
+    doctor.add_argument(
+        "--changed",
+        nargs="?",
+        const="",
+        metavar="GIT_REF",
+        help="Re-validate only changed documents and their dependents (optionally vs a git ref)",
+    )
+    doctor.add_argument(
+        "--verify-git",
+        action="store_true",
+        help="Check that Implemented-Git/Git hashes exist in the repository (one git cat-file batch)",
+    )
+
+    watch = sub.add_parser("watch", help="Re-validate on every change under .atlas/")
+    watch.add_argument("--links", action="store_true")
+    watch.add_argument("--max-age-hours", type=int, default=24)
+    watch.add_argument("--jobs", "-j", type=int, help="Worker processes for the initial scan (default: CPU count)")
+    watch.add_argument(
+        "--debounce", type=int, default=WATCH_DEBOUNCE_MS, help="Quiet period in ms before re-validating"
+    )
+    watch.add_argument("--poll", action="store_true", help="Use stat polling instead of inotify")
+    watch.add_argument(
+        "--interval", type=float, default=WATCH_POLL_INTERVAL, help="Polling interval in seconds"
+    )
+
+    serve = sub.add_parser("serve", help="Keep this workspace loaded and answer CLI calls over a local socket")
+    serve.add_argument("--stop", action="store_true", help="Stop the running server")
+
+    mcp = sub.add_parser("mcp", help="Serve this workspace's tools to MCP clients (stdio by default)")
+    mcp.add_argument("--http", action="store_true", help="Serve over HTTP instead of stdio")
+    mcp.add_argument("--host", default="127.0.0.1", help="HTTP host")
+    mcp.add_argument("--port", type=int, default=8765, help="HTTP port")
+
+    sync = sub.add_parser("sync", help="Sync RUN status to BRIEF/REQ documents")
+    sync.add_argument("run_id", help="RUN document ID")
+    sync.add_argument("--apply-brief", action="store_true", help="Apply changes to BRIEF document")
+    sync.add_argument("--write-req-patch", action="store_true", help="Write REQ patch file")
+    sync.add_argument("--apply-req", action="store_true", help="Apply changes to REQ document (caution)")
+
+    return parser
+
+
+def dispatch_command(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    if args.command == "init":
+        return init_command(args)
+    if args.command == "capture":
+        return capture_command(args)
+    if args.command == "intake":
+        print("[WARN] 'intake' is deprecated. Use 'capture' instead.")
+        return capture_command(args)
+    if args.command == "run":
+        return run_command(args)
+    if args.command == "plan":
+        return plan_command(args)
+    if args.command == "finish":
+        return finish_command(args)
+    if args.command == "doctor":
+        return doctor_command(args)
+    if args.command == "watch":
+        return watch_command(args)
+    if args.command == "sync":
+        return sync_command(args)
+    if args.command == "serve":
+        return serve_command(args)
+    if args.command == "mcp":
+        return mcp_command(args)
+
+    parser.print_help()
+    return 1
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    forwarded = forward_to_server(argv)
+    if forwarded is not None:
+        return forwarded
+    return run_cli(argv)
+
+
+def prepare_workspace(args: argparse.Namespace) -> None:
+    """Create .atlas/ if missing, report upgrades and finish interrupted writes."""
+    if args.command != "init" and not ATLAS_ROOT.exists():
+        print("[INFO] .atlas not found. Initializing...")
+        init_command(args)
+
+    if args.command != "init":
+        check_version_update()
+        recover_journal()
+
+
+def run_cli(argv: list[str], parser: Optional[argparse.ArgumentParser] = None) -> int:
+    """Parse argv and run the command in this process."""
+    parser = parser or build_parser()
+    args = parser.parse_args(argv)
+
+    if not args.command:
         parser.print_help()
-        return 1
-    
-    
-    if __name__ == "__main__":
-        raise SystemExit(main())
-    
\ No newline at end of file
+        return 0
+
+    if args.command == "mcp":
+        # stdout carries the MCP session; start-up notices go to stderr.
+        from contextlib import redirect_stdout
+
+        with redirect_stdout(sys.stderr):
+            prepare_workspace(args)
+    else:
+        prepare_workspace(args)
+
+    try:
+        return dispatch_command(parser, args)
+    finally:
+        # A server keeps the index in memory and saves it when it stops.
+        if _SERVER is None:
+            save_doc_index()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
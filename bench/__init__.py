@@ -0,0 +1,11 @@
+"""Benchmarks for the Atlas CLI.
+
+bench.generate builds deterministic synthetic workspaces of a given size;
+bench.runner times each subcommand against them and writes JSON results
+that can be diffed between Atlas versions; bench.startup checks each
+subcommand's import-time budget.
+
+    python -m bench --sizes 1000 10000 100000 --output bench-results.json
+    python -m bench.generate /tmp/ws 10000
+    python -m bench.startup
+"""
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""Deterministic synthetic .atlas/ workspaces for benchmarking.
+
+The same (n_docs, seed) always produces byte-identical documents, so timings
+from different Atlas versions are taken against the same input.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import shutil
+import sys
+from pathlib import Path
+
+# Share of each document kind in a generated workspace.
+DOC_MIX = {
+    "req": 0.35,
+    "view": 0.25,
+    "run": 0.15,
+    "rule": 0.07,
+    "cq": 0.06,
+    "adr": 0.06,
+    "brief": 0.06,
+}
+
+DOC_DIRS = {
+    "req": "req",
+    "rule": "rule",
+    "adr": "adr",
+    "cq": "cq",
+    "view": "views",
+    "brief": "drafts/brief",
+    "run": "runs",
+}
+
+DOMAINS = ("CORE", "API", "GEN", "SYNC", "DOC", "UI", "DATA", "OPS")
+
+# IDs are REQ-<DOMAIN>-<NNN>; spill into more domains rather than wider numbers.
+MAX_PER_DOMAIN = 999
+
+SENTENCES = {
+    "ko": [
+        "시스템은 요청을 받은 순서대로 처리해야 한다.",
+        "설정 값이 없으면 기본값을 사용한다.",
+        "오류가 발생하면 사용자에게 원인을 알려야 한다.",
+        "모든 변경 사항은 실행 기록(RUN)에 남긴다.",
+        "외부 의존성은 명시적으로 선언한다.",
+        "응답 시간은 일반적인 입력에서 1초를 넘지 않는다.",
+        "문서의 상태는 Draft, Active, Implemented 중 하나이다.",
+        "비밀 값은 코드에 직접 넣지 않는다.",
+    ],
+    "en": [
+        "The system processes requests in the order they arrive.",
+        "Missing settings fall back to their documented defaults.",
+        "Errors are reported to the user together with their cause.",
+        "Every change is recorded in an execution RUN.",
+        "External dependencies are declared explicitly.",
+        "Responses stay under one second for typical input.",
+        "A document status is one of Draft, Active or Implemented.",
+        "Secrets are never hard-coded.",
+    ],
+}
+
+TITLES = {
+    "ko": ["요청 처리", "설정 로딩", "오류 보고", "실행 기록", "의존성 관리", "응답 시간", "상태 전이", "비밀 관리"],
+    "en": ["Request handling", "Config loading", "Error reporting", "Run records", "Dependencies", "Latency", "Status flow", "Secrets"],
+}
+
+DATE = "2026-01-28"
+
+
+def domain_name(index: int) -> str:
+    if index < len(DOMAINS):
+        return DOMAINS[index]
+    index -= len(DOMAINS)
+    return "X" + chr(ord("A") + index // 26) + chr(ord("A") + index % 26)
+
+
+def make_ids(prefix: str, count: int) -> list[str]:
+    """count IDs for prefix, spread round-robin over as many domains as needed."""
+    domains = max(3, -(-count // MAX_PER_DOMAIN))
+    return [f"{prefix}-{domain_name(i % domains)}-{i // domains + 1:03d}" for i in range(count)]
+
+
+def split_counts(n_docs: int) -> dict[str, int]:
+    counts = {kind: int(n_docs * share) for kind, share in DOC_MIX.items()}
+    counts["rule"] = max(counts["rule"], 1)
+    counts["req"] = max(n_docs - sum(v for k, v in counts.items() if k != "req"), 1)
+    return counts
+
+
+class WorkspaceGenerator:
+    """Writes one synthetic workspace.
+
+    Args:
+        root: Directory that will contain .atlas/.
+        n_docs: Total number of REQ/RULE/CQ/ADR/BRIEF/RUN/view documents.
+        seed: Random seed; the same seed yields the same workspace.
+        links: Average number of markdown links per document body.
+        must_read: Maximum Must-Read fan-out of REQ/RULE documents.
+        broken_ratio: Share of links that point at a missing file.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        n_docs: int,
+        seed: int = 0,
+        links: int = 4,
+        must_read: int = 3,
+        broken_ratio: float = 0.01,
+    ):
+        self.root = Path(root)
+        self.atlas = self.root / ".atlas"
+        self.rnd = random.Random(seed)
+        self.links = links
+        self.must_read = must_read
+        self.broken_ratio = broken_ratio
+        self.counts = split_counts(n_docs)
+        self.ids = {
+            "req": make_ids("REQ", self.counts["req"]),
+            "rule": make_ids("RULE", self.counts["rule"]),
+            "adr": make_ids("ADR", self.counts["adr"]),
+            "cq": make_ids("CQ", self.counts["cq"]),
+            "brief": make_ids("BRIEF", self.counts["brief"]),
+        }
+        self.planned_runs: list[str] = []
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def lang(self) -> str:
+        return "ko" if self.rnd.random() < 0.5 else "en"
+
+    def sentences(self, lang: str, count: int) -> list[str]:
+        return [self.rnd.choice(SENTENCES[lang]) for _ in range(count)]
+
+    def title(self, lang: str) -> str:
+        return self.rnd.choice(TITLES[lang])
+
+    def link(self) -> str:
+        """A relative link from one doc folder to a doc in another."""
+        if self.rnd.random() < self.broken_ratio:
+            return "[missing](../req/REQ-NONE-000.md)"
+        kind = self.rnd.choice(["req", "req", "rule", "cq", "adr"])
+        pool = self.ids[kind]
+        if not pool:
+            kind, pool = "req", self.ids["req"]
+        target = self.rnd.choice(pool)
+        return f"[{target}](../{DOC_DIRS[kind]}/{target}.md)"
+
+    def link_lines(self) -> list[str]:
+        count = self.rnd.randint(0, self.links * 2)
+        return [f"- See {self.link()}" for _ in range(count)]
+
+    def must_read_ids(self) -> str:
+        if self.rnd.random() < 0.1:
+            return "None"
+        fanout = self.rnd.randint(1, self.must_read)
+        return ", ".join(sorted(set(self.rnd.choice(self.ids["rule"]) for _ in range(fanout))))
+
+    def write(self, kind: str, doc_id: str, text: str) -> None:
+        (self.atlas / DOC_DIRS[kind] / f"{doc_id}.md").write_text(text, encoding="utf-8")
+
+    # ------------------------------------------------------------------
+    # Documents
+    # ------------------------------------------------------------------
+
+    def req(self, req_id: str) -> None:
+        lang = self.lang()
+        domain = req_id.split("-")[1]
+        status = self.rnd.choice(["Draft", "Active", "Implemented"])
+        git = f"{self.rnd.getrandbits(28):07x}" if status == "Implemented" else "-"
+        decision = "\n".join(f"- {s}" for s in self.sentences(lang, 3))
+        criteria = "\n".join(
+            f"- [{'x' if self.rnd.random() < 0.5 else ' '}] {s}" for s in self.sentences(lang, self.rnd.randint(2, 6))
+        )
+        self.write("req", req_id, f"""# [{req_id}] {self.title(lang)}
+
+> **ID**: {req_id}
+> **Domain**: {domain}
+> **Status**: {status}
+> **Last Updated**: {DATE}
+> **Implemented-Git**: {git}
+> **Linked-RUN**: -
+> **Must-Read**: {self.must_read_ids()}
+
+---
+
+## Decision
+{decision}
+
+## Input
+- {self.rnd.choice(SENTENCES[lang])}
+
+## Output
+- {self.rnd.choice(SENTENCES[lang])}
+
+## Acceptance Criteria
+{criteria}
+
+## References
+""" + "\n".join(self.link_lines()) + "\n")
+
+    def rule(self, rule_id: str) -> None:
+        lang = self.lang()
+        domain = rule_id.split("-")[1]
+        self.write("rule", rule_id, f"""# [{rule_id}] {self.title(lang)}
+
+> **ID**: {rule_id}
+> **Domain**: {domain}
+> **Priority**: {self.rnd.choice(["High", "Medium", "Low"])}
+> **Last Updated**: {DATE}
+> **Must-Read**: {self.must_read_ids()}
+
+---
+
+## Rule Statement
+- {self.rnd.choice(SENTENCES[lang])}
+
+## Scope
+- {self.rnd.choice(SENTENCES[lang])}
+
+## Violation
+- {self.rnd.choice(SENTENCES[lang])}
+""" + "\n".join(self.link_lines()) + "\n")
+
+    def adr(self, adr_id: str) -> None:
+        lang = self.lang()
+        domain = adr_id.split("-")[1]
+        self.write("adr", adr_id, f"""# [{adr_id}] {self.title(lang)}
+
+> **ID**: {adr_id}
+> **Domain**: {domain}
+> **Status**: {self.rnd.choice(["Draft", "Accepted"])}
+> **Date**: {DATE}
+> **Supersedes**: -
+> **Superseded-By**: -
+
+---
+
+## Context
+""" + "\n".join(f"- {s}" for s in self.sentences(lang, 2)) + """
+
+## Decision
+""" + "\n".join(f"- {s}" for s in self.sentences(lang, 2)) + """
+
+## Consequences
+- """ + self.rnd.choice(SENTENCES[lang]) + """
+
+## References
+""" + "\n".join(self.link_lines()) + "\n")
+
+    def cq(self, cq_id: str) -> None:
+        lang = self.lang()
+        domain = cq_id.split("-")[1]
+        req_id = self.rnd.choice(self.ids["req"])
+        rule_id = self.rnd.choice(self.ids["rule"])
+        self.write("cq", cq_id, f"""# [{cq_id}] {self.title(lang)}
+
+> **ID**: {cq_id}
+> **Domain**: {domain}
+> **Status**: Draft
+> **Last Updated**: {DATE}
+
+---
+
+## Question
+- {self.rnd.choice(SENTENCES[lang])}
+
+## Expected Answer (Criteria)
+1. {self.rnd.choice(SENTENCES[lang])}
+
+## Traceability
+- **Solves by**: [{req_id}](../req/{req_id}.md)
+- **Constrained by**: [{rule_id}](../rule/{rule_id}.md)
+""")
+
+    def brief(self, brief_id: str, status: str) -> None:
+        lang = self.lang()
+        domain = brief_id.split("-")[1]
+        self.write("brief", brief_id, f"""# [{brief_id}] {self.title(lang)}
+
+> **ID**: {brief_id}
+> **Domain**: {domain}
+> **Status**: {status}
+> **Date**: {DATE}
+
+## 1. User Request
+- {self.rnd.choice(SENTENCES[lang])}
+
+## 2. Intent Summary
+- Goal: {self.rnd.choice(SENTENCES[lang])}
+
+## 3. Affected Artifacts
+- Modify: {self.rnd.choice(SENTENCES[lang])}
+
+## 4. Proposed Changes
+1. {self.rnd.choice(SENTENCES[lang])}
+
+## 5. Verification Criteria
+- [ ] {self.rnd.choice(SENTENCES[lang])}
+""")
+
+    def view(self, index: int, req_ids: list[str]) -> None:
+        lang = self.lang()
+        ssot = " ".join(f"(@{req_id})" for req_id in req_ids)
+        summary = "\n".join(
+            f"- {self.rnd.choice(SENTENCES[lang])} (@{req_id}#Decision) <!-- ATLAS:OK -->" for req_id in req_ids
+        )
+        refs = "\n".join(f"- [{req_id}](../req/{req_id}.md)" for req_id in req_ids)
+        name = f"VIEW-{index:06d}"
+        (self.atlas / "views" / f"{name}.md").write_text(f"""# [VIEW-{req_ids[0]}] {self.title(lang)}
+
+> **Last Updated**: {DATE}
+> **SSOT**: {ssot}
+
+## Summary
+{summary}
+
+## References (SSOT index)
+{refs}
+""", encoding="utf-8")
+
+    def run(self, run_id: str, status: str, req_id: str = "", brief_id: str = "") -> None:
+        lang = self.lang()
+        owner = f"> **REQ**: {req_id}" if req_id else f"> **Brief**: {brief_id}"
+        done = status in {"Completed", "Failed"}
+        git = f"{self.rnd.getrandbits(28):07x}" if done else "-"
+        checks = "\n".join(f"- [{'x' if done else ' '}] {s}" for s in self.sentences(lang, 3))
+        self.write("run", run_id, f"""# [{run_id}] Plan
+
+> **ID**: {run_id}
+{owner}
+> **Status**: {status}
+> **Started**: {DATE}
+> **Git**: {git}
+> **Completed**: {DATE if done else "-"}
+
+## Plan
+{checks}
+
+## Verification
+- [ ] Test
+- [ ] Spec
+""")
+
+    # ------------------------------------------------------------------
+    # Workspace
+    # ------------------------------------------------------------------
+
+    def generate(self) -> dict:
+        if self.atlas.exists():
+            shutil.rmtree(self.atlas)
+        for folder in set(DOC_DIRS.values()) | {"inbox", "archive", ".system/state"}:
+            (self.atlas / folder).mkdir(parents=True, exist_ok=True)
+
+        for req_id in self.ids["req"]:
+            self.req(req_id)
+        for rule_id in self.ids["rule"]:
+            self.rule(rule_id)
+        for adr_id in self.ids["adr"]:
+            self.adr(adr_id)
+        for cq_id in self.ids["cq"]:
+            self.cq(cq_id)
+
+        # Runs: most hang off a REQ, the rest off a BRIEF.
+        brief_status: dict[str, str] = {}
+        req_steps: dict[str, int] = {}
+        for i in range(self.counts["run"]):
+            status = self.rnd.choice(["Planned", "Completed", "Completed", "Failed"])
+            if self.ids["brief"] and i % 5 == 4:
+                brief_id = self.ids["brief"][(i // 5) % len(self.ids["brief"])]
+                run_id = f"RUN-{brief_id}-step-01"
+                if brief_id in brief_status:
+                    continue
+                brief_status[brief_id] = status if status != "Planned" else "Active"
+                self.run(run_id, status, brief_id=brief_id)
+                continue
+            req_id = self.ids["req"][i % len(self.ids["req"])]
+            step = req_steps[req_id] = req_steps.get(req_id, 0) + 1
+            if step > 99:
+                continue
+            run_id = f"RUN-{req_id}-step-{step:02d}"
+            self.run(run_id, status, req_id=req_id)
+            if status == "Planned":
+                self.planned_runs.append(run_id)
+
+        for brief_id in self.ids["brief"]:
+            self.brief(brief_id, brief_status.get(brief_id, "Active"))
+
+        # Views cover REQs in small groups, so most but not all REQs have one.
+        req_ids = self.ids["req"]
+        for index in range(self.counts["view"]):
+            start = (index * 3) % len(req_ids)
+            group = req_ids[start : start + self.rnd.randint(1, 3)] or req_ids[:1]
+            self.view(index + 1, group)
+
+        return {
+            "root": str(self.root),
+            "counts": self.counts,
+            "req_ids": self.ids["req"][:10],
+            "planned_runs": self.planned_runs,
+        }
+
+
+def generate_workspace(root: Path, n_docs: int, seed: int = 0, **options) -> dict:
+    """Create root/.atlas with n_docs documents and return a manifest of what was written."""
+    return WorkspaceGenerator(root, n_docs, seed=seed, **options).generate()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic Atlas workspace")
+    parser.add_argument("root", type=Path, help="Directory that will contain .atlas/")
+    parser.add_argument("docs", type=int, help="Number of documents")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--links", type=int, default=4, help="Average links per document body")
+    parser.add_argument("--must-read", type=int, default=3, help="Maximum Must-Read fan-out")
+    args = parser.parse_args(argv)
+
+    manifest = generate_workspace(args.root, args.docs, seed=args.seed, links=args.links, must_read=args.must_read)
+    print(json.dumps(manifest["counts"], indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""Time Atlas subcommands against synthetic workspaces of increasing size.
+
+Every command runs as a fresh `python atlas.py ...` process inside the
+workspace, the way users run it, so interpreter startup is part of the
+measurement. Results are written as JSON for diffing between versions.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from .generate import generate_workspace
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_SIZES = [1000, 10000, 100000]
+COMMANDS = ["init", "capture", "run", "finish", "sync", "doctor", "doctor-warm", "doctor-links"]
+
+
+def command_argv(name: str, manifest: dict, round_no: int) -> list[str]:
+    """CLI arguments for one timed invocation; each round gets its own targets."""
+    req_id = manifest["req_ids"][round_no % len(manifest["req_ids"])]
+    planned = manifest["planned_runs"]
+    if name == "init":
+        return ["init"]
+    if name == "capture":
+        return ["capture", f"Benchmark capture {round_no}: 벤치마크 요청", "--domain", "BENCH"]
+    if name == "run":
+        return ["run", req_id]
+    if name == "finish":
+        return ["finish", planned[round_no % len(planned)], "--git", "no-commit", "--success", "true"]
+    if name == "sync":
+        return ["sync", planned[-1 - round_no % len(planned)]]
+    if name == "doctor-links":
+        return ["doctor", "--links"]
+    return ["doctor"]
+
+
+def time_command(atlas: Path, workspace: Path, argv: list[str]) -> tuple[float, int]:
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, str(atlas), *argv],
+        cwd=workspace,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start, result.returncode
+
+
+def drop_caches(workspace: Path) -> None:
+    """Remove Atlas's on-disk caches so the next doctor starts cold."""
+    state = workspace / ".atlas" / ".system" / "state"
+    for name in ["doc_index.json", "doctor_cache.json"]:
+        (state / name).unlink(missing_ok=True)
+
+
+def bench_size(atlas: Path, workdir: Path, n_docs: int, commands: list[str], repeat: int, seed: int) -> list[dict]:
+    workspace = workdir / f"ws-{n_docs}"
+    gen_start = time.perf_counter()
+    manifest = generate_workspace(workspace, n_docs, seed=seed)
+    generate_seconds = time.perf_counter() - gen_start
+    shutil.copy(atlas, workspace / "atlas.py")
+    atlas = workspace / "atlas.py"
+    print(f"[INFO] {n_docs} docs generated in {generate_seconds:.1f}s: {workspace}")
+
+    results = []
+    for name in commands:
+        if name in {"finish", "sync"} and not manifest["planned_runs"]:
+            print(f"[WARN] No planned RUNs to {name} at {n_docs} docs; skipped.")
+            continue
+        samples = []
+        returncodes = []
+        for round_no in range(repeat):
+            if name == "doctor":
+                drop_caches(workspace)
+            elapsed, code = time_command(atlas, workspace, command_argv(name, manifest, round_no))
+            samples.append(elapsed)
+            returncodes.append(code)
+        results.append(
+            {
+                "docs": n_docs,
+                "command": name,
+                "samples": [round(s, 4) for s in samples],
+                "min": round(min(samples), 4),
+                "median": round(statistics.median(samples), 4),
+                "returncodes": sorted(set(returncodes)),
+            }
+        )
+        print(f"[OK] {n_docs:>7} docs  {name:<13} median {statistics.median(samples):8.3f}s  min {min(samples):8.3f}s")
+    return results
+
+
+def atlas_version(atlas: Path) -> str:
+    try:
+        result = subprocess.run(
+            [sys.executable, str(atlas), "--version"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return result.stdout.strip()
+
+
+def run_benchmarks(
+    sizes: list[int],
+    atlas: Path,
+    commands: list[str] | None = None,
+    repeat: int = 3,
+    seed: int = 0,
+    workdir: Path | None = None,
+) -> dict:
+    """Benchmark atlas at each size and return the JSON-serialisable report."""
+    commands = commands or COMMANDS
+    atlas = Path(atlas).resolve()
+    report = {
+        "atlas": atlas_version(atlas),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "seed": seed,
+        "repeat": repeat,
+        "results": [],
+    }
+    temp = None
+    if workdir is None:
+        temp = tempfile.TemporaryDirectory(prefix="atlas-bench-")
+        workdir = Path(temp.name)
+    try:
+        for n_docs in sizes:
+            report["results"].extend(bench_size(atlas, Path(workdir), n_docs, commands, repeat, seed))
+    finally:
+        if temp is not None:
+            temp.cleanup()
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Benchmark Atlas commands")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Workspace sizes in documents")
+    parser.add_argument("--commands", nargs="+", choices=COMMANDS, help="Commands to time (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per command (default: 3)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--atlas", type=Path, default=REPO_ROOT / "atlas.py", help="atlas.py bundle to benchmark")
+    parser.add_argument("--workdir", type=Path, help="Keep generated workspaces here instead of a temp dir")
+    parser.add_argument("--output", "-o", type=Path, default=Path("bench-results.json"))
+    args = parser.parse_args(argv)
+
+    if not args.atlas.exists():
+        print(f"[ERR] atlas.py not found: {args.atlas}")
+        return 1
+    if args.workdir:
+        args.workdir.mkdir(parents=True, exist_ok=True)
+
+    report = run_benchmarks(args.sizes, args.atlas, args.commands, args.repeat, args.seed, args.workdir)
+    args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(f"[DONE] Wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
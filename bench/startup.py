@@ -0,0 +1,133 @@
+"""Check each subcommand's start-up cost with `python -X importtime`.
+
+Every command runs in a fresh `python -B -X importtime` process that
+imports the atlas.py bundle as a module and calls main(), so the import
+report covers compiling the bundle, running its top level and every module
+the command pulls in on the way. A command fails the check when its total
+import time goes over its budget, or when it loads a module it should
+never need (the git helpers' subprocess, init's payload decoder).
+
+    python -m bench.startup
+    python -m bench.startup --atlas atlas.py --scale 2
+"""
+from __future__ import annotations
+
+import argparse
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from .generate import generate_workspace
+from .runner import REPO_ROOT, command_argv
+
+# Total import time per command, in milliseconds, including -X importtime's
+# own overhead. Compiling the bundle dominates every command; these leave
+# about 1.5x headroom over a typical developer machine (use --scale on
+# slower ones).
+BUDGETS_MS = {
+    "version": 140,
+    "doctor": 150,
+    "capture": 150,
+    "run": 150,
+    "finish": 150,
+    "sync": 150,
+    "init": 160,
+}
+
+# Modules that no command should import while starting up.
+FORBIDDEN_MODULES = {"dataclasses", "inspect", "subprocess"}
+
+# Modules only the listed commands may import.
+COMMAND_ONLY_MODULES = {"base64": {"init"}}
+
+# Import atlas.py as a module so its own compile and top level are timed too.
+IMPORT_SNIPPET = "import sys, atlas; sys.exit(atlas.main(sys.argv[1:]))"
+
+
+def command_args(name: str, manifest: dict) -> list[str]:
+    if name == "version":
+        return ["--version"]
+    return command_argv(name, manifest, 0)
+
+
+def import_report(workspace: Path, argv: list[str]) -> tuple[int, set[str], int]:
+    """Total self import time in microseconds, the modules imported, and the exit code."""
+    result = subprocess.run(
+        [sys.executable, "-B", "-X", "importtime", "-c", IMPORT_SNIPPET, *argv],
+        cwd=workspace,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    total = 0
+    modules: set[str] = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, _, name = (part.strip() for part in line[len("import time:") :].split("|"))
+        if not self_us.isdigit():
+            continue  # column header
+        total += int(self_us)
+        modules.add(name)
+    return total, modules, result.returncode
+
+
+def check_command(name: str, workspace: Path, manifest: dict, repeat: int, scale: float) -> list[str]:
+    """Problems found for one command (empty when it is within budget)."""
+    argv = command_args(name, manifest)
+    samples = []
+    modules: set[str] = set()
+    for _ in range(repeat):
+        total, modules, code = import_report(workspace, argv)
+        if code not in (0, 1):
+            return [f"{name}: exited with status {code}"]
+        samples.append(total)
+    elapsed_ms = min(samples) / 1000
+    budget_ms = BUDGETS_MS[name] * scale
+    problems = []
+    if elapsed_ms > budget_ms:
+        problems.append(f"{name}: imports took {elapsed_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+    for module in sorted(FORBIDDEN_MODULES & modules):
+        problems.append(f"{name}: imported {module}")
+    for module, allowed in COMMAND_ONLY_MODULES.items():
+        if module in modules and name not in allowed:
+            problems.append(f"{name}: imported {module} (only {', '.join(sorted(allowed))} needs it)")
+    status = "ERR" if problems else "OK"
+    print(f"[{status}] {name:<8} {elapsed_ms:7.1f} ms  budget {budget_ms:5.0f} ms  {len(modules)} modules")
+    return problems
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench.startup", description="Check Atlas start-up budgets")
+    parser.add_argument("--atlas", type=Path, default=REPO_ROOT / "atlas.py", help="atlas.py bundle to check")
+    parser.add_argument("--commands", nargs="+", choices=list(BUDGETS_MS), help="Commands to check (default: all)")
+    parser.add_argument("--docs", type=int, default=200, help="Size of the generated workspace (default: 200)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per command; the fastest counts (default: 5)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget by this factor")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if not args.atlas.exists():
+        print(f"[ERR] atlas.py not found: {args.atlas}")
+        return 1
+
+    problems: list[str] = []
+    with tempfile.TemporaryDirectory(prefix="atlas-startup-") as temp:
+        workspace = Path(temp) / "ws"
+        manifest = generate_workspace(workspace, args.docs, seed=args.seed)
+        shutil.copy(args.atlas, workspace / "atlas.py")
+        for name in args.commands or list(BUDGETS_MS):
+            problems.extend(check_command(name, workspace, manifest, args.repeat, args.scale))
+
+    for problem in problems:
+        print(f"[ERR] {problem}")
+    if problems:
+        return 1
+    print("[DONE] Every command started within budget.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,90 @@
 #!/usr/bin/env python3
+"""Build the single-file atlas.py from src/.
+
+src/atlas_cli.py is copied verbatim (with its own source embedded for
+`init`, zlib-compressed and base85-encoded so the literal stays small).
+Local modules it imports from src/ (such as atlas_mcp) are embedded as
+strings and served by an in-memory importlib finder, so running the bundle
+never writes to disk or touches a temp directory.
+"""
 from __future__ import annotations
 
+import ast
 import base64
-import os
-import subprocess
 import sys
+import zlib
 from pathlib import Path
 
+PLACEHOLDER = "__EMBEDDED_SRC_PLACEHOLDER__"
+
+# Prepended when the bundle carries extra modules; defines no public names.
+# importlib.abc is left out on purpose: importing it costs more than the
+# rest of start-up combined.
+FINDER_PRELUDE = '''\
+import sys as _atlas_sys
+from importlib.machinery import ModuleSpec as _AtlasModuleSpec
+
+_ATLAS_MODULES = {modules}
+
+
+class _AtlasBundleImporter:
+    """Import the modules embedded in this file straight from memory."""
+
+    def find_spec(self, name, path=None, target=None):
+        if name not in _ATLAS_MODULES:
+            return None
+        return _AtlasModuleSpec(name, self, origin=f"{{__file__}}/{{name}}.py")
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        code = compile(_ATLAS_MODULES[module.__name__], module.__spec__.origin, "exec")
+        exec(code, module.__dict__)
+
+
+_atlas_sys.meta_path.insert(0, _AtlasBundleImporter())
+
+'''
+
+
+def local_imports(source: str, src_dir: Path) -> set[str]:
+    """Top-level module names imported by source that live in src_dir."""
+    names: set[str] = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split(".")[0])
+    return {name for name in names if (src_dir / f"{name}.py").is_file()}
+
+
+def collect_modules(main: Path) -> dict[str, str]:
+    """Every src/ module reachable from main's imports, by module name."""
+    src_dir = main.parent
+    modules: dict[str, str] = {}
+    pending = sorted(local_imports(main.read_text(encoding="utf-8"), src_dir) - {main.stem})
+    while pending:
+        name = pending.pop()
+        if name in modules or name == main.stem:
+            continue
+        modules[name] = (src_dir / f"{name}.py").read_text(encoding="utf-8")
+        pending.extend(sorted(local_imports(modules[name], src_dir)))
+    return modules
+
+
+def split_header(source: str) -> tuple[str, str]:
+    """Split source after its shebang, encoding line and module docstring."""
+    lines = source.splitlines(keepends=True)
+    end = 0
+    while end < len(lines) and lines[end].startswith("#"):
+        end += 1
+    tree = ast.parse(source)
+    if tree.body and isinstance(tree.body[0], ast.Expr) and isinstance(tree.body[0].value, ast.Constant):
+        if isinstance(tree.body[0].value.value, str):
+            end = max(end, tree.body[0].end_lineno)
+    return "".join(lines[:end]), "".join(lines[end:])
+
 
 def main() -> int:
     root = Path(__file__).resolve().parent
@@ -15,48 +93,24 @@ def main() -> int:
 
     # Read original source for embedding
     original_src = src.read_text(encoding="utf-8")
-    embedded_b64 = base64.b64encode(original_src.encode("utf-8")).decode("ascii")
-    print(f"Encoded source: {len(original_src)} bytes -> {len(embedded_b64)} chars base64")
-
-    scripts_dir = Path(sys.executable).parent / "Scripts"
-    if scripts_dir.exists():
-        stickytape_exe = scripts_dir / "stickytape.exe"
-        if not stickytape_exe.exists():
-            stickytape_exe = scripts_dir / "stickytape"
-    else:
-        bin_dir = Path(sys.executable).parent / "bin"
-        stickytape_exe = bin_dir / "stickytape"
-
-    if not stickytape_exe.exists():
-        stickytape_cmd = "stickytape"
-    else:
-        stickytape_cmd = str(stickytape_exe)
-
-    cmd = [
-        stickytape_cmd,
-        "--add-python-path",
-        str(root / "src"),
-        str(src),
-    ]
-
-    env = os.environ.copy()
-    env["PYTHONIOENCODING"] = "utf-8"
-
-    result = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8", env=env)
-    if result.returncode != 0:
-        sys.stderr.write("stickytape failed. Is it installed?\n")
-        if result.stderr:
-            sys.stderr.write(result.stderr + "\n")
-        return result.returncode
-
-    # Replace placeholder with embedded source
-    output = result.stdout
-    placeholder = '__EMBEDDED_SRC_PLACEHOLDER__'
-    if placeholder in output:
-        output = output.replace(f'EMBEDDED_SRC_B64 = "{placeholder}"', f'EMBEDDED_SRC_B64 = "{embedded_b64}"')
-        print(f"Embedded original source code ({len(embedded_b64)} chars)")
-    else:
-        sys.stderr.write("WARNING: Placeholder not found in output\n")
+    compressed = zlib.compress(original_src.encode("utf-8"), 9)
+    embedded = base64.b85encode(compressed).decode("ascii")
+    print(f"Encoded source: {len(original_src)} bytes -> {len(embedded)} chars zlib+base85")
+
+    placeholder_line = f'EMBEDDED_SRC_B85 = "{PLACEHOLDER}"'
+    if placeholder_line not in original_src:
+        sys.stderr.write("WARNING: Placeholder not found in source\n")
+    output = original_src.replace(placeholder_line, f'EMBEDDED_SRC_B85 = "{embedded}"', 1)
+    print(f"Embedded original source code ({len(embedded)} chars)")
+
+    modules = collect_modules(src)
+    if modules:
+        if "from __future__" in output:
+            sys.stderr.write("atlas_cli.py must not use __future__ imports when modules are bundled.\n")
+            return 1
+        header, body = split_header(output)
+        output = header + FINDER_PRELUDE.format(modules=repr(modules)) + body
+        print(f"Bundled modules: {', '.join(sorted(modules))}")
 
     out_path.write_text(output, encoding="utf-8")
     print(f"Wrote {out_path}")
@@ -4,12 +4,13 @@
 import argparse
 import json
 import os
+import posixpath
 import re
 import sys
-import subprocess
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Iterable, Iterator, NamedTuple, Optional
 
 ATLAS_VERSION = "0.3.0"
 
@@ -34,74 +35,136 @@ CHANGELOG = {
 # If bundled as atlas.py in the root, parents[0] (or .parent) is the root.
 _path = Path(__file__).resolve()
 if _path.name == "atlas_cli.py":
-    REPO_ROOT = _path.parents[1]
+    TOOL_ROOT = _path.parents[1]
 else:
-    REPO_ROOT = _path.parent
-
-ATLAS_ROOT = REPO_ROOT / ".atlas"
-SYSTEM_ROOT = ATLAS_ROOT / ".system"
-TEMPLATES_DIR = SYSTEM_ROOT / "templates"
-STATE_DIR = SYSTEM_ROOT / "state"
-LAST_RUN_PATH = STATE_DIR / "last_run.json"
-VERSION_PATH = SYSTEM_ROOT / "VERSION"
-SRC_DEFAULTS_ROOT = REPO_ROOT / "src" / ".system_defaults"
+    TOOL_ROOT = _path.parent
+
+# Tool defaults always come from the checkout/bundle this module lives in.
+SRC_DEFAULTS_ROOT = TOOL_ROOT / "src" / ".system_defaults"
 SRC_DEFAULT_TEMPLATES_DIR = SRC_DEFAULTS_ROOT / "templates"
 SRC_DEFAULT_TOP_DOCS_DIR = SRC_DEFAULTS_ROOT / "top_docs"
 SRC_DEFAULT_PROMPTS_DIR = SRC_DEFAULTS_ROOT / "prompts"
 
-REQ_DIR = ATLAS_ROOT / "req"
-RULE_DIR = ATLAS_ROOT / "rule"
-ADR_DIR = ATLAS_ROOT / "adr"
-CQ_DIR = ATLAS_ROOT / "cq"
-VIEWS_DIR = ATLAS_ROOT / "views"
-INBOX_DIR = ATLAS_ROOT / "inbox"  # Unstructured notes, excluded from doctor
-DRAFTS_DIR = ATLAS_ROOT / "drafts"
-BRIEF_DIR = DRAFTS_DIR / "brief"
-RUN_DIR = ATLAS_ROOT / "runs"
-ARCHIVE_DIR = ATLAS_ROOT / "archive"
-
-REQUIRED_TOP_DOCS = [
-    ATLAS_ROOT / "FRONT.md",
-    ATLAS_ROOT / "BOARD.md",
-    ATLAS_ROOT / "CONVENTIONS.md",
-]
-
-OPTIONAL_TOP_DOCS = [
-    ATLAS_ROOT / "GOALS.md",
-]
-
-REQ_ID_PATTERN = re.compile(r"^REQ-([A-Z]+)-(\d{3})$")
-RULE_ID_PATTERN = re.compile(r"^RULE-([A-Z]+)-(\d{3})$")
-ADR_ID_PATTERN = re.compile(r"^ADR-([A-Z]+)-(\d{3})$")
-CQ_ID_PATTERN = re.compile(r"^CQ-([A-Z]+)-(\d{3})$")
-BRIEF_ID_PATTERN = re.compile(r"^BRIEF-([A-Z]+)-(\d{3})$")
-RUN_ID_PATTERN = re.compile(r"^RUN-(BRIEF|REQ)-([A-Z]+)-(\d{3})-step-(\d{2})$")
-
-META_RE = re.compile(r"^>\s*\*\*([^*]+)\*\*:\s*(.+)$")
-HEADER_ID_RE = re.compile(r"^#\s+\[([^\]]+)\]", re.M)
-LINK_RE = re.compile(r"\[[^\]]*\]\(([^)]+)\)")
-REQ_REF_RE = re.compile(r"REQ-[A-Z]+-\d{3}")
-REF_TOKEN_RE = re.compile(r"@(?P<id>REQ-[A-Z]+-\d{3})(?:#[^)\s]+)?")
+
+def set_workspace(repo_root: Path) -> None:
+    """Point every workspace path (.atlas/ and its folders) at repo_root."""
+    global REPO_ROOT, ATLAS_ROOT, SYSTEM_ROOT, TEMPLATES_DIR, STATE_DIR, LAST_RUN_PATH
+    global DOC_INDEX_PATH, DOCTOR_CACHE_PATH, GIT_OBJECTS_PATH, SEQUENCES_PATH, LOCKS_DIR, VERSION_PATH, PATCH_DIR
+    global SCHEMAS_PATH, WORKFLOW_PATH, JOURNAL_PATH, JOURNAL_LOCK_PATH, RUNS_LOG_PATH, ACTIVE_RUNS_PATH
+    global SERVER_SOCKET_PATH, SERVER_LOCK_PATH
+    global REQ_DIR, RULE_DIR, ADR_DIR, CQ_DIR, VIEWS_DIR, INBOX_DIR, DRAFTS_DIR, BRIEF_DIR, RUN_DIR, ARCHIVE_DIR
+    global REQUIRED_TOP_DOCS, OPTIONAL_TOP_DOCS, _DOC_INDEX
+
+    REPO_ROOT = Path(repo_root).resolve()
+    ATLAS_ROOT = REPO_ROOT / ".atlas"
+    SYSTEM_ROOT = ATLAS_ROOT / ".system"
+    TEMPLATES_DIR = SYSTEM_ROOT / "templates"
+    STATE_DIR = SYSTEM_ROOT / "state"
+    LAST_RUN_PATH = STATE_DIR / "last_run.json"
+    RUNS_LOG_PATH = STATE_DIR / "runs.jsonl"
+    ACTIVE_RUNS_PATH = STATE_DIR / "active_runs.json"
+    DOC_INDEX_PATH = STATE_DIR / "doc_index.json"
+    DOCTOR_CACHE_PATH = STATE_DIR / "doctor_cache.json"
+    GIT_OBJECTS_PATH = STATE_DIR / "git_objects.json"
+    SEQUENCES_PATH = STATE_DIR / "sequences.json"
+    LOCKS_DIR = STATE_DIR / "locks"
+    JOURNAL_PATH = STATE_DIR / "journal.json"
+    JOURNAL_LOCK_PATH = STATE_DIR / "journal.lock"
+    SERVER_SOCKET_PATH = STATE_DIR / "atlas.sock"
+    SERVER_LOCK_PATH = STATE_DIR / "atlas.sock.lock"
+    VERSION_PATH = SYSTEM_ROOT / "VERSION"
+    SCHEMAS_PATH = SYSTEM_ROOT / "schemas.json"
+    WORKFLOW_PATH = SYSTEM_ROOT / "workflow.json"
+    PATCH_DIR = ATLAS_ROOT / "patch"
+
+    REQ_DIR = ATLAS_ROOT / "req"
+    RULE_DIR = ATLAS_ROOT / "rule"
+    ADR_DIR = ATLAS_ROOT / "adr"
+    CQ_DIR = ATLAS_ROOT / "cq"
+    VIEWS_DIR = ATLAS_ROOT / "views"
+    INBOX_DIR = ATLAS_ROOT / "inbox"  # Unstructured notes, excluded from doctor
+    DRAFTS_DIR = ATLAS_ROOT / "drafts"
+    BRIEF_DIR = DRAFTS_DIR / "brief"
+    RUN_DIR = ATLAS_ROOT / "runs"
+    ARCHIVE_DIR = ATLAS_ROOT / "archive"
+
+    REQUIRED_TOP_DOCS = [
+        ATLAS_ROOT / "FRONT.md",
+        ATLAS_ROOT / "BOARD.md",
+        ATLAS_ROOT / "CONVENTIONS.md",
+    ]
+
+    OPTIONAL_TOP_DOCS = [
+        ATLAS_ROOT / "GOALS.md",
+    ]
+
+    # The document index is per workspace.
+    _DOC_INDEX = None
+
+
+set_workspace(TOOL_ROOT)
+
+
+class LazyPattern:
+    """A regex compiled on first use, so start-up only pays for the patterns a command touches.
+
+    Attribute lookups are forwarded to the compiled re.Pattern and cached on
+    the instance, so later calls cost the same as on the pattern itself.
+    """
+
+    def __init__(self, pattern: str, flags: int = 0) -> None:
+        self.pattern = pattern
+        self.flags = flags
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = getattr(re.compile(self.pattern, self.flags), name)
+        setattr(self, name, value)
+        return value
+
+    def __reduce__(self):
+        return LazyPattern, (self.pattern, self.flags)
+
+
+# ID numbers are zero-padded to three digits (RUN steps to two) and widen
+# past 999 (99) without padding, so every number has exactly one spelling:
+# REQ-CORE-007, REQ-CORE-999, REQ-CORE-1000, but never REQ-CORE-0007.
+ID_NUMBER = r"(?:\d{3}|[1-9]\d{3,})"
+STEP_NUMBER = r"(?:\d{2}|[1-9]\d{2,})"
+REQ_ID_PATTERN = LazyPattern(rf"^REQ-([A-Z]+)-({ID_NUMBER})$")
+RULE_ID_PATTERN = LazyPattern(rf"^RULE-([A-Z]+)-({ID_NUMBER})$")
+ADR_ID_PATTERN = LazyPattern(rf"^ADR-([A-Z]+)-({ID_NUMBER})$")
+CQ_ID_PATTERN = LazyPattern(rf"^CQ-([A-Z]+)-({ID_NUMBER})$")
+BRIEF_ID_PATTERN = LazyPattern(rf"^BRIEF-([A-Z]+)-({ID_NUMBER})$")
+RUN_ID_PATTERN = LazyPattern(rf"^RUN-(BRIEF|REQ)-([A-Z]+)-({ID_NUMBER})-step-({STEP_NUMBER})$")
+
+META_RE = LazyPattern(r"^>\s*\*\*([^*]+)\*\*:\s*(.+)$")
+HEADER_ID_RE = LazyPattern(r"^#\s+\[([^\]]+)\]", re.M)
+LINK_RE = LazyPattern(r"\[[^\]]*\]\(([^)]+)\)")
+REQ_REF_RE = LazyPattern(rf"REQ-[A-Z]+-{ID_NUMBER}(?!\d)")
+REF_TOKEN_RE = LazyPattern(rf"@(?P<id>REQ-[A-Z]+-{ID_NUMBER})(?!\d)(?:#[^)\s]+)?")
+ID_DIGITS_RE = LazyPattern(r"(\d+)")
 NORMATIVE_KEYWORDS = ["반드시", "해야", "불가", "금지", "항상"]
 
 ALLOWED_MUST_READ_PREFIXES = {"RULE"}
 
-PATCH_DIR = ATLAS_ROOT / "patch"
 
 # Embedded source code (populated by build.py)
-# __EMBEDDED_SRC_PLACEHOLDER__ will be replaced with base64-encoded source
-EMBEDDED_SRC_B64 = "__EMBEDDED_SRC_PLACEHOLDER__"
+# __EMBEDDED_SRC_PLACEHOLDER__ will be replaced with the zlib-compressed,
+# base85-encoded source; only `init` decodes it.
+EMBEDDED_SRC_B85 = "__EMBEDDED_SRC_PLACEHOLDER__"
 
 # Checkbox patterns
-CHECKBOX_UNCHECKED = re.compile(r"^(\s*)-\s*\[\s*\](.*)$")
-CHECKBOX_CHECKED = re.compile(r"^(\s*)-\s*\[x\](.*)$", re.IGNORECASE)
-TRACEABILITY_LINK_RE = re.compile(r"\*\*(?:Implements|Answers|Solved by|Implemented by)\*\*:\s*\[([^\]]+)\]\(([^)]+)\)")
+CHECKBOX_UNCHECKED = LazyPattern(r"^(\s*)-\s*\[\s*\](.*)$")
+CHECKBOX_CHECKED = LazyPattern(r"^(\s*)-\s*\[x\](.*)$", re.IGNORECASE)
+TRACEABILITY_LINK_RE = LazyPattern(r"\*\*(?:Implements|Answers|Solved by|Implemented by)\*\*:\s*\[([^\]]+)\]\(([^)]+)\)")
 
 DEFAULT_TOP_DOCS = {
-    ATLAS_ROOT / "FRONT.md": """# Atlas\n\nThis repo uses Atlas vNext.\nUse: `python atlas.py init`\n\nQuick flow:\n1) `python atlas.py capture \"...\" --domain GEN`\n2) `python atlas.py run REQ-GEN-001`\n3) `python atlas.py finish RUN-REQ-GEN-001-step-01 --git <hash|no-commit> --success true`\n\nLinks: BOARD.md, CONVENTIONS.md, GOALS.md\n""",
-    ATLAS_ROOT / "BOARD.md": """# BOARD\n\n> 이 문서는 프로젝트의 **현재 작업 상태 스냅샷**을 나타냅니다.\n> 비어 있는 경우, 해당 상태에 해당하는 작업이 없음을 의미합니다.\n\n## Queue\n- (empty)\n\n## Active\n- (empty)\n\n## Done\n- (empty)\n\n> Last Reviewed: YYYY-MM-DD\n""",
-    ATLAS_ROOT / "CONVENTIONS.md": """# CONVENTIONS\n\n## Boundaries\n\n### Always\n- Keep REQ/RULE/ADR/CQ as authority; do not auto-edit without intent.\n- Record verification steps in RUN.\n\n### Ask First\n- Add or remove dependencies.\n- Change storage layout under `.atlas/`.\n\n### Never\n- Hardcode secrets.\n- Modify existing REQ/RULE/ADR/CQ silently.\n\n## Roles (one-line)\n- REQ: what the system must do (SSOT).\n- RULE: constraints that must always hold (SSOT).\n- ADR: architectural decisions (SSOT).\n- CQ: questions the system must answer.\n- VIEW: human-readable context.\n- DRAFT: optional intake scratchpad.\n- RUN: execution plan and evidence.\n\n## Verification\n- `python atlas.py doctor`\n- (project tests as defined)\n""",
-    ATLAS_ROOT / "GOALS.md": """# GOALS\n\n- Purpose: (fill in)\n- In scope: (fill in)\n- Out of scope: (fill in)\n""",
+    "FRONT.md": """# Atlas\n\nThis repo uses Atlas vNext.\nUse: `python atlas.py init`\n\nQuick flow:\n1) `python atlas.py capture \"...\" --domain GEN`\n2) `python atlas.py run REQ-GEN-001`\n3) `python atlas.py finish RUN-REQ-GEN-001-step-01 --git <hash|no-commit> --success true`\n\nLinks: BOARD.md, CONVENTIONS.md, GOALS.md\n""",
+    "BOARD.md": """# BOARD\n\n> 이 문서는 프로젝트의 **현재 작업 상태 스냅샷**을 나타냅니다.\n> 비어 있는 경우, 해당 상태에 해당하는 작업이 없음을 의미합니다.\n\n## Queue\n- (empty)\n\n## Active\n- (empty)\n\n## Done\n- (empty)\n\n> Last Reviewed: YYYY-MM-DD\n""",
+    "CONVENTIONS.md": """# CONVENTIONS\n\n## Boundaries\n\n### Always\n- Keep REQ/RULE/ADR/CQ as authority; do not auto-edit without intent.\n- Record verification steps in RUN.\n\n### Ask First\n- Add or remove dependencies.\n- Change storage layout under `.atlas/`.\n\n### Never\n- Hardcode secrets.\n- Modify existing REQ/RULE/ADR/CQ silently.\n\n## Roles (one-line)\n- REQ: what the system must do (SSOT).\n- RULE: constraints that must always hold (SSOT).\n- ADR: architectural decisions (SSOT).\n- CQ: questions the system must answer.\n- VIEW: human-readable context.\n- DRAFT: optional intake scratchpad.\n- RUN: execution plan and evidence.\n\n## Verification\n- `python atlas.py doctor`\n- (project tests as defined)\n""",
+    "GOALS.md": """# GOALS\n\n- Purpose: (fill in)\n- In scope: (fill in)\n- Out of scope: (fill in)\n""",
 }
 
 DEFAULT_TEMPLATES = {
@@ -202,9 +265,10 @@ LLM은 다음 기준에 따라 각 문서를 엄격하게 평가해야 합니다
 
 def get_version() -> str:
     """Read version from VERSION file (SSOT)."""
-    if VERSION_PATH.exists():
+    try:
         return VERSION_PATH.read_text(encoding="utf-8").strip()
-    return "unknown"
+    except OSError:
+        return "unknown"
 
 
 def now_date() -> str:
@@ -223,18 +287,107 @@ def read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8")
 
 
+def atomic_write(path: Path, content: str, durable: bool = True) -> None:
+    """Write content to a temp file beside path and rename it into place.
+
+    Readers see either the old or the new file, never a torn one. With
+    durable, the temp file (and on POSIX the directory entry) is fsynced,
+    so the new content also survives a crash.
+    """
+    tmp_path = write_temp(path, content, fsync=durable)
+    try:
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    if durable:
+        fsync_dir(path.parent)
+
+
+def write_temp(path: Path, content: str, fsync: bool) -> Path:
+    """Write content to a new temp file beside path (with path's mode) and return the temp path."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{os.urandom(4).hex()}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(content)
+            if fsync:
+                handle.flush()
+                os.fsync(handle.fileno())
+        try:
+            os.chmod(tmp_path, path.stat().st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return tmp_path
+
+
+def fsync_path(path: Path) -> None:
+    """fsync a file or directory through a read-only descriptor (POSIX only)."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_dir(path: Path) -> None:
+    """Persist directory entries (renames) on POSIX; Windows has no directory fsync."""
+    if os.name != "nt":
+        fsync_path(path)
+
+
 def write_text(path: Path, content: str) -> None:
-    path.write_text(content, encoding="utf-8")
+    atomic_write(path, content)
+    if _DOC_INDEX is not None:
+        _DOC_INDEX.invalidate(path)
+
+
+def write_files(files: list[tuple[Path, str]]) -> None:
+    """Atomically write many files with one group flush instead of a flush per write.
+
+    Every temp file is written first and only then fsynced one by one, so
+    the kernel writes them back together and the later fsyncs find little
+    left to do. They are then renamed into place, and finally each touched
+    directory is fsynced once. A crash leaves each file either old or new.
+    """
+    staged: list[tuple[Path, Path]] = []
+    # Windows cannot flush through a read-only handle; fsync each file as it is written there.
+    deferred = os.name != "nt"
+    try:
+        for path, content in files:
+            staged.append((write_temp(path, content, fsync=not deferred), path))
+        if deferred:
+            for tmp_path, _ in staged:
+                fsync_path(tmp_path)
+        for tmp_path, path in staged:
+            os.replace(tmp_path, path)
+    except BaseException:
+        for tmp_path, _ in staged:
+            tmp_path.unlink(missing_ok=True)
+        raise
+    for directory in {path.parent for _, path in staged}:
+        fsync_dir(directory)
+    if _DOC_INDEX is not None:
+        for _, path in staged:
+            _DOC_INDEX.invalidate(path)
+
+
+def write_json_atomic(path: Path, data: dict) -> None:
+    """Write compact JSON atomically; caches are rebuildable, so skip the fsync."""
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    atomic_write(path, payload, durable=False)
 
 
 def load_default_top_docs() -> dict[Path, str]:
     docs = dict(DEFAULT_TOP_DOCS)
     if SRC_DEFAULT_TOP_DOCS_DIR.is_dir():
         for path in sorted(SRC_DEFAULT_TOP_DOCS_DIR.glob("*.md")):
-            target = ATLAS_ROOT / path.name
-            if target in docs:
-                docs[target] = read_text(path)
-    return docs
+            if path.name in docs:
+                docs[path.name] = read_text(path)
+    return {ATLAS_ROOT / name: content for name, content in docs.items()}
 
 
 def load_default_templates() -> dict[str, str]:
@@ -258,9 +411,9 @@ def load_default_prompts() -> dict[str, str]:
 
 
 def load_default_system_files() -> dict[str, str]:
-    """Load VERSION and VERSIONING.md from src/.system_defaults/."""
+    """Load VERSION, VERSIONING.md and the doctor schemas from src/.system_defaults/."""
     files: dict[str, str] = {}
-    for name in ["VERSION", "VERSIONING.md", "CHANGELOG.md"]:
+    for name in ["VERSION", "VERSIONING.md", "CHANGELOG.md", "schemas.json", "workflow.json"]:
         src_path = SRC_DEFAULTS_ROOT / name
         if src_path.exists():
             files[name] = read_text(src_path)
@@ -269,9 +422,8 @@ def load_default_system_files() -> dict[str, str]:
 
 def load_default_src_files() -> dict[str, str]:
     """Load source files - either from defaults dir or embedded in atlas.py."""
-    import base64
     files: dict[str, str] = {}
-    
+
     # Try loading from src/.system_defaults/src/ first (development mode)
     src_dir = SRC_DEFAULTS_ROOT / "src"
     if src_dir.is_dir():
@@ -279,12 +431,18 @@ def load_default_src_files() -> dict[str, str]:
             files[path.name] = read_text(path)
     
     # If no files found, try embedded source (distribution mode)
-    if not files and EMBEDDED_SRC_B64 != "__EMBEDDED_SRC_PLACEHOLDER__":
+    if not files and EMBEDDED_SRC_B85 != "__EMBEDDED_SRC_PLACEHOLDER__":
+        import base64
+        import zlib
+
         try:
-            decoded = base64.b64decode(EMBEDDED_SRC_B64).decode("utf-8")
+            decoded = zlib.decompress(base64.b85decode(EMBEDDED_SRC_B85)).decode("utf-8")
             files["atlas_cli.py"] = decoded
         except Exception:
             pass
+        # Modules bundled next to it by build.py (served from memory when imported).
+        for name, source in globals().get("_ATLAS_MODULES", {}).items():
+            files[f"{name}.py"] = source
     
     return files
 
@@ -296,13 +454,23 @@ def load_template(name: str) -> str:
     return read_text(template_path)
 
 
+def id_sort_key(name: str) -> tuple[list, str]:
+    """Sort key that orders the numbers in IDs and paths by value.
+
+    REQ-CORE-999 sorts before REQ-CORE-1000 and step-99 before step-100;
+    for three-digit IDs the order is the same as plain string order.
+    """
+    parts: list = ID_DIGITS_RE.split(name)
+    parts[1::2] = [int(digits) for digits in parts[1::2]]
+    return parts, name
+
+
 def iter_md_files(dirs: Iterable[Path]) -> list[Path]:
     files: list[Path] = []
     for base in dirs:
         if not base.is_dir():
             continue
-        for path in base.rglob("*.md"):
-            files.append(path)
+        files.extend(sorted(base.rglob("*.md"), key=lambda path: id_sort_key(str(path))))
     return files
 
 
@@ -321,6 +489,43 @@ def extract_header_id(text: str) -> Optional[str]:
     return match.group(1).strip() if match else None
 
 
+HEADER_CHUNK_SIZE = 512
+HEADER_MAX_LINES = 60
+
+
+def read_header(path: Path) -> tuple[dict[str, str], Optional[str]]:
+    """Read only the `> **Key**: value` block at the top of a document.
+
+    The file is streamed in small chunks and reading stops at the first `---`
+    rule or `## ` section, so long bodies are never loaded. Returns
+    (meta, header_id).
+    """
+    meta: dict[str, str] = {}
+    header_id: Optional[str] = None
+    pending = b""
+    line_no = 0
+    with open(path, "rb") as handle:
+        while True:
+            chunk = handle.read(HEADER_CHUNK_SIZE)
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop() if chunk else b""
+            for raw in lines:
+                line = raw.decode("utf-8").strip()
+                line_no += 1
+                if line == "---" or line.startswith("## ") or line_no > HEADER_MAX_LINES:
+                    return meta, header_id
+                if header_id is None:
+                    match = HEADER_ID_RE.match(line)
+                    if match:
+                        header_id = match.group(1).strip()
+                        continue
+                match = META_RE.match(line)
+                if match:
+                    meta[match.group(1).strip()] = match.group(2).strip()
+            if not chunk:
+                return meta, header_id
+
+
 def parse_must_read(value: str) -> list[str]:
     raw = value.strip()
     if raw.lower() == "none":
@@ -335,7 +540,7 @@ def parse_must_read(value: str) -> list[str]:
     return ids
 
 
-def next_id(prefix: str, domain: str, dir_path: Path, pattern: re.Pattern) -> str:
+def scan_max_id(prefix: str, domain: str, dir_path: Path, pattern: re.Pattern) -> int:
     max_n = 0
     if dir_path.exists():
         for path in dir_path.glob(f"{prefix}-{domain}-*.md"):
@@ -344,15 +549,10 @@ def next_id(prefix: str, domain: str, dir_path: Path, pattern: re.Pattern) -> st
                 num = int(match.group(2))
                 if num > max_n:
                     max_n = num
-    return f"{prefix}-{domain}-{max_n + 1:03d}"
+    return max_n
 
 
-def next_run_step(req_id: str) -> int:
-    match = REQ_ID_PATTERN.match(req_id)
-    if not match:
-        return 1
-    domain = match.group(1)
-    number = match.group(2)
+def scan_max_run_step(domain: str, number: str) -> int:
     max_step = 0
     if RUN_DIR.exists():
         for path in RUN_DIR.glob(f"RUN-REQ-{domain}-{number}-step-*.md"):
@@ -361,21 +561,183 @@ def next_run_step(req_id: str) -> int:
                 step = int(run_match.group(4))
                 if step > max_step:
                     max_step = step
-    return max_step + 1
+    return max_step
+
+
+def next_id(prefix: str, domain: str, dir_path: Path, pattern: re.Pattern) -> str:
+    """Reserve the next free ID number for prefix/domain."""
+    return next_ids(prefix, domain, dir_path, pattern, 1)[0]
+
+
+def next_ids(prefix: str, domain: str, dir_path: Path, pattern: re.Pattern, count: int) -> list[str]:
+    """Reserve count consecutive IDs for prefix/domain with one counter update."""
+    first = SequenceStore().allocate(
+        "ids",
+        f"{prefix}-{domain}",
+        scan=lambda: scan_max_id(prefix, domain, dir_path, pattern),
+        taken=lambda n: (dir_path / f"{prefix}-{domain}-{n:03d}.md").exists(),
+        count=count,
+    )
+    return [f"{prefix}-{domain}-{number:03d}" for number in range(first, first + count)]
+
+
+def next_run_step(req_id: str) -> int:
+    """Reserve the next RUN step number for req_id."""
+    match = REQ_ID_PATTERN.match(req_id)
+    if not match:
+        return 1
+    domain = match.group(1)
+    number = match.group(2)
+    return SequenceStore().allocate(
+        "steps",
+        req_id,
+        scan=lambda: scan_max_run_step(domain, number),
+        taken=lambda n: (RUN_DIR / f"RUN-REQ-{domain}-{number}-step-{n:02d}.md").exists(),
+    )
 
 
-def update_meta_line(text: str, key: str, value: str) -> str:
-    lines = text.splitlines()
-    updated = False
-    for i, line in enumerate(lines):
-        if line.startswith("> **") and line.split("**", 2)[1].strip() == key:
-            lines[i] = f"> **{key}**: {value}"
-            updated = True
-            break
-    if not updated:
-        insert_at = 1 if lines else 0
-        lines.insert(insert_at, f"> **{key}**: {value}")
-    return "\n".join(lines) + "\n"
+SECTION_HEADING_RE = LazyPattern(r"^## (.+?)[ \t]*\r?$", re.M)
+
+
+class Document:
+    """A Markdown document parsed once into header lines and a body string.
+
+    Only the header (title and `> **Key**: value` block, up to the first
+    `---` rule or `## ` heading) is split into lines; the body is kept as
+    one string and its sections are located by offset on first use.
+    set_meta()/set_section()/append_section() mark their region dirty and
+    render() re-emits untouched regions verbatim in a single pass, so
+    updating a field of a long REQ never re-tokenises its Capture log.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.header: list[str] = []
+        pos = 0
+        while pos < len(text) and len(self.header) < HEADER_MAX_LINES:
+            end = text.find("\n", pos)
+            if end == -1:
+                end = len(text)
+            line = text[pos:end].rstrip("\r")
+            stripped = line.strip()
+            if stripped == "---" or stripped.startswith("## "):
+                break
+            self.header.append(line)
+            pos = end + 1
+        self.body = text[pos:]
+        self.header_dirty = False
+        self._sections: Optional[dict[str, tuple[int, int]]] = None
+        self._section_edits: dict[str, str] = {}
+        self._appended: list[str] = []
+
+    @classmethod
+    def load(cls, path: Path, txn: Optional["Transaction"] = None) -> "Document":
+        return cls(txn.read(path) if txn is not None else read_text(path))
+
+    @property
+    def dirty(self) -> bool:
+        return self.header_dirty or bool(self._section_edits) or bool(self._appended)
+
+    @property
+    def meta(self) -> dict[str, str]:
+        meta: dict[str, str] = {}
+        for line in self.header:
+            match = META_RE.match(line.strip())
+            if match:
+                meta[match.group(1).strip()] = match.group(2).strip()
+        return meta
+
+    def _meta_index(self, key: str) -> Optional[int]:
+        for i, line in enumerate(self.header):
+            if line.startswith("> **") and line.split("**", 2)[1].strip() == key:
+                return i
+        return None
+
+    def set_meta(self, key: str, value: str) -> None:
+        """Set a header field, inserting it under the title if it is missing."""
+        line = f"> **{key}**: {value}"
+        index = self._meta_index(key)
+        if index is None:
+            self.header.insert(1 if self.header else 0, line)
+        elif self.header[index] != line:
+            self.header[index] = line
+        else:
+            return
+        self.header_dirty = True
+
+    def sections(self) -> dict[str, tuple[int, int]]:
+        """Map each `## ` heading to the (start, end) offsets of its body; first heading wins."""
+        if self._sections is None:
+            spans: dict[str, tuple[int, int]] = {}
+            matches = list(SECTION_HEADING_RE.finditer(self.body))
+            for i, match in enumerate(matches):
+                end = matches[i + 1].start() if i + 1 < len(matches) else len(self.body)
+                spans.setdefault(match.group(1), (min(match.end() + 1, end), end))
+            self._sections = spans
+        return self._sections
+
+    def has_section(self, heading: str) -> bool:
+        return heading in self._section_edits or heading in self.sections() or any(
+            block.startswith(f"\n## {heading}\n") for block in self._appended
+        )
+
+    def section(self, heading: str) -> Optional[str]:
+        if heading in self._section_edits:
+            return self._section_edits[heading]
+        span = self.sections().get(heading)
+        return self.body[span[0] : span[1]] if span else None
+
+    def set_section(self, heading: str, content: str) -> None:
+        """Replace a section's body, keeping the blank lines that separate it from the next one."""
+        old = self.section(heading)
+        if old is None:
+            raise KeyError(heading)
+        gap = old[len(old.rstrip("\n")) :] or "\n"
+        self._section_edits[heading] = content.rstrip("\n") + gap
+
+    def append_section(self, heading: str, content: str) -> None:
+        """Add a `## heading` section after the last one (trailing blank lines are dropped)."""
+        self._appended.append(f"\n## {heading}\n{content.strip()}\n")
+
+    def render(self) -> str:
+        if not self.dirty:
+            return self.text
+        if self.header_dirty:
+            head = "".join(line + "\n" for line in self.header)
+        else:
+            head = self.text[: len(self.text) - len(self.body)]
+        body = self.body
+        if self._section_edits:
+            spans = self.sections()
+            parts: list[str] = []
+            pos = 0
+            for heading, (start, end) in sorted(
+                ((heading, spans[heading]) for heading in self._section_edits), key=lambda item: item[1]
+            ):
+                parts.append(body[pos:start])
+                parts.append(self._section_edits[heading])
+                pos = end
+            parts.append(body[pos:])
+            body = "".join(parts)
+        text = head + body
+        if self._appended:
+            text = text.rstrip() + "".join(self._appended)
+        elif self.text and not self.text.endswith("\n"):
+            # Keep a missing final newline missing, so only the edited region changes.
+            text = text.rstrip("\n")
+        elif not text.endswith("\n"):
+            text += "\n"
+        return text
+
+    def save(self, path: Path, txn: Optional["Transaction"] = None) -> bool:
+        """Write the document back if it changed; returns whether it did."""
+        if not self.dirty:
+            return False
+        if txn is not None:
+            txn.write(path, self.render())
+        else:
+            write_text(path, self.render())
+        return True
 
 
 def normalize_status(value: str) -> str:
@@ -408,7 +770,7 @@ def parse_affected_artifacts(text: str) -> dict[str, list[str]]:
     return artifacts
 
 
-def update_brief_status(brief_id: str, status: str) -> bool:
+def update_brief_status(brief_id: str, status: str, txn: "Transaction") -> bool:
     if not BRIEF_ID_PATTERN.match(brief_id):
         print(f"[WARN] Invalid BRIEF ID in RUN meta: {brief_id}")
         return False
@@ -416,15 +778,18 @@ def update_brief_status(brief_id: str, status: str) -> bool:
     if not brief_path.exists():
         print(f"[WARN] BRIEF not found for RUN: {brief_path}")
         return False
-    brief_text = read_text(brief_path)
-    brief_text = update_meta_line(brief_text, "Status", status)
-    write_text(brief_path, brief_text)
-    print(f"[OK] Updated {brief_path}")
+    txn.lock(brief_path)
+    brief = Document.load(brief_path, txn)
+    brief.set_meta("Status", status)
+    brief.save(brief_path, txn)
     return True
 
 
+ANY_ID_RE = LazyPattern(rf"(?:REQ|RULE|ADR|CQ|BRIEF|RUN)-[A-Z]+-{ID_NUMBER}(?:-step-{STEP_NUMBER})?(?!\d)")
+
+
 def extract_ids_from_text(text: str) -> list[str]:
-    return re.findall(r"(?:REQ|RULE|ADR|CQ|BRIEF|RUN)-[A-Z]+-\d{3}(?:-step-\d{2})?", text)
+    return ANY_ID_RE.findall(text)
 
 
 def derive_title(text: str, fallback: str = "User Request") -> str:
@@ -452,23 +817,836 @@ def req_id_from_run_id(run_id: str) -> Optional[str]:
     return f"REQ-{domain}-{number}"
 
 
+GIT_HASH_RE = LazyPattern(r"^[0-9a-f]{40}(?:[0-9a-f]{24})?$")
+# HEAD per working directory; finish and batch scripts ask for it repeatedly.
+_GIT_HEADS: dict[Path, Optional[str]] = {}
+
+
+# Variables that change which repository or HEAD git itself would use.
+GIT_DISCOVERY_ENV = ("GIT_DIR", "GIT_COMMON_DIR", "GIT_WORK_TREE", "GIT_CEILING_DIRECTORIES")
+
+
+class UnsupportedGitLayout(Exception):
+    """The repository cannot be read natively; ask git instead."""
+
+
+def find_git_dir(start: Path) -> Optional[Path]:
+    """The .git directory for start, following `gitdir:` files of worktrees and submodules."""
+    for base in [start, *start.parents]:
+        dot_git = base / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            line = read_text(dot_git).strip()
+            if not line.startswith("gitdir:"):
+                raise UnsupportedGitLayout(dot_git)
+            return (base / line[len("gitdir:") :].strip()).resolve()
+    return None
+
+
+def resolve_git_ref(git_dir: Path, common_dir: Path, ref: str) -> str:
+    """Follow ref through loose and packed refs to a commit hash.
+
+    A ref that cannot be found (an unborn branch, or refs kept somewhere
+    this reader does not know) raises UnsupportedGitLayout, so git decides.
+    """
+    for _ in range(10):
+        if GIT_HASH_RE.match(ref):
+            return ref
+        if not ref.startswith("ref:"):
+            raise UnsupportedGitLayout(ref)
+        name = ref[len("ref:") :].strip()
+        for base in (git_dir, common_dir):
+            loose = base / name
+            if loose.is_file():
+                ref = read_text(loose).strip()
+                break
+        else:
+            packed = common_dir / "packed-refs"
+            if packed.is_file():
+                for line in read_text(packed).splitlines():
+                    if line.endswith(" " + name) and not line.startswith(("#", "^")):
+                        ref = line.split(" ", 1)[0]
+                        break
+            if not GIT_HASH_RE.match(ref):
+                raise UnsupportedGitLayout(name)
+    raise UnsupportedGitLayout(ref)
+
+
+def read_git_head(start: Path) -> Optional[str]:
+    """Resolve HEAD from .git/HEAD, loose refs and packed-refs without running git.
+
+    Handles branches, detached HEAD and linked worktrees (`commondir`);
+    raises UnsupportedGitLayout for anything else, e.g. reftable storage,
+    an unborn branch or environment overrides of repository discovery.
+    """
+    for name in GIT_DISCOVERY_ENV:
+        if os.environ.get(name):
+            raise UnsupportedGitLayout(name)
+    git_dir = find_git_dir(start)
+    if git_dir is None:
+        return None
+    common_dir = git_dir
+    commondir_file = git_dir / "commondir"
+    if commondir_file.is_file():
+        common_dir = (git_dir / read_text(commondir_file).strip()).resolve()
+    if (common_dir / "reftable").is_dir():
+        raise UnsupportedGitLayout("reftable")
+    try:
+        head = read_text(git_dir / "HEAD").strip()
+    except OSError as exc:
+        raise UnsupportedGitLayout(git_dir) from exc
+    return resolve_git_ref(git_dir, common_dir, head)
+
+
 def detect_git_hash() -> Optional[str]:
+    """HEAD commit of the repository around the current directory, cached per process."""
+    cwd = Path.cwd()
+    if cwd in _GIT_HEADS:
+        return _GIT_HEADS[cwd]
     try:
-        result = subprocess.run(
-            ["git", "rev-parse", "HEAD"],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-    except Exception:
-        return None
-    value = result.stdout.strip()
-    return value if value else None
+        value = read_git_head(cwd)
+    except (UnsupportedGitLayout, OSError, UnicodeDecodeError):
+        import subprocess
+
+        try:
+            result = subprocess.run(
+                ["git", "rev-parse", "HEAD"],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            value = result.stdout.strip() or None
+        except Exception:
+            value = None
+    _GIT_HEADS[cwd] = value
+    return value
+
+
+def write_last_run(state: dict, txn: Optional["Transaction"] = None) -> None:
+    ensure_dir(STATE_DIR)
+    content = json.dumps(state, indent=2) + "\n"
+    if txn is not None:
+        txn.lock(LAST_RUN_PATH)
+        txn.write(LAST_RUN_PATH, content)
+        return
+    with doc_lock(LAST_RUN_PATH):
+        write_text(LAST_RUN_PATH, content)
 
 
-def write_last_run(state: dict) -> None:
+# =============================================================================
+# Run log
+# =============================================================================
+
+ACTIVE_RUNS_VERSION = 1
+RUN_EVENTS = ("created", "executing", "finished", "failed")
+ACTIVE_RUN_EVENTS = {"created", "executing"}
+# RUN Status values sync may set, mapped to the lifecycle event they record.
+RUN_STATUS_EVENTS = {"inprogress": "executing", "active": "executing", "completed": "finished", "failed": "failed"}
+
+
+def append_run_event(event: str, run_id: str, **fields: str) -> None:
+    """Append one lifecycle event to state/runs.jsonl.
+
+    Each event is a single O_APPEND write, so concurrent writers never
+    need a lock and never interleave inside a line. last_run.json keeps
+    being written alongside for older tooling.
+    """
     ensure_dir(STATE_DIR)
-    write_text(LAST_RUN_PATH, json.dumps(state, indent=2) + "\n")
+    entry = {"event": event, "run_id": run_id, "at": now_iso(), **fields}
+    data = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+    fd = os.open(RUNS_LOG_PATH, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def load_active_runs() -> dict[str, dict]:
+    """RUNs whose latest event is created/executing, mapped to that event.
+
+    The view in state/active_runs.json remembers how far into runs.jsonl
+    it has read; only events appended since are read and applied, and the
+    view is saved again if it moved. A shorter log (truncated or replaced)
+    is replayed from the start.
+    """
+    try:
+        view = json.loads(read_text(ACTIVE_RUNS_PATH))
+    except (OSError, ValueError):
+        view = None
+    if (
+        not isinstance(view, dict)
+        or view.get("version") != ACTIVE_RUNS_VERSION
+        or not isinstance(view.get("runs"), dict)
+        or not isinstance(view.get("offset"), int)
+    ):
+        view = {"version": ACTIVE_RUNS_VERSION, "offset": 0, "runs": {}}
+    try:
+        with open(RUNS_LOG_PATH, "rb") as handle:
+            handle.seek(0, os.SEEK_END)
+            if handle.tell() < view["offset"]:
+                view = {"version": ACTIVE_RUNS_VERSION, "offset": 0, "runs": {}}
+            handle.seek(view["offset"])
+            data = handle.read()
+    except FileNotFoundError:
+        return {}
+    # A writer may be mid-append; leave an unterminated last line for next time.
+    end = data.rfind(b"\n") + 1
+    if not end:
+        return view["runs"]
+    runs = view["runs"]
+    for line in data[:end].splitlines():
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        run_id = entry.get("run_id") if isinstance(entry, dict) else None
+        if not run_id:
+            continue
+        if entry.get("event") in ACTIVE_RUN_EVENTS:
+            runs[run_id] = entry
+        else:
+            runs.pop(run_id, None)
+    view["offset"] += end
+    if STATE_DIR.is_dir():
+        write_json_atomic(ACTIVE_RUNS_PATH, view)
+    return runs
+
+
+# =============================================================================
+# Locks and sequence store
+# =============================================================================
+
+SEQUENCES_VERSION = 1
+
+# Blocks larger than this are checked with one directory scan instead of a stat per number.
+SEQUENCE_PROBE_LIMIT = 8
+
+# Seconds file_lock() keeps retrying a contended lock on Windows before giving up.
+FILE_LOCK_TIMEOUT = 300
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on path (created if missing) for the with-block.
+
+    Raises:
+        OSError: If the lock cannot be taken; on Windows also when it stays
+            contended for FILE_LOCK_TIMEOUT seconds.
+    """
+    ensure_dir(path.parent)
+    with open(path, "a+b") as handle:
+        if os.name == "nt":
+            import errno
+            import msvcrt
+            import time
+
+            handle.seek(0)
+            deadline = time.monotonic() + FILE_LOCK_TIMEOUT
+            while True:
+                try:
+                    # LK_LOCK gives up after ~10s of retries; keep waiting like flock does, up to the deadline.
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError as exc:
+                    if exc.errno not in (errno.EDEADLOCK, errno.EACCES) or time.monotonic() >= deadline:
+                        raise
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+# Lock files held by this process, so nested doc_lock() calls on one document do not self-deadlock.
+_HELD_LOCKS: dict[Path, int] = {}
+
+
+def doc_lock_path(path: Path) -> Path:
+    return LOCKS_DIR / (DocIndex.key(path).replace("/", "__") + ".lock")
+
+
+@contextmanager
+def doc_lock(*paths: Path) -> Iterator[None]:
+    """Hold the per-document write locks of paths for a read-modify-write.
+
+    Locks live in state/locks/ rather than on the documents themselves,
+    because atomic writes replace a document's inode. Every command takes
+    them in the same order: RUN, then BRIEF, then REQ, then view, then
+    anything else (last_run.json, patches), whether through nested
+    doc_lock() calls or one call with several paths.
+    """
+    from contextlib import ExitStack
+
+    with ExitStack() as stack:
+        for lock_path in sorted({doc_lock_path(path) for path in paths}, key=doc_lock_rank):
+            if _HELD_LOCKS.get(lock_path):
+                _HELD_LOCKS[lock_path] += 1
+            else:
+                stack.enter_context(file_lock(lock_path))
+                _HELD_LOCKS[lock_path] = 1
+            stack.callback(_release_held_lock, lock_path)
+        yield
+
+
+LOCK_ORDER = ["runs__", "drafts__brief__", "req__", "views__"]
+
+
+def doc_lock_rank(lock_path: Path) -> tuple[int, str]:
+    name = lock_path.name
+    rank = next((i for i, prefix in enumerate(LOCK_ORDER) if name.startswith(prefix)), len(LOCK_ORDER))
+    return rank, name
+
+
+def _release_held_lock(lock_path: Path) -> None:
+    _HELD_LOCKS[lock_path] -= 1
+    if not _HELD_LOCKS[lock_path]:
+        del _HELD_LOCKS[lock_path]
+
+
+class SequenceStore:
+    """High-water marks for ID numbers, persisted in state/sequences.json.
+
+    "ids" maps "PREFIX-DOMAIN" to the highest number handed out and "steps"
+    maps a REQ ID to its highest RUN step. Allocation reads and bumps one
+    counter under a file lock, so concurrent captures never get the same
+    number. A counter is rebuilt from a directory scan only when it is
+    missing or a number it would hand out is already taken on disk (files
+    added by hand, by git, or by an older Atlas).
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or SEQUENCES_PATH
+        self.lock_path = self.path.with_suffix(".lock")
+
+    def load(self) -> dict:
+        try:
+            data = json.loads(read_text(self.path))
+        except (OSError, ValueError):
+            data = None
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != SEQUENCES_VERSION
+            or not isinstance(data.get("ids"), dict)
+            or not isinstance(data.get("steps"), dict)
+        ):
+            return {"version": SEQUENCES_VERSION, "ids": {}, "steps": {}}
+        return data
+
+    def allocate(self, table: str, key: str, scan, taken, count: int = 1) -> int:
+        """Reserve count consecutive numbers for key and return the first.
+
+        scan() (the highest number on disk) and taken(n) repair a stale
+        counter: small blocks are probed number by number, larger ones
+        (bulk capture batches) with a single scan().
+        """
+        with file_lock(self.lock_path):
+            data = self.load()
+            current = data[table].get(key)
+            if not isinstance(current, int):
+                current = scan()
+            elif count > SEQUENCE_PROBE_LIMIT or any(taken(current + i) for i in range(1, count + 1)):
+                current = max(scan(), current)
+            data[table][key] = current + count
+            write_json_atomic(self.path, data)
+        return current + 1
+
+    def observe(self, table: str, key: str, number: int) -> None:
+        """Raise key's high-water mark to number (for IDs chosen explicitly)."""
+        with file_lock(self.lock_path):
+            data = self.load()
+            current = data[table].get(key)
+            if isinstance(current, int) and current >= number:
+                return
+            data[table][key] = number
+            write_json_atomic(self.path, data)
+
+
+# =============================================================================
+# Journal
+# =============================================================================
+
+JOURNAL_VERSION = 1
+
+
+def content_hash(content: Optional[str]) -> Optional[str]:
+    import hashlib
+
+    return None if content is None else hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def read_optional(path: Path) -> Optional[str]:
+    try:
+        return read_text(path)
+    except FileNotFoundError:
+        return None
+
+
+class Transaction:
+    """Edits to several documents that land together or not at all.
+
+    Commands stage new contents with write() (read() sees staged edits);
+    commit() first writes a durable redo journal to state/journal.json,
+    then writes every file with one group flush (see write_files) and
+    deletes the journal. If the process dies in between, recover_journal()
+    finishes the job on the next start. Used as a context manager, the
+    transaction commits on a clean exit and holds the doc_lock()s taken
+    through lock() until then.
+    """
+
+    def __init__(self, command: str):
+        from contextlib import ExitStack
+
+        self.command = command
+        self.files: dict[Path, str] = {}
+        self.before: dict[Path, Optional[str]] = {}
+        self.locks = ExitStack()
+
+    def __enter__(self) -> "Transaction":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        with self.locks:
+            if exc_type is None:
+                self.commit()
+
+    def lock(self, *paths: Path) -> None:
+        self.locks.enter_context(doc_lock(*paths))
+
+    def read(self, path: Path) -> str:
+        if path in self.files:
+            return self.files[path]
+        return read_text(path)
+
+    def write(self, path: Path, content: str) -> None:
+        if path not in self.before:
+            self.before[path] = content_hash(read_optional(path))
+        self.files[path] = content
+
+    def commit(self) -> None:
+        if not self.files:
+            return
+        journal = {
+            "version": JOURNAL_VERSION,
+            "command": self.command,
+            "created_at": now_iso(),
+            "files": [
+                {
+                    "path": DocIndex.key(path),
+                    "before": self.before[path],
+                    "after": content_hash(content),
+                    "content": content,
+                }
+                for path, content in self.files.items()
+            ],
+        }
+        with file_lock(JOURNAL_LOCK_PATH):
+            # Durable on its own before any document is written, so redo never depends on the payload flush.
+            atomic_write(JOURNAL_PATH, json.dumps(journal, ensure_ascii=False))
+            write_files(list(self.files.items()))
+            JOURNAL_PATH.unlink()
+            fsync_dir(STATE_DIR)
+
+
+def load_journal() -> Optional[dict]:
+    try:
+        data = json.loads(read_text(JOURNAL_PATH))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        data = None
+    if not isinstance(data, dict) or data.get("version") != JOURNAL_VERSION or not isinstance(data.get("files"), list):
+        return {}
+    return data
+
+
+def recover_journal() -> None:
+    """Finish a transaction that was interrupted after its journal became durable.
+
+    Files still holding their pre-transaction content are rewritten; files
+    already holding the new content are skipped; files edited since are
+    left alone with a warning. Without a journal nothing was written, so
+    there is nothing to roll back.
+    """
+    if not JOURNAL_PATH.exists():
+        return
+    data = load_journal()
+    if not data:
+        if data is not None:
+            aside = JOURNAL_PATH.with_name(JOURNAL_PATH.name + ".corrupt")
+            os.replace(JOURNAL_PATH, aside)
+            print(f"[WARN] Unreadable journal moved to {aside}")
+        return
+    paths = [ATLAS_ROOT / entry["path"] for entry in data["files"]]
+    with doc_lock(*paths), file_lock(JOURNAL_LOCK_PATH):
+        data = load_journal()
+        if not data:
+            return
+        files: list[tuple[Path, str]] = []
+        for entry in data["files"]:
+            path = ATLAS_ROOT / entry["path"]
+            current = content_hash(read_optional(path))
+            if current == entry["after"]:
+                continue
+            if current == entry["before"]:
+                files.append((path, entry["content"]))
+            else:
+                print(f"[WARN] {path} changed after the interrupted {data['command']}; left as is.")
+            for stale in path.parent.glob(f".{path.name}.*.tmp"):
+                stale.unlink(missing_ok=True)
+        if files:
+            write_files(files)
+        JOURNAL_PATH.unlink()
+        fsync_dir(STATE_DIR)
+    print(f"[INFO] Recovered interrupted {data['command']}: {len(files)} file(s) rewritten.")
+
+
+# =============================================================================
+# Parallel helpers
+# =============================================================================
+
+# Below this many items a process pool costs more than it saves.
+PARALLEL_MIN_ITEMS = 1000
+
+# Read-only state of a pool worker process (set once per worker by the initializer).
+_WORKER_CONTEXT: dict = {}
+
+
+def resolve_jobs(jobs: Optional[int]) -> int:
+    # Servers (atlas serve, atlas mcp) may have other threads running; never fork a pool from them.
+    if _SERVER is not None:
+        return 1
+    return max(1, jobs or os.cpu_count() or 1)
+
+
+def _set_worker_context(context: dict) -> None:
+    _WORKER_CONTEXT.clear()
+    _WORKER_CONTEXT.update(context)
+    # Spawned workers re-import the module and start out on the tool's workspace.
+    if context.get("repo_root") not in (None, REPO_ROOT):
+        set_workspace(context["repo_root"])
+
+
+def _run_chunk(func, items: list) -> list:
+    return func(items, _WORKER_CONTEXT)
+
+
+def map_chunks(func, items: list, jobs: int, context: Optional[dict] = None) -> list:
+    """Apply func(items, context) -> list to items, sharded over worker processes.
+
+    Results are concatenated in input order, so output stays deterministic
+    regardless of which worker finishes first. Small workloads, jobs=1 and
+    platforms without process pools run in-process, where context is passed
+    straight through, so concurrent callers on several threads never see
+    each other's context.
+    """
+    context = {"repo_root": REPO_ROOT, **(context or {})}
+    if jobs > 1 and len(items) >= PARALLEL_MIN_ITEMS:
+        from concurrent.futures import ProcessPoolExecutor
+        from functools import partial
+
+        size = -(-len(items) // (jobs * 4))
+        chunks = [items[i : i + size] for i in range(0, len(items), size)]
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(jobs, len(chunks)),
+                initializer=_set_worker_context,
+                initargs=(context,),
+            ) as pool:
+                results: list = []
+                for chunk_result in pool.map(partial(_run_chunk, func), chunks):
+                    results.extend(chunk_result)
+                return results
+        except (OSError, NotImplementedError):
+            pass
+    return func(items, context)
+
+
+# =============================================================================
+# Document index
+# =============================================================================
+
+DOC_INDEX_VERSION = 4
+
+VIEW_INDEX_HEADING = "## references (ssot index)"
+VIEW_SUMMARY_HEADING = "## summary"
+
+
+def parse_document(path: Path) -> dict:
+    """Parse a document into the fields cached by the document index.
+
+    The text is split into lines once; meta, links, checkboxes and sections
+    are all collected in the same pass.
+    """
+    text = read_text(path)
+    meta: dict[str, str] = {}
+    links: list[str] = []
+    checked = total = 0
+    sections: dict[str, list[str]] = {}
+    section: Optional[list[str]] = None
+    headings: list[str] = []
+    in_code = False
+    for i, line in enumerate(text.splitlines()):
+        stripped = line.strip()
+        if i < 60:
+            match = META_RE.match(stripped)
+            if match:
+                meta[match.group(1).strip()] = match.group(2).strip()
+        if CHECKBOX_CHECKED.match(line):
+            checked += 1
+            total += 1
+        elif CHECKBOX_UNCHECKED.match(line):
+            total += 1
+        if stripped.startswith("## "):
+            if not in_code:
+                headings.append(section_name(stripped))
+            key = stripped.lower()
+            section = None if key in sections else sections.setdefault(key, [])
+        elif section is not None:
+            section.append(line)
+        if stripped.startswith("```"):
+            in_code = not in_code
+            continue
+        if not in_code:
+            links.extend(match.group(1).strip() for match in LINK_RE.finditer(line))
+
+    record = {
+        "meta": meta,
+        "header_id": extract_header_id(text),
+        "links": links,
+        "req_refs": sorted(set(REQ_REF_RE.findall(text))),
+        "checkboxes": [checked, total],
+        "sections": headings,
+    }
+    if is_relative_to(path, VIEWS_DIR):
+        record["view"] = summarize_view(sections)
+    return record
+
+
+def summarize_view(sections: dict[str, list[str]]) -> dict:
+    """Collect the view fields doctor validates from pre-split sections."""
+    index_refs: set[str] = set()
+    for line in sections.get(VIEW_INDEX_HEADING, []):
+        index_refs.update(REQ_REF_RE.findall(line))
+    summary_refs: set[str] = set()
+    ok_without_ref = normative_without_ref = 0
+    for line in sections.get(VIEW_SUMMARY_HEADING, []):
+        if "<!--" in line:
+            continue
+        refs = [match.group("id") for match in REF_TOKEN_RE.finditer(line)]
+        summary_refs.update(refs)
+        if refs:
+            continue
+        if "ATLAS:OK" in line:
+            ok_without_ref += 1
+        if any(keyword in line for keyword in NORMATIVE_KEYWORDS):
+            normative_without_ref += 1
+    return {
+        "index_refs": sorted(index_refs),
+        "summary_refs": sorted(summary_refs),
+        "ok_without_ref": ok_without_ref,
+        "normative_without_ref": normative_without_ref,
+    }
+
+
+def stat_key(path: Path) -> Optional[list[int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+class DocIndex:
+    """Parsed documents cached on disk, invalidated per file by (mtime_ns, size, inode)."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or DOC_INDEX_PATH
+        self.entries: dict[str, dict] = {}
+        self.dirty = False
+        # Keys of directories a filesystem watcher keeps current (see watch()).
+        self.watched: set[str] = set()
+        # Sorted records per directory for records(), dropped on any change.
+        self._ordered: dict[str, list[tuple[Path, dict]]] = {}
+        # Bumped on every change. Records are replaced, never edited in place,
+        # so a shallow copy of entries stays a consistent snapshot.
+        self.generation = 0
+        self._load()
+
+    def _modified(self) -> None:
+        self.dirty = True
+        self.generation += 1
+        self._ordered.clear()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(read_text(self.path))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == DOC_INDEX_VERSION:
+            self.entries = data.get("docs", {})
+
+    @staticmethod
+    def key(path: Path) -> str:
+        raw = str(path)
+        root = str(ATLAS_ROOT) + os.sep
+        if raw.startswith(root):
+            return raw[len(root) :].replace(os.sep, "/")
+        return path.as_posix()
+
+    def get(self, path: Path) -> Optional[dict]:
+        """Return the parsed record for path, re-parsing only if the file changed."""
+        key = self.key(path)
+        stamp = stat_key(path)
+        if stamp is None:
+            if self.entries.pop(key, None) is not None:
+                self._modified()
+            return None
+        entry = self.entries.get(key)
+        if entry is not None and entry.get("stat") == stamp:
+            return entry
+        entry = parse_document(path)
+        entry["stat"] = stamp
+        self.entries[key] = entry
+        self._modified()
+        return entry
+
+    def scan(self, dirs: Iterable[Path], jobs: int = 1) -> list[tuple[Path, dict]]:
+        """Return (path, record) for every document under dirs, dropping deleted entries.
+
+        Stale entries are re-parsed across ``jobs`` worker processes when there
+        are enough of them to pay for the pool.
+        """
+        dirs = list(dirs)
+        if self.watched and all(self.key(d) in self.watched for d in dirs):
+            return self.records(dirs)
+        paths = iter_md_files(dirs)
+        keys = [self.key(path) for path in paths]
+        stale: list[tuple[Path, str, list[int]]] = []
+        for path, key in zip(paths, keys):
+            stamp = stat_key(path)
+            if stamp is None:
+                continue
+            entry = self.entries.get(key)
+            if entry is None or entry.get("stat") != stamp:
+                stale.append((path, key, stamp))
+        if stale:
+            parsed = map_chunks(parse_documents, [path for path, _, _ in stale], jobs)
+            for (_, key, stamp), entry in zip(stale, parsed):
+                entry["stat"] = stamp
+                self.entries[key] = entry
+            self._modified()
+
+        records = []
+        for path, key in zip(paths, keys):
+            entry = self.entries.get(key)
+            if entry is not None:
+                records.append((path, entry))
+        prefixes = tuple(self.key(d) + "/" for d in dirs)
+        seen = set(keys)
+        for key in [k for k in self.entries if k.startswith(prefixes) and k not in seen]:
+            del self.entries[key]
+            self._modified()
+        return records
+
+    def refresh(self, paths: Iterable[Path]) -> None:
+        """Re-read only the given documents, or directory trees, into the index."""
+        for path in paths:
+            if path.suffix == ".md":
+                self.get(path)
+            elif path.is_dir():
+                self.scan([path])
+            else:
+                prefix = self.key(path) + "/"
+                for key in [k for k in self.entries if k.startswith(prefix)]:
+                    del self.entries[key]
+                    self._modified()
+
+    def records(self, dirs: Iterable[Path]) -> list[tuple[Path, dict]]:
+        """Like scan(), but trusts the in-memory entries instead of stat-ing every file."""
+        records = []
+        for directory in dirs:
+            prefix = self.key(directory) + "/"
+            ordered = self._ordered.get(prefix)
+            if ordered is None:
+                keys = sorted((k for k in self.entries if k.startswith(prefix)), key=id_sort_key)
+                ordered = self._ordered[prefix] = [(ATLAS_ROOT / key, self.entries[key]) for key in keys]
+            records.extend(ordered)
+        return records
+
+    def watch(self, dirs: list[Path]) -> None:
+        """Scan dirs once, then let scan() trust memory for them.
+
+        The caller must feed every change under dirs to refresh(); `atlas
+        serve` does so from inotify events.
+        """
+        self.watched = set()
+        self.scan(dirs)
+        self.watched = {self.key(d) for d in dirs}
+
+    def invalidate(self, path: Path) -> None:
+        if self.entries.pop(self.key(path), None) is not None:
+            self._modified()
+
+    def save(self) -> None:
+        if not self.dirty or not STATE_DIR.is_dir():
+            return
+        write_json_atomic(self.path, {"version": DOC_INDEX_VERSION, "docs": self.entries})
+        self.dirty = False
+
+
+def parse_documents(paths: list[Path], context: Optional[dict] = None) -> list[dict]:
+    return [parse_document(path) for path in paths]
+
+
+# Process-wide index of the current workspace; reset by set_workspace().
+_DOC_INDEX: Optional[DocIndex] = None
+
+
+def doc_meta(path: Path) -> dict[str, str]:
+    """Header meta for one document.
+
+    Served from the document index when a long-running caller already holds
+    it in memory; otherwise only the header block is read from disk.
+    """
+    if _DOC_INDEX is not None:
+        record = _DOC_INDEX.get(path)
+        return record["meta"] if record else {}
+    try:
+        return read_header(path)[0]
+    except OSError:
+        return {}
+
+
+def doc_record(path: Path) -> dict:
+    """Full parsed record for one document, from the loaded index or a one-off parse."""
+    if _DOC_INDEX is not None:
+        return _DOC_INDEX.get(path) or {}
+    try:
+        return parse_document(path)
+    except OSError:
+        return {}
+
+
+def get_doc_index() -> DocIndex:
+    """Return the process-wide document index, loading it on first use."""
+    global _DOC_INDEX
+    if _DOC_INDEX is None:
+        _DOC_INDEX = DocIndex()
+    return _DOC_INDEX
+
+
+def save_doc_index() -> None:
+    if _DOC_INDEX is not None:
+        _DOC_INDEX.save()
 
 
 # =============================================================================
@@ -510,8 +1688,7 @@ def parse_traceability(text: str) -> dict[str, tuple[str, str]]:
 def resolve_linked_docs(run_path: Path) -> dict[str, Path]:
     """Resolve RUN -> BRIEF -> REQ chain. Returns {doc_type: path}."""
     docs = {}
-    text = read_text(run_path)
-    meta = extract_meta(text)
+    meta = doc_meta(run_path)
 
     # RUN -> REQ (direct)
     req_id = meta.get("REQ") or req_id_from_run_id(run_path.stem)
@@ -542,12 +1719,13 @@ def resolve_linked_docs(run_path: Path) -> dict[str, Path]:
 def compute_status_from_checkboxes(text: str) -> Optional[str]:
     """Compute status based on checkbox completion in Steps/Verification sections."""
     checkboxes = parse_checkboxes(text)
-    if not checkboxes:
-        return None
-    
-    total = len(checkboxes)
     checked = sum(1 for _, is_checked, _ in checkboxes if is_checked)
-    
+    return status_from_checkbox_tally(checked, len(checkboxes))
+
+
+def status_from_checkbox_tally(checked: int, total: int) -> Optional[str]:
+    if not total:
+        return None
     if checked == 0:
         return "Planned"
     elif checked == total:
@@ -564,12 +1742,11 @@ def generate_sync_diff(run_path: Path) -> dict:
         "req": None,
     }
     
-    run_text = read_text(run_path)
-    run_meta = extract_meta(run_text)
-    run_checkboxes = parse_checkboxes(run_text)
+    run_record = doc_record(run_path)
+    run_meta = run_record.get("meta", {})
     
     # Compute RUN status from checkboxes
-    computed_status = compute_status_from_checkboxes(run_text)
+    computed_status = status_from_checkbox_tally(*run_record.get("checkboxes", [0, 0]))
     current_status = run_meta.get("Status", "")
     
     if computed_status and normalize_status(computed_status) != normalize_status(current_status):
@@ -585,8 +1762,7 @@ def generate_sync_diff(run_path: Path) -> dict:
     # BRIEF sync
     if "BRIEF" in linked:
         brief_path = linked["BRIEF"]
-        brief_text = read_text(brief_path)
-        brief_meta = extract_meta(brief_text)
+        brief_meta = doc_meta(brief_path)
         brief_status = brief_meta.get("Status", "")
         
         diff["brief"] = {
@@ -605,18 +1781,16 @@ def generate_sync_diff(run_path: Path) -> dict:
     # REQ patch (don't auto-modify, generate patch)
     if "REQ" in linked:
         req_path = linked["REQ"]
-        req_text = read_text(req_path)
-        req_meta = extract_meta(req_text)
-        req_checkboxes = parse_checkboxes(req_text)
+        req_checked, req_total = doc_record(req_path).get("checkboxes", [0, 0])
         
         diff["req"] = {
             "path": req_path,
             "changes": [],
-            "checkboxes": req_checkboxes,
+            "checkboxes": (req_checked, req_total),
         }
         
         # Check if REQ acceptance criteria should be updated based on RUN completion
-        if computed_status == "Completed" and req_checkboxes:
+        if computed_status == "Completed" and req_total:
             # Suggest marking related checkboxes
             diff["req"]["changes"].append({
                 "type": "checkbox_suggestion",
@@ -657,24 +1831,23 @@ def print_sync_diff(diff: dict) -> None:
             print(f"  → REQ ({req_info['path'].stem}): (no changes)")
 
 
-def apply_brief_changes(diff: dict) -> bool:
+def apply_brief_changes(diff: dict, txn: Transaction) -> bool:
     """Apply changes to BRIEF document."""
     if not diff["brief"] or not diff["brief"]["changes"]:
         return False
     
     brief_path = diff["brief"]["path"]
-    brief_text = read_text(brief_path)
-    
+    txn.lock(brief_path)
+    brief = Document.load(brief_path, txn)
     for change in diff["brief"]["changes"]:
         if change["type"] == "status":
-            brief_text = update_meta_line(brief_text, "Status", change["to"])
-    
-    write_text(brief_path, brief_text)
+            brief.set_meta("Status", change["to"])
+    brief.save(brief_path, txn)
     print(f"[OK] Updated {brief_path}")
     return True
 
 
-def write_req_patch(diff: dict) -> Optional[Path]:
+def write_req_patch(diff: dict, txn: Transaction) -> Optional[Path]:
     """Write REQ patch file."""
     if not diff["req"] or not diff["req"]["changes"]:
         return None
@@ -705,27 +1878,27 @@ atlas sync {diff['run']['path'].stem} --apply-req
 Or manually edit: {req_path}
 """
     
-    write_text(patch_path, content)
+    txn.lock(patch_path)
+    txn.write(patch_path, content)
     print(f"[OK] Created patch: {patch_path}")
     return patch_path
 
 
-def apply_req_changes(diff: dict) -> bool:
+def apply_req_changes(diff: dict, txn: Transaction) -> bool:
     """Apply changes to REQ document (with warning)."""
     if not diff["req"] or not diff["req"]["changes"]:
         return False
     
     print("[WARN] Modifying REQ document (authority document)")
     req_path = diff["req"]["path"]
-    req_text = read_text(req_path)
-    
+    txn.lock(req_path)
+    req = Document.load(req_path, txn)
     # For now, just update status if RUN is completed
     run_changes = diff["run"]["changes"]
     for change in run_changes:
         if change["type"] == "status" and change["to"] == "Completed":
-            req_text = update_meta_line(req_text, "Status", "Implemented")
-    
-    write_text(req_path, req_text)
+            req.set_meta("Status", "Implemented")
+    req.save(req_path, txn)
     print(f"[OK] Updated {req_path}")
     return True
 
@@ -790,8 +1963,15 @@ def init_command(_args: argparse.Namespace) -> int:
 
 def create_brief_doc(text: str, domain: str) -> Path:
     brief_id = next_id("BRIEF", domain, BRIEF_DIR, BRIEF_ID_PATTERN)
+    path = BRIEF_DIR / f"{brief_id}.md"
+    ensure_dir(BRIEF_DIR)
+    write_text(path, render_brief(brief_id, text, domain))
+    return path
+
+
+def render_brief(brief_id: str, text: str, domain: str) -> str:
     title = derive_title(text)
-    content = f"""# [{brief_id}] {title}
+    return f"""# [{brief_id}] {title}
 
 > **ID**: {brief_id}
 > **Domain**: {domain}
@@ -817,19 +1997,32 @@ def create_brief_doc(text: str, domain: str) -> Path:
 ## 5. Verification Criteria
 - [ ] 
 """
-    path = BRIEF_DIR / f"{brief_id}.md"
-    ensure_dir(BRIEF_DIR)
-    write_text(path, content)
-    return path
 
 
 def capture_command(args: argparse.Namespace) -> int:
     domain = args.domain.upper()
-    text = args.text.strip()
+    source = getattr(args, "from_file", None)
+    if source is not None:
+        if args.text:
+            print("[ERR] Give either text or --from-file, not both.")
+            return 1
+        return capture_from_file(source, domain, args.to == "brief", args.format, args.batch_size)
+    text = (args.text or "").strip()
     if not text:
         print("[ERR] Empty input.")
         return 1
 
+    created, brief_path = capture_text(text, domain, getattr(args, "to", None) == "brief")
+    if brief_path is not None:
+        print(f"[OK] Created {brief_path}")
+    for req_path, view_path in created:
+        print(f"[OK] Updated {req_path}")
+        print(f"[OK] Updated {view_path}")
+    return 0
+
+
+def capture_text(text: str, domain: str, to_brief: bool) -> tuple[list[tuple[Path, Path]], Optional[Path]]:
+    """Capture one request; returns the (REQ, view) paths touched and the BRIEF created, if any."""
     title = derive_title(text)
     req_ids = [rid for rid in extract_ids_from_text(text) if rid.startswith("REQ-")]
     if not req_ids:
@@ -847,154 +2040,322 @@ def capture_command(args: argparse.Namespace) -> int:
         view_path = ensure_view_doc(req_id, title)
         created.append((req_path, view_path))
 
-    if getattr(args, "to", None) == "brief":
-        brief_path = create_brief_doc(text, domain)
-        print(f"[OK] Created {brief_path}")
+    brief_path = create_brief_doc(text, domain) if to_brief else None
+    return created, brief_path
 
-    for req_path, view_path in created:
-        print(f"[OK] Updated {req_path}")
-        print(f"[OK] Updated {view_path}")
-    return 0
+
+# =============================================================================
+# Bulk capture
+# =============================================================================
+
+CAPTURE_BATCH_SIZE = 500
+DOMAIN_RE = LazyPattern(r"^[A-Z]+$")
+
+
+def iter_capture_records(handle, fmt: str) -> Iterator[tuple[int, Optional[dict]]]:
+    """Yield (line number, record) from a JSONL or CSV stream; unreadable lines are reported with record None."""
+    if fmt == "csv":
+        import csv
+
+        reader = csv.DictReader(handle)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_no, line in enumerate(handle, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            print(f"[WARN] Skipping line {line_no}: invalid JSON ({exc})")
+            yield line_no, None
+            continue
+        if isinstance(record, str):
+            record = {"text": record}
+        if not isinstance(record, dict):
+            print(f"[WARN] Skipping line {line_no}: expected an object or a string")
+            yield line_no, None
+            continue
+        yield line_no, record
+
+
+def capture_record_text(record: dict) -> str:
+    """A record's capture text: "text", or "title" and "body" joined like a pasted request."""
+    text = record.get("text")
+    if not text:
+        text = "\n\n".join(str(record[key]).strip() for key in ["title", "body"] if record.get(key))
+    return str(text or "").strip()
+
+
+def capture_from_file(source: str, domain: str, to_brief: bool, fmt: Optional[str], batch_size: int) -> int:
+    """Capture every record of a JSONL/CSV file (or stdin for "-") in this one process.
+
+    IDs are reserved per batch with one sequence-store update per domain,
+    templates are loaded once, and each batch is written with one group
+    flush (write_files) instead of an fsync per document.
+    """
+    from contextlib import nullcontext
+
+    fmt = fmt or ("csv" if source.lower().endswith(".csv") else "jsonl")
+    try:
+        handle = nullcontext(sys.stdin) if source == "-" else open(source, encoding="utf-8", newline="")
+    except OSError as exc:
+        print(f"[ERR] Cannot read {source}: {exc}")
+        return 1
+    templates = {"REQ": load_template("REQ.md"), "VIEW": load_template("VIEW.md")}
+    for path in [REQ_DIR, VIEWS_DIR] + ([BRIEF_DIR] if to_brief else []):
+        ensure_dir(path)
+
+    captured = 0
+    skipped = 0
+    batch: list[tuple[int, str, str]] = []
+    with handle as stream:
+        for line_no, record in iter_capture_records(stream, fmt):
+            if record is None:
+                skipped += 1
+                continue
+            text = capture_record_text(record)
+            item_domain = str(record.get("domain") or domain).strip().upper()
+            if not text or not DOMAIN_RE.match(item_domain):
+                reason = "empty text" if not text else f"invalid domain {item_domain!r}"
+                print(f"[WARN] Skipping line {line_no}: {reason}")
+                skipped += 1
+                continue
+            batch.append((line_no, text, item_domain))
+            if len(batch) >= batch_size:
+                done = capture_batch(batch, templates, to_brief)
+                captured += done
+                skipped += len(batch) - done
+                batch = []
+        if batch:
+            done = capture_batch(batch, templates, to_brief)
+            captured += done
+            skipped += len(batch) - done
+
+    suffix = f"; skipped {skipped}" if skipped else ""
+    print(f"[DONE] Captured {captured} item(s) from {source}{suffix}.")
+    return 1 if skipped else 0
+
+
+def capture_batch(batch: list[tuple[int, str, str]], templates: dict[str, str], to_brief: bool) -> int:
+    """Capture one batch of (line number, text, domain) items; returns how many were captured."""
+    from collections import Counter
+
+    captured = 0
+    fresh = []
+    for line_no, text, domain in batch:
+        if any(rid.startswith("REQ-") for rid in extract_ids_from_text(text)):
+            # Updates to existing REQs need the locked read-modify-write path.
+            try:
+                updated, _ = capture_text(text, domain, to_brief)
+            except OSError as exc:
+                print(f"[WARN] Skipping line {line_no}: {exc}")
+                continue
+            if updated:
+                captured += 1
+            else:
+                print(f"[WARN] Skipping line {line_no}: no valid REQ ID to update")
+        else:
+            fresh.append((line_no, text, domain))
+
+    # Fresh IDs are reserved in the sequence store, so no other writer can
+    # claim these paths and they need no per-document lock.
+    domains = Counter(domain for _, _, domain in fresh)
+    req_ids = {d: iter(next_ids("REQ", d, REQ_DIR, REQ_ID_PATTERN, n)) for d, n in domains.items()}
+    brief_ids = {}
+    if to_brief:
+        brief_ids = {d: iter(next_ids("BRIEF", d, BRIEF_DIR, BRIEF_ID_PATTERN, n)) for d, n in domains.items()}
+
+    files: list[tuple[Path, str]] = []
+    for line_no, text, domain in fresh:
+        req_id = next(req_ids[domain])
+        brief_id = next(brief_ids[domain]) if to_brief else ""
+        captured += 1
+        title = derive_title(text)
+        req_path = REQ_DIR / f"{req_id}.md"
+        view_path = VIEWS_DIR / f"{req_id}.md"
+        if req_path.exists() or view_path.exists():
+            create_req_stub(req_id, title=title)
+            append_capture_note(req_path, text)
+            ensure_view_doc(req_id, title)
+        else:
+            files.append((req_path, render_req_stub(req_id, title, templates["REQ"]).rstrip() + capture_block(text)))
+            files.append((view_path, render_view(req_id, title, templates["VIEW"])))
+        if to_brief and BRIEF_ID_PATTERN.match(brief_id):
+            files.append((BRIEF_DIR / f"{brief_id}.md", render_brief(brief_id, text, domain)))
+    if files:
+        write_files(files)
+
+    print(f"[OK] Captured {captured} item(s) (lines {batch[0][0]}-{batch[-1][0]})")
+    return captured
+
+
+def render_req_stub(req_id: str, title: str, template: str) -> str:
+    content = template.replace("REQ-XXX-001", req_id)
+    content = content.replace("# [REQ-XXX-001] Title", f"# [{req_id}] {title}")
+    content = content.replace("Domain**: XXX", f"Domain**: {req_id.split('-')[1]}")
+    return content.replace("Last Updated**: YYYY-MM-DD", f"Last Updated**: {now_date()}")
+
+
+def render_view(req_id: str, title: str, template: str) -> str:
+    content = template.replace("REQ-XXX-001", req_id)
+    content = content.replace("# [VIEW-REQ-XXX-001] Title", f"# [VIEW-{req_id}] {title}")
+    return content.replace("Last Updated**: YYYY-MM-DD", f"Last Updated**: {now_date()}")
+
+
+def capture_block(text: str) -> str:
+    return f"\n## Capture ({now_date()})\n{text.strip()}\n"
 
 
 def create_req_stub(req_id: str, title: Optional[str] = None) -> None:
     path = REQ_DIR / f"{req_id}.md"
-    if path.exists():
-        return
     match = REQ_ID_PATTERN.match(req_id)
     if not match:
         return
     domain = match.group(1)
-    template = load_template("REQ.md")
-    title = title or "Title"
-    content = template.replace("REQ-XXX-001", req_id)
-    content = content.replace("# [REQ-XXX-001] Title", f"# [{req_id}] {title}")
-    content = content.replace("Domain**: XXX", f"Domain**: {domain}")
-    content = content.replace("Last Updated**: YYYY-MM-DD", f"Last Updated**: {now_date()}")
-    write_text(path, content)
+    content = render_req_stub(req_id, title or "Title", load_template("REQ.md"))
+    with doc_lock(path):
+        if path.exists():
+            return
+        write_text(path, content)
+    SequenceStore().observe("ids", f"REQ-{domain}", int(match.group(2)))
 
 
 def append_capture_note(path: Path, text: str) -> None:
     note = text.strip()
     if not note:
         return
-    content = read_text(path)
-    stamp = now_date()
-    block = f"\n## Capture ({stamp})\n{note}\n"
-    if f"## Capture ({stamp})" in content:
-        return
-    write_text(path, content.rstrip() + block)
+    heading = f"Capture ({now_date()})"
+    with doc_lock(path):
+        doc = Document.load(path)
+        if doc.has_section(heading):
+            return
+        doc.append_section(heading, note)
+        doc.save(path)
 
 
 def ensure_view_doc(req_id: str, title: str) -> Path:
     path = VIEWS_DIR / f"{req_id}.md"
-    if not path.exists():
-        template = load_template("VIEW.md")
-        content = template.replace("REQ-XXX-001", req_id)
-        content = content.replace("# [VIEW-REQ-XXX-001] Title", f"# [VIEW-{req_id}] {title}")
-        content = content.replace("Last Updated**: YYYY-MM-DD", f"Last Updated**: {now_date()}")
-        write_text(path, content)
-        return path
-
-    content = read_text(path)
-    if req_id not in content:
-        if "## References (SSOT index)" not in content:
-            content = content.rstrip() + "\n\n## References (SSOT index)\n"
-        content = content.rstrip() + f"\n- {req_id}\n"
-        write_text(path, content)
+    with doc_lock(path):
+        if not path.exists():
+            write_text(path, render_view(req_id, title, load_template("VIEW.md")))
+            return path
+
+        content = read_text(path)
+        if req_id not in content:
+            if "## References (SSOT index)" not in content:
+                content = content.rstrip() + "\n\n## References (SSOT index)\n"
+            content = content.rstrip() + f"\n- {req_id}\n"
+            write_text(path, content)
     return path
 
 
-def extract_section_lines(text: str, heading: str) -> list[str]:
-    lines = text.splitlines()
-    out: list[str] = []
-    in_section = False
-    target = f"## {heading}".strip().lower()
-    for line in lines:
-        stripped = line.strip()
-        if stripped.startswith("## "):
-            if in_section:
-                break
-            in_section = stripped.lower() == target
-            continue
-        if in_section:
-            out.append(line)
-    return out
+def render_run(run_id: str, req_id: str) -> str:
+    return f"""# [{run_id}] Plan
 
+> **ID**: {run_id}
+> **REQ**: {req_id}
+> **Status**: Planned
+> **Started**: {now_date()}
+> **Git**: -
+> **Completed**: -
 
-def extract_view_references(text: str) -> set[str]:
-    refs: set[str] = set()
-    for line in extract_section_lines(text, "References (SSOT index)"):
-        for ref_id in REQ_REF_RE.findall(line):
-            refs.add(ref_id)
-    return refs
+## Target REQ
+- {req_id}
 
+## Plan
+- [ ] 
 
-def extract_view_summary_refs(text: str) -> set[str]:
-    refs: set[str] = set()
-    for line in extract_section_lines(text, "Summary"):
-        if "<!--" in line:
-            continue
-        for match in REF_TOKEN_RE.finditer(line):
-            refs.add(match.group("id"))
-    return refs
+## Verification
+- [ ] Test
+- [ ] Spec
+- [ ] Boundary
 
+## Output
+- (files created/modified)
+"""
 
-def extract_view_ssot_refs(text: str) -> set[str]:
-    meta = extract_meta(text)
-    value = meta.get("SSOT", "")
-    return set(REQ_REF_RE.findall(value))
 
+def prepare_run(req_id: str, step: Optional[int] = None) -> tuple[str, str, Path]:
+    """Validate req_id and allocate its RUN step; returns (req_id, run_id, run_path).
 
-def run_command(args: argparse.Namespace) -> int:
-    req_id = args.req_id
+    Raises ValueError with the reason when the REQ ID is invalid or missing.
+    """
     if req_id.endswith(".md"):
         req_id = Path(req_id).stem
 
     match = REQ_ID_PATTERN.match(req_id)
     if not match:
-        print(f"[ERR] Invalid REQ ID: {req_id}")
-        return 1
+        raise ValueError(f"Invalid REQ ID: {req_id}")
 
     req_path = REQ_DIR / f"{req_id}.md"
     if not req_path.exists():
-        print(f"[ERR] REQ not found: {req_path}")
-        return 1
+        raise ValueError(f"REQ not found: {req_path}")
 
     domain = match.group(1)
     number = match.group(2)
-    step = getattr(args, "step", None) or next_run_step(req_id)
+    if step:
+        SequenceStore().observe("steps", req_id, int(step))
+    else:
+        step = next_run_step(req_id)
     run_id = f"RUN-REQ-{domain}-{number}-step-{int(step):02d}"
-    run_path = RUN_DIR / f"{run_id}.md"
-    if run_path.exists():
-        print(f"[ERR] RUN already exists: {run_path}")
-        return 1
+    return req_id, run_id, RUN_DIR / f"{run_id}.md"
 
-    content = f"""# [{run_id}] Plan
 
-> **ID**: {run_id}
-> **REQ**: {req_id}
-> **Status**: Planned
-> **Started**: {now_date()}
-> **Git**: -
-> **Completed**: -
+def read_batch_ids(ids: list[str], source: Optional[str]) -> Optional[list[str]]:
+    """IDs from the command line followed by those in source (one or more per line, "-" for stdin)."""
+    ids = list(ids)
+    if not source:
+        return ids
+    try:
+        if source == "-":
+            lines = sys.stdin.read().splitlines()
+        else:
+            lines = read_text(Path(source)).splitlines()
+    except OSError as exc:
+        print(f"[ERR] Cannot read {source}: {exc}")
+        return None
+    for line in lines:
+        line = line.split("#", 1)[0]
+        ids.extend(token for token in line.replace(",", " ").split() if token)
+    return ids
 
-## Target REQ
-- {req_id}
 
-## Plan
-- [ ] 
+def print_batch_summary(headers: tuple[str, str, str], rows: list[tuple[str, str, str]], ok: int) -> None:
+    """Print one row per ID as a fixed-width table, then the success count."""
+    widths = [max(len(row[i]) for row in [headers, *rows]) for i in range(2)]
+    for row in [headers, *rows]:
+        print(f"{row[0]:<{widths[0]}}  {row[1]:<{widths[1]}}  {row[2]}")
+    print(f"[DONE] {ok} of {len(rows)} succeeded.")
 
-## Verification
-- [ ] Test
-- [ ] Spec
-- [ ] Boundary
 
-## Output
-- (files created/modified)
-"""
-    write_text(run_path, content)
+def run_command(args: argparse.Namespace) -> int:
+    req_ids = read_batch_ids(args.req_ids, getattr(args, "from_file", None))
+    if req_ids is None:
+        return 1
+    if not req_ids:
+        print("[ERR] No REQ IDs given.")
+        return 1
+    step = getattr(args, "step", None)
+    if len(req_ids) > 1:
+        if step:
+            print("[ERR] --step needs exactly one REQ ID.")
+            return 1
+        return run_batch(req_ids)
+
+    try:
+        req_id, run_id, run_path = prepare_run(req_ids[0], step)
+    except ValueError as exc:
+        print(f"[ERR] {exc}")
+        return 1
+    with doc_lock(run_path):
+        if run_path.exists():
+            print(f"[ERR] RUN already exists: {run_path}")
+            return 1
+        write_text(run_path, render_run(run_id, req_id))
 
+    append_run_event("created", run_id, req_id=req_id)
     write_last_run(
         {
             "run_id": run_id,
@@ -1008,26 +2369,79 @@ def run_command(args: argparse.Namespace) -> int:
     return 0
 
 
+def run_batch(req_ids: list[str]) -> int:
+    """Create one RUN per REQ ID (repeats get consecutive steps) with one group flush."""
+    rows: list[Optional[tuple[str, str, str]]] = []
+    planned: list[tuple[int, str, str, Path]] = []
+    for raw in req_ids:
+        try:
+            req_id, run_id, run_path = prepare_run(raw)
+        except ValueError as exc:
+            rows.append((raw, "-", str(exc)))
+            continue
+        planned.append((len(rows), req_id, run_id, run_path))
+        rows.append(None)
+
+    created: list[tuple[str, str]] = []
+    with doc_lock(*[run_path for _, _, _, run_path in planned]):
+        files = []
+        for row, req_id, run_id, run_path in planned:
+            if run_path.exists():
+                rows[row] = (req_id, run_id, "RUN already exists")
+                continue
+            files.append((run_path, render_run(run_id, req_id)))
+            rows[row] = (req_id, run_id, "created")
+            created.append((req_id, run_id))
+        if files:
+            write_files(files)
+
+    for req_id, run_id in created:
+        append_run_event("created", run_id, req_id=req_id)
+    if created:
+        req_id, run_id = created[-1]
+        write_last_run({"run_id": run_id, "req_id": req_id, "stage": "executing", "updated_at": now_iso()})
+
+    print_batch_summary(("REQ", "RUN", "Result"), rows, len(created))
+    return 0 if len(created) == len(rows) else 1
+
+
 def plan_command(args: argparse.Namespace) -> int:
     print("[WARN] 'plan' is deprecated. Use 'run' instead.")
-    args.req_id = args.brief_id
+    args.req_ids = [args.brief_id]
     return run_command(args)
 
 
 def finish_command(args: argparse.Namespace) -> int:
-    run_id = args.run_id
-    if run_id.endswith(".md"):
-        run_id = Path(run_id).stem
-
-    if not RUN_ID_PATTERN.match(run_id):
-        print(f"[ERR] Invalid RUN ID: {run_id}")
+    run_ids = read_batch_ids(args.run_ids, getattr(args, "from_file", None))
+    if run_ids is None:
         return 1
-
-    run_path = RUN_DIR / f"{run_id}.md"
-    if not run_path.exists():
-        print(f"[ERR] RUN not found: {run_path}")
+    if not run_ids:
+        print("[ERR] No RUN IDs given.")
         return 1
 
+    # (RUN ID, error) in input order; error is None for RUNs to finish.
+    results: list[tuple[str, Optional[str]]] = []
+    runs: list[tuple[str, Path]] = []
+    for run_id in run_ids:
+        if run_id.endswith(".md"):
+            run_id = Path(run_id).stem
+        run_path = RUN_DIR / f"{run_id}.md"
+        if not RUN_ID_PATTERN.match(run_id):
+            error = f"Invalid RUN ID: {run_id}"
+        elif not run_path.exists():
+            error = f"RUN not found: {run_path}"
+        elif any(run_id == seen for seen, _ in runs):
+            error = "Duplicate RUN ID"
+        else:
+            runs.append((run_id, run_path))
+            results.append((run_id, None))
+            continue
+        if len(run_ids) == 1:
+            print(f"[ERR] {error}")
+            return 1
+        results.append((run_id, error))
+
+    # Resolved once for the whole batch.
     git_hash = args.git
     if not git_hash:
         git_hash = detect_git_hash()
@@ -1035,43 +2449,82 @@ def finish_command(args: argparse.Namespace) -> int:
         print("[ERR] Missing git hash. Provide --git or ensure git is available.")
         return 1
 
-    text = read_text(run_path)
-    meta = extract_meta(text)
-    brief_id = meta.get("Brief")
-    req_id = meta.get("REQ") or req_id_from_run_id(run_id)
-    status = "Completed" if args.success else "Failed"
-    text = update_meta_line(text, "Status", status)
-    text = update_meta_line(text, "Git", git_hash)
-    text = update_meta_line(text, "Completed", now_date())
-    write_text(run_path, text)
-
-    if brief_id:
-        update_brief_status(brief_id, status)
-
-    if req_id:
-        req_path = REQ_DIR / f"{req_id}.md"
-        if req_path.exists():
-            req_text = read_text(req_path)
-            req_text = update_meta_line(req_text, "Implemented-Git", git_hash)
-            req_text = update_meta_line(req_text, "Linked-RUN", run_id)
-            req_text = update_meta_line(req_text, "Last Updated", now_date())
-            write_text(req_path, req_text)
-            print(f"[OK] Updated {req_path}")
-
-    last_run_state = {
-        "run_id": run_id,
-        "stage": "finished",
-        "git_hash": git_hash,
-        "completed_at": now_iso(),
-    }
-    if brief_id:
-        last_run_state["brief_id"] = brief_id
-    if req_id:
-        last_run_state["req_id"] = req_id
-    write_last_run(last_run_state)
+    verbose = len(run_ids) == 1
+    finished = finish_runs(runs, git_hash, args.success, verbose) if runs else {}
+    event = "finished" if args.success else "failed"
+    for run_id, _ in runs:
+        append_run_event(event, run_id, git=git_hash)
 
-    print(f"[OK] Updated {run_path}")
-    return 0
+    if verbose:
+        print(f"[OK] Updated {runs[0][1]}")
+        return 0
+    status = "Completed" if args.success else "Failed"
+    rows = [
+        (run_id, "-", error) if error else (run_id, finished.get(run_id) or "-", status)
+        for run_id, error in results
+    ]
+    print_batch_summary(("RUN", "REQ", "Status"), rows, len(runs))
+    return 0 if len(runs) == len(rows) else 1
+
+
+def finish_runs(runs: list[tuple[str, Path]], git_hash: str, success: bool, verbose: bool) -> dict[str, Optional[str]]:
+    """Mark runs finished and update their BRIEFs and REQs in one transaction.
+
+    Locks are taken a layer at a time (every RUN, then every BRIEF, then
+    every REQ), the order all commands use. Returns RUN ID -> REQ ID.
+    """
+    status = "Completed" if success else "Failed"
+    linked: dict[str, Optional[str]] = {}
+    # RUN, BRIEF, REQ and last_run.json are staged and written as one
+    # transaction; the RUNs stay locked until then, so a concurrent finish or
+    # sync of the same RUN cannot interleave with this one.
+    with Transaction("finish") as txn:
+        txn.lock(*[run_path for _, run_path in runs])
+        briefs: dict[str, str] = {}
+        for run_id, run_path in runs:
+            run = Document.load(run_path, txn)
+            meta = run.meta
+            brief_id = meta.get("Brief")
+            linked[run_id] = meta.get("REQ") or req_id_from_run_id(run_id)
+            run.set_meta("Status", status)
+            run.set_meta("Git", git_hash)
+            run.set_meta("Completed", now_date())
+            run.save(run_path, txn)
+            if brief_id:
+                briefs[run_id] = brief_id
+
+        txn.lock(*[BRIEF_DIR / f"{brief_id}.md" for brief_id in briefs.values() if BRIEF_ID_PATTERN.match(brief_id)])
+        for brief_id in briefs.values():
+            if update_brief_status(brief_id, status, txn) and verbose:
+                print(f"[OK] Updated {BRIEF_DIR / f'{brief_id}.md'}")
+
+        txn.lock(*[REQ_DIR / f"{req_id}.md" for req_id in linked.values() if req_id])
+        for run_id, req_id in linked.items():
+            if not req_id:
+                continue
+            req_path = REQ_DIR / f"{req_id}.md"
+            if req_path.exists():
+                req = Document.load(req_path, txn)
+                req.set_meta("Implemented-Git", git_hash)
+                req.set_meta("Linked-RUN", run_id)
+                req.set_meta("Last Updated", now_date())
+                req.save(req_path, txn)
+                if verbose:
+                    print(f"[OK] Updated {req_path}")
+
+        run_id = runs[-1][0]
+        last_run_state = {
+            "run_id": run_id,
+            "stage": "finished",
+            "git_hash": git_hash,
+            "completed_at": now_iso(),
+        }
+        if run_id in briefs:
+            last_run_state["brief_id"] = briefs[run_id]
+        if linked[run_id]:
+            last_run_state["req_id"] = linked[run_id]
+        write_last_run(last_run_state, txn)
+    return linked
 
 
 def sync_command(args: argparse.Namespace) -> int:
@@ -1104,27 +2557,33 @@ def sync_command(args: argparse.Namespace) -> int:
         print("\n[INFO] Dry-run mode. Use --apply-brief, --write-req-patch, or --apply-req to make changes.")
         return 0
     
-    # Apply RUN changes (always when any apply flag is set)
-    if diff["run"]["changes"]:
-        run_text = read_text(run_path)
-        for change in diff["run"]["changes"]:
-            if change["type"] == "status":
-                run_text = update_meta_line(run_text, "Status", change["to"])
-        write_text(run_path, run_text)
-        print(f"[OK] Updated {run_path}")
-    
-    # Apply BRIEF changes
-    if apply_brief:
-        apply_brief_changes(diff)
-    
-    # Write REQ patch
-    if write_patch:
-        write_req_patch(diff)
-    
-    # Apply REQ changes (with warning)
-    if apply_req:
-        apply_req_changes(diff)
-    
+    event = None
+    with Transaction("sync") as txn:
+        txn.lock(run_path)
+        # Apply RUN changes (always when any apply flag is set)
+        if diff["run"]["changes"]:
+            run = Document.load(run_path, txn)
+            for change in diff["run"]["changes"]:
+                if change["type"] == "status":
+                    run.set_meta("Status", change["to"])
+                    event = RUN_STATUS_EVENTS.get(normalize_status(change["to"]))
+            run.save(run_path, txn)
+            print(f"[OK] Updated {run_path}")
+
+        # Apply BRIEF changes
+        if apply_brief:
+            apply_brief_changes(diff, txn)
+
+        # Apply REQ changes (with warning)
+        if apply_req:
+            apply_req_changes(diff, txn)
+
+        # Write REQ patch (locked last, after the REQ, like every other command)
+        if write_patch:
+            write_req_patch(diff, txn)
+
+    if event:
+        append_run_event(event, run_id)
     return 0
 
 
@@ -1143,11 +2602,314 @@ def iter_links(text: str) -> list[str]:
     return links
 
 
-def doctor_command(args: argparse.Namespace) -> int:
-    issues = 0
-    brief_statuses: dict[str, str] = {}
-    run_brief_statuses: list[tuple[str, str, str, Optional[datetime]]] = []
+DOC_FOLDER_PREFIXES = {
+    "req": "REQ",
+    "rule": "RULE",
+    "adr": "ADR",
+    "cq": "CQ",
+    "brief": "BRIEF",
+    "runs": "RUN",
+}
+
+DOC_ID_PATTERNS = {
+    "REQ": REQ_ID_PATTERN,
+    "RULE": RULE_ID_PATTERN,
+    "ADR": ADR_ID_PATTERN,
+    "CQ": CQ_ID_PATTERN,
+    "BRIEF": BRIEF_ID_PATTERN,
+    "RUN": RUN_ID_PATTERN,
+}
+
+URI_SCHEME_RE = LazyPattern(r"^[a-zA-Z][a-zA-Z0-9+.-]*:")
+
+# Check groups accepted by validate(). "links" and "git" are opt-in, like
+# doctor --links and doctor --verify-git.
+CHECKS = ("layout", "documents", "links", "views", "coverage", "runs", "git", "last_run")
+DEFAULT_CHECKS = frozenset(CHECKS) - {"links", "git"}
+# Per-document results are cached only for the full per-document check set.
+CACHED_CHECKS = frozenset({"documents", "views"})
+
+SEVERITY_LABELS = {"error": "ERR", "warning": "WARN", "notice": "WARN", "info": "INFO"}
+COUNTED_SEVERITIES = {"error", "warning"}
+
+
+class Issue(NamedTuple):
+    """One validation finding.
+
+    severity is "error" or "warning" (both count towards doctor's exit
+    status), "notice" (shown as a warning, not counted) or "info".
+    path is the offending document and target the referenced ID or link,
+    when there is one.
+    """
+
+    code: str
+    severity: str
+    message: str
+    path: Optional[str] = None
+    target: Optional[str] = None
+
+    @property
+    def counted(self) -> bool:
+        return self.severity in COUNTED_SEVERITIES
+
+    def render(self) -> str:
+        return f"[{SEVERITY_LABELS.get(self.severity, self.severity.upper())}] {self.message}"
+
+    def to_dict(self) -> dict:
+        return self._asdict()
+
+
+# =============================================================================
+# Schema plans
+# =============================================================================
+
+# Used when a workspace has no schemas.json/workflow.json: only the identity,
+# Must-Read and git-evidence rules doctor has always applied.
+BUILTIN_SCHEMAS = {
+    "id_patterns": {
+        "req": REQ_ID_PATTERN.pattern,
+        "rule": RULE_ID_PATTERN.pattern,
+        "adr": ADR_ID_PATTERN.pattern,
+        "cq": CQ_ID_PATTERN.pattern,
+        "brief": BRIEF_ID_PATTERN.pattern,
+        "run": RUN_ID_PATTERN.pattern,
+    },
+    "document_types": {
+        "req": {"required_meta": ["ID", "Must-Read"]},
+        "rule": {"required_meta": ["ID", "Must-Read"]},
+        "adr": {"required_meta": ["ID"]},
+        "cq": {"required_meta": ["ID"]},
+        "brief": {"required_meta": ["ID", "Status"]},
+        "run": {"folder": "runs", "required_meta": ["ID"]},
+    },
+}
+BUILTIN_WORKFLOW = {
+    "completion_rules": {
+        "req_implemented": {
+            "type": "req",
+            "status": "Implemented",
+            "required_fields": ["Implemented-Git"],
+            "message": "Implemented REQ missing git hash",
+        },
+    },
+}
+
+# Severity of each schema rule unless schemas.json "validation_rules" overrides it.
+DEFAULT_RULE_SEVERITIES = {
+    "required_meta": "error",
+    "required_sections": "warning",
+    "status_value_valid": "error",
+    "date_format": "warning",
+    "completion_fields": "warning",
+    "link_type_correct": "warning",
+    "link_outbound_allowed": "warning",
+    "self_reference": "warning",
+    "domain_known": "warning",
+}
+DEFAULT_DATE_PATTERN = r"^\d{4}-\d{2}-\d{2}$"
+SCHEMA_VERSION = 2
+SECTION_NUMBER_RE = LazyPattern(r"^\d+\.\s*")
+
+
+def section_name(heading: str) -> str:
+    """Normalise a "## 1. User Request" heading to "user request"."""
+    return SECTION_NUMBER_RE.sub("", heading[3:].strip()).lower()
+
+
+class TypePlan(NamedTuple):
+    """Compiled checks for one document type (one .atlas/ folder)."""
+
+    doc_type: str
+    prefix: str
+    id_pattern: re.Pattern
+    required_meta: tuple[str, ...]
+    required_sections: tuple[str, ...]
+    section_titles: tuple[str, ...]
+    statuses: Optional[frozenset[str]]
+    date_fields: tuple[str, ...]
+    completion: tuple[tuple[str, tuple[str, ...], str], ...]
+    allowed_outbound: Optional[frozenset[str]]
+    self_reference: bool
+    known_domains: Optional[frozenset[str]]
+
+
+class SchemaPlan(NamedTuple):
+    """schemas.json + workflow.json compiled into per-folder TypePlans."""
+
+    digest: str
+    types: dict[str, TypePlan]
+    severities: dict[str, str]
+    date_pattern: re.Pattern
+    note: str = ""
+
+    def for_path(self, path: Path) -> Optional[TypePlan]:
+        return self.types.get(path.parent.name)
+
+    def folder_of(self, prefix: str) -> Optional[str]:
+        for folder, plan in self.types.items():
+            if plan.prefix == prefix:
+                return folder
+        return None
+
+
+def compile_schema_plan(schemas: dict, workflow: dict, digest: str = "", note: str = "") -> SchemaPlan:
+    rules = schemas.get("validation_rules", {})
+    severities = dict(DEFAULT_RULE_SEVERITIES)
+    for name, rule in rules.items():
+        if isinstance(rule, dict) and rule.get("severity"):
+            severities[name] = rule["severity"]
+    date_rule = rules.get("date_format", {})
+    date_fields = tuple(date_rule.get("fields", []))
+
+    domains = schemas.get("domains", {})
+    known_domains = None
+    if domains and not domains.get("allow_unknown", True):
+        known_domains = frozenset(domains.get("known", []))
+
+    states = workflow.get("states", {})
+    completion: dict[str, list[tuple[str, tuple[str, ...], str]]] = {}
+    for rule in workflow.get("completion_rules", {}).values():
+        if rule.get("type") and rule.get("status"):
+            completion.setdefault(rule["type"], []).append(
+                (normalize_status(rule["status"]), tuple(rule.get("required_fields", [])), rule.get("message", ""))
+            )
+
+    # Only folders doctor indexes get plans; types the schema leaves out keep the built-in rules.
+    types_by_name = {
+        name: spec
+        for name, spec in schemas.get("document_types", {}).items()
+        if spec.get("folder", name) in DOC_FOLDER_PREFIXES
+    }
+    folders = {name: spec.get("folder", name) for name, spec in types_by_name.items()}
+    for name, spec in BUILTIN_SCHEMAS["document_types"].items():
+        if spec.get("folder", name) not in folders.values():
+            types_by_name[name] = spec
+            folders[name] = spec.get("folder", name)
+    types: dict[str, TypePlan] = {}
+    for name, spec in types_by_name.items():
+        folder = folders[name]
+        prefix = DOC_FOLDER_PREFIXES[folder]
+        pattern = schemas.get("id_patterns", {}).get(name) or DOC_ID_PATTERNS[prefix].pattern
+        link_rules = spec.get("link_rules", {})
+        outbound = link_rules.get("allowed_outbound")
+        values = states.get(name, {}).get("values")
+        types[folder] = TypePlan(
+            doc_type=name,
+            prefix=prefix,
+            id_pattern=re.compile(pattern),
+            required_meta=tuple(field for field in spec.get("required_meta", []) if field != "ID"),
+            required_sections=tuple(section.lower() for section in spec.get("required_sections", [])),
+            section_titles=tuple(spec.get("required_sections", [])),
+            statuses=frozenset(normalize_status(v) for v in values) if values else None,
+            date_fields=date_fields,
+            completion=tuple(completion.get(name, [])),
+            allowed_outbound=frozenset(folders.get(t, t) for t in outbound) if outbound is not None else None,
+            self_reference=link_rules.get("self_reference", True),
+            known_domains=known_domains,
+        )
+    return SchemaPlan(digest, types, severities, re.compile(date_rule.get("pattern", DEFAULT_DATE_PATTERN)), note)
+
+
+_SCHEMA_PLANS: dict[str, SchemaPlan] = {}
+
+
+def load_schema_plan() -> SchemaPlan:
+    """Compiled plan for the workspace's schema files, memoised by their content hash.
+
+    Schema files older than version 2 described fields doctor never checked,
+    so they are ignored in favour of the built-in rules (with a notice).
+    """
+    import hashlib
+
+    raw = []
+    for path in [SCHEMAS_PATH, WORKFLOW_PATH]:
+        try:
+            raw.append(path.read_bytes())
+        except OSError:
+            raw.append(b"")
+    digest = hashlib.sha256(b"\0".join(raw)).hexdigest()
+    plan = _SCHEMA_PLANS.get(digest)
+    if plan is not None:
+        return plan
+    note = ""
+    try:
+        schemas = json.loads(raw[0]) if raw[0] else BUILTIN_SCHEMAS
+        workflow = json.loads(raw[1]) if raw[1] else BUILTIN_WORKFLOW
+    except ValueError as exc:
+        note = f"Invalid schema file ({exc}); using built-in rules."
+        schemas, workflow = BUILTIN_SCHEMAS, BUILTIN_WORKFLOW
+    else:
+        if raw[0] and schemas.get("version", 1) < SCHEMA_VERSION:
+            note = f"{SCHEMAS_PATH} predates schema version {SCHEMA_VERSION}; using built-in rules."
+            schemas, workflow = BUILTIN_SCHEMAS, BUILTIN_WORKFLOW
+    plan = _SCHEMA_PLANS[digest] = compile_schema_plan(schemas, workflow, digest, note)
+    return plan
+
+
+def is_local_link(target: str) -> bool:
+    return bool(target) and not target.startswith("#") and not URI_SCHEME_RE.match(target)
 
+
+def link_key(doc_key: str, target: str) -> str:
+    """Lexically resolve a relative link against the linking document's index key."""
+    return posixpath.normpath(posixpath.join(posixpath.dirname(doc_key), target))
+
+
+# The default filesystems on macOS and Windows match names regardless of case.
+CASE_INSENSITIVE_FS = sys.platform in ("darwin", "win32")
+
+
+def fold_case(key: str) -> str:
+    """Key as the filesystem compares it: case-folded where names are case-insensitive."""
+    return key.casefold() if CASE_INSENSITIVE_FS else key
+
+
+class LinkResolver:
+    """Resolves relative links against one directory walk of .atlas/.
+
+    Links are normalised lexically and looked up in the set of existing
+    paths, so checking a link costs no syscalls. Only links that leave
+    .atlas/ fall back to symlink-aware Path.resolve()/exists(). existing
+    holds fold_case() keys, so Foo.md finds foo.md where the filesystem
+    would.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        root = root or ATLAS_ROOT
+        self.existing: set[str] = set()
+        self._doc: tuple[Optional[Path], str] = (None, "")
+        for dirpath, dirnames, filenames in os.walk(root):
+            rel = os.path.relpath(dirpath, root)
+            base = "" if rel == os.curdir else rel.replace(os.sep, "/") + "/"
+            self.existing.update(fold_case(base + name) for name in dirnames)
+            self.existing.update(fold_case(base + name) for name in filenames)
+
+    def key(self, path: Path, target: str) -> Optional[str]:
+        """Index-style key of the link target, or None if it points outside .atlas/."""
+        # Links of one document are checked back to back; remember its key.
+        if self._doc[0] is not path:
+            self._doc = (path, DocIndex.key(path))
+        key = link_key(self._doc[1], target)
+        if key == ".." or key.startswith(("../", "/")) or ":" in key.split("/", 1)[0]:
+            return None
+        return key
+
+    def is_broken(self, path: Path, target: str, within: Optional[Path] = None) -> bool:
+        """True if target does not exist (and, when within is given, lies under it)."""
+        key = self.key(path, target)
+        if key is None:
+            resolved = (path.parent / target).resolve()
+            if within is not None and not is_relative_to(resolved, within):
+                return False
+            return not resolved.exists()
+        if within is not None:
+            base = DocIndex.key(within)
+            if key != base and not key.startswith(base + "/"):
+                return False
+        return key != "." and fold_case(key) not in self.existing
+
+
+def check_layout() -> Iterable[Issue]:
     required_dirs = [
         REQ_DIR,
         RULE_DIR,
@@ -1165,260 +2927,1532 @@ def doctor_command(args: argparse.Namespace) -> int:
     ]
     for path in required_dirs:
         if not path.exists():
-            print(f"[ERR] Missing directory: {path}")
-            issues += 1
+            yield Issue("missing-directory", "error", f"Missing directory: {path}", str(path))
 
     for path in REQUIRED_TOP_DOCS:
         if not path.exists():
-            print(f"[ERR] Missing top doc: {path}")
-            issues += 1
+            yield Issue("missing-top-doc", "error", f"Missing top doc: {path}", str(path))
 
     for path in OPTIONAL_TOP_DOCS:
         if not path.exists():
-            print(f"[WARN] Missing optional doc: {path}")
+            yield Issue("missing-optional-doc", "notice", f"Missing optional doc: {path}", str(path))
 
-    scan_dirs = [REQ_DIR, RULE_DIR, ADR_DIR, CQ_DIR, BRIEF_DIR, RUN_DIR]
-    all_docs = iter_md_files(scan_dirs)
-    all_ids: set[str] = set()
 
-    for path in all_docs:
-        text = read_text(path)
-        meta = extract_meta(text)
-        meta_id = meta.get("ID")
-        header_id = extract_header_id(text)
-        file_id = path.stem
-        for candidate in [meta_id, header_id, file_id]:
-            if candidate:
-                all_ids.add(candidate)
-
-    for path in all_docs:
-        text = read_text(path)
-        meta = extract_meta(text)
-        meta_id = meta.get("ID")
-        header_id = extract_header_id(text)
-        file_id = path.stem
+def check_document(path: Path, record: dict, all_ids: set[str], plan: SchemaPlan) -> Iterable[Issue]:
+    """Per-document checks: ID consistency, Must-Read, git evidence and the schema rules."""
+    type_plan = plan.for_path(path)
+    if type_plan is None:
+        return
+    expected_prefix = type_plan.prefix
+    severity = plan.severities
+    meta = record["meta"]
+    meta_id = meta.get("ID")
+    header_id = record["header_id"]
+    file_id = path.stem
+    where = str(path)
+
+    for field in type_plan.required_meta:
+        if not meta.get(field):
+            yield Issue("missing-meta", severity["required_meta"], f"Missing {field}: {path}", where, field)
+
+    if expected_prefix == "RUN" and file_id.startswith("RUN-BRIEF-") and not meta.get("Brief"):
+        yield Issue("missing-brief-ref", "warning", f"Missing Brief reference: {path}", where)
+
+    if not meta_id:
+        yield Issue("missing-meta-id", "error", f"Missing meta ID: {path}", where)
+    if not header_id:
+        yield Issue("missing-header-id", "error", f"Missing header ID: {path}", where)
+
+    if not type_plan.id_pattern.match(file_id):
+        yield Issue("invalid-filename", "error", f"Invalid filename for {expected_prefix}: {path}", where)
+
+    if meta_id and meta_id != file_id:
+        yield Issue("meta-id-mismatch", "error", f"Meta ID mismatch: {path}", where, meta_id)
+    if header_id and header_id != file_id:
+        yield Issue("header-id-mismatch", "error", f"Header ID mismatch: {path}", where, header_id)
+
+    must_read = meta.get("Must-Read")
+    if must_read is not None and expected_prefix in {"REQ", "RULE"}:
+        ids = parse_must_read(must_read)
+        if not ids and must_read.strip().lower() != "none":
+            yield Issue("empty-must-read", "error", f"Empty Must-Read: {path}", where)
+        for ref_id in ids:
+            prefix = ref_id.split("-", 1)[0]
+            if prefix not in ALLOWED_MUST_READ_PREFIXES:
+                yield Issue(
+                    "must-read-disallowed", "error",
+                    f"Must-Read disallowed ID: {path} -> {ref_id}", where, ref_id,
+                )
+            if ref_id not in all_ids:
+                yield Issue(
+                    "must-read-missing-target", "error",
+                    f"Must-Read missing target: {path} -> {ref_id}", where, ref_id,
+                )
 
-        folder = path.parent.name
-        expected_prefix = {
-            "req": "REQ",
-            "rule": "RULE",
-            "adr": "ADR",
-            "cq": "CQ",
-            "brief": "BRIEF",
-            "runs": "RUN",
-        }.get(folder)
-
-        if expected_prefix is None:
-            continue
+    status = meta.get("Status", "")
+    if status and type_plan.statuses is not None and normalize_status(status) not in type_plan.statuses:
+        yield Issue(
+            "invalid-status", severity["status_value_valid"],
+            f"Invalid Status for {expected_prefix}: {path} -> {status}", where, status,
+        )
 
-        if expected_prefix == "BRIEF":
-            status = meta.get("Status")
-            if not status:
-                print(f"[ERR] Missing Status: {path}")
-                issues += 1
-            else:
-                brief_statuses[file_id] = status
+    for field in type_plan.date_fields:
+        value = meta.get(field, "").strip()
+        if value and value != "-" and not plan.date_pattern.match(value):
+            yield Issue(
+                "invalid-date", severity["date_format"], f"Invalid {field} date: {path} -> {value}", where, field
+            )
 
-        if expected_prefix == "RUN":
-            brief_id = meta.get("Brief")
-            run_status = meta.get("Status")
-            completed = meta.get("Completed")
-            if brief_id and run_status:
-                run_brief_statuses.append(
-                    (file_id, brief_id, run_status, parse_completed_date(completed))
+    if type_plan.required_sections:
+        headings = record.get("sections", [])
+        for name, wanted in zip(type_plan.section_titles, type_plan.required_sections):
+            if not any(h == wanted or h.startswith(wanted + " ") for h in headings):
+                yield Issue(
+                    "missing-section", severity["required_sections"], f"Missing section {name}: {path}", where, name
                 )
-            if file_id.startswith("RUN-BRIEF-") and not brief_id:
-                print(f"[WARN] Missing Brief reference: {path}")
-                issues += 1
 
-        if not meta_id:
-            print(f"[ERR] Missing meta ID: {path}")
-            issues += 1
-        if not header_id:
-            print(f"[ERR] Missing header ID: {path}")
-            issues += 1
+    for required_status, fields, message in type_plan.completion:
+        if normalize_status(status) != required_status:
+            continue
+        for field in fields:
+            value = meta.get(field, "").strip()
+            if not value or value == "-":
+                text = f"{message}: {path}" if message else f"{status} {expected_prefix} missing {field}: {path}"
+                yield Issue("completion-missing-field", severity["completion_fields"], text, where, field)
 
-        pattern = {
-            "REQ": REQ_ID_PATTERN,
-            "RULE": RULE_ID_PATTERN,
-            "ADR": ADR_ID_PATTERN,
-            "CQ": CQ_ID_PATTERN,
-            "BRIEF": BRIEF_ID_PATTERN,
-            "RUN": RUN_ID_PATTERN,
-        }[expected_prefix]
-
-        if not pattern.match(file_id):
-            print(f"[ERR] Invalid filename for {expected_prefix}: {path}")
-            issues += 1
+    domain = meta.get("Domain", "").strip()
+    if domain and type_plan.known_domains is not None and domain not in type_plan.known_domains:
+        yield Issue("unknown-domain", severity["domain_known"], f"Unknown domain: {path} -> {domain}", where, domain)
 
-        if meta_id and meta_id != file_id:
-            print(f"[ERR] Meta ID mismatch: {path}")
-            issues += 1
-        if header_id and header_id != file_id:
-            print(f"[ERR] Header ID mismatch: {path}")
-            issues += 1
 
-        if expected_prefix in {"REQ", "RULE"}:
-            must_read = meta.get("Must-Read")
-            if must_read is None:
-                print(f"[ERR] Missing Must-Read: {path}")
-                issues += 1
-            else:
-                ids = parse_must_read(must_read)
-                if not ids and must_read.strip().lower() != "none":
-                    print(f"[ERR] Empty Must-Read: {path}")
-                    issues += 1
-                for ref_id in ids:
-                    prefix = ref_id.split("-", 1)[0]
-                    if prefix not in ALLOWED_MUST_READ_PREFIXES:
-                        print(f"[ERR] Must-Read disallowed ID: {path} -> {ref_id}")
-                        issues += 1
-                    if ref_id not in all_ids:
-                        print(f"[ERR] Must-Read missing target: {path} -> {ref_id}")
-                        issues += 1
-
-        if expected_prefix == "REQ":
-            status = meta.get("Status", "")
-            implemented_git = meta.get("Implemented-Git", "").strip()
-            if normalize_status(status) == "implemented" and (not implemented_git or implemented_git == "-"):
-                print(f"[WARN] Implemented REQ missing git hash: {path}")
-                issues += 1
-
-        if args.links:
-            for target in iter_links(text):
-                if not target or target.startswith("#"):
-                    continue
-                if re.match(r"^[a-zA-Z][a-zA-Z0-9+.-]*:", target):
-                    continue
-                resolved = (path.parent / target).resolve()
-                if not resolved.exists():
-                    print(f"[ERR] Broken link: {path} -> {target}")
-                    issues += 1
+def check_document_links(path: Path, record: dict, resolver: LinkResolver, plan: SchemaPlan) -> Iterable[Issue]:
+    type_plan = plan.for_path(path)
+    if type_plan is None:
+        return
+    severity = plan.severities
+    where = str(path)
+    for target in record["links"]:
+        if not is_local_link(target):
+            continue
+        if resolver.is_broken(path, target):
+            yield Issue("broken-link", "error", f"Broken link: {path} -> {target}", where, target)
+            continue
+        key = resolver.key(path, target.split("#", 1)[0])
+        if key is None or not key.endswith(".md"):
+            continue
+        target_folder = posixpath.basename(posixpath.dirname(key))
+        target_stem = posixpath.basename(key)[:-3]
+        if not type_plan.self_reference and target_stem == path.stem:
+            yield Issue("self-reference", severity["self_reference"], f"Self reference: {path}", where, target)
+            continue
+        expected_folder = plan.folder_of(target_stem.split("-", 1)[0])
+        if expected_folder is not None and target_folder in plan.types and target_folder != expected_folder:
+            yield Issue(
+                "link-wrong-folder", severity["link_type_correct"],
+                f"Link to wrong folder: {path} -> {target}", where, target,
+            )
+        elif type_plan.allowed_outbound is not None and target_folder in plan.types and (
+            target_folder not in type_plan.allowed_outbound
+        ):
+            yield Issue(
+                "link-not-allowed", severity["link_outbound_allowed"],
+                f"Link to {plan.types[target_folder].prefix} not allowed from {type_plan.prefix}: {path} -> {target}",
+                where, target,
+            )
 
-    # View -> REQ link validation
-    view_refs: set[str] = set()
-    for path in iter_md_files([VIEWS_DIR]):
-        text = read_text(path)
-        index_refs = extract_view_references(text)
-        summary_refs = extract_view_summary_refs(text)
-        ssot_refs = extract_view_ssot_refs(text)
-        summary_lines = extract_section_lines(text, "Summary")
-
-        if not index_refs:
-            print(f"[WARN] View missing References (SSOT index): {path}")
-            issues += 1
 
-        if not ssot_refs:
-            print(f"[WARN] View missing SSOT meta: {path}")
-            issues += 1
+def check_document_chunk(items: list[tuple[Path, dict]], context: dict) -> list[list[Issue]]:
+    """map_chunks() entry point for the per-document checks, with options from context."""
+    all_ids = context["all_ids"]
+    documents = context["documents"]
+    resolver = context["resolver"]
+    plan = context["plan"]
+    results = []
+    for path, record in items:
+        found = list(check_document(path, record, all_ids, plan)) if documents else []
+        if resolver is not None:
+            found.extend(check_document_links(path, record, resolver, plan))
+        results.append(found)
+    return results
 
-        for ref_id in ssot_refs:
-            if ref_id not in index_refs:
-                print(f"[WARN] SSOT ref not in SSOT index: {path} -> {ref_id}")
-                issues += 1
-            ref_path = REQ_DIR / f"{ref_id}.md"
-            if not ref_path.exists():
-                print(f"[WARN] SSOT ref missing REQ: {path} -> {ref_id}")
-                issues += 1
-
-        for ref_id in index_refs:
-            ref_path = REQ_DIR / f"{ref_id}.md"
-            if not ref_path.exists():
-                print(f"[WARN] View refs missing REQ: {path} -> {ref_id}")
-                issues += 1
-
-        for ref_id in summary_refs:
-            if ref_id not in index_refs:
-                print(f"[WARN] Summary ref not in SSOT index: {path} -> {ref_id}")
-                issues += 1
-            ref_path = REQ_DIR / f"{ref_id}.md"
-            if not ref_path.exists():
-                print(f"[WARN] Summary ref missing REQ: {path} -> {ref_id}")
-                issues += 1
-
-        for line in summary_lines:
-            if "<!--" in line:
-                continue
-            if "ATLAS:OK" in line and not REF_TOKEN_RE.search(line):
-                print(f"[WARN] Summary line marked ATLAS:OK missing ref: {path}")
-                issues += 1
-            if any(keyword in line for keyword in NORMATIVE_KEYWORDS) and not REF_TOKEN_RE.search(line):
-                print(f"[WARN] Summary line has normative keyword without ref: {path}")
-                issues += 1
 
-        view_refs.update(index_refs | summary_refs | ssot_refs)
+def check_view(path: Path, record: dict, req_ids: set[str], resolver: LinkResolver) -> Iterable[Issue]:
+    view = record["view"]
+    index_refs = set(view["index_refs"])
+    summary_refs = view["summary_refs"]
+    ssot_refs = sorted(set(REQ_REF_RE.findall(record["meta"].get("SSOT", ""))))
+    where = str(path)
 
-        for target in iter_links(text):
-            if not target or target.startswith("#"):
-                continue
-            if re.match(r"^[a-zA-Z][a-zA-Z0-9+.-]*:", target):
-                continue
-            resolved = (path.parent / target).resolve()
-            if is_relative_to(resolved, REQ_DIR) and not resolved.exists():
-                print(f"[WARN] Broken REQ link in view: {path} -> {target}")
-                issues += 1
+    if not index_refs:
+        yield Issue("view-missing-index", "warning", f"View missing References (SSOT index): {path}", where)
 
-    # REQ without any view reference
-    req_ids = [path.stem for path in all_docs if path.parent.name == "req"]
-    for req_id in req_ids:
-        if req_id not in view_refs:
-            print(f"[WARN] Missing view reference for REQ: {req_id}")
-            issues += 1
+    if not ssot_refs:
+        yield Issue("view-missing-ssot", "warning", f"View missing SSOT meta: {path}", where)
+
+    for ref_id in ssot_refs:
+        if ref_id not in index_refs:
+            yield Issue(
+                "ssot-ref-not-indexed", "warning",
+                f"SSOT ref not in SSOT index: {path} -> {ref_id}", where, ref_id,
+            )
+        if ref_id not in req_ids:
+            yield Issue(
+                "ssot-ref-missing-req", "warning", f"SSOT ref missing REQ: {path} -> {ref_id}", where, ref_id
+            )
+
+    for ref_id in view["index_refs"]:
+        if ref_id not in req_ids:
+            yield Issue(
+                "view-ref-missing-req", "warning", f"View refs missing REQ: {path} -> {ref_id}", where, ref_id
+            )
+
+    for ref_id in summary_refs:
+        if ref_id not in index_refs:
+            yield Issue(
+                "summary-ref-not-indexed", "warning",
+                f"Summary ref not in SSOT index: {path} -> {ref_id}", where, ref_id,
+            )
+        if ref_id not in req_ids:
+            yield Issue(
+                "summary-ref-missing-req", "warning",
+                f"Summary ref missing REQ: {path} -> {ref_id}", where, ref_id,
+            )
+
+    for _ in range(view["ok_without_ref"]):
+        yield Issue(
+            "summary-ok-missing-ref", "warning", f"Summary line marked ATLAS:OK missing ref: {path}", where
+        )
+    for _ in range(view["normative_without_ref"]):
+        yield Issue(
+            "summary-normative-missing-ref", "warning",
+            f"Summary line has normative keyword without ref: {path}", where,
+        )
+
+    for target in record["links"]:
+        if is_local_link(target) and resolver.is_broken(path, target, within=REQ_DIR):
+            yield Issue(
+                "view-broken-req-link", "warning", f"Broken REQ link in view: {path} -> {target}", where, target
+            )
+
+
+def view_refs_of(record: dict) -> set[str]:
+    view = record["view"]
+    refs = set(view["index_refs"]) | set(view["summary_refs"])
+    refs.update(REQ_REF_RE.findall(record["meta"].get("SSOT", "")))
+    return refs
+
+
+def check_view_coverage(docs: list[tuple[Path, dict]], views: list[tuple[Path, dict]]) -> Iterable[Issue]:
+    """Every REQ must be referenced by at least one view."""
+    view_refs: set[str] = set()
+    for _, record in views:
+        view_refs.update(view_refs_of(record))
+    for path, _ in docs:
+        if path.parent.name == "req" and path.stem not in view_refs:
+            yield Issue(
+                "req-missing-view", "warning",
+                f"Missing view reference for REQ: {path.stem}", str(path), path.stem,
+            )
 
-    latest_run_by_brief: dict[str, tuple[str, str, Optional[datetime]]] = {}
-    for run_id, brief_id, run_status, completed_at in run_brief_statuses:
-        normalized = normalize_status(run_status)
-        if normalized not in {"completed", "failed"}:
+
+def check_brief_runs(docs: list[tuple[Path, dict]]) -> Iterable[Issue]:
+    """BRIEF status must follow the latest finished RUN that references it."""
+    brief_statuses: dict[str, str] = {}
+    latest_run_by_brief: dict[str, tuple[Path, str, Optional[datetime]]] = {}
+    for path, record in docs:
+        folder = path.parent.name
+        meta = record["meta"]
+        if folder == "brief" and meta.get("Status"):
+            brief_statuses[path.stem] = meta["Status"]
+        if folder != "runs":
+            continue
+        brief_id = meta.get("Brief")
+        run_status = meta.get("Status")
+        if not brief_id or not run_status:
             continue
+        if normalize_status(run_status) not in {"completed", "failed"}:
+            continue
+        completed_at = parse_completed_date(meta.get("Completed"))
         existing = latest_run_by_brief.get(brief_id)
         if existing is None:
-            latest_run_by_brief[brief_id] = (run_id, run_status, completed_at)
+            latest_run_by_brief[brief_id] = (path, run_status, completed_at)
             continue
-        existing_run_id, _, existing_completed = existing
+        existing_path, _, existing_completed = existing
         if completed_at and (existing_completed is None or completed_at > existing_completed):
-            latest_run_by_brief[brief_id] = (run_id, run_status, completed_at)
-        elif completed_at is None and existing_completed is None and run_id > existing_run_id:
-            latest_run_by_brief[brief_id] = (run_id, run_status, completed_at)
+            latest_run_by_brief[brief_id] = (path, run_status, completed_at)
+        elif completed_at is None and existing_completed is None and path.stem > existing_path.stem:
+            latest_run_by_brief[brief_id] = (path, run_status, completed_at)
 
-    for brief_id, (run_id, run_status, _) in latest_run_by_brief.items():
+    for brief_id, (run_path, run_status, _) in latest_run_by_brief.items():
+        run_id = run_path.stem
         brief_status = brief_statuses.get(brief_id)
         if not brief_status:
-            print(f"[WARN] BRIEF missing for RUN: {run_id} -> {brief_id}")
-            issues += 1
+            yield Issue(
+                "brief-missing-for-run", "warning",
+                f"BRIEF missing for RUN: {run_id} -> {brief_id}", str(run_path), brief_id,
+            )
             continue
         if normalize_status(brief_status) != normalize_status(run_status):
-            print(
-                f"[WARN] BRIEF status mismatch: {brief_id} is {brief_status}, latest RUN {run_id} is {run_status}"
+            yield Issue(
+                "brief-status-mismatch", "warning",
+                f"BRIEF status mismatch: {brief_id} is {brief_status}, latest RUN {run_id} is {run_status}",
+                str(run_path), brief_id,
+            )
+
+
+GIT_OBJECTS_VERSION = 1
+GIT_EVIDENCE_FIELDS = {"req": "Implemented-Git", "runs": "Git"}
+# Placeholders finish and the templates write when there is no commit to point at.
+GIT_PLACEHOLDERS = {"", "-", "no-commit"}
+HEX_PREFIX_RE = LazyPattern(r"^[0-9a-f]{4,64}$")
+
+
+def load_git_objects(repo: str) -> dict[str, str]:
+    """Hashes already verified in repo, mapped to the full commit ID."""
+    try:
+        data = json.loads(read_text(GIT_OBJECTS_PATH))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != GIT_OBJECTS_VERSION or data.get("repo") != repo:
+        return {}
+    commits = data.get("commits")
+    return commits if isinstance(commits, dict) else {}
+
+
+def git_batch_check(values: list[str]) -> Optional[dict[str, Optional[str]]]:
+    """Look up every value with one `git cat-file --batch-check` process.
+
+    Returns value -> full commit ID (None if it names no commit), or None
+    if git cannot be run here.
+    """
+    import subprocess
+
+    payload = "".join(f"{value}^{{commit}}\n" for value in values)
+    try:
+        result = subprocess.run(
+            ["git", "cat-file", "--batch-check=%(objectname) %(objecttype)"],
+            cwd=REPO_ROOT,
+            input=payload,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    lines = result.stdout.splitlines()
+    if len(lines) != len(values):
+        return None
+    found: dict[str, Optional[str]] = {}
+    for value, line in zip(values, lines):
+        parts = line.split()
+        found[value] = parts[0] if len(parts) == 2 and parts[1] == "commit" else None
+    return found
+
+
+def check_git_evidence(docs: list[tuple[Path, dict]]) -> Iterable[Issue]:
+    """Implemented-Git (REQ) and Git (RUN) values must name commits in the repository.
+
+    Values are checked in one batch; verified hashes are cached in
+    state/git_objects.json, since a commit, once it exists, never changes.
+    """
+    evidence: list[tuple[Path, str, str]] = []
+    for path, record in docs:
+        field = GIT_EVIDENCE_FIELDS.get(path.parent.name)
+        value = record["meta"].get(field, "").strip() if field else ""
+        if value not in GIT_PLACEHOLDERS:
+            evidence.append((path, field, value))
+    if not evidence:
+        return
+
+    try:
+        git_dir = find_git_dir(REPO_ROOT)
+    except (UnsupportedGitLayout, OSError):
+        git_dir = None
+    repo = str(git_dir or REPO_ROOT)
+    known = load_git_objects(repo)
+    unknown = sorted({value for _, _, value in evidence if value not in known})
+    found: dict[str, Optional[str]] = {}
+    if unknown:
+        checked = git_batch_check(unknown)
+        if checked is None:
+            yield Issue("git-unavailable", "notice", "git cat-file failed; Git evidence not verified.", repo)
+            return
+        found = checked
+        # Only hash prefixes are cached; branch names and other refs move.
+        verified = {
+            value: commit for value, commit in checked.items()
+            if commit and HEX_PREFIX_RE.match(value) and commit.startswith(value)
+        }
+        if verified and STATE_DIR.is_dir():
+            write_json_atomic(
+                GIT_OBJECTS_PATH,
+                {"version": GIT_OBJECTS_VERSION, "repo": repo, "commits": {**known, **verified}},
             )
-            issues += 1
 
-    if LAST_RUN_PATH.exists():
+    for path, field, value in evidence:
+        if value not in known and not found.get(value):
+            yield Issue(
+                "git-commit-missing", "error",
+                f"{field} not found in repository: {path} -> {value}", str(path), value,
+            )
+
+
+def check_last_run(max_age_hours: int) -> Iterable[Issue]:
+    """Report every RUN still created/executing after max_age_hours.
+
+    Active RUNs come from the runs.jsonl view; last_run.json is still
+    validated and covers RUNs started before the log existed.
+    """
+    stale: set[str] = set()
+    cutoff = datetime.now() - timedelta(hours=max_age_hours)
+    active = load_active_runs()
+    for run_id, entry in sorted(active.items(), key=lambda item: str(item[1].get("at"))):
+        try:
+            ts = datetime.fromisoformat(entry.get("at", ""))
+        except (TypeError, ValueError):
+            continue
+        if ts < cutoff:
+            stale.add(run_id)
+            yield Issue(
+                "run-maybe-unfinished", "warning",
+                f"RUN may be unfinished (>{max_age_hours}h): {run_id}", str(RUNS_LOG_PATH), run_id,
+            )
+
+    if not LAST_RUN_PATH.exists():
+        return
+    where = str(LAST_RUN_PATH)
+    try:
+        state = json.loads(read_text(LAST_RUN_PATH))
+    except json.JSONDecodeError:
+        state = {}
+        yield Issue("last-run-invalid-json", "error", f"Invalid JSON: {LAST_RUN_PATH}", where)
+    stage = state.get("stage")
+    updated_at = state.get("updated_at") or state.get("completed_at")
+    if stage == "executing" and updated_at:
         try:
-            state = json.loads(read_text(LAST_RUN_PATH))
-        except json.JSONDecodeError:
-            state = {}
-            print(f"[ERR] Invalid JSON: {LAST_RUN_PATH}")
+            ts = datetime.fromisoformat(updated_at)
+        except ValueError:
+            yield Issue("last-run-invalid-timestamp", "error", "Invalid timestamp in last_run.json", where)
+            return
+        run_id = state.get("run_id")
+        if ts < cutoff and run_id not in stale:
+            yield Issue(
+                "run-maybe-unfinished", "warning",
+                f"RUN may be unfinished (>{max_age_hours}h): {run_id}", where, run_id,
+            )
+
+
+# =============================================================================
+# Incremental doctor
+# =============================================================================
+
+DOCTOR_CACHE_VERSION = 4
+
+
+def load_doctor_cache(links: bool, schema: str) -> dict[str, dict]:
+    """Return cached per-document issues, or {} if they were produced under other options or schemas."""
+    if _SERVER is not None:
+        return _SERVER.doctor_caches.get((links, schema), {})
+    try:
+        data = json.loads(read_text(DOCTOR_CACHE_PATH))
+    except (OSError, ValueError):
+        return {}
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != DOCTOR_CACHE_VERSION
+        or data.get("root") != str(ATLAS_ROOT)
+        or data.get("links") != links
+        or data.get("schema") != schema
+    ):
+        return {}
+    docs = data.get("docs", {})
+    for entry in docs.values():
+        entry["issues"] = [Issue(**item) for item in entry["issues"]]
+    return docs
+
+
+def save_doctor_cache(links: bool, schema: str, docs: dict[str, dict]) -> None:
+    if _SERVER is not None:
+        _SERVER.doctor_caches[(links, schema)] = docs
+        return
+    if not STATE_DIR.is_dir():
+        return
+    docs = {key: {**entry, "issues": [issue.to_dict() for issue in entry["issues"]]} for key, entry in docs.items()}
+    write_json_atomic(
+        DOCTOR_CACHE_PATH,
+        {"version": DOCTOR_CACHE_VERSION, "root": str(ATLAS_ROOT), "links": links, "schema": schema, "docs": docs},
+    )
+
+
+def record_ids(path: Path, record: dict) -> set[str]:
+    ids = {path.stem}
+    for candidate in [record["meta"].get("ID"), record["header_id"]]:
+        if candidate:
+            ids.add(candidate)
+    return ids
+
+
+def git_changed_keys(ref: str) -> Optional[set[str]]:
+    """Index keys of .atlas files that differ from ref, or None if git is unavailable."""
+    import subprocess
+
+    try:
+        result = subprocess.run(
+            ["git", "diff", "--name-only", "--relative", ref, "--", ATLAS_ROOT.name],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            check=True,
+        )
+    except Exception:
+        return None
+    prefix = ATLAS_ROOT.name + "/"
+    return {line[len(prefix) :] for line in result.stdout.splitlines() if line.startswith(prefix)}
+
+
+def target_exists(key: str, exists: dict[str, bool]) -> bool:
+    """Whether the path at index key exists, stat-ed once per exists dict."""
+    if key not in exists:
+        exists[key] = (ATLAS_ROOT / key).exists()
+    return exists[key]
+
+
+def outside_link_targets(key: str, record: dict, indexed: set[str], exists: dict[str, bool]) -> dict[str, bool]:
+    """Non-indexed paths a document links to (FRONT.md, images), each mapped to whether it exists."""
+    targets: dict[str, bool] = {}
+    for target in record["links"]:
+        if is_local_link(target):
+            target_key = link_key(key, target)
+            if target_key not in indexed:
+                targets[target_key] = target_exists(target_key, exists)
+    return targets
+
+
+def affected_keys(
+    records: list[tuple[Path, dict]],
+    cache: dict[str, dict],
+    git_keys: Optional[set[str]] = None,
+    exists: Optional[dict[str, bool]] = None,
+) -> set[str]:
+    """Documents to re-validate: changed ones plus everything that depends on them.
+
+    A document is changed if its stat differs from the cached run, it has no
+    cached result, it was deleted, or it is in git_keys (see git_changed_keys).
+    Dependents are views naming a changed REQ, REQ/RULE docs whose Must-Read
+    names a changed ID, and documents linking to an added or deleted file,
+    indexed or not. exists memoises the stat of non-indexed link targets
+    (see outside_link_targets).
+    """
+    exists = {} if exists is None else exists
+    current = {DocIndex.key(path): (path, record) for path, record in records}
+    changed = {
+        key for key, (_, record) in current.items()
+        if key not in cache or cache[key].get("stat") != record.get("stat")
+    }
+    removed = set(cache) - set(current)
+    changed |= removed
+    if git_keys is not None:
+        changed |= git_keys & (set(current) | removed)
+    # Unchanged documents whose non-indexed link targets appeared or vanished.
+    relinked = {
+        key for key in current
+        if key not in changed and any(
+            target_exists(target, exists) != existed for target, existed in cache[key].get("targets", {}).items()
+        )
+    }
+    if not changed:
+        return relinked
+
+    changed_ids: set[str] = set()
+    for key in changed:
+        if key in current:
+            changed_ids |= record_ids(*current[key])
+        changed_ids.update(cache.get(key, {}).get("ids", []))
+    added_or_removed = removed | {key for key in changed if key not in cache}
+
+    affected = set(changed)
+    for key, (_, record) in current.items():
+        if key in affected:
+            continue
+        depends_on = set(parse_must_read(record["meta"].get("Must-Read", "None")))
+        if "view" in record:
+            depends_on |= view_refs_of(record)
+        if depends_on & changed_ids or (
+            added_or_removed
+            and any(
+                is_local_link(target) and link_key(key, target) in added_or_removed
+                for target in record["links"]
+            )
+        ):
+            affected.add(key)
+    return (affected | relinked) & set(current)
+
+
+def document_issues(
+    docs: list[tuple[Path, dict]],
+    views: list[tuple[Path, dict]],
+    checks: frozenset[str],
+    jobs: int,
+    changed: Optional[str] = None,
+    cache: Optional[dict[str, dict]] = None,
+    plan: Optional[SchemaPlan] = None,
+) -> tuple[list[Issue], list[Issue]]:
+    """Return (notes about the run, per-document and per-view issues in document order).
+
+    With the full per-document check set, results are cached per document
+    and changed (see validate) limits re-validation to affected documents.
+    The cache lives in doctor_cache.json unless the caller passes its own
+    dict, which is then updated in place. plan defaults to the workspace's
+    compiled schemas.json/workflow.json.
+    """
+    plan = plan or load_schema_plan()
+    notes: list[Issue] = []
+    if plan.note:
+        notes.append(Issue("schema-fallback", "notice", plan.note, str(SCHEMAS_PATH)))
+    all_ids: set[str] = set()
+    for path, record in docs:
+        all_ids |= record_ids(path, record)
+    req_ids = {path.stem for path, _ in docs if path.parent == REQ_DIR}
+    links = "links" in checks
+
+    doc_keys = [DocIndex.key(path) for path, _ in docs]
+    view_keys = [DocIndex.key(path) for path, _ in views]
+    cached = CACHED_CHECKS <= checks
+    persist = cache is None
+    if persist:
+        cache = load_doctor_cache(links, plan.digest) if cached else {}
+    affected = set(doc_keys) | set(view_keys)
+    exists: dict[str, bool] = {}
+    if cached and changed is not None:
+        git_keys = None
+        if changed:
+            git_keys = git_changed_keys(changed)
+            if git_keys is None:
+                notes.append(Issue(
+                    "git-diff-failed", "notice", f"git diff against {changed} failed; using stat snapshot only."
+                ))
+        affected = affected_keys(docs + views, cache, git_keys, exists)
+        notes.append(Issue(
+            "partial-validation", "info",
+            f"Re-validating {len(affected)} of {len(docs) + len(views)} document(s).",
+        ))
+    elif cached and cache and _SERVER is not None:
+        # The server's cache is current as of its last doctor run; re-check only what changed since.
+        affected = affected_keys(docs + views, cache, exists=exists)
+
+    stale_docs = [(key, item) for key, item in zip(doc_keys, docs) if key in affected]
+    if not checks & {"documents", "links"}:
+        stale_docs = []
+    stale_views = [(key, item) for key, item in zip(view_keys, views) if key in affected]
+    if "views" not in checks:
+        stale_views = []
+    resolver = LinkResolver() if stale_views or (links and stale_docs) else None
+    fresh = map_chunks(
+        check_document_chunk,
+        [item for _, item in stale_docs],
+        jobs,
+        context={
+            "all_ids": all_ids,
+            "documents": "documents" in checks,
+            "resolver": resolver if links else None,
+            "plan": plan,
+        },
+    )
+    found_by_key = {key: found for (key, _), found in zip(stale_docs, fresh)}
+    for key, (path, record) in stale_views:
+        found_by_key[key] = list(check_view(path, record, req_ids, resolver))
+
+    if cached:
+        indexed = set(doc_keys) | set(view_keys)
+        new_cache: dict[str, dict] = {}
+        for key, (path, record) in zip(doc_keys + view_keys, docs + views):
+            found = found_by_key.get(key)
+            if found is None:
+                found = found_by_key[key] = cache[key]["issues"]
+                targets = cache[key].get("targets", {})
+            else:
+                targets = outside_link_targets(key, record, indexed, exists)
+            new_cache[key] = {
+                "stat": record.get("stat"),
+                "ids": sorted(record_ids(path, record)),
+                "targets": targets,
+                "issues": found,
+            }
+        if not persist:
+            cache.clear()
+            cache.update(new_cache)
+        # Saved before anything is reported, so an interrupted consumer keeps the results.
+        elif stale_docs or stale_views or set(cache) != set(new_cache):
+            save_doctor_cache(links, plan.digest, new_cache)
+
+    issues = [issue for key in doc_keys + view_keys for issue in found_by_key.get(key, [])]
+    return notes, issues
+
+
+# =============================================================================
+# Validation API
+# =============================================================================
+
+
+def run_checks(
+    docs: list[tuple[Path, dict]],
+    views: list[tuple[Path, dict]],
+    checks: frozenset[str],
+    jobs: int,
+    max_age_hours: int,
+    changed: Optional[str] = None,
+    cache: Optional[dict[str, dict]] = None,
+    plan: Optional[SchemaPlan] = None,
+) -> Iterator[Issue]:
+    """Run the selected checks over already-parsed records, in doctor's report order."""
+    notes, found = document_issues(docs, views, checks, jobs, changed, cache, plan)
+
+    yield from notes
+    if "layout" in checks:
+        yield from check_layout()
+    yield from found
+    if "coverage" in checks:
+        yield from check_view_coverage(docs, views)
+    if "runs" in checks:
+        yield from check_brief_runs(docs)
+    if "git" in checks:
+        yield from check_git_evidence(docs)
+    if "last_run" in checks:
+        yield from check_last_run(max_age_hours)
+
+
+def validate(
+    workspace: Optional[Path] = None,
+    checks: Optional[Iterable[str]] = None,
+    *,
+    max_age_hours: int = 24,
+    jobs: Optional[int] = None,
+    changed: Optional[str] = None,
+) -> Iterator[Issue]:
+    """Validate an Atlas workspace and return an iterator over its Issue records.
+
+    For the current workspace issues stream out as the checks produce them.
+    Another workspace is switched to, validated in full and switched back
+    before this returns, so the process never stays pointed at it while the
+    caller consumes the issues.
+
+    Args:
+        workspace: Directory containing .atlas/ (default: the current workspace).
+        checks: Check groups from CHECKS to run (default: all but "links" and "git").
+        max_age_hours: Age after which an executing RUN is reported as unfinished.
+        jobs: Worker processes for parsing and per-document checks (default: CPU count).
+        changed: Re-validate only documents changed since the last cached run
+            (""), or since the given git ref; cached issues are reused for the rest.
+
+    Raises:
+        ValueError: If checks names an unknown group.
+    """
+    selected = DEFAULT_CHECKS if checks is None else frozenset(checks)
+    unknown = selected - set(CHECKS)
+    if unknown:
+        raise ValueError(f"Unknown checks: {', '.join(sorted(unknown))}")
+
+    previous = REPO_ROOT
+    if workspace is None or Path(workspace).resolve() == previous:
+        return _validate_current(selected, max_age_hours, jobs, changed)
+    set_workspace(workspace)
+    try:
+        return iter(list(_validate_current(selected, max_age_hours, jobs, changed)))
+    finally:
+        save_doc_index()
+        set_workspace(previous)
+
+
+def _validate_current(
+    selected: frozenset[str], max_age_hours: int, jobs: Optional[int], changed: Optional[str]
+) -> Iterator[Issue]:
+    jobs = resolve_jobs(jobs)
+    # Parse stage: every document is read (or fetched from the index) once.
+    docs: list[tuple[Path, dict]] = []
+    views: list[tuple[Path, dict]] = []
+    if selected - {"layout", "last_run"}:
+        index = get_doc_index()
+        docs = index.scan([REQ_DIR, RULE_DIR, ADR_DIR, CQ_DIR, BRIEF_DIR, RUN_DIR], jobs=jobs)
+        if selected & {"views", "coverage"}:
+            views = index.scan([VIEWS_DIR], jobs=jobs)
+    return run_checks(docs, views, selected, jobs, max_age_hours, changed)
+
+
+def doctor_command(args: argparse.Namespace) -> int:
+    checks = DEFAULT_CHECKS | {"links"} if args.links else DEFAULT_CHECKS
+    if args.verify_git:
+        checks |= {"git"}
+    issues = 0
+    for issue in validate(checks=checks, max_age_hours=args.max_age_hours, jobs=args.jobs, changed=args.changed):
+        print(issue.render())
+        if issue.counted:
             issues += 1
-        stage = state.get("stage")
-        updated_at = state.get("updated_at") or state.get("completed_at")
-        if stage == "executing" and updated_at:
-            try:
-                ts = datetime.fromisoformat(updated_at)
-                if datetime.now() - ts > timedelta(hours=args.max_age_hours):
-                    print(
-                        f"[WARN] RUN may be unfinished (>{args.max_age_hours}h): {state.get('run_id')}"
-                    )
-                    issues += 1
-            except ValueError:
-                print("[ERR] Invalid timestamp in last_run.json")
-                issues += 1
 
     print(f"[DONE] Doctor completed with {issues} issue(s).")
     return 0 if issues == 0 else 1
 
 
-    print(f"[DONE] Doctor completed with {issues} issue(s).")
-    return 0 if issues == 0 else 1
+# =============================================================================
+# Watch
+# =============================================================================
+
+WATCH_DEBOUNCE_MS = 50
+WATCH_POLL_INTERVAL = 0.5
+
+# inotify(7) event masks.
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+INOTIFY_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+)
+
+
+class InotifyWatcher:
+    """Reports changed paths under root using Linux inotify (via libc, no dependencies)."""
+
+    name = "inotify"
+
+    def __init__(self, root: Path):
+        import ctypes
+        import ctypes.util
+
+        self.root = root
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._get_errno = ctypes.get_errno
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(self._get_errno(), "inotify_init1 failed")
+        self.watches: dict[int, Path] = {}
+        self.add_tree(root)
+
+    def add_tree(self, directory: Path) -> None:
+        for dirpath, _, _ in os.walk(directory):
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(dirpath), INOTIFY_MASK)
+            if wd < 0:
+                raise OSError(self._get_errno(), f"inotify_add_watch failed: {dirpath}")
+            self.watches[wd] = Path(dirpath)
+
+    def wait(self, timeout: Optional[float]) -> set[Path]:
+        import select
+        import struct
+
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed: set[Path] = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = struct.unpack_from("iIII", data, offset)
+                offset += 16
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    # Events were dropped; rescan everything.
+                    changed.add(self.root)
+                    continue
+                base = self.watches.get(wd)
+                if mask & IN_IGNORED:
+                    self.watches.pop(wd, None)
+                if base is None:
+                    continue
+                path = base / os.fsdecode(name) if name else base
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    self.add_tree(path)
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Portable fallback: compares stat snapshots of the tree every interval."""
+
+    name = "polling"
+
+    def __init__(self, root: Path, interval: float = WATCH_POLL_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.snapshot = self._snapshot()
+
+    def _snapshot(self) -> dict[str, tuple[int, int]]:
+        snapshot = {}
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout: Optional[float]) -> set[Path]:
+        import time
+
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        current = self._snapshot()
+        changed = {path for path, stamp in current.items() if self.snapshot.get(path) != stamp}
+        changed |= set(self.snapshot) - set(current)
+        self.snapshot = current
+        return {Path(path) for path in changed}
+
+    def close(self) -> None:
+        pass
+
+
+def make_watcher(root: Path, poll: bool = False, interval: float = WATCH_POLL_INTERVAL):
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError) as exc:
+            print(f"[WARN] inotify unavailable ({exc}); falling back to polling.")
+    return PollingWatcher(root, interval)
+
+
+def is_watched_change(path: Path) -> bool:
+    """Ignore Atlas's own cache writes and editor temp files; keep docs, directories and schemas."""
+    if is_relative_to(path, STATE_DIR):
+        return path in (LAST_RUN_PATH, RUNS_LOG_PATH)
+    return path.suffix in {".md", ""} or path in (SCHEMAS_PATH, WORKFLOW_PATH)
+
+
+def watch_changes(watcher, debounce: float) -> set[Path]:
+    """Block until something changes, then collect events until debounce seconds pass quietly."""
+    changed: set[Path] = set()
+    while not changed:
+        changed = {path for path in watcher.wait(None) if is_watched_change(path)}
+    while True:
+        more = watcher.wait(debounce)
+        if not more:
+            return changed
+        changed |= {path for path in more if is_watched_change(path)}
+
+
+def diff_issues(before: list[Issue], after: list[Issue]) -> tuple[list[Issue], list[Issue]]:
+    """Return (appeared, disappeared) issues, keeping report order."""
+    from collections import Counter
+
+    remaining = Counter(before)
+    appeared = []
+    for issue in after:
+        if remaining[issue] > 0:
+            remaining[issue] -= 1
+        else:
+            appeared.append(issue)
+    return appeared, list((+remaining).elements())
+
+
+class IncrementalValidator:
+    """Doctor state kept in memory between edits, for watch.
+
+    Records, per-document issues and reverse dependencies (ID -> documents
+    naming it in Must-Read or view refs, file -> documents linking to it)
+    are held in memory, so update() re-validates only the changed documents
+    and their dependents instead of the whole workspace.
+    """
+
+    def __init__(self, checks: frozenset[str], max_age_hours: int, jobs: int):
+        from collections import Counter, defaultdict
+
+        self.checks = checks
+        self.links = "links" in checks
+        self.max_age_hours = max_age_hours
+        self.jobs = jobs
+        self.index = get_doc_index()
+        self.doc_dirs = [REQ_DIR, RULE_DIR, ADR_DIR, CQ_DIR, BRIEF_DIR, RUN_DIR]
+        self.prefixes = tuple(DocIndex.key(d) + "/" for d in self.doc_dirs + [VIEWS_DIR])
+        self.records: dict[str, tuple[Path, dict]] = {}
+        self.issues: dict[str, list[Issue]] = {}
+        self.coverage: dict[str, list[Issue]] = {}
+        self.global_issues: dict[str, list[Issue]] = {}
+        self.id_counts: Counter = Counter()
+        self.view_refs: Counter = Counter()
+        self.dependents: dict[str, set[str]] = defaultdict(set)
+        self.linkers: dict[str, set[str]] = defaultdict(set)
+        self.resolver = LinkResolver()
+        self.plan = load_schema_plan()
+        self.total = 0
+
+    def start(self) -> list[Issue]:
+        """Full validation (reusing doctor's on-disk cache); returns every issue in doctor order."""
+        docs = self.index.scan(self.doc_dirs, jobs=self.jobs)
+        views = self.index.scan([VIEWS_DIR], jobs=self.jobs)
+        cache = load_doctor_cache(self.links, self.plan.digest)
+        issues = [
+            issue
+            for issue in run_checks(docs, views, self.checks, self.jobs, self.max_age_hours, "", cache, self.plan)
+            if issue.severity != "info"
+        ]
+        self.total = sum(issue.counted for issue in issues)
+        for path, record in docs + views:
+            key = DocIndex.key(path)
+            self._add(key, path, record)
+            self.issues[key] = cache[key]["issues"]
+        for key in self.records:
+            if key.startswith("req/"):
+                self.coverage[key] = self._coverage(key)
+        for group in ["layout", "runs", "last_run"]:
+            self.global_issues[group] = self._global(group)
+        return issues
+
+    def cache_entries(self) -> dict[str, dict]:
+        indexed = set(self.records)
+        exists: dict[str, bool] = {}
+        return {
+            key: {
+                "stat": record.get("stat"),
+                "ids": sorted(record_ids(path, record)),
+                "targets": outside_link_targets(key, record, indexed, exists),
+                "issues": self.issues[key],
+            }
+            for key, (path, record) in self.records.items()
+        }
+
+    # ------------------------------------------------------------------
+    # Bookkeeping
+    # ------------------------------------------------------------------
+
+    def _depends_on(self, record: dict) -> set[str]:
+        ids = set(parse_must_read(record["meta"].get("Must-Read", "None")))
+        if "view" in record:
+            ids |= view_refs_of(record)
+        return ids
+
+    def _link_targets(self, key: str, record: dict) -> set[str]:
+        return {fold_case(link_key(key, target)) for target in record["links"] if is_local_link(target)}
+
+    def _add(self, key: str, path: Path, record: dict) -> None:
+        self.records[key] = (path, record)
+        self.id_counts.update(record_ids(path, record))
+        if "view" in record:
+            self.view_refs.update(view_refs_of(record))
+        for ref_id in self._depends_on(record):
+            self.dependents[ref_id].add(key)
+        for target in self._link_targets(key, record):
+            self.linkers[target].add(key)
+
+    def _remove(self, key: str) -> None:
+        path, record = self.records.pop(key)
+        self.id_counts.subtract(record_ids(path, record))
+        if "view" in record:
+            self.view_refs.subtract(view_refs_of(record))
+        for ref_id in self._depends_on(record):
+            self.dependents[ref_id].discard(key)
+        for target in self._link_targets(key, record):
+            self.linkers[target].discard(key)
+
+    def _has_id(self, ref_id: str) -> bool:
+        return self.id_counts[ref_id] > 0
+
+    def _check(self, key: str) -> list[Issue]:
+        path, record = self.records[key]
+        if "view" in record:
+            req_ids = {ref_id for ref_id in view_refs_of(record) if f"req/{ref_id}.md" in self.records}
+            return list(check_view(path, record, req_ids, self.resolver)) if "views" in self.checks else []
+        all_ids = {ref_id for ref_id in parse_must_read(record["meta"].get("Must-Read", "None")) if self._has_id(ref_id)}
+        found = list(check_document(path, record, all_ids, self.plan)) if "documents" in self.checks else []
+        if self.links:
+            found.extend(check_document_links(path, record, self.resolver, self.plan))
+        return found
+
+    def _coverage(self, key: str) -> list[Issue]:
+        if "coverage" not in self.checks or key not in self.records:
+            return []
+        path, record = self.records[key]
+        return list(check_view_coverage([(path, record)], [])) if self.view_refs[path.stem] <= 0 else []
+
+    def _global(self, group: str) -> list[Issue]:
+        if group not in self.checks:
+            return []
+        if group == "layout":
+            return list(check_layout())
+        if group == "runs":
+            docs = [item for key, item in self.records.items() if key.startswith(("runs/", "drafts/brief/"))]
+            return list(check_brief_runs(docs))
+        return list(check_last_run(self.max_age_hours))
+
+    def _changed_keys(self, paths: set[Path]) -> set[str]:
+        keys: set[str] = set()
+        for path in paths:
+            key = DocIndex.key(path)
+            if path == ATLAS_ROOT:
+                return set(self.records) | {DocIndex.key(p) for p in iter_md_files(self.doc_dirs + [VIEWS_DIR])}
+            if not (key + "/").startswith(self.prefixes) and not key.startswith(self.prefixes):
+                continue
+            if path.suffix == ".md":
+                keys.add(key)
+                continue
+            # A directory appeared or vanished: everything below it changed.
+            keys |= {k for k in self.records if k.startswith(key + "/")}
+            if path.is_dir():
+                keys |= {DocIndex.key(p) for p in iter_md_files([path])}
+        return keys
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def update(self, paths: set[Path]) -> tuple[list[Issue], list[Issue]]:
+        """Apply filesystem changes; return (appeared, disappeared) issues."""
+        keys = self._changed_keys(paths)
+        schema_changed = False
+        if SCHEMAS_PATH in paths or WORKFLOW_PATH in paths:
+            plan = load_schema_plan()
+            schema_changed = plan.digest != self.plan.digest
+            self.plan = plan
+        for key in keys:
+            self.index.get(ATLAS_ROOT / key)
+
+        changed_ids: set[str] = set()
+        changed_refs: set[str] = set()
+        existence: set[str] = set()
+        before: list[Issue] = []
+        for key in keys:
+            old = self.records.get(key)
+            new = self.index.entries.get(key)
+            if old is not None:
+                changed_ids |= record_ids(*old)
+                if "view" in old[1]:
+                    changed_refs |= view_refs_of(old[1])
+                self._remove(key)
+            if new is not None:
+                path = ATLAS_ROOT / key
+                self._add(key, path, new)
+                changed_ids |= record_ids(path, new)
+                if "view" in new:
+                    changed_refs |= view_refs_of(new)
+            if (old is None) != (new is None):
+                existence.add(key)
+                self._update_resolver(key, exists=new is not None)
+
+        affected = set(self.records) if schema_changed else set(keys)
+        for ref_id in changed_ids:
+            affected |= self.dependents.get(ref_id, set())
+        for key in existence:
+            affected |= self.linkers.get(fold_case(key), set())
+
+        after: list[Issue] = []
+        for key in sorted(affected):
+            before.extend(self.issues.pop(key, []))
+            if key in self.records:
+                self.issues[key] = self._check(key)
+                after.extend(self.issues[key])
+
+        coverage_keys = {key for key in keys if key.startswith("req/")}
+        coverage_keys |= {f"req/{ref_id}.md" for ref_id in changed_refs}
+        for key in sorted(coverage_keys):
+            before.extend(self.coverage.pop(key, []))
+            if key in self.records:
+                self.coverage[key] = self._coverage(key)
+                after.extend(self.coverage[key])
+
+        groups = ["layout", "last_run"]
+        if any(key.startswith(("runs/", "drafts/brief/")) for key in keys):
+            groups.append("runs")
+        for group in groups:
+            before.extend(self.global_issues.get(group, []))
+            self.global_issues[group] = self._global(group)
+            after.extend(self.global_issues[group])
+        self.total += sum(issue.counted for issue in after) - sum(issue.counted for issue in before)
+        return diff_issues(before, after)
+
+    def _update_resolver(self, key: str, exists: bool) -> None:
+        if exists:
+            parts = key.split("/")
+            for i in range(1, len(parts) + 1):
+                self.resolver.existing.add(fold_case("/".join(parts[:i])))
+        else:
+            self.resolver.existing.discard(fold_case(key))
+
+
+def watch_command(args: argparse.Namespace) -> int:
+    import time
+
+    checks = DEFAULT_CHECKS | {"links"} if args.links else DEFAULT_CHECKS
+    # Watch first, so edits made during the initial pass are picked up afterwards.
+    watcher = make_watcher(ATLAS_ROOT, poll=args.poll, interval=args.interval)
+    validator = IncrementalValidator(checks, args.max_age_hours, resolve_jobs(args.jobs))
+    for issue in validator.start():
+        print(issue.render())
+    print(f"[INFO] Watching {ATLAS_ROOT} ({watcher.name}) with {validator.total} issue(s). Press Ctrl+C to stop.")
+    sys.stdout.flush()
+
+    try:
+        while True:
+            changed = watch_changes(watcher, args.debounce / 1000)
+            started = time.perf_counter()
+            appeared, gone = validator.update(changed)
+            for issue in gone:
+                print(f"- {issue.render()}")
+            for issue in appeared:
+                print(f"+ {issue.render()}")
+            elapsed = (time.perf_counter() - started) * 1000
+            print(
+                f"[WATCH] {len(changed)} change(s): {validator.total} issue(s) "
+                f"(+{len(appeared)} -{len(gone)}) in {elapsed:.0f} ms"
+            )
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        save_doctor_cache(validator.links, validator.plan.digest, validator.cache_entries())
+    print("[DONE] Watch stopped.")
+    return 0
+
+
+# =============================================================================
+# Server
+# =============================================================================
+
+SERVER_PROTOCOL = 1
+# Commands the CLI hands to a running `atlas serve`; everything else runs in-process.
+SERVER_COMMANDS = frozenset({"capture", "intake", "run", "plan", "finish", "sync", "doctor"})
+# Set (to anything non-empty) to always run in-process.
+NO_SERVER_ENV = "ATLAS_NO_SERVER"
+
+# The server, when this process is one (see serve_command).
+_SERVER: Optional["WorkspaceServer"] = None
+
+
+def source_stamp() -> list:
+    """Identifies the code this process runs; a server only serves clients running the same file."""
+    path = os.path.realpath(__file__)
+    st = os.stat(path)
+    return [path, st.st_mtime_ns, st.st_size]
+
+
+def forward_to_server(argv: list[str]) -> Optional[int]:
+    """Run argv on this workspace's `atlas serve` and return its exit status.
+
+    Returns None when there is no server to ask (or it declines), so the
+    caller runs the command in-process. Commands reading stdin ('-') are
+    never forwarded.
+    """
+    if not argv or argv[0] not in SERVER_COMMANDS or "-" in argv or os.environ.get(NO_SERVER_ENV):
+        return None
+    if not SERVER_SOCKET_PATH.exists():
+        return None
+    import socket
+
+    request = {"protocol": SERVER_PROTOCOL, "source": source_stamp(), "cwd": os.getcwd(), "argv": argv}
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            sock.connect(str(SERVER_SOCKET_PATH))
+        except OSError:
+            return None  # Stale socket: the server is gone.
+        try:
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reader:
+                reply = json.loads(reader.readline())
+        except (OSError, ValueError):
+            # The command may already have run; running it again here could apply it twice.
+            print(f"[ERR] Lost connection to atlas serve ({SERVER_SOCKET_PATH}).", file=sys.stderr)
+            return 1
+    finally:
+        sock.close()
+    if "error" in reply:
+        print(f"[WARN] {reply['error']} Running in-process.", file=sys.stderr)
+        return None
+    sys.stdout.write(reply.get("stdout", ""))
+    sys.stderr.write(reply.get("stderr", ""))
+    return reply.get("code", 1)
+
+
+class ThreadStream:
+    """Stand-in for sys.stdout or sys.stderr that routes writes per thread.
+
+    A thread's writes go where thread_output() pointed them, or else to the
+    stream this one replaced. Unlike contextlib.redirect_stdout, capturing
+    one command's output never swallows another thread's writes (or an MCP
+    transport's).
+    """
+
+    def __init__(self, stream):
+        import threading
+
+        self.stream = stream
+        self.local = threading.local()
+
+    def target(self):
+        return getattr(self.local, "target", None) or self.stream
+
+    def write(self, text: str) -> int:
+        return self.target().write(text)
+
+    def flush(self) -> None:
+        self.target().flush()
+
+    def __getattr__(self, name: str):
+        return getattr(self.target(), name)
+
+
+def install_thread_streams() -> None:
+    """Replace sys.stdout and sys.stderr with ThreadStreams (once, before other threads start)."""
+    if not isinstance(sys.stdout, ThreadStream):
+        sys.stdout = ThreadStream(sys.stdout)
+    if not isinstance(sys.stderr, ThreadStream):
+        sys.stderr = ThreadStream(sys.stderr)
+
+
+@contextmanager
+def thread_output(stdout, stderr) -> Iterator[None]:
+    """Send the calling thread's sys.stdout/sys.stderr writes to stdout/stderr for the with-block.
+
+    Needs install_thread_streams(); other threads keep writing where they did.
+    """
+    routes = []
+    for stream, target in ((sys.stdout, stdout), (sys.stderr, stderr)):
+        if isinstance(target, ThreadStream):
+            target = target.target()
+        routes.append((stream, getattr(stream.local, "target", None)))
+        stream.local.target = target
+    try:
+        yield
+    finally:
+        for stream, previous in routes:
+            stream.local.target = previous
+
+
+class WorkspaceServer:
+    """Serves CLI requests for one workspace from a single long-lived process.
+
+    The document index stays in memory and, with inotify, is kept current
+    from filesystem events instead of re-walking .atlas/ for every request;
+    doctor keeps its per-document results in memory and re-checks only the
+    documents that changed (and their dependents). Requests are handled one
+    at a time, and locks still coordinate with in-process CLI runs.
+    """
+
+    def __init__(self, watcher: Optional["InotifyWatcher"]):
+        import threading
+
+        install_thread_streams()
+        # Commands run in the client's working directory, which is process-wide.
+        self.command_lock = threading.Lock()
+        self.watcher = watcher
+        self.source = source_stamp()
+        self.dirs = [REQ_DIR, RULE_DIR, ADR_DIR, CQ_DIR, BRIEF_DIR, RUN_DIR, VIEWS_DIR]
+        self.index = get_doc_index()
+        self.parser = build_parser()
+        self.doctor_caches: dict[tuple[bool, str], dict[str, dict]] = {}
+        self.stopping = False
+        if watcher is not None:
+            self.index.watch(self.dirs)
+
+    def apply_events(self) -> None:
+        """Feed filesystem events queued since the last call into the document index."""
+        if self.watcher is None:
+            return
+        changed = self.watcher.wait(0)
+        if ATLAS_ROOT in changed:
+            self.index.watch(self.dirs)  # Events were dropped: rescan.
+            return
+        self.index.refresh(path for path in changed if any(is_relative_to(path, d) for d in self.dirs))
+
+    def handle(self, request: dict) -> dict:
+        """Run one request and return its reply; safe to call from several threads.
+
+        Commands resolve relative paths against the client's cwd, and the
+        working directory belongs to the whole process, so commands run one
+        at a time under command_lock. That lock is not reentrant: a command
+        must never call handle() itself. Each command's output is captured
+        through thread_output(), so writes from other threads are left alone.
+        """
+        import io
+        import traceback
+
+        if request.get("protocol") != SERVER_PROTOCOL:
+            return {"error": "atlas serve speaks another protocol version."}
+        if request.get("stop"):
+            self.stopping = True
+            return {"code": 0, "stdout": f"[OK] Stopped atlas serve for {ATLAS_ROOT}\n"}
+        if request.get("source") != self.source:
+            return {"error": "atlas.py changed since atlas serve started; restart it."}
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with self.command_lock:
+            self.apply_events()
+            _GIT_HEADS.clear()  # HEAD may have moved since the last request.
+            cwd = os.getcwd()
+            try:
+                os.chdir(request["cwd"])
+                with thread_output(stdout, stderr):
+                    code = run_cli(request["argv"], self.parser)
+            except SystemExit as exc:
+                if isinstance(exc.code, str):
+                    stderr.write(exc.code + "\n")
+                    code = 1
+                else:
+                    code = exc.code or 0
+            except Exception:
+                traceback.print_exc(file=stderr)
+                code = 1
+            finally:
+                os.chdir(cwd)
+        return {"code": code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+    def serve_connection(self, conn) -> None:
+        try:
+            with conn.makefile("rb") as reader:
+                request = json.loads(reader.readline())
+            reply = self.handle(request)
+            conn.sendall(json.dumps(reply, ensure_ascii=False).encode("utf-8") + b"\n")
+        except (OSError, ValueError):
+            pass  # The client went away or sent garbage; nothing to answer.
+
+
+def server_running() -> bool:
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(SERVER_SOCKET_PATH))
+        except OSError:
+            return False
+    return True
+
+
+def stop_server() -> int:
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(SERVER_SOCKET_PATH))
+            sock.sendall(json.dumps({"protocol": SERVER_PROTOCOL, "stop": True}).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reader:
+                reply = json.loads(reader.readline())
+        except (OSError, ValueError):
+            print(f"[INFO] atlas serve is not running for {ATLAS_ROOT}")
+            return 1
+    print(reply.get("stdout", "").rstrip())
+    return 0
+
+
+def workspace_watcher() -> Optional[InotifyWatcher]:
+    """An inotify watcher on .atlas/ for a long-lived process, or None where there is none."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return InotifyWatcher(ATLAS_ROOT)
+    except (OSError, AttributeError) as exc:
+        print(f"[WARN] inotify unavailable ({exc}); documents are re-checked on every request.", file=sys.stderr)
+        return None
+
+
+def serve_command(args: argparse.Namespace) -> int:
+    global _SERVER
+    import select
+    import signal
+    import socket
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("[ERR] atlas serve needs Unix domain sockets, which this platform does not have.")
+        return 1
+    if args.stop:
+        return stop_server()
+
+    ensure_dir(STATE_DIR)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Checking for a live server and replacing a stale socket must not race another `serve`.
+    with file_lock(SERVER_LOCK_PATH):
+        if server_running():
+            listener.close()
+            print(f"[ERR] atlas serve is already running: {SERVER_SOCKET_PATH}")
+            return 1
+        try:
+            SERVER_SOCKET_PATH.unlink(missing_ok=True)
+            listener.bind(str(SERVER_SOCKET_PATH))
+            listener.listen(16)
+        except OSError as exc:
+            listener.close()
+            print(f"[ERR] Cannot listen on {SERVER_SOCKET_PATH}: {exc}")
+            return 1
+    socket_stat = SERVER_SOCKET_PATH.stat()
+
+    watcher = workspace_watcher()
+    _SERVER = WorkspaceServer(watcher)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    mode = watcher.name if watcher is not None else "stat"
+    print(f"[INFO] Serving {ATLAS_ROOT} on {SERVER_SOCKET_PATH} ({mode}). Press Ctrl+C to stop.")
+    sys.stdout.flush()
+
+    try:
+        waiting = [listener] + ([watcher.fd] if watcher is not None else [])
+        while not _SERVER.stopping:
+            ready, _, _ = select.select(waiting, [], [])
+            if watcher is not None and watcher.fd in ready:
+                _SERVER.apply_events()
+            if listener in ready:
+                conn, _ = listener.accept()
+                with conn:
+                    _SERVER.serve_connection(conn)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        _SERVER = None
+        listener.close()
+        try:
+            # Leave a socket another server has since bound alone.
+            if SERVER_SOCKET_PATH.stat().st_ino == socket_stat.st_ino:
+                SERVER_SOCKET_PATH.unlink()
+        except OSError:
+            pass
+        if watcher is not None:
+            watcher.close()
+        save_doc_index()
+    print("[DONE] Server stopped.")
+    return 0
+
+
+def mcp_command(args: argparse.Namespace) -> int:
+    """Serve the workspace's tools over MCP (stdio, or HTTP) until the client disconnects."""
+    global _SERVER
+    import atlas_mcp
+
+    try:
+        server, http_options = atlas_mcp.new_server(args.host, args.port)
+    except ImportError:
+        print("[ERR] atlas mcp needs fastmcp or the MCP Python SDK: pip install mcp", file=sys.stderr)
+        return 1
+
+    watcher = workspace_watcher()
+    _SERVER = WorkspaceServer(watcher)
+    tools = atlas_mcp.AtlasTools(sys.modules[__name__], _SERVER)
+    try:
+        atlas_mcp.register_tools(server, tools)
+        transport = f"http://{args.host}:{args.port}" if args.http else "stdio"
+        print(f"[INFO] Serving MCP tools for {ATLAS_ROOT} ({transport}).", file=sys.stderr)
+        if args.http:
+            server.run(**http_options)
+        else:
+            server.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        tools.close()
+        _SERVER = None
+        if watcher is not None:
+            watcher.close()
+        save_doc_index()
+    return 0
 
 
 def parse_version(v: str) -> tuple[int, ...]:
@@ -1430,11 +4464,11 @@ def parse_version(v: str) -> tuple[int, ...]:
 
 def check_version_update() -> None:
     """Check if Atlas has been updated and print changelog."""
-    if not VERSION_PATH.exists():
+    try:
+        installed_ver_str = VERSION_PATH.read_text(encoding="utf-8").strip()
+    except OSError:
         return
-
-    installed_ver_str = VERSION_PATH.read_text(encoding="utf-8").strip()
-    if not installed_ver_str:
+    if not installed_ver_str or installed_ver_str == ATLAS_VERSION:
         return
 
     installed_ver = parse_version(installed_ver_str)
@@ -1468,22 +4502,37 @@ def check_version_update() -> None:
             print(f"[OK] Updated VERSION file to {ATLAS_VERSION}\n")
 
 
+class VersionAction(argparse.Action):
+    """--version that reads VERSION only when the flag is given."""
+
+    def __init__(self, option_strings: list[str], dest: str = argparse.SUPPRESS, **kwargs) -> None:
+        kwargs.setdefault("help", "show program's version number and exit")
+        super().__init__(option_strings, dest, nargs=0, default=argparse.SUPPRESS, **kwargs)
+
+    def __call__(self, parser, namespace, values, option_string=None) -> None:
+        print(f"Atlas {get_version()}")
+        parser.exit()
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="atlas")
-    parser.add_argument(
-        "--version", "-v",
-        action="version",
-        version=f"Atlas {get_version()}"
-    )
-    sub = parser.add_subparsers(dest="command", required=False)
+    parser.add_argument("--version", "-v", action=VersionAction)
+    sub = parser.add_subparsers(dest="command", required=False, prog=parser.prog)
 
     init = sub.add_parser("init")
     init.add_argument("--overwrite", action="store_true")
 
     capture = sub.add_parser("capture")
-    capture.add_argument("text")
+    capture.add_argument("text", nargs="?")
     capture.add_argument("--domain", default="GEN")
     capture.add_argument("--to", choices=["brief"])
+    capture.add_argument(
+        "--from-file", metavar="PATH", help="Capture every record of a JSONL/CSV file ('-' reads stdin)"
+    )
+    capture.add_argument(
+        "--format", choices=["jsonl", "csv"], help="Input format (default: from the file suffix, else jsonl)"
+    )
+    capture.add_argument("--batch-size", type=int, default=CAPTURE_BATCH_SIZE, help="Items written per group flush")
 
     intake = sub.add_parser("intake")
     intake.add_argument("text")
@@ -1491,21 +4540,56 @@ def build_parser() -> argparse.ArgumentParser:
     intake.add_argument("--to", choices=["brief"])
 
     run = sub.add_parser("run")
-    run.add_argument("req_id")
+    run.add_argument("req_ids", nargs="*", metavar="req_id")
     run.add_argument("--step", type=int)
+    run.add_argument("--from-file", metavar="PATH", help="Read more REQ IDs from a file ('-' for stdin)")
 
     plan = sub.add_parser("plan")
     plan.add_argument("brief_id")
     plan.add_argument("--step", type=int)
 
     finish = sub.add_parser("finish")
-    finish.add_argument("run_id")
+    finish.add_argument("run_ids", nargs="*", metavar="run_id")
+    finish.add_argument("--from-file", metavar="PATH", help="Read more RUN IDs from a file ('-' for stdin)")
     finish.add_argument("--git")
     finish.add_argument("--success", type=lambda v: v.lower() == "true", required=True)
 
     doctor = sub.add_parser("doctor")
     doctor.add_argument("--links", action="store_true")
     doctor.add_argument("--max-age-hours", type=int, default=24)
+    doctor.add_argument("--jobs", "-j", type=int, help="Worker processes (default: CPU count)")
+    doctor.add_argument(
+        "--changed",
+        nargs="?",
+        const="",
+        metavar="GIT_REF",
+        help="Re-validate only changed documents and their dependents (optionally vs a git ref)",
+    )
+    doctor.add_argument(
+        "--verify-git",
+        action="store_true",
+        help="Check that Implemented-Git/Git hashes exist in the repository (one git cat-file batch)",
+    )
+
+    watch = sub.add_parser("watch", help="Re-validate on every change under .atlas/")
+    watch.add_argument("--links", action="store_true")
+    watch.add_argument("--max-age-hours", type=int, default=24)
+    watch.add_argument("--jobs", "-j", type=int, help="Worker processes for the initial scan (default: CPU count)")
+    watch.add_argument(
+        "--debounce", type=int, default=WATCH_DEBOUNCE_MS, help="Quiet period in ms before re-validating"
+    )
+    watch.add_argument("--poll", action="store_true", help="Use stat polling instead of inotify")
+    watch.add_argument(
+        "--interval", type=float, default=WATCH_POLL_INTERVAL, help="Polling interval in seconds"
+    )
+
+    serve = sub.add_parser("serve", help="Keep this workspace loaded and answer CLI calls over a local socket")
+    serve.add_argument("--stop", action="store_true", help="Stop the running server")
+
+    mcp = sub.add_parser("mcp", help="Serve this workspace's tools to MCP clients (stdio by default)")
+    mcp.add_argument("--http", action="store_true", help="Serve over HTTP instead of stdio")
+    mcp.add_argument("--host", default="127.0.0.1", help="HTTP host")
+    mcp.add_argument("--port", type=int, default=8765, help="HTTP port")
 
     sync = sub.add_parser("sync", help="Sync RUN status to BRIEF/REQ documents")
     sync.add_argument("run_id", help="RUN document ID")
@@ -1516,21 +4600,7 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def main(argv: Optional[list[str]] = None) -> int:
-    parser = build_parser()
-    args = parser.parse_args(argv)
-
-    if not args.command:
-        parser.print_help()
-        return 0
-
-    if args.command != "init" and not ATLAS_ROOT.exists():
-        print("[INFO] .atlas not found. Initializing...")
-        init_command(args)
-
-    if args.command != "init":
-        check_version_update()
-
+def dispatch_command(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
     if args.command == "init":
         return init_command(args)
     if args.command == "capture":
@@ -1546,12 +4616,63 @@ def main(argv: Optional[list[str]] = None) -> int:
         return finish_command(args)
     if args.command == "doctor":
         return doctor_command(args)
+    if args.command == "watch":
+        return watch_command(args)
     if args.command == "sync":
         return sync_command(args)
+    if args.command == "serve":
+        return serve_command(args)
+    if args.command == "mcp":
+        return mcp_command(args)
 
     parser.print_help()
     return 1
 
 
+def main(argv: Optional[list[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    forwarded = forward_to_server(argv)
+    if forwarded is not None:
+        return forwarded
+    return run_cli(argv)
+
+
+def prepare_workspace(args: argparse.Namespace) -> None:
+    """Create .atlas/ if missing, report upgrades and finish interrupted writes."""
+    if args.command != "init" and not ATLAS_ROOT.exists():
+        print("[INFO] .atlas not found. Initializing...")
+        init_command(args)
+
+    if args.command != "init":
+        check_version_update()
+        recover_journal()
+
+
+def run_cli(argv: list[str], parser: Optional[argparse.ArgumentParser] = None) -> int:
+    """Parse argv and run the command in this process."""
+    parser = parser or build_parser()
+    args = parser.parse_args(argv)
+
+    if not args.command:
+        parser.print_help()
+        return 0
+
+    if args.command == "mcp":
+        # stdout carries the MCP session; start-up notices go to stderr.
+        from contextlib import redirect_stdout
+
+        with redirect_stdout(sys.stderr):
+            prepare_workspace(args)
+    else:
+        prepare_workspace(args)
+
+    try:
+        return dispatch_command(parser, args)
+    finally:
+        # A server keeps the index in memory and saves it when it stops.
+        if _SERVER is None:
+            save_doc_index()
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
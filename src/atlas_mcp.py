@@ -0,0 +1,427 @@
+"""MCP tools for an Atlas workspace, served by `atlas mcp`.
+
+capture, run, plan, finish and sync change the workspace exactly as the CLI
+commands do; doctor, req_status, run_report and list_documents answer with
+structured data. The server process keeps the workspace loaded for the
+whole session: the parsed document index and doctor's per-document results
+stay in memory and are refreshed from filesystem events (inotify on Linux,
+a stat per document elsewhere), so tool calls do not re-scan .atlas/.
+
+Tools are coroutines that run their work on thread pools. Lookups and
+doctor read an immutable snapshot of the index and run side by side, each
+on a pool of its own; writes queue on one writer lock per workspace and
+run on a dedicated thread. A slow doctor therefore never delays a lookup
+or a write, from the same client or another one.
+
+Needs fastmcp or the MCP Python SDK (`pip install mcp`); the CLI does not.
+"""
+import asyncio
+import os
+import sys
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+SERVER_NAME = "atlas"
+
+# Tools registered on the server, in the order clients list them.
+TOOLS = (
+    "capture",
+    "run",
+    "plan",
+    "finish",
+    "sync",
+    "doctor",
+    "req_status",
+    "run_report",
+    "list_documents",
+)
+
+# Threads answering lookups, and threads running doctor; writes get a thread of their own.
+LOOKUP_THREADS = 4
+DOCTOR_THREADS = 2
+
+
+def new_server(host: str, port: int) -> tuple[Any, dict]:
+    """Return an MCP server and the run() arguments that serve it over HTTP.
+
+    fastmcp is preferred, then the MCP SDK's own server (MCPServer in 2.x,
+    FastMCP in 1.x, which takes host and port up front).
+
+    Raises:
+        ImportError: If none of them is installed.
+    """
+    try:
+        from fastmcp import FastMCP
+    except ImportError:
+        pass
+    else:
+        return FastMCP(SERVER_NAME), {"transport": "http", "host": host, "port": port}
+    try:
+        from mcp.server.mcpserver import MCPServer
+    except ImportError:
+        from mcp.server.fastmcp import FastMCP
+
+        return FastMCP(SERVER_NAME, host=host, port=port), {"transport": "streamable-http"}
+    return MCPServer(SERVER_NAME), {"transport": "streamable-http", "host": host, "port": port}
+
+
+def register_tools(server: Any, tools: "AtlasTools") -> None:
+    for name in TOOLS:
+        server.tool()(getattr(tools, name))
+
+
+class Snapshot:
+    """The document index at one generation; never changed once published.
+
+    entries is a shallow copy of DocIndex.entries: the index replaces a
+    record when its document changes instead of editing it, so the copy
+    stays consistent while the index moves on. listing, runs_by_req and
+    records are derived from it on first use (see AtlasTools.listing,
+    runs_of and records); threads racing to fill one in compute the same
+    value.
+    """
+
+    def __init__(self, generation: int, entries: dict[str, dict]):
+        self.generation = generation
+        self.entries = entries
+        self.listing: Optional[list[tuple[str, str]]] = None
+        self.runs_by_req: Optional[dict[str, list[str]]] = None
+        self.records: dict[str, list[tuple[Path, dict]]] = {}
+
+
+class AtlasTools:
+    """The MCP tools, bound to one loaded workspace.
+
+    cli is the Atlas CLI module and workspace its WorkspaceServer.
+
+    Lookups (req_status, run_report, list_documents) and doctor read the
+    last published Snapshot. Before reading they fold pending filesystem
+    events into the index if it is free; while a write holds it, they
+    answer from the snapshot as it stands instead of waiting. doctor
+    validates the snapshot's records and works on its own copy of the
+    per-document results, publishing it back when done.
+
+    Writes (capture, run, plan, finish, sync) take the writer lock and go
+    through WorkspaceServer.handle() like forwarded CLI calls, so they share
+    the CLI's document locks and journal. They publish a new snapshot
+    before returning, so a client always reads its own writes.
+    """
+
+    def __init__(self, cli: Any, workspace: Any):
+        self.cli = cli
+        self.workspace = workspace
+        self.doc_dirs = [cli.REQ_DIR, cli.RULE_DIR, cli.ADR_DIR, cli.CQ_DIR, cli.BRIEF_DIR, cli.RUN_DIR]
+        # Index keys are relative to .atlas/; tools report paths relative to the repository.
+        self.atlas_prefix = cli.ATLAS_ROOT.relative_to(cli.REPO_ROOT).as_posix() + "/"
+        self.folders = tuple(workspace.index.key(folder) + "/" for folder in self.doc_dirs)
+        self.run_folder = workspace.index.key(cli.RUN_DIR) + "/"
+        # IDs outlive snapshots, so their sort keys are worth keeping.
+        self.sort_key = lru_cache(maxsize=None)(cli.id_sort_key)
+        # Separate pools, so a queue of doctor calls never holds up a lookup or a write.
+        self.lookups = ThreadPoolExecutor(LOOKUP_THREADS, thread_name_prefix="atlas-mcp-lookup")
+        self.doctors = ThreadPoolExecutor(DOCTOR_THREADS, thread_name_prefix="atlas-mcp-doctor")
+        self.writes = ThreadPoolExecutor(1, thread_name_prefix="atlas-mcp-write")
+        self.writer = asyncio.Lock()
+        # Held by the one thread using the document index at a time.
+        self.index_lock = threading.Lock()
+        # Guards WorkspaceServer.doctor_caches, which doctor runs copy and replace.
+        self.cache_lock = threading.Lock()
+        self.snapshot = Snapshot(-1, {})
+        with self.index_lock:
+            self.refresh()
+
+    def close(self) -> None:
+        for pool in (self.lookups, self.doctors, self.writes):
+            pool.shutdown()
+
+    # -------------------------------------------------------------------------
+    # Scheduling
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    async def in_pool(pool: ThreadPoolExecutor, func: Callable, *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+
+    async def exclusive(self, func: Callable, *args: Any) -> Any:
+        """Run func(*args) on the write thread under the writer lock, then publish a snapshot."""
+        async with self.writer:
+            return await self.in_pool(self.writes, self.with_index, func, *args)
+
+    async def lookup(self, func: Callable, *args: Any) -> Any:
+        """Run func(snapshot, *args) on the lookup pool against the freshest snapshot at hand."""
+        return await self.in_pool(self.lookups, lambda: func(self.current(), *args))
+
+    async def checked(self, func: Callable, *args: Any) -> Any:
+        """Like lookup(), but on the doctor pool."""
+        return await self.in_pool(self.doctors, lambda: func(self.current(), *args))
+
+    def with_index(self, func: Callable, *args: Any) -> Any:
+        with self.index_lock:
+            try:
+                return func(*args)
+            finally:
+                self.refresh()
+
+    def current(self) -> Snapshot:
+        """Refresh the snapshot unless the index is busy, and return it."""
+        if self.index_lock.acquire(blocking=False):
+            try:
+                self.refresh()
+            finally:
+                self.index_lock.release()
+        return self.snapshot
+
+    def refresh(self) -> None:
+        """Fold pending changes into the index and publish it if it moved on. Needs index_lock."""
+        if self.workspace.watcher is not None:
+            self.workspace.apply_events()
+        else:
+            self.workspace.index.scan(self.doc_dirs + [self.cli.VIEWS_DIR])
+        index = self.workspace.index
+        if index.generation != self.snapshot.generation:
+            self.snapshot = Snapshot(index.generation, dict(index.entries))
+
+    def key(self, folder: Path, doc_id: str) -> str:
+        return self.workspace.index.key(folder / f"{doc_id}.md")
+
+    @staticmethod
+    def doc_id(key: str) -> str:
+        return key.rsplit("/", 1)[-1][: -len(".md")]
+
+    def listing(self, snapshot: Snapshot) -> list[tuple[str, str]]:
+        """(ID, key) of each REQ, RULE, ADR, CQ, BRIEF and RUN document, in ID order."""
+        if snapshot.listing is None:
+            listing = [(self.doc_id(key), key) for key in snapshot.entries if key.startswith(self.folders)]
+            listing.sort(key=lambda item: self.sort_key(item[0]))
+            snapshot.listing = listing
+        return snapshot.listing
+
+    def records(self, snapshot: Snapshot, folders: list[Path]) -> list[tuple[Path, dict]]:
+        """(path, record) of every document under folders, in the order DocIndex.records() gives."""
+        records = []
+        for folder in folders:
+            prefix = self.workspace.index.key(folder) + "/"
+            ordered = snapshot.records.get(prefix)
+            if ordered is None:
+                keys = sorted((key for key in snapshot.entries if key.startswith(prefix)), key=self.sort_key)
+                root = self.cli.ATLAS_ROOT
+                ordered = snapshot.records[prefix] = [(root / key, snapshot.entries[key]) for key in keys]
+            records.extend(ordered)
+        return records
+
+    def runs_of(self, snapshot: Snapshot, req_id: str) -> list[str]:
+        """Keys of the RUN documents of req_id, in step order."""
+        if snapshot.runs_by_req is None:
+            runs_by_req: dict[str, list[str]] = {}
+            for doc_id, key in self.listing(snapshot):
+                if key.startswith(self.run_folder):
+                    run_req = self.cli.req_id_from_run_id(doc_id)
+                    if run_req:
+                        runs_by_req.setdefault(run_req, []).append(key)
+            snapshot.runs_by_req = runs_by_req
+        return snapshot.runs_by_req.get(req_id, [])
+
+    # -------------------------------------------------------------------------
+    # Work done on the pool
+    # -------------------------------------------------------------------------
+
+    def command(self, argv: list[str]) -> dict:
+        """Run one CLI command and return its exit status and output lines."""
+        request = {
+            "protocol": self.cli.SERVER_PROTOCOL,
+            "source": self.workspace.source,
+            "cwd": os.getcwd(),
+            "argv": argv,
+        }
+        reply = self.workspace.handle(request)
+        if "error" in reply:
+            return {"ok": False, "code": 1, "output": [], "errors": [reply["error"]]}
+        return {
+            "ok": reply["code"] == 0,
+            "code": reply["code"],
+            "output": reply["stdout"].splitlines(),
+            "errors": reply["stderr"].splitlines(),
+        }
+
+    def validate(
+        self, snapshot: Snapshot, checks: frozenset, max_age_hours: int, changed: Optional[str], limit: int
+    ) -> dict:
+        """Run doctor's checks over snapshot; other threads keep using the index meanwhile."""
+        cli = self.cli
+        cli._GIT_HEADS.clear()  # HEAD may have moved since the last call.
+        docs = self.records(snapshot, self.doc_dirs)
+        views = self.records(snapshot, [cli.VIEWS_DIR]) if checks & {"views", "coverage"} else []
+        plan = cli.load_schema_plan()
+        cache_key = ("links" in checks, plan.digest)
+        with self.cache_lock:
+            cache = dict(self.workspace.doctor_caches.get(cache_key, {}))
+        # Nothing here should print, but stdout carries the stdio session.
+        with cli.thread_output(sys.stderr, sys.stderr):
+            # One job: forking a process pool from this multithreaded process is unsafe.
+            issues = list(cli.run_checks(docs, views, checks, 1, max_age_hours, changed, cache, plan))
+        with self.cache_lock:
+            self.workspace.doctor_caches[cache_key] = cache
+        counted = sum(1 for issue in issues if issue.counted)
+        return {
+            "ok": counted == 0,
+            "counted": counted,
+            "total": len(issues),
+            "issues": [issue.to_dict() for issue in issues[: max(0, limit)]],
+        }
+
+    def document(self, key: str, record: dict) -> dict:
+        checked, total = record["checkboxes"]
+        return {
+            "id": self.doc_id(key),
+            "path": self.atlas_prefix + key,
+            "meta": record["meta"],
+            "sections": record["sections"],
+            "links": record["links"],
+            "req_refs": record["req_refs"],
+            "checkboxes": {"checked": checked, "total": total},
+        }
+
+    def req_report(self, snapshot: Snapshot, req_id: str) -> dict:
+        cli = self.cli
+        key = self.key(cli.REQ_DIR, req_id)
+        record = snapshot.entries.get(key)
+        if record is None:
+            return {"id": req_id, "found": False}
+        view = snapshot.entries.get(self.key(cli.VIEWS_DIR, req_id))
+        runs = [
+            {"id": self.doc_id(k), "status": snapshot.entries[k]["meta"].get("Status")}
+            for k in self.runs_of(snapshot, req_id)
+        ]
+        return {**self.document(key, record), "found": True, "view": view.get("view") if view else None, "runs": runs}
+
+    def run_summary(self, snapshot: Snapshot, run_id: str) -> dict:
+        cli = self.cli
+        key = self.key(cli.RUN_DIR, run_id)
+        record = snapshot.entries.get(key)
+        if record is None:
+            return {"id": run_id, "found": False}
+        meta = record["meta"]
+        linked = {}
+        for kind, doc_id, folder in (
+            ("REQ", meta.get("REQ") or cli.req_id_from_run_id(run_id), cli.REQ_DIR),
+            ("BRIEF", meta.get("Brief"), cli.BRIEF_DIR),
+        ):
+            if doc_id and self.key(folder, doc_id) in snapshot.entries:
+                linked[kind] = self.atlas_prefix + self.key(folder, doc_id)
+        return {**self.document(key, record), "found": True, "linked": linked}
+
+    def matching(self, snapshot: Snapshot, prefix: str, status: str, limit: int) -> dict:
+        entries = snapshot.entries
+        status = status.lower()
+        matches = [
+            (doc_id, key)
+            for doc_id, key in self.listing(snapshot)
+            if doc_id.startswith(prefix)
+            and (not status or entries[key]["meta"].get("Status", "").lower() == status)
+        ]
+        documents = [
+            {"id": doc_id, "path": self.atlas_prefix + key, "status": entries[key]["meta"].get("Status")}
+            for doc_id, key in matches[: max(0, limit)]
+        ]
+        return {"total": len(matches), "documents": documents}
+
+    # -------------------------------------------------------------------------
+    # Tools that change the workspace
+    # -------------------------------------------------------------------------
+
+    async def capture(self, text: str, domain: str = "GEN", to_brief: bool = False) -> dict:
+        """Capture a request: create or update its REQ and view, optionally with a BRIEF.
+
+        Args:
+            text: The request; REQ IDs mentioned in it are updated instead of creating a new REQ.
+            domain: Domain for new documents (e.g. "AUTH").
+            to_brief: Also create a BRIEF draft from the text.
+        """
+        argv = ["capture", "--domain", domain] + (["--to", "brief"] if to_brief else [])
+        return await self.exclusive(self.command, argv + ["--", text])
+
+    async def run(self, req_ids: list[str], step: Optional[int] = None) -> dict:
+        """Start a RUN document for each REQ (the next step, or the given one)."""
+        argv = ["run"] + (["--step", str(step)] if step is not None else [])
+        return await self.exclusive(self.command, argv + ["--", *req_ids])
+
+    async def plan(self, brief_id: str, step: Optional[int] = None) -> dict:
+        """Start a RUN document for a BRIEF."""
+        argv = ["plan"] + (["--step", str(step)] if step is not None else [])
+        return await self.exclusive(self.command, argv + ["--", brief_id])
+
+    async def finish(self, run_ids: list[str], success: bool = True, git: Optional[str] = None) -> dict:
+        """Close RUNs and record the outcome on their REQ/BRIEF.
+
+        Args:
+            run_ids: RUN IDs to finish.
+            success: Whether the work succeeded.
+            git: Commit hash implementing the change (default: the repository's HEAD).
+        """
+        argv = ["finish", "--success", "true" if success else "false"] + (["--git", git] if git else [])
+        return await self.exclusive(self.command, argv + ["--", *run_ids])
+
+    async def sync(
+        self,
+        run_id: str,
+        apply_brief: bool = False,
+        write_req_patch: bool = False,
+        apply_req: bool = False,
+    ) -> dict:
+        """Show (and optionally apply) what a RUN changes in its BRIEF and REQ."""
+        argv = ["sync"]
+        if apply_brief:
+            argv.append("--apply-brief")
+        if write_req_patch:
+            argv.append("--write-req-patch")
+        if apply_req:
+            argv.append("--apply-req")
+        return await self.exclusive(self.command, argv + ["--", run_id])
+
+    # -------------------------------------------------------------------------
+    # Tools that read it
+    # -------------------------------------------------------------------------
+
+    async def doctor(
+        self,
+        links: bool = False,
+        verify_git: bool = False,
+        changed: Optional[str] = None,
+        max_age_hours: int = 24,
+        limit: int = 500,
+    ) -> dict:
+        """Validate the workspace and return the issues found (at most limit of them, with the total).
+
+        Only documents changed since the previous call (and their dependents)
+        are re-checked; the rest reuse results held in memory.
+
+        Args:
+            links: Also check that Markdown links resolve.
+            verify_git: Also check that recorded commit hashes exist.
+            changed: Re-check only documents changed since this git ref ("" for the last call).
+            max_age_hours: Age after which an executing RUN is reported as unfinished.
+            limit: Most issues to return; "total" and "counted" cover all of them.
+        """
+        cli = self.cli
+        checks = cli.DEFAULT_CHECKS | {"links"} if links else cli.DEFAULT_CHECKS
+        if verify_git:
+            checks |= {"git"}
+        return await self.checked(self.validate, checks, max_age_hours, changed, limit)
+
+    async def req_status(self, req_id: str) -> dict:
+        """A REQ's header fields, sections and progress, with its view and RUNs."""
+        return await self.lookup(self.req_report, req_id)
+
+    async def run_report(self, run_id: str) -> dict:
+        """A RUN's header fields and checklist progress, with the BRIEF/REQ it belongs to."""
+        return await self.lookup(self.run_summary, run_id)
+
+    async def list_documents(self, prefix: str = "", status: str = "", limit: int = 200) -> dict:
+        """List documents whose ID starts with prefix (e.g. "REQ-AUTH") and, if given, with this Status.
+
+        Returns at most limit documents, in ID order, and the total that matched.
+        """
+        return await self.lookup(self.matching, prefix, status, limit)
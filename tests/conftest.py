@@ -0,0 +1,92 @@
+"""Shared fixtures: the CLI module in-process, and atlas.py in a fresh workspace.
+
+    python -m pytest tests
+"""
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+ATLAS = REPO_ROOT / "atlas.py"
+
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+import atlas_cli  # noqa: E402
+
+
+@pytest.fixture
+def cli():
+    """The atlas_cli module, pointed back at its own checkout afterwards."""
+    previous = atlas_cli.REPO_ROOT
+    yield atlas_cli
+    atlas_cli.set_workspace(previous)
+
+
+@pytest.fixture
+def workspace(tmp_path: Path, cli) -> Path:
+    """An initialised workspace holding a copy of atlas.py; atlas_cli points at it."""
+    shutil.copy(ATLAS, tmp_path / "atlas.py")
+    subprocess.run([sys.executable, "atlas.py", "init"], cwd=tmp_path, capture_output=True, check=True)
+    cli.set_workspace(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def atlas(workspace: Path) -> Callable[..., subprocess.CompletedProcess]:
+    """Run atlas.py in the workspace (never through a server): atlas("doctor", "--links")."""
+
+    def run(*args: str, stdin: str = "") -> subprocess.CompletedProcess:
+        return subprocess.run(
+            [sys.executable, "atlas.py", *args],
+            cwd=workspace,
+            input=stdin,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            env={**os.environ, "ATLAS_NO_SERVER": "1"},
+        )
+
+    return run
+
+
+def write_doc(path: Path, text: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+REQ_TEMPLATE = """# [{req_id}] {title}
+
+> **ID**: {req_id}
+> **Domain**: {domain}
+> **Status**: Draft
+> **Last Updated**: 2026-01-01
+> **Implemented-Git**: -
+> **Linked-RUN**: -
+> **Must-Read**: None
+
+---
+
+## Decision
+- {title}
+
+## Input
+- Credentials
+
+## Output
+- A session
+
+## Acceptance Criteria
+- [ ] It works.
+
+## References
+{references}"""
+
+
+def req_text(req_id: str, title: str = "Login", references: str = "- None\n") -> str:
+    return REQ_TEMPLATE.format(req_id=req_id, title=title, domain=req_id.split("-")[1], references=references)
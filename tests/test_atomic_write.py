@@ -0,0 +1,131 @@
+"""Atomic and grouped writes: old or new content, never a torn file or a stray temp."""
+import errno
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+def temp_files(directory) -> list[str]:
+    return sorted(name for name in os.listdir(directory) if name.endswith(".tmp"))
+
+
+def test_atomic_write_replaces_content_and_keeps_mode(tmp_path, cli) -> None:
+    path = tmp_path / "doc.md"
+    path.write_text("old", encoding="utf-8")
+    path.chmod(0o640)
+    cli.atomic_write(path, "new")
+    assert path.read_text(encoding="utf-8") == "new"
+    assert path.stat().st_mode & 0o777 == 0o640
+    assert temp_files(tmp_path) == []
+
+
+def test_atomic_write_failure_keeps_old_content(tmp_path, cli, monkeypatch) -> None:
+    path = tmp_path / "doc.md"
+    path.write_text("old", encoding="utf-8")
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(cli.os, "replace", fail)
+    with pytest.raises(OSError):
+        cli.atomic_write(path, "new")
+    assert path.read_text(encoding="utf-8") == "old"
+    assert temp_files(tmp_path) == []
+
+
+def test_write_files_writes_every_file_and_fsyncs_each_once(tmp_path, cli, monkeypatch) -> None:
+    synced = []
+    fsync = os.fsync
+    monkeypatch.setattr(cli.os, "fsync", lambda fd: synced.append(fd) or fsync(fd))
+    (tmp_path / "sub").mkdir()
+    files = [(tmp_path / "a.md", "A"), (tmp_path / "b.md", "B"), (tmp_path / "sub" / "c.md", "C")]
+    cli.write_files(files)
+    for path, content in files:
+        assert path.read_text(encoding="utf-8") == content
+    # One fsync per file, then one per touched directory; never a global sync.
+    assert len(synced) == 3 + 2
+    assert temp_files(tmp_path) == [] and temp_files(tmp_path / "sub") == []
+
+
+def test_write_files_failure_leaves_no_temp_files(tmp_path, cli, monkeypatch) -> None:
+    (tmp_path / "a.md").write_text("old", encoding="utf-8")
+    replaced = []
+    real_replace = os.replace
+
+    def replace_once(src, dst):
+        if replaced:
+            raise OSError("gone")
+        replaced.append(dst)
+        real_replace(src, dst)
+
+    monkeypatch.setattr(cli.os, "replace", replace_once)
+    with pytest.raises(OSError):
+        cli.write_files([(tmp_path / "a.md", "new"), (tmp_path / "b.md", "B")])
+    assert temp_files(tmp_path) == []
+    assert not (tmp_path / "b.md").exists()
+
+
+def test_file_lock_is_exclusive_across_processes(tmp_path, cli) -> None:
+    lock = tmp_path / "x.lock"
+    probe = (
+        "import fcntl, sys\n"
+        "f = open(sys.argv[1], 'a+b')\n"
+        "try:\n"
+        "    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)\n"
+        "except OSError:\n"
+        "    sys.exit(3)\n"
+    )
+    if os.name == "nt":
+        pytest.skip("flock probe is POSIX-only")
+    with cli.file_lock(lock):
+        held = subprocess.run([sys.executable, "-c", probe, str(lock)]).returncode
+    free = subprocess.run([sys.executable, "-c", probe, str(lock)]).returncode
+    assert (held, free) == (3, 0)
+
+
+class FakeMsvcrt:
+    """msvcrt.locking stand-in that fails with the given errnos before succeeding."""
+
+    LK_LOCK = 1
+    LK_UNLCK = 0
+
+    def __init__(self, *errnos: int):
+        self.errnos = list(errnos)
+        self.calls = 0
+
+    def locking(self, fd: int, mode: int, nbytes: int) -> None:
+        if mode == self.LK_LOCK:
+            self.calls += 1
+            if self.errnos:
+                err = self.errnos.pop(0)
+                raise OSError(err, os.strerror(err))
+
+
+def windows_lock(cli, monkeypatch, fake: FakeMsvcrt, path) -> None:
+    monkeypatch.setitem(sys.modules, "msvcrt", fake)
+    monkeypatch.setattr(cli.os, "name", "nt")
+    with cli.file_lock(path):
+        pass
+
+
+def test_windows_lock_keeps_waiting_while_contended(tmp_path, cli, monkeypatch) -> None:
+    fake = FakeMsvcrt(errno.EDEADLOCK, errno.EACCES)
+    windows_lock(cli, monkeypatch, fake, tmp_path / "x.lock")
+    assert fake.calls == 3
+
+
+def test_windows_lock_raises_other_errors(tmp_path, cli, monkeypatch) -> None:
+    fake = FakeMsvcrt(errno.EBADF)
+    with pytest.raises(OSError):
+        windows_lock(cli, monkeypatch, fake, tmp_path / "x.lock")
+    assert fake.calls == 1
+
+
+def test_windows_lock_gives_up_after_the_timeout(tmp_path, cli, monkeypatch) -> None:
+    monkeypatch.setattr(cli, "FILE_LOCK_TIMEOUT", 0)
+    fake = FakeMsvcrt(*[errno.EDEADLOCK] * 5)
+    with pytest.raises(OSError):
+        windows_lock(cli, monkeypatch, fake, tmp_path / "x.lock")
+    assert fake.calls == 1
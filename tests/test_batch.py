@@ -0,0 +1,95 @@
+"""Batch run/finish: many IDs per invocation, one summary row each."""
+import json
+
+from conftest import req_text, write_doc
+
+HASH = "0123456789abcdef0123456789abcdef01234567"
+
+
+def add_reqs(workspace, *req_ids: str) -> None:
+    for req_id in req_ids:
+        write_doc(workspace / ".atlas" / "req" / f"{req_id}.md", req_text(req_id))
+
+
+def summary(stdout: str) -> dict[str, list[str]]:
+    """Table rows keyed by their first column."""
+    rows: dict[str, list[str]] = {}
+    for line in stdout.splitlines():
+        cells = line.split(None, 2)
+        if cells and cells[0].startswith(("REQ-", "RUN-", "nope")):
+            rows.setdefault(cells[0], []).append(line)
+    return rows
+
+
+def test_run_batch_creates_every_run(workspace, cli, atlas) -> None:
+    add_reqs(workspace, "REQ-GEN-001", "REQ-GEN-002")
+    result = atlas("run", "REQ-GEN-001", "REQ-GEN-002")
+    assert result.returncode == 0, result.stdout
+    assert "[DONE] 2 of 2 succeeded." in result.stdout
+    for req_id in ("REQ-GEN-001", "REQ-GEN-002"):
+        assert (workspace / ".atlas" / "runs" / f"RUN-{req_id}-step-01.md").exists()
+    last = json.loads(cli.LAST_RUN_PATH.read_text(encoding="utf-8"))
+    assert last["run_id"] == "RUN-REQ-GEN-002-step-01"
+
+
+def test_run_batch_partial_failure_exits_1_and_reports_each_id(workspace, atlas) -> None:
+    add_reqs(workspace, "REQ-GEN-001")
+    result = atlas("run", "REQ-GEN-001", "REQ-GEN-404", "nope", stdin="")
+    assert result.returncode == 1
+    rows = summary(result.stdout)
+    assert "created" in rows["REQ-GEN-001"][0]
+    assert "REQ not found" in rows["REQ-GEN-404"][0]
+    assert "Invalid REQ ID: nope" in rows["nope"][0]
+    assert "[DONE] 1 of 3 succeeded." in result.stdout
+    assert (workspace / ".atlas" / "runs" / "RUN-REQ-GEN-001-step-01.md").exists()
+
+
+def test_run_batch_repeated_req_gets_consecutive_steps(workspace, atlas) -> None:
+    add_reqs(workspace, "REQ-GEN-001")
+    (workspace / "ids.txt").write_text("REQ-GEN-001  # again\nREQ-GEN-001, REQ-GEN-001\n", encoding="utf-8")
+    result = atlas("run", "REQ-GEN-001", "--from-file", "ids.txt")
+    assert result.returncode == 0, result.stdout
+    steps = sorted(path.name for path in (workspace / ".atlas" / "runs").glob("RUN-REQ-GEN-001-step-*.md"))
+    assert steps == [f"RUN-REQ-GEN-001-step-0{n}.md" for n in range(1, 5)]
+
+
+def test_run_batch_rejects_step(workspace, atlas) -> None:
+    add_reqs(workspace, "REQ-GEN-001", "REQ-GEN-002")
+    result = atlas("run", "REQ-GEN-001", "REQ-GEN-002", "--step", "3")
+    assert result.returncode == 1
+    assert "[ERR] --step needs exactly one REQ ID." in result.stdout
+
+
+def test_finish_batch_updates_every_run_and_req(workspace, atlas) -> None:
+    add_reqs(workspace, "REQ-GEN-001", "REQ-GEN-002")
+    assert atlas("run", "REQ-GEN-001", "REQ-GEN-002").returncode == 0
+    result = atlas("finish", "RUN-REQ-GEN-001-step-01", "RUN-REQ-GEN-002-step-01", "--git", HASH, "--success", "true")
+    assert result.returncode == 0, result.stdout
+    assert "[DONE] 2 of 2 succeeded." in result.stdout
+    for req_id in ("REQ-GEN-001", "REQ-GEN-002"):
+        run = (workspace / ".atlas" / "runs" / f"RUN-{req_id}-step-01.md").read_text(encoding="utf-8")
+        assert "> **Status**: Completed" in run and f"> **Git**: {HASH}" in run
+        req = (workspace / ".atlas" / "req" / f"{req_id}.md").read_text(encoding="utf-8")
+        assert f"> **Implemented-Git**: {HASH}" in req
+        assert f"> **Linked-RUN**: RUN-{req_id}-step-01" in req
+
+
+def test_finish_batch_partial_failure_and_duplicates(workspace, atlas) -> None:
+    add_reqs(workspace, "REQ-GEN-001")
+    assert atlas("run", "REQ-GEN-001").returncode == 0
+    run_id = "RUN-REQ-GEN-001-step-01"
+    result = atlas("finish", run_id, run_id, "RUN-REQ-GEN-001-step-09", "--git", HASH, "--success", "false")
+    assert result.returncode == 1
+    rows = summary(result.stdout)
+    assert "Failed" in rows[run_id][0]
+    assert "Duplicate RUN ID" in rows[run_id][1]
+    assert "RUN not found" in rows["RUN-REQ-GEN-001-step-09"][0]
+    assert "[DONE] 1 of 3 succeeded." in result.stdout
+    run = (workspace / ".atlas" / "runs" / f"{run_id}.md").read_text(encoding="utf-8")
+    assert "> **Status**: Failed" in run
+
+
+def test_finish_single_unknown_run_fails(workspace, atlas) -> None:
+    result = atlas("finish", "RUN-REQ-GEN-001-step-01", "--git", HASH, "--success", "true")
+    assert result.returncode == 1
+    assert "[ERR] RUN not found" in result.stdout
@@ -0,0 +1,64 @@
+"""capture --from-file: bulk intake from JSONL/CSV files and stdin."""
+import json
+
+from conftest import req_text, write_doc
+
+
+def jsonl(*records) -> str:
+    return "".join((record if isinstance(record, str) else json.dumps(record)) + "\n" for record in records)
+
+
+def test_mixed_batch_of_new_items_and_updates(workspace, atlas) -> None:
+    req_dir = workspace / ".atlas" / "req"
+    existing = write_doc(req_dir / "REQ-GEN-001.md", req_text("REQ-GEN-001"))
+    (workspace / "items.jsonl").write_text(
+        jsonl(
+            {"text": "Export reports as CSV"},
+            {"text": "REQ-GEN-001 must also lock the account"},
+            {"title": "Audit log", "body": "Keep 90 days", "domain": "sec"},
+        ),
+        encoding="utf-8",
+    )
+
+    result = atlas("capture", "--from-file", "items.jsonl", "--batch-size", "2")
+    assert result.returncode == 0, result.stdout
+    assert "[DONE] Captured 3 item(s) from items.jsonl." in result.stdout
+    assert "REQ-GEN-001 must also lock the account" in existing.read_text(encoding="utf-8")
+    assert (req_dir / "REQ-GEN-002.md").exists()
+    assert (req_dir / "REQ-SEC-001.md").exists()
+    assert (workspace / ".atlas" / "views" / "REQ-SEC-001.md").exists()
+
+
+def test_skipped_records_are_reported_and_fail_the_run(workspace, atlas) -> None:
+    stdin = jsonl(
+        {"text": "First"},
+        "{broken",
+        {"text": "   "},
+        {"text": "Bad domain", "domain": "no-such"},
+        [1, 2],
+        "\"Plain string item\"",
+    )
+    result = atlas("capture", "--from-file", "-", stdin=stdin)
+    assert result.returncode == 1
+    assert "[DONE] Captured 2 item(s) from -; skipped 4." in result.stdout
+    assert "[WARN] Skipping line 2: invalid JSON" in result.stdout
+    assert "[WARN] Skipping line 3: empty text" in result.stdout
+    assert "[WARN] Skipping line 4: invalid domain 'NO-SUCH'" in result.stdout
+    assert "[WARN] Skipping line 5: expected an object or a string" in result.stdout
+
+
+def test_failed_update_is_not_counted_as_captured(workspace, atlas) -> None:
+    # A directory where the REQ should be makes the update's read fail.
+    (workspace / ".atlas" / "req" / "REQ-GEN-005.md").mkdir()
+    stdin = jsonl({"text": "Fresh item"}, {"text": "Amend REQ-GEN-005"})
+    result = atlas("capture", "--from-file", "-", stdin=stdin)
+    assert result.returncode == 1
+    assert "[WARN] Skipping line 2:" in result.stdout
+    assert "[DONE] Captured 1 item(s) from -; skipped 1." in result.stdout
+
+
+def test_csv_file(workspace, atlas) -> None:
+    (workspace / "items.csv").write_text("title,body,domain\nSearch,Find by name,GEN\n", encoding="utf-8")
+    result = atlas("capture", "--from-file", "items.csv")
+    assert result.returncode == 0, result.stdout
+    assert "Find by name" in (workspace / ".atlas" / "req" / "REQ-GEN-001.md").read_text(encoding="utf-8")
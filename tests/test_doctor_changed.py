@@ -0,0 +1,22 @@
+"""doctor --changed against files that are linked to but not indexed."""
+from conftest import req_text, write_doc
+
+
+def test_changed_reports_deleted_non_indexed_link_target(workspace, atlas) -> None:
+    req = write_doc(
+        workspace / ".atlas" / "req" / "REQ-AUTH-001.md",
+        req_text("REQ-AUTH-001", references="- [Front](../FRONT.md)\n"),
+    )
+    front = workspace / ".atlas" / "FRONT.md"
+    broken = f"Broken link: {req} -> ../FRONT.md"
+
+    assert broken not in atlas("doctor", "--links").stdout
+
+    text = front.read_text(encoding="utf-8")
+    front.unlink()
+    output = atlas("doctor", "--links", "--changed").stdout
+    assert "Re-validating 1 of" in output
+    assert broken in output
+
+    front.write_text(text, encoding="utf-8")
+    assert broken not in atlas("doctor", "--links", "--changed").stdout
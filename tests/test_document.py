@@ -0,0 +1,75 @@
+"""Document: parse once, edit a region, re-emit everything else byte for byte."""
+import pytest
+from conftest import req_text
+
+CAPTURE_LOG = "".join(f"- 2026-01-{day:02d}: note  with  odd   spacing\t\n" for day in range(1, 29))
+
+TEXT = (
+    req_text("REQ-GEN-001").replace("> **Must-Read**: None\n", "> **Must-Read**: None\n>   **Odd**:   spaced  \n")
+    + "\n## Capture\n"
+    + CAPTURE_LOG
+    + "\n\n"
+)
+
+
+def test_untouched_document_renders_verbatim(cli) -> None:
+    doc = cli.Document(TEXT)
+    assert doc.meta["Status"] == "Draft"
+    assert doc.section("Capture") == CAPTURE_LOG + "\n\n"
+    assert not doc.dirty
+    assert doc.render() == TEXT
+
+
+def test_changing_one_field_changes_only_that_line(cli) -> None:
+    doc = cli.Document(TEXT)
+    doc.set_meta("Status", "Active")
+    assert doc.render() == TEXT.replace("> **Status**: Draft\n", "> **Status**: Active\n")
+
+
+def test_setting_a_field_to_its_value_is_not_an_edit(cli) -> None:
+    doc = cli.Document(TEXT)
+    doc.set_meta("Status", "Draft")
+    assert not doc.dirty
+    assert doc.render() == TEXT
+
+
+def test_missing_field_is_inserted_under_the_title(cli) -> None:
+    doc = cli.Document(TEXT)
+    doc.set_meta("Owner", "kim")
+    title, rest = TEXT.split("\n", 1)
+    assert doc.render() == f"{title}\n> **Owner**: kim\n{rest}"
+
+
+def test_changing_one_section_changes_only_that_section(cli) -> None:
+    doc = cli.Document(TEXT)
+    doc.set_section("Output", "- A session and a refresh token")
+    assert doc.render() == TEXT.replace("## Output\n- A session\n", "## Output\n- A session and a refresh token\n")
+    with pytest.raises(KeyError):
+        doc.set_section("Nope", "x")
+
+
+def test_field_and_section_edits_together(cli) -> None:
+    doc = cli.Document(TEXT)
+    doc.set_meta("Linked-RUN", "RUN-REQ-GEN-001-step-01")
+    doc.set_section("Input", "- Credentials\n- A captcha\n")
+    expected = TEXT.replace("> **Linked-RUN**: -\n", "> **Linked-RUN**: RUN-REQ-GEN-001-step-01\n")
+    expected = expected.replace("## Input\n- Credentials\n", "## Input\n- Credentials\n- A captcha\n")
+    assert doc.render() == expected
+
+
+def test_missing_final_newline_stays_missing(cli) -> None:
+    text = TEXT.rstrip("\n")
+    doc = cli.Document(text)
+    doc.set_meta("Status", "Active")
+    assert doc.render() == text.replace("**Status**: Draft", "**Status**: Active")
+
+
+def test_load_edit_save_round_trip_on_disk(tmp_path, cli) -> None:
+    path = tmp_path / "REQ-GEN-001.md"
+    path.write_bytes(TEXT.encode("utf-8"))
+    assert cli.Document.load(path).save(path) is False
+
+    doc = cli.Document.load(path)
+    doc.set_meta("Status", "Done")
+    assert doc.save(path) is True
+    assert path.read_bytes() == TEXT.replace("**Status**: Draft", "**Status**: Done").encode("utf-8")
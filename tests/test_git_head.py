@@ -0,0 +1,121 @@
+"""Reading HEAD without git, checked against `git rev-parse HEAD` for each repository layout."""
+import os
+import shutil
+import subprocess
+
+import pytest
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Atlas",
+    "GIT_AUTHOR_EMAIL": "atlas@example.com",
+    "GIT_COMMITTER_NAME": "Atlas",
+    "GIT_COMMITTER_EMAIL": "atlas@example.com",
+    "GIT_CONFIG_NOSYSTEM": "1",
+    "GIT_CONFIG_GLOBAL": os.devnull,
+}
+
+
+def git(cwd, *args) -> str:
+    env = {k: v for k, v in os.environ.items() if not k.startswith("GIT_")}
+    result = subprocess.run(
+        ["git", *args], cwd=cwd, env={**env, **GIT_ENV}, capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    for name in GIT_ENV:
+        monkeypatch.setenv(name, GIT_ENV[name])
+    path = tmp_path / "repo"
+    path.mkdir()
+    git(path, "init", "-q", "-b", "main")
+    for n in range(2):
+        (path / "file.txt").write_text(f"v{n}\n", encoding="utf-8")
+        git(path, "add", "file.txt")
+        git(path, "commit", "-q", "-m", f"commit {n}")
+    (path / "sub").mkdir()
+    return path
+
+
+def assert_matches_git(cli, start) -> None:
+    assert cli.read_git_head(start) == git(start, "rev-parse", "HEAD")
+
+
+def test_branch_in_a_loose_ref(cli, repo) -> None:
+    assert (repo / ".git" / "refs" / "heads" / "main").is_file()
+    assert_matches_git(cli, repo)
+    assert_matches_git(cli, repo / "sub")
+
+
+def test_branch_in_packed_refs(cli, repo) -> None:
+    git(repo, "pack-refs", "--all")
+    assert not (repo / ".git" / "refs" / "heads" / "main").exists()
+    assert_matches_git(cli, repo)
+
+
+def test_loose_ref_wins_over_a_stale_packed_one(cli, repo) -> None:
+    git(repo, "pack-refs", "--all")
+    git(repo, "commit", "-q", "--allow-empty", "-m", "after packing")
+    assert_matches_git(cli, repo)
+
+
+def test_detached_head(cli, repo) -> None:
+    git(repo, "checkout", "-q", "--detach", "HEAD~1")
+    assert cli.GIT_HASH_RE.match((repo / ".git" / "HEAD").read_text(encoding="utf-8").strip())
+    assert_matches_git(cli, repo)
+
+
+def test_linked_worktree_gitdir_file(cli, repo, tmp_path) -> None:
+    worktree = tmp_path / "wt"
+    git(repo, "worktree", "add", "-q", "-b", "side", str(worktree), "HEAD~1")
+    git(worktree, "commit", "-q", "--allow-empty", "-m", "on side")
+    assert (worktree / ".git").read_text(encoding="utf-8").startswith("gitdir:")
+    assert_matches_git(cli, worktree)
+    git(repo, "pack-refs", "--all")
+    assert_matches_git(cli, worktree)
+    assert_matches_git(cli, repo)
+
+
+def test_detached_linked_worktree(cli, repo, tmp_path) -> None:
+    worktree = tmp_path / "wt"
+    git(repo, "worktree", "add", "-q", "--detach", str(worktree), "HEAD~1")
+    assert_matches_git(cli, worktree)
+
+
+@pytest.mark.parametrize("layout", ["unborn-branch", "gitdir-garbage", "reftable", "GIT_DIR"])
+def test_unrecognised_layouts_are_left_to_git(cli, repo, monkeypatch, layout) -> None:
+    if layout == "unborn-branch":
+        git(repo, "checkout", "-q", "--orphan", "fresh")
+    elif layout == "gitdir-garbage":
+        shutil.move(repo / ".git", repo.parent / "real.git")
+        (repo / ".git").write_text("not a gitdir line\n", encoding="utf-8")
+    elif layout == "reftable":
+        (repo / ".git" / "reftable").mkdir()
+    else:
+        monkeypatch.setenv("GIT_DIR", str(repo / ".git"))
+    with pytest.raises(cli.UnsupportedGitLayout):
+        cli.read_git_head(repo)
+
+
+def test_detect_git_hash_falls_back_to_rev_parse(cli, repo, tmp_path, monkeypatch) -> None:
+    # GIT_DIR points git at the repository from a directory with no .git of its own.
+    elsewhere = tmp_path / "elsewhere"
+    elsewhere.mkdir()
+    monkeypatch.chdir(elsewhere)
+    monkeypatch.setenv("GIT_DIR", str(repo / ".git"))
+    monkeypatch.setattr(cli, "_GIT_HEADS", {})
+    assert cli.detect_git_hash() == git(repo, "rev-parse", "HEAD")
+
+
+def test_detect_git_hash_of_an_unborn_branch_is_none(cli, repo, monkeypatch) -> None:
+    git(repo, "checkout", "-q", "--orphan", "fresh")
+    monkeypatch.chdir(repo)
+    monkeypatch.setattr(cli, "_GIT_HEADS", {})
+    assert cli.detect_git_hash() is None
+
+
+def test_outside_a_repository_is_none(cli, tmp_path) -> None:
+    assert cli.read_git_head(tmp_path) is None
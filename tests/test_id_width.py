@@ -0,0 +1,36 @@
+"""ID numbers and RUN steps past the old three-digit and two-digit widths."""
+from conftest import req_text, write_doc
+
+HASH = "0123456789abcdef0123456789abcdef01234567"
+
+
+def add_req(workspace, req_id: str) -> None:
+    write_doc(workspace / ".atlas" / "req" / f"{req_id}.md", req_text(req_id))
+
+
+def test_ids_past_the_old_width_sort_by_value(cli) -> None:
+    names = ["REQ-GEN-1000", "REQ-GEN-999", "REQ-GEN-002", "REQ-GEN-10000", "REQ-AUTH-1000"]
+    assert sorted(names, key=cli.id_sort_key) == [
+        "REQ-AUTH-1000", "REQ-GEN-002", "REQ-GEN-999", "REQ-GEN-1000", "REQ-GEN-10000",
+    ]
+    steps = ["RUN-REQ-GEN-001-step-100", "RUN-REQ-GEN-001-step-99", "RUN-REQ-GEN-001-step-02"]
+    assert sorted(steps, key=cli.id_sort_key) == [steps[2], steps[1], steps[0]]
+
+
+def test_numbering_widens_after_999(workspace, cli, atlas) -> None:
+    add_req(workspace, "REQ-GEN-999")
+    assert cli.next_ids("REQ", "GEN", cli.REQ_DIR, cli.REQ_ID_PATTERN, 2) == ["REQ-GEN-1000", "REQ-GEN-1001"]
+    add_req(workspace, "REQ-GEN-1000")
+    paths = [path.stem for path in cli.iter_md_files([cli.REQ_DIR])]
+    assert paths.index("REQ-GEN-999") < paths.index("REQ-GEN-1000")
+
+    result = atlas("run", "REQ-GEN-1000", "--step", "99")
+    assert result.returncode == 0, result.stdout
+    result = atlas("run", "REQ-GEN-1000")
+    assert result.returncode == 0, result.stdout
+    assert (workspace / ".atlas" / "runs" / "RUN-REQ-GEN-1000-step-100.md").exists()
+    result = atlas("finish", "RUN-REQ-GEN-1000-step-100", "--git", HASH, "--success", "true")
+    assert result.returncode == 0, result.stdout
+    req = (workspace / ".atlas" / "req" / "REQ-GEN-1000.md").read_text(encoding="utf-8")
+    assert "> **Linked-RUN**: RUN-REQ-GEN-1000-step-100" in req
+    assert not [issue for issue in cli.validate(workspace) if issue.code == "invalid-filename"]
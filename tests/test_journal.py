@@ -0,0 +1,146 @@
+"""Transaction commits and redo of an interrupted one from state/journal.json."""
+import json
+import subprocess
+import sys
+
+import pytest
+from conftest import REPO_ROOT, req_text, write_doc
+
+
+class Crash(Exception):
+    pass
+
+
+def crash(files) -> None:
+    raise Crash()
+
+
+def two_docs(cli):
+    first = write_doc(cli.REQ_DIR / "REQ-GEN-001.md", req_text("REQ-GEN-001", "Old one"))
+    second = write_doc(cli.REQ_DIR / "REQ-GEN-002.md", req_text("REQ-GEN-002", "Old two"))
+    return first, second
+
+
+def interrupted_commit(cli, monkeypatch, edits) -> None:
+    """Commit edits, dying after the journal is durable but before any document is replaced."""
+    monkeypatch.setattr(cli, "write_files", crash)
+    with pytest.raises(Crash):
+        with cli.Transaction("finish") as tx:
+            for path, content in edits:
+                tx.lock(path)
+                tx.write(path, content)
+    monkeypatch.undo()
+
+
+def test_commit_writes_every_file_and_removes_the_journal(workspace, cli) -> None:
+    first, second = two_docs(cli)
+    with cli.Transaction("finish") as tx:
+        tx.lock(first, second)
+        tx.write(first, "one")
+        assert tx.read(first) == "one"
+        tx.write(second, "two")
+    assert first.read_text(encoding="utf-8") == "one"
+    assert second.read_text(encoding="utf-8") == "two"
+    assert not cli.JOURNAL_PATH.exists()
+
+
+def test_journal_is_durable_before_documents_are_written(workspace, cli, monkeypatch) -> None:
+    first, second = two_docs(cli)
+    old = first.read_text(encoding="utf-8")
+    synced = []
+    fsync = cli.os.fsync
+    monkeypatch.setattr(cli.os, "fsync", lambda fd: synced.append(fd) or fsync(fd))
+    interrupted_commit(cli, monkeypatch, [(first, "one"), (second, "two")])
+
+    # The journal file and its directory entry were fsynced on their own.
+    assert len(synced) == 2
+    assert first.read_text(encoding="utf-8") == old
+    journal = json.loads(cli.JOURNAL_PATH.read_text(encoding="utf-8"))
+    assert journal["command"] == "finish"
+    assert [entry["path"] for entry in journal["files"]] == ["req/REQ-GEN-001.md", "req/REQ-GEN-002.md"]
+
+
+def test_recover_replays_the_writes_and_removes_the_journal(workspace, cli, monkeypatch, capsys) -> None:
+    first, second = two_docs(cli)
+    interrupted_commit(cli, monkeypatch, [(first, "one"), (second, "two")])
+
+    cli.recover_journal()
+    assert first.read_text(encoding="utf-8") == "one"
+    assert second.read_text(encoding="utf-8") == "two"
+    assert not cli.JOURNAL_PATH.exists()
+    assert "Recovered interrupted finish: 2 file(s) rewritten." in capsys.readouterr().out
+
+
+def test_recover_skips_files_already_written(workspace, cli, monkeypatch, capsys) -> None:
+    first, second = two_docs(cli)
+    interrupted_commit(cli, monkeypatch, [(first, "one"), (second, "two")])
+    first.write_text("one", encoding="utf-8")
+
+    cli.recover_journal()
+    assert second.read_text(encoding="utf-8") == "two"
+    assert "1 file(s) rewritten" in capsys.readouterr().out
+
+
+def test_recover_leaves_files_edited_since_alone(workspace, cli, monkeypatch, capsys) -> None:
+    first, second = two_docs(cli)
+    interrupted_commit(cli, monkeypatch, [(first, "one"), (second, "two")])
+    first.write_text("edited by hand", encoding="utf-8")
+
+    cli.recover_journal()
+    assert first.read_text(encoding="utf-8") == "edited by hand"
+    assert second.read_text(encoding="utf-8") == "two"
+    assert f"[WARN] {first} changed after the interrupted finish; left as is." in capsys.readouterr().out
+    assert not cli.JOURNAL_PATH.exists()
+
+
+@pytest.mark.parametrize(
+    "journal",
+    [
+        "{not json",
+        '{"version": 1, "command": "finish", "files": [{"path": "req/REQ-GEN-001.md", "bef',
+        '{"version": 999, "command": "finish", "files": []}',
+        "[]",
+    ],
+    ids=["garbage", "truncated", "other-version", "not-an-object"],
+)
+def test_unreadable_journal_is_moved_aside(workspace, cli, capsys, journal) -> None:
+    first, _ = two_docs(cli)
+    old = first.read_text(encoding="utf-8")
+    cli.JOURNAL_PATH.write_text(journal, encoding="utf-8")
+
+    cli.recover_journal()
+    aside = cli.JOURNAL_PATH.with_name("journal.json.corrupt")
+    assert not cli.JOURNAL_PATH.exists()
+    assert aside.read_text(encoding="utf-8") == journal
+    assert first.read_text(encoding="utf-8") == old
+    assert f"[WARN] Unreadable journal moved to {aside}" in capsys.readouterr().out
+
+
+KILLED_COMMIT = """
+import os, sys
+sys.path.insert(0, sys.argv[1])
+import atlas_cli
+atlas_cli.set_workspace(sys.argv[2])
+
+def die(files):
+    atlas_cli.atomic_write(*files[0])
+    os._exit(9)
+
+atlas_cli.write_files = die
+with atlas_cli.Transaction("finish") as tx:
+    for name, content in [("REQ-GEN-001.md", "one"), ("REQ-GEN-002.md", "two")]:
+        tx.write(atlas_cli.REQ_DIR / name, content)
+"""
+
+
+def test_next_command_finishes_a_killed_commit(workspace, cli, atlas) -> None:
+    first, second = two_docs(cli)
+    killed = subprocess.run([sys.executable, "-c", KILLED_COMMIT, str(REPO_ROOT / "src"), str(workspace)])
+    assert killed.returncode == 9
+    assert first.read_text(encoding="utf-8") == "one"
+    assert cli.JOURNAL_PATH.exists()
+
+    output = atlas("doctor").stdout
+    assert "[INFO] Recovered interrupted finish: 1 file(s) rewritten." in output
+    assert second.read_text(encoding="utf-8") == "two"
+    assert not cli.JOURNAL_PATH.exists()
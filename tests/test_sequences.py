@@ -0,0 +1,86 @@
+"""ID and RUN step allocation through state/sequences.json."""
+import json
+import subprocess
+import sys
+
+from conftest import REPO_ROOT, req_text, write_doc
+
+
+def new_req_ids(cli, count: int, domain: str = "GEN") -> list[str]:
+    return cli.next_ids("REQ", domain, cli.REQ_DIR, cli.REQ_ID_PATTERN, count)
+
+
+def add_req(cli, req_id: str) -> None:
+    write_doc(cli.REQ_DIR / f"{req_id}.md", req_text(req_id))
+
+
+def test_allocates_consecutive_blocks_and_persists_the_counter(workspace, cli) -> None:
+    assert new_req_ids(cli, 1) == ["REQ-GEN-001"]
+    assert new_req_ids(cli, 3) == ["REQ-GEN-002", "REQ-GEN-003", "REQ-GEN-004"]
+    assert new_req_ids(cli, 1, "AUTH") == ["REQ-AUTH-001"]
+    data = json.loads(cli.SEQUENCES_PATH.read_text(encoding="utf-8"))
+    assert data["ids"] == {"REQ-GEN": 4, "REQ-AUTH": 1}
+
+
+def test_missing_counter_is_rebuilt_from_the_folder(workspace, cli) -> None:
+    add_req(cli, "REQ-GEN-001")
+    add_req(cli, "REQ-GEN-007")
+    assert new_req_ids(cli, 1) == ["REQ-GEN-008"]
+
+
+def test_unreadable_counter_file_is_rebuilt_from_the_folder(workspace, cli) -> None:
+    add_req(cli, "REQ-GEN-002")
+    cli.SEQUENCES_PATH.write_text("{not json", encoding="utf-8")
+    assert new_req_ids(cli, 1) == ["REQ-GEN-003"]
+
+
+def test_stale_counter_skips_ids_created_by_hand(workspace, cli) -> None:
+    assert new_req_ids(cli, 1) == ["REQ-GEN-001"]
+    add_req(cli, "REQ-GEN-002")
+    assert new_req_ids(cli, 1) == ["REQ-GEN-003"]
+
+
+def test_small_block_is_checked_past_its_first_number(workspace, cli) -> None:
+    assert new_req_ids(cli, 1) == ["REQ-GEN-001"]
+    add_req(cli, "REQ-GEN-004")
+    assert new_req_ids(cli, 3) == ["REQ-GEN-005", "REQ-GEN-006", "REQ-GEN-007"]
+
+
+def test_large_block_is_checked_with_one_scan(workspace, cli) -> None:
+    assert new_req_ids(cli, 1) == ["REQ-GEN-001"]
+    add_req(cli, "REQ-GEN-040")
+    block = new_req_ids(cli, 50)
+    assert block[0] == "REQ-GEN-041"
+    assert block[-1] == "REQ-GEN-090"
+
+
+def test_run_steps_follow_existing_runs(workspace, cli) -> None:
+    add_req(cli, "REQ-GEN-001")
+    assert cli.next_run_step("REQ-GEN-001") == 1
+    write_doc(cli.RUN_DIR / "RUN-REQ-GEN-001-step-02.md", "# [RUN-REQ-GEN-001-step-02] Run\n")
+    assert cli.next_run_step("REQ-GEN-001") == 3
+
+
+ALLOCATE = """
+import sys
+sys.path.insert(0, sys.argv[1])
+import atlas_cli
+atlas_cli.set_workspace(sys.argv[2])
+for _ in range(20):
+    print(*atlas_cli.next_ids("REQ", "RACE", atlas_cli.REQ_DIR, atlas_cli.REQ_ID_PATTERN, 2))
+"""
+
+
+def test_concurrent_processes_never_share_an_id(workspace) -> None:
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-c", ALLOCATE, str(REPO_ROOT / "src"), str(workspace)],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        for _ in range(4)
+    ]
+    ids = [req_id for proc in procs for req_id in proc.communicate()[0].split()]
+    assert all(proc.returncode == 0 for proc in procs)
+    assert len(ids) == 4 * 20 * 2
+    assert sorted(ids) == [f"REQ-RACE-{n:03d}" for n in range(1, 161)]
@@ -0,0 +1,41 @@
+"""Start-up cost of atlas.py per command, checked the way `python -m bench.startup` does.
+
+Timing budgets are multiplied by ATLAS_STARTUP_SCALE (default 2) so a busy
+test machine does not fail them; the module checks are exact.
+"""
+import os
+import shutil
+import sys
+
+import pytest
+from conftest import ATLAS, REPO_ROOT
+
+sys.path.insert(0, str(REPO_ROOT))
+
+from bench.generate import generate_workspace  # noqa: E402
+from bench.startup import BUDGETS_MS, FORBIDDEN_MODULES, check_command, command_args, import_report  # noqa: E402
+
+SCALE = float(os.environ.get("ATLAS_STARTUP_SCALE", "2"))
+
+
+@pytest.fixture(scope="module")
+def bench_workspace(tmp_path_factory):
+    workspace = tmp_path_factory.mktemp("startup") / "ws"
+    manifest = generate_workspace(workspace, 50, seed=0)
+    shutil.copy(ATLAS, workspace / "atlas.py")
+    return workspace, manifest
+
+
+def test_version_imports_no_heavy_modules(bench_workspace) -> None:
+    workspace, manifest = bench_workspace
+    _, modules, code = import_report(workspace, command_args("version", manifest))
+    assert code == 0
+    assert "atlas" in modules
+    assert not FORBIDDEN_MODULES & modules
+    assert "base64" not in modules
+
+
+@pytest.mark.parametrize("name", list(BUDGETS_MS))
+def test_command_starts_within_budget(bench_workspace, name) -> None:
+    workspace, manifest = bench_workspace
+    assert check_command(name, workspace, manifest, repeat=3, scale=SCALE) == []
@@ -0,0 +1,22 @@
+"""validate() as a Python API."""
+import pytest
+from conftest import req_text, write_doc
+
+
+def test_validate_other_workspace_restores_globals_before_returning(workspace, cli, tmp_path_factory) -> None:
+    write_doc(workspace / ".atlas" / "req" / "REQ-AUTH-001.md", req_text("REQ-AUTH-001"))
+    home = tmp_path_factory.mktemp("home")
+    cli.set_workspace(home)
+
+    issues = cli.validate(workspace)
+    found = [next(issues)]
+    # The caller is consuming issues: the process must be back on its own workspace.
+    assert cli.REPO_ROOT == home.resolve()
+    assert cli.ATLAS_ROOT == home.resolve() / ".atlas"
+    found.extend(issues)
+    assert any(issue.code == "req-missing-view" and issue.target == "REQ-AUTH-001" for issue in found)
+
+
+def test_validate_rejects_unknown_checks(workspace, cli) -> None:
+    with pytest.raises(ValueError):
+        cli.validate(workspace, checks=["documents", "nonsense"])